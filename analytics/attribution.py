@@ -0,0 +1,390 @@
+"""
+ATLAS Terminal - Vectorized Brinson-Fachler Attribution
+=======================================================
+Pure computation module for sector attribution.
+
+Single period
+    ``sector_attribution`` / ``stock_attribution`` decompose one period's
+    active return from a holdings table with one groupby and aligned
+    vector arithmetic. They are unit-agnostic: effects come out in the
+    units of the returns (weights are fractions).
+
+Daily history
+    ``brinson_fachler_history`` computes the three effects for every date
+    and sector at once. Portfolio sector weights and contributions are
+    (dates x assets) @ (assets x sectors) products with a one-hot sector
+    matrix.
+
+Multi-period linking
+    Arithmetic daily effects do not add up to the compounded active
+    return. ``linked_attribution`` scales each day by Carino (logarithmic)
+    or Menchero (optimised) coefficients, so the linked sector effects sum
+    exactly to R - B over the whole window.
+
+Effects (Brinson-Fachler):
+
+    allocation  = (wp - wb) x (rb - Rb)
+    selection   = wb x (rp - rb)
+    interaction = (wp - wb) x (rp - rb)
+
+``selection_weight='portfolio'`` uses wp in the selection term instead.
+This is the convention of core/calculations.calculate_brinson_attribution_gics,
+whose selection then already contains the interaction term.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Dict, Mapping, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+LINKING_METHODS = ("carino", "menchero")
+SELECTION_WEIGHTS = ("benchmark", "portfolio")
+
+SectorValues = Union[pd.Series, Mapping[str, float]]
+
+SECTOR_COLUMNS = [
+    'Sector', 'Portfolio Weight', 'Benchmark Weight', 'Weight Diff',
+    'Portfolio Return', 'Benchmark Return', 'Return Diff',
+    'Allocation Effect', 'Selection Effect', 'Interaction Effect', 'Total Effect',
+]
+
+
+# ---------------------------------------------------------------------------
+# Data classes
+# ---------------------------------------------------------------------------
+
+@dataclass
+class AttributionResult:
+    """Linked multi-period attribution over a daily history."""
+    sectors: pd.DataFrame            # linked effects + average weights, one row per sector
+    allocation: pd.DataFrame         # daily (unlinked) effects, dates x sectors
+    selection: pd.DataFrame
+    interaction: pd.DataFrame
+    portfolio_returns: pd.Series     # daily
+    benchmark_returns: pd.Series     # daily
+    coefficients: pd.Series          # linking coefficient per date
+    method: str = "carino"
+    summary: Dict[str, float] = field(default_factory=dict)
+
+
+# ---------------------------------------------------------------------------
+# Single period
+# ---------------------------------------------------------------------------
+
+def _check_selection_weight(selection_weight: str):
+    if selection_weight not in SELECTION_WEIGHTS:
+        raise ValueError(f"selection_weight must be one of {SELECTION_WEIGHTS}, got {selection_weight!r}")
+
+
+def sector_attribution(
+    holdings: pd.DataFrame,
+    benchmark_weights: SectorValues,
+    benchmark_returns: SectorValues,
+    benchmark_total: Optional[float] = None,
+    *,
+    selection_weight: str = "benchmark",
+    include_unheld: bool = True,
+    sector_col: str = "Sector",
+    weight_col: str = "Weight",
+    return_col: str = "Return",
+) -> pd.DataFrame:
+    """One-period Brinson-Fachler effects per sector.
+
+    Parameters
+    ----------
+    holdings : DataFrame
+        One row per position with sector, weight (fraction) and return.
+    benchmark_weights, benchmark_returns : Series or dict
+        Per sector; weights are fractions, returns in the holdings' units.
+    benchmark_total : float, optional
+        Benchmark total return (default: sum of wb x rb).
+    selection_weight : {'benchmark', 'portfolio'}
+        Weight in the selection term (see module docstring).
+    include_unheld : bool
+        Also report benchmark sectors the portfolio does not hold, which
+        carry allocation effect only.
+
+    Returns
+    -------
+    DataFrame with SECTOR_COLUMNS, held sectors first (in order of first
+    appearance), then unheld benchmark sectors.
+    """
+    _check_selection_weight(selection_weight)
+    w = holdings[weight_col].to_numpy(dtype=float)
+    r = holdings[return_col].to_numpy(dtype=float)
+    grouped = (pd.DataFrame({'sector': holdings[sector_col].to_numpy(), 'w': w, 'wr': w * r})
+               .groupby('sector', sort=False).sum())
+    bw = pd.Series(benchmark_weights, dtype=float)
+    br = pd.Series(benchmark_returns, dtype=float)
+
+    sectors = grouped.index
+    if include_unheld:
+        unheld = bw.index[(bw > 0) & ~bw.index.isin(sectors)]
+        sectors = sectors.append(unheld)
+    wp = grouped['w'].reindex(sectors, fill_value=0.0).to_numpy()
+    wr = grouped['wr'].reindex(sectors, fill_value=0.0).to_numpy()
+    wb = bw.reindex(sectors, fill_value=0.0).to_numpy()
+    rb = br.reindex(sectors, fill_value=0.0).to_numpy()
+    if benchmark_total is None:
+        benchmark_total = float((bw * br.reindex(bw.index, fill_value=0.0)).sum())
+
+    held = np.isin(sectors, grouped.index)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rp = np.where(wp != 0, wr / wp, rb)
+    # Unheld sectors show a zero portfolio return but are neutral in the
+    # selection and interaction terms (rp := rb)
+    rp_shown = np.where(held, rp, 0.0)
+    rp_eff = np.where(held, rp, rb)
+
+    allocation = (wp - wb) * (rb - benchmark_total)
+    selection = (wb if selection_weight == "benchmark" else wp) * (rp_eff - rb)
+    interaction = (wp - wb) * (rp_eff - rb)
+    return pd.DataFrame({
+        'Sector': sectors,
+        'Portfolio Weight': wp,
+        'Benchmark Weight': wb,
+        'Weight Diff': wp - wb,
+        'Portfolio Return': rp_shown,
+        'Benchmark Return': rb,
+        'Return Diff': rp_shown - rb,
+        'Allocation Effect': allocation,
+        'Selection Effect': selection,
+        'Interaction Effect': interaction,
+        'Total Effect': allocation + selection + interaction,
+    }, columns=SECTOR_COLUMNS)
+
+
+def stock_attribution(
+    holdings: pd.DataFrame,
+    benchmark_returns: SectorValues,
+    *,
+    ticker_col: str = "Ticker",
+    sector_col: str = "Sector",
+    weight_col: str = "Weight",
+    return_col: str = "Return",
+) -> pd.DataFrame:
+    """Per-position contribution and active contribution versus its sector.
+
+    ``Contribution`` is w x r; ``Active Contribution`` is w x (r - rb of
+    the position's benchmark sector).
+    """
+    w = holdings[weight_col].to_numpy(dtype=float)
+    r = holdings[return_col].to_numpy(dtype=float)
+    rb = holdings[sector_col].map(pd.Series(benchmark_returns, dtype=float)).fillna(0.0).to_numpy()
+    return pd.DataFrame({
+        'Ticker': holdings[ticker_col].to_numpy(),
+        'Sector': holdings[sector_col].to_numpy(),
+        'Weight': w,
+        'Return': r,
+        'Sector Benchmark Return': rb,
+        'Return vs Sector': r - rb,
+        'Contribution': w * r,
+        'Active Contribution': w * (r - rb),
+    })
+
+
+# ---------------------------------------------------------------------------
+# Daily history
+# ---------------------------------------------------------------------------
+
+def drifted_weights(initial: SectorValues, asset_returns: pd.DataFrame) -> pd.DataFrame:
+    """Beginning-of-day weights of a buy-and-hold portfolio started at ``initial``."""
+    w0 = pd.Series(initial, dtype=float).reindex(asset_returns.columns, fill_value=0.0)
+    growth = np.cumprod(1.0 + asset_returns.fillna(0.0).to_numpy(), axis=0)
+    # Value at the start of day t is the value at the close of day t-1
+    value = np.vstack([w0.to_numpy(), w0.to_numpy() * growth[:-1]])
+    total = value.sum(axis=1, keepdims=True)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        weights = np.where(total != 0, value / total, 0.0)
+    return pd.DataFrame(weights, index=asset_returns.index, columns=asset_returns.columns)
+
+
+def _sector_frame(values, dates: pd.DatetimeIndex, sectors: pd.Index) -> np.ndarray:
+    """Broadcast a per-sector Series/dict or a (dates x sectors) frame to an array."""
+    if isinstance(values, pd.DataFrame):
+        frame = values.reindex(index=dates).reindex(columns=sectors)
+        return frame.fillna(0.0).to_numpy(dtype=float)
+    row = pd.Series(values, dtype=float).reindex(sectors, fill_value=0.0).to_numpy()
+    return np.broadcast_to(row, (len(dates), len(sectors)))
+
+
+def brinson_fachler_history(
+    weights: Union[pd.DataFrame, SectorValues],
+    asset_returns: pd.DataFrame,
+    sectors: SectorValues,
+    benchmark_weights: Union[pd.DataFrame, SectorValues],
+    benchmark_returns: pd.DataFrame,
+    selection_weight: str = "benchmark",
+) -> Dict[str, pd.DataFrame]:
+    """Daily Brinson-Fachler effects for every (date, sector).
+
+    Parameters
+    ----------
+    weights : DataFrame or Series/dict
+        Beginning-of-day portfolio weights (dates x assets), or initial
+        weights that then drift with prices (``drifted_weights``).
+    asset_returns : DataFrame
+        Daily asset returns (dates x assets); NaN counts as 0.
+    sectors : Series or dict
+        Asset -> sector; unclassified assets go to 'Other'.
+    benchmark_weights : DataFrame or Series/dict
+        Benchmark sector weights, per date or constant.
+    benchmark_returns : DataFrame
+        Daily benchmark sector returns (dates x sectors).
+
+    Returns
+    -------
+    dict of (dates x sectors) DataFrames 'allocation', 'selection',
+    'interaction', 'portfolio_weight', 'benchmark_weight', plus Series
+    'portfolio_return' and 'benchmark_return'.
+    """
+    _check_selection_weight(selection_weight)
+    dates, assets = asset_returns.index, asset_returns.columns
+    if not isinstance(weights, pd.DataFrame):
+        weights = drifted_weights(weights, asset_returns)
+    W = weights.reindex(index=dates, columns=assets).fillna(0.0).to_numpy(dtype=float)
+    R = asset_returns.fillna(0.0).to_numpy(dtype=float)
+
+    labels = pd.Series(sectors, dtype=object).reindex(assets).fillna('Other')
+    codes, held_sectors = pd.factorize(labels)
+    bench_sectors = (benchmark_returns.columns if not isinstance(benchmark_weights, pd.DataFrame)
+                     else benchmark_weights.columns.union(benchmark_returns.columns, sort=False))
+    names = pd.Index(held_sectors).append(pd.Index(bench_sectors).difference(held_sectors, sort=False))
+    onehot = np.zeros((len(assets), len(names)))
+    onehot[np.arange(len(assets)), codes] = 1.0
+
+    wp = W @ onehot
+    contrib = (W * R) @ onehot
+    wb = _sector_frame(benchmark_weights, dates, names)
+    rb = _sector_frame(benchmark_returns, dates, names)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rp = np.where(wp != 0, contrib / wp, rb)
+    port = contrib.sum(axis=1)
+    bench = (wb * rb).sum(axis=1)
+
+    allocation = (wp - wb) * (rb - bench[:, None])
+    selection = (wb if selection_weight == "benchmark" else wp) * (rp - rb)
+    interaction = (wp - wb) * (rp - rb)
+    frame = lambda a: pd.DataFrame(a, index=dates, columns=names)  # noqa: E731
+    return {
+        'allocation': frame(allocation),
+        'selection': frame(selection),
+        'interaction': frame(interaction),
+        'portfolio_weight': frame(wp),
+        'benchmark_weight': frame(np.array(wb)),
+        'portfolio_return': pd.Series(port, index=dates),
+        'benchmark_return': pd.Series(bench, index=dates),
+    }
+
+
+# ---------------------------------------------------------------------------
+# Linking
+# ---------------------------------------------------------------------------
+
+def _log_ratio(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """(ln(1+a) - ln(1+b)) / (a - b), with its limit 1 / (1+a) where a == b."""
+    a, b = np.asarray(a, dtype=float), np.asarray(b, dtype=float)
+    diff = a - b
+    same = np.isclose(diff, 0.0, atol=1e-12)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ratio = (np.log1p(a) - np.log1p(b)) / np.where(same, 1.0, diff)
+    return np.where(same, 1.0 / (1.0 + a), ratio)
+
+
+def linking_coefficients(
+    portfolio_returns: pd.Series,
+    benchmark_returns: pd.Series,
+    method: str = "carino",
+) -> pd.Series:
+    """Per-period scale factors that make arithmetic effects compound.
+
+    Multiplying each period's effects by its coefficient and summing over
+    periods gives effects that add up to the compounded active return
+    prod(1 + rp) - prod(1 + rb).
+
+    Parameters
+    ----------
+    method : {'carino', 'menchero'}
+        Carino (1999) logarithmic smoothing, or Menchero (2000) optimised
+        linking (a common scale M plus the smallest per-period correction).
+    """
+    rp = portfolio_returns.to_numpy(dtype=float)
+    rb = benchmark_returns.reindex(portfolio_returns.index).to_numpy(dtype=float)
+    R, B = np.prod(1.0 + rp) - 1.0, np.prod(1.0 + rb) - 1.0
+    if method == "carino":
+        coef = _log_ratio(rp, rb) / _log_ratio(R, B)
+    elif method == "menchero":
+        T = len(rp)
+        if np.isclose(R, B, atol=1e-12):
+            M = (1.0 + R) ** ((T - 1.0) / T)
+        else:
+            M = ((R - B) / T) / ((1.0 + R) ** (1.0 / T) - (1.0 + B) ** (1.0 / T))
+        d = rp - rb
+        ss = float(d @ d)
+        coef = M + ((R - B - M * d.sum()) / ss * d if ss > 0 else 0.0)
+    else:
+        raise ValueError(f"method must be one of {LINKING_METHODS}, got {method!r}")
+    return pd.Series(np.broadcast_to(coef, rp.shape).astype(float), index=portfolio_returns.index)
+
+
+def linked_attribution(
+    weights: Union[pd.DataFrame, SectorValues],
+    asset_returns: pd.DataFrame,
+    sectors: SectorValues,
+    benchmark_weights: Union[pd.DataFrame, SectorValues],
+    benchmark_returns: pd.DataFrame,
+    method: str = "carino",
+    selection_weight: str = "benchmark",
+) -> AttributionResult:
+    """Brinson-Fachler over a daily history, linked into period totals.
+
+    Arguments are as for ``brinson_fachler_history``. Returns
+    -------
+    AttributionResult whose ``sectors`` table has the linked Allocation,
+    Selection, Interaction and Total effects and average weights per
+    sector (fractions), and whose ``summary`` reconciles them to the
+    compounded portfolio and benchmark returns.
+    """
+    daily = brinson_fachler_history(weights, asset_returns, sectors, benchmark_weights,
+                                    benchmark_returns, selection_weight)
+    port, bench = daily['portfolio_return'], daily['benchmark_return']
+    coef = linking_coefficients(port, bench, method).to_numpy()[:, None]
+    linked = {k: (daily[k].to_numpy() * coef).sum(axis=0)
+              for k in ('allocation', 'selection', 'interaction')}
+    names = daily['allocation'].columns
+    table = pd.DataFrame({
+        'Sector': names,
+        'Portfolio Weight': daily['portfolio_weight'].mean().to_numpy(),
+        'Benchmark Weight': daily['benchmark_weight'].mean().to_numpy(),
+        'Allocation Effect': linked['allocation'],
+        'Selection Effect': linked['selection'],
+        'Interaction Effect': linked['interaction'],
+    })
+    table['Total Effect'] = table[['Allocation Effect', 'Selection Effect', 'Interaction Effect']].sum(axis=1)
+    table = table.sort_values('Total Effect', ascending=False, ignore_index=True)
+
+    R = float(np.prod(1.0 + port.to_numpy()) - 1.0)
+    B = float(np.prod(1.0 + bench.to_numpy()) - 1.0)
+    totals = {k: float(v.sum()) for k, v in linked.items()}
+    summary = {
+        'portfolio_return': R,
+        'benchmark_return': B,
+        'active_return': R - B,
+        'allocation_effect': totals['allocation'],
+        'selection_effect': totals['selection'],
+        'interaction_effect': totals['interaction'],
+        'residual': R - B - sum(totals.values()),
+    }
+    return AttributionResult(
+        sectors=table,
+        allocation=daily['allocation'],
+        selection=daily['selection'],
+        interaction=daily['interaction'],
+        portfolio_returns=port,
+        benchmark_returns=bench,
+        coefficients=pd.Series(coef[:, 0], index=port.index),
+        method=method,
+        summary=summary,
+    )
@@ -0,0 +1,438 @@
+"""
+ATLAS Terminal - Vectorized Backtest Engine
+===========================================
+Pure computation module for backtesting weight schedules on a price
+matrix.
+
+Holdings are bought at the close of each rebalance date and drift with
+prices until the next one. Between rebalances the unit holdings are
+constant, so the engine only steps through rebalance dates (O(assets)
+each). The daily value path is then one gather and multiply over the
+whole (dates x assets) matrix.
+
+Rebalances pay transaction costs in basis points of traded value and SA
+capital gains tax. The rates default to those of analytics/transition
+(25 bps, 18% effective CGT). CGT is either charged on realised gains,
+using average-cost basis with losses carried forward, or conservatively
+on the full sell value as in the transition planner.
+
+``walk_forward`` re-estimates target weights on a trailing window at each
+rebalance, using any optimizer in core/optimizers, PMGradeOptimizer or a
+callable. The re-solves are independent, so they fan out over a process
+pool.
+"""
+from __future__ import annotations
+
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Callable, Dict, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+TRADING_DAYS = 252
+CGT_MODES = ("realised", "conservative")
+# Post-cost value fixed point: relative tolerance and iteration cap
+COST_TOL = 1e-12
+COST_MAX_ITER = 100
+# Re-solves below this count run in-process (pool start-up costs more)
+MIN_PARALLEL_SOLVES = 8
+
+WeightsLike = Union[pd.DataFrame, pd.Series, Dict[str, float]]
+Optimizer = Union[str, Callable[[pd.DataFrame], Union[pd.Series, np.ndarray, Dict[str, float]]]]
+
+
+# ---------------------------------------------------------------------------
+# Data classes
+# ---------------------------------------------------------------------------
+
+@dataclass
+class BacktestResult:
+    """Daily paths and per-rebalance trading costs of one backtest."""
+    returns: pd.Series           # daily return net of costs and CGT
+    gross_returns: pd.Series     # daily return before costs and CGT
+    value: pd.Series             # portfolio value at each close
+    weights: pd.DataFrame        # drifted end-of-day weights
+    trades: pd.DataFrame         # signed traded value per asset, rebalance dates
+    turnover: pd.Series          # one-way turnover (fraction of value) per rebalance
+    transaction_costs: pd.Series # currency, per rebalance
+    cgt: pd.Series               # currency, per rebalance
+    summary: Dict[str, float] = field(default_factory=dict)
+
+
+# ---------------------------------------------------------------------------
+# Schedules
+# ---------------------------------------------------------------------------
+
+def rebalance_dates(index: pd.DatetimeIndex, freq: Union[str, int, None]) -> pd.DatetimeIndex:
+    """First trading date of each period.
+
+    Parameters
+    ----------
+    index : DatetimeIndex
+        Trading dates.
+    freq : str, int or None
+        'D', 'W', 'M', 'Q' or 'Y' (pandas period codes), an integer number of
+        trading days, or None / 'never' for buy-and-hold (first date only).
+    """
+    if len(index) == 0:
+        return index
+    if freq is None or freq == "never":
+        return index[:1]
+    if isinstance(freq, (int, np.integer)):
+        if freq < 1:
+            raise ValueError(f"Rebalance interval must be positive, got {freq}")
+        return index[::int(freq)]
+    if freq == "D":
+        return index
+    periods = index.to_period(freq)
+    first = np.r_[True, periods[1:] != periods[:-1]]
+    return index[first]
+
+
+def weight_schedule(
+    weights: WeightsLike,
+    index: pd.DatetimeIndex,
+    rebalance: Union[str, int, None] = "M",
+) -> pd.DataFrame:
+    """Normalise weights into a (rebalance dates x assets) schedule.
+
+    A DataFrame is used as-is: each row is applied at the close of its
+    date, or the next trading date if that is not in ``index``. A static
+    Series / dict target is repeated on every ``rebalance`` date.
+    """
+    if isinstance(weights, pd.DataFrame):
+        schedule = weights.sort_index()
+        positions = index.searchsorted(schedule.index)
+        keep = positions < len(index)
+        schedule = schedule[keep]
+        schedule.index = index[positions[keep]]
+        return schedule[~schedule.index.duplicated(keep="last")]
+    target = pd.Series(weights, dtype=float)
+    dates = rebalance_dates(index, rebalance)
+    return pd.DataFrame(np.tile(target.to_numpy(), (len(dates), 1)),
+                        index=dates, columns=target.index)
+
+
+# ---------------------------------------------------------------------------
+# Core calculation
+# ---------------------------------------------------------------------------
+
+def run_backtest(
+    prices: pd.DataFrame,
+    weights: WeightsLike,
+    rebalance: Union[str, int, None] = "M",
+    initial_value: float = 1.0,
+    cost_bps: float = 25.0,
+    cgt_rate: float = 0.18,
+    cgt_mode: str = "realised",
+    risk_free_rate: float = 0.0,
+) -> BacktestResult:
+    """Backtest a weight schedule on a price matrix.
+
+    Parameters
+    ----------
+    prices : DataFrame
+        Close prices, dates x assets. Missing prices are forward-filled;
+        assets without a price yet must not be given weight.
+    weights : DataFrame, Series or dict
+        A schedule of target weights (rows = rebalance dates), or one static
+        target applied on every ``rebalance`` date. Weights summing below
+        one leave the remainder in cash (earning nothing).
+    rebalance : str, int or None
+        Rebalance frequency for a static target; see ``rebalance_dates``.
+    initial_value : float
+        Starting portfolio value, invested at the first rebalance.
+    cost_bps : float
+        Transaction cost in basis points of traded value (default 25).
+    cgt_rate : float
+        Effective capital gains tax rate (default 0.18 for SA CGT).
+    cgt_mode : str
+        'realised' taxes realised gains net of carried-forward losses
+        (average-cost basis); 'conservative' taxes the full sell value,
+        as analytics/transition does.
+    risk_free_rate : float
+        Annual rate used for the Sharpe ratio in ``summary``.
+
+    Returns
+    -------
+    BacktestResult
+    """
+    if cgt_mode not in CGT_MODES:
+        raise ValueError(f"cgt_mode must be one of {CGT_MODES}, got {cgt_mode!r}")
+    prices = prices.sort_index().ffill()
+    schedule = weight_schedule(weights, prices.index, rebalance)
+    schedule = schedule.reindex(columns=prices.columns, fill_value=0.0).fillna(0.0)
+    if schedule.empty:
+        raise ValueError("Weight schedule has no dates inside the price history")
+
+    start = prices.index.get_loc(schedule.index[0])
+    prices = prices.iloc[start:]
+    price_matrix = prices.to_numpy(dtype=float)
+    target = schedule.to_numpy(dtype=float)
+    rebal_rows = prices.index.get_indexer(schedule.index)
+    unpriced = (target != 0) & ~np.isfinite(price_matrix[rebal_rows])
+    if unpriced.any():
+        row, col = np.argwhere(unpriced)[0]
+        raise ValueError(
+            f"Weight on {prices.columns[col]} at {schedule.index[row].date()} but it has no price yet"
+        )
+
+    n_rebal, n_assets = target.shape
+    cost_rate = cost_bps / 10_000
+    units_by_seg = np.zeros((n_rebal, n_assets))
+    cash_by_seg = np.zeros(n_rebal)
+    trades = np.zeros((n_rebal, n_assets))
+    txn_costs = np.zeros(n_rebal)
+    taxes = np.zeros(n_rebal)
+    turnover = np.zeros(n_rebal)
+
+    units = np.zeros(n_assets)
+    basis = np.zeros(n_assets)     # total cost basis per asset
+    cash = float(initial_value)
+    loss_carry = 0.0
+    for k, row in enumerate(rebal_rows):
+        px = np.nan_to_num(price_matrix[row])
+        held = units * px
+        value_pre = cash + held.sum()
+        w = target[k]
+
+        # Costs are paid out of the portfolio, so the traded amounts depend
+        # on the post-cost value; iterate the fixed point until it settles.
+        value_post = value_pre
+        for _ in range(COST_MAX_ITER):
+            trade = w * value_post - held
+            sells = np.maximum(-trade, 0.0)
+            txn = cost_rate * np.abs(trade).sum()
+            if cgt_mode == "conservative":
+                tax, carry = cgt_rate * sells.sum(), loss_carry
+            else:
+                with np.errstate(invalid="ignore", divide="ignore"):
+                    avg_cost = np.where(units > 0, basis / units, 0.0)
+                    sold_units = np.where(px > 0, sells / px, 0.0)
+                gains = (sells - sold_units * avg_cost).sum() + loss_carry
+                tax, carry = (cgt_rate * gains, 0.0) if gains > 0 else (0.0, gains)
+            settled = value_pre - txn - tax
+            if abs(settled - value_post) <= COST_TOL * max(abs(value_pre), 1.0):
+                value_post = settled
+                break
+            value_post = settled
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            new_units = np.where(px > 0, w * value_post / px, 0.0)
+        if cgt_mode == "realised":
+            sold = np.maximum(units - new_units, 0.0)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                basis -= np.where(units > 0, basis * sold / units, 0.0)
+            basis += np.maximum(new_units - units, 0.0) * px
+        loss_carry = carry
+        units = new_units
+        cash = value_post - (units * px).sum()
+
+        units_by_seg[k], cash_by_seg[k] = units, cash
+        trades[k] = trade
+        txn_costs[k], taxes[k] = txn, tax
+        turnover[k] = np.abs(trade).sum() / 2.0 / value_pre if value_pre > 0 else 0.0
+
+    # Daily paths: each date holds the units of the latest rebalance at or before it
+    seg = np.searchsorted(rebal_rows, np.arange(len(prices)), side="right") - 1
+    filled = np.nan_to_num(price_matrix)
+    holdings = units_by_seg[seg] * filled
+    value = holdings.sum(axis=1) + cash_by_seg[seg]
+    pre_trade = (units_by_seg[seg[:-1]] * filled[1:]).sum(axis=1) + cash_by_seg[seg[:-1]]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        net = np.r_[value[0] / initial_value - 1.0, value[1:] / value[:-1] - 1.0]
+        gross = np.r_[0.0, pre_trade / value[:-1] - 1.0]
+        drifted = holdings / value[:, None]
+
+    index = prices.index
+    rebal_index = schedule.index
+    result = BacktestResult(
+        returns=pd.Series(net, index=index, name="net_return"),
+        gross_returns=pd.Series(gross, index=index, name="gross_return"),
+        value=pd.Series(value, index=index, name="portfolio_value"),
+        weights=pd.DataFrame(drifted, index=index, columns=prices.columns),
+        trades=pd.DataFrame(trades, index=rebal_index, columns=prices.columns),
+        turnover=pd.Series(turnover, index=rebal_index, name="turnover"),
+        transaction_costs=pd.Series(txn_costs, index=rebal_index, name="transaction_cost"),
+        cgt=pd.Series(taxes, index=rebal_index, name="cgt"),
+    )
+    result.summary = summarize(result, initial_value, risk_free_rate)
+    return result
+
+
+def summarize(result: BacktestResult, initial_value: float = 1.0,
+              risk_free_rate: float = 0.0) -> Dict[str, float]:
+    """Headline statistics for a backtest."""
+    r = result.returns.to_numpy()
+    value = result.value.to_numpy()
+    years = max(len(r) - 1, 1) / TRADING_DAYS
+    total = value[-1] / initial_value - 1.0
+    vol = float(np.std(r[1:], ddof=1) * np.sqrt(TRADING_DAYS)) if len(r) > 2 else 0.0
+    cagr = (value[-1] / initial_value) ** (1.0 / years) - 1.0 if value[-1] > 0 else -1.0
+    peak = np.maximum.accumulate(value)
+    costs = float(result.transaction_costs.sum())
+    cgt = float(result.cgt.sum())
+    # Annualised return lost to costs and CGT: gross vs net compounding
+    growth_ratio = np.prod(1.0 + result.gross_returns.to_numpy()) / max(value[-1] / initial_value, 1e-12)
+    return {
+        "total_return": float(total),
+        "cagr": float(cagr),
+        "volatility": vol,
+        "sharpe": float((cagr - risk_free_rate) / vol) if vol > 0 else 0.0,
+        "max_drawdown": float((value / peak - 1.0).min()),
+        "rebalances": int(len(result.turnover)),
+        "annual_turnover": float(result.turnover.iloc[1:].sum() / years),
+        "total_transaction_cost": costs,
+        "total_cgt": cgt,
+        "cost_drag_bps": float((growth_ratio ** (1.0 / years) - 1.0) * 10_000),
+    }
+
+
+# ---------------------------------------------------------------------------
+# Walk-forward re-optimisation
+# ---------------------------------------------------------------------------
+
+def _named_optimizer(name: str, window: pd.DataFrame, **kwargs) -> pd.Series:
+    """Solve one window with a core/optimizers strategy or PMGradeOptimizer."""
+    if name == "equal_weight":
+        return pd.Series(1.0 / window.shape[1], index=window.columns)
+    if name == "pm_grade":
+        from portfolio_tools.atlas_pm_optimization import PMGradeOptimizer
+        sector_map = kwargs.pop("sector_map", None)
+        result = PMGradeOptimizer(window, sector_map).optimize(**kwargs)
+        return pd.Series(result["weights"], index=window.columns)
+
+    from core import optimizers
+    solvers = {
+        "max_sharpe": optimizers.optimize_max_sharpe,
+        "min_volatility": optimizers.optimize_min_volatility,
+        "max_return": optimizers.optimize_max_return,
+        "risk_parity": optimizers.optimize_risk_parity,
+    }
+    if name not in solvers:
+        raise ValueError(f"Unknown optimizer {name!r}. Options: {sorted(solvers) + ['equal_weight', 'pm_grade']}")
+    if name == "max_sharpe":
+        kwargs.setdefault("risk_free_rate", 0.0)
+    return solvers[name](window, **kwargs)
+
+
+def resolve_optimizer(optimizer: Optimizer, **kwargs) -> Callable[[pd.DataFrame], pd.Series]:
+    """Callable ``window -> weights`` for a strategy name or a callable.
+
+    Names: 'max_sharpe', 'min_volatility', 'max_return', 'risk_parity'
+    (core/optimizers), 'pm_grade' (PMGradeOptimizer; pass ``strategy`` /
+    ``sector_map``) and 'equal_weight'. Keyword arguments go to the
+    optimizer. The result pickles, so it can run in pool workers, as long
+    as a callable passed in is a module-level function.
+    """
+    if isinstance(optimizer, str):
+        return partial(_named_optimizer, optimizer, **kwargs)
+    return partial(optimizer, **kwargs) if kwargs else optimizer
+
+
+# Per-worker state: the full return matrix is shipped once per process
+_WORKER_RETURNS: Optional[pd.DataFrame] = None
+
+
+def _init_worker(returns: pd.DataFrame):
+    global _WORKER_RETURNS
+    _WORKER_RETURNS = returns
+
+
+def _solve_window(solver, lookback: int, min_history: float, row: int, returns=None):
+    """Optimise on the ``lookback`` returns ending at ``row``; None on failure."""
+    returns = _WORKER_RETURNS if returns is None else returns
+    window = returns.iloc[max(row - lookback + 1, 0):row + 1]
+    # Only assets with (nearly) full history in the window are eligible
+    eligible = window.columns[window.notna().mean() >= min_history]
+    if len(eligible) == 0:
+        return None
+    try:
+        weights = solver(window[eligible].fillna(0.0))
+    except Exception as e:
+        logger.warning(f"[Backtest] Re-optimisation failed at {returns.index[row].date()}: {e}")
+        return None
+    weights = pd.Series(weights, index=eligible if not isinstance(weights, (pd.Series, dict)) else None,
+                        dtype=float)
+    return weights.reindex(returns.columns, fill_value=0.0).to_numpy()
+
+
+def walk_forward(
+    prices: pd.DataFrame,
+    optimizer: Optimizer,
+    lookback: int = TRADING_DAYS,
+    rebalance: Union[str, int] = "M",
+    processes: Optional[int] = None,
+    min_history: float = 0.95,
+    optimizer_kwargs: Optional[Dict] = None,
+    **backtest_kwargs,
+) -> BacktestResult:
+    """Walk-forward backtest: re-optimise on trailing data at every rebalance.
+
+    At each rebalance date the optimizer sees only the ``lookback`` daily
+    returns up to and including that date. Its weights are applied at that
+    close. Dates with less than ``lookback`` returns of history are skipped,
+    as are failed solves, so the previous weights are held instead.
+
+    Parameters
+    ----------
+    prices : DataFrame
+        Close prices, dates x assets.
+    optimizer : str or callable
+        See ``resolve_optimizer``.
+    lookback : int
+        Estimation window in trading days.
+    rebalance : str or int
+        Re-optimisation frequency; see ``rebalance_dates``.
+    processes : int, optional
+        Worker processes for the re-solves (default: CPU count; 1 = serial).
+    min_history : float
+        Fraction of the window an asset needs prices for to be eligible.
+    optimizer_kwargs : dict, optional
+        Passed to the optimizer.
+    **backtest_kwargs
+        Passed to ``run_backtest`` (costs, CGT, initial value).
+    """
+    prices = prices.sort_index().ffill()
+    returns = prices.pct_change(fill_method=None).iloc[1:]
+    solver = resolve_optimizer(optimizer, **(optimizer_kwargs or {}))
+    dates = rebalance_dates(returns.index, rebalance)
+    rows = [r for r in returns.index.get_indexer(dates) if r >= lookback - 1]
+    if not rows:
+        raise ValueError(f"Price history is shorter than the {lookback}-day lookback")
+
+    solutions = _solve_all(solver, returns, rows, lookback, min_history, processes)
+    schedule = {returns.index[row]: w for row, w in zip(rows, solutions) if w is not None}
+    if not schedule:
+        raise ValueError("Every re-optimisation failed; nothing to backtest")
+    schedule = pd.DataFrame.from_dict(schedule, orient="index", columns=prices.columns)
+    return run_backtest(prices, schedule, **backtest_kwargs)
+
+
+def _solve_all(solver, returns, rows, lookback, min_history, processes) -> List[Optional[np.ndarray]]:
+    processes = processes or os.cpu_count() or 1
+    task = partial(_solve_window, solver, lookback, min_history)
+    if processes <= 1 or len(rows) < MIN_PARALLEL_SOLVES:
+        return [task(row, returns) for row in rows]
+    workers = min(processes, len(rows))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(returns,)) as pool:
+        return list(pool.map(task, rows, chunksize=max(1, len(rows) // (4 * workers))))
+
+
+def compare_strategies(
+    prices: pd.DataFrame,
+    strategies: Dict[str, Optimizer],
+    **walk_forward_kwargs,
+) -> pd.DataFrame:
+    """Walk-forward each strategy on the same prices; one summary row per strategy."""
+    rows = {}
+    for name, optimizer in strategies.items():
+        rows[name] = walk_forward(prices, optimizer, **walk_forward_kwargs).summary
+    return pd.DataFrame.from_dict(rows, orient="index")
@@ -0,0 +1,389 @@
+"""
+ATLAS Terminal - Copula Dependency Engine
+=========================================
+Joint-tail scenario generation without an R runtime:
+
+    gaussian   dependence of correlated normals, no tail dependence
+    t          Student-t copula, symmetric tail dependence (joint crashes
+               and joint rallies) that grows as the degrees of freedom fall
+    clayton    exchangeable Archimedean copula, lower-tail dependence only
+
+``fit_copula`` splits a returns frame into marginals and dependence:
+
+    marginals  'empirical'  each asset's own historical return distribution
+               'garch'      GARCH-filtered: standardised residuals from
+                            ``analytics.volatility.fit_garch``, rescaled to
+                            each asset's next-day volatility
+    copula     fitted by pseudo-likelihood on the ranks of the (filtered)
+               returns, rank / (n + 1), so the marginals never enter the fit
+
+The Gaussian correlation is the correlation of normal scores; the t
+copula profiles its likelihood over the degrees of freedom; Clayton's
+theta maximises the exchangeable density. All likelihoods are evaluated
+on the whole sample at once.
+
+``CopulaFit.simulate`` draws scenarios in chunks, so millions of joint
+scenarios never sit in memory as one scenarios x assets array, and
+``portfolio_returns`` reduces them to the one-dimensional arrays the
+VaR/CVaR and probability outputs already consume. Empirical marginals are
+inverted by interpolating the historical quantiles, so simulated
+returns stay within each asset's observed range.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+from scipy import optimize, special, stats
+from scipy.linalg import solve_triangular
+
+COPULAS = ("gaussian", "t", "clayton")
+COPULA_ALIASES = {"gaussian": "gaussian", "normal": "gaussian", "t": "t", "student": "t",
+                  "student-t": "t", "clayton": "clayton"}
+MARGINALS = ("empirical", "garch")
+DEFAULT_CHUNK = 250_000
+# Profile grid for the t copula's degrees of freedom (refined between grid points)
+_DF_GRID = (2.5, 3.0, 4.0, 5.0, 6.0, 8.0, 10.0, 15.0, 20.0, 30.0, 50.0, 100.0)
+_THETA_BOUNDS = (1e-4, 30.0)
+_U_CLIP = 1e-12
+
+
+def _family(family: str) -> str:
+    try:
+        return COPULA_ALIASES[family.lower()]
+    except KeyError:
+        raise ValueError(f"copula must be one of {COPULAS}, got {family!r}") from None
+
+
+def pseudo_observations(X: np.ndarray) -> np.ndarray:
+    """Column-wise ranks scaled to (0, 1): rank / (n + 1), ties averaged."""
+    X = np.asarray(X, dtype=float)
+    return stats.rankdata(X, axis=0) / (X.shape[0] + 1.0)
+
+
+def _correlation(scores: np.ndarray) -> np.ndarray:
+    """Correlation matrix of ``scores``, repaired to positive definite if needed."""
+    R = np.atleast_2d(np.corrcoef(scores, rowvar=False))
+    vals, vecs = np.linalg.eigh(R)
+    if vals.min() < 1e-8:
+        R = (vecs * np.maximum(vals, 1e-8)) @ vecs.T
+        d = np.sqrt(np.diag(R))
+        R = R / np.outer(d, d)
+    return R
+
+
+# ---------------------------------------------------------------------------
+# Pseudo log-likelihoods (sum over the sample)
+# ---------------------------------------------------------------------------
+
+def _mahalanobis(x: np.ndarray, L: np.ndarray):
+    """(x' R^-1 x per row, log |R|) from the Cholesky factor of R."""
+    y = solve_triangular(L, x.T, lower=True)
+    return (y ** 2).sum(axis=0), 2.0 * np.log(np.diag(L)).sum()
+
+
+def _gaussian_loglik(U: np.ndarray, R: np.ndarray) -> float:
+    z = special.ndtri(U)
+    quad, logdet = _mahalanobis(z, np.linalg.cholesky(R))
+    return float(-0.5 * len(z) * logdet - 0.5 * (quad - (z ** 2).sum(axis=1)).sum())
+
+
+def _t_loglik(U: np.ndarray, df: float, R: Optional[np.ndarray] = None):
+    """t copula pseudo-loglik at ``df``; R defaults to the correlation of the t scores."""
+    x = special.stdtrit(df, U)
+    R = _correlation(x) if R is None else R
+    n, d = x.shape
+    quad, logdet = _mahalanobis(x, np.linalg.cholesky(R))
+    const = (special.gammaln((df + d) / 2.0) + (d - 1) * special.gammaln(df / 2.0)
+             - d * special.gammaln((df + 1.0) / 2.0) - 0.5 * logdet)
+    ll = (n * const - (df + d) / 2.0 * np.log1p(quad / df).sum()
+          + (df + 1.0) / 2.0 * np.log1p(x ** 2 / df).sum())
+    return float(ll), R
+
+
+def _clayton_loglik(log_u: np.ndarray, theta: float) -> float:
+    """d-dimensional Clayton density on log pseudo-observations."""
+    n, d = log_u.shape
+    s = np.exp(-theta * log_u).sum(axis=1) - d + 1.0
+    return float(n * np.log1p(theta * np.arange(d)).sum()
+                 - (1.0 + theta) * log_u.sum()
+                 - (d + 1.0 / theta) * np.log(s).sum())
+
+
+def _fit_t(U: np.ndarray):
+    """Profile the t copula likelihood over df: grid, then bounded refinement."""
+    grid = [(_t_loglik(U, df)[0], df) for df in _DF_GRID]
+    best = int(np.argmax([ll for ll, _ in grid]))
+    lo = _DF_GRID[max(best - 1, 0)]
+    hi = _DF_GRID[min(best + 1, len(_DF_GRID) - 1)]
+    res = optimize.minimize_scalar(lambda df: -_t_loglik(U, df)[0], bounds=(lo, hi),
+                                   method="bounded", options={"xatol": 1e-3})
+    df = float(res.x) if -res.fun >= grid[best][0] else grid[best][1]
+    ll, R = _t_loglik(U, df)
+    return df, R, ll
+
+
+def _fit_clayton(U: np.ndarray):
+    log_u = np.log(U)
+    res = optimize.minimize_scalar(lambda th: -_clayton_loglik(log_u, th), bounds=_THETA_BOUNDS,
+                                   method="bounded", options={"xatol": 1e-6})
+    return float(res.x), -float(res.fun)
+
+
+# ---------------------------------------------------------------------------
+# Result
+# ---------------------------------------------------------------------------
+
+@dataclass
+class CopulaFit:
+    """Fitted copula plus the marginals it was fitted over (daily units)."""
+    family: str
+    assets: List[str]
+    marginals: str
+    correlation: Optional[np.ndarray]    # gaussian / t
+    df: Optional[float]                  # t
+    theta: Optional[float]               # clayton
+    loglik: float
+    n_obs: int
+    innovations: np.ndarray              # sorted marginal sample, n_obs x assets
+    location: np.ndarray                 # return = location + scale * innovation
+    scale: np.ndarray
+    _chol: Optional[np.ndarray] = field(default=None, repr=False, compare=False)
+
+    def __post_init__(self):
+        if self.correlation is not None and self._chol is None:
+            self._chol = np.linalg.cholesky(self.correlation)
+
+    @property
+    def n_assets(self) -> int:
+        return len(self.assets)
+
+    @property
+    def n_params(self) -> int:
+        d = self.n_assets
+        if self.family == "clayton":
+            return 1
+        return d * (d - 1) // 2 + (self.family == "t")
+
+    @property
+    def aic(self) -> float:
+        return 2.0 * self.n_params - 2.0 * self.loglik
+
+    # -- dependence summaries --------------------------------------------------
+
+    def kendall_tau(self) -> pd.DataFrame:
+        """Pairwise Kendall's tau implied by the fitted copula."""
+        if self.family == "clayton":
+            tau = np.full((self.n_assets, self.n_assets), self.theta / (self.theta + 2.0))
+            np.fill_diagonal(tau, 1.0)
+        else:
+            tau = 2.0 / np.pi * np.arcsin(self.correlation)
+        return pd.DataFrame(tau, index=self.assets, columns=self.assets)
+
+    def tail_dependence(self) -> pd.DataFrame:
+        """Pairwise lower-tail dependence lim P(U_i < q | U_j < q) as q -> 0."""
+        d = self.n_assets
+        if self.family == "clayton":
+            lam = np.full((d, d), 2.0 ** (-1.0 / self.theta))
+        elif self.family == "t":
+            rho = np.clip(self.correlation, -1.0, 1.0 - 1e-12)
+            lam = 2.0 * special.stdtr(self.df + 1.0, -np.sqrt((self.df + 1.0) * (1.0 - rho) / (1.0 + rho)))
+        else:
+            lam = np.zeros((d, d))
+        np.fill_diagonal(lam, 1.0)
+        return pd.DataFrame(lam, index=self.assets, columns=self.assets)
+
+    def summary(self) -> Dict[str, object]:
+        """Fields the R Analytics page shows (the old ``copula_dependency`` shape)."""
+        params = {"df": self.df} if self.family == "t" else \
+            {"theta": self.theta} if self.family == "clayton" else {}
+        off = ~np.eye(self.n_assets, dtype=bool)
+        params["mean_kendall_tau"] = float(self.kendall_tau().to_numpy()[off].mean())
+        params["mean_lower_tail_dependence"] = float(self.tail_dependence().to_numpy()[off].mean())
+        return {
+            "copula_type": self.family,
+            "marginals": self.marginals,
+            "n_assets": self.n_assets,
+            "n_obs": self.n_obs,
+            "loglik": self.loglik,
+            "aic": self.aic,
+            "parameters": params,
+        }
+
+    # -- simulation ------------------------------------------------------------
+
+    def sample_uniforms(self, n: int, rng=None) -> np.ndarray:
+        """n x assets draws from the copula (uniform marginals)."""
+        rng = np.random.default_rng(rng)
+        d = self.n_assets
+        if self.family == "clayton":
+            # Marshall-Olkin: frailty V ~ Gamma(1/theta), U = (1 + E/V)^(-1/theta)
+            v = rng.gamma(1.0 / self.theta, 1.0, size=(n, 1))
+            return (1.0 + rng.standard_exponential((n, d)) / v) ** (-1.0 / self.theta)
+        z = rng.standard_normal((n, d)) @ self._chol.T
+        if self.family == "gaussian":
+            return special.ndtr(z)
+        w = np.sqrt(rng.chisquare(self.df, size=(n, 1)) / self.df)
+        return special.stdtr(self.df, z / w)
+
+    def normal_scores(self, n: int, rng=None) -> np.ndarray:
+        """Copula draws mapped to standard normal marginals (drop-in for correlated N(0, 1))."""
+        return special.ndtri(np.clip(self.sample_uniforms(n, rng), _U_CLIP, 1.0 - _U_CLIP))
+
+    def quantile(self, U: np.ndarray) -> np.ndarray:
+        """Invert the fitted marginals: uniforms -> returns (interpolated historical quantiles)."""
+        n = self.innovations.shape[0]
+        pos = np.clip(U * (n + 1.0) - 1.0, 0.0, n - 1.0)
+        lo = np.minimum(pos.astype(np.intp), n - 2)
+        frac = pos - lo
+        cols = np.arange(self.n_assets)
+        below = self.innovations[lo, cols]
+        z = below + frac * (self.innovations[lo + 1, cols] - below)
+        return self.location + self.scale * z
+
+    def simulate(self, n: int, chunk_size: int = DEFAULT_CHUNK, rng=None) -> Iterator[np.ndarray]:
+        """Yield n one-day joint return scenarios in chunks of at most ``chunk_size`` x assets."""
+        rng = np.random.default_rng(rng)
+        for start in range(0, n, chunk_size):
+            yield self.quantile(self.sample_uniforms(min(chunk_size, n - start), rng))
+
+    def portfolio_returns(
+        self,
+        weights,
+        n: int,
+        chunk_size: int = DEFAULT_CHUNK,
+        rng=None,
+        location: Optional[np.ndarray] = None,
+        scale: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """n simulated one-period portfolio returns, built chunk by chunk.
+
+        With ``location``/``scale`` the marginals are normal with those
+        parameters instead of the fitted ones, so an engine can keep its
+        own marginal assumptions and take only the dependence from here.
+        """
+        w = self._weights(weights)
+        rng = np.random.default_rng(rng)
+        out = np.empty(n)
+        for start in range(0, n, chunk_size):
+            m = min(chunk_size, n - start)
+            if location is None and scale is None:
+                chunk = self.quantile(self.sample_uniforms(m, rng))
+            else:
+                loc = 0.0 if location is None else np.asarray(location, dtype=float)
+                sc = 1.0 if scale is None else np.asarray(scale, dtype=float)
+                chunk = loc + sc * self.normal_scores(m, rng)
+            out[start:start + m] = chunk @ w
+        return out
+
+    def value_at_risk(self, weights, confidence: float = 0.95, n: int = 1_000_000,
+                      chunk_size: int = DEFAULT_CHUNK, rng=None) -> Dict[str, float]:
+        """One-day VaR / CVaR of the portfolio from ``n`` copula scenarios (positive = loss)."""
+        port = self.portfolio_returns(weights, n, chunk_size, rng)
+        cutoff = np.quantile(port, 1.0 - confidence)
+        return {
+            "var": float(-cutoff),
+            "cvar": float(-port[port <= cutoff].mean()),
+            "confidence": confidence,
+            "n_scenarios": n,
+            "method": f"copula-{self.family}",
+        }
+
+    def joint_crash_probability(self, q: float = 0.05, n: int = 1_000_000,
+                                chunk_size: int = DEFAULT_CHUNK, rng=None) -> float:
+        """P(every asset falls below its own q-quantile on the same day)."""
+        rng = np.random.default_rng(rng)
+        hits = 0
+        for start in range(0, n, chunk_size):
+            hits += int((self.sample_uniforms(min(chunk_size, n - start), rng) < q).all(axis=1).sum())
+        return hits / n
+
+    def _weights(self, weights) -> np.ndarray:
+        if isinstance(weights, pd.Series):
+            weights = weights.reindex(self.assets).fillna(0.0)
+        w = np.asarray(weights, dtype=float).ravel()
+        if len(w) != self.n_assets:
+            raise ValueError(f"expected {self.n_assets} weights, got {len(w)}")
+        return w
+
+
+# ---------------------------------------------------------------------------
+# Fitting
+# ---------------------------------------------------------------------------
+
+def fit_copula(
+    returns: pd.DataFrame,
+    family: str = "t",
+    marginals: str = "empirical",
+    garch_model: str = "garch",
+) -> CopulaFit:
+    """Fit a ``family`` copula to the columns of ``returns``.
+
+    Parameters
+    ----------
+    returns : DataFrame
+        Daily returns (dates x assets). Rows with any NaN are dropped so
+        every observation is a joint one.
+    family : {'gaussian', 't', 'clayton'} ('normal' accepted)
+    marginals : {'empirical', 'garch'}
+        'garch' fits ``garch_model`` per asset first and models the
+        dependence of the standardised residuals.
+
+    Returns
+    -------
+    CopulaFit
+    """
+    family = _family(family)
+    if marginals not in MARGINALS:
+        raise ValueError(f"marginals must be one of {MARGINALS}, got {marginals!r}")
+    frame = returns.astype(float)
+    if frame.shape[1] < 2:
+        raise ValueError("a copula needs at least 2 assets")
+
+    if marginals == "garch":
+        from analytics.volatility import fit_garch
+        garch = fit_garch(frame, garch_model)
+        sample = (garch.residuals / garch.conditional_volatility).dropna()
+        location = garch.params["mean"].to_numpy()
+        scale = np.sqrt(garch.next_variance.to_numpy())
+    else:
+        sample = frame.dropna()
+        location = np.zeros(frame.shape[1])
+        scale = np.ones(frame.shape[1])
+    X = sample.to_numpy()
+    n, d = X.shape
+    if n < max(20, d + 2):
+        raise ValueError(f"need at least {max(20, d + 2)} joint observations, got {n}")
+
+    U = pseudo_observations(X)
+    R = df = theta = None
+    if family == "gaussian":
+        R = _correlation(special.ndtri(U))
+        ll = _gaussian_loglik(U, R)
+    elif family == "t":
+        df, R, ll = _fit_t(U)
+    else:
+        theta, ll = _fit_clayton(U)
+
+    return CopulaFit(
+        family=family,
+        assets=list(frame.columns),
+        marginals=marginals,
+        correlation=R,
+        df=df,
+        theta=theta,
+        loglik=ll,
+        n_obs=n,
+        innovations=np.sort(X, axis=0),
+        location=location,
+        scale=scale,
+    )
+
+
+def resolve_copula(copula: Union[str, CopulaFit, None], returns: pd.DataFrame) -> Optional[CopulaFit]:
+    """Engines accept a fitted copula, a family name to fit on their returns, or None."""
+    if copula is None or isinstance(copula, CopulaFit):
+        return copula
+    return fit_copula(returns, copula)
@@ -0,0 +1,262 @@
+"""
+ATLAS Terminal - Covariance Estimators
+======================================
+Pure computation module: one place for the covariance estimators the
+optimisers, risk pages and simulators use.
+
+Estimators (all on a dates x assets returns frame, per-period units)
+
+    sample        pandas ``DataFrame.cov()`` (ddof=1, pairwise NaN handling)
+    ledoit_wolf   shrinkage toward a scaled identity, closed-form intensity
+                  (Ledoit & Wolf 2004; same result as sklearn's LedoitWolf)
+    ewma          RiskMetrics exponentially weighted covariance (zero mean),
+                  with an ``EWMAState`` that updates one day at a time
+    factor        statistical (PCA) factor model  B B' + diag(D)
+
+A ``CovarianceEstimate`` carries the result. Factor estimates keep only
+the n x k loadings and n specific variances, so portfolio variance,
+matrix-vector products and simulation draws are O(nk). The dense n x n
+matrix is only materialised when ``.values`` is asked for.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+ESTIMATORS = ("sample", "ledoit_wolf", "ewma", "factor")
+RISKMETRICS_LAMBDA = 0.94
+DEFAULT_FACTORS = 10
+
+
+# ---------------------------------------------------------------------------
+# Result
+# ---------------------------------------------------------------------------
+
+@dataclass
+class CovarianceEstimate:
+    """Covariance of ``assets`` as of ``as_of`` (dense or factor-structured)."""
+    assets: List[str]
+    estimator: str
+    as_of: Optional[pd.Timestamp] = None
+    n_obs: int = 0
+    dense: Optional[np.ndarray] = None          # n x n, or None for factor form
+    loadings: Optional[np.ndarray] = None       # n x k (factor covariance = I)
+    specific: Optional[np.ndarray] = None       # n specific variances
+    params: Dict[str, float] = field(default_factory=dict)
+    _chol: Optional[np.ndarray] = field(default=None, repr=False, compare=False)
+
+    @property
+    def n_assets(self) -> int:
+        return len(self.assets)
+
+    @property
+    def is_factor(self) -> bool:
+        return self.dense is None
+
+    @property
+    def values(self) -> np.ndarray:
+        """Dense n x n matrix (built from the factors on first use)."""
+        if self.dense is None:
+            self.dense = self.loadings @ self.loadings.T + np.diag(self.specific)
+        return self.dense
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame(self.values, index=self.assets, columns=self.assets)
+
+    def diag(self) -> np.ndarray:
+        if self.dense is not None:
+            return np.diag(self.dense).copy()
+        return np.einsum('ij,ij->i', self.loadings, self.loadings) + self.specific
+
+    def scaled(self, factor: float) -> "CovarianceEstimate":
+        """The same estimate in other units, e.g. ``scaled(252)`` to annualise daily."""
+        return CovarianceEstimate(
+            assets=list(self.assets), estimator=self.estimator, as_of=self.as_of, n_obs=self.n_obs,
+            dense=None if self.dense is None else self.dense * factor,
+            loadings=None if self.loadings is None else self.loadings * np.sqrt(factor),
+            specific=None if self.specific is None else self.specific * factor,
+            params=dict(self.params, scale=self.params.get('scale', 1.0) * factor),
+        )
+
+    def matvec(self, weights) -> np.ndarray:
+        """Sigma @ w (O(nk) for factor estimates)."""
+        w = np.asarray(weights, dtype=float)
+        if self.dense is not None:
+            return self.dense @ w
+        return self.loadings @ (self.loadings.T @ w) + self.specific * w
+
+    def variance(self, weights) -> float:
+        """w' Sigma w."""
+        w = np.asarray(weights, dtype=float)
+        return float(w @ self.matvec(w))
+
+    def cholesky(self, jitter: float = 1e-8) -> np.ndarray:
+        """Lower Cholesky factor L (L L' = Sigma), cached.
+
+        A matrix that is not numerically positive definite gets ``jitter``
+        added to its diagonal, growing tenfold until the factorisation
+        succeeds (the fallback the simulators have always used).
+        """
+        if self._chol is None:
+            sigma = self.values
+            try:
+                self._chol = np.linalg.cholesky(sigma)
+            except np.linalg.LinAlgError:
+                eye = np.eye(self.n_assets)
+                for attempt in range(8):
+                    try:
+                        self._chol = np.linalg.cholesky(sigma + eye * jitter * 10 ** attempt)
+                        break
+                    except np.linalg.LinAlgError:
+                        continue
+                else:
+                    raise
+        return self._chol
+
+    def simulate(self, n_draws: int, rng: Optional[np.random.Generator] = None) -> np.ndarray:
+        """Zero-mean normal draws with this covariance, shape (n_draws, n)."""
+        rng = rng or np.random.default_rng()
+        if self.dense is None:
+            k = self.loadings.shape[1]
+            common = rng.standard_normal((n_draws, k)) @ self.loadings.T
+            return common + rng.standard_normal((n_draws, self.n_assets)) * np.sqrt(self.specific)
+        return rng.standard_normal((n_draws, self.n_assets)) @ self.cholesky().T
+
+
+# ---------------------------------------------------------------------------
+# Estimators
+# ---------------------------------------------------------------------------
+
+def _frame(returns) -> pd.DataFrame:
+    return returns if isinstance(returns, pd.DataFrame) else pd.DataFrame(np.asarray(returns, dtype=float))
+
+
+def _as_of(returns: pd.DataFrame) -> Optional[pd.Timestamp]:
+    if len(returns) and isinstance(returns.index, pd.DatetimeIndex):
+        return returns.index[-1]
+    return None
+
+
+def sample_covariance(returns) -> CovarianceEstimate:
+    """Sample covariance, identical to ``returns.cov()``."""
+    df = _frame(returns)
+    X = df.to_numpy(dtype=float)
+    if np.isnan(X).any():
+        dense = df.cov().to_numpy()
+    else:
+        dense = np.cov(X, rowvar=False, ddof=1).reshape(X.shape[1], X.shape[1])
+    return CovarianceEstimate(list(df.columns), "sample", _as_of(df), len(df), dense=dense)
+
+
+def ledoit_wolf(returns) -> CovarianceEstimate:
+    """Ledoit-Wolf shrinkage toward mu * I (mu = average variance).
+
+    Uses the maximum-likelihood (1/n) empirical covariance, as sklearn
+    does; missing values count as the column mean.
+    """
+    df = _frame(returns)
+    X = df.to_numpy(dtype=float)
+    X = X - np.nanmean(X, axis=0)
+    X = np.nan_to_num(X)
+    n, p = X.shape
+    emp = X.T @ X / n
+    mu = np.trace(emp) / p
+    X2 = X ** 2
+    delta_ = float(np.sum(emp ** 2))
+    beta_ = float(np.sum(X2.T @ X2))
+    beta = (beta_ / n - delta_) / (p * n)
+    delta = (delta_ - 2.0 * mu * np.trace(emp) + p * mu ** 2) / p
+    beta = min(beta, delta)
+    shrinkage = 0.0 if beta == 0 else beta / delta
+    dense = (1.0 - shrinkage) * emp
+    dense.flat[::p + 1] += shrinkage * mu
+    return CovarianceEstimate(list(df.columns), "ledoit_wolf", _as_of(df), n, dense=dense,
+                              params={'shrinkage': float(shrinkage)})
+
+
+@dataclass
+class EWMAState:
+    """Running RiskMetrics covariance: S = sum(l^(T-t) r r') / sum(l^(T-t)).
+
+    ``update`` folds in new days in O(n^2) each, giving exactly the batch
+    result over the longer history.
+    """
+    assets: List[str]
+    lam: float
+    cov: np.ndarray
+    weight_sum: float = 0.0
+    n_obs: int = 0
+    as_of: Optional[pd.Timestamp] = None
+
+    @classmethod
+    def from_returns(cls, returns, lam: float = RISKMETRICS_LAMBDA) -> "EWMAState":
+        df = _frame(returns)
+        X = np.nan_to_num(df.to_numpy(dtype=float))
+        decay = lam ** np.arange(len(X) - 1, -1, -1, dtype=float)
+        weight_sum = float(decay.sum())
+        Xw = X * np.sqrt(decay)[:, None]
+        cov = Xw.T @ Xw / weight_sum if weight_sum else np.zeros((X.shape[1], X.shape[1]))
+        return cls(list(df.columns), lam, cov, weight_sum, len(df), _as_of(df))
+
+    def update(self, returns) -> "EWMAState":
+        """Fold in the rows of ``returns`` (oldest first); returns self."""
+        df = _frame(returns)
+        if list(df.columns) != self.assets:
+            df = df.reindex(columns=self.assets)
+        for r in np.nan_to_num(df.to_numpy(dtype=float)):
+            new_sum = self.lam * self.weight_sum + 1.0
+            self.cov = (self.lam * self.weight_sum * self.cov + np.outer(r, r)) / new_sum
+            self.weight_sum = new_sum
+        self.n_obs += len(df)
+        as_of = _as_of(df)
+        if as_of is not None:
+            self.as_of = as_of
+        return self
+
+    def estimate(self) -> CovarianceEstimate:
+        return CovarianceEstimate(list(self.assets), "ewma", self.as_of, self.n_obs,
+                                  dense=self.cov.copy(), params={'lam': self.lam})
+
+
+def ewma_covariance(returns, lam: float = RISKMETRICS_LAMBDA) -> CovarianceEstimate:
+    """RiskMetrics EWMA covariance (zero mean, decay ``lam``)."""
+    return EWMAState.from_returns(returns, lam).estimate()
+
+
+def factor_covariance(returns, n_factors: int = DEFAULT_FACTORS,
+                      min_specific: float = 1e-10) -> CovarianceEstimate:
+    """Statistical factor model from the top principal components.
+
+    Loadings are the leading ``n_factors`` components of the sample
+    covariance (unit-variance factors); each asset's specific variance is
+    what the factors leave of its sample variance, floored at
+    ``min_specific``. Nothing n x n is formed.
+    """
+    df = _frame(returns)
+    X = df.to_numpy(dtype=float)
+    X = np.nan_to_num(X - np.nanmean(X, axis=0))
+    n, p = X.shape
+    k = int(max(1, min(n_factors, p, n - 1)))
+    _, s, vt = np.linalg.svd(X, full_matrices=False)
+    loadings = vt[:k].T * (s[:k] / np.sqrt(n - 1))
+    total = np.einsum('ij,ij->j', X, X) / (n - 1)
+    specific = np.maximum(total - np.einsum('ij,ij->i', loadings, loadings), min_specific)
+    explained = float((s[:k] ** 2).sum() / (s ** 2).sum()) if s.size and (s ** 2).sum() else 0.0
+    return CovarianceEstimate(list(df.columns), "factor", _as_of(df), n, loadings=loadings,
+                              specific=specific, params={'n_factors': k, 'explained': explained})
+
+
+def estimate_covariance(returns, estimator: str = "sample", **params) -> CovarianceEstimate:
+    """Dispatch to one of ESTIMATORS."""
+    if estimator == "sample":
+        return sample_covariance(returns)
+    if estimator == "ledoit_wolf":
+        return ledoit_wolf(returns)
+    if estimator == "ewma":
+        return ewma_covariance(returns, **params)
+    if estimator == "factor":
+        return factor_covariance(returns, **params)
+    raise ValueError(f"estimator must be one of {ESTIMATORS}, got {estimator!r}")
@@ -14,7 +14,10 @@ Version: 1.0.0
 """
 
 from typing import Dict, Optional
-from regime_detector import QuantitativeRegimeDetector
+try:
+    from regime_detector import QuantitativeRegimeDetector
+except ImportError:
+    from analytics.regime_detector import QuantitativeRegimeDetector
 
 
 class DCFRegimeOverlay:
@@ -77,7 +80,8 @@ class DCFRegimeOverlay:
         self,
         baseline_wacc: float,
         baseline_terminal_growth: float,
-        apply_adjustments: bool = True
+        apply_adjustments: bool = True,
+        regime_info: Optional[Dict] = None
     ) -> Dict:
         """
         Detect market regime and apply adjustments to DCF inputs.
@@ -86,6 +90,8 @@ class DCFRegimeOverlay:
             baseline_wacc: Baseline WACC (e.g., 0.10 = 10%)
             baseline_terminal_growth: Baseline terminal growth (e.g., 0.025 = 2.5%)
             apply_adjustments: If False, just detect regime but don't adjust
+            regime_info: Already-detected regime (``detect_regime()`` output),
+                e.g. one snapshot shared across a batch; detected if omitted
 
         Returns:
             {
@@ -102,7 +108,8 @@ class DCFRegimeOverlay:
             }
         """
         # Detect market regime
-        regime_info = self.regime_detector.detect_regime()
+        if regime_info is None:
+            regime_info = self.regime_detector.detect_regime()
         regime = regime_info['regime']
 
         # Get adjustments for this regime
@@ -25,6 +25,72 @@ except ImportError:
     YIELD_FETCHER_AVAILABLE = False
 
 
+# Shared with the batch screener (analytics/dcf_trap_screener.py)
+GDP_GROWTH = 0.025  # Long-term US GDP growth ~2.5%
+
+# Rough industry WACC benchmarks
+INDUSTRY_WACC_BENCHMARKS = {
+    'Software': 0.10,
+    'Technology': 0.11,
+    'Biotechnology': 0.12,
+    'Pharmaceuticals': 0.09,
+    'Banks': 0.08,
+    'Utilities': 0.07,
+    'Real Estate': 0.08,
+    'Retail': 0.09,
+    'Energy': 0.10,
+}
+
+# High-risk industries for customer concentration
+HIGH_CONCENTRATION_INDUSTRIES = [
+    'Aerospace & Defense',  # Government contracts
+    'Auto Parts',  # OEM dependency
+    'Semiconductors',  # Few large customers
+]
+
+# Mature, slow-growth industries
+MATURE_INDUSTRIES = [
+    'Utilities',
+    'Tobacco',
+    'Beverages',
+    'Packaged Foods',
+    'Railroads',
+]
+
+LOW_BETA_SECTORS = ['Utilities', 'Consumer Defensive']
+
+
+def fetch_treasury_10y() -> Optional[float]:
+    """
+    Current 10-year Treasury yield as a decimal (None if unavailable).
+
+    Primary: YieldDataFetcher (FRED -> Yahoo -> fallback); fallback: ^TNX.
+    """
+    try:
+        if YIELD_FETCHER_AVAILABLE:
+            fetcher = YieldDataFetcher()
+            yields = fetcher.get_current_yields()
+            val_10y = yields.get('10Y')
+            if val_10y is not None and 0 < val_10y < 15:
+                return val_10y / 100  # Convert to decimal
+
+        tnx = yf.Ticker("^TNX")
+        raw = tnx.history(period='5d')['Close'].iloc[-1]
+        if 0 < raw < 15:
+            return raw / 100
+    except Exception:
+        pass
+    return None
+
+
+def chronological_revenue(financials: pd.DataFrame) -> pd.Series:
+    """Total Revenue oldest -> newest (yfinance lists the newest column first)."""
+    if financials is None or financials.empty or 'Total Revenue' not in financials.index:
+        return pd.Series(dtype=float)
+    revenues = pd.to_numeric(financials.loc['Total Revenue'], errors='coerce').dropna()
+    return revenues.sort_index()
+
+
 @dataclass
 class TrapWarning:
     """Container for trap detection results"""
@@ -61,7 +127,9 @@ class DCFTrapDetector:
     5. Absence of Critical Factor
     """
 
-    def __init__(self, ticker: str, dcf_inputs: Dict[str, Any]):
+    def __init__(self, ticker: str, dcf_inputs: Dict[str, Any],
+                 fundamentals: Optional[Dict[str, Any]] = None,
+                 treasury_10y: Optional[float] = None):
         """
         Initialize trap detector
 
@@ -77,10 +145,22 @@ class DCFTrapDetector:
                 - enterprise_value: Calculated enterprise value
                 - current_price: Current stock price
                 - fair_value: Calculated fair value
+            fundamentals: Pre-loaded {'info', 'financials', 'balance_sheet',
+                'cashflow'} (see dcf_trap_screener.load_fundamentals); fetched
+                from yfinance if omitted
+            treasury_10y: Shared 10Y yield (decimal); fetched if omitted
         """
         self.ticker = ticker
         self.dcf_inputs = dcf_inputs
         self.warnings: List[TrapWarning] = []
+        self.treasury_10y = treasury_10y
+
+        if fundamentals is not None:
+            self.info = fundamentals.get('info') or {}
+            self.financials = fundamentals.get('financials', pd.DataFrame())
+            self.balance_sheet = fundamentals.get('balance_sheet', pd.DataFrame())
+            self.cashflow = fundamentals.get('cashflow', pd.DataFrame())
+            return
 
         # Fetch company data
         try:
@@ -142,22 +222,9 @@ class DCFTrapDetector:
 
         # Flag 1: WACC vs Risk-Free Rate
         try:
-            treasury_10y = None
-
-            # Primary: YieldDataFetcher (FRED -> Yahoo -> fallback)
-            if YIELD_FETCHER_AVAILABLE:
-                fetcher = YieldDataFetcher()
-                yields = fetcher.get_current_yields()
-                val_10y = yields.get('10Y')
-                if val_10y is not None and 0 < val_10y < 15:
-                    treasury_10y = val_10y / 100  # Convert to decimal
-
-            # Fallback: Direct Yahoo
-            if treasury_10y is None:
-                tnx = yf.Ticker("^TNX")
-                raw = tnx.history(period='5d')['Close'].iloc[-1]
-                if 0 < raw < 15:
-                    treasury_10y = raw / 100
+            if self.treasury_10y is None:
+                self.treasury_10y = fetch_treasury_10y()
+            treasury_10y = self.treasury_10y
 
             if treasury_10y is not None:
                 metrics['treasury_10y'] = treasury_10y
@@ -178,7 +245,7 @@ class DCFTrapDetector:
             metrics['sector'] = sector
 
             # Non-utility stocks with beta < 0.8 are suspicious
-            if beta < 0.8 and sector not in ['Utilities', 'Consumer Defensive']:
+            if beta < 0.8 and sector not in LOW_BETA_SECTORS:
                 flags.append(f"Suspiciously low beta ({beta:.2f}) for {sector} sector")
 
         # Flag 3: Leverage analysis
@@ -202,20 +269,7 @@ class DCFTrapDetector:
         if industry:
             metrics['industry'] = industry
 
-            # Rough industry WACC benchmarks
-            industry_waccs = {
-                'Software': 0.10,
-                'Technology': 0.11,
-                'Biotechnology': 0.12,
-                'Pharmaceuticals': 0.09,
-                'Banks': 0.08,
-                'Utilities': 0.07,
-                'Real Estate': 0.08,
-                'Retail': 0.09,
-                'Energy': 0.10,
-            }
-
-            for ind_name, benchmark_wacc in industry_waccs.items():
+            for ind_name, benchmark_wacc in INDUSTRY_WACC_BENCHMARKS.items():
                 if ind_name.lower() in industry.lower():
                     metrics['industry_benchmark_wacc'] = benchmark_wacc
 
@@ -287,7 +341,7 @@ class DCFTrapDetector:
             flags.append(f"Terminal value is {tv_percent:.1f}% of enterprise value (approaching danger zone)")
 
         # Flag 2: Terminal growth vs GDP
-        gdp_growth = 0.025  # Long-term US GDP growth ~2.5%
+        gdp_growth = GDP_GROWTH
         metrics['gdp_growth'] = gdp_growth
         metrics['terminal_growth_rate'] = terminal_growth
 
@@ -296,21 +350,20 @@ class DCFTrapDetector:
 
         # Flag 3: Terminal growth vs historical growth
         try:
-            if not self.financials.empty and 'Total Revenue' in self.financials.index:
-                revenues = self.financials.loc['Total Revenue'].dropna()
+            revenues = chronological_revenue(self.financials)
 
-                if len(revenues) >= 3:
-                    # Calculate historical CAGR
-                    years = len(revenues) - 1
-                    historical_cagr = (revenues.iloc[-1] / revenues.iloc[0]) ** (1/years) - 1
+            if len(revenues) >= 3:
+                # Calculate historical CAGR
+                years = len(revenues) - 1
+                historical_cagr = (revenues.iloc[-1] / revenues.iloc[0]) ** (1/years) - 1
 
-                    metrics['historical_revenue_cagr'] = historical_cagr
+                metrics['historical_revenue_cagr'] = historical_cagr
 
-                    if terminal_growth > historical_cagr and historical_cagr < 0.05:
-                        flags.append(
-                            f"Terminal growth ({terminal_growth:.2%}) exceeds historical CAGR ({historical_cagr:.2%}) "
-                            f"despite slowing growth trend"
-                        )
+                if terminal_growth > historical_cagr and historical_cagr < 0.05:
+                    flags.append(
+                        f"Terminal growth ({terminal_growth:.2%}) exceeds historical CAGR ({historical_cagr:.2%}) "
+                        f"despite slowing growth trend"
+                    )
         except:
             pass
 
@@ -423,14 +476,7 @@ class DCFTrapDetector:
         sector = self.info.get('sector', '')
         industry = self.info.get('industry', '')
 
-        # High-risk industries for customer concentration
-        high_concentration_industries = [
-            'Aerospace & Defense',  # Government contracts
-            'Auto Parts',  # OEM dependency
-            'Semiconductors',  # Few large customers
-        ]
-
-        for high_risk_ind in high_concentration_industries:
+        for high_risk_ind in HIGH_CONCENTRATION_INDUSTRIES:
             if high_risk_ind.lower() in industry.lower():
                 flags.append(f"{industry} sector typically has high customer concentration risk")
                 metrics['industry_risk'] = 'HIGH'
@@ -569,8 +615,9 @@ class DCFTrapDetector:
             market_cap = self.info.get('marketCap', 0)
 
             try:
-                if not self.financials.empty and 'Total Revenue' in self.financials.index:
-                    current_revenue = self.financials.loc['Total Revenue'].iloc[0]
+                revenues = chronological_revenue(self.financials)
+                if len(revenues):
+                    current_revenue = revenues.iloc[-1]
 
                     if current_revenue > 0:
                         ps_ratio = market_cap / current_revenue
@@ -666,26 +713,25 @@ class DCFTrapDetector:
 
         # Check for turnaround assumptions
         try:
-            if not self.financials.empty and 'Total Revenue' in self.financials.index:
-                revenues = self.financials.loc['Total Revenue'].dropna()
+            revenues = chronological_revenue(self.financials)
 
-                if len(revenues) >= 3:
-                    # Calculate historical growth
-                    recent_growth = (revenues.iloc[-1] / revenues.iloc[-2]) - 1 if revenues.iloc[-2] != 0 else 0
+            if len(revenues) >= 3:
+                # Calculate historical growth
+                recent_growth = (revenues.iloc[-1] / revenues.iloc[-2]) - 1 if revenues.iloc[-2] != 0 else 0
 
-                    metrics['recent_revenue_growth'] = recent_growth
+                metrics['recent_revenue_growth'] = recent_growth
 
-                    # Check if projections assume turnaround from declining revenues
-                    revenue_projections = self.dcf_inputs.get('revenue_projections', [])
+                # Check if projections assume turnaround from declining revenues
+                revenue_projections = self.dcf_inputs.get('revenue_projections', [])
 
-                    if recent_growth < 0 and len(revenue_projections) >= 2:
-                        projected_growth = (revenue_projections[1] / revenue_projections[0]) - 1
+                if recent_growth < 0 and len(revenue_projections) >= 2:
+                    projected_growth = (revenue_projections[1] / revenue_projections[0]) - 1
 
-                        if projected_growth > 0.05:  # Assumes >5% growth
-                            flags.append(
-                                f"Model assumes turnaround to {projected_growth:.1%} growth "
-                                f"from recent {recent_growth:.1%} decline without clear catalyst"
-                            )
+                    if projected_growth > 0.05:  # Assumes >5% growth
+                        flags.append(
+                            f"Model assumes turnaround to {projected_growth:.1%} growth "
+                            f"from recent {recent_growth:.1%} decline without clear catalyst"
+                        )
         except:
             pass
 
@@ -693,16 +739,7 @@ class DCFTrapDetector:
         industry = self.info.get('industry', '')
         sector = self.info.get('sector', '')
 
-        # Mature, slow-growth industries
-        mature_industries = [
-            'Utilities',
-            'Tobacco',
-            'Beverages',
-            'Packaged Foods',
-            'Railroads',
-        ]
-
-        is_mature = any(mature_ind.lower() in industry.lower() for mature_ind in mature_industries)
+        is_mature = any(mature_ind.lower() in industry.lower() for mature_ind in MATURE_INDUSTRIES)
 
         if is_mature:
             revenue_projections = self.dcf_inputs.get('revenue_projections', [])
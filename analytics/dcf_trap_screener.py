@@ -0,0 +1,691 @@
+"""
+ATLAS DCF TRAP SCREENER
+=======================
+Batch mode for the DCF trap detector and regime overlay: every holding and
+watchlist name in one run.
+
+1. One macro snapshot per run (10Y Treasury + market regime), shared by
+   every name instead of one yield fetch and regime detection per company
+2. One fundamentals load per ticker (info, income statement, balance sheet,
+   cash flow), concurrent and kept in the persistent cache for a day
+3. A fundamentals table (one row per ticker) with a standard 5-year DCF per
+   name, or the caller's own DCF inputs where a saved model exists
+4. The five trap checks of DCFTrapDetector as vectorized column rules, and
+   the regime overlay's WACC / terminal growth shifts on every row
+5. A SQLite flags table with change tracking: when each trap first fired,
+   when it escalated, and when it cleared
+
+Usage:
+    from analytics.dcf_trap_screener import screen_dcf_traps, TrapFlagStore, screening_universe
+
+    screen = screen_dcf_traps(screening_universe(portfolio_df, watchlist))
+    changes = TrapFlagStore().record(screen)
+
+Author: ATLAS v11.0
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from analytics.dcf_trap_detector import (
+    GDP_GROWTH, HIGH_CONCENTRATION_INDUSTRIES, INDUSTRY_WACC_BENCHMARKS, LOW_BETA_SECTORS,
+    MATURE_INDUSTRIES, chronological_revenue, fetch_treasury_10y,
+)
+
+_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_DB_PATH = Path(os.environ.get("ATLAS_TRAP_FLAGS_DB", _ROOT / "data" / "traps" / "trap_flags.sqlite3"))
+BUSY_TIMEOUT = 30.0
+FUNDAMENTALS_TTL = 24 * 3600
+
+# Standard DCF used when a name has no saved model
+EQUITY_RISK_PREMIUM = 0.055
+CREDIT_SPREAD = 0.02
+TAX_RATE = 0.21
+PROJECTION_YEARS = 5
+BASE_TERMINAL_GROWTH = GDP_GROWTH
+DEFAULT_RISK_FREE = 0.04
+
+TRAP_TYPES = ('DISCOUNT_RATE_ILLUSION', 'TERMINAL_VALUE_DEPENDENCY', 'REVENUE_CONCENTRATION',
+              'IDIOSYNCRATIC_OPTIONALITY', 'ABSENCE_OF_CATALYST')
+SEVERITY_ORDER = {'CRITICAL': 0, 'HIGH': 1, 'MEDIUM': 2, 'LOW': 3}
+
+INFO_FIELDS = ('sector', 'industry', 'beta', 'marketCap', 'currentPrice', 'regularMarketPrice',
+               'sharesOutstanding', 'shortName')
+
+
+# ============================================================
+# INPUTS
+# ============================================================
+
+@dataclass
+class MacroSnapshot:
+    """Market inputs shared by every name in a run."""
+    treasury_10y: Optional[float]
+    regime_info: Dict[str, Any]
+    captured_at: datetime = field(default_factory=datetime.now)
+
+    @property
+    def regime(self) -> str:
+        return self.regime_info.get('regime', 'neutral')
+
+    @classmethod
+    def capture(cls) -> 'MacroSnapshot':
+        """Fetch the 10Y yield and detect the market regime once."""
+        try:
+            from analytics.regime_detector import QuantitativeRegimeDetector
+            regime_info = QuantitativeRegimeDetector().detect_regime()
+        except Exception as e:
+            regime_info = {'regime': 'neutral', 'regime_label': 'NEUTRAL', 'error': str(e)}
+        return cls(treasury_10y=fetch_treasury_10y(), regime_info=regime_info)
+
+
+def load_fundamentals(ticker: str, fetch: bool = True) -> Optional[Dict[str, Any]]:
+    """
+    info (trimmed to the fields the checks use), financials, balance sheet
+    and cash flow for one ticker: one ``yf.Ticker`` per day, via the
+    persistent cache. Returns None if nothing could be loaded.
+    """
+    ticker = ticker.upper().strip()
+    try:
+        from atlas_terminal.core.cache_manager import cache_manager
+    except Exception:
+        cache_manager = None
+    key = cache_manager.get_cache_key('dcf_fundamentals', ticker) if cache_manager is not None else None
+    if cache_manager is not None:
+        cached = cache_manager.get(key, ttl=FUNDAMENTALS_TTL)
+        if cached is not None:
+            return cached
+    if not fetch:
+        return None
+
+    import yfinance as yf
+    stock = yf.Ticker(ticker)
+    try:
+        info = stock.info or {}
+    except Exception:
+        info = {}
+    fundamentals = {'info': {k: info.get(k) for k in INFO_FIELDS if info.get(k) is not None}}
+    for name in ('financials', 'balance_sheet', 'cashflow'):
+        try:
+            frame = getattr(stock, name)
+        except Exception:
+            frame = None
+        fundamentals[name] = frame if isinstance(frame, pd.DataFrame) else pd.DataFrame()
+    if not fundamentals['info'] and all(fundamentals[n].empty for n in ('financials', 'balance_sheet', 'cashflow')):
+        return None
+    if cache_manager is not None:
+        cache_manager.set(key, fundamentals, persist=True, ttl=FUNDAMENTALS_TTL)
+    return fundamentals
+
+
+def screening_universe(portfolio_df: Optional[pd.DataFrame] = None,
+                       watchlist: Optional[Iterable] = None) -> List[str]:
+    """Unique tickers from holdings (``Ticker``/``Symbol`` column) and watchlist entries."""
+    tickers = []
+    if portfolio_df is not None and not portfolio_df.empty:
+        column = next((c for c in ('Ticker', 'Symbol', 'ticker', 'symbol') if c in portfolio_df.columns), None)
+        if column is not None:
+            tickers += portfolio_df[column].dropna().astype(str).tolist()
+    for entry in watchlist or []:
+        tickers.append(entry.get('ticker', '') if isinstance(entry, dict) else str(entry))
+    return list(dict.fromkeys(t.upper().strip() for t in tickers if t and t.strip()))
+
+
+def _latest(frame: pd.DataFrame, item: str) -> float:
+    """Most recent value of a statement line (yfinance: newest column first)."""
+    if frame is None or frame.empty or item not in frame.index:
+        return np.nan
+    row = pd.to_numeric(frame.loc[item], errors='coerce').dropna()
+    return float(row.sort_index().iloc[-1]) if len(row) else np.nan
+
+
+def fundamentals_row(fundamentals: Dict[str, Any]) -> Dict[str, Any]:
+    """The fundamentals-table columns for one ticker's loaded data."""
+    info = fundamentals.get('info') or {}
+    financials = fundamentals.get('financials', pd.DataFrame())
+    balance_sheet = fundamentals.get('balance_sheet', pd.DataFrame())
+    revenues = chronological_revenue(financials)
+    n = len(revenues)
+    debt = _latest(balance_sheet, 'Total Debt')
+    equity = _latest(balance_sheet, 'Stockholders Equity')
+    # Missing lines count as no debt / unit equity, as in the detector
+    debt_to_equity = np.nan_to_num(debt) / (1.0 if np.isnan(equity) else equity) if equity != 0 else 0.0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cagr = (revenues.iloc[-1] / revenues.iloc[0]) ** (1 / (n - 1)) - 1 if n >= 3 else np.nan
+        recent = revenues.iloc[-1] / revenues.iloc[-2] - 1 if n >= 3 and revenues.iloc[-2] != 0 else np.nan
+    return {
+        'name': info.get('shortName', ''),
+        'sector': info.get('sector', '') or '',
+        'industry': info.get('industry', '') or '',
+        'beta': info.get('beta', np.nan),
+        'market_cap': info.get('marketCap', np.nan),
+        'current_price': info.get('currentPrice', info.get('regularMarketPrice', np.nan)),
+        'shares': info.get('sharesOutstanding', np.nan),
+        'revenue': float(revenues.iloc[-1]) if n else np.nan,
+        'revenue_years': n,
+        'revenue_cagr': float(cagr),
+        'recent_revenue_growth': float(recent),
+        'free_cash_flow': _latest(fundamentals.get('cashflow', pd.DataFrame()), 'Free Cash Flow'),
+        'debt_to_equity': debt_to_equity,
+        'net_debt': np.nan_to_num(debt) - np.nan_to_num(_latest(balance_sheet, 'Cash And Cash Equivalents')),
+    }
+
+
+# ============================================================
+# STANDARD DCF (VECTORIZED)
+# ============================================================
+
+def _pad(rows: List[List[float]]) -> np.ndarray:
+    width = max((len(r) for r in rows), default=0)
+    out = np.full((len(rows), width), np.nan)
+    for i, r in enumerate(rows):
+        out[i, :len(r)] = r
+    return out
+
+
+def standard_projections(table: pd.DataFrame, years: int = PROJECTION_YEARS):
+    """
+    Revenue and FCF projections for every row: historical growth (clipped
+    to -5%..25%) fading linearly to terminal growth, at the current FCF margin.
+    """
+    g0 = table['revenue_cagr'].fillna(0.05).clip(-0.05, 0.25).to_numpy()
+    fade = np.linspace(0.0, 1.0, years)
+    growth = g0[:, None] + (BASE_TERMINAL_GROWTH - g0)[:, None] * fade[None, :]
+    revenue = table['revenue'].to_numpy()[:, None] * np.cumprod(1 + growth, axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        margin = np.clip(table['free_cash_flow'].to_numpy() / table['revenue'].to_numpy(), -0.5, 0.6)
+    return revenue, revenue * np.nan_to_num(margin)[:, None]
+
+
+def dcf_values(fcf: np.ndarray, wacc: np.ndarray, terminal_growth: np.ndarray):
+    """
+    Enterprise value and PV of terminal value for NaN-padded FCF rows.
+
+    Returns (enterprise_value, pv_terminal) arrays.
+    """
+    n = (~np.isnan(fcf)).sum(axis=1)
+    t = np.arange(1, fcf.shape[1] + 1)
+    w = np.maximum(wacc, terminal_growth + 0.005)        # keep the Gordon denominator positive
+    discount = (1 + w)[:, None] ** t[None, :]
+    pv_fcf = np.nansum(fcf / discount, axis=1)
+    last = fcf[np.arange(len(fcf)), np.maximum(n - 1, 0)] if fcf.shape[1] else np.zeros(len(fcf))
+    pv_terminal = last * (1 + terminal_growth) / (w - terminal_growth) / (1 + w) ** n
+    pv_terminal = np.where(n > 0, pv_terminal, 0.0)
+    return pv_fcf + pv_terminal, pv_terminal
+
+
+def _projection_features(revenue: np.ndarray, fcf: np.ndarray) -> Dict[str, np.ndarray]:
+    """Per-row projection shape (margins, growth path) from NaN-padded arrays."""
+    rows = np.arange(len(revenue))
+    n = (~np.isnan(revenue)).sum(axis=1)
+    last = np.maximum(n - 1, 0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        r0, f0 = revenue[:, 0], fcf[:, 0]
+        r_last, f_last = revenue[rows, last], fcf[rows, last]
+        initial_margin = np.where(r0 != 0, f0 / r0, 0.0)
+        final_margin = np.where(r_last != 0, f_last / r_last, 0.0)
+        prev = revenue[:, :-1]
+        growth = np.where(prev != 0, revenue[:, 1:] / prev - 1, np.nan)
+        cagr = (r_last / r0) ** (1 / np.maximum(n - 1, 1)) - 1
+    valid = ~np.isnan(growth)
+    k = valid.sum(axis=1)
+    early = np.nanmean(np.where(np.arange(growth.shape[1])[None, :] < 2, growth, np.nan), axis=1) \
+        if growth.shape[1] else np.full(len(revenue), np.nan)
+    # Mean of the last two valid growth rates
+    late_idx = np.stack([np.maximum(k - 2, 0), np.maximum(k - 1, 0)], axis=1) if growth.shape[1] else None
+    late = growth[rows[:, None], late_idx].mean(axis=1) if late_idx is not None else np.full(len(revenue), np.nan)
+    return {
+        'projection_years': n,
+        'initial_fcf_margin': initial_margin,
+        'final_fcf_margin': final_margin,
+        'projected_cagr': cagr,
+        'first_year_growth': growth[:, 0] if growth.shape[1] else np.full(len(revenue), np.nan),
+        'early_growth': early,
+        'late_growth': late,
+        'growth_rates': k,
+        'high_growth_years': (np.nan_to_num(growth, nan=-1) > 0.30).sum(axis=1),
+    }
+
+
+def build_fundamentals_table(fundamentals: Dict[str, Dict[str, Any]], macro: MacroSnapshot,
+                             dcf_inputs: Optional[Dict[str, Dict[str, Any]]] = None) -> pd.DataFrame:
+    """
+    One row per ticker: fundamentals, DCF inputs, projection features and
+    the regime-adjusted valuation.
+
+    ``dcf_inputs`` maps tickers to ``analyze_dcf_traps``-style inputs (saved
+    Valuation House models); other names get the standard DCF.
+    """
+    dcf_inputs = {k.upper(): v for k, v in (dcf_inputs or {}).items()}
+    table = pd.DataFrame.from_dict({t: fundamentals_row(f) for t, f in fundamentals.items()}, orient='index')
+    if table.empty:
+        return table
+    table.index.name = 'ticker'
+    for col in ('beta', 'market_cap', 'current_price', 'shares'):
+        table[col] = pd.to_numeric(table[col], errors='coerce')
+
+    rf = macro.treasury_10y if macro.treasury_10y is not None else DEFAULT_RISK_FREE
+    de = table['debt_to_equity'].clip(lower=0).to_numpy()
+    debt_weight = np.clip(de / (1 + de), 0.0, 0.8)
+    cost_of_equity = rf + table['beta'].fillna(1.0).to_numpy() * EQUITY_RISK_PREMIUM
+    wacc = (1 - debt_weight) * cost_of_equity + debt_weight * (rf + CREDIT_SPREAD) * (1 - TAX_RATE)
+    terminal_growth = np.full(len(table), BASE_TERMINAL_GROWTH)
+    revenue, fcf = standard_projections(table)
+    source = np.array(['standard'] * len(table), dtype=object)
+
+    # Saved models replace the standard DCF for their rows
+    overrides = [i for i, t in enumerate(table.index) if t in dcf_inputs]
+    if overrides:
+        rev_rows, fcf_rows = list(revenue), list(fcf)
+        for i in overrides:
+            inputs = dcf_inputs[table.index[i]]
+            wacc[i] = inputs.get('wacc', wacc[i]) or wacc[i]
+            terminal_growth[i] = inputs.get('terminal_growth_rate', terminal_growth[i])
+            if inputs.get('revenue_projections') and inputs.get('fcf_projections'):
+                rev_rows[i] = np.asarray(inputs['revenue_projections'], dtype=float)
+                fcf_rows[i] = np.asarray(inputs['fcf_projections'], dtype=float)
+            source[i] = 'model'
+        revenue, fcf = _pad(rev_rows), _pad(fcf_rows)
+
+    enterprise_value, pv_terminal = dcf_values(fcf, wacc, terminal_growth)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        fair_value = (enterprise_value - table['net_debt'].to_numpy()) / table['shares'].to_numpy()
+    table['dcf_source'] = source
+    table['wacc'] = wacc
+    table['terminal_growth_rate'] = terminal_growth
+    table['enterprise_value'] = enterprise_value
+    table['terminal_value'] = pv_terminal
+    table['fair_value'] = fair_value
+    for i in overrides:
+        inputs = dcf_inputs[table.index[i]]
+        for col in ('enterprise_value', 'terminal_value', 'fair_value', 'current_price'):
+            if inputs.get(col):
+                table.iloc[i, table.columns.get_loc(col)] = inputs[col]
+    for name, values in _projection_features(revenue, fcf).items():
+        table[name] = values
+
+    # Regime overlay: the same bps shifts DCFRegimeOverlay applies, on every row
+    from analytics.dcf_regime_overlay import DCFRegimeOverlay
+    overlay = DCFRegimeOverlay()
+    regime = macro.regime if macro.regime in overlay.wacc_adjustments else 'neutral'
+    table['regime'] = regime
+    table['adjusted_wacc'] = wacc + overlay.wacc_adjustments[regime] / 10000
+    table['adjusted_terminal_growth'] = terminal_growth + overlay.terminal_growth_adjustments[regime] / 10000
+    adjusted_ev, _ = dcf_values(fcf, table['adjusted_wacc'].to_numpy(), table['adjusted_terminal_growth'].to_numpy())
+    with np.errstate(divide='ignore', invalid='ignore'):
+        table['regime_fair_value'] = np.where(
+            table['dcf_source'] == 'model',
+            table['fair_value'] * adjusted_ev / enterprise_value,
+            (adjusted_ev - table['net_debt'].to_numpy()) / table['shares'].to_numpy())
+        table['regime_value_change_pct'] = (table['regime_fair_value'] / table['fair_value'] - 1) * 100
+    return table
+
+
+# ============================================================
+# VECTORIZED TRAP RULES
+# ============================================================
+
+def _contains_any(column: pd.Series, needles: Iterable[str]) -> pd.Series:
+    lowered = column.fillna('').str.lower()
+    hit = pd.Series(False, index=column.index)
+    for needle in needles:
+        hit |= lowered.str.contains(needle.lower(), regex=False)
+    return hit
+
+
+def trap_flags(table: pd.DataFrame, macro: MacroSnapshot) -> Dict[str, pd.DataFrame]:
+    """
+    Boolean red-flag columns per trap, mirroring DCFTrapDetector's checks.
+
+    Returns {trap_type: DataFrame of flag columns (rows = tickers)}.
+    """
+    wacc = table['wacc']
+    tg = table['terminal_growth_rate']
+    industry = table['industry']
+    benchmark = pd.Series(np.nan, index=table.index)
+    for name, value in INDUSTRY_WACC_BENCHMARKS.items():          # first match wins, as in the detector
+        benchmark = benchmark.where(benchmark.notna() | ~_contains_any(industry, [name]), value)
+    ev = table['enterprise_value']
+    tv_pct = table['terminal_value'] / ev.where(ev != 0) * 100
+    n_proj = table['projection_years']
+    margin_ok = n_proj >= 3
+    rf = macro.treasury_10y
+
+    discount = pd.DataFrame({
+        'wacc_below_risk_free_plus_2pct': (wacc < rf + 0.02) if rf is not None else False,
+        'low_beta': (table['beta'] < 0.8) & ~table['sector'].isin(LOW_BETA_SECTORS),
+        'levered_low_wacc': (table['debt_to_equity'] > 1.0) & (wacc < 0.08),
+        'wacc_below_industry': wacc < benchmark - 0.015,
+    }, index=table.index).mul(wacc != 0, axis=0)
+
+    terminal = pd.DataFrame({
+        'terminal_value_share': tv_pct > 70,
+        'terminal_growth_above_gdp': tg > GDP_GROWTH + 0.01,
+        'terminal_growth_above_history': (table['revenue_years'] >= 3) & (tg > table['revenue_cagr'])
+                                         & (table['revenue_cagr'] < 0.05),
+        'margin_expansion': margin_ok & (table['final_fcf_margin'] > table['initial_fcf_margin'] * 1.5),
+    }, index=table.index).mul(ev != 0, axis=0)
+
+    concentration = pd.DataFrame({
+        'concentrated_industry': _contains_any(industry, HIGH_CONCENTRATION_INDUSTRIES),
+    }, index=table.index)
+
+    pharma = (table['sector'] == 'Healthcare') & (industry.str.contains('Biotech', regex=False)
+                                                 | industry.str.contains('Pharmaceutical', regex=False))
+    tech = table['sector'] == 'Technology'
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ps_ratio = table['market_cap'].fillna(0) / table['revenue'].where(table['revenue'] > 0)
+    optionality = pd.DataFrame({
+        'revenue_hockey_stick': pharma & (n_proj >= 4) & (table['growth_rates'] >= 3)
+                                & (table['late_growth'] > table['early_growth'] * 3),
+        'sustained_hypergrowth': tech & (n_proj >= 4) & (table['high_growth_years'] >= 3),
+        'extreme_price_to_sales': tech & (ps_ratio > 15),
+    }, index=table.index)
+
+    catalyst = pd.DataFrame({
+        'margin_expansion_without_catalyst': margin_ok
+                                             & (table['final_fcf_margin'] > table['initial_fcf_margin'] * 1.2),
+        'turnaround_without_catalyst': (table['revenue_years'] >= 3) & (table['recent_revenue_growth'] < 0)
+                                       & (n_proj >= 2) & (table['first_year_growth'] > 0.05),
+        'share_gains_in_mature_industry': _contains_any(industry, MATURE_INDUSTRIES) & margin_ok
+                                          & (table['projected_cagr'] > 0.05),
+    }, index=table.index)
+
+    return {
+        'DISCOUNT_RATE_ILLUSION': discount.fillna(False).astype(bool),
+        'TERMINAL_VALUE_DEPENDENCY': terminal.fillna(False).astype(bool),
+        'REVENUE_CONCENTRATION': concentration.fillna(False).astype(bool),
+        'IDIOSYNCRATIC_OPTIONALITY': optionality.fillna(False).astype(bool),
+        'ABSENCE_OF_CATALYST': catalyst.fillna(False).astype(bool),
+    }
+
+
+def evaluate_traps(table: pd.DataFrame, macro: MacroSnapshot) -> pd.DataFrame:
+    """
+    Fired traps as a long table: ticker, trap_type, severity, confidence,
+    n_flags, flags (comma-separated rule names). Same trigger thresholds,
+    severities and confidences as DCFTrapDetector.
+    """
+    if table.empty:
+        return pd.DataFrame(columns=['ticker', 'trap_type', 'severity', 'confidence', 'n_flags', 'flags'])
+    flags = trap_flags(table, macro)
+    ev = table['enterprise_value']
+    tv_pct = (table['terminal_value'] / ev.where(ev != 0) * 100).to_numpy()
+    frames = []
+    for trap_type, rules in flags.items():
+        n = rules.sum(axis=1).to_numpy()
+        if trap_type == 'DISCOUNT_RATE_ILLUSION':
+            fired = n >= 2
+            severity = np.where(n >= 3, 'CRITICAL', 'HIGH')
+            confidence = np.minimum(0.95, 0.5 + n * 0.15)
+        elif trap_type == 'TERMINAL_VALUE_DEPENDENCY':
+            fired = n >= 1
+            severity = np.select([(tv_pct > 85) | (n >= 3), tv_pct > 75], ['CRITICAL', 'HIGH'], 'MEDIUM')
+            confidence = np.minimum(0.95, 0.6 + n * 0.1)
+        elif trap_type == 'REVENUE_CONCENTRATION':
+            fired = n >= 1
+            severity = np.where(n >= 2, 'HIGH', 'MEDIUM')
+            confidence = np.full(len(n), 0.5)                    # no segment data: heuristic only
+        elif trap_type == 'IDIOSYNCRATIC_OPTIONALITY':
+            fired = n >= 1
+            severity = np.where(n >= 2, 'CRITICAL', 'HIGH')
+            confidence = np.full(len(n), 0.75)
+        else:
+            fired = n >= 2
+            severity = np.where(n >= 3, 'HIGH', 'MEDIUM')
+            confidence = np.full(len(n), 0.65)
+        names = rules.apply(lambda row: ', '.join(row.index[row]), axis=1) if fired.any() else None
+        frames.append(pd.DataFrame({
+            'ticker': table.index[fired], 'trap_type': trap_type, 'severity': severity[fired],
+            'confidence': confidence[fired], 'n_flags': n[fired],
+            'flags': names[fired].to_numpy() if names is not None else [],
+        }))
+    fired = pd.concat(frames, ignore_index=True)
+    fired['_order'] = fired['severity'].map(SEVERITY_ORDER)
+    fired = fired.sort_values(['ticker', '_order', 'confidence'], ascending=[True, True, False])
+    return fired.drop(columns='_order').reset_index(drop=True)
+
+
+@dataclass
+class TrapScreen:
+    """One batch run: inputs, fundamentals table and fired traps."""
+    macro: MacroSnapshot
+    table: pd.DataFrame
+    traps: pd.DataFrame
+    errors: Dict[str, str] = field(default_factory=dict)
+    elapsed: float = 0.0
+
+    @property
+    def tickers(self) -> List[str]:
+        return list(self.table.index)
+
+    def summary(self) -> pd.DataFrame:
+        """One row per screened ticker: trap count, worst severity, regime-adjusted value."""
+        counts = self.traps.groupby('ticker').agg(
+            traps=('trap_type', 'size'),
+            max_severity=('severity', lambda s: min(s, key=SEVERITY_ORDER.get)),
+        )
+        out = self.table[['sector', 'dcf_source', 'wacc', 'adjusted_wacc', 'fair_value', 'regime_fair_value',
+                          'current_price']].join(counts)
+        out['traps'] = out['traps'].fillna(0).astype(int)
+        out['max_severity'] = out['max_severity'].fillna('NONE')
+        order = out['max_severity'].map({**SEVERITY_ORDER, 'NONE': 9})
+        return out.assign(_o=order).sort_values(['_o', 'traps'], ascending=[True, False]).drop(columns='_o')
+
+
+def screen_dcf_traps(
+    tickers: Iterable[str],
+    dcf_inputs: Optional[Dict[str, Dict[str, Any]]] = None,
+    macro: Optional[MacroSnapshot] = None,
+    max_workers: int = 8,
+    fetch: bool = True,
+    loader=None,
+) -> TrapScreen:
+    """
+    Run every trap check and the regime overlay across ``tickers``.
+
+    Args:
+        tickers: Holdings and watchlist names (see ``screening_universe``)
+        dcf_inputs: Optional saved DCF inputs per ticker (``analyze_dcf_traps`` format)
+        macro: Shared macro snapshot; captured once if omitted
+        max_workers: Concurrent fundamentals loads
+        fetch: If False, only names already in the fundamentals cache are screened
+        loader: Fundamentals loader, ``load_fundamentals`` by default
+    """
+    start = time.perf_counter()
+    tickers = list(dict.fromkeys(str(t).upper().strip() for t in tickers if str(t).strip()))
+    macro = macro or MacroSnapshot.capture()
+    if loader is None:
+        def loader(ticker):
+            return load_fundamentals(ticker, fetch=fetch)
+
+    def load(ticker):
+        try:
+            return loader(ticker)
+        except Exception:
+            return None
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(tickers) or 1))) as pool:
+        loaded = dict(zip(tickers, pool.map(load, tickers)))
+    errors = {t: 'No fundamentals available' for t, f in loaded.items() if not f}
+    fundamentals = {t: f for t, f in loaded.items() if f}
+
+    table = build_fundamentals_table(fundamentals, macro, dcf_inputs)
+    traps = evaluate_traps(table, macro)
+    return TrapScreen(macro=macro, table=table, traps=traps, errors=errors, elapsed=time.perf_counter() - start)
+
+
+# ============================================================
+# FLAG HISTORY
+# ============================================================
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS trap_runs (
+    run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_at REAL NOT NULL,
+    regime TEXT,
+    treasury_10y REAL,
+    n_names INTEGER NOT NULL,
+    n_traps INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS trap_flags (
+    ticker TEXT NOT NULL,
+    trap_type TEXT NOT NULL,
+    severity TEXT NOT NULL,
+    confidence REAL NOT NULL,
+    flags TEXT NOT NULL,
+    first_fired REAL NOT NULL,
+    first_run INTEGER NOT NULL,
+    last_seen REAL NOT NULL,
+    last_run INTEGER NOT NULL,
+    cleared_at REAL,
+    active INTEGER NOT NULL,
+    PRIMARY KEY (ticker, trap_type)
+);
+CREATE TABLE IF NOT EXISTS trap_events (
+    run_id INTEGER NOT NULL,
+    at REAL NOT NULL,
+    ticker TEXT NOT NULL,
+    trap_type TEXT NOT NULL,
+    event TEXT NOT NULL,
+    severity TEXT,
+    previous_severity TEXT,
+    flags TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_trap_events_ticker ON trap_events (ticker, at);
+CREATE INDEX IF NOT EXISTS idx_trap_flags_active ON trap_flags (active);
+"""
+
+FIRED, CLEARED, ESCALATED, DOWNGRADED = 'fired', 'cleared', 'escalated', 'downgraded'
+
+
+class TrapFlagStore:
+    """
+    Current trap flags plus an append-only event log, in one SQLite file
+    (WAL journal, IMMEDIATE transactions, per-thread connections, as in
+    services/jobs/store.py).
+
+    Args:
+        path: Database file (default ``ATLAS_TRAP_FLAGS_DB`` or data/traps/trap_flags.sqlite3)
+    """
+
+    def __init__(self, path=None):
+        self.path = Path(path or DEFAULT_DB_PATH)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(_SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.path), timeout=BUSY_TIMEOUT,
+                                   isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def record(self, screen: TrapScreen, at: Optional[float] = None) -> pd.DataFrame:
+        """
+        Store a run and diff it against the active flags of the names it
+        screened. Names not in this run keep their state.
+
+        Returns the run's events (fired / escalated / downgraded / cleared).
+        """
+        at = time.time() if at is None else at
+        current = {(r.ticker, r.trap_type): r for r in screen.traps.itertuples(index=False)}
+        screened = set(screen.tickers)
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            run_id = conn.execute(
+                "INSERT INTO trap_runs (run_at, regime, treasury_10y, n_names, n_traps) VALUES (?, ?, ?, ?, ?)",
+                (at, screen.macro.regime, screen.macro.treasury_10y, len(screened), len(current)),
+            ).lastrowid
+            active = {(t, k): sev for t, k, sev in conn.execute(
+                "SELECT ticker, trap_type, severity FROM trap_flags WHERE active = 1")}
+            events = []
+            for key, row in current.items():
+                previous = active.get(key)
+                if previous is None:
+                    events.append((run_id, at, *key, FIRED, row.severity, None, row.flags))
+                    conn.execute(
+                        "INSERT INTO trap_flags (ticker, trap_type, severity, confidence, flags, first_fired, "
+                        "first_run, last_seen, last_run, cleared_at, active) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, NULL, 1) "
+                        "ON CONFLICT (ticker, trap_type) DO UPDATE SET severity = excluded.severity, "
+                        "confidence = excluded.confidence, flags = excluded.flags, first_fired = excluded.first_fired, "
+                        "first_run = excluded.first_run, last_seen = excluded.last_seen, "
+                        "last_run = excluded.last_run, cleared_at = NULL, active = 1",
+                        (*key, row.severity, float(row.confidence), row.flags, at, run_id, at, run_id),
+                    )
+                    continue
+                if previous != row.severity:
+                    event = ESCALATED if SEVERITY_ORDER[row.severity] < SEVERITY_ORDER[previous] else DOWNGRADED
+                    events.append((run_id, at, *key, event, row.severity, previous, row.flags))
+                conn.execute(
+                    "UPDATE trap_flags SET severity = ?, confidence = ?, flags = ?, last_seen = ?, last_run = ? "
+                    "WHERE ticker = ? AND trap_type = ?",
+                    (row.severity, float(row.confidence), row.flags, at, run_id, *key),
+                )
+            for key, previous in active.items():
+                if key[0] in screened and key not in current:
+                    events.append((run_id, at, *key, CLEARED, None, previous, None))
+                    conn.execute("UPDATE trap_flags SET active = 0, cleared_at = ? WHERE ticker = ? AND trap_type = ?",
+                                 (at, *key))
+            conn.executemany("INSERT INTO trap_events VALUES (?, ?, ?, ?, ?, ?, ?, ?)", events)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return self._frame(events, ['run_id', 'at', 'ticker', 'trap_type', 'event', 'severity',
+                                    'previous_severity', 'flags'])
+
+    def active(self) -> pd.DataFrame:
+        """Traps firing as of the latest run that screened each name."""
+        return self._query("SELECT ticker, trap_type, severity, confidence, flags, first_fired, last_seen "
+                           "FROM trap_flags WHERE active = 1 ORDER BY ticker, trap_type")
+
+    def history(self, ticker: Optional[str] = None) -> pd.DataFrame:
+        """Event log, oldest first (optionally for one ticker)."""
+        sql = "SELECT run_id, at, ticker, trap_type, event, severity, previous_severity, flags FROM trap_events"
+        if ticker is not None:
+            return self._query(sql + " WHERE ticker = ? ORDER BY at, rowid", (ticker.upper(),))
+        return self._query(sql + " ORDER BY at, rowid")
+
+    def runs(self) -> pd.DataFrame:
+        return self._query("SELECT * FROM trap_runs ORDER BY run_id")
+
+    def _query(self, sql: str, params=()) -> pd.DataFrame:
+        cursor = self._conn().execute(sql, params)
+        return self._frame(cursor.fetchall(), [d[0] for d in cursor.description])
+
+    @staticmethod
+    def _frame(rows, columns) -> pd.DataFrame:
+        frame = pd.DataFrame(rows, columns=columns)
+        for col in ('at', 'run_at', 'first_fired', 'last_seen', 'cleared_at'):
+            if col in frame:
+                frame[col] = pd.to_datetime(frame[col], unit='s')
+        return frame
+
+
+def portfolio_trap_report(screen: TrapScreen) -> str:
+    """Compact JSON of a run (for logs and exports)."""
+    return json.dumps({
+        'regime': screen.macro.regime,
+        'treasury_10y': screen.macro.treasury_10y,
+        'names': len(screen.tickers),
+        'traps': screen.traps.to_dict(orient='records'),
+        'errors': screen.errors,
+    }, default=str)
@@ -0,0 +1,499 @@
+"""
+ATLAS Terminal - Options Analytics
+==================================
+Pure NumPy option maths for whole chains at once:
+
+    black_scholes / black76     prices and Greeks on broadcast arrays
+    implied_volatility          batched safeguarded Newton (bisection
+                                fallback inside a shrinking bracket), one
+                                pass over every contract in a chain
+    fit_svi_surface             raw SVI slice per expiry,
+                                w(k) = a + b (rho (k - m) + sqrt((k - m)^2 + sigma^2)),
+                                interpolated linearly in total variance
+    pnl_grid                    multi-leg strategy P&L over spot x horizon
+
+Everything runs on a ``ChainSnapshot``: one symbol's quotes, spot, rate and
+timestamp. Snapshots are built from the yfinance chain frames the Command
+Centre already fetches, and they save to / load from JSON, so a recorded
+chain replays offline.
+
+Units: volatilities and rates are annual decimals, T is in years (calendar,
+365 days). Greeks are per share: vega and rho per 1 vol/rate point (0.01),
+theta per calendar day.
+"""
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+from scipy import optimize, special
+
+DAYS_PER_YEAR = 365.0
+CONTRACT_MULTIPLIER = 100
+DEFAULT_RATE = 0.045
+MARKET_CLOSE = pd.Timedelta(hours=16)
+# Implied-vol solver
+_IV_MAX = 5.0                       # 500% vol: prices above this bound return NaN
+_IV_TOL = 1e-10                     # on the undiscounted price, relative to the forward
+_IV_MAX_ITER = 60
+# SVI seed grid (quasi-explicit: linear least squares for each (m, sigma))
+_SVI_SIGMAS = np.geomspace(0.01, 1.0, 12)
+_SVI_MIN_POINTS = 5
+STRATEGIES = ("long_call", "long_put", "covered_call", "straddle", "strangle",
+              "bull_call_spread", "bear_put_spread", "iron_condor")
+
+
+def _as_call(kind) -> np.ndarray:
+    """Boolean call flags from 'call'/'put' strings, 'c'/'p' or booleans."""
+    arr = np.asarray(kind)
+    if arr.dtype == bool:
+        return arr
+    return np.char.lower(arr.astype(str)).astype('U1') == 'c'
+
+
+# ---------------------------------------------------------------------------
+# Pricing and Greeks
+# ---------------------------------------------------------------------------
+
+def black_scholes(S, K, T, r, sigma, q=0.0, kind="call", greeks: bool = False):
+    """Black-Scholes-Merton price (and Greeks) with continuous dividend yield ``q``.
+
+    All arguments broadcast. Returns the price array, or with ``greeks=True``
+    a dict with price, delta, gamma, vega, theta and rho. At expiry the
+    price is intrinsic and gamma/vega/theta are zero.
+    """
+    S, K, T, r, sigma, q = np.broadcast_arrays(*(np.asarray(x, dtype=float) for x in (S, K, T, r, sigma, q)))
+    call = np.broadcast_to(_as_call(kind), S.shape)
+    T = np.maximum(T, 0.0)
+    sqrt_t = np.sqrt(T)
+    s = sigma * sqrt_t
+    live = s > 0
+    s_safe = np.where(live, s, 1.0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        d1 = np.where(live, (np.log(S / K) + (r - q) * T) / s_safe + 0.5 * s_safe,
+                      np.where(S * np.exp((r - q) * T) >= K, np.inf, -np.inf))
+    d2 = np.where(live, d1 - s, d1)
+    sign = np.where(call, 1.0, -1.0)
+    disc_s = S * np.exp(-q * T)
+    disc_k = K * np.exp(-r * T)
+    nd1 = special.ndtr(sign * d1)
+    nd2 = special.ndtr(sign * d2)
+    price = sign * (disc_s * nd1 - disc_k * nd2)
+    if not greeks:
+        return price
+    pdf = np.where(live, np.exp(-0.5 * np.where(live, d1, 0.0) ** 2) / np.sqrt(2.0 * np.pi), 0.0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        gamma = np.where(live, np.exp(-q * T) * pdf / (S * s_safe), 0.0)
+        theta = np.where(live, -disc_s * pdf * sigma / (2.0 * np.where(live, sqrt_t, 1.0)), 0.0) \
+            - sign * r * disc_k * nd2 + sign * q * disc_s * nd1
+    return {
+        'price': price,
+        'delta': sign * np.exp(-q * T) * nd1,
+        'gamma': gamma,
+        'vega': disc_s * pdf * sqrt_t / 100.0,
+        'theta': theta / DAYS_PER_YEAR,
+        'rho': sign * disc_k * T * nd2 / 100.0,
+    }
+
+
+def black76(F, K, T, r, sigma, kind="call", greeks: bool = False):
+    """Black-76 on a forward/futures price ``F`` (Greeks with respect to F).
+
+    Rho holds F fixed, so only the discount factor moves: rho = -T * price.
+    """
+    out = black_scholes(F, K, T, r, sigma, q=r, kind=kind, greeks=greeks)
+    if greeks:
+        out['rho'] = -np.maximum(np.asarray(T, dtype=float), 0.0) * out['price'] / 100.0
+    return out
+
+
+# ---------------------------------------------------------------------------
+# Implied volatility
+# ---------------------------------------------------------------------------
+
+def _undiscounted_call(F, K, s):
+    d1 = np.log(F / K) / s + 0.5 * s
+    return F * special.ndtr(d1) - K * special.ndtr(d1 - s), F * np.exp(-0.5 * d1 ** 2) / np.sqrt(2.0 * np.pi)
+
+
+def implied_volatility(price, S, K, T, r=0.0, q=0.0, kind="call",
+                       tol: float = _IV_TOL, max_iter: int = _IV_MAX_ITER) -> np.ndarray:
+    """Black-Scholes implied volatility for every contract at once.
+
+    Works in forward terms on the equivalent call (put-call parity), starts
+    from the Corrado-Miller approximation and takes Newton steps in total
+    volatility sigma*sqrt(T); a step leaving the current bracket falls back
+    to bisection, so every contract converges. Prices outside the
+    no-arbitrage bounds (or implying more than 500% vol) give NaN.
+    """
+    price, S, K, T, r, q = np.broadcast_arrays(*(np.asarray(x, dtype=float) for x in (price, S, K, T, r, q)))
+    call = np.broadcast_to(_as_call(kind), price.shape)
+    shape = price.shape
+    price, S, K, T, r, q, call = (a.ravel() for a in (price, S, K, T, r, q, call))
+    out = np.full(price.shape, np.nan)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        F = S * np.exp((r - q) * T)
+        target = price * np.exp(r * T) + np.where(call, 0.0, F - K)   # undiscounted call
+        s_max = _IV_MAX * np.sqrt(T)
+        valid = (T > 0) & (price > 0) & (K > 0) & (F > 0) \
+            & (target > np.maximum(F - K, 0.0)) & (target < F)
+    idx = np.flatnonzero(valid)
+    if len(idx):
+        F, K, target, s_max = F[idx], K[idx], target[idx], s_max[idx]
+        valid_hi = _undiscounted_call(F, K, s_max)[0] >= target
+        idx, F, K, target, s_max = idx[valid_hi], F[valid_hi], K[valid_hi], target[valid_hi], s_max[valid_hi]
+
+        # Corrado-Miller seed, clipped into the bracket
+        half = target - 0.5 * (F - K)
+        disc = np.maximum(half ** 2 - (F - K) ** 2 / np.pi, 0.0)
+        s = np.sqrt(2.0 * np.pi) / (F + K) * (half + np.sqrt(disc))
+        lo, hi = np.zeros_like(s), s_max.copy()
+        s = np.where(np.isfinite(s) & (s > 0) & (s < hi), s, 0.5 * hi)
+
+        active = np.arange(len(idx))
+        for _ in range(max_iter):
+            value, vega = _undiscounted_call(F[active], K[active], s[active])
+            diff = value - target[active]
+            done = np.abs(diff) <= tol * F[active]
+            above = diff > 0
+            hi[active] = np.where(above, s[active], hi[active])
+            lo[active] = np.where(above, lo[active], s[active])
+            with np.errstate(divide='ignore', invalid='ignore'):
+                step = s[active] - diff / vega
+            inside = np.isfinite(step) & (step > lo[active]) & (step < hi[active])
+            s[active] = np.where(done, s[active], np.where(inside, step, 0.5 * (lo[active] + hi[active])))
+            active = active[~done & (hi[active] - lo[active] > 1e-14)]
+            if not len(active):
+                break
+        out[idx] = s / np.sqrt(T[idx])
+    return out.reshape(shape)
+
+
+# ---------------------------------------------------------------------------
+# Chain snapshots
+# ---------------------------------------------------------------------------
+
+_YF_COLUMNS = {"contractSymbol": "contract", "strike": "strike", "bid": "bid", "ask": "ask",
+               "lastPrice": "last", "volume": "volume", "openInterest": "open_interest",
+               "impliedVolatility": "vendor_iv"}
+
+
+@dataclass
+class ChainSnapshot:
+    """One symbol's option quotes at ``as_of`` (long format, one row per contract)."""
+    symbol: str
+    spot: float
+    as_of: pd.Timestamp
+    quotes: pd.DataFrame          # expiry, kind, strike, bid, ask, last, volume, open_interest, ...
+    rate: float = DEFAULT_RATE
+    dividend_yield: float = 0.0
+    _analyzed: Optional[pd.DataFrame] = field(default=None, repr=False, compare=False)
+
+    @classmethod
+    def from_chains(
+        cls,
+        symbol: str,
+        spot: float,
+        chains: Mapping[str, Tuple[pd.DataFrame, pd.DataFrame]],
+        as_of=None,
+        rate: float = DEFAULT_RATE,
+        dividend_yield: float = 0.0,
+    ) -> "ChainSnapshot":
+        """Build from ``{expiry: (calls, puts)}`` frames as returned by yfinance's ``option_chain``."""
+        frames = []
+        for expiry, (calls, puts) in chains.items():
+            for kind, df in (("call", calls), ("put", puts)):
+                if df is None or df.empty:
+                    continue
+                part = df[[c for c in _YF_COLUMNS if c in df.columns]].rename(columns=_YF_COLUMNS)
+                part.insert(0, "kind", kind)
+                part.insert(0, "expiry", pd.Timestamp(expiry))
+                frames.append(part)
+        quotes = pd.concat(frames, ignore_index=True) if frames else \
+            pd.DataFrame(columns=["expiry", "kind", "strike", "bid", "ask", "last"])
+        as_of = pd.Timestamp.now().floor("s") if as_of is None else pd.Timestamp(as_of)
+        return cls(symbol, float(spot), as_of, quotes, rate, dividend_yield)
+
+    @property
+    def expiries(self) -> List[pd.Timestamp]:
+        return sorted(pd.to_datetime(self.quotes["expiry"]).unique())
+
+    def for_expiry(self, expiry) -> "ChainSnapshot":
+        """The same snapshot restricted to one expiry."""
+        rows = pd.to_datetime(self.quotes["expiry"]) == pd.Timestamp(expiry)
+        return ChainSnapshot(self.symbol, self.spot, self.as_of, self.quotes[rows].reset_index(drop=True),
+                             self.rate, self.dividend_yield)
+
+    # -- persistence -----------------------------------------------------------
+
+    def save(self, path: Union[str, Path]) -> Path:
+        """Record to JSON (replay with ``ChainSnapshot.load``)."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        quotes = self.quotes.copy()
+        quotes["expiry"] = pd.to_datetime(quotes["expiry"]).dt.strftime("%Y-%m-%d")
+        payload = {"symbol": self.symbol, "spot": self.spot, "as_of": self.as_of.isoformat(),
+                   "rate": self.rate, "dividend_yield": self.dividend_yield,
+                   "quotes": json.loads(quotes.to_json(orient="split", index=False))}
+        path.write_text(json.dumps(payload))
+        return path
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "ChainSnapshot":
+        payload = json.loads(Path(path).read_text())
+        q = payload["quotes"]
+        quotes = pd.DataFrame(q["data"], columns=q["columns"])
+        quotes["expiry"] = pd.to_datetime(quotes["expiry"])
+        return cls(payload["symbol"], float(payload["spot"]), pd.Timestamp(payload["as_of"]), quotes,
+                   float(payload["rate"]), float(payload["dividend_yield"]))
+
+    # -- analytics -------------------------------------------------------------
+
+    def analyze(self) -> pd.DataFrame:
+        """Quotes plus mid, T, forward, log-moneyness, solved IV and Greeks (cached)."""
+        if self._analyzed is not None:
+            return self._analyzed
+        df = self.quotes.copy()
+        bid = pd.to_numeric(df.get("bid"), errors="coerce").to_numpy(dtype=float)
+        ask = pd.to_numeric(df.get("ask"), errors="coerce").to_numpy(dtype=float)
+        last = pd.to_numeric(df.get("last"), errors="coerce").to_numpy(dtype=float)
+        two_sided = (bid > 0) & (ask >= bid)
+        df["mid"] = np.where(two_sided, 0.5 * (bid + ask), last)
+        expiry_close = pd.to_datetime(df["expiry"]) + MARKET_CLOSE
+        T = ((expiry_close - self.as_of).dt.total_seconds() / (DAYS_PER_YEAR * 86400)).to_numpy()
+        df["T"] = np.maximum(T, 0.0)
+        strike = df["strike"].to_numpy(dtype=float)
+        df["forward"] = self.spot * np.exp((self.rate - self.dividend_yield) * df["T"].to_numpy())
+        df["log_moneyness"] = np.log(strike / df["forward"].to_numpy())
+        iv = implied_volatility(df["mid"].to_numpy(), self.spot, strike, df["T"].to_numpy(),
+                                self.rate, self.dividend_yield, df["kind"].to_numpy())
+        df["iv"] = iv
+        g = black_scholes(self.spot, strike, df["T"].to_numpy(), self.rate, np.nan_to_num(iv),
+                          self.dividend_yield, df["kind"].to_numpy(), greeks=True)
+        for name in ("delta", "gamma", "vega", "theta", "rho"):
+            df[name] = np.where(np.isnan(iv), np.nan, g[name])
+        self._analyzed = df
+        return df
+
+    def surface(self) -> "VolSurface":
+        return fit_svi_surface(self.analyze())
+
+
+# ---------------------------------------------------------------------------
+# SVI volatility surface
+# ---------------------------------------------------------------------------
+
+def svi_total_variance(k, a, b, rho, m, sigma):
+    """Raw SVI total implied variance at log-moneyness ``k`` (broadcasts)."""
+    x = np.asarray(k) - m
+    return a + b * (rho * x + np.sqrt(x ** 2 + sigma ** 2))
+
+
+def _svi_seed(k: np.ndarray, w: np.ndarray):
+    """Best (a, b, rho, m, sigma) over an (m, sigma) grid, each solved as linear least squares."""
+    ms = np.linspace(k.min(), k.max(), 15)
+    M, S = np.meshgrid(ms, _SVI_SIGMAS, indexing="ij")
+    M, S = M.ravel()[:, None], S.ravel()[:, None]
+    x = k[None, :] - M
+    y = np.sqrt(x ** 2 + S ** 2)
+    A = np.stack([np.ones_like(x), x, y], axis=2)                  # G x n x 3
+    coef = np.linalg.solve(np.einsum('gni,gnj->gij', A, A) + 1e-12 * np.eye(3),
+                           np.einsum('gni,n->gi', A, w)[:, :, None])[:, :, 0]
+    a, c, d = coef.T                                               # c = b rho, d = b
+    ok = (d > 0) & (np.abs(c) < d)
+    sse = ((np.einsum('gni,gi->gn', A, coef) - w) ** 2).sum(axis=1)
+    sse = np.where(ok, sse, np.inf)
+    g = int(np.argmin(sse))
+    if not np.isfinite(sse[g]):
+        return float(w.mean()), 0.0, 0.0, 0.0, 0.1
+    return float(a[g]), float(d[g]), float(c[g] / d[g]), float(M[g, 0]), float(S[g, 0])
+
+
+def fit_svi_slice(k, w) -> Dict[str, float]:
+    """Fit raw SVI to one expiry's (log-moneyness, total variance) points.
+
+    The minimum total variance a + b sigma sqrt(1 - rho^2) is kept
+    non-negative by fitting it directly under a lower bound of zero.
+    """
+    k, w = np.asarray(k, dtype=float), np.asarray(w, dtype=float)
+    a, b, rho, m, sigma = _svi_seed(k, w)
+    floor = max(a + b * sigma * np.sqrt(1.0 - rho ** 2), 0.0)
+    span = max(k.max() - k.min(), 0.1)
+
+    def unpack(p):
+        w_min, b_, rho_, m_, sigma_ = p
+        return w_min - b_ * sigma_ * np.sqrt(1.0 - rho_ ** 2), b_, rho_, m_, sigma_
+
+    lower = [0.0, 0.0, -0.999, k.min() - span, 1e-4]
+    upper = [max(w.max(), 1e-6) * 2.0, 10.0, 0.999, k.max() + span, 5.0]
+    x0 = np.clip([floor, b, rho, m, sigma], lower, upper)
+    res = optimize.least_squares(lambda p: svi_total_variance(k, *unpack(p)) - w, x0,
+                                 bounds=(lower, upper), x_scale='jac')
+    a, b, rho, m, sigma = unpack(res.x)
+    return {'a': a, 'b': b, 'rho': rho, 'm': m, 'sigma': sigma,
+            'rmse': float(np.sqrt(np.mean(res.fun ** 2))), 'n_points': len(k)}
+
+
+@dataclass
+class VolSurface:
+    """SVI slices per expiry, interpolated linearly in total variance between them."""
+    params: pd.DataFrame          # index expiry; T, forward, a, b, rho, m, sigma, rmse, n_points
+
+    def total_variance(self, k, T) -> np.ndarray:
+        """Total variance at log-moneyness ``k`` and maturity ``T`` (broadcast).
+
+        Before the first slice and after the last the nearest slice's
+        total variance is scaled by T / T_slice (constant implied vol).
+        """
+        p = self.params
+        k, T = np.broadcast_arrays(np.asarray(k, dtype=float), np.asarray(T, dtype=float))
+        Ts = p['T'].to_numpy()
+        cols = [p[c].to_numpy()[:, None] for c in ('a', 'b', 'rho', 'm', 'sigma')]
+        W = svi_total_variance(k.ravel()[None, :], *cols)            # slices x points
+        t = T.ravel()
+        j = np.clip(np.searchsorted(Ts, t), 1, len(Ts) - 1) if len(Ts) > 1 else np.zeros(len(t), dtype=int)
+        pts = np.arange(len(t))
+        if len(Ts) == 1:
+            w = W[0] * t / Ts[0]
+        else:
+            t0, t1 = Ts[j - 1], Ts[j]
+            frac = (t - t0) / (t1 - t0)
+            w = W[j - 1, pts] + frac * (W[j, pts] - W[j - 1, pts])
+            w = np.where(t < Ts[0], W[0] * t / Ts[0], w)
+            w = np.where(t > Ts[-1], W[-1] * t / Ts[-1], w)
+        return w.reshape(k.shape)
+
+    def forward(self, T) -> np.ndarray:
+        """Forward at ``T``, log-linear in T between slices."""
+        p = self.params
+        return np.exp(np.interp(T, p['T'].to_numpy(), np.log(p['forward'].to_numpy())))
+
+    def implied_vol(self, strike, T) -> np.ndarray:
+        strike, T = np.broadcast_arrays(np.asarray(strike, dtype=float), np.asarray(T, dtype=float))
+        k = np.log(strike / self.forward(T))
+        return np.sqrt(np.maximum(self.total_variance(k, T), 0.0) / T)
+
+    def grid(self, moneyness: Sequence[float] = tuple(np.round(np.linspace(0.7, 1.3, 13), 3))) -> pd.DataFrame:
+        """Implied vol by expiry (rows) and strike / forward (columns)."""
+        p = self.params
+        k = np.log(np.asarray(moneyness, dtype=float))
+        T = p['T'].to_numpy()
+        vol = np.sqrt(np.maximum(self.total_variance(k[None, :], T[:, None]), 0.0) / T[:, None])
+        return pd.DataFrame(vol, index=p.index, columns=pd.Index(list(moneyness), name='moneyness'))
+
+
+def fit_svi_surface(analyzed: pd.DataFrame) -> VolSurface:
+    """Fit an SVI slice to each expiry of an analysed chain (``ChainSnapshot.analyze()``).
+
+    Uses out-of-the-money quotes (puts below the forward, calls above);
+    expiries with fewer than five solved vols are skipped.
+    """
+    df = analyzed[np.isfinite(analyzed['iv']) & (analyzed['T'] > 0)]
+    otm = np.where(df['kind'].str.lower().str[0] == 'c', df['log_moneyness'] >= 0, df['log_moneyness'] < 0)
+    df = df[otm]
+    rows = {}
+    for expiry, part in df.groupby('expiry'):
+        if len(part) < _SVI_MIN_POINTS:
+            continue
+        T = float(part['T'].iloc[0])
+        fit = fit_svi_slice(part['log_moneyness'].to_numpy(), part['iv'].to_numpy() ** 2 * T)
+        rows[pd.Timestamp(expiry)] = {'T': T, 'forward': float(part['forward'].iloc[0]), **fit}
+    if not rows:
+        raise ValueError(f"need at least {_SVI_MIN_POINTS} solved out-of-the-money vols in some expiry")
+    params = pd.DataFrame.from_dict(rows, orient='index').sort_values('T')
+    params.index.name = 'expiry'
+    return VolSurface(params)
+
+
+# ---------------------------------------------------------------------------
+# Multi-leg strategies
+# ---------------------------------------------------------------------------
+
+@dataclass
+class OptionLeg:
+    """One strategy leg. ``quantity`` > 0 long, < 0 short (contracts, or shares for stock)."""
+    kind: str                     # 'call', 'put' or 'stock'
+    quantity: float
+    strike: float = 0.0
+    premium: float = 0.0          # entry price per share (stock: entry price)
+    T: float = 0.0                # years to expiry at entry
+    iv: float = 0.2
+
+
+def pnl_grid(
+    legs: Sequence[OptionLeg],
+    spots: Iterable[float],
+    days: Iterable[float] = (0,),
+    r: float = DEFAULT_RATE,
+    q: float = 0.0,
+    vol_shift: float = 0.0,
+    multiplier: int = CONTRACT_MULTIPLIER,
+) -> pd.DataFrame:
+    """Strategy P&L (spots x days forward), every leg revalued in one broadcast.
+
+    Options are revalued with Black-Scholes at their remaining time and
+    ``iv + vol_shift``; legs past expiry are worth intrinsic.
+    """
+    spots = np.asarray(list(spots), dtype=float)
+    days = np.asarray(list(days), dtype=float)
+    kind = np.array([leg.kind.lower() for leg in legs])
+    qty = np.array([leg.quantity for leg in legs], dtype=float)[:, None, None]
+    strike = np.array([leg.strike for leg in legs], dtype=float)[:, None, None]
+    premium = np.array([leg.premium for leg in legs], dtype=float)[:, None, None]
+    T = np.array([leg.T for leg in legs], dtype=float)[:, None, None] - days[None, None, :] / DAYS_PER_YEAR
+    iv = np.maximum(np.array([leg.iv for leg in legs], dtype=float) + vol_shift, 1e-4)[:, None, None]
+    S = spots[None, :, None]
+
+    value = black_scholes(S, np.maximum(strike, 1e-12), T, r, iv, q, kind[:, None, None])
+    stock = (kind == 'stock')[:, None, None]
+    per_leg = np.where(stock, qty * (S - premium), qty * multiplier * (value - premium))
+    return pd.DataFrame(per_leg.sum(axis=0), index=pd.Index(spots, name='spot'),
+                        columns=pd.Index(days, name='days'))
+
+
+def breakevens(pnl: pd.Series) -> List[float]:
+    """Spots where a P&L curve crosses zero (linear interpolation)."""
+    x, y = pnl.index.to_numpy(dtype=float), pnl.to_numpy(dtype=float)
+    y = np.where(np.abs(y) < 1e-9, 0.0, y)
+    i = np.flatnonzero(np.sign(y[:-1]) * np.sign(y[1:]) < 0)
+    crossings = x[i] - y[i] * (x[i + 1] - x[i]) / (y[i + 1] - y[i])
+    return sorted(float(v) for v in np.concatenate([crossings, x[y == 0]]))
+
+
+def strategy_legs(name: str, chain: pd.DataFrame, spot: float, shares: int = CONTRACT_MULTIPLIER) -> List[OptionLeg]:
+    """Legs of a preset strategy on one expiry of an analysed chain, strikes nearest the money.
+
+    Spreads and strangles use the nearest listed strikes about 5% (iron
+    condor: 5% and 10%) either side of spot; premiums are the mids.
+    """
+    if name not in STRATEGIES:
+        raise ValueError(f"strategy must be one of {STRATEGIES}, got {name!r}")
+    chain = chain[np.isfinite(chain['iv'])]
+
+    def leg(kind, target, qty):
+        side = chain[chain['kind'] == kind]
+        if side.empty:
+            raise ValueError(f"no {kind}s with a solved implied vol")
+        row = side.iloc[int(np.argmin(np.abs(side['strike'].to_numpy() - target)))]
+        return OptionLeg(kind, qty, float(row['strike']), float(row['mid']), float(row['T']), float(row['iv']))
+
+    up, down = spot * 1.05, spot * 0.95
+    recipes = {
+        'long_call': [('call', spot, 1)],
+        'long_put': [('put', spot, 1)],
+        'covered_call': [('call', up, -1)],
+        'straddle': [('call', spot, 1), ('put', spot, 1)],
+        'strangle': [('call', up, 1), ('put', down, 1)],
+        'bull_call_spread': [('call', spot, 1), ('call', up, -1)],
+        'bear_put_spread': [('put', spot, 1), ('put', down, -1)],
+        'iron_condor': [('put', spot * 0.90, 1), ('put', down, -1), ('call', up, -1), ('call', spot * 1.10, 1)],
+    }
+    legs = [leg(kind, target, qty) for kind, target, qty in recipes[name]]
+    if name == 'covered_call':
+        legs.insert(0, OptionLeg('stock', shares, premium=spot))
+    return legs
@@ -10,13 +10,24 @@ volatility_based     Position sized to target a fixed dollar risk per day
 
 All functions return a PositionSize dataclass so callers can display
 the reasoning as well as the final share count.
+
+Book sizing
+-----------
+size_book            All of the above for every name at once from a returns
+                     matrix and signals, plus fractional Kelly under the
+                     covariance, risk-parity volatility targeting and
+                     per-name liquidity caps. Returns a SizedBook whose
+                     ``orders()`` feed ``TradingService.submit_orders``.
 """
 
 from __future__ import annotations
 
 import math
-from dataclasses import dataclass
-from typing import Optional
+from dataclasses import dataclass, field
+from typing import Dict, List, Mapping, Optional, Union
+
+import numpy as np
+import pandas as pd
 
 
 @dataclass
@@ -266,3 +277,257 @@ def volatility_based(
 def annual_vol_to_daily(annual_vol_pct: float) -> float:
     """Convert annualised volatility percentage to daily (252 trading days)."""
     return annual_vol_pct / math.sqrt(252)
+
+
+# ---------------------------------------------------------------------------
+# Book sizing (every name in one matrix pass)
+# ---------------------------------------------------------------------------
+
+BOOK_METHODS = ("kelly", "fixed_fractional", "volatility", "kelly_covariance", "risk_parity")
+TRADING_DAYS = 252
+RISK_PARITY_ITERATIONS = 50
+
+
+@dataclass
+class SizedBook:
+    """Target sizes for a whole book.
+
+    ``table`` has one row per name: inputs and per-name statistics (price,
+    signal, daily_vol, n_obs, win_rate, payoff_ratio, liquidity_cap_pct),
+    each method's signed size as a fraction of equity (``<method>_pct``),
+    and the targets for the chosen method
+    (target_pct, target_notional, target_shares). ``stats`` holds each
+    method's ex-ante annual volatility, gross and net exposure.
+    """
+    table: pd.DataFrame
+    method: str
+    equity: float
+    stats: pd.DataFrame
+    notes: Dict[str, str] = field(default_factory=dict)
+
+    def orders(
+        self,
+        positions: Optional[List[Dict]] = None,
+        min_notional: float = 1.0,
+        whole_shares: bool = False,
+    ) -> List[Dict]:
+        """Market orders that move current ``positions`` to the targets.
+
+        ``positions`` are ``TradingService.get_all_positions()`` dicts;
+        held names outside the book are left alone. Each order is
+        ``{"symbol", "qty", "side"}`` (``submit_market_order`` keywords),
+        sells first so they free buying power for the buys.
+        """
+        held = pd.Series({str(p["symbol"]).upper(): float(p.get("qty", 0.0)) for p in positions or []},
+                         dtype=float)
+        book = self.table
+        delta = book["target_shares"] - held.reindex(book.index).fillna(0.0)
+        if whole_shares:
+            delta = np.trunc(delta)
+        delta = delta[(delta.abs() * book["price"] >= min_notional) & (delta != 0)]
+        orders = [{"symbol": sym, "qty": round(abs(q), 4), "side": "buy" if q > 0 else "sell"}
+                  for sym, q in delta.items()]
+        return sorted(orders, key=lambda o: o["side"] != "sell")
+
+
+def _as_series(values, index, default=np.nan) -> pd.Series:
+    if values is None:
+        return pd.Series(default, index=index, dtype=float)
+    if isinstance(values, pd.Series):
+        return values.reindex(index).astype(float)
+    if isinstance(values, Mapping):
+        return pd.Series(values, dtype=float).reindex(index)
+    return pd.Series(float(values), index=index)
+
+
+def _risk_parity(cov: np.ndarray, budgets: np.ndarray) -> np.ndarray:
+    """Positive weights (sum 1) whose risk contributions are proportional to ``budgets``.
+
+    Newton's method on min 1/2 x'Sigma x - sum b_i log x_i, whose
+    optimum satisfies x_i (Sigma x)_i = b_i. Convex, so it also converges
+    for a signed (long/short) covariance, where hedges have negative
+    marginal risk.
+    """
+    active = budgets > 0
+    w = np.zeros(len(budgets))
+    if not active.any():
+        return w
+    sub = cov[np.ix_(active, active)]
+    b = budgets[active] / budgets[active].sum()
+    x = b / np.sqrt(np.diag(sub))
+    x /= math.sqrt(x @ sub @ x)
+
+    def objective(v):
+        return 0.5 * v @ sub @ v - b @ np.log(v)
+
+    for _ in range(RISK_PARITY_ITERATIONS):
+        grad = sub @ x - b / x
+        if np.max(np.abs(grad * x)) < 1e-12:
+            break
+        step = np.linalg.solve(sub + np.diag(b / x ** 2), grad)
+        t = 1.0
+        while np.any(x - t * step <= 0) or objective(x - t * step) > objective(x) - 0.25 * t * grad @ step:
+            t *= 0.5
+            if t < 1e-12:
+                break
+        x = x - t * step
+    w[active] = x / x.sum()
+    return w
+
+
+def size_book(
+    returns: pd.DataFrame,
+    prices: Union[pd.Series, Mapping[str, float]],
+    portfolio_equity: float,
+    signals: Union[pd.Series, Mapping[str, float], None] = None,
+    method: str = "risk_parity",
+    expected_returns: Union[pd.Series, Mapping[str, float], None] = None,
+    covariance=None,
+    kelly_multiplier: float = 0.5,
+    risk_pct: float = 0.01,
+    stops: Union[pd.Series, Mapping[str, float], None] = None,
+    target_risk_pct: float = 0.01,
+    target_vol: float = 0.10,
+    max_position_pct: float = 0.20,
+    max_gross: float = 1.0,
+    adv: Union[pd.Series, Mapping[str, float], None] = None,
+    max_participation: float = 0.05,
+    vol_window: int = 63,
+    min_obs: int = 20,
+) -> SizedBook:
+    """
+    Size every name in ``returns`` with all five methods at once.
+
+    Parameters
+    ----------
+    returns : DataFrame
+        Daily returns, dates x tickers (the universe being sized).
+    prices : Series or dict
+        Latest price per ticker.
+    portfolio_equity : float
+        Total account equity in dollars.
+    signals : Series or dict, optional
+        Conviction per ticker in [-1, 1]; the sign is the direction and
+        the magnitude scales the risk budget. Default +1 (long everything).
+    method : str
+        Which method sets the targets, one of BOOK_METHODS.
+    expected_returns : Series or dict, optional
+        Annual expected returns for covariance Kelly (default: historical mean).
+    covariance : CovarianceEstimate, optional
+        Daily covariance of ``returns`` (default: Ledoit-Wolf on ``returns``).
+    kelly_multiplier : float
+        Fraction of full Kelly for both Kelly methods. Default 0.5.
+    risk_pct, stops :
+        Fixed fractional: risk per name as a fraction of equity, optionally
+        measured to a stop price (as in ``fixed_fractional``).
+    target_risk_pct : float
+        Volatility-based: daily dollar risk per name as a fraction of equity.
+    target_vol : float
+        Annual ex-ante volatility of the risk-parity book, and the ceiling
+        for the covariance Kelly book.
+    max_position_pct, max_gross : float
+        Per-name cap and gross exposure cap, as fractions of equity.
+    adv, max_participation :
+        Average daily dollar volume per ticker; a name is capped at
+        ``max_participation * adv`` of notional.
+    vol_window, min_obs : int
+        Rows used for volatility; names with fewer than ``min_obs`` returns
+        are not sized.
+
+    Returns
+    -------
+    SizedBook
+    """
+    if method not in BOOK_METHODS:
+        raise ValueError(f"method must be one of {BOOK_METHODS}, got {method!r}")
+    if portfolio_equity <= 0:
+        raise ValueError("portfolio_equity must be > 0")
+
+    tickers = list(returns.columns)
+    R = returns.to_numpy(dtype=float)
+    price = _as_series(prices, tickers).to_numpy()
+    signal = _as_series(signals, tickers, 1.0).fillna(0.0).clip(-1, 1).to_numpy()
+    direction = np.sign(signal)
+    n_obs = np.sum(~np.isnan(R), axis=0)
+    usable = (n_obs >= min_obs) & (price > 0) & (direction != 0)
+
+    # Per-name statistics, signed by direction (a short wins when the name falls)
+    Rs = R * direction
+    wins, losses = Rs > 0, Rs < 0
+    n_trades = np.maximum((wins | losses).sum(axis=0), 1)
+    win_rate = wins.sum(axis=0) / n_trades
+    with np.errstate(divide="ignore", invalid="ignore"):
+        avg_win = np.where(wins, Rs, 0.0).sum(axis=0) / wins.sum(axis=0)
+        avg_loss = -np.where(losses, Rs, 0.0).sum(axis=0) / losses.sum(axis=0)
+        payoff = avg_win / avg_loss
+        full_kelly = (win_rate * payoff - (1 - win_rate)) / payoff
+    daily_vol = np.nanstd(R[-vol_window:], axis=0, ddof=1)
+
+    # Caps: position limit and participation in average daily volume
+    liquidity_cap = _as_series(adv, tickers).to_numpy() * max_participation / portfolio_equity
+    cap = np.fmin(np.where(np.isnan(liquidity_cap), np.inf, liquidity_cap), max_position_pct)
+    cap = np.where(usable, cap, 0.0)
+
+    sizes = {}
+    sizes["kelly"] = direction * np.clip(np.nan_to_num(full_kelly) * kelly_multiplier, 0.0, None)
+    stop = _as_series(stops, tickers).to_numpy()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        stop_distance = np.abs(price - stop) / price
+        stop_distance = np.where(stop_distance < 1e-6, 0.01, stop_distance)     # as fixed_fractional
+        sizes["fixed_fractional"] = direction * np.where(np.isnan(stop) | (stop <= 0), risk_pct,
+                                                         risk_pct / stop_distance)
+        sizes["volatility"] = direction * np.abs(signal) * target_risk_pct / daily_vol
+
+    # Covariance-aware methods on the usable names only
+    idx = np.flatnonzero(usable)
+    if covariance is None:
+        from analytics.covariance import ledoit_wolf
+        covariance = ledoit_wolf(returns.iloc[:, idx]) if len(idx) else None
+        cov = covariance.values * TRADING_DAYS if covariance is not None else np.zeros((0, 0))
+    else:
+        pos = {t: i for i, t in enumerate(covariance.assets)}
+        sel = [pos[tickers[i]] for i in idx]
+        cov = covariance.values[np.ix_(sel, sel)] * TRADING_DAYS
+
+    mu = _as_series(expected_returns, tickers).to_numpy()
+    mu = np.where(np.isnan(mu), np.nanmean(R, axis=0) * TRADING_DAYS, mu)[idx]
+    kelly_cov = np.zeros(len(tickers))
+    risk_parity = np.zeros(len(tickers))
+    if len(idx):
+        # Growth-optimal f* = Sigma^-1 mu, fractional, in the signal's direction only
+        f = np.linalg.solve(cov, mu) * kelly_multiplier
+        f = np.where(np.sign(f) == direction[idx], f, 0.0)
+        f = np.sign(f) * np.minimum(np.abs(f), cap[idx])
+        vol = math.sqrt(max(f @ cov @ f, 0.0))
+        kelly_cov[idx] = f * min(1.0, target_vol / vol if vol > 0 else 1.0)
+
+        signed_cov = cov * np.outer(direction[idx], direction[idx])
+        rp = _risk_parity(signed_cov, np.abs(signal[idx]))
+        vol = math.sqrt(max(rp @ signed_cov @ rp, 0.0))
+        risk_parity[idx] = direction[idx] * rp * (target_vol / vol if vol > 0 else 0.0)
+    sizes["kelly_covariance"] = kelly_cov
+    sizes["risk_parity"] = risk_parity
+
+    table = pd.DataFrame({"price": price, "signal": signal, "daily_vol": daily_vol, "n_obs": n_obs,
+                          "win_rate": win_rate, "payoff_ratio": payoff, "liquidity_cap_pct": liquidity_cap},
+                         index=pd.Index(tickers, name="symbol"))
+    full_cov = np.zeros((len(tickers), len(tickers)))
+    full_cov[np.ix_(idx, idx)] = cov
+    stats = {}
+    for name, w in sizes.items():
+        w = np.nan_to_num(np.where(usable, w, 0.0))
+        w = np.sign(w) * np.minimum(np.abs(w), cap)          # per-name and gross caps apply to every method
+        if np.abs(w).sum() > max_gross:
+            w = w * max_gross / np.abs(w).sum()
+        table[f"{name}_pct"] = w
+        stats[name] = {"ex_ante_vol": math.sqrt(max(w @ full_cov @ w, 0.0)),
+                       "gross": float(np.abs(w).sum()), "net": float(w.sum())}
+
+    target = table[f"{method}_pct"]
+    table["target_pct"] = target
+    table["target_notional"] = target * portfolio_equity
+    table["target_shares"] = np.where(usable, table["target_notional"] / table["price"], 0.0)
+    notes = {t: "insufficient history" for t, n in zip(tickers, n_obs) if n < min_obs}
+    notes.update({t: "no price" for t, p in zip(tickers, price) if not p > 0})
+    return SizedBook(table=table, method=method, equity=portfolio_equity,
+                     stats=pd.DataFrame(stats).T, notes=notes)
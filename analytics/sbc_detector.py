@@ -11,6 +11,8 @@ Key Functions:
 - Analyze historical trends
 - Detect materiality (>3% threshold)
 - Provide forecasting inputs
+- Load statements once per ticker from the persistent fundamentals cache
+  (shared with the bulk screener in analytics/sbc_screener.py)
 
 Author: ATLAS Development Team
 Version: 1.0.0
@@ -18,6 +20,7 @@ Date: 2025-12-16
 """
 
 import yfinance as yf
+import numpy as np
 import pandas as pd
 from typing import Dict, Optional, Tuple, List
 from datetime import datetime
@@ -25,17 +28,234 @@ import warnings
 warnings.filterwarnings('ignore')
 
 
+# Line items searched in order (first hit wins)
+CASHFLOW_SBC_ITEMS = [
+    'Stock Based Compensation',
+    'Stock-Based Compensation',
+    'Share Based Compensation',
+    'Stock Compensation',
+    'Share Based Compensation Expense',
+    'Stock Based Compensation Expense'
+]
+INCOME_SBC_ITEMS = [
+    'Stock Based Compensation',
+    'Share Based Compensation',
+    'Stock Compensation Expense',
+    'Employee Stock Options'
+]
+REVENUE_ITEMS = ['Total Revenue', 'Revenue']
+DILUTED_SHARES_ITEMS = ['Diluted Average Shares', 'Basic Average Shares']
+
+MATERIALITY_THRESHOLD = 3.0          # % of revenue
+TREND_THRESHOLD = 0.5                # pp per year before a trend counts
+STATEMENTS_TTL = 7 * 24 * 3600       # annual statements change once a year
+
+
+def _cache():
+    try:
+        from atlas_terminal.core.cache_manager import cache_manager
+        return cache_manager
+    except Exception:
+        return None
+
+
+def load_statements(ticker: str, fetch: bool = True) -> Optional[Dict[str, pd.DataFrame]]:
+    """
+    Annual cash flow and income statements for one ticker.
+
+    One ``yf.Ticker`` per ticker, stored in the persistent fundamentals cache
+    (CacheManager's disk tier) for a week, so every extraction path, the bulk
+    screener and later sessions all read the same copy.
+
+    Args:
+        ticker: Stock ticker symbol
+        fetch: If False, only return cached statements (never call yfinance)
+
+    Returns:
+        {'cashflow': DataFrame, 'financials': DataFrame} or None if unavailable
+    """
+    ticker = ticker.upper().strip()
+    cache = _cache()
+    key = cache.get_cache_key('sbc_statements', ticker) if cache is not None else None
+    if cache is not None:
+        cached = cache.get(key, ttl=STATEMENTS_TTL)
+        if cached is not None:
+            return cached
+    if not fetch:
+        return None
+
+    company = yf.Ticker(ticker)
+    statements = {}
+    for name in ('cashflow', 'financials'):
+        try:
+            frame = getattr(company, name)
+        except Exception:
+            frame = None
+        statements[name] = frame if isinstance(frame, pd.DataFrame) else pd.DataFrame()
+    if all(frame.empty for frame in statements.values()):
+        return None                                   # not cached: retried next time
+    if cache is not None:
+        cache.set(key, statements, persist=True, ttl=STATEMENTS_TTL)
+    return statements
+
+
+def _annual_line(statement: Optional[pd.DataFrame], line_items: List[str]) -> Tuple[Optional[str], pd.Series]:
+    """First matching line item as a numeric Series indexed by fiscal year."""
+    if statement is None or statement.empty:
+        return None, pd.Series(dtype=float)
+    for item in line_items:
+        if item in statement.index:
+            row = statement.loc[item]
+            if isinstance(row, pd.DataFrame):
+                row = row.iloc[0]
+            row = pd.to_numeric(row, errors='coerce')
+            row.index = pd.to_datetime(row.index).year
+            return item, row[~row.index.duplicated()]
+    return None, pd.Series(dtype=float)
+
+
+def align_sbc(sbc: pd.Series, revenue: pd.Series) -> pd.DataFrame:
+    """Year-aligned sbc, revenue and sbc_pct, keeping years where both are positive."""
+    frame = pd.DataFrame({'sbc': sbc.abs(), 'revenue': revenue}).dropna()
+    frame = frame[(frame['sbc'] > 0) & (frame['revenue'] > 0)].sort_index().astype(float)
+    frame['sbc_pct'] = frame['sbc'] / frame['revenue'] * 100
+    return frame
+
+
+def sbc_history(cashflow: pd.DataFrame, financials: pd.DataFrame) -> Tuple[pd.DataFrame, Optional[str], Optional[str]]:
+    """
+    SBC, revenue and SBC % of revenue by fiscal year.
+
+    Tries the cash flow statement, then the income statement, and aligns
+    SBC with revenue on fiscal year.
+
+    Returns:
+        (DataFrame indexed by year with columns sbc, revenue, sbc_pct,
+         method, line item); the frame is empty if neither statement works
+    """
+    _, revenue = _annual_line(financials, REVENUE_ITEMS)
+    empty = pd.DataFrame(columns=['sbc', 'revenue', 'sbc_pct'], dtype=float)
+    if revenue.empty:
+        return empty, None, None
+
+    for method, statement, items in (('cash_flow_statement', cashflow, CASHFLOW_SBC_ITEMS),
+                                     ('income_statement', financials, INCOME_SBC_ITEMS)):
+        line_item, sbc = _annual_line(statement, items)
+        if line_item is None:
+            continue
+        frame = align_sbc(sbc, revenue)
+        if len(frame):
+            return frame, method, line_item
+    return empty, None, None
+
+
+def sector_sbc_estimate(sector: str) -> float:
+    """Typical SBC % of revenue for a sector (used when no SBC line item exists)."""
+    if 'Technology' in sector or 'Software' in sector:
+        return 8.0   # Tech average
+    if 'Communication' in sector or 'Internet' in sector:
+        return 10.0  # High SBC
+    return 2.0       # Conservative estimate
+
+
+def sbc_trends(sbc_pct: pd.DataFrame) -> pd.DataFrame:
+    """
+    Trend statistics for every column of an aligned year x ticker SBC % frame.
+
+    Missing years are NaN. The average year-over-year change telescopes to
+    (last - first) / (years - 1), so no per-ticker loop is needed.
+
+    Returns:
+        DataFrame indexed by ticker: years, latest_sbc_pct, avg_sbc_pct,
+        avg_annual_change_pct, volatility, trend_direction, is_normalizing
+    """
+    values = sbc_pct.sort_index().to_numpy(dtype=float)
+    valid = ~np.isnan(values)
+    n = valid.sum(axis=0)
+    cols = np.arange(values.shape[1])
+    rows = len(values)
+    first = values[valid.argmax(axis=0), cols] if rows else np.full(len(cols), np.nan)
+    latest = values[rows - 1 - valid[::-1].argmax(axis=0), cols] if rows else np.full(len(cols), np.nan)
+    filled = np.where(valid, values, 0.0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = np.where(n > 0, filled.sum(axis=0) / n, np.nan)
+        volatility = np.sqrt(np.where(valid, (values - mean) ** 2, 0.0).sum(axis=0) / n)
+        change = np.where(n >= 2, (latest - first) / (n - 1), np.nan)
+    direction = np.select([change > TREND_THRESHOLD, change < -TREND_THRESHOLD], ['increasing', 'decreasing'],
+                          'stable')
+    return pd.DataFrame({
+        'years': n,
+        'latest_sbc_pct': np.where(n > 0, latest, np.nan),
+        'avg_sbc_pct': mean,
+        'avg_annual_change_pct': change,
+        'volatility': np.where(n > 0, volatility, np.nan),
+        'trend_direction': np.where(n >= 2, direction, None),
+        'is_normalizing': (latest > 5.0) & (direction == 'decreasing') & (n >= 2),
+    }, index=sbc_pct.columns)
+
+
+def forecast_recommendation(latest_sbc_pct: float, trend_direction: str) -> str:
+    """Plain-English normalization advice for a current SBC level and trend."""
+    if latest_sbc_pct > 10.0:
+        if trend_direction == 'increasing':
+            return "Very high SBC and increasing - model gradual normalization to 8-10%"
+        if trend_direction == 'decreasing':
+            return "High SBC but declining - model continued decline to 6-8%"
+        return "High stable SBC - maintain current levels with slight decline"
+    if latest_sbc_pct > 5.0:
+        if trend_direction == 'increasing':
+            return "Moderate SBC and increasing - model stabilization at 6-8%"
+        if trend_direction == 'decreasing':
+            return "Moderate SBC declining - model normalization to 3-5%"
+        return "Moderate stable SBC - maintain current levels"
+    return "Low SBC - maintain current low levels (2-3%)"
+
+
+def normalization_path(latest_sbc_pct: float) -> Tuple[float, int]:
+    """(normalization target %, years to normalize) for the current SBC level."""
+    if latest_sbc_pct > 10.0:
+        return 7.0, 7
+    if latest_sbc_pct > 5.0:
+        return 4.0, 5
+    return latest_sbc_pct, 5
+
+
+def build_sbc_result(history: pd.DataFrame, method: str, line_item: Optional[str] = None) -> Dict:
+    """The ``extract_sbc_data`` result dict for a year-indexed SBC history."""
+    latest_year = int(history.index.max())
+    avg_sbc_pct = float(history['sbc_pct'].mean())
+    result = {
+        'success': True,
+        'method': method,
+        'sbc_annual': {int(y): float(v) for y, v in history['sbc'].items()},
+        'revenue_annual': {int(y): float(v) for y, v in history['revenue'].items()},
+        'sbc_pct_revenue': {int(y): float(v) for y, v in history['sbc_pct'].items()},
+        'latest_year': latest_year,
+        'latest_sbc': float(history.loc[latest_year, 'sbc']),
+        'latest_sbc_pct': float(history.loc[latest_year, 'sbc_pct']),
+        'avg_sbc_pct': avg_sbc_pct,
+        'is_material': avg_sbc_pct > MATERIALITY_THRESHOLD,
+        'years_available': len(history),
+        'error': None
+    }
+    if line_item is not None:
+        result['line_item'] = line_item
+    return result
+
+
 class SBCDetector:
     """
     Detects and extracts Share-Based Compensation from financial statements.
     """
 
-    def __init__(self, ticker: str):
+    def __init__(self, ticker: str, statements: Optional[Dict[str, pd.DataFrame]] = None):
         """
         Initialize SBC detector for a specific company.
 
         Args:
             ticker: Stock ticker symbol
+            statements: Pre-loaded statements (see ``load_statements``);
+                fetched once on first use if omitted
         """
         self.ticker = ticker.upper()
         self.sbc_data = None
@@ -43,6 +263,14 @@ class SBCDetector:
         self.extraction_success = False
         self.extraction_method = None
         self.error_message = None
+        self._loaded_statements = statements
+
+    def _statements(self) -> Dict[str, pd.DataFrame]:
+        """Statements for this ticker, loaded once and shared by every extraction path."""
+        if self._loaded_statements is None:
+            self._loaded_statements = load_statements(self.ticker) or {
+                'cashflow': pd.DataFrame(), 'financials': pd.DataFrame()}
+        return self._loaded_statements
 
     def extract_sbc_data(self) -> Dict:
         """
@@ -97,99 +325,23 @@ class SBCDetector:
         activities (it's a non-cash expense added back).
         """
         try:
-            company = yf.Ticker(self.ticker)
-
-            # Get annual cash flow statement
-            cashflow = company.cashflow
-            if cashflow is None or cashflow.empty:
+            statements = self._statements()
+            if statements['cashflow'].empty:
                 return self._create_error_result("No cash flow data available")
-
-            # Get income statement for revenue
-            income_stmt = company.financials
-            if income_stmt is None or income_stmt.empty:
+            if statements['financials'].empty:
                 return self._create_error_result("No income statement data available")
 
-            # Look for SBC in various possible line items
-            sbc_line_items = [
-                'Stock Based Compensation',
-                'Stock-Based Compensation',
-                'Share Based Compensation',
-                'Stock Compensation',
-                'Share Based Compensation Expense',
-                'Stock Based Compensation Expense'
-            ]
-
-            sbc_series = None
-            found_line = None
-
-            for line_item in sbc_line_items:
-                if line_item in cashflow.index:
-                    sbc_series = cashflow.loc[line_item]
-                    found_line = line_item
-                    break
-
-            if sbc_series is None:
+            line_item, sbc = _annual_line(statements['cashflow'], CASHFLOW_SBC_ITEMS)
+            if line_item is None:
                 return self._create_error_result("SBC line item not found in cash flow statement")
-
-            # Get revenue (Total Revenue or Revenue)
-            revenue_series = None
-            for rev_item in ['Total Revenue', 'Revenue']:
-                if rev_item in income_stmt.index:
-                    revenue_series = income_stmt.loc[rev_item]
-                    break
-
-            if revenue_series is None:
+            _, revenue = _annual_line(statements['financials'], REVENUE_ITEMS)
+            if revenue.empty:
                 return self._create_error_result("Revenue not found in income statement")
 
-            # Convert to annual dictionaries
-            sbc_annual = {}
-            revenue_annual = {}
-            sbc_pct_revenue = {}
-
-            # Get years (columns are timestamps)
-            for col in sbc_series.index:
-                year = col.year
-                sbc_value = abs(sbc_series[col])  # Make positive
-
-                # Find matching revenue (may have different dates)
-                revenue_value = None
-                for rev_col in revenue_series.index:
-                    if rev_col.year == year:
-                        revenue_value = revenue_series[rev_col]
-                        break
-
-                if revenue_value and revenue_value > 0 and sbc_value > 0:
-                    sbc_annual[year] = float(sbc_value)
-                    revenue_annual[year] = float(revenue_value)
-                    sbc_pct_revenue[year] = (float(sbc_value) / float(revenue_value)) * 100
-
-            if not sbc_annual:
+            history = align_sbc(sbc, revenue)
+            if history.empty:
                 return self._create_error_result("No valid SBC data found")
-
-            # Calculate statistics
-            avg_sbc_pct = sum(sbc_pct_revenue.values()) / len(sbc_pct_revenue)
-            latest_year = max(sbc_annual.keys())
-            latest_sbc = sbc_annual[latest_year]
-            latest_sbc_pct = sbc_pct_revenue[latest_year]
-
-            # Determine if material (>3% threshold)
-            is_material = avg_sbc_pct > 3.0
-
-            return {
-                'success': True,
-                'method': 'cash_flow_statement',
-                'line_item': found_line,
-                'sbc_annual': sbc_annual,
-                'revenue_annual': revenue_annual,
-                'sbc_pct_revenue': sbc_pct_revenue,
-                'latest_year': latest_year,
-                'latest_sbc': latest_sbc,
-                'latest_sbc_pct': latest_sbc_pct,
-                'avg_sbc_pct': avg_sbc_pct,
-                'is_material': is_material,
-                'years_available': len(sbc_annual),
-                'error': None
-            }
+            return build_sbc_result(history, 'cash_flow_statement', line_item)
 
         except Exception as e:
             return self._create_error_result(f"Cash flow extraction failed: {str(e)}")
@@ -201,77 +353,20 @@ class SBCDetector:
         Some companies report SBC as a separate line item in operating expenses.
         """
         try:
-            company = yf.Ticker(self.ticker)
-            income_stmt = company.financials
-
-            if income_stmt is None or income_stmt.empty:
+            income_stmt = self._statements()['financials']
+            if income_stmt.empty:
                 return self._create_error_result("No income statement data")
-
-            # Look for SBC-related line items
-            sbc_line_items = [
-                'Stock Based Compensation',
-                'Share Based Compensation',
-                'Stock Compensation Expense',
-                'Employee Stock Options'
-            ]
-
-            sbc_series = None
-            for line_item in sbc_line_items:
-                if line_item in income_stmt.index:
-                    sbc_series = income_stmt.loc[line_item]
-                    break
-
-            if sbc_series is None:
+            line_item, sbc = _annual_line(income_stmt, INCOME_SBC_ITEMS)
+            if line_item is None:
                 return self._create_error_result("SBC not found in income statement")
-
-            # Get revenue
-            revenue_series = None
-            for rev_item in ['Total Revenue', 'Revenue']:
-                if rev_item in income_stmt.index:
-                    revenue_series = income_stmt.loc[rev_item]
-                    break
-
-            if revenue_series is None:
+            _, revenue = _annual_line(income_stmt, REVENUE_ITEMS)
+            if revenue.empty:
                 return self._create_error_result("Revenue not found")
 
-            # Process data (similar to cash flow method)
-            sbc_annual = {}
-            revenue_annual = {}
-            sbc_pct_revenue = {}
-
-            for col in sbc_series.index:
-                year = col.year
-                sbc_value = abs(sbc_series[col])
-
-                for rev_col in revenue_series.index:
-                    if rev_col.year == year:
-                        revenue_value = revenue_series[rev_col]
-                        if revenue_value > 0 and sbc_value > 0:
-                            sbc_annual[year] = float(sbc_value)
-                            revenue_annual[year] = float(revenue_value)
-                            sbc_pct_revenue[year] = (float(sbc_value) / float(revenue_value)) * 100
-                        break
-
-            if not sbc_annual:
+            history = align_sbc(sbc, revenue)
+            if history.empty:
                 return self._create_error_result("No valid SBC data")
-
-            avg_sbc_pct = sum(sbc_pct_revenue.values()) / len(sbc_pct_revenue)
-            latest_year = max(sbc_annual.keys())
-
-            return {
-                'success': True,
-                'method': 'income_statement',
-                'sbc_annual': sbc_annual,
-                'revenue_annual': revenue_annual,
-                'sbc_pct_revenue': sbc_pct_revenue,
-                'latest_year': latest_year,
-                'latest_sbc': sbc_annual[latest_year],
-                'latest_sbc_pct': sbc_pct_revenue[latest_year],
-                'avg_sbc_pct': avg_sbc_pct,
-                'is_material': avg_sbc_pct > 3.0,
-                'years_available': len(sbc_annual),
-                'error': None
-            }
+            return build_sbc_result(history, 'income_statement')
 
         except Exception as e:
             return self._create_error_result(f"Income statement extraction failed: {str(e)}")
@@ -284,68 +379,15 @@ class SBCDetector:
         Other companies typically: 1-3% of revenue
         """
         try:
-            company = yf.Ticker(self.ticker)
-            info = company.info
-            income_stmt = company.financials
-
-            if income_stmt is None or income_stmt.empty:
+            income_stmt = self._statements()['financials']
+            if income_stmt.empty:
                 return self._create_error_result("Cannot estimate without revenue data")
 
-            # Get sector
-            sector = info.get('sector', 'Unknown')
-
-            # Estimate SBC % based on sector
-            if 'Technology' in sector or 'Software' in sector:
-                estimated_sbc_pct = 8.0  # Tech average
-            elif 'Communication' in sector or 'Internet' in sector:
-                estimated_sbc_pct = 10.0  # High SBC
-            else:
-                estimated_sbc_pct = 2.0  # Conservative estimate
-
-            # Get revenue
-            revenue_series = None
-            for rev_item in ['Total Revenue', 'Revenue']:
-                if rev_item in income_stmt.index:
-                    revenue_series = income_stmt.loc[rev_item]
-                    break
-
-            if revenue_series is None:
-                return self._create_error_result("Revenue not found")
-
-            sbc_annual = {}
-            revenue_annual = {}
-            sbc_pct_revenue = {}
-
-            for col in revenue_series.index:
-                year = col.year
-                revenue_value = revenue_series[col]
-                if revenue_value > 0:
-                    revenue_annual[year] = float(revenue_value)
-                    sbc_annual[year] = float(revenue_value * estimated_sbc_pct / 100)
-                    sbc_pct_revenue[year] = estimated_sbc_pct
-
-            if not sbc_annual:
-                return self._create_error_result("No revenue data to estimate from")
-
-            latest_year = max(sbc_annual.keys())
-
-            return {
-                'success': True,
-                'method': 'estimated',
-                'estimated': True,
-                'sbc_annual': sbc_annual,
-                'revenue_annual': revenue_annual,
-                'sbc_pct_revenue': sbc_pct_revenue,
-                'latest_year': latest_year,
-                'latest_sbc': sbc_annual[latest_year],
-                'latest_sbc_pct': estimated_sbc_pct,
-                'avg_sbc_pct': estimated_sbc_pct,
-                'is_material': estimated_sbc_pct > 3.0,
-                'years_available': len(sbc_annual),
-                'sector': sector,
-                'error': None,
-                'warning': f"SBC estimated at {estimated_sbc_pct:.1f}% based on {sector} sector average"
-            }
+            # Sector from the shared (cached) GICS classification
+            from data.sectors import classify_sectors
+            sector = classify_sectors([self.ticker]).get(self.ticker, 'Unknown')
+            return estimate_sbc_result(income_stmt, sector) or self._create_error_result(
+                "No revenue data to estimate from")
 
         except Exception as e:
             return self._create_error_result(f"Estimation failed: {str(e)}")
@@ -392,68 +434,8 @@ class SBCDetector:
                 'error': 'Insufficient historical data for trend analysis (need 2+ years)'
             }
 
-        # Sort by year
-        years = sorted(sbc_pct_history.keys())
-        percentages = [sbc_pct_history[y] for y in years]
-
-        # Calculate year-over-year changes
-        yoy_changes = []
-        for i in range(1, len(percentages)):
-            change = percentages[i] - percentages[i-1]
-            yoy_changes.append(change)
-
-        avg_annual_change = sum(yoy_changes) / len(yoy_changes)
-
-        # Determine trend direction
-        if avg_annual_change > 0.5:
-            trend_direction = 'increasing'
-        elif avg_annual_change < -0.5:
-            trend_direction = 'decreasing'
-        else:
-            trend_direction = 'stable'
-
-        # Check if normalizing (high SBC companies moving toward 3-5% range)
-        latest_sbc_pct = percentages[-1]
-        is_normalizing = latest_sbc_pct > 5.0 and trend_direction == 'decreasing'
-
-        # Forecast recommendation
-        if latest_sbc_pct > 10.0:
-            if trend_direction == 'increasing':
-                recommendation = "Very high SBC and increasing - model gradual normalization to 8-10%"
-            elif trend_direction == 'decreasing':
-                recommendation = "High SBC but declining - model continued decline to 6-8%"
-            else:
-                recommendation = "High stable SBC - maintain current levels with slight decline"
-        elif latest_sbc_pct > 5.0:
-            if trend_direction == 'increasing':
-                recommendation = "Moderate SBC and increasing - model stabilization at 6-8%"
-            elif trend_direction == 'decreasing':
-                recommendation = "Moderate SBC declining - model normalization to 3-5%"
-            else:
-                recommendation = "Moderate stable SBC - maintain current levels"
-        else:
-            recommendation = "Low SBC - maintain current low levels (2-3%)"
-
-        # Calculate volatility
-        if len(percentages) > 1:
-            mean = sum(percentages) / len(percentages)
-            variance = sum((x - mean) ** 2 for x in percentages) / len(percentages)
-            volatility = variance ** 0.5
-        else:
-            volatility = 0
-
-        return {
-            'success': True,
-            'trend_direction': trend_direction,
-            'avg_annual_change_pct': avg_annual_change,
-            'is_normalizing': is_normalizing,
-            'forecast_recommendation': recommendation,
-            'historical_years': years,
-            'historical_percentages': percentages,
-            'latest_sbc_pct': latest_sbc_pct,
-            'volatility': volatility,
-            'data_quality': 'good' if len(years) >= 3 else 'limited'
-        }
+        history = pd.Series(sbc_pct_history, dtype=float).sort_index()
+        return trend_result(history, sbc_trends(history.to_frame(self.ticker)).iloc[0])
 
     def get_forecast_inputs(self) -> Dict:
         """
@@ -467,49 +449,73 @@ class SBCDetector:
                 'success': False,
                 'error': 'No SBC data available'
             }
+        return forecast_inputs(self.sbc_data['latest_sbc_pct'], self.analyze_sbc_trend())
+
+
+def estimate_sbc_result(income_stmt: pd.DataFrame, sector: str) -> Optional[Dict]:
+    """Sector-average SBC estimate over the reported revenue years (None without revenue)."""
+    _, revenue = _annual_line(income_stmt, REVENUE_ITEMS)
+    revenue = revenue[revenue > 0].sort_index()
+    if revenue.empty:
+        return None
+    estimated_sbc_pct = sector_sbc_estimate(sector)
+    history = pd.DataFrame({'sbc': revenue * estimated_sbc_pct / 100, 'revenue': revenue,
+                            'sbc_pct': estimated_sbc_pct}).astype(float)
+    result = build_sbc_result(history, 'estimated')
+    result.update({
+        'estimated': True,
+        'sector': sector,
+        'warning': f"SBC estimated at {estimated_sbc_pct:.1f}% based on {sector} sector average"
+    })
+    return result
+
+
+def trend_result(history: pd.Series, stats: pd.Series) -> Dict:
+    """The ``analyze_sbc_trend`` dict from one ticker's history and its ``sbc_trends`` row."""
+    latest_sbc_pct = float(stats['latest_sbc_pct'])
+    return {
+        'success': True,
+        'trend_direction': stats['trend_direction'],
+        'avg_annual_change_pct': float(stats['avg_annual_change_pct']),
+        'is_normalizing': bool(stats['is_normalizing']),
+        'forecast_recommendation': forecast_recommendation(latest_sbc_pct, stats['trend_direction']),
+        'historical_years': [int(y) for y in history.index],
+        'historical_percentages': [float(v) for v in history],
+        'latest_sbc_pct': latest_sbc_pct,
+        'volatility': float(stats['volatility']),
+        'data_quality': 'good' if len(history) >= 3 else 'limited'
+    }
 
-        trend_analysis = self.analyze_sbc_trend()
-
-        if not trend_analysis['success']:
-            # Use latest data only
-            latest_sbc_pct = self.sbc_data['latest_sbc_pct']
-            return {
-                'success': True,
-                'starting_sbc_pct_revenue': latest_sbc_pct,
-                'trend': 'stable',
-                'normalization_target': max(3.0, latest_sbc_pct * 0.8),
-                'years_to_normalize': 5,
-                'data_quality': 'limited',
-                'warning': 'Limited historical data - using conservative assumptions'
-            }
-
-        # Use trend analysis for recommendations
-        latest_sbc_pct = trend_analysis['latest_sbc_pct']
-        trend = trend_analysis['trend_direction']
-
-        # Determine normalization target based on current levels
-        if latest_sbc_pct > 10.0:
-            normalization_target = 7.0
-            years_to_normalize = 7
-        elif latest_sbc_pct > 5.0:
-            normalization_target = 4.0
-            years_to_normalize = 5
-        else:
-            normalization_target = latest_sbc_pct
-            years_to_normalize = 5
 
+def forecast_inputs(latest_sbc_pct: float, trend_analysis: Dict) -> Dict:
+    """The ``get_forecast_inputs`` dict for a latest SBC % and its trend analysis."""
+    if not trend_analysis['success']:
+        # Use latest data only
         return {
             'success': True,
             'starting_sbc_pct_revenue': latest_sbc_pct,
-            'trend': trend,
-            'normalization_target': normalization_target,
-            'years_to_normalize': years_to_normalize,
-            'recommendation': trend_analysis['forecast_recommendation'],
-            'data_quality': trend_analysis['data_quality'],
-            'historical_years': trend_analysis['historical_years'],
-            'historical_percentages': trend_analysis['historical_percentages']
+            'trend': 'stable',
+            'normalization_target': max(3.0, latest_sbc_pct * 0.8),
+            'years_to_normalize': 5,
+            'data_quality': 'limited',
+            'warning': 'Limited historical data - using conservative assumptions'
         }
 
+    # Use trend analysis for recommendations
+    latest_sbc_pct = trend_analysis['latest_sbc_pct']
+    normalization_target, years_to_normalize = normalization_path(latest_sbc_pct)
+    return {
+        'success': True,
+        'starting_sbc_pct_revenue': latest_sbc_pct,
+        'trend': trend_analysis['trend_direction'],
+        'normalization_target': normalization_target,
+        'years_to_normalize': years_to_normalize,
+        'recommendation': trend_analysis['forecast_recommendation'],
+        'data_quality': trend_analysis['data_quality'],
+        'historical_years': trend_analysis['historical_years'],
+        'historical_percentages': trend_analysis['historical_percentages']
+    }
+
 
 def detect_sbc_for_company(ticker: str) -> Dict:
     """
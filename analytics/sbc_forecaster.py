@@ -52,6 +52,25 @@ class SBCForecastConfig:
     starting_sbc_amount: Optional[float] = None
     starting_revenue: Optional[float] = None
 
+    @classmethod
+    def from_forecast_inputs(
+        cls,
+        forecast_inputs: Dict,
+        method: SBCForecastMethod = SBCForecastMethod.LINEAR_NORMALIZATION,
+        forecast_years: int = 10
+    ) -> 'SBCForecastConfig':
+        """
+        Build a config from detector/screener forecast inputs
+        (``SBCDetector.get_forecast_inputs`` or ``SBCScreen.forecast_inputs``).
+        """
+        return cls(
+            method=method,
+            starting_sbc_pct_revenue=float(forecast_inputs['starting_sbc_pct_revenue']),
+            forecast_years=forecast_years,
+            normalization_target_pct=float(forecast_inputs['normalization_target']),
+            years_to_normalize=min(int(forecast_inputs['years_to_normalize']), forecast_years)
+        )
+
     def validate(self) -> Tuple[bool, Optional[str]]:
         """Validate configuration"""
         if self.starting_sbc_pct_revenue < 0:
@@ -0,0 +1,202 @@
+"""
+Bulk Share-Based Compensation (SBC) Screener
+
+Runs SBC extraction across a whole universe in one pass:
+
+1. Statements load once per ticker (``sbc_detector.load_statements``), from
+   the persistent fundamentals cache when present, with the misses fetched
+   concurrently
+2. SBC, revenue and SBC % of revenue become aligned fiscal-year x ticker
+   DataFrames
+3. Trend statistics are computed column-wise for every ticker at once
+4. A summary ranks the universe by SBC dilution: SBC as % of revenue, and
+   the annual growth in diluted share count
+
+Results feed ``SBCForecaster`` directly (``SBCScreen.forecast_config``)
+without re-fetching anything.
+
+Usage:
+    from analytics.sbc_screener import screen_sbc
+    from core.stock_universe import SP500_TICKERS
+
+    screen = screen_sbc(SP500_TICKERS)
+    screen.ranked().head(25)
+    SBCForecaster(screen.forecast_config('SNOW')).generate_sbc_forecast(revenue)
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+from analytics.sbc_detector import (
+    DILUTED_SHARES_ITEMS, MATERIALITY_THRESHOLD, SBCDetector, _annual_line, build_sbc_result,
+    estimate_sbc_result, forecast_inputs, load_statements, sbc_history, sbc_trends, trend_result,
+)
+from analytics.sbc_forecaster import SBCForecastConfig, SBCForecastMethod
+
+RANK_COLUMNS = ('latest_sbc_pct', 'avg_sbc_pct', 'share_growth_pct', 'avg_annual_change_pct')
+
+
+@dataclass
+class SBCScreen:
+    """Aligned SBC histories and per-ticker summary for a screened universe."""
+    sbc: pd.DataFrame                 # fiscal year x ticker, SBC amount
+    revenue: pd.DataFrame             # fiscal year x ticker, revenue
+    sbc_pct: pd.DataFrame             # fiscal year x ticker, SBC % of revenue
+    summary: pd.DataFrame             # one row per ticker (see screen_sbc)
+    statements: Dict[str, Dict[str, pd.DataFrame]] = field(default_factory=dict, repr=False)
+    errors: Dict[str, str] = field(default_factory=dict)
+
+    def ranked(self, by: str = 'latest_sbc_pct', material_only: bool = False,
+               include_estimated: bool = False) -> pd.DataFrame:
+        """Summary sorted by ``by`` (highest dilution first)."""
+        if by not in RANK_COLUMNS:
+            raise ValueError(f"by must be one of {RANK_COLUMNS}, got {by!r}")
+        ranked = self.summary
+        if not include_estimated:
+            ranked = ranked[ranked['method'] != 'estimated']
+        if material_only:
+            ranked = ranked[ranked['is_material']]
+        ranked = ranked.sort_values(by, ascending=False, na_position='last')
+        return ranked.assign(rank=np.arange(1, len(ranked) + 1))
+
+    def history(self, ticker: str) -> pd.DataFrame:
+        """One ticker's years x [sbc, revenue, sbc_pct] (reported years only)."""
+        ticker = ticker.upper()
+        frame = pd.DataFrame({'sbc': self.sbc[ticker], 'revenue': self.revenue[ticker],
+                              'sbc_pct': self.sbc_pct[ticker]})
+        return frame.dropna()
+
+    def sbc_data(self, ticker: str) -> Dict:
+        """The ``SBCDetector.extract_sbc_data`` dict for ``ticker``, built from the screen."""
+        ticker = ticker.upper()
+        if ticker not in self.summary.index:
+            raise KeyError(f"{ticker} was not screened successfully: {self.errors.get(ticker, 'not in universe')}")
+        row = self.summary.loc[ticker]
+        result = build_sbc_result(self.history(ticker), row['method'], row['line_item'] or None)
+        if row['method'] == 'estimated':
+            result.update({'estimated': True, 'sector': row['sector']})
+        return result
+
+    def detector(self, ticker: str) -> SBCDetector:
+        """An ``SBCDetector`` already holding this ticker's statements and extraction."""
+        ticker = ticker.upper()
+        detector = SBCDetector(ticker, statements=self.statements.get(ticker))
+        detector.sbc_data = self.sbc_data(ticker)
+        detector.extraction_success = True
+        detector.extraction_method = detector.sbc_data['method']
+        return detector
+
+    def forecast_inputs(self, ticker: str) -> Dict:
+        """The ``SBCDetector.get_forecast_inputs`` dict for ``ticker``, without re-fetching."""
+        ticker = ticker.upper()
+        history = self.history(ticker)['sbc_pct']
+        row = self.summary.loc[ticker]
+        trend = (trend_result(history, row) if len(history) >= 2
+                 else {'success': False, 'error': 'Insufficient historical data for trend analysis (need 2+ years)'})
+        return forecast_inputs(float(row['latest_sbc_pct']), trend)
+
+    def forecast_config(self, ticker: str,
+                        method: SBCForecastMethod = SBCForecastMethod.LINEAR_NORMALIZATION,
+                        forecast_years: int = 10) -> SBCForecastConfig:
+        """``SBCForecastConfig`` seeded from the screen's forecast inputs."""
+        return SBCForecastConfig.from_forecast_inputs(self.forecast_inputs(ticker), method, forecast_years)
+
+
+def _share_growth(financials: pd.DataFrame) -> float:
+    """Annualised % change in diluted share count over the reported years."""
+    _, shares = _annual_line(financials, DILUTED_SHARES_ITEMS)
+    shares = shares[shares > 0].sort_index()
+    if len(shares) < 2:
+        return np.nan
+    span = shares.index[-1] - shares.index[0]
+    return float(((shares.iloc[-1] / shares.iloc[0]) ** (1 / span) - 1) * 100) if span > 0 else np.nan
+
+
+def screen_sbc(
+    tickers: Iterable[str],
+    max_workers: int = 8,
+    fetch: bool = True,
+    estimate: bool = True,
+    loader: Optional[Callable[[str], Optional[Dict[str, pd.DataFrame]]]] = None,
+) -> SBCScreen:
+    """
+    Screen a universe for SBC in one run.
+
+    Args:
+        tickers: Ticker symbols (duplicates and case ignored)
+        max_workers: Concurrent statement loads (network-bound)
+        fetch: If False, use only statements already in the fundamentals cache
+        estimate: Fall back to sector-average SBC for tickers without an SBC
+            line item (sectors from data.sectors.classify_sectors, one batch)
+        loader: Statement loader, ``load_statements`` by default
+
+    Returns:
+        SBCScreen. ``summary`` is indexed by ticker with columns method,
+        line_item, years, latest_year, latest_sbc, latest_revenue,
+        latest_sbc_pct, avg_sbc_pct, avg_annual_change_pct, volatility,
+        trend_direction, is_normalizing, is_material, share_growth_pct, sector
+    """
+    tickers = list(dict.fromkeys(str(t).upper().strip() for t in tickers if str(t).strip()))
+    if loader is None:
+        def loader(ticker):
+            return load_statements(ticker, fetch=fetch)
+
+    def load(ticker):
+        try:
+            return loader(ticker)
+        except Exception:
+            return None
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(tickers) or 1))) as pool:
+        statements = dict(zip(tickers, pool.map(load, tickers)))
+
+    histories, meta, errors, unreported = {}, {}, {}, []
+    for ticker, loaded in statements.items():
+        if not loaded:
+            errors[ticker] = 'No financial statements available'
+            continue
+        history, method, line_item = sbc_history(loaded.get('cashflow'), loaded.get('financials'))
+        if method is None:
+            unreported.append(ticker)
+            continue
+        histories[ticker] = history
+        meta[ticker] = {'method': method, 'line_item': line_item or '', 'sector': ''}
+
+    if unreported and estimate:
+        from data.sectors import classify_sectors
+        sectors = classify_sectors(unreported, fetch=fetch)
+        for ticker in unreported:
+            result = estimate_sbc_result(statements[ticker]['financials'], sectors.get(ticker, 'Other'))
+            if result is None:
+                errors[ticker] = 'No revenue data to estimate from'
+                continue
+            histories[ticker] = pd.DataFrame({'sbc': result['sbc_annual'], 'revenue': result['revenue_annual'],
+                                              'sbc_pct': result['sbc_pct_revenue']})
+            meta[ticker] = {'method': 'estimated', 'line_item': '', 'sector': result['sector']}
+    else:
+        errors.update({t: 'Could not extract SBC from any source' for t in unreported})
+
+    if histories:
+        stacked = pd.concat(histories, names=['ticker', 'year'])
+        sbc, revenue, sbc_pct = (stacked[col].unstack('ticker').sort_index() for col in ('sbc', 'revenue', 'sbc_pct'))
+        sbc, revenue, sbc_pct = (frame.reindex(columns=list(histories)) for frame in (sbc, revenue, sbc_pct))
+    else:
+        sbc = revenue = sbc_pct = pd.DataFrame(dtype=float)
+
+    summary = sbc_trends(sbc_pct)
+    latest_year = pd.Series({t: sbc_pct[t].last_valid_index() for t in sbc_pct.columns}, dtype=float)
+    summary.insert(0, 'latest_year', latest_year.astype('Int64'))
+    summary['latest_sbc'] = sbc.ffill().iloc[-1] if len(sbc) else np.nan
+    summary['latest_revenue'] = revenue.ffill().iloc[-1] if len(revenue) else np.nan
+    summary['is_material'] = summary['avg_sbc_pct'] > MATERIALITY_THRESHOLD
+    summary['share_growth_pct'] = pd.Series(
+        {t: _share_growth(statements[t].get('financials')) for t in summary.index}, dtype=float)
+    summary = pd.DataFrame(meta, index=['method', 'line_item', 'sector']).T.reindex(summary.index).join(summary)
+    summary.index.name = 'ticker'
+
+    return SBCScreen(sbc=sbc, revenue=revenue, sbc_pct=sbc_pct, summary=summary,
+                     statements={t: statements[t] for t in histories}, errors=errors)
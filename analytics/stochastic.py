@@ -33,18 +33,25 @@ class StochasticEngine:
     Uses Geometric Brownian Motion with correlated asset movements
     """
 
-    def __init__(self, tickers: List[str], returns_data: pd.DataFrame):
+    def __init__(self, tickers: List[str], returns_data: pd.DataFrame, copula=None):
         """
         Initialize Stochastic Engine
 
         Args:
             tickers: List of ticker symbols
             returns_data: DataFrame of historical returns
+            copula: Optional dependence model for the shocks (a fitted
+                analytics.copula.CopulaFit or a family name to fit on
+                ``returns_data``); None keeps correlated normals
         """
         self.tickers = tickers
         self.returns_data = returns_data
         self.mu = returns_data.mean().values
-        self.cov = returns_data.cov().values
+        from services.covariance_service import get_covariance_service
+        self._cov = get_covariance_service().estimate(returns_data, 'sample')
+        self.cov = self._cov.values
+        from analytics.copula import resolve_copula
+        self.copula = resolve_copula(copula, returns_data)
 
     def geometric_brownian_motion(
         self,
@@ -107,11 +114,9 @@ class StochasticEngine:
         n_steps = T
 
         # Generate correlated random numbers using Cholesky decomposition
-        try:
-            L = np.linalg.cholesky(self.cov)
-        except np.linalg.LinAlgError:
-            # If covariance matrix is not positive definite, add small regularization
-            L = np.linalg.cholesky(self.cov + np.eye(n_assets) * 1e-8)
+        # (regularised with a small diagonal if not positive definite; cached)
+        L = self._cov.cholesky(jitter=1e-8)
+        rng = np.random.default_rng() if self.copula is not None else None
 
         # Initialize paths for each asset
         asset_paths = np.zeros((n_scenarios, n_steps, n_assets))
@@ -121,8 +126,12 @@ class StochasticEngine:
 
         # Simulate correlated paths
         for t in range(1, n_steps):
-            Z = np.random.standard_normal((n_scenarios, n_assets))
-            Z_corr = Z @ L.T
+            if self.copula is not None:
+                # Copula shocks at the same marginal scale as Z @ L.T
+                Z_corr = self.copula.normal_scores(n_scenarios, rng) * np.sqrt(np.diag(self.cov))
+            else:
+                Z = np.random.standard_normal((n_scenarios, n_assets))
+                Z_corr = Z @ L.T
 
             for i in range(n_assets):
                 asset_paths[:, t, i] = asset_paths[:, t-1, i] * np.exp(
@@ -170,7 +179,8 @@ class PortfolioMonteCarloEngine:
         returns: pd.DataFrame,
         current_weights: np.ndarray,
         tickers: List[str],
-        initial_portfolio_value: float = 100000
+        initial_portfolio_value: float = 100000,
+        copula=None
     ):
         """
         Initialize Portfolio Monte Carlo Engine
@@ -180,15 +190,22 @@ class PortfolioMonteCarloEngine:
             current_weights: Current portfolio weights
             tickers: List of ticker symbols
             initial_portfolio_value: Starting portfolio value
+            copula: Optional dependence model for the shocks (a fitted
+                analytics.copula.CopulaFit or a family name to fit on
+                ``returns``); None keeps correlated normals
         """
         self.returns = returns
         self.current_weights = current_weights
         self.tickers = tickers
         self.initial_value = initial_portfolio_value
+        from analytics.copula import resolve_copula
+        self.copula = resolve_copula(copula, returns)
 
         # Calculate statistical parameters
         self.mean_returns = returns.mean().values * 252  # Annualized
-        self.cov_matrix = returns.cov().values * 252  # Annualized
+        from services.covariance_service import get_covariance_service
+        self._cov = get_covariance_service().estimate(returns, 'sample', scale=252)  # Annualized
+        self.cov_matrix = self._cov.values
         self.corr_matrix = returns.corr().values
 
         # Calculate volatility for each asset
@@ -299,11 +316,9 @@ class PortfolioMonteCarloEngine:
             expected_returns = self.mean_returns
 
         # Generate correlated random numbers using Cholesky decomposition
-        try:
-            L = np.linalg.cholesky(self.cov_matrix)
-        except np.linalg.LinAlgError:
-            # Regularize if not positive definite
-            L = np.linalg.cholesky(self.cov_matrix + np.eye(n_assets) * 1e-6)
+        # (regularised with a small diagonal if not positive definite; cached)
+        L = self._cov.cholesky(jitter=1e-6)
+        rng = np.random.default_rng(random_seed) if self.copula is not None else None
 
         # Initialize asset paths
         asset_paths = np.zeros((n_simulations, n_steps + 1, n_assets))
@@ -311,9 +326,13 @@ class PortfolioMonteCarloEngine:
 
         # Simulate correlated GBM paths for each asset
         for t in range(1, n_steps + 1):
-            # Generate correlated random shocks
-            Z = np.random.standard_normal((n_simulations, n_assets))
-            Z_corr = Z @ L.T
+            # Generate correlated random shocks (copula shocks at the same
+            # marginal scale as Z @ L.T when a copula is set)
+            if self.copula is not None:
+                Z_corr = self.copula.normal_scores(n_simulations, rng) * np.sqrt(np.diag(self.cov_matrix))
+            else:
+                Z = np.random.standard_normal((n_simulations, n_assets))
+                Z_corr = Z @ L.T
 
             # Update each asset using GBM
             for i in range(n_assets):
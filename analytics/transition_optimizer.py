@@ -0,0 +1,422 @@
+"""
+ATLAS Terminal - Lot-Aware Transition Optimizer
+================================================
+Linear-programming counterpart to ``analytics.transition``: instead of
+filling phases greedily by asset-class gap, it decides how much of each tax
+lot to sell in each phase so that
+
+    CGT + transaction costs + tracking-error penalty
+
+is minimised across the whole horizon, subject to
+
+- lot sizes (a lot can only be sold once),
+- a one-way turnover cap per phase,
+- the annual CGT exclusion (one phase = one tax year),
+- short- vs long-term rates by holding period, as of each phase's date.
+
+Trades are self-funding: each phase's buys equal its sells, bought at asset
+class level. Tracking error to the target SAA is linearised as a penalty on
+absolute active weight (optionally scaled by asset-class volatility), with a
+dominant penalty on the final phase so the plan reaches target whenever the
+turnover caps allow. Loss lots may be sold to offset gains within a phase:
+losses net within each holding-period bucket, and a net loss in the bucket
+taxed at the higher (or equal) rate also offsets gains in the other. The
+reverse offset makes CGT non-convex, so with unequal rates it is left out
+and the plan errs towards overstating tax. No wash-sale rule or loss
+carry-forward is modelled.
+
+The LP is sparse (one column per lot and phase) and solved with HiGHS via
+``scipy.optimize.linprog``; 2,000 lots over a few phases solve in well
+under a second. The result is a ``TransitionPlan`` (so the SAA tool's
+panels render it unchanged) carrying the lot-level schedule as well.
+
+Usage:
+    from analytics.transition_optimizer import optimize_transition, lots_from_trades
+
+    lots = lots_from_trades(trade_history, prices, asset_classes)
+    plan = optimize_transition(lots, target_weights, max_turnover=0.20)
+    plan.lot_trades                    # phase, ticker, lot, value, gain, ...
+"""
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass, field
+from typing import Dict, List, Mapping, Optional
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from scipy.optimize import linprog
+
+from analytics.transition import PhasedTrade, TradePhase, TransitionPlan, _compute_gaps
+
+LOT_COLUMNS = ("ticker", "asset_class", "quantity", "cost_basis", "acquired", "price")
+DEFAULT_ANNUAL_EXCLUSION = 40_000.0      # SA annual exclusion for individuals
+LONG_TERM_DAYS = 365
+PERIOD_DAYS = 365
+DEFAULT_TRACKING_PENALTY = 0.01          # cost per unit |active weight| per phase
+TERMINAL_PENALTY = 1.0                   # dominates any CGT rate: reach target if feasible
+
+
+@dataclass
+class LotTransitionPlan(TransitionPlan):
+    """TransitionPlan from the optimizer, with the lot-level schedule.
+
+    lot_trades: one row per lot sold in a phase
+        (phase, date, lot_id, ticker, asset_class, quantity, value, gain, long_term)
+    buys: one row per asset class bought in a phase (phase, asset_class, value)
+    tax_by_phase: realised gains, exclusion used and CGT per phase
+    """
+    lot_trades: pd.DataFrame = field(default_factory=pd.DataFrame)
+    buys: pd.DataFrame = field(default_factory=pd.DataFrame)
+    tax_by_phase: pd.DataFrame = field(default_factory=pd.DataFrame)
+    tracking_penalty_cost: float = 0.0
+    solver_status: str = ""
+
+
+# ---------------------------------------------------------------------------
+# Lots
+# ---------------------------------------------------------------------------
+
+def lots_from_trades(
+    trades: pd.DataFrame,
+    prices: Mapping[str, float],
+    asset_classes: Mapping[str, str],
+) -> pd.DataFrame:
+    """Open tax lots (FIFO) from a trade history.
+
+    Accepts the trade-history layout saved by the Phoenix Parser
+    (date, ticker, action, quantity, price; any capitalisation).
+    Tickers without an asset class are grouped as ``Unclassified``.
+    """
+    df = trades.rename(columns=str.lower)
+    df = df.rename(columns={"trade type": "action", "symbol": "ticker"})
+    df = df.assign(date=pd.to_datetime(df["date"]),
+                   quantity=pd.to_numeric(df["quantity"], errors="coerce").abs(),
+                   price=pd.to_numeric(df["price"], errors="coerce"))
+    df = df.dropna(subset=["date", "ticker", "quantity", "price"]).sort_values("date", kind="stable")
+
+    open_lots: Dict[str, List[list]] = {}
+    for row in df.itertuples(index=False):
+        ticker = str(row.ticker).upper()
+        queue = open_lots.setdefault(ticker, [])
+        if "sell" in str(row.action).lower():
+            remaining = row.quantity
+            while remaining > 1e-12 and queue:
+                take = min(remaining, queue[0][0])
+                queue[0][0] -= take
+                remaining -= take
+                if queue[0][0] <= 1e-12:
+                    queue.pop(0)
+        else:
+            queue.append([row.quantity, row.price, row.date])
+
+    records = [
+        {"ticker": t, "asset_class": asset_classes.get(t, "Unclassified"), "quantity": q,
+         "cost_basis": basis, "acquired": date, "price": prices.get(t, np.nan)}
+        for t, queue in open_lots.items() for q, basis, date in queue
+    ]
+    return pd.DataFrame(records, columns=list(LOT_COLUMNS))
+
+
+def _prepare_lots(lots: pd.DataFrame) -> pd.DataFrame:
+    missing = [c for c in LOT_COLUMNS if c not in lots.columns]
+    if missing:
+        raise ValueError(f"lots is missing columns: {missing}")
+    lots = lots.reset_index(drop=True).copy()
+    lots["acquired"] = pd.to_datetime(lots["acquired"])
+    lots["value"] = lots["quantity"].astype(float) * lots["price"].astype(float)
+    if lots["value"].isna().any():
+        raise ValueError("every lot needs a quantity and a price")
+    lots = lots[lots["value"] > 0].reset_index(drop=True)
+    # Gain per unit of value sold (negative for a loss lot)
+    lots["gain_fraction"] = 1.0 - lots["cost_basis"].astype(float) / lots["price"].astype(float)
+    lots["lot_id"] = lots.index
+    return lots
+
+
+# ---------------------------------------------------------------------------
+# Optimizer
+# ---------------------------------------------------------------------------
+
+def optimize_transition(
+    lots: pd.DataFrame,
+    target_weights: Dict[str, float],
+    phases: Optional[int] = None,
+    cost_bps: float = 25.0,
+    cgt_rate: float = 0.18,
+    short_term_cgt_rate: Optional[float] = None,
+    long_term_days: int = LONG_TERM_DAYS,
+    annual_exclusion: float = DEFAULT_ANNUAL_EXCLUSION,
+    max_turnover: float = 0.20,
+    tracking_penalty: float = DEFAULT_TRACKING_PENALTY,
+    class_volatility: Optional[Dict[str, float]] = None,
+    as_of: Optional[pd.Timestamp] = None,
+    period_days: int = PERIOD_DAYS,
+) -> LotTransitionPlan:
+    """Cost-minimal, lot-level transition plan from ``lots`` to ``target_weights``.
+
+    Parameters
+    ----------
+    lots : DataFrame
+        One row per tax lot: ticker, asset_class, quantity, cost_basis
+        (per unit), acquired (date), price (current, per unit).
+    target_weights : dict
+        Target allocation by asset class (fractions).
+    phases : int, optional
+        Rebalance phases (tax years). Defaults to the number the greedy
+        planner needs at ``max_turnover``.
+    cost_bps : float
+        Transaction cost per side in basis points.
+    cgt_rate : float
+        Effective CGT rate on long-term gains (default 0.18 for SA CGT).
+    short_term_cgt_rate : float, optional
+        Rate on gains from lots held less than ``long_term_days`` at the
+        phase date. Defaults to ``cgt_rate`` (no holding-period distinction).
+    annual_exclusion : float
+        Net gains excluded from CGT in each phase (tax year).
+    max_turnover : float
+        Maximum one-way turnover per phase as a fraction of portfolio value.
+    tracking_penalty : float
+        Penalty per unit of absolute active weight per phase before the last.
+    class_volatility : dict, optional
+        Asset-class volatilities; active weight in volatile classes costs
+        proportionally more (normalised to mean 1).
+    as_of : Timestamp, optional
+        Date of the first phase (default today); later phases follow every
+        ``period_days``.
+
+    Returns
+    -------
+    LotTransitionPlan
+    """
+    lots = _prepare_lots(lots)
+    value = float(lots["value"].sum())
+    if value <= 0:
+        raise ValueError("lots have no market value")
+    as_of = pd.Timestamp(as_of or pd.Timestamp.today()).normalize()
+    short_rate = cgt_rate if short_term_cgt_rate is None else short_term_cgt_rate
+
+    current = (lots.groupby("asset_class")["value"].sum() / value).to_dict()
+    gaps = _compute_gaps(current, target_weights, value)
+    total_drift = sum(abs(g.delta) for g in gaps) / 2.0
+    if phases is None:
+        phases = max(1, math.ceil(total_drift / max_turnover - 1e-9)) if max_turnover > 0 else 1
+    classes = [g.asset_class for g in gaps]
+    class_idx = {c: k for k, c in enumerate(classes)}
+
+    L, C, T = len(lots), len(classes), int(phases)
+    dates = [as_of + pd.Timedelta(days=period_days * t) for t in range(T)]
+    held = np.array([(d - lots["acquired"]).dt.days.to_numpy() for d in dates]).T      # L x T
+    long_term = held >= long_term_days
+    lot_w = lots["value"].to_numpy() / value                                              # all in weights
+    lot_c = lots["asset_class"].map(class_idx).to_numpy()
+    gain = lots["gain_fraction"].to_numpy()
+    target = np.array([target_weights.get(c, 0.0) for c in classes])
+    start = np.array([current.get(c, 0.0) for c in classes])
+    vol = np.ones(C)
+    if class_volatility:
+        vol = np.array([class_volatility.get(c, np.nan) for c in classes], dtype=float)
+        vol = np.where(np.isnan(vol), np.nanmean(vol) if np.isfinite(vol).any() else 1.0, vol)
+        vol = vol / vol.mean()
+
+    # Variable layout: sells s[l,t] | buys b[c,t] | dev+ | dev- | taxable (st, lt) | exclusion (st, lt)
+    #                  | net loss carried across buckets (st -> lt, lt -> st)
+    n_s, n_b = L * T, C * T
+    o_b = n_s
+    o_dp = o_b + n_b
+    o_dm = o_dp + n_b
+    o_z = o_dm + n_b
+    o_e = o_z + 2 * T
+    o_u = o_e + 2 * T
+    n = o_u + 2 * T
+
+    def s_col(l, t):
+        return np.asarray(l) * T + np.asarray(t)
+
+    cost = cost_bps / 10_000
+    c_vec = np.zeros(n)
+    c_vec[:n_s] = 2 * cost                          # sell side + matching buy side
+    weight_pen = np.full(T, tracking_penalty)
+    weight_pen[-1] = TERMINAL_PENALTY
+    pen = (vol[:, None] * weight_pen[None, :]).ravel()        # c-major, t-minor
+    c_vec[o_dp:o_dp + n_b] = pen
+    c_vec[o_dm:o_dm + n_b] = pen
+    c_vec[o_z:o_z + T] = short_rate
+    c_vec[o_z + T:o_z + 2 * T] = cgt_rate
+
+    lots_idx = np.repeat(np.arange(L), T)
+    periods = np.tile(np.arange(T), L)
+
+    # Equalities: buys = sells per phase; end-of-phase class weight - target = dev+ - dev-
+    eq_rows, eq_cols, eq_vals = [], [], []
+    eq_rows += [periods, np.arange(C * T) % T]
+    eq_cols += [s_col(lots_idx, periods), o_b + np.arange(C * T)]
+    eq_vals += [-np.ones(n_s), np.ones(n_b)]
+    b_eq = np.zeros(T + C * T)
+    # Sales in phase tau reduce the lot's class weight in every phase t >= tau
+    for tau in range(T):
+        ts = np.arange(tau, T)
+        rows_s = T + (lot_c[:, None] * T + ts[None, :]).ravel()
+        cols_s = np.repeat(s_col(np.arange(L), tau), len(ts))
+        eq_rows.append(rows_s)
+        eq_cols.append(cols_s)
+        eq_vals.append(-np.ones(len(rows_s)))
+        rows_b = T + (np.arange(C)[:, None] * T + ts[None, :]).ravel()
+        cols_b = o_b + np.repeat(np.arange(C) * T + tau, len(ts))
+        eq_rows.append(rows_b)
+        eq_cols.append(cols_b)
+        eq_vals.append(np.ones(len(rows_b)))
+    dev = np.arange(C * T)
+    eq_rows += [T + dev, T + dev]
+    eq_cols += [o_dp + dev, o_dm + dev]
+    eq_vals += [-np.ones(n_b), np.ones(n_b)]
+    b_eq[T:] = np.repeat(target - start, T)
+    A_eq = sparse.csr_matrix((np.concatenate(eq_vals), (np.concatenate(eq_rows), np.concatenate(eq_cols))),
+                             shape=(T + C * T, n))
+
+    # Inequalities: lot size | turnover per phase | taxable gain per bucket | exclusion per phase.
+    # A carry u moves a net loss out of its bucket (raising that bucket's row) into the other.
+    r_lot, r_turn, r_tax, r_excl = 0, L, L + T, L + 3 * T
+    lt_flat = long_term.ravel()
+    buckets = np.arange(2 * T)
+    ub_rows = [r_lot + lots_idx, r_turn + periods,
+               r_tax + periods + T * lt_flat,
+               r_tax + buckets, r_tax + buckets,
+               r_tax + buckets, r_tax + (buckets + T) % (2 * T),
+               r_excl + np.tile(np.arange(T), 2)]
+    ub_cols = [s_col(lots_idx, periods), s_col(lots_idx, periods), s_col(lots_idx, periods),
+               o_z + buckets, o_e + buckets,
+               o_u + buckets, o_u + buckets,
+               o_e + buckets]
+    ub_vals = [np.ones(n_s), np.ones(n_s), np.repeat(gain, T),
+               -np.ones(2 * T), -np.ones(2 * T),
+               np.ones(2 * T), -np.ones(2 * T),
+               np.ones(2 * T)]
+    A_ub = sparse.csr_matrix((np.concatenate(ub_vals), (np.concatenate(ub_rows), np.concatenate(ub_cols))),
+                             shape=(L + 4 * T, n))
+    b_ub = np.concatenate([lot_w, np.full(T, max_turnover), np.zeros(2 * T),
+                           np.full(T, annual_exclusion / value)])
+
+    # Only carry losses out of the bucket with the higher (or equal) rate: the other
+    # direction would let the LP tax high-rate gains at the low rate
+    carries = _carry_directions(short_rate, cgt_rate)
+    bounds = [(0, None)] * o_u + [(0, None if ok else 0) for ok in carries for _ in range(T)]
+    result = linprog(c_vec, A_ub=A_ub, b_ub=b_ub, A_eq=A_eq, b_eq=b_eq, bounds=bounds, method="highs")
+    if result.status != 0:
+        raise ValueError(f"transition LP did not solve: {result.message}")
+    x = result.x
+
+    sells = np.clip(x[:n_s].reshape(L, T), 0, None) * value
+    sells[sells < 1e-6 * value] = 0.0
+    buys = np.clip(x[o_b:o_dp].reshape(C, T), 0, None) * value
+    buys[buys < 1e-6 * value] = 0.0
+    active = (x[o_dp:o_dm] - x[o_dm:o_z]).reshape(C, T)
+    taxable = x[o_z:o_e].reshape(2, T) * value
+    return _build_plan(lots, classes, dates, sells, buys, active, taxable, long_term,
+                       gaps, total_drift, value, cost, cgt_rate, short_rate, max_turnover, cost_bps,
+                       float(pen @ np.abs(active).ravel()) * value, result.message)
+
+
+def _carry_directions(short_rate: float, cgt_rate: float):
+    """Whether a net (short-term -> long-term, long-term -> short-term) loss may offset the other bucket."""
+    return short_rate >= cgt_rate, cgt_rate >= short_rate
+
+
+def _net_gains(realised: np.ndarray, short_rate: float, cgt_rate: float) -> np.ndarray:
+    """Per-phase (short, long) gains after carrying net losses across buckets."""
+    net = realised.copy()
+    for src, ok in enumerate(_carry_directions(short_rate, cgt_rate)):
+        if ok:
+            dst = 1 - src
+            carry = np.minimum(np.clip(-net[src], 0, None), np.clip(net[dst], 0, None))
+            net[src] += carry
+            net[dst] -= carry
+    return net
+
+
+def _build_plan(lots, classes, dates, sells, buys, active, taxable, long_term,
+                gaps, total_drift, value, cost, cgt_rate, short_rate, max_turnover, cost_bps,
+                tracking_cost, status) -> LotTransitionPlan:
+    """Assemble the LP solution into TransitionPlan phases plus lot-level tables."""
+    L, T = sells.shape
+    l_idx, t_idx = np.nonzero(sells)
+    lot_trades = pd.DataFrame({
+        "phase": t_idx + 1,
+        "date": [dates[t] for t in t_idx],
+        "lot_id": lots["lot_id"].to_numpy()[l_idx],
+        "ticker": lots["ticker"].to_numpy()[l_idx],
+        "asset_class": lots["asset_class"].to_numpy()[l_idx],
+        "acquired": lots["acquired"].to_numpy()[l_idx],
+        "quantity": sells[l_idx, t_idx] / lots["price"].to_numpy()[l_idx],
+        "value": sells[l_idx, t_idx],
+        "gain": sells[l_idx, t_idx] * lots["gain_fraction"].to_numpy()[l_idx],
+        "long_term": long_term[l_idx, t_idx],
+    }).sort_values(["phase", "asset_class", "ticker", "lot_id"], ignore_index=True)
+    lot_trades["rate"] = np.where(lot_trades["long_term"], cgt_rate, short_rate)
+
+    c_idx, bt_idx = np.nonzero(buys)
+    buy_frame = pd.DataFrame({"phase": bt_idx + 1, "asset_class": [classes[c] for c in c_idx],
+                              "value": buys[c_idx, bt_idx]}).sort_values(["phase", "asset_class"],
+                                                                         ignore_index=True)
+
+    tax = short_rate * taxable[0] + cgt_rate * taxable[1]
+    grouped = lot_trades.groupby(["phase", "long_term"])["gain"].sum()
+    realised = np.array([[grouped.get((t + 1, lt), 0.0) for t in range(T)] for lt in (False, True)])
+    tax_by_phase = pd.DataFrame({
+        "phase": np.arange(1, T + 1),
+        "date": dates,
+        "short_term_gain": realised[0],
+        "long_term_gain": realised[1],
+        "exclusion_used": np.clip(np.clip(_net_gains(realised, short_rate, cgt_rate), 0, None).sum(axis=0)
+                                  - taxable.sum(axis=0), 0, None),
+        "cgt": tax,
+    })
+
+    phases: List[TradePhase] = []
+    for t in range(T):
+        in_phase = lot_trades[lot_trades["phase"] == t + 1]
+        # Attribute the phase's CGT to asset classes by their rate-weighted realised gains
+        taxed = (in_phase["gain"] * in_phase["rate"]).groupby(in_phase["asset_class"]).sum().clip(lower=0)
+        share = taxed / taxed.sum() if taxed.sum() > 0 else taxed * 0.0
+        trades = []
+        for ac, sold in in_phase.groupby("asset_class")["value"].sum().items():
+            trades.append(PhasedTrade(asset_class=ac, action="SELL", weight_change=sold / value,
+                                      trade_value=sold, transaction_cost=sold * cost,
+                                      cgt_exposure=float(share.get(ac, 0.0) * tax[t])))
+        for row in buy_frame[buy_frame["phase"] == t + 1].itertuples(index=False):
+            trades.append(PhasedTrade(asset_class=row.asset_class, action="BUY", weight_change=row.value / value,
+                                      trade_value=row.value, transaction_cost=row.value * cost,
+                                      cgt_exposure=0.0))
+        if not trades:
+            continue
+        phases.append(TradePhase(
+            phase_number=t + 1,
+            trades=trades,
+            total_turnover=sum(tr.weight_change for tr in trades if tr.action == "SELL"),
+            total_cost=sum(tr.transaction_cost for tr in trades),
+            total_cgt=float(tax[t]),
+            cumulative_drift=float(np.abs(active[:, t]).sum() / 2.0),
+        ))
+
+    total_txn = sum(p.total_cost for p in phases)
+    total_cgt = float(tax.sum())
+    return LotTransitionPlan(
+        gaps=gaps,
+        total_drift=total_drift,
+        phases=phases,
+        phases_required=len(phases),
+        total_transaction_cost=total_txn,
+        total_cgt_exposure=total_cgt,
+        total_implementation_cost=total_txn + total_cgt,
+        performance_drag_bps=(total_txn + total_cgt) / value * 10_000,
+        portfolio_value=value,
+        cost_bps=cost_bps,
+        cgt_rate=cgt_rate,
+        max_turnover=max_turnover,
+        lot_trades=lot_trades,
+        buys=buy_frame,
+        tax_by_phase=tax_by_phase,
+        tracking_penalty_cost=tracking_cost,
+        solver_status=status,
+    )
@@ -0,0 +1,434 @@
+"""
+ATLAS Terminal - GARCH-Family Volatility Engine
+===============================================
+Pure NumPy conditional volatility models (no R runtime):
+
+    garch    h_t = w + a e_{t-1}^2 + b h_{t-1}                        (GARCH(1,1))
+    gjr      h_t = w + (a + g 1[e_{t-1} < 0]) e_{t-1}^2 + b h_{t-1}    (GJR-GARCH)
+    egarch   ln h_t = w + a (|z_{t-1}| - E|z|) + g z_{t-1} + b ln h_{t-1}
+
+Constant mean, Gaussian quasi-likelihood, h_0 backcast from the first
+observations.
+
+``fit_garch`` fits every column of a returns frame in one call: the
+variance recursion runs once over time on whole asset vectors, the
+analytic gradient is carried along the same recursion, and every asset
+takes its own Newton step in one batched linear solve. Parameters are
+optimised in an unconstrained space that keeps every fitted model
+positive and stationary, with omega tied to the long-run variance.
+Shorter histories (leading NaN) are allowed: an asset's variance starts
+at its own first observation. Assets whose likelihood is too flat to pin
+down (no volatility clustering at all) are reported with
+``converged=False`` in ``GARCHFit.params``.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+MODELS = ("garch", "gjr", "egarch")
+MODEL_ALIASES = {"sgarch": "garch", "garch": "garch", "gjrgarch": "gjr", "gjr": "gjr",
+                 "gjr-garch": "gjr", "egarch": "egarch"}
+PARAM_NAMES = ("omega", "alpha", "gamma", "beta")
+TRADING_DAYS = 252
+_ABS_Z_MEAN = np.sqrt(2.0 / np.pi)
+_LOG_2PI = np.log(2.0 * np.pi)
+# Optimiser settings
+_MAX_STEP = 1.0                     # largest move of any unconstrained parameter per step
+_FD_STEP = 1e-6                     # Hessian by differencing analytic gradients
+_MIN_STEP = 1.0 / 32                # line-search fraction below which an asset stops
+_U_BOUND = 10.0                     # persistence below 1 - 5e-5; shares above ~5e-5
+_LEVEL_BOUND = 3.0                  # long-run variance within e^3 of the sample variance
+
+
+def _model_name(model: str) -> str:
+    try:
+        return MODEL_ALIASES[model.lower()]
+    except KeyError:
+        raise ValueError(f"model must be one of {MODELS} (or rugarch names), got {model!r}") from None
+
+
+def _sigmoid(x):
+    return 1.0 / (1.0 + np.exp(-x))
+
+
+# ---------------------------------------------------------------------------
+# Parameter transforms: unconstrained u (k x N) -> natural (omega, alpha, gamma, beta)
+# ---------------------------------------------------------------------------
+
+def _natural(model: str, u: np.ndarray, var: np.ndarray):
+    """Natural parameters (4 x N) and Jacobian d natural / d u (4 x k x N)."""
+    k, n = u.shape
+    theta = np.zeros((4, n))
+    jac = np.zeros((4, k, n))
+    # omega is tied to the long-run level (u0), so persistence can move
+    # without dragging the unconditional variance along with it
+    if model == "egarch":
+        beta = np.tanh(u[3])
+        dbeta = 1.0 - beta ** 2
+        level = np.log(var) + u[0]                  # long-run ln h = ln var + u0
+        theta[0] = (1.0 - beta) * level
+        theta[1], theta[2], theta[3] = u[1], u[2], beta
+        jac[0, 0], jac[0, 3] = 1.0 - beta, -level * dbeta
+        jac[1, 1] = jac[2, 2] = 1.0
+        jac[3, 3] = dbeta
+        return theta, jac
+
+    p = _sigmoid(u[1])                              # persistence
+    dp = p * (1.0 - p)
+    omega = var * (1.0 - p) * np.exp(u[0])          # long-run variance = var * e^u0
+    theta[0], jac[0, 0], jac[0, 1] = omega, omega, -omega * p
+    if model == "garch":
+        s = _sigmoid(u[2])                          # alpha's share of the persistence
+        ds = s * (1.0 - s)
+        theta[1], theta[3] = p * s, p * (1.0 - s)
+        jac[1, 1], jac[1, 2] = s * dp, p * ds
+        jac[3, 1], jac[3, 2] = (1.0 - s) * dp, -p * ds
+        return theta, jac
+
+    # gjr: shares of (alpha, gamma / 2, beta) via softmax(u2, u3, 0)
+    ex = np.exp(np.vstack([u[2], u[3], np.zeros(n)]) - np.maximum(np.maximum(u[2], u[3]), 0.0))
+    s = ex / ex.sum(axis=0)
+    scale = np.array([1.0, 2.0, 1.0])
+    for i, row in enumerate((1, 2, 3)):
+        theta[row] = scale[i] * p * s[i]
+        jac[row, 1] = scale[i] * s[i] * dp
+        for j, col in enumerate((2, 3)):
+            jac[row, col] = scale[i] * p * s[i] * ((i == j) - s[j])
+    return theta, jac
+
+
+def _initial(model: str, var: np.ndarray) -> np.ndarray:
+    n = len(var)
+    if model == "egarch":
+        beta = 0.95
+        return np.vstack([np.zeros(n), np.full(n, 0.1), np.full(n, -0.05),
+                          np.full(n, np.arctanh(beta))])
+    base = [np.zeros(n), np.full(n, np.log(0.95 / 0.05))]
+    if model == "garch":
+        return np.vstack(base + [np.full(n, np.log(0.08 / 0.87))])
+    # gjr: alpha 0.05, gamma 0.06 (gamma/2 = 0.03), beta 0.87
+    return np.vstack(base + [np.full(n, np.log(0.05 / 0.87)), np.full(n, np.log(0.03 / 0.87))])
+
+
+# ---------------------------------------------------------------------------
+# Likelihood recursion (all assets at once)
+# ---------------------------------------------------------------------------
+
+def _backcast(eps: np.ndarray, mask: np.ndarray, var: np.ndarray, span: int = 75,
+              decay: float = 0.94) -> np.ndarray:
+    """Starting variance h_0: decay-weighted mean of each asset's first
+    ``span`` squared residuals (the usual backcast), so the fit does not
+    spend parameters walking from the full-sample variance to the local level."""
+    start = var.copy()
+    weights = decay ** np.arange(span)
+    for j in range(eps.shape[1]):
+        first = eps[mask[:, j], j][:span] ** 2
+        if len(first):
+            w = weights[:len(first)]
+            start[j] = max(float(w @ first / w.sum()), 1e-12)
+    return start
+
+
+def _recursion(model: str, theta: np.ndarray, eps: np.ndarray, mask: np.ndarray,
+               start: np.ndarray, grad: bool = True):
+    """Log-likelihood per asset and variances (T x N); with ``grad`` also the
+    score wrt theta (4 x N) and its outer-product sum (4 x 4 x N).
+
+    Only the variance recursion itself loops over time; likelihood terms
+    and scores are summed in one pass afterwards.
+    """
+    T, n = eps.shape
+    omega, alpha, gamma, beta = theta
+    eps2 = eps ** 2
+    # An asset's variance restarts at ``start`` on its first observation
+    first = mask.argmax(axis=0)
+    restarts = {}
+    for j in np.flatnonzero(first > 0):
+        restarts.setdefault(int(first[j]), []).append(j)
+    h = np.empty((T, n))
+    h[0] = start
+    dlog = np.zeros((T, 4, n)) if grad else None    # d ln h_t / d theta
+
+    if model == "egarch":
+        lh = np.log(start)
+        lo, hi = lh - 30.0, lh + 30.0
+        for t in range(1, T):
+            z = eps[t - 1] * np.exp(-0.5 * lh)
+            az = np.abs(z)
+            if grad:
+                d = (beta - 0.5 * (alpha * az + gamma * z)) * dlog[t - 1]
+                d[0] += 1.0
+                d[1] += az - _ABS_Z_MEAN
+                d[2] += z
+                d[3] += lh
+                dlog[t] = d
+            lh = np.clip(omega + alpha * (az - _ABS_Z_MEAN) + gamma * z + beta * lh, lo, hi)
+            cols = restarts.get(t)
+            if cols is not None:
+                lh[cols] = np.log(start[cols])
+                if grad:
+                    dlog[t][:, cols] = 0.0
+            h[t] = np.exp(lh)
+    else:
+        shock = (alpha + gamma * (eps < 0)) * eps2
+        for t in range(1, T):
+            h[t] = omega + shock[t - 1] + beta * h[t - 1]
+            cols = restarts.get(t)
+            if cols is not None:
+                h[t, cols] = start[cols]
+        if grad:
+            # d h_t = [1, e^2, 1[e<0] e^2, h]_{t-1} + beta d h_{t-1}
+            drive = np.empty((T, 4, n))
+            drive[:, 0] = 1.0
+            drive[1:, 1] = eps2[:-1]
+            drive[1:, 2] = np.where(eps[:-1] < 0, eps2[:-1], 0.0)
+            drive[1:, 3] = h[:-1]
+            dh = dlog
+            for t in range(1, T):
+                dh[t] = drive[t] + beta * dh[t - 1]
+                cols = restarts.get(t)
+                if cols is not None:
+                    dh[t][:, cols] = 0.0
+            dlog /= h[:, None, :]
+
+    ratio = eps2 / h
+    loglik = -0.5 * (mask * (_LOG_2PI + np.log(h) + ratio)).sum(axis=0)
+    if not grad:
+        return loglik, h
+    score = (-0.5 * mask * (1.0 - ratio))[:, None, :] * dlog
+    return loglik, h, score.sum(axis=0), np.einsum('tin,tjn->ijn', score, score)
+
+
+def _score(model, u, eps, mask, var, start):
+    """Log-likelihood, gradient wrt u (k x N) and BHHH matrix (N x k x k)."""
+    theta, jac = _natural(model, u, var)
+    ll, _, dll, opg = _recursion(model, theta, eps, mask, start)
+    grad = np.einsum('in,ikn->kn', dll, jac)
+    return ll, grad, np.einsum('ikn,ijn,jln->nkl', jac, opg, jac)
+
+
+def _maximize(model: str, u: np.ndarray, eps: np.ndarray, mask: np.ndarray, var: np.ndarray,
+              start: np.ndarray, counts: np.ndarray, max_iter: int, tol: float):
+    """Maximise every asset's likelihood at once with damped Newton steps.
+
+    The likelihoods are separable across assets, so nudging one parameter
+    for all assets together and differencing the analytic gradients gives
+    every asset's full Hessian from k extra recursions. Where that Hessian
+    is not negative definite the step falls back to BHHH (outer product of
+    scores). Steps are capped, kept inside the parameter bounds, then
+    backtracked (Armijo) per asset. An asset stops once its Newton
+    decrement, or its likelihood gain, per observation falls below
+    ``tol``; later iterations only touch the assets still moving. Returns
+    the parameters and a per-asset converged flag.
+    """
+    k, n = u.shape
+    eye = np.eye(k)
+    bound = np.full((k, 1), _U_BOUND)
+    bound[0] = _LEVEL_BOUND
+    ll, grad, opg = _score(model, u, eps, mask, var, start)
+    active = np.ones(n, dtype=bool)
+    stalled = np.zeros(n, dtype=bool)
+    for _ in range(max_iter):
+        idx = np.flatnonzero(active)
+        if not idx.size:
+            break
+        ua, g, data = u[:, idx], grad[:, idx], (eps[:, idx], mask[:, idx], var[idx], start[idx])
+        m = len(idx)
+        hess = np.empty((m, k, k))
+        for j in range(k):
+            bumped = ua.copy()
+            bumped[j] += _FD_STEP
+            hess[:, :, j] = ((_score(model, bumped, *data)[1] - g) / _FD_STEP).T
+        curvature = -0.5 * (hess + hess.transpose(0, 2, 1))
+        concave = np.isfinite(curvature).all(axis=(1, 2))
+        concave[concave] = np.linalg.eigvalsh(curvature[concave])[:, 0] > 0
+        curvature[~concave] = opg[idx][~concave]
+        curvature += 1e-10 * counts[idx, None, None] * eye
+        # Parameters pinned at a bound and pushing outwards are held fixed
+        pinned = ((ua <= -bound) & (g < 0)) | ((ua >= bound) & (g > 0))
+        if pinned.any():
+            free = (~pinned).T.astype(float)
+            curvature = curvature * free[:, :, None] * free[:, None, :] + eye * (1.0 - free)[:, :, None]
+            g = np.where(pinned, 0.0, g)
+        step = np.linalg.solve(curvature, g.T[:, :, None])[:, :, 0].T
+        # Flat likelihood ridges give huge steps: cap them (a crude trust region)
+        step /= np.maximum(np.abs(step).max(axis=0) / _MAX_STEP, 1.0)
+        decrement = (g * step).sum(axis=0)
+        moving = np.isfinite(decrement) & (decrement / counts[idx] > tol)
+
+        size = np.ones(m)
+        pending = moving.copy()
+        for _ in range(12):
+            trial = np.clip(ua + size * step, -bound, bound)
+            cand = _recursion(model, _natural(model, trial, data[2])[0], data[0], data[1], data[3],
+                              grad=False)[0]
+            ok = pending & np.isfinite(cand) & (cand >= ll[idx] + 1e-4 * size * decrement)
+            ua[:, ok] = trial[:, ok]
+            pending &= ~ok
+            if not pending.any():
+                break
+            size = np.where(pending, size * 0.5, size)
+        # No improving step, or only a sliver of one, along the search
+        # direction: the local model is useless there, so stop that asset
+        # (reported as not converged)
+        pending |= moving & (size < _MIN_STEP)
+        stalled[idx] |= pending
+        u[:, idx] = ua
+        prev = ll[idx]
+        ll[idx], grad[:, idx], opg[idx] = _score(model, ua, *data)
+        # Boundary optima (e.g. alpha -> 0) are approached along a flat
+        # direction; stop once the likelihood has stopped moving
+        active[idx] = moving & ~pending & ((ll[idx] - prev) / counts[idx] > tol)
+    return u, ~active & ~stalled
+
+
+# ---------------------------------------------------------------------------
+# Results
+# ---------------------------------------------------------------------------
+
+@dataclass
+class GARCHFit:
+    """Fitted volatility model(s) for one or more assets (daily units)."""
+    model: str
+    params: pd.DataFrame                 # one row per asset
+    conditional_volatility: pd.DataFrame  # daily sigma_t, dates x assets
+    residuals: pd.DataFrame              # demeaned returns
+    next_variance: pd.Series             # h_{T+1}
+    converged: bool = True
+
+    @property
+    def assets(self):
+        return list(self.params.index)
+
+    def forecast(self, horizon: int = 10) -> pd.DataFrame:
+        """Daily volatility forecasts sigma_{T+1..T+horizon} (horizon x assets).
+
+        GARCH/GJR use the closed-form mean reversion to the long-run
+        variance; EGARCH iterates the log-variance recursion with the
+        shock terms at their expectation.
+        """
+        p = self.params
+        steps = np.arange(horizon)[:, None]
+        h1 = self.next_variance.reindex(p.index).to_numpy()
+        if self.model == "egarch":
+            beta, omega = p['beta'].to_numpy(), p['omega'].to_numpy()
+            lh = np.empty((horizon, len(p)))
+            lh[0] = np.log(h1)
+            for k in range(1, horizon):
+                lh[k] = omega + beta * lh[k - 1]
+            var = np.exp(lh)
+        else:
+            persistence = p['persistence'].to_numpy()
+            long_run = p['long_run_variance'].to_numpy()
+            var = long_run + persistence ** steps * (h1 - long_run)
+        return pd.DataFrame(np.sqrt(var), index=pd.RangeIndex(1, horizon + 1, name='horizon'),
+                            columns=p.index)
+
+    def term_structure(self, horizons: Sequence[int] = (1, 5, 10, 21, 63, 126, 252),
+                       annualize: bool = True) -> pd.DataFrame:
+        """Volatility over the next H days for each horizon H (horizons x assets).
+
+        sqrt of the average forecast variance, annualised by default.
+        """
+        horizons = list(horizons)
+        daily_var = self.forecast(max(horizons)) ** 2
+        cum = daily_var.cumsum()
+        avg = pd.DataFrame({h: cum.loc[h] / h for h in horizons}).T
+        avg.index.name = 'horizon'
+        return np.sqrt(avg * (TRADING_DAYS if annualize else 1.0))
+
+    def summary(self, asset=None) -> Dict[str, object]:
+        """The fields the old R ``garch_volatility`` returned, for one asset."""
+        asset = self.assets[0] if asset is None else asset
+        vol = self.conditional_volatility[asset].dropna()
+        return {
+            'model': self.model,
+            'last_volatility': float(vol.iloc[-1]) if len(vol) else float('nan'),
+            'mean_volatility': float(vol.mean()) if len(vol) else float('nan'),
+            'next_volatility': float(np.sqrt(self.next_variance[asset])),
+            'volatility': vol,
+            **{k: float(self.params.loc[asset, k]) for k in PARAM_NAMES + ('persistence', 'loglik')},
+        }
+
+
+# ---------------------------------------------------------------------------
+# Fitting
+# ---------------------------------------------------------------------------
+
+def fit_garch(
+    returns: Union[pd.Series, pd.DataFrame],
+    model: str = "garch",
+    max_iter: int = 50,
+    tol: float = 1e-7,
+) -> GARCHFit:
+    """Fit ``model`` to every column of ``returns`` in one batch.
+
+    Parameters
+    ----------
+    returns : Series or DataFrame
+        Daily simple or log returns (dates x assets). NaN before an
+        asset's first observation is fine; later gaps count as no shock.
+    model : {'garch', 'gjr', 'egarch'} (rugarch names 'sGARCH', 'gjrGARCH', 'eGARCH' accepted)
+
+    Returns
+    -------
+    GARCHFit with per-asset parameters, conditional volatility and forecasts.
+    """
+    model = _model_name(model)
+    frame = returns.to_frame() if isinstance(returns, pd.Series) else returns
+    frame = frame.astype(float)
+    X = frame.to_numpy()
+    mask = ~np.isnan(X)
+    counts = mask.sum(axis=0)
+    if (counts < 20).any():
+        short = list(frame.columns[counts < 20])
+        raise ValueError(f"need at least 20 observations per asset; too short: {short}")
+    mean = np.nanmean(X, axis=0)
+    eps = np.where(mask, X - mean, 0.0)
+    var = (eps ** 2).sum(axis=0) / counts
+    var = np.where(var > 0, var, 1e-12)
+
+    n = X.shape[1]
+    start = _backcast(eps, mask, var)
+    u, converged = _maximize(model, _initial(model, var), eps, mask, var, start, counts, max_iter, tol)
+    theta, _ = _natural(model, u, var)
+    ll, h = _recursion(model, theta, eps, mask, start, grad=False)
+    next_h = _recursion(model, theta, np.vstack([eps, np.zeros((1, n))]),
+                        np.vstack([mask, np.zeros((1, n), dtype=bool)]), start, grad=False)[1][-1]
+
+    omega, alpha, gamma, beta = theta
+    if model == "egarch":
+        persistence = beta
+        long_run = np.exp(omega / (1.0 - beta))
+    else:
+        persistence = alpha + gamma / 2.0 + beta
+        long_run = omega / np.maximum(1.0 - persistence, 1e-12)
+    params = pd.DataFrame({
+        'omega': omega, 'alpha': alpha, 'gamma': gamma, 'beta': beta,
+        'persistence': persistence,
+        'long_run_variance': long_run,
+        'long_run_volatility': np.sqrt(long_run * TRADING_DAYS),
+        'mean': mean,
+        'loglik': ll,
+        'n_obs': counts,
+        'converged': converged,
+    }, index=frame.columns)
+    started = np.maximum.accumulate(mask, axis=0)
+    cond_vol = pd.DataFrame(np.where(started, np.sqrt(h), np.nan), index=frame.index, columns=frame.columns)
+    return GARCHFit(
+        model=model,
+        params=params,
+        conditional_volatility=cond_vol,
+        residuals=pd.DataFrame(np.where(mask, eps, np.nan), index=frame.index, columns=frame.columns),
+        next_variance=pd.Series(next_h, index=frame.columns),
+        converged=bool(converged.all()),
+    )
+
+
+def garch_volatility(returns: pd.Series, model: str = "garch") -> Dict[str, object]:
+    """Single-series convenience: ``fit_garch(returns, model).summary()``."""
+    return fit_garch(returns, model).summary()
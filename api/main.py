@@ -59,7 +59,7 @@ app.add_middleware(
 )
 
 # Register routers
-from api.routers import portfolio, optimisation, regime, saa, commentary, health, billing, sandbox  # noqa: E402
+from api.routers import portfolio, optimisation, regime, saa, commentary, health, billing, sandbox, jobs  # noqa: E402
 
 app.include_router(health.router, prefix="/v1", tags=["Health & Admin"])
 app.include_router(portfolio.router, prefix="/v1/portfolio", tags=["Portfolio Analytics"])
@@ -68,4 +68,5 @@ app.include_router(regime.router, prefix="/v1/regime", tags=["Market Intelligenc
 app.include_router(saa.router, prefix="/v1/macro", tags=["Strategic Asset Allocation"])
 app.include_router(commentary.router, prefix="/v1/commentary", tags=["Commentary"])
 app.include_router(billing.router, prefix="/v1", tags=["Billing"])
+app.include_router(jobs.router, prefix="/v1", tags=["Background Jobs"])
 app.include_router(sandbox.router, prefix="/v1/sandbox", tags=["Sandbox (Testing)"])
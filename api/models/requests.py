@@ -100,3 +100,14 @@ class ManagerCommentaryRequest(BaseModel):
     mandate_type: str = Field("")
     fee_structure: str = Field("")
     tone: Literal["institutional", "concise", "detailed"] = "institutional"
+
+
+# ---------------------------------------------------------------------------
+# Background Jobs
+# ---------------------------------------------------------------------------
+
+class EnqueueJobRequest(BaseModel):
+    """POST /v1/jobs"""
+    kind: str = Field(..., description="Job handler, e.g. 'ingest_tickers'")
+    payload: dict = Field(default_factory=dict, description="Handler arguments (no secrets)")
+    max_attempts: int = Field(3, ge=1, le=10)
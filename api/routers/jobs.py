@@ -0,0 +1,61 @@
+"""
+ATLAS API — Background Job Status
+===================================
+GET  /v1/jobs                — recent jobs (filter by status / kind)
+GET  /v1/jobs/{job_id}       — one job: status, attempts, progress, result
+POST /v1/jobs                — enqueue a job (deduplicated)
+POST /v1/jobs/{job_id}/cancel
+
+Delegates to services/jobs — zero business logic here.
+"""
+from __future__ import annotations
+
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException
+
+from api.auth import APIUser, require_tier
+from api.models.requests import EnqueueJobRequest
+
+router = APIRouter()
+
+
+@router.get("/jobs")
+async def list_jobs(
+    status: Optional[str] = None,
+    kind: Optional[str] = None,
+    limit: int = 50,
+    user: APIUser = Depends(require_tier("admin")),
+):
+    """Most recent jobs first."""
+    from services.jobs import list_jobs as _list_jobs
+    return {"jobs": _list_jobs(status=status, kind=kind, limit=min(max(limit, 1), 500))}
+
+
+@router.get("/jobs/{job_id}")
+async def get_job(job_id: str, user: APIUser = Depends(require_tier("admin"))):
+    """Status, attempts, progress counters and result of one job."""
+    from services.jobs import get_job as _get_job
+    job = _get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return job
+
+
+@router.post("/jobs")
+async def enqueue_job(req: EnqueueJobRequest, user: APIUser = Depends(require_tier("admin"))):
+    """Queue a job; an identical queued or running job is returned instead."""
+    from services.jobs import enqueue
+    from services.jobs.handlers import HANDLERS
+    if req.kind not in HANDLERS:
+        raise HTTPException(status_code=422, detail=f"Unknown job kind '{req.kind}'")
+    return enqueue(req.kind, req.payload, max_attempts=req.max_attempts).to_dict()
+
+
+@router.post("/jobs/{job_id}/cancel")
+async def cancel_job(job_id: str, user: APIUser = Depends(require_tier("admin"))):
+    """Cancel a queued job, or ask a running one to stop."""
+    from services.jobs import cancel_job as _cancel_job
+    if not _cancel_job(job_id):
+        raise HTTPException(status_code=409, detail=f"Job {job_id} is unknown or already finished")
+    return {"job_id": job_id, "cancelled": True}
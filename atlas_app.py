@@ -51,19 +51,24 @@ import streamlit as st
 # ============================================================================
 # EARLY BOOT DIAGNOSTICS - TRACE IMPORT FAILURES
 # ============================================================================
+# Heavy dependencies (yfinance, scipy, sklearn, networkx, plotly, the DCF /
+# Monte Carlo / PM-optimisation engines) are NOT imported here. Page modules
+# import what they need when navigation/registry._load_handler loads them, so
+# a cold start only pays for the shell. Each stage below is timed and the
+# profile is printed once all imports complete.
 import sys
+import importlib.util
 print(f"[BOOT] Python {sys.version}", flush=True)
 print(f"[BOOT] Starting imports...", flush=True)
 print(f"[BOOT] Global socket timeout set to 15s", flush=True)
 
+from core.monitoring import BootProfiler
+_boot = BootProfiler()
+
 import warnings
 import time
 from datetime import datetime, timedelta, date
 from pathlib import Path
-import numpy as np
-import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
 print(f"[BOOT] Standard libs + streamlit OK", flush=True)
 
 # ============================================================================
@@ -86,7 +91,8 @@ st.set_page_config(
 # ============================================================================
 # CSS/JS STYLING - Extracted to ui/atlas_css.py (Phase 1 Refactoring)
 # ============================================================================
-from ui.atlas_css import init_atlas_css
+with _boot.stage("ui.atlas_css"):
+    from ui.atlas_css import init_atlas_css
 init_atlas_css()
 
 # Background layers — real divs instead of ::before/::after pseudo-elements
@@ -97,252 +103,44 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # ATLAS Table Formatting - Global typography for tables (Inter font, Bloomberg style)
-from core.atlas_table_formatting import inject_table_css
+with _boot.stage("core.atlas_table_formatting"):
+    from core.atlas_table_formatting import inject_table_css
 inject_table_css()
 
-# PHASE 1 REFACTORING: Centralized configuration
-print(f"[BOOT] Importing app.config...", flush=True)
-from app.config import (
-    COLORS, CHART_HEIGHT_COMPACT, CHART_HEIGHT_STANDARD,
-    CHART_HEIGHT_LARGE, CHART_HEIGHT_DEEP_DIVE, CHART_THEME,
-    CACHE_DIR, PORTFOLIO_CACHE, TRADE_HISTORY_CACHE,
-    ACCOUNT_HISTORY_CACHE, RISK_FREE_RATE, MARKET_RETURN
-)
-
 # ============================================================================
 # PHASE 2A: NAVIGATION SYSTEM (New modular architecture)
 # ============================================================================
-print(f"[BOOT] Importing navigation...", flush=True)
-from navigation import PAGE_REGISTRY, get_page_by_key, route_to_page
-print(f"[BOOT] navigation OK", flush=True)
+with _boot.stage("navigation"):
+    from navigation import route_to_page
 
 # PHASE 1B: VERTICAL SIDEBAR NAVIGATION (Fomo-inspired)
-print(f"[BOOT] Importing ui.components...", flush=True)
-from ui.components import render_sidebar_navigation
-print(f"[BOOT] ui.components OK", flush=True)
-
-# PHASE 2A: ENHANCED COMPONENTS (Fomo-inspired)
-print(f"[BOOT] Importing ui.components extended...", flush=True)
-from ui.components import (
-    # Badges
-    badge, render_badge, badge_group,
-    # Enhanced Tables
-    atlas_table, atlas_table_with_badges,
-    # Chart Theme
-    create_line_chart, create_performance_chart,
-    ATLAS_TEMPLATE, ATLAS_COLORS
-)
-print(f"[BOOT] ui.components extended OK", flush=True)
+with _boot.stage("ui.components"):
+    from ui.components import render_sidebar_navigation
 
-# ATLAS v12.0: Professional Blue Theme System
-print(f"[BOOT] Importing ui.theme...", flush=True)
-try:
-    from ui.theme import (
-        ATLAS_COLORS as PROFESSIONAL_COLORS,
-        CHART_COLORS as PROFESSIONAL_CHART_COLORS,
-        CHART_FILLS,
-        FONTS,
-        SPACING,
-        CHART_LAYOUT,
-        get_color,
-        get_semantic_color,
-        format_percentage as fmt_pct,
-        format_currency as fmt_curr,
-    )
-    from ui.charts_professional import (
-        apply_atlas_theme as apply_professional_theme,
-        create_performance_chart as create_pro_performance_chart,
-        create_bar_chart as create_pro_bar_chart,
-        create_donut_chart as create_pro_donut_chart,
-        create_gauge_chart as create_pro_gauge_chart,
-    )
-    PROFESSIONAL_THEME_AVAILABLE = True
-    print("✅ Professional Blue Theme System loaded")
-except ImportError as e:
-    PROFESSIONAL_THEME_AVAILABLE = False
-    print(f"⚠️ Professional Theme not available: {e}")
-print(f"[BOOT] ui.theme done", flush=True)
 
 # ============================================================================
-# BROKER INTEGRATION SYSTEM (Alpaca, Easy Equities, Manual Entry)
+# FEATURE FLAGS - resolved without importing the optional layers
 # ============================================================================
-print(f"[BOOT] Importing broker manager...", flush=True)
-try:
-    from atlas_broker_manager import BrokerManager, ManualPortfolioAdapter
-    from atlas_broker_manager import display_manual_portfolio_editor
-    BROKER_MANAGER_AVAILABLE = True
-    print("✅ Broker Manager loaded (Alpaca, Easy Equities, Manual Entry)")
-except ImportError as e:
-    BROKER_MANAGER_AVAILABLE = False
-    print(f"⚠️ Broker Manager not available: {e}")
-print(f"[BOOT] broker manager done", flush=True)
-
-# Auto-install streamlit_option_menu if missing
-print(f"[BOOT] Importing streamlit_option_menu...", flush=True)
-try:
-    from streamlit_option_menu import option_menu
-except ImportError:
-    import subprocess
-    import sys
-    print("📦 Installing streamlit-option-menu...")
-    subprocess.check_call([sys.executable, "-m", "pip", "install", "-q", "streamlit-option-menu>=0.3.6"])
-    from streamlit_option_menu import option_menu
-    print("✅ streamlit-option-menu installed successfully!")
-print(f"[BOOT] streamlit_option_menu done", flush=True)
-
-print(f"[BOOT] Importing yfinance, scipy, sklearn...", flush=True)
-import yfinance as yf
-from scipy import stats
-from scipy.optimize import minimize
-import networkx as nx
-from sklearn.preprocessing import StandardScaler
-from sklearn.decomposition import PCA
-from sklearn.linear_model import LinearRegression
-print(f"[BOOT] yfinance, scipy, sklearn OK", flush=True)
-
-# ATLAS v10.0 Advanced Modules
-print(f"[BOOT] Importing v10.0 modules...", flush=True)
-try:
-    from valuation.atlas_dcf_engine import DCFValuation
-    from risk_analytics.atlas_monte_carlo import MonteCarloSimulation
-    from risk_analytics.atlas_risk_metrics import RiskAnalytics
-    from portfolio_tools.atlas_phoenix_mode import PhoenixMode
-    from analytics.atlas_performance_attribution import PerformanceAttribution
-    from ui.atlas_enhanced_components import (
-        create_allocation_chart,
-        create_performance_chart,
-        create_drawdown_chart,
-        create_risk_return_scatter
-    )
-    V10_MODULES_AVAILABLE = True
-except ImportError as e:
-    V10_MODULES_AVAILABLE = False
-    print(f"⚠️ v10.0 modules not available: {e}")
-
-# ATLAS v11.0 SQL & R Integration
-try:
-    from data import get_db
-    SQL_AVAILABLE = True
-    print("✅ SQL data layer loaded")
-except ImportError as e:
-    SQL_AVAILABLE = False
-    print(f"⚠️ SQL layer not available: {e}")
-
-# ATLAS v11.0 DCF Trap Detection System
-try:
-    from analytics.dcf_trap_detector import DCFTrapDetector, analyze_dcf_traps
-    DCF_TRAP_DETECTION_AVAILABLE = True
-    print("✅ DCF Trap Detection System loaded")
-except ImportError as e:
-    DCF_TRAP_DETECTION_AVAILABLE = False
-    print(f"⚠️ DCF Trap Detection not available: {e}")
-
-# ATLAS v11.0 Model Inputs Dashboard
-try:
-    from analytics.model_inputs_ui import display_model_inputs_dashboard
-    MODEL_INPUTS_DASHBOARD_AVAILABLE = True
-    print("✅ Model Inputs Dashboard loaded")
-except ImportError as e:
-    MODEL_INPUTS_DASHBOARD_AVAILABLE = False
-    print(f"⚠️ Model Inputs Dashboard not available: {e}")
+def _module_available(name: str) -> bool:
+    """True if ``name`` is importable, without importing it."""
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
 
-# ============================================================================
-# INSTITUTIONAL-GRADE DCF ENHANCEMENTS (January 2026)
-# ============================================================================
-try:
-    from atlas_dcf_institutional import (
-        DCFAssumptionManager,
-        DCFValidator,
-        RobustDCFEngine,
-        MonteCarloDCF,
-        display_validation_warnings,
-        display_monte_carlo_results
-    )
-    INSTITUTIONAL_DCF_AVAILABLE = True
-    print("✅ Institutional-Grade DCF Enhancements loaded")
-except ImportError as e:
-    INSTITUTIONAL_DCF_AVAILABLE = False
-    print(f"⚠️ Institutional DCF not available: {e}")
-
-# ATLAS v11.0 SBC Integration
-try:
-    from analytics.sbc_forecaster import (
-        SBCForecaster,
-        SBCForecastConfig,
-        SBCForecastMethod,
-        integrate_sbc_with_fcff,
-        create_sbc_comparison_analysis
-    )
-    from analytics.sbc_ui import display_sbc_valuation_impact
-    SBC_AVAILABLE = True
-    print("✅ SBC Integration loaded")
-except ImportError as e:
-    SBC_AVAILABLE = False
-    print(f"⚠️ SBC Integration not available: {e}")
 
-# ============================================================================
-# PM-GRADE PORTFOLIO OPTIMIZATION (January 2026)
-# ============================================================================
-try:
-    from atlas_pm_optimization import (
-        PMGradeOptimizer,
-        AsymmetricRiskOptimizer,
-        MarketRegimeDetector,
-        ForwardLookingReturns,
-        display_regime_analysis,
-        display_optimization_results
-    )
-    PM_OPTIMIZATION_AVAILABLE = True
-    print("✅ PM-Grade Optimization loaded")
-except ImportError as e:
-    PM_OPTIMIZATION_AVAILABLE = False
-    PMGradeOptimizer = None
-    AsymmetricRiskOptimizer = None
-    MarketRegimeDetector = None
-    ForwardLookingReturns = None
-    display_regime_analysis = None
-    display_optimization_results = None
-    print(f"⚠️ PM-Grade Optimization not available: {e}")
-
-# ATLAS v11.0 Multi-Stage DCF
-try:
-    from analytics.multistage_ui import (
-        display_model_selection,
-        visualize_stage_transitions,
-        display_multistage_results
-    )
-    from analytics.multistage_dcf import (
-        MultiStageProjectionEngine,
-        calculate_multistage_dcf
-    )
-    MULTISTAGE_DCF_AVAILABLE = True
-    print("✅ Multi-Stage DCF loaded")
-except ImportError as e:
-    MULTISTAGE_DCF_AVAILABLE = False
-    print(f"⚠️ Multi-Stage DCF not available: {e}")
-
-try:
-    from r_analytics import get_r
-    R_AVAILABLE = True
-    print("✅ R analytics layer loaded")
-except ImportError as e:
-    R_AVAILABLE = False
-    print(f"⚠️ R analytics not available: {e}")
-
-# ATLAS REFACTORING - Phase 1 Infrastructure (Week 1)
-try:
-    from atlas_terminal.core.cache_manager import cached, cache_manager
-    from atlas_terminal.core.error_handler import safe_execute, ErrorHandler
-    from atlas_terminal.data.fetchers.market_data import market_data
-    REFACTORED_MODULES_AVAILABLE = True
-    print("✅ ATLAS Refactored Infrastructure loaded (Cache + Error + Data)")
-except ImportError as e:
-    REFACTORED_MODULES_AVAILABLE = False
-    print(f"⚠️ Refactored modules not available: {e}")
+# ATLAS v11.0 SQL & R Integration
+SQL_AVAILABLE = _module_available("sqlalchemy")
+R_AVAILABLE = _module_available("r_analytics")
+# PM-Grade Portfolio Optimization (January 2026)
+PM_OPTIMIZATION_AVAILABLE = _module_available("atlas_pm_optimization")
+print(f"[BOOT] Feature flags: SQL={SQL_AVAILABLE} R={R_AVAILABLE} "
+      f"PM_OPT={PM_OPTIMIZATION_AVAILABLE}", flush=True)
 
 print(f"[BOOT] ========================================", flush=True)
 print(f"[BOOT] ALL IMPORTS COMPLETE - Starting app...", flush=True)
 print(f"[BOOT] ========================================", flush=True)
+_boot.report()
 
 warnings.filterwarnings("ignore")
 
@@ -352,44 +150,6 @@ warnings.filterwarnings("ignore")
 st.session_state['r_available'] = R_AVAILABLE
 st.session_state['sql_available'] = SQL_AVAILABLE
 
-# ============================================================================
-# HELPER FUNCTIONS FOR VALIDATION
-# ============================================================================
-
-
-
-
-
-
-
-
-# Formatting utilities - imported from utils/formatting.py
-from utils.formatting import format_currency, format_percentage, format_large_number, add_arrow_indicator
-
-
-# ============================================================================
-# GICS SECTOR CLASSIFICATION - Extracted to data/sectors.py (Phase 2)
-# ============================================================================
-from data.sectors import (
-    GICS_SECTORS, GICS_SECTOR_MAPPING, STOCK_SECTOR_OVERRIDES, SPY_SECTOR_WEIGHTS,
-    get_benchmark_sector_returns
-)
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
 # =============================================================================
 # RERUN LOOP PROTECTION - DO NOT REMOVE
 # =============================================================================
@@ -418,53 +178,6 @@ else:
         st.error("Rerun loop detected! App has rerun more than 15 times in rapid succession.")
         st.stop()
 
-# ============================================================================
-# CHART THEME FUNCTION & COLORSCALES
-# ============================================================================
-
-
-COLORSCALES = {
-    "viridis": px.colors.sequential.Viridis,
-    "plasma": px.colors.sequential.Plasma,
-    "turbo": px.colors.sequential.Turbo,
-    "rdylgn": px.colors.diverging.RdYlGn,
-    "spectral": px.colors.diverging.Spectral,
-}
-
-
-# ============================================================================
-# CONSTANTS & CONFIG - Now imported from app.config
-# ============================================================================
-
-# ============================================================================
-# MARKET DATA DICTIONARIES - Extracted to data/instruments.py (Phase 2)
-# ============================================================================
-from data.instruments import (
-    GLOBAL_INDICES, CRYPTOCURRENCIES, FX_PAIRS, BOND_YIELDS,
-    CREDIT_SPREADS, COMMODITIES, POPULAR_STOCKS, POPULAR_ETFS,
-    FACTOR_DEFINITIONS, ETF_SECTORS
-)
-
-# ============================================================
-# Phase 4: Core module imports (explicit — wildcard removed)
-# ============================================================
-from core.data_loading import get_current_portfolio_metrics
-
-
-# ============================================================================
-# HELPER FUNCTIONS - format_currency, format_percentage, format_large_number,
-# add_arrow_indicator now imported from utils/formatting.py
-# ============================================================================
-
-
-
-
-
-# ============================================================================
-# PROFESSIONAL ENHANCEMENTS - ATLAS v9.4 EXCELLENCE EDITION
-# ============================================================================
-
-
 # ============================================================================
 # MAIN APP - EXCELLENCE EDITION
 # ============================================================================
@@ -500,7 +213,13 @@ def main():
             from services.supabase_client import get_supabase_client
             from services.market_data import start_scheduler
             _md_supabase = get_supabase_client()
-            start_scheduler(_md_supabase)
+            try:
+                from services.jobs import get_job_store
+                _job_store = get_job_store()
+            except Exception as _jobs_err:
+                print(f"[MAIN] Job queue unavailable, nightly sync runs in-process: {_jobs_err}", flush=True)
+                _job_store = None
+            start_scheduler(_md_supabase, job_store=_job_store)
             st.session_state["scheduler_started"] = True
             print("[MAIN] Market data scheduler running.", flush=True)
         except Exception as _sched_err:
@@ -528,6 +247,7 @@ def main():
     # ============================================================================
     # Initialize equity tracking from performance history if available
     print(f"[MAIN] Initializing session state... ({_t.time() - _main_start:.2f}s)", flush=True)
+    from core.data_loading import get_current_portfolio_metrics
     if 'equity_capital' not in st.session_state:
         # Try to get equity from performance history first
         metrics = get_current_portfolio_metrics()
@@ -805,6 +525,11 @@ def main():
 # ============================================================================
 # RUN THE APP
 # ============================================================================
+if os.environ.get("ATLAS_BOOT_ONLY") == "1":
+    # Import-time profiling / regression test: stop before rendering any page
+    print("[BOOT] ATLAS_BOOT_ONLY=1 - skipping main()", flush=True)
+    sys.exit(0)
+
 print("[BOOT] Calling main()...", flush=True)
 try:
     main()
@@ -0,0 +1,267 @@
+"""
+ATLAS Quantitative Dashboard — Incremental Metric State
+Layer: Computation (stateful accumulator over the pure engines)
+Purpose: Update series-level metrics by appending new daily returns
+         instead of recomputing them from the full history
+
+The state keeps running power sums, log-return sums, capture sums, the
+wealth index and its peak, drawdown-episode aggregates, the rolling series
+already computed and the tail of the history needed for the next rolling
+window. ``update()`` compares the incoming history with what it has seen:
+
+  - identical             → nothing to do
+  - same prefix + new rows → only the new rows are folded in
+  - anything else (a revised or shortened history) → full rebuild
+
+``snapshot()`` returns the same values as the corresponding functions in
+performance_metrics / statistical_metrics on the full history.
+Inputs must be NaN-free (the dashboard's data contract drops NaNs).
+"""
+import numpy as np
+import pandas as pd
+from typing import Dict, Optional
+from atlas_quant_dashboard.analytics import rolling_kernels as rk
+from atlas_quant_dashboard.analytics.statistical_metrics import sharpe_stability_summary
+TRADING_DAYS = 252
+ROLLING_WINDOWS = (21, 63, 126, 252)
+BETA_WINDOW = 63
+STABILITY_WINDOW = 63
+# Rows of history needed to extend every rolling series by one day
+_TAIL = max(max(ROLLING_WINDOWS), BETA_WINDOW) - 1
+class IncrementalMetricState:
+    """Append-only accumulator for portfolio-vs-benchmark series metrics."""
+    def __init__(self):
+        self.reset()
+    def reset(self):
+        self.dates: Optional[pd.DatetimeIndex] = None
+        self.port = np.empty(0)
+        self.bench = np.empty(0)
+        self.rebuilds = 0
+        self.appends = 0
+        # Power sums of (r - shift) for moments, shifted to avoid cancellation
+        self._shift = 0.0
+        self._active_shift = 0.0
+        self._s = np.zeros(5)           # n, Σx, Σx², Σx³, Σx⁴
+        self._active = np.zeros(3)      # n, Σa, Σa² of (p - b - active_shift)
+        self._down = np.zeros(3)        # n, Σd, Σd² of negative returns
+        self._log_p = 0.0
+        self._log_b = 0.0
+        self._up = np.zeros(3)          # n, Σlog1p(p), Σlog1p(b) where b > 0
+        self._dn = np.zeros(3)          # same where b < 0
+        self._min = np.inf
+        self._max = -np.inf
+        # Wealth / drawdown
+        self._wealth = np.empty(0)
+        self._bench_wealth = np.empty(0)
+        self._dd = np.empty(0)
+        self._peak = 1.0
+        self._dd_open: Optional[list] = None   # [start index, min depth]
+        self._dd_count = 0
+        self._dd_depth_sum = 0.0
+        self._dd_depth_min = 0.0
+        self._dd_dur_sum = 0
+        self._dd_dur_max = 0
+        # Rolling series
+        self._rolling: Dict[str, np.ndarray] = {}
+        # Last fitted distribution parameters (warm start for refits)
+        self.fit_params: dict = {}
+    # ─── UPDATE ───────────────────────────────────────────────────────────────
+    def update(self, portfolio_returns: pd.Series, benchmark_returns: pd.Series) -> str:
+        """
+        Bring the state up to date with the given full history.
+        Returns 'unchanged', 'append' or 'rebuild'.
+        """
+        dates = pd.DatetimeIndex(portfolio_returns.index)
+        p = portfolio_returns.to_numpy(dtype=float)
+        b = benchmark_returns.reindex(portfolio_returns.index).to_numpy(dtype=float)
+        if np.isnan(p).any() or np.isnan(b).any():
+            raise ValueError("IncrementalMetricState requires NaN-free aligned returns")
+        n = len(self.port)
+        if (n and len(p) >= n and dates[:n].equals(self.dates)
+                and np.array_equal(p[:n], self.port) and np.array_equal(b[:n], self.bench)):
+            if len(p) == n:
+                return "unchanged"
+            self._extend(dates[n:], p[n:], b[n:])
+            self.appends += 1
+            return "append"
+        fit_params, rebuilds, appends = self.fit_params, self.rebuilds, self.appends
+        self.reset()
+        self.fit_params, self.rebuilds, self.appends = fit_params, rebuilds, appends
+        self._shift = float(p.mean()) if len(p) else 0.0
+        self._active_shift = float((p - b).mean()) if len(p) else 0.0
+        self._extend(dates, p, b)
+        self.rebuilds += 1
+        return "rebuild"
+    def _extend(self, dates: pd.DatetimeIndex, p: np.ndarray, b: np.ndarray):
+        offset = len(self.port)
+        # Moments and sums
+        x = p - self._shift
+        self._s += [len(x), x.sum(), (x ** 2).sum(), (x ** 3).sum(), (x ** 4).sum()]
+        a = p - b - self._active_shift
+        self._active += [len(a), a.sum(), (a ** 2).sum()]
+        d = p[p < 0]
+        self._down += [len(d), d.sum(), (d ** 2).sum()]
+        lp, lb = np.log1p(p), np.log1p(b)
+        self._log_p += lp.sum()
+        self._log_b += lb.sum()
+        up, dn = b > 0, b < 0
+        self._up += [up.sum(), lp[up].sum(), lb[up].sum()]
+        self._dn += [dn.sum(), lp[dn].sum(), lb[dn].sum()]
+        if len(p):
+            self._min = min(self._min, float(p.min()))
+            self._max = max(self._max, float(p.max()))
+        # Wealth index continues the previous product sequentially
+        last_w = self._wealth[-1] if len(self._wealth) else 1.0
+        last_bw = self._bench_wealth[-1] if len(self._bench_wealth) else 1.0
+        wealth = np.cumprod(np.concatenate([[last_w], 1 + p]))[1:]
+        bench_wealth = np.cumprod(np.concatenate([[last_bw], 1 + b]))[1:]
+        peak = np.maximum.accumulate(np.concatenate([[self._peak], wealth]))[1:]
+        dd = (wealth - peak) / peak
+        if len(peak):
+            self._peak = float(peak[-1])
+        self._fold_drawdowns(dd, offset)
+        # Rolling series: run the kernels over the retained tail + new rows
+        tail_p = np.concatenate([self.port[-_TAIL:], p]) if offset else p
+        tail_b = np.concatenate([self.bench[-_TAIL:], b]) if offset else b
+        k = len(p)
+        new = {}
+        for w in ROLLING_WINDOWS:
+            new[f"rolling_sharpe_{w}"] = rk.rolling_sharpe(tail_p, w, ddof=0)[-k:]
+            new[f"rolling_vol_{w}"] = rk.rolling_volatility(tail_p, w)[-k:]
+            new[f"rolling_returns_{w}"] = rk.rolling_compound_return(tail_p, w)[-k:]
+        new["rolling_beta"] = rk.rolling_beta(tail_p, tail_b, BETA_WINDOW)[-k:]
+        for key, values in new.items():
+            self._rolling[key] = np.concatenate([self._rolling.get(key, np.empty(0)), values])
+        self.dates = dates if self.dates is None else self.dates.append(dates)
+        self.port = np.concatenate([self.port, p])
+        self.bench = np.concatenate([self.bench, b])
+        self._wealth = np.concatenate([self._wealth, wealth])
+        self._bench_wealth = np.concatenate([self._bench_wealth, bench_wealth])
+        self._dd = np.concatenate([self._dd, dd])
+    def _fold_drawdowns(self, dd: np.ndarray, offset: int):
+        """Fold new drawdown values into the episode aggregates."""
+        if not len(dd):
+            return
+        flags = (dd < 0).astype(np.int8)
+        edges = np.diff(np.concatenate([[1 if self._dd_open else 0], flags, [0]]))
+        starts = np.flatnonzero(edges == 1)
+        ends = np.flatnonzero(edges == -1)          # exclusive, relative to chunk
+        if self._dd_open is not None:
+            starts = np.concatenate([[0], starts])
+        for s, e in zip(starts, ends):
+            depth = float(dd[s:e].min()) if e > s else 0.0
+            start = offset + s
+            if s == 0 and self._dd_open is not None:
+                start, depth = self._dd_open[0], min(depth, self._dd_open[1])
+                self._dd_open = None
+            if e < len(dd):
+                self._close_episode(depth, offset + e - start)
+            else:
+                self._dd_open = [start, depth]
+    def _close_episode(self, depth: float, duration: int):
+        self._dd_count += 1
+        self._dd_depth_sum += depth
+        self._dd_depth_min = min(self._dd_depth_min, depth)
+        self._dd_dur_sum += duration
+        self._dd_dur_max = max(self._dd_dur_max, duration)
+    # ─── SNAPSHOT ─────────────────────────────────────────────────────────────
+    def _annualise(self, log_sum: float, n: float) -> float:
+        return float(np.exp(log_sum * TRADING_DAYS / n) - 1) if n > 0 else 0.0
+    def _moments(self) -> dict:
+        n, s1, s2, s3, s4 = self._s
+        mu = s1 / n
+        m2 = s2 / n - mu ** 2
+        m3 = s3 / n - 3 * mu * s2 / n + 2 * mu ** 3
+        m4 = s4 / n - 4 * mu * s3 / n + 6 * mu ** 2 * s2 / n - 3 * mu ** 4
+        return {
+            "mean_daily": float(self._shift + mu),
+            "std_daily": float(np.sqrt(max(m2, 0.0) * n / (n - 1))) if n > 1 else float("nan"),
+            "skewness": float(m3 / m2 ** 1.5) if m2 > 0 else float("nan"),
+            "excess_kurtosis": float(m4 / m2 ** 2 - 3) if m2 > 0 else float("nan"),
+            "min_return": float(self._min),
+            "max_return": float(self._max),
+            "n_observations": int(n),
+        }
+    @staticmethod
+    def _sample_std(n: float, s1: float, s2: float) -> float:
+        if n < 2:
+            return float("nan")
+        return float(np.sqrt(max(s2 - s1 * s1 / n, 0.0) / (n - 1)))
+    def _drawdown_anatomy(self) -> dict:
+        count, depth_sum, depth_min = self._dd_count, self._dd_depth_sum, self._dd_depth_min
+        dur_sum, dur_max = self._dd_dur_sum, self._dd_dur_max
+        if self._dd_open is not None:
+            duration = len(self._dd) - self._dd_open[0]
+            count += 1
+            depth_sum += self._dd_open[1]
+            depth_min = min(depth_min, self._dd_open[1])
+            dur_sum += duration
+            dur_max = max(dur_max, duration)
+        if count == 0:
+            return {
+                "max_drawdown": 0.0,
+                "avg_drawdown": 0.0,
+                "max_duration_days": 0,
+                "avg_duration_days": 0,
+                "drawdown_count": 0,
+                "drawdown_frequency_per_year": 0.0,
+            }
+        years = len(self._dd) / TRADING_DAYS
+        return {
+            "max_drawdown": float(depth_min),
+            "avg_drawdown": float(depth_sum / count),
+            "max_duration_days": int(dur_max),
+            "avg_duration_days": int(dur_sum / count),
+            "drawdown_count": count,
+            "drawdown_frequency_per_year": round(count / years, 2) if years > 0 else 0.0,
+        }
+    def snapshot(self) -> dict:
+        """Series-level metrics for the history seen so far (keys as in compute_all_metrics)."""
+        n = len(self.port)
+        if n == 0:
+            raise ValueError("IncrementalMetricState.snapshot() called before update()")
+        idx = self.dates
+        moments = self._moments()
+        ann_ret = self._annualise(self._log_p, n)
+        std = moments["std_daily"]
+        ann_vol = float(std * np.sqrt(TRADING_DAYS))
+        sharpe = float(moments["mean_daily"] / std * np.sqrt(TRADING_DAYS)) if std > 0 else 0.0
+        downside_dev = self._sample_std(*self._down) * np.sqrt(TRADING_DAYS)
+        sortino = 0.0 if downside_dev == 0 else float(ann_ret / downside_dev)
+        max_dd = float(self._dd.min())
+        calmar = 0.0 if max_dd == 0 else float(ann_ret / abs(max_dd))
+        te = self._sample_std(*self._active) * np.sqrt(TRADING_DAYS)
+        ann_active = ann_ret - self._annualise(self._log_b, n)
+        ir = 0.0 if te == 0 else float(ann_active / te)
+        up_capture = down_capture = 0.0
+        n_up, up_p, up_b = self._up
+        if n_up > 5:
+            bench_up = self._annualise(up_b, n_up)
+            up_capture = float(self._annualise(up_p, n_up) / bench_up) if bench_up != 0 else 0.0
+        n_dn, dn_p, dn_b = self._dn
+        if n_dn > 5:
+            bench_dn = self._annualise(dn_b, n_dn)
+            down_capture = float(self._annualise(dn_p, n_dn) / bench_dn) if bench_dn != 0 else 0.0
+        results = {
+            "ann_return": ann_ret,
+            "ann_vol": ann_vol,
+            "sharpe": sharpe,
+            "sortino": sortino,
+            "calmar": calmar,
+            "tracking_error": float(te),
+            "ir": ir,
+            "up_capture": up_capture,
+            "down_capture": down_capture,
+            "convexity": float(up_capture / down_capture) if down_capture != 0 else 0.0,
+            "cum_returns": pd.Series(self._wealth, index=idx),
+            "bench_cum_returns": pd.Series(self._bench_wealth, index=idx),
+            "drawdown_series": pd.Series(self._dd, index=idx),
+            "drawdown_anatomy": self._drawdown_anatomy(),
+            "max_drawdown": max_dd,
+            "return_moments": moments,
+        }
+        for key, values in self._rolling.items():
+            results[key] = pd.Series(values, index=idx)
+        stability = results[f"rolling_sharpe_{STABILITY_WINDOW}"].dropna()
+        results["sharpe_stability"] = sharpe_stability_summary(stability)
+        return results
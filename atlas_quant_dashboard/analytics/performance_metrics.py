@@ -6,6 +6,7 @@ Purpose: All performance analytics for the Performance Intelligence module
 import numpy as np
 import pandas as pd
 from typing import Optional, Tuple
+from atlas_quant_dashboard.analytics import rolling_kernels as rk
 # ─── ANNUALISATION ────────────────────────────────────────────────────────────
 TRADING_DAYS = 252
 def annualise_return(daily_returns: pd.Series) -> float:
@@ -171,22 +172,15 @@ def rolling_sharpe(
     window: int = 63,
     risk_free_rate: float = 0.0
 ) -> pd.Series:
-    """Rolling Sharpe ratio over a given window."""
+    """Rolling Sharpe ratio over a given window (population std, as before)."""
     daily_rf = (1 + risk_free_rate) ** (1 / TRADING_DAYS) - 1
-    excess = daily_returns - daily_rf
-    def _sharpe(x):
-        if x.std() == 0:
-            return np.nan
-        return (x.mean() / x.std()) * np.sqrt(TRADING_DAYS)
-    return excess.rolling(window).apply(_sharpe, raw=True)
+    return rk.rolling_sharpe(daily_returns, window, daily_rf=daily_rf, ddof=0)
 def rolling_returns(
     daily_returns: pd.Series,
     window: int = 63
 ) -> pd.Series:
     """Rolling annualised returns over a given window."""
-    def _ann_ret(x):
-        return (1 + x).prod() ** (TRADING_DAYS / len(x)) - 1
-    return daily_returns.rolling(window).apply(_ann_ret, raw=True)
+    return rk.rolling_compound_return(daily_returns, window, annualise=True)
 def rolling_volatility(
     daily_returns: pd.Series,
     window: int = 63
@@ -199,17 +193,7 @@ def rolling_beta(
     window: int = 63
 ) -> pd.Series:
     """Rolling OLS beta vs benchmark."""
-    aligned_p, aligned_b = portfolio_returns.align(benchmark_returns, join='inner')
-    result = pd.Series(index=aligned_p.index, dtype=float)
-    for i in range(window - 1, len(aligned_p)):
-        p_slice = aligned_p.iloc[i - window + 1:i + 1].values
-        b_slice = aligned_b.iloc[i - window + 1:i + 1].values
-        var_b = np.var(b_slice, ddof=1)
-        if var_b > 0:
-            result.iloc[i] = np.cov(p_slice, b_slice, ddof=1)[0][1] / var_b
-        else:
-            result.iloc[i] = np.nan
-    return result
+    return rk.rolling_beta(portfolio_returns, benchmark_returns, window)
 # ─── CONTRIBUTION ANALYSIS ────────────────────────────────────────────────────
 def return_contribution(
     asset_returns: pd.DataFrame,
@@ -29,10 +29,18 @@ def covariance_matrix(
     """
     Compute covariance matrix from returns DataFrame.
     method: 'sample' | 'ledoit_wolf' (recommended for small samples)
+            | 'ewma' (RiskMetrics, lambda 0.94) | 'factor' (statistical PCA)
     window: if provided, use trailing window only
     """
     data = returns.iloc[-window:] if window else returns
     data = data.dropna(how='all', axis=1).fillna(0)
+    try:
+        from analytics.covariance import ESTIMATORS
+        from services.covariance_service import get_covariance_service
+    except ImportError:
+        ESTIMATORS = ()
+    if method in ESTIMATORS:
+        return get_covariance_service().estimate(data, method).to_frame()
     if method == "ledoit_wolf":
         try:
             from sklearn.covariance import LedoitWolf
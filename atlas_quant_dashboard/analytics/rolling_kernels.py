@@ -0,0 +1,214 @@
+"""
+ATLAS Quantitative Dashboard — Rolling Statistics Kernels
+Layer: Computation (stateless, pure functions)
+Purpose: O(n) vectorised rolling windows for one series or a whole returns matrix
+
+Every kernel works on a 1-D series or a 2-D (dates × assets) matrix in one
+pass: window sums come from differences of cumulative sums, rolling maxima
+from block prefix/suffix maxima (van Herk / Gil-Werman), so cost does not
+depend on the window length and there is no per-window Python call.
+
+Inputs may be ndarray, Series or DataFrame; the output has the same type,
+index and columns. As with ``pandas.rolling(window)``, a result is NaN until
+a full window of non-NaN observations is available.
+"""
+import numpy as np
+import pandas as pd
+from typing import Tuple, Union
+TRADING_DAYS = 252
+ArrayLike = Union[np.ndarray, pd.Series, pd.DataFrame]
+# Relative tolerance below which a window's variance is treated as zero
+_VAR_RTOL = 1e-12
+# ─── INPUT / OUTPUT ───────────────────────────────────────────────────────────
+def _as_2d(x: ArrayLike) -> Tuple[np.ndarray, bool]:
+    """Float (T, N) view of the input and whether it was 1-D."""
+    arr = np.asarray(x, dtype=float)
+    if arr.ndim == 1:
+        return arr[:, None], True
+    return arr, False
+def _wrap(values: np.ndarray, like: ArrayLike, was_1d: bool, name=None) -> ArrayLike:
+    """Return ``values`` in the container type of ``like``."""
+    out = values[:, 0] if was_1d else values
+    if isinstance(like, pd.DataFrame):
+        return pd.DataFrame(out, index=like.index, columns=like.columns)
+    if isinstance(like, pd.Series):
+        return pd.Series(out, index=like.index, name=name if name is not None else like.name)
+    return out
+def _window_sum(values: np.ndarray, window: int) -> np.ndarray:
+    """Sum over the trailing ``window`` rows (first window-1 rows are partial)."""
+    c = np.cumsum(values, axis=0)
+    out = c.copy()
+    out[window:] = c[window:] - c[:-window]
+    return out
+def _window_stats(x: np.ndarray, window: int):
+    """
+    Trailing-window count, mean and centred sum of squares for each column.
+
+    Columns are shifted by their overall mean first so the cumulative sums
+    stay small and the sum-of-squares difference does not cancel.
+    """
+    valid = np.isfinite(x)
+    shift = np.zeros(x.shape[1])
+    if valid.any():
+        with np.errstate(invalid="ignore"):
+            shift = np.where(valid.any(axis=0), np.nanmean(np.where(valid, x, np.nan), axis=0), 0.0)
+    xc = np.where(valid, x - shift, 0.0)
+    n = _window_sum(valid.astype(float), window)
+    s1 = _window_sum(xc, window)
+    s2 = _window_sum(xc * xc, window)
+    full = n >= window
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean_c = s1 / n
+        ss = s2 - s1 * mean_c
+    ss = np.maximum(ss, 0.0)
+    ss[ss <= _VAR_RTOL * s2] = 0.0
+    mean = np.where(full, mean_c + shift, np.nan)
+    return n, mean, np.where(full, ss, np.nan)
+# ─── MOMENTS ──────────────────────────────────────────────────────────────────
+def rolling_mean(x: ArrayLike, window: int) -> ArrayLike:
+    """Trailing mean."""
+    arr, was_1d = _as_2d(x)
+    _, mean, _ = _window_stats(arr, window)
+    return _wrap(mean, x, was_1d)
+def rolling_std(x: ArrayLike, window: int, ddof: int = 1) -> ArrayLike:
+    """Trailing standard deviation (sample by default, as pandas)."""
+    arr, was_1d = _as_2d(x)
+    n, _, ss = _window_stats(arr, window)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        std = np.sqrt(ss / (n - ddof))
+    return _wrap(std, x, was_1d)
+def rolling_volatility(x: ArrayLike, window: int) -> ArrayLike:
+    """Trailing annualised volatility."""
+    arr, was_1d = _as_2d(x)
+    n, _, ss = _window_stats(arr, window)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        vol = np.sqrt(ss / (n - 1)) * np.sqrt(TRADING_DAYS)
+    return _wrap(vol, x, was_1d)
+# ─── RISK-ADJUSTED RETURNS ────────────────────────────────────────────────────
+def rolling_sharpe(x: ArrayLike, window: int, daily_rf: float = 0.0, ddof: int = 1) -> ArrayLike:
+    """
+    Trailing annualised Sharpe ratio of ``x - daily_rf``.
+    NaN where the window's standard deviation is zero.
+    """
+    arr, was_1d = _as_2d(x)
+    n, mean, ss = _window_stats(arr - daily_rf, window)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        std = np.sqrt(ss / (n - ddof))
+        sharpe = np.where(std > 0, mean / std * np.sqrt(TRADING_DAYS), np.nan)
+    return _wrap(sharpe, x, was_1d)
+def rolling_compound_return(x: ArrayLike, window: int, annualise: bool = True) -> ArrayLike:
+    """
+    Trailing compounded return, ``prod(1 + r) - 1`` over each window,
+    annualised to TRADING_DAYS by default. Uses cumulative log-returns;
+    returns at or below -100% are floored just above -100%.
+    """
+    arr, was_1d = _as_2d(x)
+    valid = np.isfinite(arr)
+    logs = np.where(valid, np.log1p(np.maximum(arr, -1 + 1e-12)), 0.0)
+    n = _window_sum(valid.astype(float), window)
+    total = _window_sum(logs, window)
+    if annualise:
+        total = total * (TRADING_DAYS / window)
+    out = np.where(n >= window, np.expm1(total), np.nan)
+    return _wrap(out, x, was_1d)
+def rolling_sortino(
+    x: ArrayLike,
+    window: int,
+    daily_rf: float = 0.0,
+    annual_rf: float = 0.0,
+    target: float = 0.0,
+) -> ArrayLike:
+    """
+    Trailing Sortino ratio, matching ``performance_metrics.sortino_ratio``
+    per window: (annualised compounded return - annual_rf) divided by the
+    annualised sample std of the excess returns below ``target``.
+    """
+    arr, was_1d = _as_2d(x)
+    excess = arr - daily_rf
+    down = np.isfinite(excess) & (excess < target)
+    d = np.where(down, excess, 0.0)
+    n_d = _window_sum(down.astype(float), window)
+    s1 = _window_sum(d, window)
+    s2 = _window_sum(d * d, window)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        dd = np.sqrt(np.maximum(s2 - s1 * s1 / n_d, 0.0) / (n_d - 1)) * np.sqrt(TRADING_DAYS)
+    ann, _ = _as_2d(rolling_compound_return(arr, window))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        out = np.where((n_d > 1) & (dd > 0), (ann - annual_rf) / dd, 0.0)
+    out[np.isnan(ann)] = np.nan
+    return _wrap(out, x, was_1d)
+# ─── BENCHMARK RELATIVE ───────────────────────────────────────────────────────
+def _co_moments(y: np.ndarray, b: np.ndarray, window: int):
+    """Trailing covariance, variances and count for each column of y vs b (T, 1)."""
+    valid = np.isfinite(y) & np.isfinite(b)
+    yc = np.where(valid, y - np.nanmean(y, axis=0), 0.0)
+    bc = np.where(valid, b - np.nanmean(b), 0.0)
+    n = _window_sum(valid.astype(float), window)
+    sy, sb = _window_sum(yc, window), _window_sum(bc, window)
+    syy, sbb, syb = _window_sum(yc * yc, window), _window_sum(bc * bc, window), _window_sum(yc * bc, window)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        cov = (syb - sy * sb / n) / (n - 1)
+        var_y = np.maximum(syy - sy * sy / n, 0.0) / (n - 1)
+        var_b = np.maximum(sbb - sb * sb / n, 0.0) / (n - 1)
+    var_b[var_b * (n - 1) <= _VAR_RTOL * sbb] = 0.0
+    var_y[var_y * (n - 1) <= _VAR_RTOL * syy] = 0.0
+    full = n >= window
+    return np.where(full, cov, np.nan), np.where(full, var_y, np.nan), np.where(full, var_b, np.nan)
+def rolling_beta(y: ArrayLike, benchmark: ArrayLike, window: int) -> ArrayLike:
+    """
+    Trailing OLS beta of each column of ``y`` against ``benchmark``.
+    Pandas inputs are aligned on their index (inner join) first.
+    """
+    if isinstance(y, (pd.Series, pd.DataFrame)) and isinstance(benchmark, pd.Series):
+        y, benchmark = y.align(benchmark, join="inner", axis=0)
+    arr, was_1d = _as_2d(y)
+    b = np.asarray(benchmark, dtype=float).reshape(-1, 1)
+    cov, _, var_b = _co_moments(arr, b, window)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        beta = np.where(var_b > 0, cov / var_b, np.nan)
+    return _wrap(beta, y, was_1d)
+def rolling_correlation(y: ArrayLike, benchmark: ArrayLike, window: int) -> ArrayLike:
+    """Trailing Pearson correlation of each column of ``y`` with ``benchmark``."""
+    if isinstance(y, (pd.Series, pd.DataFrame)) and isinstance(benchmark, pd.Series):
+        y, benchmark = y.align(benchmark, join="inner", axis=0)
+    arr, was_1d = _as_2d(y)
+    b = np.asarray(benchmark, dtype=float).reshape(-1, 1)
+    cov, var_y, var_b = _co_moments(arr, b, window)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        corr = np.where((var_y > 0) & (var_b > 0), cov / np.sqrt(var_y * var_b), np.nan)
+    return _wrap(np.clip(corr, -1.0, 1.0), y, was_1d)
+# ─── DRAWDOWN ─────────────────────────────────────────────────────────────────
+def rolling_max(x: ArrayLike, window: int) -> ArrayLike:
+    """
+    Trailing maximum in O(n) regardless of window (van Herk / Gil-Werman):
+    the series is cut into blocks of ``window`` rows, and each trailing
+    window spans the suffix of one block and the prefix of the next.
+    """
+    arr, was_1d = _as_2d(x)
+    t, k = arr.shape
+    if t == 0:
+        return _wrap(arr.copy(), x, was_1d)
+    filled = np.where(np.isnan(arr), -np.inf, arr)
+    n_blocks = -(-t // window)
+    padded = np.full((n_blocks * window, k), -np.inf)
+    padded[:t] = filled
+    blocks = padded.reshape(n_blocks, window, k)
+    prefix = np.maximum.accumulate(blocks, axis=1).reshape(-1, k)[:t]
+    suffix = np.maximum.accumulate(blocks[:, ::-1], axis=1)[:, ::-1].reshape(-1, k)[:t]
+    out = np.full((t, k), np.nan)
+    if t >= window:
+        out[window - 1:] = np.maximum(suffix[:t - window + 1], prefix[window - 1:])
+    out[np.isneginf(out)] = np.nan
+    return _wrap(out, x, was_1d)
+def drawdown(x: ArrayLike) -> ArrayLike:
+    """Drawdown of the compounded wealth index from its running peak."""
+    arr, was_1d = _as_2d(x)
+    wealth = np.cumprod(1 + np.nan_to_num(arr), axis=0)
+    peak = np.maximum.accumulate(wealth, axis=0)
+    return _wrap(wealth / peak - 1, x, was_1d)
+def rolling_drawdown(x: ArrayLike, window: int) -> ArrayLike:
+    """Drawdown of the wealth index from its trailing ``window``-day peak."""
+    arr, was_1d = _as_2d(x)
+    wealth = np.cumprod(1 + np.nan_to_num(arr), axis=0)
+    peak, _ = _as_2d(rolling_max(wealth, window))
+    return _wrap(wealth / peak - 1, x, was_1d)
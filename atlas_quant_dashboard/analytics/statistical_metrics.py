@@ -3,11 +3,45 @@ ATLAS Quantitative Dashboard — Statistical Diagnostics Engine
 Layer: Computation (stateless, pure functions)
 Purpose: Distributional properties, serial structure, regime analytics
 """
+import copy
+import hashlib
+import threading
+from collections import OrderedDict
 import numpy as np
 import pandas as pd
-from typing import Tuple, Optional
-from scipy import stats
+from typing import Callable, Tuple, Optional
+from scipy import stats, optimize, special
+from atlas_quant_dashboard.analytics import rolling_kernels as rk
 TRADING_DAYS = 252
+# ─── RESULT MEMO ──────────────────────────────────────────────────────────────
+# Expensive estimators are memoised on a hash of the return array, so reruns
+# over unchanged data (other tabs, other sessions on the same data) are free.
+_MEMO_SIZE = 64
+_memo: "OrderedDict[tuple, object]" = OrderedDict()
+_memo_lock = threading.Lock()
+def returns_fingerprint(values: np.ndarray) -> str:
+    """Content hash of a return array (dtype, shape and bytes)."""
+    arr = np.ascontiguousarray(values, dtype=float)
+    h = hashlib.blake2b(digest_size=16)
+    h.update(str(arr.shape).encode())
+    h.update(arr.tobytes())
+    return h.hexdigest()
+def _memoised(name: str, values: np.ndarray, compute: Callable[[], dict], *extra) -> dict:
+    """Cached ``compute()`` for (name, hash of values, extra); callers get a copy."""
+    key = (name, returns_fingerprint(values)) + extra
+    with _memo_lock:
+        if key in _memo:
+            _memo.move_to_end(key)
+            return copy.deepcopy(_memo[key])
+    result = compute()
+    with _memo_lock:
+        _memo[key] = result
+        while len(_memo) > _MEMO_SIZE:
+            _memo.popitem(last=False)
+    return copy.deepcopy(result)
+def clear_memo():
+    with _memo_lock:
+        _memo.clear()
 # ─── DISTRIBUTION PROPERTIES ─────────────────────────────────────────────────
 def return_moments(daily_returns: pd.Series) -> dict:
     """
@@ -41,13 +75,69 @@ def normality_test(daily_returns: pd.Series) -> dict:
         "normal": jb_pval > 0.05,
         "shapiro_pval": round(float(sw_pval), 6) if sw_pval is not None else None,
     }
-def distribution_fit(daily_returns: pd.Series) -> dict:
+def _t_nll(theta: np.ndarray, r: np.ndarray) -> float:
+    """Student-t negative log-likelihood in (log(df - 2), loc, log scale)."""
+    df, loc, scale = 2 + np.exp(theta[0]), theta[1], np.exp(theta[2])
+    z = (r - loc) / scale
+    ll = (special.gammaln((df + 1) / 2) - special.gammaln(df / 2)
+          - 0.5 * np.log(df * np.pi) - np.log(scale)) * len(r)
+    ll -= (df + 1) / 2 * np.log1p(z * z / df).sum()
+    return float(-ll)
+def _skewnorm_nll(theta: np.ndarray, r: np.ndarray) -> float:
+    """Skew-normal negative log-likelihood in (a, loc, log scale)."""
+    a, loc, scale = theta[0], theta[1], np.exp(theta[2])
+    z = (r - loc) / scale
+    ll = len(r) * (np.log(2) - 0.5 * np.log(2 * np.pi) - np.log(scale))
+    ll += (-0.5 * z * z + special.log_ndtr(a * z)).sum()
+    return float(-ll)
+def _t_moment_start(r: np.ndarray) -> Tuple[float, float, float]:
+    """Closed-form Student-t start: df from excess kurtosis (κ = 6 / (df − 4))."""
+    k = stats.kurtosis(r)
+    df = float(np.clip(4 + 6 / k, 2.5, 100.0)) if k > 0 else 100.0
+    return df, float(np.median(r)), float(r.std() * np.sqrt((df - 2) / df))
+def _skewnorm_moment_start(r: np.ndarray) -> Tuple[float, float, float]:
+    """Closed-form skew-normal method-of-moments start from the sample skewness."""
+    g = float(np.clip(stats.skew(r), -0.99, 0.99))
+    g23 = abs(g) ** (2 / 3)
+    delta = np.sign(g) * np.sqrt(np.pi / 2 * g23 / (g23 + ((4 - np.pi) / 2) ** (2 / 3)))
+    scale = r.std() / np.sqrt(1 - 2 * delta ** 2 / np.pi)
+    loc = r.mean() - scale * delta * np.sqrt(2 / np.pi)
+    return float(delta / np.sqrt(1 - delta ** 2)), float(loc), float(scale)
+def _fit_mle(nll: Callable, starts: list, r: np.ndarray) -> Tuple[np.ndarray, float]:
+    """
+    Minimise ``nll`` over (shape, loc, log scale) from the best of the
+    candidate starts. The fit runs on standardised returns so all three
+    parameters are O(1); results are mapped back to return units.
+    """
+    centre, spread = float(np.median(r)), float(r.std()) or 1.0
+    x = (r - centre) / spread
+    to_x = lambda th: np.array([th[0], (th[1] - centre) / spread, th[2] - np.log(spread)])
+    starts = [to_x(np.asarray(th, dtype=float)) for th in starts if np.all(np.isfinite(th))]
+    x0 = min(starts, key=lambda th: nll(th, x))
+    res = optimize.minimize(nll, x0, args=(x,), method="L-BFGS-B", options={"ftol": 1e-12, "gtol": 1e-8})
+    theta = res.x if np.isfinite(res.fun) and res.fun <= nll(x0, x) else x0
+    ll = -nll(theta, x) - len(r) * np.log(spread)
+    return np.array([theta[0], centre + spread * theta[1], theta[2] + np.log(spread)]), float(ll)
+def distribution_fit(daily_returns: pd.Series, previous: Optional[dict] = None) -> dict:
     """
     Fits normal, Student-t, and skewed-t distributions to the return series.
     Uses log-likelihood and AIC for model comparison.
     Returns best-fit distribution and parameters.
+    The t and skew-normal MLEs start from the better of a closed-form
+    moment estimate and ``previous`` (an earlier distribution_fit result),
+    so daily refits converge in a few iterations. Memoised on the data.
     """
     r = daily_returns.dropna().values
+    seeds = _previous_fit_seeds(previous)
+    return _memoised("distribution_fit", r, lambda: _distribution_fit(r, seeds), seeds)
+def _previous_fit_seeds(previous: Optional[dict]) -> tuple:
+    try:
+        t = previous["student_t"]["params"]
+        sn = previous["skew_normal"]["params"]
+        return (t["df"], t["loc"], t["scale"]), (sn["a"], sn["loc"], sn["scale"])
+    except (TypeError, KeyError):
+        return ()
+def _distribution_fit(r: np.ndarray, seeds: tuple) -> dict:
     results = {}
     # Normal
     mu, sigma = stats.norm.fit(r)
@@ -59,8 +149,11 @@ def distribution_fit(daily_returns: pd.Series) -> dict:
         "aic": round(aic_norm, 2),
     }
     # Student-t
-    df_t, loc_t, scale_t = stats.t.fit(r)
-    ll_t = np.sum(stats.t.logpdf(r, df_t, loc_t, scale_t))
+    t_starts = [_t_moment_start(r)] + ([seeds[0]] if seeds else [])
+    theta, ll_t = _fit_mle(
+        _t_nll, [(np.log(max(df - 2, 1e-3)), loc, np.log(scale)) for df, loc, scale in t_starts], r
+    )
+    df_t, loc_t, scale_t = 2 + np.exp(theta[0]), theta[1], np.exp(theta[2])
     aic_t = -2 * ll_t + 2 * 3  # 3 params
     results["student_t"] = {
         "params": {"df": round(df_t, 2), "loc": round(loc_t, 6), "scale": round(scale_t, 6)},
@@ -69,8 +162,11 @@ def distribution_fit(daily_returns: pd.Series) -> dict:
         "implied_tail_heaviness": "heavy" if df_t < 5 else "moderate" if df_t < 10 else "near-normal",
     }
     # Skewed normal (skew-normal)
-    a_sn, loc_sn, scale_sn = stats.skewnorm.fit(r)
-    ll_sn = np.sum(stats.skewnorm.logpdf(r, a_sn, loc_sn, scale_sn))
+    sn_starts = [_skewnorm_moment_start(r)] + ([seeds[1]] if seeds else [])
+    theta, ll_sn = _fit_mle(
+        _skewnorm_nll, [(a, loc, np.log(scale)) for a, loc, scale in sn_starts], r
+    )
+    a_sn, loc_sn, scale_sn = theta[0], theta[1], np.exp(theta[2])
     aic_sn = -2 * ll_sn + 2 * 3
     results["skew_normal"] = {
         "params": {"a": round(a_sn, 3), "loc": round(loc_sn, 6), "scale": round(scale_sn, 6)},
@@ -142,6 +238,45 @@ def first_order_autocorrelation(daily_returns: pd.Series) -> dict:
         ),
     }
 # ─── HURST EXPONENT ───────────────────────────────────────────────────────────
+def _chunks(x: np.ndarray, window: int, n_chunks: int) -> np.ndarray:
+    """First ``n_chunks`` non-overlapping windows of ``x`` as a (chunks × window) matrix."""
+    return x[:n_chunks * window].reshape(n_chunks, window)
+def rescaled_range(r: np.ndarray, window: int) -> float:
+    """Mean R/S over the non-overlapping windows of ``r`` (all windows at once)."""
+    chunks = _chunks(r, window, len(range(0, len(r) - window, window)))
+    deviation = np.cumsum(chunks - chunks.mean(axis=1, keepdims=True), axis=1)
+    r_range = deviation.max(axis=1) - deviation.min(axis=1)
+    s = chunks.std(axis=1, ddof=1)
+    ok = s > 0
+    return float(np.mean(r_range[ok] / s[ok])) if ok.any() else np.nan
+def dfa_fluctuation(profile: np.ndarray, window: int) -> float:
+    """
+    DFA-1 fluctuation F(window): RMS residual of a per-window linear fit to
+    the integrated series, solved in closed form for all windows at once.
+    """
+    chunks = _chunks(profile, window, len(profile) // window)
+    t = np.arange(window) - (window - 1) / 2
+    slope = chunks @ t / (t @ t)
+    resid = chunks - chunks.mean(axis=1, keepdims=True) - slope[:, None] * t
+    return float(np.sqrt(np.mean(resid ** 2)))
+def _window_sizes(n: int, min_window: int) -> range:
+    return range(min_window, n // 2, max(1, (n // 2 - min_window) // 20))
+def dfa_exponent(daily_returns: pd.Series, min_window: int = 20) -> Optional[float]:
+    """
+    Detrended fluctuation analysis scaling exponent α (≈ H for returns).
+    More robust than R/S to short-range dependence and local trends.
+    """
+    r = daily_returns.dropna().values
+    n = len(r)
+    if n < min_window * 2:
+        return None
+    profile = np.cumsum(r - r.mean())
+    sizes = [w for w in _window_sizes(n, min_window) if n // w >= 2]
+    fluct = np.array([dfa_fluctuation(profile, w) for w in sizes])
+    ok = fluct > 0
+    if ok.sum() < 4:
+        return None
+    return float(np.polyfit(np.log(np.array(sizes)[ok]), np.log(fluct[ok]), 1)[0])
 def hurst_exponent(daily_returns: pd.Series, min_window: int = 20) -> dict:
     """
     Hurst Exponent via rescaled range (R/S) analysis.
@@ -150,36 +285,33 @@ def hurst_exponent(daily_returns: pd.Series, min_window: int = 20) -> dict:
     H < 0.5: mean-reverting
     Directly informs rebalancing frequency decisions.
     A trending portfolio should be rebalanced less frequently.
+    Also reports the DFA exponent as a cross-check. Memoised on the data.
     """
     r = daily_returns.dropna().values
+    return _memoised("hurst_exponent", r, lambda: _hurst_exponent(r, min_window), min_window)
+def _hurst_exponent(r: np.ndarray, min_window: int) -> dict:
     n = len(r)
     if n < min_window * 2:
         return {"hurst": None, "interpretation": "Insufficient data (need 2× min_window observations)"}
     # R/S analysis across multiple window sizes
     lags = []
     rs_values = []
-    for window in range(min_window, n // 2, max(1, (n // 2 - min_window) // 20)):
-        sub_rs = []
-        for start in range(0, n - window, window):
-            chunk = r[start:start + window]
-            mean = chunk.mean()
-            deviation = np.cumsum(chunk - mean)
-            r_range = deviation.max() - deviation.min()
-            s = chunk.std(ddof=1)
-            if s > 0:
-                sub_rs.append(r_range / s)
-        if sub_rs:
+    for window in _window_sizes(n, min_window):
+        rs = rescaled_range(r, window)
+        if np.isfinite(rs):
             lags.append(window)
-            rs_values.append(np.mean(sub_rs))
+            rs_values.append(rs)
     if len(lags) < 4:
         return {"hurst": None, "interpretation": "Insufficient windows for reliable estimate"}
     log_lags = np.log(lags)
     log_rs = np.log(rs_values)
     slope, intercept, r_val, p_val, _ = stats.linregress(log_lags, log_rs)
     H = float(slope)
+    dfa = dfa_exponent(pd.Series(r), min_window)
     return {
         "hurst": round(H, 4),
         "r_squared": round(float(r_val ** 2), 4),
+        "dfa_alpha": round(dfa, 4) if dfa is not None else None,
         "regime": "Trending (H > 0.55)" if H > 0.55 else "Mean-Reverting (H < 0.45)" if H < 0.45 else "Random Walk",
         "interpretation": (
             f"H={H:.3f}: Returns exhibit trending behaviour. Momentum strategies may be effective. "
@@ -204,10 +336,10 @@ def rolling_sharpe_stability(
     A Sharpe that frequently breaches the band signals regime-dependent performance.
     """
     daily_rf = (1 + risk_free_rate) ** (1 / TRADING_DAYS) - 1
-    excess = daily_returns - daily_rf
-    def _sharpe(x):
-        return (x.mean() / x.std() * np.sqrt(TRADING_DAYS)) if x.std() > 0 else np.nan
-    rolling = excess.rolling(window).apply(_sharpe, raw=True).dropna()
+    rolling = rk.rolling_sharpe(daily_returns, window, daily_rf=daily_rf, ddof=0).dropna()
+    return sharpe_stability_summary(rolling)
+def sharpe_stability_summary(rolling: pd.Series) -> dict:
+    """Stability band and breach statistics for an already computed rolling Sharpe series."""
     mean_sharpe = float(rolling.mean())
     std_sharpe = float(rolling.std())
     breaches = int((abs(rolling - mean_sharpe) > std_sharpe).sum())
@@ -20,6 +20,7 @@ from atlas_quant_dashboard.analytics import performance_metrics as pm
 from atlas_quant_dashboard.analytics import risk_metrics as rm
 from atlas_quant_dashboard.analytics import structure_metrics as sm
 from atlas_quant_dashboard.analytics import statistical_metrics as stm
+from atlas_quant_dashboard.analytics.incremental_state import IncrementalMetricState
 from atlas_quant_dashboard.analytics.quant_flags import (
     QuantFlagsEngine, portfolio_health_score, FlagSeverity
 )
@@ -184,39 +185,34 @@ def load_portfolio_data(use_live: bool = False):
         print(f"[ATLAS] Live data unavailable: {e}")
     st.warning("Awaiting sync. Run Alpaca sync and refresh.")
     st.stop()
-@st.cache_data(ttl=300, show_spinner=False)
-def compute_all_metrics(port_ret_values, bench_ret_values, asset_ret_values,
-                         weights_values, _dates, asset_cols):
-    """Orchestration layer — computes and caches all metrics."""
+def update_metric_state(portfolio_returns: pd.Series, benchmark_returns: pd.Series,
+                        source: str) -> IncrementalMetricState:
+    """
+    Per-session incremental state for the series metrics. Portfolio data is
+    user-specific, so it lives in session_state (one state per data source).
+    New daily returns are appended; a revised history triggers a rebuild.
+    """
+    states = st.session_state.setdefault('_quant_metric_states', {})
+    state = states.get(source)
+    if state is None:
+        state = states[source] = IncrementalMetricState()
+    state.update(portfolio_returns, benchmark_returns)
+    return state
+@st.cache_data(max_entries=8, show_spinner=False)
+def compute_history_metrics(port_ret_values, bench_ret_values, asset_ret_values,
+                            weights_values, _dates, asset_cols, _previous_fit=None):
+    """
+    Metrics that need the full history or the asset matrix. Keyed on the
+    data itself, so they are recomputed only when the data changes.
+    ``_previous_fit`` (unhashed) warm-starts the distribution refits.
+    """
     portfolio_returns = pd.Series(port_ret_values, index=_dates)
     benchmark_returns = pd.Series(bench_ret_values, index=_dates)
     asset_returns = pd.DataFrame(asset_ret_values, index=_dates, columns=asset_cols)
     weights = pd.Series(weights_values, index=asset_cols)
     results = {}
-    # ── Performance metrics
-    results["ann_return"] = pm.annualise_return(portfolio_returns)
-    results["ann_vol"] = pm.annualise_volatility(portfolio_returns)
-    results["sharpe"] = pm.sharpe_ratio(portfolio_returns)
-    results["sortino"] = pm.sortino_ratio(portfolio_returns)
-    results["calmar"] = pm.calmar_ratio(portfolio_returns)
-    results["tracking_error"] = pm.tracking_error(portfolio_returns, benchmark_returns)
-    results["ir"] = pm.information_ratio(portfolio_returns, benchmark_returns)
-    results["up_capture"], results["down_capture"] = pm.capture_ratios(portfolio_returns, benchmark_returns)
-    results["convexity"] = pm.convexity_score(portfolio_returns, benchmark_returns)
-    results["cum_returns"] = pm.cumulative_return(portfolio_returns)
-    results["bench_cum_returns"] = pm.cumulative_return(benchmark_returns)
     results["calendar_returns"] = pm.calendar_returns(portfolio_returns)
     results["return_contribution"] = pm.return_contribution(asset_returns, weights)
-    # Rolling
-    for w in [21, 63, 126, 252]:
-        results[f"rolling_sharpe_{w}"] = pm.rolling_sharpe(portfolio_returns, w)
-        results[f"rolling_vol_{w}"] = pm.rolling_volatility(portfolio_returns, w)
-        results[f"rolling_returns_{w}"] = pm.rolling_returns(portfolio_returns, w)
-    results["rolling_beta"] = pm.rolling_beta(portfolio_returns, benchmark_returns, 63)
-    results["drawdown_series"] = pm.drawdown_series(portfolio_returns)
-    # ── Drawdown anatomy
-    results["drawdown_anatomy"] = pm.drawdown_anatomy(portfolio_returns)
-    results["max_drawdown"] = pm.max_drawdown(portfolio_returns)
     # ── Risk metrics
     try:
         cov = rm.covariance_matrix(asset_returns, method="sample")
@@ -225,7 +221,7 @@ def compute_all_metrics(port_ret_values, bench_ret_values, asset_ret_values,
         results["port_vol_wts"] = rm.portfolio_volatility(w_arr, cov.values)
     except Exception:
         results["risk_budget"] = None
-        results["port_vol_wts"] = results["ann_vol"]
+        results["port_vol_wts"] = pm.annualise_volatility(portfolio_returns)
     results["vol_decomp"] = rm.systematic_vs_idiosyncratic_vol(portfolio_returns, benchmark_returns)
     results["tail_risk"] = rm.tail_risk_summary(portfolio_returns)
     # ── Structure metrics
@@ -245,14 +241,32 @@ def compute_all_metrics(port_ret_values, bench_ret_values, asset_ret_values,
     except Exception:
         results["pca_clusters"] = None
     # ── Statistical diagnostics
-    results["return_moments"] = stm.return_moments(portfolio_returns)
     results["normality"] = stm.normality_test(portfolio_returns)
-    results["dist_fit"] = stm.distribution_fit(portfolio_returns)
+    results["dist_fit"] = stm.distribution_fit(portfolio_returns, previous=_previous_fit)
     results["autocorr"] = stm.first_order_autocorrelation(portfolio_returns)
     results["autocorr_structure"] = stm.autocorrelation_structure(portfolio_returns)
     results["hurst"] = stm.hurst_exponent(portfolio_returns)
-    results["sharpe_stability"] = stm.rolling_sharpe_stability(portfolio_returns, window=63)
     results["rsi_data"] = stm.regime_sensitivity_index(portfolio_returns)
+    return results
+def compute_all_metrics(data: dict, source: str = "live") -> dict:
+    """
+    Orchestration layer. Series metrics (performance, rolling, drawdown,
+    moments) come from the incremental state; the rest from the data-keyed cache.
+    """
+    portfolio_returns = pd.Series(data["portfolio_returns"].values, index=data["dates"])
+    benchmark_returns = pd.Series(data["benchmark_returns"].values, index=data["dates"])
+    state = update_metric_state(portfolio_returns, benchmark_returns, source)
+    results = state.snapshot()
+    results.update(compute_history_metrics(
+        data["portfolio_returns"].values,
+        data["benchmark_returns"].values,
+        data["asset_returns"].values,
+        data["weights"].values,
+        data["dates"],
+        data["asset_returns"].columns.tolist(),
+        _previous_fit=state.fit_params.get("dist_fit"),
+    ))
+    state.fit_params["dist_fit"] = results["dist_fit"]
     # ── Health score
     dd_anat = results["drawdown_anatomy"]
     hs = portfolio_health_score(
@@ -894,12 +908,7 @@ def main():
     with st.spinner("Computing quantitative metrics..."):
         data = load_portfolio_data(use_live=use_live)
         metrics = compute_all_metrics(
-            data["portfolio_returns"].values,
-            data["benchmark_returns"].values,
-            data["asset_returns"].values,
-            data["weights"].values,
-            data["dates"],
-            data["asset_returns"].columns.tolist(),
+            data, source=st.session_state.get('_quant_data_source_active', 'live'),
         )
         # Inject portfolio_returns reference
         metrics["portfolio_returns"] = data["portfolio_returns"]
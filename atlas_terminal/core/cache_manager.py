@@ -2,54 +2,99 @@
 Smart caching system for ATLAS Terminal.
 
 Handles multiple cache layers:
-1. In-memory cache (fastest, session-only)
-2. Disk cache (persistent across sessions)
+1. In-memory cache (fastest, shared by every session in the process)
+2. Disk cache (persistent across sessions; one indexed SQLite file, see
+   disk_cache.py)
 3. Smart invalidation (TTL + conditional)
 """
 
-import streamlit as st
-import pickle
+import hashlib
+import json
+import threading
 import time
 from pathlib import Path
 from typing import Any, Optional, Callable
 from functools import wraps
-import hashlib
-import json
+
+import numpy as np
+import pandas as pd
+
+from core.shared_cache import market_cache
+from atlas_terminal.core.disk_cache import DiskCache
+
+# Namespace for CacheManager entries inside the shared process cache
+_MEMORY_NAMESPACE = 'cache_manager'
+
+# Disk cache database, inside cache_dir
+DISK_CACHE_FILE = "atlas_cache.db"
+
+
+def _key_part(obj: Any) -> Any:
+    """JSON-friendly, content-based stand-in for one cache-key argument."""
+    if isinstance(obj, (pd.DataFrame, pd.Series, pd.Index)):
+        digest = hashlib.blake2b(
+            pd.util.hash_pandas_object(obj, index=not isinstance(obj, pd.Index)).values.tobytes(),
+            digest_size=16,
+        ).hexdigest()
+        return f"{type(obj).__name__}:{digest}"
+    if isinstance(obj, np.ndarray):
+        return f"ndarray:{obj.dtype}:{obj.shape}:{hashlib.blake2b(obj.tobytes(), digest_size=16).hexdigest()}"
+    if isinstance(obj, (list, tuple)):
+        return [_key_part(o) for o in obj]
+    if isinstance(obj, dict):
+        return {str(k): _key_part(v) for k, v in obj.items()}
+    if isinstance(obj, (str, int, float, bool)) or obj is None:
+        return obj
+    return repr(obj)
+
 
 class CacheManager:
     """
     Centralized cache management with multiple layers.
 
     Features:
-    - In-memory caching (st.session_state)
-    - Disk caching (pickle files)
+    - In-memory caching (process-wide core.shared_cache, bounded LRU)
+    - Disk caching (SQLite, size-bounded LRU, Parquet for DataFrames)
     - TTL-based expiration
     - Smart invalidation
     - Cache statistics
+
+    Cached values are market data shared by all sessions; user-specific data
+    belongs in st.session_state, not here.
     """
 
-    def __init__(self, cache_dir: str = "data/cache"):
+    def __init__(self, cache_dir: str = "data/cache", memory=None, disk: Optional[DiskCache] = None):
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.memory = memory if memory is not None else market_cache
+        self.disk = disk if disk is not None else DiskCache(self.cache_dir / DISK_CACHE_FILE)
+        self._stats_lock = threading.Lock()
+        self.cache_stats = {
+            'hits': 0,
+            'misses': 0,
+            'disk_hits': 0,
+            'disk_writes': 0
+        }
+        self._legacy_purge_started = False
 
-        # Initialize cache stats in session state
-        if 'cache_stats' not in st.session_state:
-            st.session_state.cache_stats = {
-                'hits': 0,
-                'misses': 0,
-                'disk_hits': 0,
-                'disk_writes': 0
-            }
+    def _count(self, stat: str):
+        with self._stats_lock:
+            self.cache_stats[stat] += 1
 
     def get_cache_key(self, func_name: str, *args, **kwargs) -> str:
-        """Generate unique cache key from function name and arguments."""
+        """
+        Generate unique cache key from function name and arguments.
+
+        DataFrames/Series/arrays contribute a hash of their contents (not
+        their truncated ``str``), so different frames never share a key.
+        """
         key_data = {
             'func': func_name,
-            'args': args,
-            'kwargs': kwargs
+            'args': _key_part(args),
+            'kwargs': _key_part(kwargs)
         }
-        key_str = json.dumps(key_data, sort_keys=True, default=str)
-        return hashlib.md5(key_str.encode()).hexdigest()
+        key_str = json.dumps(key_data, sort_keys=True, default=repr)
+        return f"{func_name}:{hashlib.blake2b(key_str.encode(), digest_size=16).hexdigest()}"
 
     def get(self, key: str, ttl: Optional[int] = None) -> Optional[Any]:
         """
@@ -62,47 +107,30 @@ class CacheManager:
         Returns:
             Cached value or None if not found/expired
         """
-        # Initialize cache_stats if it doesn't exist
-        if 'cache_stats' not in st.session_state:
-            st.session_state.cache_stats = {
-                'hits': 0,
-                'misses': 0,
-                'disk_hits': 0,
-                'disk_writes': 0
-            }
-
         # Try memory cache first (fastest)
-        if key in st.session_state:
-            cached = st.session_state[key]
-
+        cached = self.memory.get((_MEMORY_NAMESPACE, key))
+        if cached is not None:
             # Check expiration
             if ttl is None or (time.time() - cached['timestamp']) < ttl:
-                st.session_state.cache_stats['hits'] += 1
+                self._count('hits')
                 return cached['value']
 
         # Try disk cache (slower but persistent)
-        cache_file = self.cache_dir / f"{key}.pkl"
-        if cache_file.exists():
-            try:
-                with open(cache_file, 'rb') as f:
-                    cached = pickle.load(f)
-
-                # Check expiration
-                if ttl is None or (time.time() - cached['timestamp']) < ttl:
-                    # Load into memory cache for faster access
-                    st.session_state[key] = cached
-                    st.session_state.cache_stats['disk_hits'] += 1
-                    return cached['value']
-                else:
-                    # Expired, delete
-                    cache_file.unlink()
-            except:
-                pass
+        try:
+            hit = self.disk.lookup(key, max_age=ttl)
+        except Exception:
+            hit = None
+        if hit is not None:
+            value, created = hit
+            # Load into memory cache for faster access (keeping its original age)
+            self.memory.set((_MEMORY_NAMESPACE, key), {'value': value, 'timestamp': created})
+            self._count('disk_hits')
+            return value
 
-        st.session_state.cache_stats['misses'] += 1
+        self._count('misses')
         return None
 
-    def set(self, key: str, value: Any, persist: bool = True):
+    def set(self, key: str, value: Any, persist: bool = True, ttl: Optional[int] = None):
         """
         Set cached value.
 
@@ -110,67 +138,66 @@ class CacheManager:
             key: Cache key
             value: Value to cache
             persist: Whether to persist to disk
+            ttl: Optional expiry, lets the disk sweep drop the entry unread
         """
-        # Initialize cache_stats if it doesn't exist
-        if 'cache_stats' not in st.session_state:
-            st.session_state.cache_stats = {
-                'hits': 0,
-                'misses': 0,
-                'disk_hits': 0,
-                'disk_writes': 0
-            }
-
         cached = {
             'value': value,
             'timestamp': time.time()
         }
 
         # Always set in memory
-        st.session_state[key] = cached
+        self.memory.set((_MEMORY_NAMESPACE, key), cached, ttl=ttl)
 
         # Optionally persist to disk
         if persist:
             try:
-                cache_file = self.cache_dir / f"{key}.pkl"
-                with open(cache_file, 'wb') as f:
-                    pickle.dump(cached, f)
-                st.session_state.cache_stats['disk_writes'] += 1
-            except:
+                self.disk.set(key, value, ttl=ttl, created=cached['timestamp'])
+                self._count('disk_writes')
+            except Exception:
                 pass
+            self._purge_legacy_files()
+
+    def _purge_legacy_files(self):
+        """Remove pre-SQLite ``*.pkl`` cache files once, in the background."""
+        if self._legacy_purge_started:
+            return
+        self._legacy_purge_started = True
+
+        def purge():
+            for cache_file in self.cache_dir.glob("*.pkl"):
+                try:
+                    cache_file.unlink()
+                except OSError:
+                    pass
+
+        threading.Thread(target=purge, name='atlas-cache-legacy-purge', daemon=True).start()
+
+    def _is_memory_key(self, key, pattern: Optional[str] = None) -> bool:
+        return (isinstance(key, tuple) and len(key) == 2 and key[0] == _MEMORY_NAMESPACE
+                and (pattern is None or pattern in key[1]))
 
     def clear(self, pattern: Optional[str] = None):
         """Clear cache (optionally by pattern)."""
+        self.memory.invalidate(lambda k: self._is_memory_key(k, pattern))
+        try:
+            self.disk.clear(pattern)
+        except Exception:
+            pass
         if pattern is None:
-            # Clear all
-            keys_to_delete = [k for k in st.session_state.keys()
-                             if not k.startswith('_')]
-            for key in keys_to_delete:
-                del st.session_state[key]
-
-            # Clear disk cache
+            # Leftovers from the old pickle-per-key layout
             for cache_file in self.cache_dir.glob("*.pkl"):
                 cache_file.unlink()
-        else:
-            # Clear matching pattern
-            keys_to_delete = [k for k in st.session_state.keys()
-                             if pattern in k]
-            for key in keys_to_delete:
-                del st.session_state[key]
 
     def get_stats(self) -> dict:
         """Get cache statistics."""
-        # Initialize cache_stats if it doesn't exist
-        if 'cache_stats' not in st.session_state:
-            st.session_state.cache_stats = {
-                'hits': 0,
-                'misses': 0,
-                'disk_hits': 0,
-                'disk_writes': 0
-            }
-
-        stats = st.session_state.cache_stats
+        with self._stats_lock:
+            stats = dict(self.cache_stats)
         total = stats['hits'] + stats['misses']
         hit_rate = (stats['hits'] / total * 100) if total > 0 else 0
+        try:
+            disk = self.disk.stats()
+        except Exception:
+            disk = {'entries': 0, 'bytes': 0}
 
         return {
             'hits': stats['hits'],
@@ -178,8 +205,9 @@ class CacheManager:
             'hit_rate': f"{hit_rate:.1f}%",
             'disk_hits': stats['disk_hits'],
             'disk_writes': stats['disk_writes'],
-            'memory_keys': len([k for k in st.session_state.keys()
-                               if not k.startswith('_')])
+            'memory_keys': sum(1 for k in self.memory.keys() if self._is_memory_key(k)),
+            'disk_keys': disk['entries'],
+            'disk_bytes': disk['bytes'],
         }
 
 
@@ -220,7 +248,7 @@ def cached(ttl: int = 3600, persist: bool = True, key_prefix: str = ""):
             value = func(*args, **kwargs)
 
             # Store in cache
-            cache_manager.set(cache_key, value, persist=persist)
+            cache_manager.set(cache_key, value, persist=persist, ttl=ttl)
 
             return value
 
@@ -0,0 +1,332 @@
+"""
+Indexed disk cache for ATLAS Terminal.
+
+A single SQLite database replaces the old one-pickle-file-per-key layout:
+
+1. Indexed lookups (primary key on the cache key, indexes on expiry and
+   last access) instead of a directory of hundreds of thousands of files
+2. Size-bounded LRU eviction by last access time
+3. Background expiry sweeps (daemon thread) plus sweeps after writes
+4. Atomic writes safe across processes (WAL journal, IMMEDIATE transactions,
+   busy timeout)
+5. DataFrames / Series stored as Parquet when pyarrow is available,
+   pickle otherwise
+"""
+
+import io
+import itertools
+import json
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Optional, Tuple
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+
+DEFAULT_MAX_BYTES = int(float(os.environ.get('ATLAS_DISK_CACHE_MB', '1024')) * 1024 * 1024)
+DEFAULT_SWEEP_INTERVAL = 600     # seconds between background expiry sweeps
+ACCESS_RESOLUTION = 30           # don't rewrite last-access more often than this
+BUSY_TIMEOUT = 30.0              # seconds to wait on another process's write lock
+EVICT_EVERY = 32                 # writes between size checks (SUM over the table)
+EVICT_BATCH = 256                # LRU rows read per eviction step
+
+FORMAT_PICKLE = 'pickle'
+FORMAT_PARQUET_FRAME = 'parquet'
+FORMAT_PARQUET_SERIES = 'parquet_series'
+# Parquet schema metadata key for what the file format drops (Series name, index freq)
+_PANDAS_EXTRA = b'atlas_pandas'
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache_entries (
+    key TEXT PRIMARY KEY,
+    format TEXT NOT NULL,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    created REAL NOT NULL,
+    expires REAL,
+    accessed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_cache_accessed ON cache_entries (accessed);
+CREATE INDEX IF NOT EXISTS idx_cache_expires ON cache_entries (expires);
+"""
+
+
+def _extra_metadata(value: Any) -> Optional[dict]:
+    """Series name and index freq as JSON, or None if the name won't round-trip."""
+    extra = {'freq': getattr(value.index, 'freqstr', None)}
+    if isinstance(value, pd.Series):
+        name = value.name
+        if not (name is None or type(name) in (str, int, float, bool)):
+            return None
+        extra['name'] = name
+    return extra
+
+
+def _restore_extra(value: Any, extra: dict) -> Any:
+    freq = extra.get('freq')
+    if freq and isinstance(value.index, (pd.DatetimeIndex, pd.TimedeltaIndex)):
+        try:
+            value.index = type(value.index)(value.index, freq=freq)
+        except ValueError:
+            pass  # index no longer conforms; leave freq unset
+    if isinstance(value, pd.Series):
+        value.name = extra.get('name')
+    return value
+
+
+def serialize(value: Any) -> Tuple[str, bytes]:
+    """Encode a value as (format, bytes); pandas objects go to Parquet if possible."""
+    if PARQUET_AVAILABLE and isinstance(value, (pd.DataFrame, pd.Series)):
+        is_series = isinstance(value, pd.Series)
+        extra = _extra_metadata(value)
+        if extra is not None:
+            frame = value.to_frame(name='__value__') if is_series else value
+            try:
+                table = pa.Table.from_pandas(frame)
+                table = table.replace_schema_metadata(
+                    {**(table.schema.metadata or {}), _PANDAS_EXTRA: json.dumps(extra).encode()})
+                buf = io.BytesIO()
+                pq.write_table(table, buf)
+                return (FORMAT_PARQUET_SERIES if is_series else FORMAT_PARQUET_FRAME), buf.getvalue()
+            except Exception:
+                pass  # e.g. non-string column labels or object columns of mixed types
+    return FORMAT_PICKLE, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def deserialize(fmt: str, blob: bytes) -> Any:
+    """Inverse of ``serialize``."""
+    if fmt in (FORMAT_PARQUET_FRAME, FORMAT_PARQUET_SERIES):
+        metadata = pq.read_schema(io.BytesIO(blob)).metadata or {}
+        extra = json.loads(metadata.get(_PANDAS_EXTRA, b'{}'))
+        value = pd.read_parquet(io.BytesIO(blob), engine='pyarrow')
+        if fmt == FORMAT_PARQUET_SERIES:
+            value = value['__value__']
+        return _restore_extra(value, extra)
+    return pickle.loads(blob)
+
+
+class DiskCache:
+    """
+    SQLite-backed key/value cache with LRU size bound and TTL.
+
+    Each thread gets its own connection; SQLite's locking makes writes
+    atomic across threads and processes sharing the same file.
+
+    Args:
+        path: Database file
+        max_bytes: Total payload size above which least recently accessed
+                   entries are evicted
+        sweep_interval: Seconds between background expiry sweeps
+                        (None/0 = no background thread)
+    """
+
+    def __init__(
+        self,
+        path,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        sweep_interval: Optional[float] = DEFAULT_SWEEP_INTERVAL,
+    ):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.sweep_interval = sweep_interval
+        self._local = threading.local()
+        self._sweeper: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._writes = itertools.count(1)   # next() is atomic across threads
+
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(_SCHEMA)
+
+    # ------------------------------------------------------------------
+    # Connection handling
+    # ------------------------------------------------------------------
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.path), timeout=BUSY_TIMEOUT,
+                                   isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _write(self, sql: str, params=()) -> sqlite3.Cursor:
+        """Run one statement in its own IMMEDIATE transaction."""
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            cur = conn.execute(sql, params)
+            conn.execute("COMMIT")
+            return cur
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def lookup(self, key: str, max_age: Optional[float] = None) -> Optional[Tuple[Any, float]]:
+        """
+        Look up ``key``.
+
+        Args:
+            key: Cache key
+            max_age: Treat entries older than this many seconds as expired
+
+        Returns:
+            (value, created timestamp), or None if absent. Expired entries
+            are deleted and reported as absent.
+        """
+        row = self._conn().execute(
+            "SELECT format, value, created, expires, accessed FROM cache_entries WHERE key = ?",
+            (key,),
+        ).fetchone()
+        if row is None:
+            return None
+
+        fmt, blob, created, expires, accessed = row
+        now = time.time()
+        if (expires is not None and now >= expires) or \
+                (max_age is not None and now - created >= max_age):
+            self.delete(key)
+            return None
+
+        try:
+            value = deserialize(fmt, blob)
+        except Exception:
+            self.delete(key)
+            return None
+
+        if now - accessed > ACCESS_RESOLUTION:
+            try:
+                self._write("UPDATE cache_entries SET accessed = ? WHERE key = ?", (now, key))
+            except sqlite3.Error:
+                pass  # LRU bookkeeping only
+        return value, created
+
+    def get(self, key: str, default: Any = None, max_age: Optional[float] = None) -> Any:
+        """Cached value for ``key``, or ``default`` if absent or expired."""
+        hit = self.lookup(key, max_age=max_age)
+        return default if hit is None else hit[0]
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None,
+            created: Optional[float] = None):
+        """
+        Store ``value`` atomically. Every EVICT_EVERY writes (and after any
+        large write) least recently used entries over ``max_bytes`` are evicted.
+
+        Args:
+            key: Cache key
+            value: Any picklable value
+            ttl: Seconds until the entry expires (None = only read-time max_age)
+            created: Creation timestamp (default now)
+        """
+        fmt, blob = serialize(value)
+        now = time.time()
+        created = now if created is None else created
+        expires = created + ttl if ttl is not None else None
+        self._write(
+            "INSERT OR REPLACE INTO cache_entries "
+            "(key, format, value, size, created, expires, accessed) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (key, fmt, sqlite3.Binary(blob), len(blob), created, expires, now),
+        )
+        if next(self._writes) % EVICT_EVERY == 1 or len(blob) > self.max_bytes // EVICT_EVERY:
+            self.evict()
+        self._ensure_sweeper()
+
+    def delete(self, key: str) -> bool:
+        return self._write("DELETE FROM cache_entries WHERE key = ?", (key,)).rowcount > 0
+
+    def clear(self, pattern: Optional[str] = None) -> int:
+        """Delete all entries, or those whose key contains ``pattern``."""
+        if pattern is None:
+            return self._write("DELETE FROM cache_entries").rowcount
+        escaped = pattern.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+        return self._write(
+            "DELETE FROM cache_entries WHERE key LIKE ? ESCAPE '\\'", (f"%{escaped}%",)
+        ).rowcount
+
+    def purge_expired(self) -> int:
+        """Delete every expired entry now; returns the count."""
+        return self._write(
+            "DELETE FROM cache_entries WHERE expires IS NOT NULL AND expires <= ?",
+            (time.time(),),
+        ).rowcount
+
+    def evict(self) -> int:
+        """Delete least recently accessed entries until the total fits ``max_bytes``."""
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM cache_entries").fetchone()[0]
+            removed = 0
+            excess = total - self.max_bytes
+            while excess > 0:
+                # Oldest entries a batch at a time, never the whole key list
+                doomed = []
+                for key, size in conn.execute(
+                    "SELECT key, size FROM cache_entries ORDER BY accessed LIMIT ?", (EVICT_BATCH,)
+                ):
+                    if excess <= 0:
+                        break
+                    doomed.append((key,))
+                    excess -= size
+                if not doomed:
+                    break
+                conn.executemany("DELETE FROM cache_entries WHERE key = ?", doomed)
+                removed += len(doomed)
+            conn.execute("COMMIT")
+            return removed
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def stats(self) -> dict:
+        count, total = self._conn().execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache_entries"
+        ).fetchone()
+        return {'entries': count, 'bytes': total, 'max_bytes': self.max_bytes}
+
+    def __len__(self) -> int:
+        return self._conn().execute("SELECT COUNT(*) FROM cache_entries").fetchone()[0]
+
+    # ------------------------------------------------------------------
+    # Background expiry sweep
+    # ------------------------------------------------------------------
+
+    def _ensure_sweeper(self):
+        if not self.sweep_interval or (self._sweeper is not None and self._sweeper.is_alive()):
+            return
+        self._sweeper = threading.Thread(target=self._sweep_loop, name='atlas-disk-cache-sweep',
+                                         daemon=True)
+        self._sweeper.start()
+
+    def _sweep_loop(self):
+        while not self._stop.wait(self.sweep_interval):
+            try:
+                self.purge_expired()
+                self.evict()
+            except sqlite3.Error:
+                pass  # another process holds the lock; try next interval
+
+    def close(self):
+        """Stop the sweeper and close this thread's connection."""
+        self._stop.set()
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
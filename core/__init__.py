@@ -2,259 +2,180 @@
 ATLAS Core Module
 Exports all shared functions for use by page modules.
 This breaks the circular import cycle with atlas_app.py.
-"""
 
-# Shared constants and feature flags (must be first - other modules depend on these)
-from .constants import (
-    REFACTORED_MODULES_AVAILABLE, SQL_AVAILABLE, BROKER_MANAGER_AVAILABLE,
-    market_data, ErrorHandler, cache_manager, cached, safe_execute,
-    get_db, ManualPortfolioAdapter, BrokerManager,
-    PROFESSIONAL_THEME_AVAILABLE, PROFESSIONAL_CHART_COLORS,
-    VALUATION_CONSTRAINTS, EXPERT_WISDOM_RULES,
-    ALPACA_DATA_ENGINE_AVAILABLE, AlpacaDataEngine, alpaca_prompt_credentials,
-)
+Exports are resolved lazily (PEP 562 module ``__getattr__``): ``from core
+import fetch_market_data`` imports ``core.fetchers`` on first use instead of
+pulling every submodule (and yfinance, scipy, plotly, networkx with them)
+into the process the moment anything under ``core`` is imported. This keeps
+``atlas_app`` cold start independent of the pages that need those libraries.
+"""
 
-# Data Loading Functions
-from .data_loading import (
-    load_portfolio_data,
-    save_portfolio_data,
-    load_trade_history,
-    save_trade_history,
-    load_account_history,
-    save_account_history,
-    parse_trade_history_file,
-    parse_account_history_file,
-    get_current_portfolio_metrics,
-    get_portfolio_period_return,
-    get_benchmark_period_return,
-    get_gics_sector,
-    get_portfolio_gics_sectors,
-    get_spy_sector_weights,
-    get_data_freshness,
-    get_portfolio_from_broker_or_legacy,
-    validate_portfolio_data,
-    get_leverage_info,
-    is_option_ticker,
-    classify_ticker_sector,
-    init_watchlist,
-    add_to_watchlist,
-    remove_from_watchlist,
-    save_watchlist,
-    get_watchlist,
-    is_valid_series,
-    is_valid_dataframe,
-    ATLASFormatter,
-)
+import importlib
 
-# Calculation Functions
-from .calculations import (
-    calculate_portfolio_returns,
-    calculate_performance_metrics,
-    calculate_signal_health,
-    calculate_forward_rates,
-    calculate_smart_assumptions,
-    calculate_wacc,
-    calculate_cost_of_equity,
-    calculate_terminal_value,
-    calculate_dcf_value,
-    calculate_gordon_growth_ddm,
-    calculate_multistage_ddm,
-    calculate_residual_income,
-    calculate_peer_multiples,
-    calculate_sotp_valuation,
-    calculate_consensus_valuation,
-    calculate_skill_score,
-    calculate_brinson_attribution_gics,
-    calculate_brinson_attribution,
-    calculate_benchmark_returns,
-    calculate_quality_score,
-    calculate_sharpe_ratio,
-    calculate_sortino_ratio,
-    calculate_information_ratio,
-    calculate_var,
-    calculate_cvar,
-    calculate_historical_stress_test,
-    calculate_risk_adjusted_limits,
-    calculate_var_cvar_portfolio_optimization,
-    calculate_max_risk_contrib,
-    calculate_performance_metric,
-    calculate_portfolio_max_drawdown,
-    calculate_max_risk_contrib_pct,
-    calculate_max_drawdown,
-    calculate_calmar_ratio,
-    calculate_portfolio_correlations,
-    calculate_factor_exposures,
-    calculate_portfolio_from_trades,
-    project_fcff_enhanced,
-    project_fcfe_enhanced,
-    apply_relative_valuation,
-)
+# Submodule -> names it exports through ``core``
+_EXPORTS = {
+    # Shared constants and feature flags
+    'constants': (
+        'REFACTORED_MODULES_AVAILABLE', 'SQL_AVAILABLE', 'BROKER_MANAGER_AVAILABLE',
+        'market_data', 'ErrorHandler', 'cache_manager', 'cached', 'safe_execute',
+        'get_db', 'ManualPortfolioAdapter', 'BrokerManager',
+        'PROFESSIONAL_THEME_AVAILABLE', 'PROFESSIONAL_CHART_COLORS',
+        'VALUATION_CONSTRAINTS', 'EXPERT_WISDOM_RULES', 'ALPACA_DATA_ENGINE_AVAILABLE',
+        'AlpacaDataEngine', 'alpaca_prompt_credentials',
+    ),
+    # Data Loading Functions
+    'data_loading': (
+        'load_portfolio_data', 'save_portfolio_data', 'load_trade_history',
+        'save_trade_history', 'load_account_history', 'save_account_history',
+        'parse_trade_history_file', 'parse_account_history_file',
+        'get_current_portfolio_metrics', 'get_portfolio_period_return',
+        'get_benchmark_period_return', 'get_gics_sector', 'get_portfolio_gics_sectors',
+        'get_spy_sector_weights', 'get_data_freshness',
+        'get_portfolio_from_broker_or_legacy', 'validate_portfolio_data',
+        'get_leverage_info', 'is_option_ticker', 'classify_ticker_sector',
+        'init_watchlist', 'add_to_watchlist', 'remove_from_watchlist', 'save_watchlist',
+        'get_watchlist', 'is_valid_series', 'is_valid_dataframe', 'ATLASFormatter',
+    ),
+    # Calculation Functions
+    'calculations': (
+        'calculate_portfolio_returns', 'calculate_performance_metrics',
+        'calculate_signal_health', 'calculate_forward_rates',
+        'calculate_smart_assumptions', 'calculate_wacc', 'calculate_cost_of_equity',
+        'calculate_terminal_value', 'calculate_dcf_value',
+        'calculate_gordon_growth_ddm', 'calculate_multistage_ddm',
+        'calculate_residual_income', 'calculate_peer_multiples',
+        'calculate_sotp_valuation', 'calculate_consensus_valuation',
+        'calculate_skill_score', 'calculate_brinson_attribution_gics',
+        'calculate_brinson_attribution', 'calculate_benchmark_returns',
+        'calculate_quality_score', 'calculate_sharpe_ratio', 'calculate_sortino_ratio',
+        'calculate_information_ratio', 'calculate_var', 'calculate_cvar',
+        'calculate_historical_stress_test', 'calculate_risk_adjusted_limits',
+        'calculate_var_cvar_portfolio_optimization', 'calculate_max_risk_contrib',
+        'calculate_performance_metric', 'calculate_portfolio_max_drawdown',
+        'calculate_max_risk_contrib_pct', 'calculate_max_drawdown',
+        'calculate_calmar_ratio', 'calculate_portfolio_correlations',
+        'calculate_factor_exposures', 'calculate_portfolio_from_trades',
+        'project_fcff_enhanced', 'project_fcfe_enhanced', 'apply_relative_valuation',
+    ),
+    # Chart Functions
+    'charts': (
+        'create_enhanced_holdings_table', 'create_risk_snapshot',
+        'create_signal_health_badge', 'create_pnl_attribution_sector',
+        'create_pnl_attribution_position', 'create_sparkline', 'create_yield_curve',
+        'create_yield_curve_with_forwards', 'create_valuation_summary_table',
+        'create_brinson_attribution_chart', 'create_skill_assessment_card',
+        'create_sector_attribution_table', 'create_top_contributors_chart',
+        'create_top_detractors_chart', 'create_sector_allocation_donut',
+        'create_professional_sector_allocation_pie',
+        'create_professional_sector_allocation_bar', 'create_rolling_metrics_chart',
+        'create_underwater_plot', 'create_var_waterfall',
+        'create_var_cvar_distribution', 'create_rolling_var_cvar_chart',
+        'create_risk_contribution_sunburst', 'create_risk_reward_plot',
+        'create_performance_heatmap', 'create_portfolio_heatmap',
+        'create_interactive_performance_chart', 'create_monte_carlo_chart',
+        'create_risk_parity_analysis', 'create_drawdown_distribution',
+        'create_correlation_network', 'create_efficient_frontier',
+        'create_dynamic_market_table', 'create_sector_rotation_heatmap',
+        'create_holdings_attribution_waterfall', 'create_concentration_gauge',
+        'create_concentration_analysis', 'create_factor_momentum_chart',
+        'create_factor_exposure_radar', 'make_scrollable_table', 'show_toast',
+        'style_holdings_dataframe', 'style_holdings_dataframe_with_optimization',
+        'should_display_monthly_heatmap', 'apply_chart_theme',
+    ),
+    # Fetcher Functions
+    'fetchers': (
+        'search_yahoo_finance', 'fetch_us_treasury_yields_fred', 'fetch_uk_gilt_yields',
+        'fetch_german_bund_yields', 'fetch_sa_government_bond_yields',
+        'fetch_market_data', 'fetch_historical_data', 'fetch_stock_info',
+        'fetch_analyst_data', 'fetch_company_financials', 'fetch_peer_companies',
+        'fetch_ticker_performance', 'fetch_market_watch_data',
+    ),
+    # Optimizer Functions
+    'optimizers': (
+        'RiskProfile', 'RobustPortfolioOptimizer', 'OptimizationExplainer',
+        'optimize_two_stage_diversification_first', 'optimize_for_peak_performance',
+        'optimize_max_sharpe', 'optimize_min_volatility', 'optimize_max_return',
+        'optimize_risk_parity', 'check_expert_wisdom', 'get_wisdom_grade',
+        'build_realistic_constraints', 'build_position_bounds', 'apply_trade_threshold',
+        'validate_portfolio_realism',
+    ),
+    # TradingView Charts (fallbacks below if the package is missing)
+    'tradingview_charts': (
+        'render_candlestick_chart', 'render_candlestick_with_indicators',
+        'render_line_chart', 'render_multi_series_chart', 'create_tradingview_chart',
+        'prepare_ohlcv_data', 'prepare_line_data', 'get_chart_options', 'ATLAS_COLORS',
+        'INDEX_COLORS', 'is_tradingview_available', 'TRADINGVIEW_AVAILABLE',
+    ),
+    # Alpha Vantage API Integration
+    'alpha_vantage': (
+        'AlphaVantageClient', 'av_client', 'get_client', 'FREE_TIER_DAILY_LIMIT',
+    ),
+    # Stock Universe (Smart Hybrid Architecture)
+    'stock_universe': (
+        'SP500_TICKERS', 'NASDAQ100_ADDITIONS', 'POPULAR_ADDITIONS', 'SECTOR_MAP',
+        'COMPANY_NAMES', 'get_local_universe', 'get_local_universe_count',
+        'get_local_universe_df', 'get_screener_universe', 'validate_ticker_yfinance',
+        'get_ticker_info_fast', 'search_any_ticker', 'get_all_sectors',
+        'get_tickers_by_sector', 'get_sector_for_ticker', 'get_company_name',
+    ),
+    # Local symbol index (prefix + trigram typeahead)
+    'symbol_index': (
+        'SymbolIndex', 'get_symbol_index', 'refresh_asset_snapshot',
+    ),
+    # Table Formatting (ATLAS typography system for tables)
+    'atlas_table_formatting': (
+        'inject_table_css', 'table_row', 'table_row_from_data', 'table_section_header',
+        'render_movers_table', 'render_holdings_table', 'render_generic_table',
+        'render_column_manager', 'render_table_card', 'format_volume', 'format_price',
+        'format_percent', 'format_market_cap', 'format_change', 'format_ratio',
+    ),
+}
 
-# Chart Functions
-from .charts import (
-    create_enhanced_holdings_table,
-    create_risk_snapshot,
-    create_signal_health_badge,
-    create_pnl_attribution_sector,
-    create_pnl_attribution_position,
-    create_sparkline,
-    create_yield_curve,
-    create_yield_curve_with_forwards,
-    create_valuation_summary_table,
-    create_brinson_attribution_chart,
-    create_skill_assessment_card,
-    create_sector_attribution_table,
-    create_top_contributors_chart,
-    create_top_detractors_chart,
-    create_sector_allocation_donut,
-    create_professional_sector_allocation_pie,
-    create_professional_sector_allocation_bar,
-    create_rolling_metrics_chart,
-    create_underwater_plot,
-    create_var_waterfall,
-    create_var_cvar_distribution,
-    create_rolling_var_cvar_chart,
-    create_risk_contribution_sunburst,
-    create_risk_reward_plot,
-    create_performance_heatmap,
-    create_portfolio_heatmap,
-    create_interactive_performance_chart,
-    create_monte_carlo_chart,
-    create_risk_parity_analysis,
-    create_drawdown_distribution,
-    create_correlation_network,
-    create_efficient_frontier,
-    create_dynamic_market_table,
-    create_sector_rotation_heatmap,
-    create_holdings_attribution_waterfall,
-    create_concentration_gauge,
-    create_concentration_analysis,
-    create_factor_momentum_chart,
-    create_factor_exposure_radar,
-    # Additional functions for page modules
-    make_scrollable_table,
-    show_toast,
-    style_holdings_dataframe,
-    style_holdings_dataframe_with_optimization,
-    should_display_monthly_heatmap,
-    apply_chart_theme,
-)
+_EXPORT_SOURCE = {name: module for module, names in _EXPORTS.items() for name in names}
 
-# Fetcher Functions
-from .fetchers import (
-    search_yahoo_finance,
-    fetch_us_treasury_yields_fred,
-    fetch_uk_gilt_yields,
-    fetch_german_bund_yields,
-    fetch_sa_government_bond_yields,
-    fetch_market_data,
-    fetch_historical_data,
-    fetch_stock_info,
-    fetch_analyst_data,
-    fetch_company_financials,
-    fetch_peer_companies,
-    fetch_ticker_performance,
-    fetch_market_watch_data,
-)
 
-# Optimizer Functions
-from .optimizers import (
-    RiskProfile,
-    RobustPortfolioOptimizer,
-    OptimizationExplainer,
-    optimize_two_stage_diversification_first,
-    optimize_for_peak_performance,
-    optimize_max_sharpe,
-    optimize_min_volatility,
-    optimize_max_return,
-    optimize_risk_parity,
-    check_expert_wisdom,
-    get_wisdom_grade,
-    build_realistic_constraints,
-    build_position_bounds,
-    apply_trade_threshold,
-    validate_portfolio_realism,
-)
+def _tv_fallback(name, error):
+    """Stand-ins when streamlit-lightweight-charts (or its deps) is missing."""
+    if name == 'TRADINGVIEW_AVAILABLE':
+        return False
+    if name == 'is_tradingview_available':
+        return lambda: False
 
-# TradingView Charts - REQUIRED (no silent fallback)
-try:
-    from .tradingview_charts import (
-        render_candlestick_chart,
-        render_candlestick_with_indicators,
-        render_line_chart,
-        render_multi_series_chart,
-        create_tradingview_chart,
-        prepare_ohlcv_data,
-        prepare_line_data,
-        get_chart_options,
-        ATLAS_COLORS,
-        INDEX_COLORS,
-        is_tradingview_available,
-        TRADINGVIEW_AVAILABLE,
-    )
-except ImportError as e:
-    TRADINGVIEW_AVAILABLE = False
     def _tv_not_available(*args, **kwargs):
-        raise ImportError(f"TradingView charts require streamlit-lightweight-charts package: {e}")
-    render_candlestick_chart = _tv_not_available
-    render_candlestick_with_indicators = _tv_not_available
-    render_line_chart = _tv_not_available
-    render_multi_series_chart = _tv_not_available
-    create_tradingview_chart = _tv_not_available
-    def is_tradingview_available():
-        return False
+        raise ImportError(f"TradingView charts require streamlit-lightweight-charts package: {error}")
+    return _tv_not_available
+
+
+def _import_fallback(module, name, error):
+    """Value to export when ``module`` cannot be imported, or re-raise."""
+    if module == 'tradingview_charts':
+        return _tv_fallback(name, error)
+    if module == 'alpha_vantage' and name in ('av_client', 'ALPHA_VANTAGE_AVAILABLE'):
+        return None if name == 'av_client' else False
+    raise AttributeError(f"module 'core' has no attribute {name!r} ({error})") from error
+
+
+def __getattr__(name):
+    if name == 'ALPHA_VANTAGE_AVAILABLE':
+        # True when the client module imports, as with the old eager import
+        try:
+            importlib.import_module('.alpha_vantage', __name__)
+            value = True
+        except ImportError as e:
+            value = _import_fallback('alpha_vantage', name, e)
+        globals()[name] = value
+        return value
 
-# Alpha Vantage API Integration
-try:
-    from .alpha_vantage import (
-        AlphaVantageClient,
-        av_client,
-        get_client,
-        FREE_TIER_DAILY_LIMIT,
-    )
-    ALPHA_VANTAGE_AVAILABLE = True
-except ImportError:
-    ALPHA_VANTAGE_AVAILABLE = False
-    av_client = None
+    module = _EXPORT_SOURCE.get(name)
+    if module is None:
+        raise AttributeError(f"module 'core' has no attribute {name!r}")
+    try:
+        value = getattr(importlib.import_module(f'.{module}', __name__), name)
+    except ImportError as e:
+        value = _import_fallback(module, name, e)
+    globals()[name] = value
+    return value
 
-# Stock Universe (Smart Hybrid Architecture)
-try:
-    from .stock_universe import (
-        SP500_TICKERS,
-        NASDAQ100_ADDITIONS,
-        POPULAR_ADDITIONS,
-        SECTOR_MAP,
-        COMPANY_NAMES,
-        get_local_universe,
-        get_local_universe_count,
-        get_local_universe_df,
-        get_screener_universe,
-        validate_ticker_yfinance,
-        get_ticker_info_fast,
-        search_any_ticker,
-        get_all_sectors,
-        get_tickers_by_sector,
-        get_sector_for_ticker,
-        get_company_name,
-    )
-except ImportError:
-    pass
 
-# Table Formatting (ATLAS typography system for tables)
-from .atlas_table_formatting import (
-    inject_table_css,
-    table_row,
-    table_row_from_data,
-    table_section_header,
-    render_movers_table,
-    render_holdings_table,
-    render_generic_table,
-    render_column_manager,
-    render_table_card,
-    format_volume,
-    format_price,
-    format_percent,
-    format_market_cap,
-    format_change,
-    format_ratio,
-)
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORT_SOURCE) | {'ALPHA_VANTAGE_AVAILABLE'})
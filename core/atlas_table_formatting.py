@@ -15,13 +15,20 @@ Usage:
         inject_table_css,
         table_row, table_row_from_data,
         render_movers_table, render_holdings_table, render_generic_table,
+        render_paginated_table,
         format_volume, format_price, format_percent,
     )
 """
 
-import streamlit as st
+import hashlib
+import math
+import threading
+from collections import OrderedDict
+from typing import Optional, List, Dict, Tuple
+
+import numpy as np
 import pandas as pd
-from typing import Optional, List, Dict
+import streamlit as st
 
 
 # =============================================================================
@@ -122,6 +129,11 @@ STYLE_TEXT = (
     f"padding: 12px 8px; border-bottom: 1px solid {COLOR_BORDER};"
 )
 
+# Rendered generic tables, keyed by a fingerprint of the visible rows + columns
+TABLE_CACHE_MAX_ENTRIES = 64
+_TABLE_HTML_CACHE: "OrderedDict[str, str]" = OrderedDict()
+_TABLE_CACHE_LOCK = threading.Lock()
+
 # Row styles (flex layout for Movers)
 STYLE_ROW = (
     f"display: flex; justify-content: space-between; align-items: center; "
@@ -282,6 +294,54 @@ def table_section_header(title: str, icon: str = "") -> str:
     return f'<div style="{STYLE_SECTION_HEADER}">{icon_html}{title}</div>'
 
 
+# =============================================================================
+# VECTORIZED COLUMN HELPERS
+# =============================================================================
+
+def _column(df: pd.DataFrame, key: str, default=None) -> pd.Series:
+    """Return ``df[key]``, or a constant Series when the column is missing."""
+    if key in df.columns:
+        return df[key]
+    return pd.Series(default, index=df.index, dtype=object)
+
+
+def _first_column(df: pd.DataFrame, keys: List[str], default=None) -> pd.Series:
+    """Return the first of ``keys`` present in ``df`` (column-level row.get fallback chain)."""
+    for key in keys:
+        if key in df.columns:
+            return df[key]
+    return pd.Series(default, index=df.index, dtype=object)
+
+
+def _as_text(series: pd.Series) -> pd.Series:
+    """``str()`` of every value as an object Series (None -> 'None', like f-strings)."""
+    return pd.Series(series.to_numpy(dtype=object).astype(str), index=series.index, dtype=object)
+
+
+def _to_numeric(series: pd.Series, strip: Tuple[str, ...] = ()) -> pd.Series:
+    """Coerce a column to float, stripping ``strip`` tokens from text values first."""
+    if strip and not pd.api.types.is_numeric_dtype(series):
+        text = _as_text(series)
+        for token in strip:
+            text = text.str.replace(token, '', regex=False)
+        return pd.to_numeric(text.str.strip(), errors='coerce').astype(float)
+    return pd.to_numeric(series, errors='coerce').astype(float)
+
+
+def _format_each(values, spec: str) -> np.ndarray:
+    """Apply one format spec to a numeric array. Returns an object array of str."""
+    arr = np.asarray(values, dtype=float)
+    fmt = ('{:' + spec + '}').format
+    return np.array([fmt(v) for v in arr.tolist()], dtype=object)
+
+
+def _format_shares(values) -> np.ndarray:
+    """Whole shares as integers with separators, fractional shares to 2dp."""
+    arr = np.asarray(values, dtype=float)
+    whole = arr == np.floor(arr)
+    return np.where(whole, _format_each(arr, ',.0f'), _format_each(arr, ',.2f')).astype(object)
+
+
 # =============================================================================
 # MOVERS TABLE (Top Gainers / Losers / Most Active)
 # =============================================================================
@@ -307,29 +367,18 @@ def render_movers_table(
         )
         return
 
-    for _, row in df.head(max_rows).iterrows():
-        ticker = str(row.get(ticker_col, 'N/A'))
-        volume = pd.to_numeric(row.get(volume_col, 0), errors='coerce') or 0
-        price = pd.to_numeric(row.get(price_col, 0), errors='coerce') or 0
-        change = pd.to_numeric(row.get(change_col, 0), errors='coerce') or 0
+    window = df.head(max_rows)
+    tickers = _column(window, ticker_col, 'N/A').astype(str)
+    volumes = _to_numeric(_column(window, volume_col, 0)).fillna(0)
+    prices = _to_numeric(_column(window, price_col, 0)).fillna(0)
+    # Handles change_percentage strings like "232.87%"
+    changes = _to_numeric(_column(window, change_col, 0), strip=('%',)).fillna(0)
 
-        # Handle change_percentage strings like "232.87%"
-        if isinstance(row.get(change_col), str):
-            change = pd.to_numeric(
-                str(row.get(change_col)).replace('%', ''),
-                errors='coerce'
-            ) or 0
-
-        st.markdown(
-            table_row_from_data(
-                ticker=ticker,
-                volume=volume,
-                price=price,
-                change_pct=change,
-                currency=currency,
-            ),
-            unsafe_allow_html=True
-        )
+    rows = [
+        table_row_from_data(ticker=t, volume=v, price=p, change_pct=c, currency=currency)
+        for t, v, p, c in zip(tickers, volumes, prices, changes)
+    ]
+    st.markdown("".join(rows), unsafe_allow_html=True)
 
 
 # =============================================================================
@@ -352,33 +401,31 @@ def render_holdings_table(
     if df is None or df.empty:
         return f'<span style="font-family: {FONT}; font-size: 11px; color: {COLOR_DIM};">No holdings data</span>'
 
-    rows_html = []
-    for _, row in df.iterrows():
-        ticker = str(row.get(ticker_col, row.get('symbol', row.get('Symbol', row.get('Ticker', 'N/A')))))
-        shares = pd.to_numeric(row.get(shares_col, row.get('quantity', row.get('Shares', 0))), errors='coerce') or 0
-        price = pd.to_numeric(row.get(price_col, row.get('current_price', row.get('Current Price', 0))), errors='coerce') or 0
-        value = pd.to_numeric(row.get(value_col, row.get('market_value', row.get('Total Value', 0))), errors='coerce')
-        if pd.isna(value) or value == 0:
-            value = shares * price
-        change = pd.to_numeric(row.get(change_col, row.get('daily_change', row.get('Daily Change %', 0))), errors='coerce') or 0
-
-        is_up = change >= 0
-        arrow = "\u25b2" if is_up else "\u25bc"
-        sign = "+" if is_up else ""
-        chg_style = STYLE_CHANGE_UP if is_up else STYLE_CHANGE_DOWN
-
-        # Format shares: whole if integer, 2 decimal if fractional
-        shares_str = f"{int(shares):,}" if shares == int(shares) else f"{shares:,.2f}"
-
-        rows_html.append(
-            f'<tr>'
-            f'<td style="{STYLE_TICKER}">{ticker}</td>'
-            f'<td style="{STYLE_TD}">{shares_str}</td>'
-            f'<td style="{STYLE_PRICE}">{currency}{price:,.2f}</td>'
-            f'<td style="{STYLE_PRICE}">{currency}{value:,.2f}</td>'
-            f'<td style="{chg_style}">{arrow} {sign}{change:.2f}%</td>'
-            f'</tr>'
-        )
+    tickers = _first_column(df, [ticker_col, 'symbol', 'Symbol', 'Ticker'], 'N/A').astype(str)
+    shares = _to_numeric(_first_column(df, [shares_col, 'quantity', 'Shares'], 0)).fillna(0)
+    prices = _to_numeric(_first_column(df, [price_col, 'current_price', 'Current Price'], 0)).fillna(0)
+    values = _to_numeric(_first_column(df, [value_col, 'market_value', 'Total Value'], 0))
+    values = values.where(values.notna() & (values != 0), shares * prices)
+    changes = _to_numeric(_first_column(df, [change_col, 'daily_change', 'Daily Change %'], 0)).fillna(0)
+
+    is_up = changes >= 0
+    shares_str = _format_shares(shares)
+    price_str = _format_each(prices, ',.2f')
+    value_str = _format_each(values, ',.2f')
+    change_str = (
+        np.where(is_up, "\u25b2 +", "\u25bc ").astype(object)
+        + _format_each(changes, '.2f') + "%"
+    )
+    chg_style = np.where(is_up, STYLE_CHANGE_UP, STYLE_CHANGE_DOWN).astype(object)
+
+    rows = (
+        f'<tr><td style="{STYLE_TICKER}">' + tickers.to_numpy(dtype=object)
+        + f'</td><td style="{STYLE_TD}">' + shares_str
+        + f'</td><td style="{STYLE_PRICE}">{currency}' + price_str
+        + f'</td><td style="{STYLE_PRICE}">{currency}' + value_str
+        + '</td><td style="' + chg_style + '">' + change_str
+        + '</td></tr>'
+    )
 
     return (
         f'<table style="{STYLE_TABLE}">'
@@ -389,7 +436,7 @@ def render_holdings_table(
         f'<th style="{STYLE_TH_RIGHT}">Value</th>'
         f'<th style="{STYLE_TH_RIGHT}">Change</th>'
         f'</tr></thead>'
-        f'<tbody>{"".join(rows_html)}</tbody>'
+        f'<tbody>{"".join(rows)}</tbody>'
         f'</table>'
     )
 
@@ -398,136 +445,176 @@ def render_holdings_table(
 # GENERIC TABLE (Column-type driven rendering with inline styles)
 # =============================================================================
 
-def _format_quality_score(val: float) -> str:
-    """Format Quality Score: 1 decimal if fractional, whole number if whole."""
-    if val == int(val):
-        return f"{int(val)}"
-    return f"{val:.1f}"
+def _glow_style(color: str, glow: str, weight: int = 600, halo: bool = True) -> str:
+    """Inline style for a green/red glowing numeric cell."""
+    shadow = f"{glow}, 0 0 16px {color}60" if halo else glow
+    return (
+        f"font-family: {FONT_MONO}; font-weight: {weight}; font-size: 13px; "
+        f"color: {color}; text-shadow: {shadow}; text-align: right; "
+        f"padding: 12px 8px; border-bottom: 1px solid {COLOR_BORDER};"
+    )
+
+
+# Enhanced green/red with stronger glow (change / dollar_change columns)
+STYLE_GLOW_UP = _glow_style(COLOR_GREEN, GLOW_GREEN)
+STYLE_GLOW_DOWN = _glow_style(COLOR_RED, GLOW_RED)
+# Single glow, lighter weight (percent columns)
+STYLE_PERCENT_UP = _glow_style(COLOR_GREEN, GLOW_GREEN, weight=500, halo=False)
+STYLE_PERCENT_DOWN = _glow_style(COLOR_RED, GLOW_RED, weight=500, halo=False)
+
+EMPTY_CELL = f'<td style="{STYLE_TEXT}">\u2014</td>'
+
+# Fallback style when a numeric column holds an unparseable value
+_FALLBACK_STYLE = {
+    'price': STYLE_PRICE,
+    'dollar_change': STYLE_PRICE,
+    'shares': STYLE_TD,
+    'quality_score': STYLE_TEXT,
+    'volume': STYLE_META,
+    'market_cap': STYLE_META,
+    'ratio': STYLE_TEXT,
+    'percent': STYLE_PERCENT,
+    'weight': STYLE_PERCENT,
+}
+
+# Characters stripped before parsing text-valued change / percent cells
+_CHANGE_STRIP = ('%', ',', '\u25b2', '\u25bc')
+_PERCENT_STRIP = ('%', ',')
 
 
-def _render_cell(value, col_type: str, currency: str = "$") -> str:
-    """Render a single cell based on column type, using inline styles."""
-    if value is None or (isinstance(value, float) and pd.isna(value)):
-        return f'<td style="{STYLE_TEXT}">\u2014</td>'
+def _td(style, content: np.ndarray) -> np.ndarray:
+    """Wrap an object array of cell contents in <td> tags (style may be an array)."""
+    if isinstance(style, str):
+        return f'<td style="{style}">' + content + '</td>'
+    return '<td style="' + style + '">' + content + '</td>'
+
+
+def _render_column(series: pd.Series, col_type: str, currency: str = "$") -> np.ndarray:
+    """
+    Render every cell of one column in a single pass.
+
+    Parses the column to numbers once, formats the parsed values with the
+    type's formatter and picks styles with boolean masks. Returns an object
+    array of ``<td>`` strings aligned with ``series``.
+    """
+    n = len(series)
+    null = series.isna().to_numpy()
+
+    def text():
+        return _as_text(series).to_numpy(dtype=object)
 
     if col_type == 'ticker':
-        return f'<td style="{STYLE_TICKER}">{value}</td>'
-
-    elif col_type == 'price':
-        val = pd.to_numeric(value, errors='coerce')
-        if pd.isna(val):
-            return f'<td style="{STYLE_PRICE}">{value}</td>'
-        return f'<td style="{STYLE_PRICE}">{currency}{val:,.2f}</td>'
-
-    elif col_type == 'dollar_change':
-        # Dollar gain/loss: ▲ +$749.30 in green / ▼ -$234.27 in red
-        val = pd.to_numeric(value, errors='coerce')
-        if pd.isna(val):
-            return f'<td style="{STYLE_PRICE}">{value}</td>'
-        is_up = val >= 0
-        arrow = "\u25b2" if is_up else "\u25bc"
-        color = COLOR_GREEN if is_up else COLOR_RED
-        glow = GLOW_GREEN if is_up else GLOW_RED
-        sign = "+" if is_up else ""
-        style = (
-            f"font-family: {FONT_MONO}; font-weight: 600; font-size: 13px; "
-            f"color: {color}; text-shadow: {glow}, 0 0 16px {color}60; text-align: right; "
-            f"padding: 12px 8px; border-bottom: 1px solid {COLOR_BORDER};"
-        )
-        return f'<td style="{style}">{arrow} {sign}{currency}{abs(val):,.2f}</td>'
-
-    elif col_type == 'change':
-        # Try to parse numeric value from string
-        raw = str(value).replace('%', '').replace(',', '').strip()
-        # Handle arrow characters
-        raw = raw.replace('\u25b2', '').replace('\u25bc', '').replace('▲', '').replace('▼', '').strip()
-        val = pd.to_numeric(raw, errors='coerce')
-        if pd.isna(val):
-            # Not numeric - render as-is but check for up/down indicators
-            text = str(value)
-            if any(up in text for up in ['+', '\u25b2', '▲']):
-                return f'<td style="{STYLE_CHANGE_UP}">{text}</td>'
-            elif any(dn in text for dn in ['-', '\u25bc', '▼']):
-                return f'<td style="{STYLE_CHANGE_DOWN}">{text}</td>'
-            return f'<td style="{STYLE_CHANGE_NEUTRAL}">{text}</td>'
-        is_up = val >= 0
-        arrow = "\u25b2" if is_up else "\u25bc"
-        color = COLOR_GREEN if is_up else COLOR_RED
-        glow = GLOW_GREEN if is_up else GLOW_RED
-        sign = "+" if is_up else ""
-        # Enhanced green/red with stronger glow animation effect
-        style = (
-            f"font-family: {FONT_MONO}; font-weight: 600; font-size: 13px; "
-            f"color: {color}; text-shadow: {glow}, 0 0 16px {color}60; text-align: right; "
-            f"padding: 12px 8px; border-bottom: 1px solid {COLOR_BORDER};"
-        )
-        return f'<td style="{style}">{arrow} {sign}{val:.2f}%</td>'
-
-    elif col_type == 'percent':
-        raw = str(value).replace('%', '').replace(',', '').strip()
-        val = pd.to_numeric(raw, errors='coerce')
-        if pd.isna(val):
-            return f'<td style="{STYLE_PERCENT}">{value}</td>'
-        # Color-code percentages with green/red glow like changes
-        if val > 0:
-            style = (
-                f"font-family: {FONT_MONO}; font-weight: 500; font-size: 13px; "
-                f"color: {COLOR_GREEN}; text-shadow: {GLOW_GREEN}; text-align: right; "
-                f"padding: 12px 8px; border-bottom: 1px solid {COLOR_BORDER};"
-            )
-            return f'<td style="{style}">+{val:.2f}%</td>'
-        elif val < 0:
-            style = (
-                f"font-family: {FONT_MONO}; font-weight: 500; font-size: 13px; "
-                f"color: {COLOR_RED}; text-shadow: {GLOW_RED}; text-align: right; "
-                f"padding: 12px 8px; border-bottom: 1px solid {COLOR_BORDER};"
+        out = _td(STYLE_TICKER, text())
+
+    elif col_type in ('change', 'percent', 'weight'):
+        strip = _CHANGE_STRIP if col_type == 'change' else _PERCENT_STRIP
+        num = _to_numeric(_as_text(series), strip=strip).to_numpy(dtype=float)
+        bad = np.isnan(num)
+        up = num >= 0
+
+        if col_type == 'change':
+            content = np.where(up, "\u25b2 +", "\u25bc ").astype(object) + _format_each(num, '.2f') + "%"
+            out = _td(np.where(up, STYLE_GLOW_UP, STYLE_GLOW_DOWN).astype(object), content)
+            if bad.any():
+                # Not numeric - render as-is but check for up/down indicators
+                raw = _as_text(series)
+                is_up = raw.str.contains('+', regex=False) | raw.str.contains('\u25b2', regex=False)
+                is_dn = raw.str.contains('-', regex=False) | raw.str.contains('\u25bc', regex=False)
+                styles = np.select(
+                    [is_up.to_numpy(), is_dn.to_numpy()],
+                    [STYLE_CHANGE_UP, STYLE_CHANGE_DOWN],
+                    default=STYLE_CHANGE_NEUTRAL,
+                ).astype(object)
+                out[bad] = _td(styles[bad], text()[bad])
+        elif col_type == 'percent':
+            # Color-code percentages with green/red glow like changes
+            content = np.where(num > 0, "+", "").astype(object) + _format_each(num, '.2f') + "%"
+            styles = np.select(
+                [num > 0, num < 0], [STYLE_PERCENT_UP, STYLE_PERCENT_DOWN], default=STYLE_PERCENT,
+            ).astype(object)
+            out = _td(styles, content)
+            out[num == 0] = f'<td style="{STYLE_PERCENT}">0.00%</td>'
+        else:
+            # Plain percentage - no green/red glow, just normal text
+            out = _td(STYLE_PERCENT, _format_each(num, '.2f') + "%")
+
+        if col_type != 'change' and bad.any():
+            out[bad] = _td(_FALLBACK_STYLE[col_type], text()[bad])
+
+    elif col_type in _FALLBACK_STYLE:
+        num = _to_numeric(series).to_numpy(dtype=float)
+        bad = np.isnan(num)
+
+        if col_type == 'price':
+            out = _td(STYLE_PRICE, currency + _format_each(num, ',.2f'))
+        elif col_type == 'dollar_change':
+            # Dollar gain/loss: ▲ +$749.30 in green / ▼ -$234.27 in red
+            up = num >= 0
+            content = (
+                np.where(up, "\u25b2 +", "\u25bc ").astype(object)
+                + currency + _format_each(np.abs(num), ',.2f')
             )
-            return f'<td style="{style}">{val:.2f}%</td>'
-        return f'<td style="{STYLE_PERCENT}">0.00%</td>'
-
-    elif col_type == 'weight':
-        # Plain percentage - no green/red glow, just normal text
-        raw = str(value).replace('%', '').replace(',', '').strip()
-        val = pd.to_numeric(raw, errors='coerce')
-        if pd.isna(val):
-            return f'<td style="{STYLE_PERCENT}">{value}</td>'
-        return f'<td style="{STYLE_PERCENT}">{val:.2f}%</td>'
-
-    elif col_type == 'shares':
-        val = pd.to_numeric(value, errors='coerce')
-        if pd.isna(val):
-            return f'<td style="{STYLE_TD}">{value}</td>'
-        # Round fractional shares to 2 decimal places
-        if val == int(val):
-            return f'<td style="{STYLE_TD}">{int(val):,}</td>'
-        return f'<td style="{STYLE_TD}">{val:,.2f}</td>'
-
-    elif col_type == 'quality_score':
-        val = pd.to_numeric(value, errors='coerce')
-        if pd.isna(val):
-            return f'<td style="{STYLE_TEXT}">{value}</td>'
-        return f'<td style="{STYLE_TEXT}">{_format_quality_score(val)}</td>'
-
-    elif col_type == 'volume':
-        val = pd.to_numeric(value, errors='coerce')
-        if pd.isna(val):
-            return f'<td style="{STYLE_META}">{value}</td>'
-        return f'<td style="{STYLE_META}">{format_volume(val)}</td>'
-
-    elif col_type == 'market_cap':
-        val = pd.to_numeric(value, errors='coerce')
-        if pd.isna(val):
-            return f'<td style="{STYLE_META}">{value}</td>'
-        return f'<td style="{STYLE_META}">{format_market_cap(val)}</td>'
-
-    elif col_type == 'ratio':
-        val = pd.to_numeric(value, errors='coerce')
-        if pd.isna(val):
-            return f'<td style="{STYLE_TEXT}">{value}</td>'
-        return f'<td style="{STYLE_TEXT}">{val:.2f}</td>'
+            out = _td(np.where(up, STYLE_GLOW_UP, STYLE_GLOW_DOWN).astype(object), content)
+        elif col_type == 'shares':
+            # Round fractional shares to 2 decimal places
+            out = _td(STYLE_TD, _format_shares(num))
+        elif col_type == 'quality_score':
+            # 1 decimal if fractional, whole number if whole
+            whole = num == np.floor(num)
+            content = np.where(whole, _format_each(num, '.0f'), _format_each(num, '.1f'))
+            out = _td(STYLE_TEXT, content.astype(object))
+        elif col_type == 'volume':
+            out = _td(STYLE_META, np.array([format_volume(v) for v in num], dtype=object))
+        elif col_type == 'market_cap':
+            out = _td(STYLE_META, np.array([format_market_cap(v) for v in num], dtype=object))
+        else:  # ratio
+            out = _td(STYLE_TEXT, _format_each(num, '.2f'))
+
+        if bad.any():
+            out[bad] = _td(_FALLBACK_STYLE[col_type], text()[bad])
 
     else:  # 'text' or unknown
-        return f'<td style="{STYLE_TEXT}">{value}</td>'
+        out = _td(STYLE_TEXT, text())
+
+    out = np.asarray(out, dtype=object).reshape(n)
+    out[null] = EMPTY_CELL
+    return out
+
+
+def _row_window(
+    df: pd.DataFrame,
+    max_rows: Optional[int] = None,
+    page: Optional[int] = None,
+    page_size: Optional[int] = None,
+) -> pd.DataFrame:
+    """Slice the rows that will actually be rendered (max_rows, then page window)."""
+    window = df.head(max_rows) if max_rows else df
+    if page_size:
+        start = max(int(page or 0), 0) * page_size
+        window = window.iloc[start:start + page_size]
+    return window
+
+
+def _table_fingerprint(window: pd.DataFrame, columns: List[Dict], currency: str) -> Optional[str]:
+    """Hash the rendered window + column spec. Returns None if the data is unhashable."""
+    keys = [c['key'] for c in columns if c['key'] in window.columns]
+    digest = hashlib.md5()
+    try:
+        if keys:
+            digest.update(pd.util.hash_pandas_object(window[keys], index=False).to_numpy().tobytes())
+    except TypeError:
+        return None
+    digest.update(repr((
+        len(window), currency,
+        [(c['key'], c.get('label'), c.get('type', 'text')) for c in columns],
+    )).encode())
+    return digest.hexdigest()
+
+
+def clear_table_cache():
+    """Drop all cached table HTML."""
+    with _TABLE_CACHE_LOCK:
+        _TABLE_HTML_CACHE.clear()
 
 
 def render_generic_table(
@@ -535,10 +622,16 @@ def render_generic_table(
     columns: List[Dict],
     max_rows: Optional[int] = None,
     currency: str = "$",
+    page: Optional[int] = None,
+    page_size: Optional[int] = None,
 ) -> str:
     """
     Render a table with column-type-driven formatting using inline styles.
 
+    Each column is formatted once as a whole (see ``_render_column``) and the
+    resulting HTML is cached by a fingerprint of the rendered rows, so a
+    Streamlit rerun over unchanged data is a hash + dict lookup.
+
     Args:
         df: DataFrame with data
         columns: List of column definitions, each a dict:
@@ -547,10 +640,12 @@ def render_generic_table(
                 'label': 'Display Header',
                 'type': 'ticker' | 'price' | 'change' | 'percent' | 'weight' |
                         'volume' | 'market_cap' | 'ratio' | 'shares' |
-                        'quality_score' | 'text',
+                        'quality_score' | 'dollar_change' | 'text',
             }
         max_rows: Limit number of rows (None = all)
         currency: Currency symbol for price columns
+        page: Zero-based page index (used with page_size)
+        page_size: Rows per page. When set only that window is rendered.
 
     Returns:
         HTML string. Use with st.markdown(..., unsafe_allow_html=True).
@@ -558,6 +653,16 @@ def render_generic_table(
     if df is None or df.empty:
         return f'<span style="font-family: {FONT}; font-size: 11px; color: {COLOR_DIM};">No data available</span>'
 
+    window = _row_window(df, max_rows, page, page_size)
+
+    cache_key = _table_fingerprint(window, columns, currency)
+    if cache_key is not None:
+        with _TABLE_CACHE_LOCK:
+            cached_html = _TABLE_HTML_CACHE.get(cache_key)
+            if cached_html is not None:
+                _TABLE_HTML_CACHE.move_to_end(cache_key)
+                return cached_html
+
     # Determine alignment for headers
     right_types = {'price', 'change', 'dollar_change', 'percent', 'weight', 'ratio', 'quality_score'}
 
@@ -567,23 +672,73 @@ def render_generic_table(
         style = STYLE_TH_RIGHT if col.get('type') in right_types else STYLE_TH
         headers.append(f'<th style="{style}">{col["label"]}</th>')
 
-    # Build rows
-    rows_html = []
-    display_df = df.head(max_rows) if max_rows else df
-    for _, row in display_df.iterrows():
-        cells = []
-        for col in columns:
-            val = row.get(col['key'])
-            cells.append(_render_cell(val, col.get('type', 'text'), currency))
-        rows_html.append(f'<tr>{"".join(cells)}</tr>')
+    # Build cells column by column, then stitch rows together
+    cells = [
+        _render_column(_column(window, col['key']), col.get('type', 'text'), currency)
+        for col in columns
+    ]
+    rows = ['<tr>' + ''.join(row) + '</tr>' for row in zip(*cells)]
 
-    return (
+    html = (
         f'<table style="{STYLE_TABLE}">'
         f'<thead><tr>{"".join(headers)}</tr></thead>'
-        f'<tbody>{"".join(rows_html)}</tbody>'
+        f'<tbody>{"".join(rows)}</tbody>'
         f'</table>'
     )
 
+    if cache_key is not None:
+        with _TABLE_CACHE_LOCK:
+            _TABLE_HTML_CACHE[cache_key] = html
+            while len(_TABLE_HTML_CACHE) > TABLE_CACHE_MAX_ENTRIES:
+                _TABLE_HTML_CACHE.popitem(last=False)
+    return html
+
+
+def render_paginated_table(
+    df: pd.DataFrame,
+    columns: List[Dict],
+    page_size: int = 50,
+    session_key: str = "atlas_table",
+    currency: str = "$",
+) -> str:
+    """
+    Render one page of a large table with previous/next controls.
+
+    Only ``page_size`` rows are formatted and sent to the browser. The current
+    page lives in ``st.session_state[f"{session_key}_page"]``.
+
+    Returns:
+        HTML string for the current page.
+    """
+    if df is None or df.empty:
+        return render_generic_table(df, columns, currency=currency)
+
+    n_rows = len(df)
+    n_pages = max(1, math.ceil(n_rows / page_size))
+    page_key = f"{session_key}_page"
+    page = min(max(int(st.session_state.get(page_key, 0)), 0), n_pages - 1)
+
+    if n_pages > 1:
+        c1, c2, c3 = st.columns([1, 4, 1])
+        with c1:
+            if st.button("\u25c0", key=f"{session_key}_prev", disabled=(page == 0), help="Previous page"):
+                page -= 1
+        with c3:
+            if st.button("\u25b6", key=f"{session_key}_next", disabled=(page >= n_pages - 1), help="Next page"):
+                page += 1
+        first = page * page_size + 1
+        last = min((page + 1) * page_size, n_rows)
+        with c2:
+            st.markdown(
+                f'<div style="font-family: {FONT}; font-size: 11px; color: {COLOR_MUTED}; '
+                f'text-align: center; padding-top: 8px;">'
+                f'Rows {first:,}\u2013{last:,} of {n_rows:,} \u00b7 Page {page + 1} / {n_pages}</div>',
+                unsafe_allow_html=True
+            )
+    st.session_state[page_key] = page
+
+    return render_generic_table(df, columns, currency=currency, page=page, page_size=page_size)
+
 
 # =============================================================================
 # INTERACTIVE COLUMN MANAGEMENT
@@ -775,6 +930,8 @@ __all__ = [
     'render_movers_table',
     'render_holdings_table',
     'render_generic_table',
+    'render_paginated_table',
+    'clear_table_cache',
 
     # Interactive column management
     'render_column_manager',
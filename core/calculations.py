@@ -71,7 +71,8 @@ from .data_loading import (
     is_valid_series, is_option_ticker, get_gics_sector,
     get_current_portfolio_metrics, get_spy_sector_weights,
 )
-from data.sectors import get_benchmark_sector_returns
+from data.sectors import get_benchmark_sector_returns, classify_sectors
+from analytics.attribution import sector_attribution, stock_attribution
 
 
 
@@ -1027,8 +1028,9 @@ def calculate_brinson_attribution_gics(portfolio_df, period='1y'):
     """
     df = portfolio_df.copy()
 
-    # Step 1: Apply GICS sector classification
-    df['GICS_Sector'] = df['Ticker'].apply(get_gics_sector)
+    # Step 1: Apply GICS sector classification (one bulk lookup, not one per ticker)
+    sectors = classify_sectors(df['Ticker'].tolist())
+    df['GICS_Sector'] = df['Ticker'].map(lambda t: sectors.get(str(t).upper().strip(), 'Other'))
 
     # Step 2: Calculate portfolio weights if not provided
     if 'Weight %' not in df.columns:
@@ -1051,84 +1053,24 @@ def calculate_brinson_attribution_gics(portfolio_df, period='1y'):
         benchmark_total_return = sum(benchmark_weights[s] / 100 * benchmark_returns.get(s, 0)
                                      for s in benchmark_weights.keys())
 
-    # Step 5: Aggregate portfolio by GICS sector
-    # Use value-weighted returns within each sector
-    portfolio_sectors = df.groupby('GICS_Sector').agg({
-        'Weight %': 'sum',
-        'Total Gain/Loss %': lambda x: np.average(x, weights=df.loc[x.index, 'Weight %'])
-    }).reset_index()
-
-    portfolio_sectors.columns = ['Sector', 'Portfolio Weight', 'Portfolio Return']
-    portfolio_sectors['Portfolio Weight'] = portfolio_sectors['Portfolio Weight'] / 100
-
-    # Step 6: Calculate attribution for each sector
-    results = []
-
-    for _, row in portfolio_sectors.iterrows():
-        sector = row['Sector']
-
-        # Portfolio weight and return
-        wp = row['Portfolio Weight']
-        rp = row['Portfolio Return'] / 100
-
-        # Benchmark weight and return
-        wb = benchmark_weights.get(sector, 0) / 100
-        rb = benchmark_returns.get(sector, 0) / 100
-
-        # Benchmark total return
-        rb_total = benchmark_total_return / 100
-
-        # Brinson-Fachler Attribution:
-        # Allocation Effect = (wp - wb) × (rb - rb_total)
-        # Selection Effect = wp × (rp - rb)  # Using portfolio weight (Brinson-Fachler)
-        # Interaction Effect = (wp - wb) × (rp - rb)
-
-        allocation_effect = (wp - wb) * (rb - rb_total) * 100
-        selection_effect = wp * (rp - rb) * 100
-        interaction_effect = (wp - wb) * (rp - rb) * 100
-
-        results.append({
-            'Sector': sector,
-            'Portfolio Weight': wp * 100,
-            'Benchmark Weight': wb * 100,
-            'Weight Diff': (wp - wb) * 100,
-            'Portfolio Return': rp * 100,
-            'Benchmark Return': rb * 100,
-            'Return Diff': (rp - rb) * 100,
-            'Allocation Effect': allocation_effect,
-            'Selection Effect': selection_effect,
-            'Interaction Effect': interaction_effect,
-            'Total Effect': allocation_effect + selection_effect + interaction_effect
-        })
-
-    # Include sectors where portfolio has 0% but benchmark has weight
-    portfolio_sector_list = portfolio_sectors['Sector'].tolist()
-    for sector, wb in benchmark_weights.items():
-        if sector not in portfolio_sector_list and wb > 0:
-            wb_pct = wb / 100
-            rb = benchmark_returns.get(sector, 0) / 100
-            rb_total = benchmark_total_return / 100
-
-            # Portfolio has 0% in this sector
-            allocation_effect = (0 - wb_pct) * (rb - rb_total) * 100
-            selection_effect = 0  # No selection effect when no holdings
-            interaction_effect = 0
-
-            results.append({
-                'Sector': sector,
-                'Portfolio Weight': 0,
-                'Benchmark Weight': wb,
-                'Weight Diff': -wb,
-                'Portfolio Return': 0,
-                'Benchmark Return': rb * 100,
-                'Return Diff': -rb * 100,
-                'Allocation Effect': allocation_effect,
-                'Selection Effect': selection_effect,
-                'Interaction Effect': interaction_effect,
-                'Total Effect': allocation_effect
-            })
-
-    attribution_df = pd.DataFrame(results)
+    # Steps 5-6: Sector attribution, vectorized (analytics.attribution).
+    # Effects are in % units: weights as fractions, returns in %.
+    # Selection uses the portfolio weight, as this page always has, so its
+    # Selection Effect already includes the interaction term.
+    holdings = pd.DataFrame({
+        'Sector': df['GICS_Sector'],
+        'Weight': df['Weight %'] / 100,
+        'Return': df['Total Gain/Loss %'],
+    })
+    attribution_df = sector_attribution(
+        holdings,
+        pd.Series(benchmark_weights, dtype=float) / 100,
+        benchmark_returns,
+        benchmark_total=benchmark_total_return,
+        selection_weight='portfolio',
+    )
+    for col in ('Portfolio Weight', 'Benchmark Weight', 'Weight Diff'):
+        attribution_df[col] = attribution_df[col] * 100
     attribution_df = attribution_df.sort_values('Total Effect', ascending=False)
 
     # Step 7: Calculate totals
@@ -1138,7 +1080,6 @@ def calculate_brinson_attribution_gics(portfolio_df, period='1y'):
     total_attribution = total_allocation + total_selection + total_interaction
 
     # Step 8: Calculate stock-level attribution
-    stock_results = []
     portfolio_total_return = (df['Weight %'] * df['Total Gain/Loss %']).sum() / 100
 
     # SPY weights for major holdings (approximate, as of recent data)
@@ -1156,37 +1097,22 @@ def calculate_brinson_attribution_gics(portfolio_df, period='1y'):
         'IBM': 0.3, 'NOW': 0.3, 'BKR': 0.25, 'NVT': 0.2,
     }
 
-    for _, row in df.iterrows():
-        ticker = row['Ticker']
-        weight = row['Weight %'] / 100
-        stock_return = row['Total Gain/Loss %'] / 100
-        sector = row['GICS_Sector']
-
-        # Get SPY index weight (0 if not in index)
-        index_weight = SPY_WEIGHTS.get(ticker, 0.0)
-
-        # Benchmark return for this sector
-        sector_benchmark_return = benchmark_returns.get(sector, 0) / 100
-
-        # Contribution to portfolio return
-        contribution = weight * stock_return * 100
-
-        # Active contribution (vs if held at benchmark sector return)
-        active_contribution = weight * (stock_return - sector_benchmark_return) * 100
-
-        stock_results.append({
-            'Ticker': ticker,
-            'GICS_Sector': sector,
-            'Weight %': weight * 100,
-            'Index Weight %': index_weight,  # SPY weight
-            'Return %': stock_return * 100,
-            'Sector Benchmark Return %': sector_benchmark_return * 100,
-            'Return vs Sector': (stock_return - sector_benchmark_return) * 100,
-            'Contribution %': contribution,
-            'Active Contribution %': active_contribution
-        })
-
-    stock_attribution_df = pd.DataFrame(stock_results)
+    stocks = stock_attribution(
+        pd.DataFrame({'Ticker': df['Ticker'], 'Sector': df['GICS_Sector'],
+                      'Weight': df['Weight %'] / 100, 'Return': df['Total Gain/Loss %']}),
+        benchmark_returns,
+    )
+    stock_attribution_df = pd.DataFrame({
+        'Ticker': stocks['Ticker'],
+        'GICS_Sector': stocks['Sector'],
+        'Weight %': stocks['Weight'] * 100,
+        'Index Weight %': stocks['Ticker'].map(SPY_WEIGHTS).fillna(0.0),  # SPY weight
+        'Return %': stocks['Return'],
+        'Sector Benchmark Return %': stocks['Sector Benchmark Return'],
+        'Return vs Sector': stocks['Return vs Sector'],
+        'Contribution %': stocks['Contribution'],
+        'Active Contribution %': stocks['Active Contribution'],
+    })
     stock_attribution_df = stock_attribution_df.sort_values('Active Contribution %', ascending=False)
 
     # Step 9: Validation - LINK TO PERFORMANCE SUITE
@@ -2590,9 +2516,12 @@ def validate_brinson_calculations(attribution_df, portfolio_weights, benchmark_w
     validation_output.append("BRINSON ATTRIBUTION VALIDATION")
     validation_output.append("=" * 60)
 
+    pw = pd.Series(portfolio_weights, dtype=float)
+    bw = pd.Series(benchmark_weights, dtype=float)
+
     # Check 1: Weights sum to 100%
-    port_weight_sum = sum(portfolio_weights.values())
-    bench_weight_sum = sum(benchmark_weights.values())
+    port_weight_sum = pw.sum()
+    bench_weight_sum = bw.sum()
 
     validation_output.append("\n1. WEIGHT VALIDATION:")
     validation_output.append(f"   Portfolio weights sum: {port_weight_sum:.2f}%")
@@ -2619,10 +2548,8 @@ def validate_brinson_calculations(attribution_df, portfolio_weights, benchmark_w
     validation_output.append(f"   Total Attribution: {total_attribution:+.2f}%")
 
     # Check 3: Compare to actual excess return
-    portfolio_return = sum(portfolio_weights.get(s, 0) * portfolio_returns.get(s, 0) / 100
-                          for s in portfolio_weights.keys())
-    benchmark_return = sum(benchmark_weights.get(s, 0) * benchmark_returns.get(s, 0) / 100
-                          for s in benchmark_weights.keys())
+    portfolio_return = (pw * pd.Series(portfolio_returns, dtype=float).reindex(pw.index, fill_value=0)).sum() / 100
+    benchmark_return = (bw * pd.Series(benchmark_returns, dtype=float).reindex(bw.index, fill_value=0)).sum() / 100
     actual_excess = portfolio_return - benchmark_return
 
     validation_output.append(f"\n3. EXCESS RETURN VALIDATION:")
@@ -2638,10 +2565,9 @@ def validate_brinson_calculations(attribution_df, portfolio_weights, benchmark_w
 
     # Check 4: Sector-level sanity checks
     validation_output.append(f"\n4. SECTOR-LEVEL CHECKS:")
-    for _, row in attribution_df.iterrows():
-        sector = row['Sector']
-        alloc = row['Allocation Effect']
-        selection = row['Selection Effect']
+    for sector, alloc, selection in zip(attribution_df['Sector'],
+                                        attribution_df['Allocation Effect'],
+                                        attribution_df['Selection Effect']):
         validation_output.append(f"   {sector}:")
         validation_output.append(f"      Allocation: {alloc:+.2f}% | Selection: {selection:+.2f}%")
 
@@ -83,6 +83,7 @@ from .data_loading import (
     ATLASFormatter,
     get_current_portfolio_metrics,
 )
+from .downsampling import downsample_series
 from .calculations import (
     calculate_signal_health,
     calculate_forward_rates,
@@ -1312,6 +1313,10 @@ def create_rolling_metrics_chart(returns, window=60, use_professional_theme=True
     rolling_vol = returns.rolling(window).std() * np.sqrt(252) * 100
     rolling_sharpe = (returns.rolling(window).mean() * 252 - RISK_FREE_RATE) / (returns.rolling(window).std() * np.sqrt(252))
 
+    # Send at most a chart-width's worth of points to the browser
+    rolling_vol = downsample_series(rolling_vol)
+    rolling_sharpe = downsample_series(rolling_sharpe)
+
     # Theme colors
     if use_professional_theme and PROFESSIONAL_THEME_AVAILABLE:
         vol_color = '#FF1744'
@@ -1397,12 +1402,13 @@ def create_underwater_plot(returns):
     cumulative = (1 + returns).cumprod()
     running_max = cumulative.expanding().max()
     drawdown = ((cumulative - running_max) / running_max) * 100
+    plot_drawdown = downsample_series(drawdown)
     
     fig = go.Figure()
     
     fig.add_trace(go.Scatter(
-        x=drawdown.index,
-        y=drawdown.values,
+        x=plot_drawdown.index,
+        y=plot_drawdown.values,
         fill='tozeroy',
         fillcolor='rgba(255, 0, 68, 0.3)',
         line=dict(color=COLORS['danger'], width=2),
@@ -2011,6 +2017,7 @@ def create_interactive_performance_chart(tickers, start_date, end_date, use_prof
     for idx, ticker in enumerate(tickers):
         cumulative, data = fetch_ticker_performance(ticker, start_date, end_date)
         if cumulative is not None:
+            cumulative = downsample_series(cumulative)
             fig.add_trace(go.Scatter(
                 x=cumulative.index,
                 y=cumulative.values,
@@ -47,13 +47,22 @@ except ImportError:
     ETF_SECTORS = {}
 
 try:
-    from data.sectors import GICS_SECTORS, GICS_SECTOR_MAPPING, STOCK_SECTOR_OVERRIDES, SPY_SECTOR_WEIGHTS
+    from data.sectors import (
+        GICS_SECTORS, GICS_SECTOR_MAPPING, STOCK_SECTOR_OVERRIDES, SPY_SECTOR_WEIGHTS,
+        classify_sectors, standardize_sector,
+    )
 except ImportError:
     GICS_SECTORS = {}
     GICS_SECTOR_MAPPING = {}
     STOCK_SECTOR_OVERRIDES = {}
     SPY_SECTOR_WEIGHTS = {}
 
+    def standardize_sector(raw_sector):
+        return raw_sector if raw_sector in GICS_SECTORS else GICS_SECTOR_MAPPING.get(raw_sector, 'Other')
+
+    def classify_sectors(tickers, fetch=True, max_workers=8):
+        return {str(t).upper().strip(): get_gics_sector(t) for t in tickers}
+
 # Shared constants and feature flags
 from .constants import (
     REFACTORED_MODULES_AVAILABLE, market_data, ErrorHandler, cache_manager,
@@ -432,15 +441,7 @@ def get_gics_sector(ticker):
     try:
         stock = yf.Ticker(ticker_upper)
         info = stock.info or {}  # yfinance 1.2+ returns None on 401 — guard against NoneType
-        sector = info.get('sector', 'Other')
-
-        # Map to standard GICS
-        if sector in GICS_SECTORS:
-            result = sector
-        elif sector in GICS_SECTOR_MAPPING:
-            result = GICS_SECTOR_MAPPING[sector]
-        else:
-            result = 'Other'
+        result = standardize_sector(info.get('sector', 'Other'))
 
         # Cache the result
         if REFACTORED_MODULES_AVAILABLE:
@@ -472,8 +473,9 @@ def get_portfolio_gics_sectors(portfolio_df):
     """
     df = portfolio_df.copy()
 
-    # Apply GICS classification to each ticker
-    df['GICS_Sector'] = df['Ticker'].apply(get_gics_sector)
+    # One bulk lookup: overrides + cache first, a single concurrent batch for misses
+    sectors = classify_sectors(df['Ticker'].tolist())
+    df['GICS_Sector'] = df['Ticker'].map(lambda t: sectors.get(str(t).upper().strip(), 'Other'))
 
     return df
 
@@ -0,0 +1,240 @@
+"""
+ATLAS Terminal - Time-Series Downsampling
+==========================================
+
+Server-side reduction of long price / metric histories before they are sent
+to the browser. A 20-year daily history (~5,000 bars) or a week of minute
+bars (~2,000+) is far more than a 1,200px-wide chart can show, and every
+point is serialised into the Streamlit component payload.
+
+- Lines use Largest-Triangle-Three-Buckets (LTTB), which keeps the visual
+  shape (peaks, troughs, drawdowns) with a fixed point budget.
+- Candles use OHLC bucket aggregation: first open, max high, min low,
+  last close, summed volume per bucket.
+- The point budget comes from the chart's pixel width and, optionally, the
+  visible date range.
+
+Usage:
+    from core.downsampling import downsample_series, target_points
+
+    s = downsample_series(cumulative_returns, target_points(len(cumulative_returns)))
+"""
+
+from typing import Dict, Optional, Tuple, Any
+
+import numpy as np
+import pandas as pd
+
+
+# Assumed plot width when the caller does not know it (wide Streamlit layout)
+DEFAULT_CHART_WIDTH_PX = 1200
+
+# LTTB keeps ~2 points per horizontal pixel; candles need room for a body
+LINE_POINTS_PER_PIXEL = 2
+CANDLE_PIXELS_PER_BAR = 4
+
+# Never reduce below this many points, however narrow the chart
+MIN_POINTS = 100
+
+
+def target_points(
+    n_points: int,
+    width_px: Optional[int] = None,
+    kind: str = 'line',
+) -> int:
+    """
+    Number of points worth sending for a chart of ``width_px`` pixels.
+
+    Args:
+        n_points: Points available after clipping to the visible range
+        width_px: Plot width in pixels (None = DEFAULT_CHART_WIDTH_PX)
+        kind: 'line' or 'candle'
+
+    Returns:
+        Point budget, never more than ``n_points``.
+    """
+    width = width_px or DEFAULT_CHART_WIDTH_PX
+    if kind == 'candle':
+        budget = width // CANDLE_PIXELS_PER_BAR
+    else:
+        budget = width * LINE_POINTS_PER_PIXEL
+    return int(min(n_points, max(budget, MIN_POINTS)))
+
+
+def clip_to_visible_range(
+    obj,
+    visible_range: Optional[Tuple[Any, Any]] = None,
+):
+    """Slice a DatetimeIndex-ed Series/DataFrame to ``(start, end)`` (either may be None)."""
+    if visible_range is None or not isinstance(obj.index, pd.DatetimeIndex):
+        return obj
+    start, end = visible_range
+    return obj.loc[start:end]
+
+
+# =============================================================================
+# LTTB (lines)
+# =============================================================================
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Indices of the points kept by Largest-Triangle-Three-Buckets.
+
+    The first and last points are always kept. The interior is split into
+    ``n_out - 2`` equal buckets and from each bucket the point forming the
+    largest triangle with the previously kept point and the next bucket's
+    centroid is selected. Bucket centroids are computed up front with
+    cumulative sums, so the loop only does one argmax per bucket.
+
+    Args:
+        x: Monotonic x values (e.g. int64 nanoseconds), no NaN
+        y: Values, no NaN
+        n_out: Number of points to keep
+
+    Returns:
+        Sorted int array of kept indices.
+    """
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+
+    # Bucket i (0..n_out-3) covers [edges[i], edges[i + 1]) of the interior
+    edges = (np.floor(np.arange(n_out - 1) * (n - 2) / (n_out - 2)) + 1).astype(np.int64)
+    edges[-1] = n - 1
+
+    # Centroid of each bucket, plus the last point as the final "next bucket"
+    counts = np.diff(edges)
+    avg_x = np.append(np.add.reduceat(x[:-1], edges[:-1]) / counts, x[-1])
+    avg_y = np.append(np.add.reduceat(y[:-1], edges[:-1]) / counts, y[-1])
+
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        ax, ay = x[a], y[a]
+        bx, by = avg_x[i + 1], avg_y[i + 1]
+        area = np.abs((ax - bx) * (y[lo:hi] - ay) - (ax - x[lo:hi]) * (by - ay))
+        a = lo + int(np.argmax(area))
+        selected[i + 1] = a
+    return selected
+
+
+def _x_values(index) -> np.ndarray:
+    """Numeric x positions for an index (nanoseconds for datetimes)."""
+    if isinstance(index, pd.DatetimeIndex):
+        return index.asi8.astype(float)
+    values = np.asarray(index)
+    if np.issubdtype(values.dtype, np.number):
+        return values.astype(float)
+    return np.arange(len(values), dtype=float)
+
+
+def downsample_series(series: pd.Series, max_points: Optional[int] = None) -> pd.Series:
+    """
+    LTTB-downsample a Series for plotting. NaNs are dropped first.
+
+    Args:
+        series: Values indexed by date (or any monotonic index)
+        max_points: Point budget (None = ``target_points(len(series))``)
+
+    Returns:
+        The original Series if it already fits, else the kept points.
+    """
+    if series is None or len(series) == 0:
+        return series
+    clean = series.dropna()
+    n_out = max_points or target_points(len(clean))
+    if len(clean) <= n_out:
+        return clean
+    keep = lttb_indices(_x_values(clean.index), clean.to_numpy(dtype=float), n_out)
+    return clean.iloc[keep]
+
+
+def downsample_frame(df: pd.DataFrame, max_points: Optional[int] = None) -> pd.DataFrame:
+    """
+    Downsample every column of a wide frame onto one shared set of rows.
+
+    Rows are the union of each column's LTTB selection, so every series
+    keeps its own peaks and the traces still share x values (needed for
+    ``hovermode='x unified'``).
+    """
+    if df is None or df.empty:
+        return df
+    n_out = max_points or target_points(len(df))
+    if len(df) <= n_out:
+        return df
+    x = _x_values(df.index)
+    keep = set()
+    per_column = max(3, n_out // max(1, df.shape[1]))
+    for col in df.columns:
+        values = df[col].to_numpy(dtype=float)
+        valid = np.flatnonzero(~np.isnan(values))
+        if len(valid) == 0:
+            continue
+        keep.update(valid[lttb_indices(x[valid], values[valid], per_column)].tolist())
+    return df.iloc[sorted(keep)]
+
+
+# =============================================================================
+# OHLC BUCKETS (candles)
+# =============================================================================
+
+def bucket_starts(n: int, n_buckets: int) -> np.ndarray:
+    """Start offsets of ``n_buckets`` contiguous, near-equal buckets over ``n`` rows."""
+    if n_buckets >= n:
+        return np.arange(n)
+    return np.unique(np.floor(np.arange(n_buckets) * n / n_buckets).astype(np.int64))
+
+
+def aggregate_ohlcv(
+    arrays: Dict[str, np.ndarray],
+    n_buckets: int,
+) -> Dict[str, np.ndarray]:
+    """
+    Aggregate OHLCV arrays into ``n_buckets`` bars.
+
+    Each bucket takes its first time and open, the max high, min low, last
+    close and summed volume. NaN highs/lows are ignored.
+
+    Args:
+        arrays: Dict with 'time', 'open', 'high', 'low', 'close' and
+                optionally 'volume', all the same length
+        n_buckets: Number of output bars
+
+    Returns:
+        Dict of the same keys with aggregated arrays.
+    """
+    n = len(arrays['close'])
+    starts = bucket_starts(n, n_buckets)
+    if len(starts) == n:
+        return arrays
+    ends = np.append(starts[1:], n) - 1
+
+    out = {
+        'time': np.asarray(arrays['time'])[starts],
+        'open': np.asarray(arrays['open'], dtype=float)[starts],
+        'high': np.fmax.reduceat(np.asarray(arrays['high'], dtype=float), starts),
+        'low': np.fmin.reduceat(np.asarray(arrays['low'], dtype=float), starts),
+        'close': np.asarray(arrays['close'], dtype=float)[ends],
+    }
+    if 'volume' in arrays:
+        volume = np.nan_to_num(np.asarray(arrays['volume'], dtype=float))
+        out['volume'] = np.add.reduceat(volume, starts)
+    return out
+
+
+__all__ = [
+    'DEFAULT_CHART_WIDTH_PX',
+    'target_points',
+    'clip_to_visible_range',
+    'lttb_indices',
+    'downsample_series',
+    'downsample_frame',
+    'bucket_starts',
+    'aggregate_ohlcv',
+]
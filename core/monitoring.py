@@ -6,12 +6,16 @@ Lightweight error logging and usage tracking.
 - Error logging: writes to atlas_errors.log
 - Usage tracking: appends CSV rows to atlas_usage.csv
 - Health check: already handled in atlas_app.py (/?health=check)
+- Boot profiling: per-stage import timings for atlas_app.py cold start
 """
 from __future__ import annotations
 
 import csv
 import logging
 import os
+import sys
+import time
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
 
@@ -69,3 +73,74 @@ def log_page_view(username: str | None, page: str, tier: str = "free"):
             ])
     except OSError:
         pass  # Never let logging break the app
+
+
+# ---------------------------------------------------------------------------
+# Boot profiler — per-stage import timings printed as [BOOT] lines
+# ---------------------------------------------------------------------------
+# Cold-start budget for atlas_app.py module import (seconds)
+BOOT_BUDGET_SECONDS = float(os.environ.get("ATLAS_BOOT_BUDGET_S", "3.0"))
+
+# Dependencies that must only be imported by the pages that use them
+HEAVY_MODULES = (
+    "yfinance",
+    "scipy",
+    "sklearn",
+    "networkx",
+    "plotly",
+    "statsmodels",
+    "arch",
+)
+
+
+def loaded_heavy_modules() -> list[str]:
+    """Return the HEAVY_MODULES already present in sys.modules."""
+    return [name for name in HEAVY_MODULES if name in sys.modules]
+
+
+class BootProfiler:
+    """Times named boot stages and prints a summary.
+
+    Usage:
+        boot = BootProfiler()
+        with boot.stage("navigation"):
+            from navigation import route_to_page
+        boot.report()
+    """
+
+    def __init__(self):
+        self._start = time.perf_counter()
+        self.stages: list[tuple[str, float]] = []
+        # Streamlit itself imports plotly; only count what boot adds on top
+        self._preloaded = set(loaded_heavy_modules())
+
+    @contextmanager
+    def stage(self, name: str):
+        """Time the enclosed block and print ``[BOOT] <name> OK (N ms)``."""
+        t0 = time.perf_counter()
+        print(f"[BOOT] Importing {name}...", flush=True)
+        yield
+        elapsed = time.perf_counter() - t0
+        self.stages.append((name, elapsed))
+        print(f"[BOOT] {name} OK ({elapsed * 1000:.0f} ms)", flush=True)
+
+    @property
+    def total(self) -> float:
+        """Seconds since the profiler was created."""
+        return time.perf_counter() - self._start
+
+    def heavy_imported(self) -> list[str]:
+        """HEAVY_MODULES imported since the profiler was created."""
+        return [name for name in loaded_heavy_modules() if name not in self._preloaded]
+
+    def report(self) -> str:
+        """Print and return the stage profile, slowest first."""
+        lines = [f"[BOOT] Import profile: {self.total * 1000:.0f} ms total "
+                 f"(budget {BOOT_BUDGET_SECONDS * 1000:.0f} ms)"]
+        for name, elapsed in sorted(self.stages, key=lambda s: s[1], reverse=True):
+            lines.append(f"[BOOT]   {elapsed * 1000:8.0f} ms  {name}")
+        heavy = self.heavy_imported()
+        lines.append(f"[BOOT] Heavy modules imported: {', '.join(heavy) if heavy else 'none'}")
+        text = "\n".join(lines)
+        print(text, flush=True)
+        return text
@@ -369,7 +369,8 @@ class OptimizationExplainer:
         """
         explanations = {}
         tickers = returns_df.columns
-        cov_matrix = returns_df.cov() * 252
+        from services.covariance_service import get_covariance_service
+        cov_matrix = get_covariance_service().estimate(returns_df, 'sample', scale=252).to_frame()
 
         # ============================================================
         # 1. EXECUTIVE SUMMARY
@@ -590,14 +591,22 @@ class OptimizationExplainer:
         return reasons
 
     def _calculate_risk_contributions(self, weights, cov_matrix):
-        """Calculate risk contribution of each asset"""
-        port_vol = np.sqrt(weights @ cov_matrix @ weights)
+        """Calculate risk contribution of each asset
+
+        cov_matrix may be a matrix or a CovarianceEstimate (O(nk) for factor models).
+        """
+        weights = np.asarray(weights, dtype=float)
+        if hasattr(cov_matrix, 'matvec'):
+            sigma_w = cov_matrix.matvec(weights)
+        else:
+            sigma_w = np.asarray(cov_matrix @ weights, dtype=float)
+        port_vol = np.sqrt(weights @ sigma_w)
 
         if port_vol == 0:
             return np.zeros(len(weights))
 
         # Marginal contribution to risk
-        marginal_contrib = (cov_matrix @ weights) / port_vol
+        marginal_contrib = sigma_w / port_vol
 
         # Total risk contribution
         risk_contrib = weights * marginal_contrib
@@ -905,6 +914,11 @@ def optimize_for_peak_performance(returns_df, strategy_type, risk_free_rate, max
     return weights.values if isinstance(weights, pd.Series) else weights
 
 
+def _leverage_jac(w, target_lev):
+    """Gradient of the sum(|w|) leverage constraint (analytic, so SLSQP skips finite differences)."""
+    return np.sign(w)
+
+
 def optimize_max_sharpe(returns_df, risk_free_rate, max_position=0.25, min_position=0.02, target_leverage=1.0):
     """
     Optimize for maximum Sharpe ratio with production-grade constraints
@@ -925,10 +939,13 @@ def optimize_max_sharpe(returns_df, risk_free_rate, max_position=0.25, min_posit
     from scipy.optimize import minimize
 
     n_assets = len(returns_df.columns)
+    # Moments are fixed during the solve; compute them once, not per evaluation
+    mean_returns = returns_df.mean().to_numpy()
+    cov_matrix = (returns_df.cov() * 252).to_numpy()
 
     def neg_sharpe(weights):
-        port_return = np.sum(returns_df.mean() * weights) * 252
-        port_vol = np.sqrt(np.dot(weights.T, np.dot(returns_df.cov() * 252, weights)))
+        port_return = np.sum(mean_returns * weights) * 252
+        port_vol = np.sqrt(np.dot(weights.T, np.dot(cov_matrix, weights)))
         sharpe = (port_return - risk_free_rate) / port_vol if port_vol > 0 else 0
 
         # GENTLE regularization - tiny penalty to avoid extreme concentration
@@ -938,19 +955,28 @@ def optimize_max_sharpe(returns_df, risk_free_rate, max_position=0.25, min_posit
 
         return -sharpe + gentle_regularization
 
+    def neg_sharpe_grad(weights):
+        cov_w = np.dot(cov_matrix, weights)
+        port_vol = np.sqrt(np.dot(weights, cov_w))
+        grad = 0.02 * weights
+        if port_vol > 0:
+            excess = np.sum(mean_returns * weights) * 252 - risk_free_rate
+            grad -= 252 * mean_returns / port_vol - excess * cov_w / port_vol ** 3
+        return grad
+
     # FIXED v11.0: Leverage constraint using absolute sum of weights
     def leverage_constraint(w, target_lev):
         """Leverage = sum of absolute weights"""
         return np.abs(w).sum() - target_lev
 
     constraints = [
-        {'type': 'eq', 'fun': leverage_constraint, 'args': (target_leverage,)}
+        {'type': 'eq', 'fun': leverage_constraint, 'jac': _leverage_jac, 'args': (target_leverage,)}
     ]
     bounds = tuple((0, max_position) for _ in range(n_assets))
     initial_guess = np.array([target_leverage/n_assets] * n_assets)  # Scale initial guess by leverage
 
-    result = minimize(neg_sharpe, initial_guess, method='SLSQP', bounds=bounds, constraints=constraints,
-                     options={'maxiter': 1000, 'ftol': 1e-9})
+    result = minimize(neg_sharpe, initial_guess, method='SLSQP', jac=neg_sharpe_grad, bounds=bounds,
+                     constraints=constraints, options={'maxiter': 1000, 'ftol': 1e-9})
 
     # Post-processing: Remove tiny positions
     optimized_weights = result.x.copy()
@@ -981,9 +1007,10 @@ def optimize_min_volatility(returns_df, max_position=0.25, min_position=0.02, ta
     from scipy.optimize import minimize
 
     n_assets = len(returns_df.columns)
+    cov_matrix = (returns_df.cov() * 252).to_numpy()
 
     def portfolio_vol(weights):
-        vol = np.sqrt(np.dot(weights.T, np.dot(returns_df.cov() * 252, weights)))
+        vol = np.sqrt(np.dot(weights.T, np.dot(cov_matrix, weights)))
 
         # GENTLE regularization - tiny penalty to avoid extreme concentration
         # Scaled to be ~0.5% of typical volatility magnitude
@@ -992,19 +1019,24 @@ def optimize_min_volatility(returns_df, max_position=0.25, min_position=0.02, ta
 
         return vol + gentle_regularization
 
+    def portfolio_vol_grad(weights):
+        cov_w = np.dot(cov_matrix, weights)
+        vol = np.sqrt(np.dot(weights, cov_w))
+        return (cov_w / vol if vol > 0 else 0.0) + 0.002 * weights
+
     # FIXED v11.0: Leverage constraint using absolute sum of weights
     def leverage_constraint(w, target_lev):
         """Leverage = sum of absolute weights"""
         return np.abs(w).sum() - target_lev
 
     constraints = [
-        {'type': 'eq', 'fun': leverage_constraint, 'args': (target_leverage,)}
+        {'type': 'eq', 'fun': leverage_constraint, 'jac': _leverage_jac, 'args': (target_leverage,)}
     ]
     bounds = tuple((0, max_position) for _ in range(n_assets))
     initial_guess = np.array([target_leverage/n_assets] * n_assets)
 
-    result = minimize(portfolio_vol, initial_guess, method='SLSQP', bounds=bounds, constraints=constraints,
-                     options={'maxiter': 1000, 'ftol': 1e-9})
+    result = minimize(portfolio_vol, initial_guess, method='SLSQP', jac=portfolio_vol_grad, bounds=bounds,
+                     constraints=constraints, options={'maxiter': 1000, 'ftol': 1e-9})
 
     # Post-processing: Remove tiny positions
     optimized_weights = result.x.copy()
@@ -1035,7 +1067,7 @@ def optimize_max_return(returns_df, max_position=0.25, min_position=0.02, target
     from scipy.optimize import minimize
 
     n_assets = len(returns_df.columns)
-    mean_returns = returns_df.mean() * 252
+    mean_returns = (returns_df.mean() * 252).to_numpy()
 
     def neg_return(weights):
         portfolio_return = np.sum(mean_returns * weights)
@@ -1047,19 +1079,22 @@ def optimize_max_return(returns_df, max_position=0.25, min_position=0.02, target
 
         return -portfolio_return + gentle_regularization
 
+    def neg_return_grad(weights):
+        return -mean_returns + 0.01 * weights
+
     # FIXED v11.0: Leverage constraint using absolute sum of weights
     def leverage_constraint(w, target_lev):
         """Leverage = sum of absolute weights"""
         return np.abs(w).sum() - target_lev
 
     constraints = [
-        {'type': 'eq', 'fun': leverage_constraint, 'args': (target_leverage,)}
+        {'type': 'eq', 'fun': leverage_constraint, 'jac': _leverage_jac, 'args': (target_leverage,)}
     ]
     bounds = tuple((0, max_position) for _ in range(n_assets))
     initial_guess = np.array([target_leverage/n_assets] * n_assets)
 
-    result = minimize(neg_return, initial_guess, method='SLSQP', bounds=bounds, constraints=constraints,
-                     options={'maxiter': 1000, 'ftol': 1e-9})
+    result = minimize(neg_return, initial_guess, method='SLSQP', jac=neg_return_grad, bounds=bounds,
+                     constraints=constraints, options={'maxiter': 1000, 'ftol': 1e-9})
 
     # Post-processing: Remove tiny positions
     optimized_weights = result.x.copy()
@@ -1090,7 +1125,7 @@ def optimize_risk_parity(returns_df, max_position=0.25, min_position=0.02, targe
     from scipy.optimize import minimize
 
     n_assets = len(returns_df.columns)
-    cov_matrix = returns_df.cov() * 252
+    cov_matrix = (returns_df.cov() * 252).to_numpy()
 
     def risk_parity_objective(weights):
         port_vol = np.sqrt(np.dot(weights.T, np.dot(cov_matrix, weights)))
@@ -1103,19 +1138,32 @@ def optimize_risk_parity(returns_df, max_position=0.25, min_position=0.02, targe
 
         return risk_parity_error
 
+    def risk_parity_grad(weights):
+        cov_w = np.dot(cov_matrix, weights)
+        port_vol = np.sqrt(np.dot(weights, cov_w))
+        if port_vol == 0:
+            return np.zeros_like(weights)
+        error = weights * cov_w / port_vol - port_vol / n_assets
+        return 2 * (
+            error * cov_w / port_vol
+            + np.dot(cov_matrix, error * weights) / port_vol
+            - np.sum(error * weights * cov_w) * cov_w / port_vol ** 3
+            - np.sum(error) * cov_w / (n_assets * port_vol)
+        )
+
     # FIXED v11.0: Leverage constraint using absolute sum of weights
     def leverage_constraint(w, target_lev):
         """Leverage = sum of absolute weights"""
         return np.abs(w).sum() - target_lev
 
     constraints = [
-        {'type': 'eq', 'fun': leverage_constraint, 'args': (target_leverage,)}
+        {'type': 'eq', 'fun': leverage_constraint, 'jac': _leverage_jac, 'args': (target_leverage,)}
     ]
     bounds = tuple((0, max_position) for _ in range(n_assets))
     initial_guess = np.array([target_leverage/n_assets] * n_assets)
 
-    result = minimize(risk_parity_objective, initial_guess, method='SLSQP', bounds=bounds, constraints=constraints,
-                     options={'maxiter': 1000, 'ftol': 1e-9})
+    result = minimize(risk_parity_objective, initial_guess, method='SLSQP', jac=risk_parity_grad,
+                     bounds=bounds, constraints=constraints, options={'maxiter': 1000, 'ftol': 1e-9})
 
     # Post-processing: Remove tiny positions
     optimized_weights = result.x.copy()
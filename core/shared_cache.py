@@ -0,0 +1,355 @@
+"""
+ATLAS Terminal - Process-Wide Shared Cache
+===========================================
+
+One in-memory cache per server process for market data that is the same for
+every user (index/sector/factor ETF prices, quotes, benchmark returns).
+Streamlit runs every browser session in the same Python process, so a
+module-level cache is shared by all of them: 30 analysts opening Market Watch
+trigger one SPY download instead of 30.
+
+User-specific data (portfolio, broker engines, credentials) stays in
+``st.session_state``; never put it here.
+
+- Bounded LRU: by entry count and by estimated bytes
+- Per-entry TTL (set time) and optional max age (read time)
+- Thread-safe; ``get_or_compute`` lets one thread fetch while concurrent
+  callers for the same key wait for its result
+- Hit / miss / eviction counters
+
+Usage:
+    from core.shared_cache import market_cache, shared_cached
+
+    @shared_cached(ttl=300, namespace='sectors')
+    def get_sector_performance():
+        ...
+
+    df = market_cache.get_or_compute(('spy', '1y'), lambda: fetch('SPY'), ttl=3600)
+
+Cached objects are shared between sessions: treat them as read-only.
+"""
+
+import os
+import pickle
+import sys
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from typing import Any, Callable, Dict, Hashable, Optional
+
+import numpy as np
+import pandas as pd
+
+
+# Defaults, overridable per deployment
+DEFAULT_MAX_ENTRIES = int(os.environ.get('ATLAS_SHARED_CACHE_ENTRIES', '2048'))
+DEFAULT_MAX_BYTES = int(float(os.environ.get('ATLAS_SHARED_CACHE_MB', '512')) * 1024 * 1024)
+
+_MISSING = object()
+
+
+def estimate_size(value: Any) -> int:
+    """
+    Approximate in-memory size of ``value`` in bytes.
+
+    DataFrames/Series use pandas' deep memory usage, arrays their buffer
+    size; containers are summed one level deep and anything else falls
+    back to its pickled length.
+    """
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(index=True, deep=True))
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    if isinstance(value, (str, bytes, int, float, bool)) or value is None:
+        return sys.getsizeof(value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(
+            estimate_size(k) + estimate_size(v) for k, v in value.items()
+        )
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return sys.getsizeof(value) + sum(estimate_size(v) for v in value)
+    try:
+        return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        return sys.getsizeof(value)
+
+
+class _Entry:
+    __slots__ = ('value', 'created', 'expires', 'size')
+
+    def __init__(self, value: Any, created: float, expires: Optional[float], size: int):
+        self.value = value
+        self.created = created
+        self.expires = expires
+        self.size = size
+
+
+class SharedCache:
+    """
+    Thread-safe LRU cache with TTL and byte-size accounting.
+
+    Args:
+        max_entries: Maximum number of keys held
+        max_bytes: Maximum total estimated size; least recently used
+                   entries are evicted until the new entry fits. A single
+                   value larger than this is not cached.
+        default_ttl: TTL in seconds applied when ``set`` gets none
+                     (None = no expiry)
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        default_ttl: Optional[float] = None,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self._data: 'OrderedDict[Hashable, _Entry]' = OrderedDict()
+        self._lock = threading.RLock()
+        self._inflight: Dict[Hashable, threading.Lock] = {}
+        self._bytes = 0
+        self._stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'expirations': 0}
+
+    # ------------------------------------------------------------------
+    # Core operations
+    # ------------------------------------------------------------------
+
+    def _lookup(self, key: Hashable, max_age: Optional[float], now: float):
+        """Return the live entry for ``key`` or None (caller holds the lock)."""
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        if (entry.expires is not None and now >= entry.expires) or \
+                (max_age is not None and now - entry.created >= max_age):
+            self._remove(key)
+            self._stats['expirations'] += 1
+            return None
+        self._data.move_to_end(key)
+        return entry
+
+    def get(self, key: Hashable, default: Any = None, max_age: Optional[float] = None) -> Any:
+        """
+        Cached value for ``key``, or ``default`` if absent or expired.
+
+        Args:
+            key: Any hashable key
+            default: Returned on a miss
+            max_age: Also treat entries older than this many seconds as
+                     expired (for callers that decide freshness at read time)
+        """
+        with self._lock:
+            entry = self._lookup(key, max_age, time.time())
+            if entry is None:
+                self._stats['misses'] += 1
+                return default
+            self._stats['hits'] += 1
+            return entry.value
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return self._lookup(key, None, time.time()) is not None
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> bool:
+        """
+        Store ``value`` under ``key``.
+
+        Returns:
+            False if the value alone exceeds ``max_bytes`` and was not stored.
+        """
+        size = estimate_size(value)
+        if size > self.max_bytes:
+            return False
+        ttl = self.default_ttl if ttl is None else ttl
+        now = time.time()
+        expires = now + ttl if ttl is not None else None
+        with self._lock:
+            if key in self._data:
+                self._remove(key)
+            self._data[key] = _Entry(value, now, expires, size)
+            self._bytes += size
+            self._evict()
+        return True
+
+    def get_or_compute(
+        self,
+        key: Hashable,
+        compute: Callable[[], Any],
+        ttl: Optional[float] = None,
+        max_age: Optional[float] = None,
+        cache_none: bool = False,
+    ) -> Any:
+        """
+        Cached value for ``key``, computing and storing it on a miss.
+
+        Only one thread runs ``compute`` per key; concurrent callers block
+        until it finishes and then read its result. Exceptions propagate
+        and nothing is cached.
+
+        Args:
+            key: Any hashable key
+            compute: Zero-argument callable producing the value
+            ttl: TTL for the stored value
+            max_age: Read-time freshness limit (see ``get``)
+            cache_none: Whether a None result is stored (default: no, so
+                        failed fetches are retried on the next call)
+        """
+        value = self.get(key, _MISSING, max_age=max_age)
+        if value is not _MISSING:
+            return value
+
+        with self._lock:
+            key_lock = self._inflight.setdefault(key, threading.Lock())
+        with key_lock:
+            try:
+                # Another thread may have filled it while we waited
+                with self._lock:
+                    entry = self._lookup(key, max_age, time.time())
+                if entry is not None:
+                    return entry.value
+                value = compute()
+                if value is not None or cache_none:
+                    self.set(key, value, ttl=ttl)
+                return value
+            finally:
+                with self._lock:
+                    if self._inflight.get(key) is key_lock:
+                        del self._inflight[key]
+
+    def delete(self, key: Hashable) -> bool:
+        """Remove ``key``; returns whether it was present."""
+        with self._lock:
+            if key in self._data:
+                self._remove(key)
+                return True
+            return False
+
+    def invalidate(self, predicate: Callable[[Hashable], bool]) -> int:
+        """Remove every key for which ``predicate(key)`` is true; returns the count."""
+        with self._lock:
+            doomed = [k for k in self._data if predicate(k)]
+            for key in doomed:
+                self._remove(key)
+            return len(doomed)
+
+    def clear(self):
+        """Remove all entries (statistics are kept)."""
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def purge_expired(self) -> int:
+        """Drop expired entries now instead of on next access; returns the count."""
+        now = time.time()
+        with self._lock:
+            doomed = [k for k, e in self._data.items()
+                      if e.expires is not None and now >= e.expires]
+            for key in doomed:
+                self._remove(key)
+            self._stats['expirations'] += len(doomed)
+            return len(doomed)
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _remove(self, key: Hashable):
+        entry = self._data.pop(key)
+        self._bytes -= entry.size
+
+    def _evict(self):
+        while self._data and (len(self._data) > self.max_entries or self._bytes > self.max_bytes):
+            _, entry = self._data.popitem(last=False)
+            self._bytes -= entry.size
+            self._stats['evictions'] += 1
+
+    # ------------------------------------------------------------------
+    # Introspection
+    # ------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def keys(self) -> list:
+        """Snapshot of the current keys, least recently used first."""
+        with self._lock:
+            return list(self._data)
+
+    @property
+    def size_bytes(self) -> int:
+        """Estimated bytes currently held."""
+        return self._bytes
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters plus current size, for admin / diagnostics pages."""
+        with self._lock:
+            lookups = self._stats['hits'] + self._stats['misses']
+            return {
+                **self._stats,
+                'hit_rate': self._stats['hits'] / lookups if lookups else 0.0,
+                'entries': len(self._data),
+                'bytes': self._bytes,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+            }
+
+
+# Process-wide instance for non-user-specific market data
+market_cache = SharedCache()
+
+
+def make_key(namespace: str, args: tuple = (), kwargs: Optional[dict] = None) -> tuple:
+    """Hashable cache key from a namespace and call arguments."""
+    kwargs = kwargs or {}
+    return (namespace, repr(args), repr(sorted(kwargs.items())))
+
+
+def shared_cached(
+    ttl: Optional[float] = 300,
+    namespace: Optional[str] = None,
+    cache: Optional[SharedCache] = None,
+):
+    """
+    Decorator: cache a market-data function's result in the shared cache.
+
+    Arguments are part of the key (via ``repr``), so only decorate functions
+    whose result depends on their arguments alone — never on the user.
+    None results are not cached. pandas results are returned as shallow
+    copies so callers can add columns without affecting other sessions.
+
+    Args:
+        ttl: Seconds to keep a result
+        namespace: Key prefix (default: module.qualname of the function)
+        cache: Cache instance (default: ``market_cache``)
+    """
+    def decorator(func: Callable) -> Callable:
+        prefix = namespace or f"{func.__module__}.{func.__qualname__}"
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            store = cache if cache is not None else market_cache
+            value = store.get_or_compute(
+                make_key(prefix, args, kwargs),
+                lambda: func(*args, **kwargs),
+                ttl=ttl,
+            )
+            if isinstance(value, (pd.DataFrame, pd.Series)):
+                return value.copy(deep=False)
+            return value
+
+        wrapper.cache_namespace = prefix
+        return wrapper
+    return decorator
+
+
+__all__ = [
+    'SharedCache',
+    'market_cache',
+    'shared_cached',
+    'make_key',
+    'estimate_size',
+]
@@ -430,24 +430,19 @@ def get_screener_universe() -> pd.DataFrame:
 
 def search_any_ticker(query: str, limit: int = 20) -> List[Dict]:
     """
-    Search for any ticker - combines local list with yfinance validation.
+    Search for any ticker - combines the local symbol index with yfinance validation.
     This is the "unlimited" search.
     """
+    from core.symbol_index import get_symbol_index
+
     query = query.upper().strip()
-    results = []
-    seen = set()
+    index = get_symbol_index()
 
-    # 1. Check local list for matches (instant)
-    for ticker in get_local_universe():
-        name = COMPANY_NAMES.get(ticker, ticker)
-        if query in ticker or query in name.upper():
-            info = get_ticker_info_fast(ticker)
-            if ticker not in seen:
-                results.append(info)
-                seen.add(ticker)
-
-    # 2. Try exact ticker match via yfinance (if not already found)
-    if query not in seen:
+    # 1. Prefix/fuzzy matches from the local index (instant, no network)
+    results = [{**match, 'source': 'local'} for match in index.search(query, limit=limit)]
+
+    # 2. Try exact ticker match via yfinance (if the index doesn't know it)
+    if query and query not in index:
         yf_result = validate_ticker_yfinance(query)
         if yf_result:
             yf_result['source'] = 'yfinance'
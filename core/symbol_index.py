@@ -0,0 +1,281 @@
+"""
+ATLAS Terminal - Local Symbol Index
+===================================
+One in-process search index over every symbol the terminal knows about:
+
+1. data.instruments     indices, crypto, FX, bonds, commodities, stocks, ETFs
+2. core.stock_universe  curated S&P 500 / NASDAQ-100 / popular lists
+3. asset snapshot       the broker's (Alpaca) or yfinance asset list, saved to
+                        data/cache/symbol_assets.parquet by
+                        ``refresh_asset_snapshot`` and reloaded on start
+
+Lookups never touch the network:
+
+    from core.symbol_index import get_symbol_index
+
+    get_symbol_index().search("appl")      # AAPL first, then fuzzy matches
+
+Prefix matching is a flattened trie: every symbol and every word of the
+name, sector and exchange is a key in one sorted list, so all keys sharing
+a prefix are one contiguous slice found by bisection. Queries with several
+words must match every word. Typos are caught by trigram similarity over
+symbol + name (inverted trigram postings, counted with one ``bincount``).
+A 50k-symbol index answers a typeahead query in well under 5 ms.
+"""
+from __future__ import annotations
+
+import os
+import re
+import threading
+import time
+from bisect import bisect_left
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+_ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_SNAPSHOT_PATH = Path(os.environ.get("ATLAS_SYMBOL_SNAPSHOT",
+                                            _ROOT / "data" / "cache" / "symbol_assets.parquet"))
+SNAPSHOT_MAX_AGE = 24 * 3600
+COLUMNS = ("symbol", "name", "sector", "exchange", "asset_class", "source")
+# Source priority: curated names win over instrument and snapshot metadata,
+# and rank slightly higher when scores tie
+SOURCE_PRIORITY = {"universe": 3, "instruments": 2, "snapshot": 1}
+# Score per matched field (exact token match adds EXACT_BONUS)
+FIELD_SCORES = (3.0, 2.0, 1.0, 1.0)          # symbol, name, sector, exchange
+EXACT_BONUS = 2.0
+FUZZY_WEIGHT = 1.5
+MIN_COVERAGE = 0.5
+_SPLIT = re.compile(r"[^0-9A-Z]+")
+
+
+def _words(text: str) -> List[str]:
+    return [w for w in _SPLIT.split(str(text).upper()) if w]
+
+
+def _trigrams(text: str) -> set:
+    """Trigrams of each word padded with one space, so word starts and ends count."""
+    return {padded[i:i + 3] for padded in (f" {w} " for w in _words(text))
+            for i in range(len(padded) - 2)}
+
+
+# ---------------------------------------------------------------------------
+# Sources
+# ---------------------------------------------------------------------------
+
+def _instrument_records() -> List[Dict]:
+    from data import instruments as ins
+    groups = (
+        ("GLOBAL_INDICES", "index"), ("CRYPTOCURRENCIES", "crypto"), ("FX_PAIRS", "fx"),
+        ("BOND_YIELDS", "bond"), ("CREDIT_SPREADS", "etf"), ("COMMODITIES", "commodity"),
+        ("POPULAR_STOCKS", "equity"), ("POPULAR_ETFS", "etf"),
+    )
+    records = []
+    for attr, asset_class in groups:
+        for symbol, meta in getattr(ins, attr, {}).items():
+            records.append({
+                "symbol": symbol, "name": meta.get("name", ""),
+                "sector": meta.get("sector") or meta.get("category", ""),
+                "exchange": meta.get("exchange", ""),
+                "asset_class": asset_class, "source": "instruments",
+            })
+    return records
+
+
+def _universe_records() -> List[Dict]:
+    from core import stock_universe as su
+    sector_of = {t: sector for sector, tickers in su.SECTOR_MAP.items() for t in tickers}
+    return [{"symbol": t, "name": su.COMPANY_NAMES.get(t, ""), "sector": sector_of.get(t, ""),
+             "exchange": "", "asset_class": "equity", "source": "universe"}
+            for t in su.get_local_universe()]
+
+
+def load_asset_snapshot(path: Optional[Path] = None) -> pd.DataFrame:
+    """The saved asset snapshot (empty frame if none has been recorded)."""
+    path = Path(path or DEFAULT_SNAPSHOT_PATH)
+    if not path.exists():
+        return pd.DataFrame(columns=list(COLUMNS))
+    frame = pd.read_parquet(path)
+    frame["source"] = "snapshot"
+    return frame
+
+
+def snapshot_is_stale(path: Optional[Path] = None, max_age: float = SNAPSHOT_MAX_AGE) -> bool:
+    path = Path(path or DEFAULT_SNAPSHOT_PATH)
+    return not path.exists() or time.time() - path.stat().st_mtime > max_age
+
+
+def refresh_asset_snapshot(assets: Iterable[Dict], path: Optional[Path] = None) -> int:
+    """Save an asset list (dicts with symbol, name and optionally sector,
+    exchange, asset_class) as the snapshot and rebuild the shared index.
+    Returns the number of assets saved."""
+    frame = pd.DataFrame(list(assets))
+    for col in COLUMNS:
+        if col not in frame.columns:
+            frame[col] = ""
+    frame = frame[list(COLUMNS)].fillna("").astype(str)
+    frame["source"] = "snapshot"
+    path = Path(path or DEFAULT_SNAPSHOT_PATH)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    frame.to_parquet(tmp, index=False)
+    os.replace(tmp, path)
+    reset_symbol_index()
+    return len(frame)
+
+
+def _merge(frames: Iterable[pd.DataFrame]) -> pd.DataFrame:
+    """One row per symbol; each field taken from the highest-priority source that has it."""
+    data = pd.concat([f[list(COLUMNS)] for f in frames if len(f)], ignore_index=True)
+    data = data.fillna("").astype(str)
+    data["symbol"] = data["symbol"].str.strip().str.upper()
+    data = data[data["symbol"] != ""]
+    data["_priority"] = data["source"].map(SOURCE_PRIORITY).fillna(0)
+    data = data.sort_values("_priority", ascending=False, kind="stable").replace("", np.nan)
+    merged = data.groupby("symbol", sort=False).first().reset_index()
+    merged["name"] = merged["name"].fillna(merged["symbol"])
+    return merged.fillna("")
+
+
+# ---------------------------------------------------------------------------
+# Index
+# ---------------------------------------------------------------------------
+
+class SymbolIndex:
+    """Prefix + trigram search over a symbols frame (see module docstring)."""
+
+    def __init__(self, records: pd.DataFrame):
+        self.records = records.reset_index(drop=True)
+        n = len(self.records)
+        self._row = {s: i for i, s in enumerate(self.records["symbol"])}
+        self._prior = (0.01 * self.records["_priority"].to_numpy(dtype=float)
+                       if "_priority" in self.records else np.zeros(n)) \
+            - 0.001 * self.records["symbol"].str.len().to_numpy()
+
+        keys, rows, fields = [], [], []
+        trigram_rows: Dict[str, List[int]] = {}
+        self._n_trigrams = np.zeros(n)
+        columns = [self.records[c].tolist() for c in ("symbol", "name", "sector", "exchange")]
+        for i, (symbol, name, sector, exchange) in enumerate(zip(*columns)):
+            seen = set()
+            for field, words in enumerate(([symbol, *_words(symbol)], _words(name),
+                                           _words(sector), _words(exchange))):
+                for word in words:
+                    if (word, field) not in seen:
+                        seen.add((word, field))
+                        keys.append(word)
+                        rows.append(i)
+                        fields.append(field)
+            grams = _trigrams(f"{symbol} {name}")
+            self._n_trigrams[i] = len(grams)
+            for g in grams:
+                trigram_rows.setdefault(g, []).append(i)
+
+        order = sorted(range(len(keys)), key=keys.__getitem__)
+        self._keys = [keys[j] for j in order]
+        self._key_rows = np.asarray(rows, dtype=np.int64)[order]
+        self._key_fields = np.asarray(fields, dtype=np.int64)[order]
+        self._key_lengths = np.fromiter(map(len, self._keys), dtype=np.int64, count=len(self._keys))
+        self._key_base = np.take(FIELD_SCORES, self._key_fields) - 0.01 * self._key_lengths
+        self._postings = {g: np.asarray(r, dtype=np.int64) for g, r in trigram_rows.items()}
+
+    @classmethod
+    def build(cls, snapshot_path: Optional[Path] = None) -> "SymbolIndex":
+        """Index over instruments, the curated universe and the saved asset snapshot."""
+        return cls(_merge([pd.DataFrame(_instrument_records()), pd.DataFrame(_universe_records()),
+                           load_asset_snapshot(snapshot_path)]))
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol.strip().upper() in self._row
+
+    def lookup(self, symbol: str) -> Optional[Dict]:
+        i = self._row.get(symbol.strip().upper())
+        return None if i is None else self._result(i, 0.0)
+
+    # -- search ----------------------------------------------------------------
+
+    def _prefix_scores(self, word: str) -> np.ndarray:
+        """Best score per record for keys starting with ``word`` (dense, 0 = no match)."""
+        scores = np.zeros(len(self.records))
+        lo = bisect_left(self._keys, word)
+        hi = bisect_left(self._keys, word + "￿", lo)
+        if hi <= lo:
+            return scores
+        rows = self._key_rows[lo:hi]
+        fields = self._key_fields[lo:hi]
+        s = self._key_base[lo:hi] + EXACT_BONUS * ((self._key_lengths[lo:hi] == len(word)) & (fields <= 1))
+        if len(word) == 1:                      # one letter: symbols only
+            rows, s = rows[fields == 0], s[fields == 0]
+        # Best key per record: sort ascending so the last write wins
+        order = np.argsort(s, kind="stable")
+        scores[rows[order]] = s[order]
+        return scores
+
+    def _fuzzy_scores(self, query: str) -> np.ndarray:
+        grams = [self._postings[g] for g in _trigrams(query) if g in self._postings]
+        n = len(self.records)
+        if not grams:
+            return np.zeros(n)
+        hits = np.bincount(np.concatenate(grams), minlength=n).astype(float)
+        q = len(_trigrams(query))
+        # Share of the query's trigrams found, tie-broken towards shorter texts
+        coverage = hits / q
+        jaccard = hits / (q + self._n_trigrams - hits)
+        return np.where(coverage >= MIN_COVERAGE, FUZZY_WEIGHT * (coverage + 0.5 * jaccard), 0.0)
+
+    def search(self, query: str, limit: int = 10, asset_class: Optional[str] = None,
+               fuzzy: bool = True) -> List[Dict]:
+        """Best ``limit`` matches for ``query``: prefix matches first, then fuzzy ones."""
+        words = _words(query)
+        raw = query.strip().upper()
+        if not words and not raw:
+            return []
+        total = None
+        for word in dict.fromkeys([raw] if raw and not words else words):
+            s = self._prefix_scores(word)
+            total = s if total is None else np.where((total > 0) & (s > 0), total + s, 0.0)
+        if raw and raw not in words:            # symbols with punctuation: '^GSPC', 'BRK.B'
+            total = np.maximum(total, self._prefix_scores(raw) * len(words or [raw]))
+        if fuzzy and len(raw) >= 3:
+            total = np.where(total > 0, total + 10.0, self._fuzzy_scores(query))
+        if asset_class is not None:
+            total = np.where(self.records["asset_class"].to_numpy() == asset_class, total, 0.0)
+
+        hits = np.flatnonzero(total > 0)
+        if not len(hits):
+            return []
+        ranked = total[hits] + self._prior[hits]
+        if len(hits) > limit:
+            top = np.argpartition(-ranked, limit - 1)[:limit]
+            hits, ranked = hits[top], ranked[top]
+        order = np.argsort(-ranked, kind="stable")
+        return [self._result(int(i), float(s)) for i, s in zip(hits[order], ranked[order])]
+
+    def _result(self, i: int, score: float) -> Dict:
+        row = self.records.iloc[i]
+        return {**{c: row[c] for c in COLUMNS}, "score": round(score, 4)}
+
+
+_index: Optional[SymbolIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_symbol_index() -> SymbolIndex:
+    """Process-wide SymbolIndex (built on first use)."""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = SymbolIndex.build()
+        return _index
+
+
+def reset_symbol_index():
+    """Drop the shared index; the next ``get_symbol_index`` rebuilds it."""
+    global _index
+    with _index_lock:
+        _index = None
@@ -19,11 +19,12 @@ Usage:
     render_line_chart(df, key='line_chart', area_fill=True)
 """
 
-import json
 import numpy as np
 import pandas as pd
 from typing import Dict, List, Optional, Any
 
+from .downsampling import target_points, lttb_indices, aggregate_ohlcv
+
 # Conditional import for environments without the package
 try:
     from streamlit_lightweight_charts import renderLightweightCharts
@@ -104,48 +105,106 @@ def _standardize_dataframe(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
-def _convert_time_column(df: pd.DataFrame) -> pd.DataFrame:
-    """Convert time column to TradingView-compatible format."""
-    df = df.copy()
-
-    # Find the time column
-    time_col = None
+def _find_time_column(df: pd.DataFrame) -> str:
+    """Return the name of the time/date column, or raise."""
     for col in ['time', 'date', 'datetime', 'timestamp']:
         if col in df.columns:
-            time_col = col
-            break
+            return col
+    raise ValueError("DataFrame must have a time/date column")
 
-    if time_col is None:
-        raise ValueError("DataFrame must have a time/date column")
+
+def _convert_time_column(df: pd.DataFrame) -> pd.DataFrame:
+    """Convert time column to TradingView-compatible format."""
+    df = df.copy()
+    time_col = _find_time_column(df)
 
     # Rename to 'time' if needed
     if time_col != 'time':
         df = df.rename(columns={time_col: 'time'})
 
-    # Convert to string format
-    if pd.api.types.is_datetime64_any_dtype(df['time']):
-        # For intraday data, use UNIX timestamp
-        if df['time'].dt.hour.sum() > 0:
-            df['time'] = df['time'].view('int64') // 10**9
-        else:
-            # For daily data, use YYYY-MM-DD string
-            df['time'] = df['time'].dt.strftime('%Y-%m-%d')
-
+    df['time'] = _serialize_times(df['time'])
     return df
 
 
-def prepare_ohlcv_data(df: pd.DataFrame) -> Dict[str, List]:
+def _serialize_times(times: pd.Series) -> list:
+    """
+    Times as TradingView expects them: UNIX seconds for intraday data,
+    'YYYY-MM-DD' strings for daily data. Non-datetime values pass through.
+    """
+    if not pd.api.types.is_datetime64_any_dtype(times):
+        return times.tolist()
+    values = times.to_numpy(dtype='datetime64[ns]')
+    # For intraday data, use UNIX timestamp
+    if times.dt.hour.sum() > 0:
+        return values.astype('datetime64[s]').astype(np.int64).tolist()
+    # For daily data, use YYYY-MM-DD string
+    return np.datetime_as_string(values, unit='D').tolist()
+
+
+def _json_values(values) -> list:
+    """Float array to a JSON-ready list with NaN as None (what to_json emitted)."""
+    arr = np.asarray(values, dtype=float)
+    if np.isnan(arr).any():
+        return np.where(np.isnan(arr), None, arr).tolist()
+    return arr.tolist()
+
+
+def _records(times: list, columns: Dict[str, Any]) -> List[Dict]:
+    """Zip a time list and column arrays into TradingView point dicts."""
+    keys = ['time', *columns]
+    cols = [times] + [
+        v if isinstance(v, list) else _json_values(v) for v in columns.values()
+    ]
+    return [dict(zip(keys, row)) for row in zip(*cols)]
+
+
+def _visible_mask(times: pd.Series, visible_range: Optional[tuple]) -> Optional[np.ndarray]:
+    """Boolean mask for rows inside ``visible_range`` = (start, end), or None."""
+    if visible_range is None or not pd.api.types.is_datetime64_any_dtype(times):
+        return None
+    start, end = visible_range
+    mask = np.ones(len(times), dtype=bool)
+    if start is not None:
+        mask &= (times >= pd.Timestamp(start)).to_numpy()
+    if end is not None:
+        mask &= (times <= pd.Timestamp(end)).to_numpy()
+    return mask
+
+
+def prepare_ohlcv_data(
+    df: pd.DataFrame,
+    max_points: Optional[int] = None,
+    width_px: Optional[int] = None,
+    visible_range: Optional[tuple] = None,
+) -> Dict[str, List]:
     """
     Convert OHLCV DataFrame to TradingView-compatible format.
 
+    Bars are clipped to ``visible_range`` and, when there are more bars than
+    the chart can draw, aggregated into OHLC buckets (see
+    ``core.downsampling.aggregate_ohlcv``).
+
     Args:
         df: DataFrame with columns: time/date, open, high, low, close, volume (optional)
+        max_points: Explicit bar budget (overrides width_px)
+        width_px: Chart width used to derive the bar budget
+        visible_range: Optional (start, end) dates to keep
 
     Returns:
         Dict with 'candles' and 'volume' lists ready for charting
     """
+    return _ohlcv_records(_ohlcv_buckets(df, max_points, width_px, visible_range))
+
+
+def _ohlcv_buckets(
+    df: pd.DataFrame,
+    max_points: Optional[int] = None,
+    width_px: Optional[int] = None,
+    visible_range: Optional[tuple] = None,
+) -> Dict[str, np.ndarray]:
+    """Clipped, bucket-aggregated OHLCV arrays; 'time' holds each bucket's first raw time."""
     df = _standardize_dataframe(df)
-    df = _convert_time_column(df)
+    time_col = _find_time_column(df)
 
     # Ensure required columns exist
     required = ['open', 'high', 'low', 'close']
@@ -153,54 +212,100 @@ def prepare_ohlcv_data(df: pd.DataFrame) -> Dict[str, List]:
     if missing:
         raise ValueError(f"Missing required columns: {missing}")
 
-    # Add bull/bear color for volume
-    df['color'] = np.where(
-        df['open'] > df['close'],
-        ATLAS_COLORS['bear'],
-        ATLAS_COLORS['bull']
-    )
+    mask = _visible_mask(df[time_col], visible_range)
+    if mask is not None:
+        df = df.loc[mask]
+
+    fields = required + (['volume'] if 'volume' in df.columns else [])
+    arrays = {col: df[col].to_numpy(dtype=float) for col in fields}
+    arrays['time'] = df[time_col].to_numpy()
+
+    n_bars = max_points or target_points(len(df), width_px, kind='candle')
+    return aggregate_ohlcv(arrays, n_bars)
+
+
+def _ohlcv_records(arrays: Dict[str, np.ndarray]) -> Dict[str, List]:
+    """Candle and volume point dicts from ``_ohlcv_buckets`` arrays."""
+    times = _serialize_times(pd.Series(arrays['time']))
 
     # Prepare candles data
-    candles = json.loads(
-        df[['time', 'open', 'high', 'low', 'close']].to_json(orient='records')
-    )
+    candles = _records(times, {col: arrays[col] for col in ('open', 'high', 'low', 'close')})
 
-    # Prepare volume data (if available)
+    # Prepare volume data (if available), with bull/bear color
     volume = None
-    if 'volume' in df.columns:
-        volume_df = df[['time', 'volume', 'color']].copy()
-        volume_df = volume_df.rename(columns={'volume': 'value'})
-        volume = json.loads(volume_df.to_json(orient='records'))
+    if 'volume' in arrays:
+        colors = np.where(
+            arrays['open'] > arrays['close'],
+            ATLAS_COLORS['bear'],
+            ATLAS_COLORS['bull']
+        ).tolist()
+        volume = _records(times, {'value': arrays['volume'], 'color': colors})
 
     return {'candles': candles, 'volume': volume}
 
 
 def prepare_line_data(
     df: pd.DataFrame,
-    value_col: str = 'close'
+    value_col: str = 'close',
+    max_points: Optional[int] = None,
+    width_px: Optional[int] = None,
+    visible_range: Optional[tuple] = None,
 ) -> List[Dict]:
     """
     Convert DataFrame to line chart format.
 
+    Points are clipped to ``visible_range`` and LTTB-downsampled to the
+    chart's point budget (see ``core.downsampling.lttb_indices``).
+
     Args:
         df: DataFrame with time/date and value column
         value_col: Column name for the y-axis values
+        max_points: Explicit point budget (overrides width_px)
+        width_px: Chart width used to derive the point budget
+        visible_range: Optional (start, end) dates to keep
 
     Returns:
         List of {time, value} dicts
     """
     df = _standardize_dataframe(df)
-    df = _convert_time_column(df)
+    time_col = _find_time_column(df)
 
     value_col = value_col.lower()
     if value_col not in df.columns:
         raise ValueError(f"Column '{value_col}' not found in DataFrame")
 
-    data = df[['time', value_col]].copy()
-    data = data.rename(columns={value_col: 'value'})
-    data = data.dropna()
+    data = df[[time_col, value_col]].dropna()
+    mask = _visible_mask(data[time_col], visible_range)
+    if mask is not None:
+        data = data.loc[mask]
+
+    return _line_records(data[time_col], data[value_col], max_points or target_points(len(data), width_px))
 
-    return json.loads(data.to_json(orient='records'))
+
+def _line_records(times: pd.Series, values: pd.Series, n_points: int) -> List[Dict]:
+    """LTTB-reduce a (time, value) pair of columns to {time, value} dicts."""
+    y = values.to_numpy(dtype=float)
+    if len(y) > n_points:
+        if pd.api.types.is_datetime64_any_dtype(times):
+            x = times.to_numpy(dtype='datetime64[ns]').astype(np.int64)
+        else:
+            x = np.arange(len(y))
+        keep = lttb_indices(x, y, n_points)
+        times, y = times.iloc[keep], y[keep]
+    return _records(_serialize_times(times), {'value': y})
+
+
+def _indicator_records(times: pd.Series, values: pd.Series, buckets: Dict[str, np.ndarray],
+                       candles: List[Dict]) -> List[Dict]:
+    """
+    Indicator values at the candle bucket starts, stamped with the candles'
+    own times so overlays share the candle time scale (no extra points).
+    """
+    by_time = pd.Series(values.to_numpy(dtype=float), index=pd.Index(times))
+    by_time = by_time[~by_time.index.duplicated(keep='last')]
+    at = by_time.reindex(pd.Index(buckets['time'])).to_numpy()
+    keep = ~np.isnan(at)
+    return _records([c['time'] for c, k in zip(candles, keep) if k], {'value': at[keep]})
 
 
 # =============================================================================
@@ -293,7 +398,9 @@ def render_candlestick_chart(
     height: int = 400,
     show_volume: bool = True,
     watermark: str = '',
-    dark_mode: bool = True
+    dark_mode: bool = True,
+    width_px: Optional[int] = None,
+    visible_range: Optional[tuple] = None,
 ) -> None:
     """
     Render a professional candlestick chart with optional volume.
@@ -305,11 +412,13 @@ def render_candlestick_chart(
         show_volume: Whether to show volume histogram
         watermark: Optional watermark text (e.g., ticker symbol)
         dark_mode: Use dark theme
+        width_px: Chart width used to size the bar budget
+        visible_range: Optional (start, end) dates to send
     """
     if not TRADINGVIEW_AVAILABLE:
         return
 
-    data = prepare_ohlcv_data(df)
+    data = prepare_ohlcv_data(df, width_px=width_px, visible_range=visible_range)
     charts = []
 
     # Calculate heights
@@ -396,7 +505,9 @@ def render_line_chart(
     color: Optional[str] = None,
     area_fill: bool = True,
     watermark: str = '',
-    dark_mode: bool = True
+    dark_mode: bool = True,
+    width_px: Optional[int] = None,
+    visible_range: Optional[tuple] = None,
 ) -> None:
     """
     Render a professional line or area chart.
@@ -410,11 +521,13 @@ def render_line_chart(
         area_fill: Whether to fill area under line
         watermark: Optional watermark text
         dark_mode: Use dark theme
+        width_px: Chart width used to size the point budget
+        visible_range: Optional (start, end) dates to send
     """
     if not TRADINGVIEW_AVAILABLE:
         return
 
-    data = prepare_line_data(df, value_col)
+    data = prepare_line_data(df, value_col, width_px=width_px, visible_range=visible_range)
     line_color = color or ATLAS_COLORS['accent_blue']
 
     chart_options = get_chart_options(
@@ -457,7 +570,9 @@ def render_multi_series_chart(
     height: int = 350,
     colors: Optional[Dict[str, str]] = None,
     percentage_mode: bool = True,
-    dark_mode: bool = True
+    dark_mode: bool = True,
+    width_px: Optional[int] = None,
+    visible_range: Optional[tuple] = None,
 ) -> None:
     """
     Render multiple series as overlaid line charts.
@@ -470,6 +585,8 @@ def render_multi_series_chart(
         colors: Optional dict of {series_name: color}
         percentage_mode: Normalize to percentage for comparison
         dark_mode: Use dark theme
+        width_px: Chart width used to size each series' point budget
+        visible_range: Optional (start, end) dates to send
     """
     if not TRADINGVIEW_AVAILABLE:
         return
@@ -485,7 +602,7 @@ def render_multi_series_chart(
     series_list = []
     for name, df in data_dict.items():
         try:
-            data = prepare_line_data(df, value_col)
+            data = prepare_line_data(df, value_col, width_px=width_px, visible_range=visible_range)
             color = colors.get(name, ATLAS_COLORS['accent_blue'])
 
             series_list.append({
@@ -548,35 +665,26 @@ def render_candlestick_with_indicators(
     show_ma_200: bool = False,
     show_bollinger: bool = False,
     watermark: str = '',
-    dark_mode: bool = True
+    dark_mode: bool = True,
+    width_px: Optional[int] = None,
 ) -> None:
     """
     Render candlestick chart with technical indicators.
     FIXED: MA lines now extend to the most recent data point using min_periods.
+    Indicators are computed on the full history, then sampled at the candle bucket starts.
     """
     if not TRADINGVIEW_AVAILABLE:
         return
 
     # Prepare base data
-    data = prepare_ohlcv_data(df)
+    buckets = _ohlcv_buckets(df, width_px=width_px)
+    data = _ohlcv_records(buckets)
     if not data['candles']:
         return
 
-    # Standardize DataFrame for calculations
-    df_calc = df.copy()
-    df_calc.columns = df_calc.columns.str.lower()
-
-    # Ensure time column exists
-    if 'time' not in df_calc.columns:
-        if isinstance(df_calc.index, pd.DatetimeIndex):
-            df_calc = df_calc.reset_index()
-            df_calc = df_calc.rename(columns={df_calc.columns[0]: 'time'})
-        elif 'date' in df_calc.columns:
-            df_calc = df_calc.rename(columns={'date': 'time'})
-
-    # Convert time to string format for TradingView
-    if 'time' in df_calc.columns and pd.api.types.is_datetime64_any_dtype(df_calc['time']):
-        df_calc['time'] = df_calc['time'].dt.strftime('%Y-%m-%d')
+    # Standardize DataFrame for calculations (same rows and times as the candles)
+    df_calc = _standardize_dataframe(df)
+    df_calc = df_calc.rename(columns={_find_time_column(df_calc): 'time'})
 
     # Calculate heights
     main_height = height if not show_volume else int(height * 0.75)
@@ -607,10 +715,9 @@ def render_candlestick_with_indicators(
         df_calc['ma50'] = df_calc['close'].rolling(window=50, min_periods=20).mean()
         ma50_data = df_calc[['time', 'ma50']].dropna()
         if not ma50_data.empty:
-            ma50_data = ma50_data.rename(columns={'ma50': 'value'})
             series_list.append({
                 "type": "Line",
-                "data": json.loads(ma50_data.to_json(orient='records')),
+                "data": _indicator_records(ma50_data['time'], ma50_data['ma50'], buckets, data['candles']),
                 "options": {
                     "color": "#f7b924",
                     "lineWidth": 2,
@@ -626,10 +733,9 @@ def render_candlestick_with_indicators(
         df_calc['ma200'] = df_calc['close'].rolling(window=200, min_periods=50).mean()
         ma200_data = df_calc[['time', 'ma200']].dropna()
         if not ma200_data.empty:
-            ma200_data = ma200_data.rename(columns={'ma200': 'value'})
             series_list.append({
                 "type": "Line",
-                "data": json.loads(ma200_data.to_json(orient='records')),
+                "data": _indicator_records(ma200_data['time'], ma200_data['ma200'], buckets, data['candles']),
                 "options": {
                     "color": "#ff6b6b",
                     "lineWidth": 2,
@@ -650,10 +756,10 @@ def render_candlestick_with_indicators(
         # Upper band
         bb_upper_data = df_calc[['time', 'bb_upper']].dropna()
         if not bb_upper_data.empty:
-            bb_upper_data = bb_upper_data.rename(columns={'bb_upper': 'value'})
             series_list.append({
                 "type": "Line",
-                "data": json.loads(bb_upper_data.to_json(orient='records')),
+                "data": _indicator_records(bb_upper_data['time'], bb_upper_data['bb_upper'],
+                                           buckets, data['candles']),
                 "options": {
                     "color": "rgba(136, 132, 216, 0.8)",
                     "lineWidth": 1,
@@ -666,10 +772,10 @@ def render_candlestick_with_indicators(
         # Lower band
         bb_lower_data = df_calc[['time', 'bb_lower']].dropna()
         if not bb_lower_data.empty:
-            bb_lower_data = bb_lower_data.rename(columns={'bb_lower': 'value'})
             series_list.append({
                 "type": "Line",
-                "data": json.loads(bb_lower_data.to_json(orient='records')),
+                "data": _indicator_records(bb_lower_data['time'], bb_lower_data['bb_lower'],
+                                           buckets, data['candles']),
                 "options": {
                     "color": "rgba(136, 132, 216, 0.8)",
                     "lineWidth": 1,
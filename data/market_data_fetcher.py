@@ -23,6 +23,8 @@ import streamlit as st
 from typing import Dict, List, Optional, Tuple
 import json
 
+from core.shared_cache import shared_cached
+
 try:
     from utils.yield_data_fetcher import YieldDataFetcher
     YIELD_FETCHER_AVAILABLE = True
@@ -120,35 +122,13 @@ def cache_market_data(ttl_seconds=60):
     """
     Cache market data for specified TTL (Time To Live)
     Reduces API calls and improves performance
+
+    Results live in the process-wide shared cache (core.shared_cache), so
+    every session on the server reuses one fetch instead of holding its own
+    copy in st.session_state.
     """
     def decorator(func):
-        def wrapper(*args, **kwargs):
-            cache_key = f"{func.__name__}_{str(args)}_{str(kwargs)}"
-
-            # Check if cached and still valid
-            if hasattr(st, 'session_state'):
-                cache = st.session_state.get('market_data_cache', {})
-
-                if cache_key in cache:
-                    data, timestamp = cache[cache_key]
-                    age = (datetime.now() - timestamp).total_seconds()
-
-                    if age < ttl_seconds:
-                        return data
-
-            # Fetch fresh data
-            result = func(*args, **kwargs)
-
-            # Store in cache
-            if hasattr(st, 'session_state'):
-                if 'market_data_cache' not in st.session_state:
-                    st.session_state.market_data_cache = {}
-
-                st.session_state.market_data_cache[cache_key] = (result, datetime.now())
-
-            return result
-
-        return wrapper
+        return shared_cached(ttl=ttl_seconds, namespace=f"market_data.{func.__name__}")(func)
     return decorator
 
 
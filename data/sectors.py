@@ -1,10 +1,14 @@
 """
 ATLAS Terminal - GICS Sector Classification Data
 S&P 500 / SPY benchmark sector mapping for portfolio attribution.
-Includes get_benchmark_sector_returns() — the single canonical copy.
+Includes get_benchmark_sector_returns() — the single canonical copy — and
+classify_sectors(), the bulk ticker -> GICS sector lookup.
+
+yfinance is imported inside the functions that need it so the static
+sector tables stay cheap to import at app boot.
 """
 
-import yfinance as yf
+from concurrent.futures import ThreadPoolExecutor
 
 # ============================================================================
 # PHASE 2: GICS SECTOR CLASSIFICATION SYSTEM
@@ -372,6 +376,8 @@ def get_benchmark_sector_returns(benchmark_ticker='SPY', period='1y'):
     except (ImportError, Exception):
         _cache_available = False
 
+    import yfinance as yf
+
     sector_returns = {}
 
     for sector, etf in SECTOR_ETFS.items():
@@ -393,3 +399,78 @@ def get_benchmark_sector_returns(benchmark_ticker='SPY', period='1y'):
             pass
 
     return sector_returns
+
+
+def standardize_sector(raw_sector):
+    """Map a provider sector name (e.g. yfinance 'Technology') to GICS Level 1."""
+    if raw_sector in GICS_SECTORS:
+        return raw_sector
+    return GICS_SECTOR_MAPPING.get(raw_sector, 'Other')
+
+
+def _fetch_sector(ticker):
+    """One yfinance info lookup; None on failure so the miss is not cached."""
+    import yfinance as yf
+    try:
+        info = yf.Ticker(ticker).info or {}  # yfinance 1.2+ returns None on 401
+    except Exception:
+        return None
+    return standardize_sector(info.get('sector', 'Other'))
+
+
+def classify_sectors(tickers, fetch=True, max_workers=8):
+    """
+    GICS Level 1 sector for many tickers in one pass.
+
+    Resolution order per ticker: STOCK_SECTOR_OVERRIDES, then the shared
+    'gics_sector' cache entry (the same key core.data_loading.get_gics_sector
+    uses), then a single concurrent batch of yfinance lookups for whatever
+    is still missing. Successful lookups are written back to the cache;
+    failed ones come back as 'Other' and are retried next time.
+
+    Parameters:
+        tickers: iterable of ticker symbols
+        fetch: if False, never call yfinance (unknown tickers -> 'Other')
+        max_workers: concurrent yfinance lookups
+
+    Returns:
+        dict: {TICKER (upper-cased): sector_name}
+    """
+    try:
+        from atlas_terminal.core.cache_manager import cache_manager
+    except Exception:
+        cache_manager = None
+
+    sectors = {}
+    misses = []
+    for ticker in dict.fromkeys(str(t).upper().strip() for t in tickers):
+        if ticker in STOCK_SECTOR_OVERRIDES:
+            sectors[ticker] = STOCK_SECTOR_OVERRIDES[ticker]
+            continue
+        cached = None
+        if cache_manager is not None:
+            try:
+                cached = cache_manager.get(cache_manager.get_cache_key('gics_sector', ticker), ttl=21600)
+            except Exception:
+                cached = None
+        if cached is not None:
+            sectors[ticker] = cached
+        else:
+            misses.append(ticker)
+
+    if misses and fetch:
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(misses)))) as pool:
+            fetched = dict(zip(misses, pool.map(_fetch_sector, misses)))
+        for ticker, sector in fetched.items():
+            if sector is None:
+                continue
+            sectors[ticker] = sector
+            if cache_manager is not None:
+                try:
+                    cache_manager.set(cache_manager.get_cache_key('gics_sector', ticker), sector, persist=True)
+                except Exception:
+                    pass
+
+    for ticker in misses:
+        sectors.setdefault(ticker, 'Other')
+    return sectors
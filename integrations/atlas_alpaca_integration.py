@@ -18,7 +18,7 @@ from typing import Dict, List, Optional, Tuple
 try:
     from alpaca.trading.client import TradingClient
     from alpaca.trading.requests import GetAssetsRequest
-    from alpaca.trading.enums import AssetClass, OrderSide, TimeInForce
+    from alpaca.trading.enums import AssetClass, AssetStatus, OrderSide, TimeInForce
     from alpaca.data.historical import StockHistoricalDataClient
     from alpaca.data.requests import StockBarsRequest, StockLatestQuoteRequest
     from alpaca.data.timeframe import TimeFrame
@@ -509,24 +509,24 @@ class AlpacaAdapter:
         --------
         pd.DataFrame : Matching assets
         """
+        from core.symbol_index import get_symbol_index, refresh_asset_snapshot, snapshot_is_stale
+
         try:
-            request = GetAssetsRequest(asset_class=AssetClass.US_EQUITY)
-            assets = self.trading_client.get_all_assets(request)
-
-            # Filter by query
-            matches = []
-            for asset in assets:
-                if (query.upper() in asset.symbol.upper() or
-                    query.upper() in asset.name.upper()):
-                    matches.append({
-                        'symbol': asset.symbol,
-                        'name': asset.name,
-                        'exchange': asset.exchange,
-                        'tradable': asset.tradable,
-                        'status': asset.status,
-                    })
-
-            return pd.DataFrame(matches)
+            # The asset list is pulled at most once a day; searches hit the local index
+            if snapshot_is_stale():
+                request = GetAssetsRequest(asset_class=AssetClass.US_EQUITY, status=AssetStatus.ACTIVE)
+                refresh_asset_snapshot(
+                    {'symbol': a.symbol, 'name': a.name or '', 'exchange': getattr(a.exchange, 'value', a.exchange),
+                     'asset_class': 'equity'}
+                    for a in self.trading_client.get_all_assets(request) if a.tradable
+                )
+
+            matches = get_symbol_index().search(query, limit=50, fuzzy=False)
+            return pd.DataFrame([
+                {'symbol': m['symbol'], 'name': m['name'], 'exchange': m['exchange'],
+                 'tradable': True, 'status': 'active'}
+                for m in matches if m['asset_class'] in ('equity', 'etf')
+            ])
 
         except Exception as e:
             st.error(f"Error searching assets: {str(e)}")
@@ -28,7 +28,10 @@ def simulate_portfolio_returns(
     enriched_df: pd.DataFrame,
     price_histories: Dict[str, pd.Series],
     start_date: Optional[datetime] = None,
-    end_date: Optional[datetime] = None
+    end_date: Optional[datetime] = None,
+    rebalance: Optional[str] = None,
+    cost_bps: float = 0.0,
+    cgt_rate: float = 0.0,
 ) -> pd.DataFrame:
     """
     Simulate historical portfolio returns using current weights.
@@ -36,6 +39,12 @@ def simulate_portfolio_returns(
     This function creates a synthetic performance history by assuming
     the current portfolio composition was held throughout the lookback period.
 
+    By default the weights are reset every day (implicit daily rebalancing).
+    With ``rebalance`` set, holdings drift with prices and are reset to the
+    current weights on that schedule instead ('W', 'M', 'Q', 'Y', or 'never'
+    for buy-and-hold), paying ``cost_bps`` and ``cgt_rate`` on each
+    rebalance; see analytics/backtest.run_backtest.
+
     Parameters:
     -----------
     enriched_df : pd.DataFrame
@@ -46,6 +55,12 @@ def simulate_portfolio_returns(
         Start of simulation period
     end_date : datetime, optional
         End of simulation period (defaults to today)
+    rebalance : str, optional
+        Rebalance schedule; None keeps the daily-rebalanced simulation
+    cost_bps : float
+        Transaction cost per rebalance in basis points (with ``rebalance``)
+    cgt_rate : float
+        Effective CGT rate on realised gains (with ``rebalance``)
 
     Returns:
     --------
@@ -62,10 +77,9 @@ def simulate_portfolio_returns(
 
     # Calculate current weights
     total_value = enriched_df['Market_Value'].sum()
-    weights = {}
-    for ticker in price_histories.keys():
-        ticker_value = enriched_df.loc[enriched_df['Ticker'] == ticker, 'Market_Value'].sum()
-        weights[ticker] = ticker_value / total_value if total_value > 0 else 0
+    ticker_values = enriched_df.groupby('Ticker')['Market_Value'].sum()
+    weights = ticker_values.reindex(list(price_histories.keys())).fillna(0.0)
+    weights = weights / total_value if total_value > 0 else weights * 0.0
 
     # Align all price series
     prices_df = pd.DataFrame(price_histories)
@@ -81,11 +95,17 @@ def simulate_portfolio_returns(
     # Calculate returns
     returns_df = prices_df.pct_change()
 
-    # Calculate weighted portfolio returns
-    portfolio_returns = pd.Series(0.0, index=returns_df.index)
-    for ticker, weight in weights.items():
-        if ticker in returns_df.columns:
-            portfolio_returns += returns_df[ticker].fillna(0) * weight
+    # Calculate weighted portfolio returns (one matrix-vector product)
+    if rebalance is None:
+        w = weights.reindex(returns_df.columns).fillna(0.0).to_numpy()
+        portfolio_returns = pd.Series(returns_df.fillna(0).to_numpy() @ w, index=returns_df.index)
+    else:
+        from analytics.backtest import run_backtest
+        # Assets without a price on the first day cannot be bought then
+        priced = prices_df.columns[prices_df.iloc[0].notna()]
+        backtest = run_backtest(prices_df, weights.reindex(priced).fillna(0.0), rebalance=rebalance,
+                                cost_bps=cost_bps, cgt_rate=cgt_rate)
+        portfolio_returns = backtest.returns.reindex(returns_df.index).fillna(0.0)
 
     # Build result DataFrame
     result = pd.DataFrame(index=returns_df.index)
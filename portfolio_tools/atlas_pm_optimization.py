@@ -30,6 +30,11 @@ from typing import Dict, List, Tuple, Optional
 import streamlit as st
 
 
+def _sample_std(values: np.ndarray) -> float:
+    """Sample standard deviation (ddof=1, NaN below two values), as pandas."""
+    return float(np.std(values, ddof=1)) if len(values) > 1 else np.nan
+
+
 # ============================================================================
 # ASYMMETRIC RISK OPTIMIZER
 # ============================================================================
@@ -633,22 +638,26 @@ class PMGradeOptimizer:
         # Step 5: Optimize with asymmetric risk
         # Use Sortino instead of Sharpe
 
+        # Plain arrays for the objective: it runs once per SLSQP evaluation
+        returns_matrix = np.nan_to_num(self.returns.to_numpy(dtype=float))
+        expected = expected_returns.to_numpy(dtype=float)
+
         def objective(weights):
             # Portfolio return (forward-looking)
-            portfolio_return = np.dot(weights, expected_returns)
+            portfolio_return = np.dot(weights, expected)
 
             # Downside deviation (backward-looking)
-            portfolio_returns_hist = (self.returns * weights).sum(axis=1)
+            portfolio_returns_hist = returns_matrix @ weights
             downside_returns = portfolio_returns_hist[portfolio_returns_hist < 0]
 
             # Handle edge cases
             if len(downside_returns) == 0:
                 # No downside - use overall volatility with penalty
-                downside = portfolio_returns_hist.std() * np.sqrt(252)
+                downside = _sample_std(portfolio_returns_hist) * np.sqrt(252)
                 # Apply penalty for using volatility instead of downside
                 penalty = 0.5
             else:
-                downside = downside_returns.std() * np.sqrt(252)
+                downside = _sample_std(downside_returns) * np.sqrt(252)
                 penalty = 1.0
 
             # Add small regularization to prevent numerical issues
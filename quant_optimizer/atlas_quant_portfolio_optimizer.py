@@ -74,8 +74,12 @@ class PortfolioOptimizer:
         This fixes the correlation matrix bug from earlier versions.
         Ensures positive semi-definite matrix.
         """
-        # Calculate raw covariance
-        cov = self.returns.cov() * 252  # Annualized
+        # Calculate raw covariance (shared covariance service when available)
+        try:
+            from services.covariance_service import get_covariance_service
+            cov = get_covariance_service().estimate(self.returns, 'sample', scale=252).values
+        except ImportError:
+            cov = self.returns.cov() * 252  # Annualized
 
         # Eigenvalue correction
         eigenvalues, eigenvectors = np.linalg.eigh(cov)
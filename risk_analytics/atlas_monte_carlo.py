@@ -24,7 +24,8 @@ class MonteCarloSimulation:
         self,
         returns: pd.DataFrame,
         weights: np.ndarray,
-        initial_value: float = 100000
+        initial_value: float = 100000,
+        copula=None
     ):
         """
         Initialize Monte Carlo engine
@@ -33,13 +34,20 @@ class MonteCarloSimulation:
             returns: DataFrame of asset returns
             weights: Portfolio weights
             initial_value: Starting portfolio value
+            copula: Optional dependence model for the daily draws: a fitted
+                analytics.copula.CopulaFit or a family name ('t', 'clayton',
+                'gaussian') to fit on ``returns``. None keeps the
+                multivariate normal.
         """
         self.returns = returns
         self.weights = weights
         self.initial_value = initial_value
+        from analytics.copula import resolve_copula
+        self.copula = resolve_copula(copula, returns)
 
         self.mean_returns = returns.mean()
-        self.cov_matrix = returns.cov()
+        from services.covariance_service import get_covariance_service
+        self.cov_matrix = get_covariance_service().estimate(returns, 'sample').to_frame()
 
         self.portfolio_return = np.dot(weights, self.mean_returns)
         self.portfolio_vol = np.sqrt(np.dot(weights, np.dot(self.cov_matrix, weights)))
@@ -66,13 +74,24 @@ class MonteCarloSimulation:
 
         dt = 1/252
 
-        random_returns = np.random.multivariate_normal(
-            self.mean_returns * dt,
-            self.cov_matrix * dt,
-            size=(n_simulations, n_days)
-        )
-
-        portfolio_returns = np.dot(random_returns, self.weights)
+        if self.copula is not None:
+            # Same normal marginals as below; only the dependence comes from
+            # the copula (drawn in chunks, reduced to portfolio returns)
+            portfolio_returns = self.copula.portfolio_returns(
+                self.weights,
+                n_simulations * n_days,
+                rng=random_seed,
+                location=self.mean_returns.values * dt,
+                scale=np.sqrt(np.diag(self.cov_matrix) * dt)
+            ).reshape(n_simulations, n_days)
+        else:
+            random_returns = np.random.multivariate_normal(
+                self.mean_returns * dt,
+                self.cov_matrix * dt,
+                size=(n_simulations, n_days)
+            )
+
+            portfolio_returns = np.dot(random_returns, self.weights)
 
         cumulative_returns = np.cumprod(1 + portfolio_returns, axis=1)
 
@@ -19,6 +19,7 @@ class RiskAnalytics:
     - Calmar Ratio
     - Information Ratio
     - Beta, Alpha
+    - GARCH conditional volatility and VaR
     """
 
     def __init__(self, returns: pd.Series, benchmark_returns: Optional[pd.Series] = None):
@@ -31,6 +32,7 @@ class RiskAnalytics:
         """
         self.returns = returns
         self.benchmark_returns = benchmark_returns
+        self._garch = {}
 
     def maximum_drawdown(self) -> Dict:
         """Calculate maximum drawdown"""
@@ -116,6 +118,63 @@ class RiskAnalytics:
 
         return (active_returns.mean() * 252) / tracking_error
 
+    def garch_fit(self, model: str = 'garch'):
+        """GARCH-family fit of the returns (analytics.volatility), cached per model"""
+        from analytics.volatility import fit_garch
+
+        if model not in self._garch:
+            self._garch[model] = fit_garch(self.returns.dropna(), model=model)
+        return self._garch[model]
+
+    def conditional_volatility(self, model: str = 'garch', horizon: int = 1) -> Dict:
+        """Current and forecast volatility from a GARCH-family model (annualized, %)"""
+        fit = self.garch_fit(model)
+        name = fit.assets[0]
+        term = fit.term_structure((horizon,))[name]
+        return {
+            'model': fit.model,
+            'current_volatility': fit.conditional_volatility[name].iloc[-1] * np.sqrt(252) * 100,
+            'forecast_volatility': term.iloc[0] * 100,
+            'long_run_volatility': fit.params.loc[name, 'long_run_volatility'] * 100,
+            'persistence': fit.params.loc[name, 'persistence'],
+            'volatility_series': fit.conditional_volatility[name],
+        }
+
+    def value_at_risk(self, confidence: float = 0.95, horizon: int = 1,
+                      method: str = 'garch', model: str = 'garch') -> Dict:
+        """
+        Value at Risk and expected shortfall over ``horizon`` days (%, positive = loss)
+
+        'garch' scales the empirical quantiles of the standardized GARCH
+        residuals (filtered historical simulation) by the forecast volatility
+        over the horizon, so VaR rises and falls with current conditions.
+        'historical' uses the unconditional return quantiles scaled by sqrt(horizon).
+        """
+        alpha = 1 - confidence
+        mean = self.returns.mean() * horizon
+        if method == 'garch':
+            fit = self.garch_fit(model)
+            name = fit.assets[0]
+            z = (fit.residuals[name] / fit.conditional_volatility[name]).dropna()
+            sigma = np.sqrt((fit.forecast(horizon)[name] ** 2).sum())
+        elif method == 'historical':
+            clean = self.returns.dropna()
+            z = (clean - clean.mean()) / clean.std()
+            sigma = clean.std() * np.sqrt(horizon)
+        else:
+            raise ValueError("method must be 'garch' or 'historical'")
+
+        q = np.quantile(z, alpha)
+        tail = z[z <= q]
+        return {
+            'var': -(mean + q * sigma) * 100,
+            'cvar': -(mean + tail.mean() * sigma) * 100,
+            'volatility': sigma * 100,
+            'confidence': confidence,
+            'horizon': horizon,
+            'method': method,
+        }
+
     def comprehensive_metrics(self, risk_free_rate: float = 0.03) -> Dict:
         """Calculate all risk metrics"""
         metrics = {
@@ -0,0 +1,128 @@
+"""
+ATLAS Scheduler — Multi-Portfolio Report Engine
+=================================================
+Shared plumbing for the scheduled report jobs, so a run scales with the
+number of distinct tickers rather than the number of subscribers:
+
+    fetch_close_matrix   price the union of every user's tickers once
+                         (concurrent fetch_historical_data, one call per ticker)
+    weight_matrix        users x assets weight matrix for the configs
+    window_returns       per-asset simple returns over a window
+    portfolio_returns    users' window returns = W @ asset returns
+    fan_out              per-user rendering/delivery on a thread pool
+
+Rendering is I/O bound (commentary generation, SendGrid), so a thread pool
+is enough; ATLAS_REPORT_WORKERS sets its size.
+"""
+from __future__ import annotations
+
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional
+
+logger = logging.getLogger("atlas.scheduler.engine")
+
+FETCH_WORKERS = 8
+REPORT_WORKERS = int(os.environ.get("ATLAS_REPORT_WORKERS", "4"))
+DEFAULT_BENCHMARK = "^J203.JO"
+
+
+def _close_series(data):
+    """Close column of a fetch_historical_data result as a Series, or None."""
+    import pandas as pd
+
+    if data is None or data.empty:
+        return None
+    close = data["Close"] if isinstance(data, pd.DataFrame) and "Close" in data.columns else data
+    if isinstance(close, pd.DataFrame):
+        close = close.iloc[:, 0]
+    return close
+
+
+def universe(configs: Iterable[dict], extra: Iterable[str] = ()) -> List[str]:
+    """Distinct tickers across all configs (first-seen order), plus ``extra``."""
+    tickers = [t for cfg in configs for t in cfg.get("portfolio_tickers", [])]
+    return list(dict.fromkeys(tickers + list(extra)))
+
+
+def fetch_close_matrix(tickers: Iterable[str], start, end, max_workers: int = FETCH_WORKERS):
+    """Closes for every ticker (dates x tickers), fetched concurrently once each.
+
+    Tickers with no data are left out of the columns.
+    """
+    import pandas as pd
+    from core.fetchers import fetch_historical_data
+
+    tickers = list(dict.fromkeys(tickers))
+
+    def fetch(ticker):
+        try:
+            return _close_series(fetch_historical_data(ticker, start, end))
+        except Exception as e:
+            logger.warning(f"Failed to fetch {ticker}: {e}")
+            return None
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(tickers) or 1))) as pool:
+        closes = dict(zip(tickers, pool.map(fetch, tickers)))
+    frames = {t: c for t, c in closes.items() if c is not None}
+    return pd.DataFrame(frames).sort_index() if frames else pd.DataFrame()
+
+
+def weight_matrix(configs: List[dict], assets):
+    """users x assets weights (rows in config order).
+
+    A held ticker without an explicit weight gets 1 / len(portfolio_tickers),
+    as the per-user jobs always did; weights are not renormalised.
+    """
+    import numpy as np
+    import pandas as pd
+
+    assets = pd.Index(assets)
+    W = np.zeros((len(configs), len(assets)))
+    for i, cfg in enumerate(configs):
+        tickers = cfg.get("portfolio_tickers", [])
+        weights = cfg.get("portfolio_weights", {})
+        for t in tickers:
+            j = assets.get_indexer([t])[0]
+            if j >= 0:
+                W[i, j] = weights.get(t, 1.0 / len(tickers))
+    return pd.DataFrame(W, columns=assets)
+
+
+def window_returns(closes, start=None):
+    """Per-asset simple return from the first to the last close on/after ``start``."""
+    import pandas as pd
+
+    window = closes if start is None else closes[closes.index >= pd.Timestamp(start)]
+    window = window.ffill()
+    first = window.bfill().iloc[0] if len(window) else None
+    if first is None or len(window) < 2:
+        return pd.Series(0.0, index=closes.columns)
+    return (window.iloc[-1] / first - 1).fillna(0.0)
+
+
+def portfolio_returns(W, closes, start=None):
+    """Window return of every user's portfolio at once (users,)."""
+    asset = window_returns(closes, start).reindex(W.columns).fillna(0.0)
+    return W.to_numpy() @ asset.to_numpy()
+
+
+def fan_out(fn: Callable[[dict], None], configs: List[dict],
+            max_workers: Optional[int] = None) -> Dict[str, Optional[Exception]]:
+    """Run ``fn(cfg)`` for every config on a thread pool.
+
+    Returns:
+        {email: None on success, or the exception raised for that user}
+    """
+    def run(cfg):
+        try:
+            fn(cfg)
+            return None
+        except Exception as e:
+            return e
+
+    workers = max(1, min(max_workers or REPORT_WORKERS, len(configs) or 1))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="atlas-report") as pool:
+        errors = list(pool.map(run, configs))
+    return {cfg.get("email", "unknown"): err for cfg, err in zip(configs, errors)}
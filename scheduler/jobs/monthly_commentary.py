@@ -2,55 +2,52 @@
 ATLAS Scheduler — Monthly Positioning Commentary Job
 ======================================================
 Generates a monthly commentary via Claude (headless) and emails it.
+
+All users are processed in one batch: the regime context is fetched once,
+the market-return context for every user comes from one shared close
+matrix (scheduler.engine), and commentary generation + delivery run on the
+report worker pool.
 """
 from __future__ import annotations
 
 import logging
-from datetime import datetime
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
 
 logger = logging.getLogger("atlas.scheduler.monthly_commentary")
 
+CONTEXT_TICKERS = 5      # holdings quoted in each user's market-return context
 
-def execute_monthly_commentary(user_config: dict):
-    """Generate and email monthly positioning commentary.
-
-    Args:
-        user_config: dict with email, portfolio_tickers, portfolio_weights,
-                     key_calls (optional), tone (optional)
-    """
-    from config.branding import get_branding
-    from scheduler.delivery.email import send_email
 
-    brand = get_branding()
-    email = user_config["email"]
-    tickers = user_config.get("portfolio_tickers", [])
-    tone = user_config.get("monthly_commentary", {}).get("tone", "institutional")
-
-    # Fetch regime context (headless — no Streamlit)
-    regime_ctx = None
+def _regime_context() -> Optional[dict]:
+    """Headless regime context (no Streamlit), shared by every user."""
     try:
         from regime_detector import QuantitativeRegimeDetector
         detector = QuantitativeRegimeDetector()
         indicators = detector.fetch_market_indicators()
-        regime_ctx = {
+        return {
             "quant_regime": indicators.get("overall_regime", "unknown"),
             "consensus": indicators.get("overall_regime", "unknown"),
         }
     except Exception as e:
         logger.warning(f"Regime context unavailable: {e}")
+        return None
 
-    # Fetch market returns for context
-    market_returns = ""
-    if tickers:
-        try:
-            import yfinance as yf
-            data = yf.download(tickers[:5], period="1mo", progress=False)
-            if not data.empty:
-                close = data["Close"] if "Close" in data.columns.get_level_values(0) else data
-                rets = (close.iloc[-1] / close.iloc[0] - 1) * 100
-                market_returns = "\n".join(f"- {t}: {r:+.1f}%" for t, r in rets.items())
-        except Exception as e:
-            logger.warning(f"Market returns fetch failed: {e}")
+
+def market_returns_text(tickers: List[str], month_returns) -> str:
+    """'- TICKER: +x.x%' lines for the first CONTEXT_TICKERS holdings with prices."""
+    shown = [t for t in tickers[:CONTEXT_TICKERS] if t in month_returns.index]
+    return "\n".join(f"- {t}: {month_returns[t] * 100:+.1f}%" for t in shown)
+
+
+def _generate_and_send(user_config: dict, regime_ctx: Optional[dict], market_returns: str):
+    """Generate one user's commentary and email it."""
+    from config.branding import get_branding
+    from scheduler.delivery.email import send_email
+
+    brand = get_branding()
+    email = user_config["email"]
+    tone = user_config.get("monthly_commentary", {}).get("tone", "institutional")
 
     # Build prompt and generate commentary
     word_counts = {"institutional": 800, "concise": 400, "detailed": 1200}
@@ -108,3 +105,48 @@ def execute_monthly_commentary(user_config: dict):
         subject=f"{brand['firm_name']} — Monthly Commentary — {datetime.now():%B %Y}",
         html_body=html,
     )
+
+
+def execute_monthly_commentary_batch(user_configs: List[dict]) -> Dict[str, Optional[Exception]]:
+    """Monthly commentary for many users with one regime fetch and one price load.
+
+    Returns:
+        {email: None on success, or the exception raised for that user}
+    """
+    from scheduler.engine import fan_out, fetch_close_matrix, universe, window_returns
+
+    if not user_configs:
+        return {}
+    regime_ctx = _regime_context()
+
+    end = datetime.now()
+    context_tickers = universe({"portfolio_tickers": cfg.get("portfolio_tickers", [])[:CONTEXT_TICKERS]}
+                               for cfg in user_configs)
+    month_returns = None
+    if context_tickers:
+        try:
+            closes = fetch_close_matrix(context_tickers, end - timedelta(days=31), end)
+            if not closes.empty:
+                month_returns = window_returns(closes)
+        except Exception as e:
+            logger.warning(f"Market returns fetch failed: {e}")
+
+    def run(cfg):
+        text = ""
+        if month_returns is not None:
+            text = market_returns_text(cfg.get("portfolio_tickers", []), month_returns)
+        _generate_and_send(cfg, regime_ctx, text)
+
+    return fan_out(run, list(user_configs))
+
+
+def execute_monthly_commentary(user_config: dict):
+    """Generate and email monthly positioning commentary.
+
+    Args:
+        user_config: dict with email, portfolio_tickers, portfolio_weights,
+                     key_calls (optional), tone (optional)
+    """
+    error = execute_monthly_commentary_batch([user_config]).get(user_config.get("email", "unknown"))
+    if error is not None:
+        raise error
@@ -2,92 +2,109 @@
 ATLAS Scheduler — Quarterly Attribution Summary Job
 =====================================================
 Generates quarterly attribution commentary + DOCX attachment via Claude.
+
+All users are processed in one pass: the union of their tickers is
+classified (data.sectors.classify_sectors) and priced once, together with
+the sector ETFs and benchmarks, and each portfolio's linked
+Brinson-Fachler attribution (analytics.attribution) is computed from that
+shared close matrix (scheduler.engine) on the report worker pool, along
+with commentary generation and delivery. The attribution benchmark is the
+S&P 500 sector model (SPDR sector ETF returns at SPY sector weights); the
+headline benchmark return stays the user's configured benchmark.
 """
 from __future__ import annotations
 
 import logging
-from datetime import datetime
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
 
 logger = logging.getLogger("atlas.scheduler.quarterly_attribution")
 
+LOOKBACK_DAYS = 90
+TOP_N = 3
+ATTRIBUTION_BENCHMARK = "S&P 500 sector model (SPDR sector ETFs)"
 
-def execute_quarterly_attribution(user_config: dict):
-    """Generate and email quarterly attribution with DOCX attachment.
 
-    Args:
-        user_config: dict with email, portfolio_tickers, portfolio_weights,
-                     benchmark (optional), tone (optional)
+def compute_quarterly_attribution(user_config: dict, closes, sectors: Dict[str, str],
+                                  end: datetime) -> Optional[dict]:
+    """Attribution data for one user from the shared close matrix.
+
+    Returns the dict _build_attribution_message expects, or None when none
+    of the user's tickers have prices.
     """
     import numpy as np
     import pandas as pd
 
-    from config.branding import get_branding
-    from scheduler.delivery.email import send_email
+    from analytics.attribution import linked_attribution, linking_coefficients
+    from data.sectors import SECTOR_ETFS, SPY_SECTOR_WEIGHTS
 
-    brand = get_branding()
-    email = user_config["email"]
-    tickers = user_config.get("portfolio_tickers", [])
+    tickers = [t for t in user_config.get("portfolio_tickers", []) if t in closes.columns]
+    if not tickers:
+        return None
     weights = user_config.get("portfolio_weights", {})
     benchmark = user_config.get("benchmark", "^J203.JO")
-    tone = user_config.get("quarterly_attribution", {}).get("tone", "institutional")
-
-    if not tickers:
-        logger.warning(f"No tickers for {email}, skipping quarterly attribution")
-        return
+    n = len(user_config.get("portfolio_tickers", []))
+
+    returns = closes[tickers].dropna().pct_change().dropna()
+    w = pd.Series([weights.get(t, 1.0 / n) for t in tickers], index=tickers, dtype=float)
+    w = w / w.sum() if w.sum() else pd.Series(1.0 / len(tickers), index=tickers)
+    # Constant (rebalanced) weights, as the portfolio return has always been computed
+    weight_frame = pd.DataFrame(np.broadcast_to(w.to_numpy(), returns.shape),
+                                index=returns.index, columns=tickers)
+
+    etfs = {s: e for s, e in SECTOR_ETFS.items() if e in closes.columns}
+    sector_returns = (closes[list(etfs.values())].pct_change()
+                      .reindex(returns.index).fillna(0.0))
+    sector_returns.columns = list(etfs.keys())
+    bench_weights = pd.Series(SPY_SECTOR_WEIGHTS, dtype=float).reindex(sector_returns.columns).fillna(0.0)
+    bench_weights = bench_weights / bench_weights.sum() if bench_weights.sum() else bench_weights
+
+    result = linked_attribution(weight_frame, returns, {t: sectors.get(t.upper(), "Other") for t in tickers},
+                                bench_weights, sector_returns)
+    summary = result.summary
 
-    # Fetch 3-month returns
-    from core.fetchers import fetch_historical_data
-    from datetime import timedelta
-
-    end = datetime.now()
-    start = end - timedelta(days=90)
-
-    frames = {}
-    for ticker in tickers:
-        try:
-            data = fetch_historical_data(ticker, start, end)
-            if data is not None and not data.empty:
-                close = data["Close"] if isinstance(data, pd.DataFrame) and "Close" in data.columns else data
-                if isinstance(close, pd.DataFrame):
-                    close = close.iloc[:, 0]
-                frames[ticker] = close
-        except Exception:
-            continue
-
-    if not frames:
-        logger.error(f"No price data for {email}")
-        return
-
-    prices = pd.DataFrame(frames).dropna()
-    returns = prices.pct_change().dropna()
-
-    w = np.array([weights.get(t, 1.0 / len(tickers)) for t in returns.columns])
-    port_returns = (returns * w).sum(axis=1)
-    total_port_ret = float((1 + port_returns).prod() - 1)
-
-    # Benchmark return
     bench_ret = 0.0
-    try:
-        bench_data = fetch_historical_data(benchmark, start, end)
-        if bench_data is not None and not bench_data.empty:
-            close = bench_data["Close"] if isinstance(bench_data, pd.DataFrame) and "Close" in bench_data.columns else bench_data
-            if isinstance(close, pd.DataFrame):
-                close = close.iloc[:, 0]
+    if benchmark in closes.columns:
+        close = closes[benchmark].dropna()
+        if len(close) > 1:
             bench_ret = float(close.iloc[-1] / close.iloc[0] - 1)
-    except Exception:
-        pass
 
-    # Build attribution data
+    # Per-holding contribution, Carino-linked against a zero benchmark so the
+    # contributions sum to the compounded portfolio return
+    port_daily = result.portfolio_returns
+    coef = linking_coefficients(port_daily, pd.Series(0.0, index=port_daily.index))
+    contrib = (weight_frame * returns).mul(coef, axis=0).sum()
+    ranked = contrib.sort_values(ascending=False)
+    fmt = lambda t: f"{t} ({ranked[t] * 100:+.2f}%)"  # noqa: E731
+
     quarter = f"Q{(end.month - 1) // 3 + 1} {end.year}"
-    attr_data = {
+    return {
         "period": quarter,
         "benchmark_name": benchmark,
-        "total_return": total_port_ret * 100,
+        "total_return": summary["portfolio_return"] * 100,
         "benchmark_return": bench_ret * 100,
-        "allocation_effect": (total_port_ret - bench_ret) * 50,  # Simplified split
-        "selection_effect": (total_port_ret - bench_ret) * 50,
+        "attribution_benchmark": ATTRIBUTION_BENCHMARK,
+        "attribution_benchmark_return": summary["benchmark_return"] * 100,
+        "allocation_effect": summary["allocation_effect"] * 100,
+        "selection_effect": summary["selection_effect"] * 100,
+        "interaction_effect": summary["interaction_effect"] * 100,
+        "top_contributors": [fmt(t) for t in ranked.index[:TOP_N] if ranked[t] > 0],
+        "top_detractors": [fmt(t) for t in ranked.index[::-1][:TOP_N] if ranked[t] < 0],
+        "sector_attribution": result.sectors,
     }
 
+
+def _deliver(user_config: dict, attr_data: dict):
+    """Commentary, DOCX and email for one user."""
+    from config.branding import get_branding
+    from scheduler.delivery.email import send_email
+
+    brand = get_branding()
+    email = user_config["email"]
+    benchmark = user_config.get("benchmark", "^J203.JO")
+    tone = user_config.get("quarterly_attribution", {}).get("tone", "institutional")
+    quarter = attr_data["period"]
+
     # Generate commentary
     word_counts = {"institutional": 800, "concise": 400, "detailed": 1200}
     wc = word_counts.get(tone, 800)
@@ -146,3 +163,53 @@ def execute_quarterly_attribution(user_config: dict):
         html_body=html,
         attachments=attachments,
     )
+
+
+def execute_quarterly_attribution_batch(user_configs: List[dict]) -> Dict[str, Optional[Exception]]:
+    """Quarterly attribution for many users with one classification and price fetch.
+
+    Returns:
+        {email: None on success, or the exception that user's report raised}
+    """
+    from data.sectors import SECTOR_ETFS, classify_sectors
+    from scheduler.engine import DEFAULT_BENCHMARK, fan_out, fetch_close_matrix, universe
+
+    configs = []
+    for cfg in user_configs:
+        if cfg.get("portfolio_tickers"):
+            configs.append(cfg)
+        else:
+            logger.warning(f"No tickers for {cfg.get('email')}, skipping quarterly attribution")
+    if not configs:
+        return {}
+
+    end = datetime.now()
+    start = end - timedelta(days=LOOKBACK_DAYS)
+    tickers = universe(configs)
+    benchmarks = [cfg.get("benchmark", DEFAULT_BENCHMARK) for cfg in configs]
+
+    sectors = classify_sectors(tickers)
+    closes = fetch_close_matrix(universe(configs, list(SECTOR_ETFS.values()) + benchmarks), start, end)
+    logger.info(f"Quarterly attribution: {len(configs)} users, {len(tickers)} tickers, "
+                f"{closes.shape[1]} series priced")
+
+    def run(cfg):
+        attr_data = compute_quarterly_attribution(cfg, closes, sectors, end) if not closes.empty else None
+        if attr_data is None:
+            logger.error(f"No price data for {cfg.get('email')}")
+            return
+        _deliver(cfg, attr_data)
+
+    return fan_out(run, configs)
+
+
+def execute_quarterly_attribution(user_config: dict):
+    """Generate and email quarterly attribution with DOCX attachment.
+
+    Args:
+        user_config: dict with email, portfolio_tickers, portfolio_weights,
+                     benchmark (optional), tone (optional)
+    """
+    error = execute_quarterly_attribution_batch([user_config]).get(user_config.get("email", "unknown"))
+    if error is not None:
+        raise error
@@ -3,103 +3,23 @@ ATLAS Scheduler — Weekly Portfolio Snapshot Job
 =================================================
 Collects portfolio data from the data layer directly (no Streamlit),
 renders the snapshot email, and sends via SendGrid.
+
+All users are processed in one batch (scheduler.engine): prices for the
+union of tickers are loaded once, week/MTD/YTD returns for every user come
+from one users x assets weight matrix, and the market context (regimes,
+commentary excerpt) is shared; only rendering and sending are per user.
 """
 from __future__ import annotations
 
 import logging
 from datetime import datetime, timedelta
+from typing import Dict, List, Optional
 
 logger = logging.getLogger("atlas.scheduler.weekly_snapshot")
 
 
-def execute_weekly_snapshot(user_config: dict):
-    """Run weekly snapshot for a single user configuration.
-
-    Args:
-        user_config: dict with keys:
-            - email: recipient email address
-            - portfolio_tickers: list of ticker symbols
-            - portfolio_weights: dict of ticker -> weight
-            - benchmark: benchmark ticker (default ^J203.JO)
-    """
-    import numpy as np
-    import pandas as pd
-
-    from config.branding import get_branding
-    from scheduler.delivery.email import send_email, render_snapshot_email
-
-    brand = get_branding()
-    tickers = user_config.get("portfolio_tickers", [])
-    weights = user_config.get("portfolio_weights", {})
-    email = user_config["email"]
-
-    if not tickers:
-        logger.warning(f"No tickers configured for {email}, skipping")
-        return
-
-    # Fetch price data
-    from core.fetchers import fetch_historical_data
-
-    end = datetime.now()
-    start_week = end - timedelta(days=7)
-    start_month = end.replace(day=1)
-    start_year = end.replace(month=1, day=1)
-
-    frames = {}
-    for ticker in tickers:
-        try:
-            data = fetch_historical_data(ticker, start_year, end)
-            if data is not None and not data.empty:
-                close = data["Close"] if isinstance(data, pd.DataFrame) and "Close" in data.columns else data
-                if isinstance(close, pd.DataFrame):
-                    close = close.iloc[:, 0]
-                frames[ticker] = close
-        except Exception as e:
-            logger.warning(f"Failed to fetch {ticker}: {e}")
-
-    if not frames:
-        logger.error(f"No price data available for {email}")
-        return
-
-    prices = pd.DataFrame(frames).dropna()
-    returns = prices.pct_change().dropna()
-
-    # Compute weighted portfolio returns
-    w = np.array([weights.get(t, 1.0 / len(tickers)) for t in returns.columns])
-
-    # Weekly return
-    week_prices = prices[prices.index >= pd.Timestamp(start_week)]
-    if len(week_prices) >= 2:
-        week_ret = float((week_prices.iloc[-1] / week_prices.iloc[0] - 1).dot(w))
-    else:
-        week_ret = 0.0
-
-    # MTD return
-    month_prices = prices[prices.index >= pd.Timestamp(start_month)]
-    if len(month_prices) >= 2:
-        mtd_ret = float((month_prices.iloc[-1] / month_prices.iloc[0] - 1).dot(w))
-    else:
-        mtd_ret = 0.0
-
-    # YTD return
-    if len(prices) >= 2:
-        ytd_ret = float((prices.iloc[-1] / prices.iloc[0] - 1).dot(w))
-    else:
-        ytd_ret = 0.0
-
-    # Portfolio value (if provided)
-    portfolio_value = user_config.get("portfolio_value", 0)
-    pv_str = f"R{portfolio_value:,.0f}" if portfolio_value else "N/A"
-
-    # Top movers (individual stock returns for the week)
-    movers = []
-    for ticker in returns.columns:
-        week_rets = returns[ticker][returns.index >= pd.Timestamp(start_week)]
-        if len(week_rets) > 0:
-            total = float((1 + week_rets).prod() - 1) * 100
-            movers.append({"ticker": ticker, "change": total})
-    movers.sort(key=lambda x: abs(x["change"]), reverse=True)
-
+def _market_context() -> dict:
+    """Regime status and latest commentary excerpt (the same for every user)."""
     # Regime status
     regime_quant = "N/A"
     regime_macro = "N/A"
@@ -134,18 +54,37 @@ def execute_weekly_snapshot(user_config: dict):
     except Exception:
         pass
 
+    return {
+        "regime_quant": regime_quant,
+        "regime_macro": regime_macro,
+        "commentary_excerpt": commentary_excerpt,
+    }
+
+
+def _render_and_send(user_config: dict, snapshot: dict, context: dict):
+    """Render the snapshot email for one user and send it."""
+    from config.branding import get_branding
+    from scheduler.delivery.email import send_email, render_snapshot_email
+
+    brand = get_branding()
+    email = user_config["email"]
+
+    # Portfolio value (if provided)
+    portfolio_value = user_config.get("portfolio_value", 0)
+    pv_str = f"R{portfolio_value:,.0f}" if portfolio_value else "N/A"
+
     # Render email
     html = render_snapshot_email(
         firm_name=brand["firm_name"],
         date_str=datetime.now().strftime("%d %B %Y"),
         portfolio_value=pv_str,
-        week_return=f"{week_ret:+.1%}",
-        mtd_return=f"{mtd_ret:+.1%}",
-        ytd_return=f"{ytd_ret:+.1%}",
-        top_movers=movers[:5],
-        regime_quant=regime_quant,
-        regime_macro=regime_macro,
-        commentary_excerpt=commentary_excerpt,
+        week_return=f"{snapshot['week_return']:+.1%}",
+        mtd_return=f"{snapshot['mtd_return']:+.1%}",
+        ytd_return=f"{snapshot['ytd_return']:+.1%}",
+        top_movers=snapshot["top_movers"][:5],
+        regime_quant=context["regime_quant"],
+        regime_macro=context["regime_macro"],
+        commentary_excerpt=context["commentary_excerpt"],
         website_url=brand.get("website", ""),
         report_footer=brand.get("report_footer", brand["firm_name"]),
     )
@@ -156,3 +95,94 @@ def execute_weekly_snapshot(user_config: dict):
         subject=f"{brand['firm_name']} — Weekly Snapshot — {datetime.now():%d %b %Y}",
         html_body=html,
     )
+
+
+def compute_weekly_snapshots(configs: List[dict], closes, end: datetime) -> List[Optional[dict]]:
+    """Week/MTD/YTD returns and top movers for every config (None: no prices).
+
+    ``closes`` is the shared dates x tickers close matrix from
+    scheduler.engine.fetch_close_matrix, starting at 1 January.
+    """
+    import pandas as pd
+
+    from scheduler.engine import portfolio_returns, weight_matrix
+
+    start_week = end - timedelta(days=7)
+    start_month = end.replace(day=1)
+
+    W = weight_matrix(configs, closes.columns)
+    week = portfolio_returns(W, closes, start_week)
+    mtd = portfolio_returns(W, closes, start_month)
+    ytd = portfolio_returns(W, closes)
+
+    # Individual stock returns for the week (shared across users)
+    daily = closes.ffill().pct_change()
+    week_moves = ((1 + daily[daily.index >= pd.Timestamp(start_week)]).prod() - 1) * 100
+
+    snapshots = []
+    for i, cfg in enumerate(configs):
+        held = [t for t in cfg.get("portfolio_tickers", []) if t in closes.columns]
+        if not held:
+            snapshots.append(None)
+            continue
+        movers = [{"ticker": t, "change": float(week_moves[t])} for t in held]
+        movers.sort(key=lambda x: abs(x["change"]), reverse=True)
+        snapshots.append({
+            "week_return": float(week[i]),
+            "mtd_return": float(mtd[i]),
+            "ytd_return": float(ytd[i]),
+            "top_movers": movers,
+        })
+    return snapshots
+
+
+def execute_weekly_snapshot_batch(user_configs: List[dict]) -> Dict[str, Optional[Exception]]:
+    """Weekly snapshots for many users from one shared price load.
+
+    Returns:
+        {email: None on success, or the exception raised for that user}
+    """
+    from scheduler.engine import fan_out, fetch_close_matrix, universe
+
+    configs = []
+    for cfg in user_configs:
+        if cfg.get("portfolio_tickers"):
+            configs.append(cfg)
+        else:
+            logger.warning(f"No tickers configured for {cfg.get('email')}, skipping")
+    if not configs:
+        return {}
+
+    end = datetime.now()
+    closes = fetch_close_matrix(universe(configs), end.replace(month=1, day=1), end)
+    logger.info(f"Weekly snapshot: {len(configs)} users, {closes.shape[1]} tickers priced")
+
+    snapshots = compute_weekly_snapshots(configs, closes, end) if not closes.empty else [None] * len(configs)
+    ready = []
+    for cfg, snapshot in zip(configs, snapshots):
+        if snapshot is None:
+            logger.error(f"No price data available for {cfg.get('email')}")
+        else:
+            ready.append((cfg, snapshot))
+    if not ready:
+        return {}
+
+    context = _market_context()
+    snapshot_for = {id(cfg): snapshot for cfg, snapshot in ready}
+    return fan_out(lambda cfg: _render_and_send(cfg, snapshot_for[id(cfg)], context),
+                   [cfg for cfg, _ in ready])
+
+
+def execute_weekly_snapshot(user_config: dict):
+    """Run weekly snapshot for a single user configuration.
+
+    Args:
+        user_config: dict with keys:
+            - email: recipient email address
+            - portfolio_tickers: list of ticker symbols
+            - portfolio_weights: dict of ticker -> weight
+            - benchmark: benchmark ticker (default ^J203.JO)
+    """
+    error = execute_weekly_snapshot_batch([user_config]).get(user_config.get("email", "unknown"))
+    if error is not None:
+        raise error
@@ -49,55 +49,48 @@ def _log_error(job_name: str, error: str):
         f.write(f"{timestamp} | SCHEDULER | {job_name} | {error}\n")
 
 
+def _run_batch(job_name: str, label: str, config_key: str, batch_fn):
+    """Run one report batch for every user with ``config_key`` enabled."""
+    configs = [cfg for cfg in _load_report_configs()
+               if cfg.get(config_key, {}).get("enabled", False)]
+    try:
+        outcomes = batch_fn(configs)
+    except Exception as e:
+        logger.error(f"{label} batch failed: {e}")
+        _log_error(job_name, str(e))
+        return
+    for email, error in outcomes.items():
+        if error is None:
+            logger.info(f"{label} sent to {email}")
+        else:
+            logger.error(f"{label} failed for {email}: {error}")
+            _log_error(job_name, str(error))
+
+
 def run_weekly_snapshots():
-    """Execute weekly snapshot for all configured users."""
+    """Execute weekly snapshot for all configured users (one shared price load)."""
     logger.info("Starting weekly snapshot job")
-    from scheduler.jobs.weekly_snapshot import execute_weekly_snapshot
+    from scheduler.jobs.weekly_snapshot import execute_weekly_snapshot_batch
 
-    configs = _load_report_configs()
-    for cfg in configs:
-        if not cfg.get("weekly_snapshot", {}).get("enabled", False):
-            continue
-        try:
-            execute_weekly_snapshot(cfg)
-            logger.info(f"Weekly snapshot sent to {cfg.get('email', 'unknown')}")
-        except Exception as e:
-            logger.error(f"Weekly snapshot failed for {cfg.get('email')}: {e}")
-            _log_error("weekly_snapshot", str(e))
+    _run_batch("weekly_snapshot", "Weekly snapshot", "weekly_snapshot", execute_weekly_snapshot_batch)
 
 
 def run_monthly_commentary():
     """Execute monthly positioning commentary for all configured users."""
     logger.info("Starting monthly commentary job")
-    from scheduler.jobs.monthly_commentary import execute_monthly_commentary
+    from scheduler.jobs.monthly_commentary import execute_monthly_commentary_batch
 
-    configs = _load_report_configs()
-    for cfg in configs:
-        if not cfg.get("monthly_commentary", {}).get("enabled", False):
-            continue
-        try:
-            execute_monthly_commentary(cfg)
-            logger.info(f"Monthly commentary sent to {cfg.get('email', 'unknown')}")
-        except Exception as e:
-            logger.error(f"Monthly commentary failed for {cfg.get('email')}: {e}")
-            _log_error("monthly_commentary", str(e))
+    _run_batch("monthly_commentary", "Monthly commentary", "monthly_commentary",
+               execute_monthly_commentary_batch)
 
 
 def run_quarterly_attribution():
     """Execute quarterly attribution for all configured users."""
     logger.info("Starting quarterly attribution job")
-    from scheduler.jobs.quarterly_attribution import execute_quarterly_attribution
-
-    configs = _load_report_configs()
-    for cfg in configs:
-        if not cfg.get("quarterly_attribution", {}).get("enabled", False):
-            continue
-        try:
-            execute_quarterly_attribution(cfg)
-            logger.info(f"Quarterly attribution sent to {cfg.get('email', 'unknown')}")
-        except Exception as e:
-            logger.error(f"Quarterly attribution failed for {cfg.get('email')}: {e}")
-            _log_error("quarterly_attribution", str(e))
+    from scheduler.jobs.quarterly_attribution import execute_quarterly_attribution_batch
+
+    _run_batch("quarterly_attribution", "Quarterly attribution", "quarterly_attribution",
+               execute_quarterly_attribution_batch)
 
 
 def main():
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Ingestion throughput benchmark.
+
+Runs MarketDataIngestionService.sync_tickers against the in-process
+Supabase stand-in (services/local_supabase.py) and the replay provider
+(synthetic bars), so results reflect the pipeline itself rather than
+network or rate limits. Latency and failure injection model those when
+wanted.
+
+For each universe size it reports records/sec, Supabase round trips,
+provider requests and peak memory, for an initial backfill and, with
+--incremental, for a second pass with nothing new to fetch. Peak memory is
+the process's maximum RSS so far (cheap, but monotonic across passes);
+--tracemalloc reports each pass's own peak Python allocation instead, at
+the cost of several times slower timings.
+
+Usage:
+    python scripts/bench_ingestion.py
+    python scripts/bench_ingestion.py --assets 100 1000 --days 90 --incremental
+    python scripts/bench_ingestion.py --db-latency 0.002 --provider-latency 0.5 --error-rate 0.01
+    python scripts/bench_ingestion.py --assets 1000 --tracemalloc
+    python scripts/bench_ingestion.py --json results.json
+"""
+
+import argparse
+import json
+import logging
+import os
+import resource
+import sys
+import time
+import tracemalloc
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.local_supabase import LocalSupabase
+from services.market_data.ingestion_service import MarketDataIngestionService
+from services.market_data.replay_provider import ReplayProvider
+
+
+def run_pass(service, db, provider, tickers, start, end, trace_memory=False):
+    """One sync_tickers call; returns its measurements."""
+    db.reset_stats()
+    provider.reset_stats()
+    if trace_memory:
+        tracemalloc.reset_peak()
+    t0 = time.perf_counter()
+    results = service.sync_tickers(tickers, interval="1d", start=start, end=end)
+    elapsed = time.perf_counter() - t0
+    records = sum(results.values())
+    db_stats, provider_stats = db.stats(), provider.stats()
+    return {
+        "assets": len(tickers),
+        "records": records,
+        "seconds": round(elapsed, 3),
+        "records_per_sec": round(records / elapsed, 1) if elapsed > 0 else None,
+        "db_round_trips": db_stats["round_trips"],
+        "provider_requests": provider_stats["requests"],
+        "provider_failures": provider_stats["failures"],
+        "synced_assets": sum(1 for n in results.values() if n),
+        "peak_mb": round(_peak_bytes(trace_memory) / 2 ** 20, 1),
+    }
+
+
+def _peak_bytes(trace_memory):
+    if trace_memory:
+        return tracemalloc.get_traced_memory()[1]
+    # ru_maxrss is kilobytes on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def benchmark(sizes, days=30, db_latency=0.0, provider_latency=0.0, error_rate=0.0,
+              incremental=False, trace_memory=False, seed=0):
+    """Run the backfill (and optional incremental) pass for each universe size."""
+    end = date.today()
+    start = (end - timedelta(days=days)).strftime("%Y-%m-%d")
+    end = end.strftime("%Y-%m-%d")
+    rows = []
+    if trace_memory:
+        tracemalloc.start()
+    try:
+        for n in sizes:
+            db = LocalSupabase(latency=db_latency)
+            provider = ReplayProvider(latency=provider_latency, error_rate=error_rate, seed=seed)
+            service = MarketDataIngestionService(db, provider)
+            tickers = [f"SYN{i:05d}" for i in range(n)]
+            rows.append({"pass": "backfill", **run_pass(service, db, provider, tickers,
+                                                        start, end, trace_memory)})
+            if incremental:
+                rows.append({"pass": "incremental", **run_pass(service, db, provider, tickers,
+                                                               start, end, trace_memory)})
+            del db, provider, service
+    finally:
+        if trace_memory:
+            tracemalloc.stop()
+    return rows
+
+
+def print_table(rows):
+    headers = ["pass", "assets", "records", "seconds", "records_per_sec",
+               "db_round_trips", "provider_requests", "provider_failures", "peak_mb"]
+    widths = [max(len(h), *(len(str(r[h])) for r in rows)) for h in headers]
+    print("  ".join(h.rjust(w) for h, w in zip(headers, widths)))
+    for r in rows:
+        print("  ".join(str(r[h]).rjust(w) for h, w in zip(headers, widths)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark price_history ingestion")
+    parser.add_argument("--assets", type=int, nargs="+", default=[100, 1000, 10000],
+                        help="Universe sizes to sync (default: 100 1000 10000)")
+    parser.add_argument("--days", type=int, default=30,
+                        help="Calendar days of history per asset (default: 30)")
+    parser.add_argument("--db-latency", type=float, default=0.0,
+                        help="Simulated seconds per Supabase round trip")
+    parser.add_argument("--provider-latency", type=float, default=0.0,
+                        help="Simulated seconds per provider request")
+    parser.add_argument("--error-rate", type=float, default=0.0,
+                        help="Probability that a provider request (or batch member) fails")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Also time a second, already up-to-date pass")
+    parser.add_argument("--tracemalloc", action="store_true",
+                        help="Report per-pass peak Python allocation (slows timings)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", metavar="PATH", help="Also write results as JSON")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    rows = benchmark(args.assets, days=args.days, db_latency=args.db_latency,
+                     provider_latency=args.provider_latency, error_rate=args.error_rate,
+                     incremental=args.incremental, trace_memory=args.tracemalloc,
+                     seed=args.seed)
+    print_table(rows)
+    if args.json:
+        with open(args.json, "w") as fh:
+            json.dump(rows, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
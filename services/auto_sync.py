@@ -9,24 +9,29 @@ runs on every boot regardless of which page the user lands on.
 Public API
 ----------
 run_full_sync(api_key, api_secret, paper)
-    Write Alpaca portfolio to Supabase then kick off price-history
-    ingestion in a background thread.  Must be called from the main
-    Streamlit thread.  Sets session_state['alpaca_synced'] = True only
-    on SUCCESS so callers can retry on transient failures.
+    Write Alpaca portfolio to Supabase then queue price-history ingestion
+    as a durable job (services/jobs) run by a worker process outside
+    Streamlit.  Must be called from the main Streamlit thread.  Sets
+    session_state['alpaca_synced'] = True only on SUCCESS so callers can
+    retry on transient failures.
+
+start_ingestion_job(tickers)
+    Queue an ``ingest_tickers`` job (deduplicated) and make sure a worker
+    process is running.  Returns the job id; the UI polls its status.
 
 run_ingestion_only(tickers)
-    Background worker — fetch 5-year price history for each ticker and
-    write results to PIPELINE_RESULT_PATH for UI polling.
+    Synchronous fallback used when the job queue is unavailable — fetch
+    5-year price history for each ticker and write results to
+    PIPELINE_RESULT_PATH.
 
 PIPELINE_RESULT_PATH
-    Path of the JSON result file shared between background thread and UI.
+    Path of the JSON result file written by the synchronous fallback.
 """
 
 import json
 import logging
 import os
 import re
-import threading
 
 from services.secrets_helper import get_secret
 
@@ -50,10 +55,10 @@ def _ensure_supabase_env() -> None:
     """
     Copy SUPABASE_URL / SUPABASE_ANON_KEY into os.environ if not already set.
 
-    Called from both the main Streamlit thread (before starting the background
-    thread) and at the top of run_ingestion_only() so the os.getenv() fallback
-    inside get_secret() is always populated — even if st.secrets is not
-    accessible from a background thread.
+    Called before a job worker process is spawned (it inherits os.environ)
+    and at the top of run_ingestion_only() so the os.getenv() fallback
+    inside get_secret() is always populated — even where st.secrets is not
+    accessible, as in a worker process.
     """
     for key in ("SUPABASE_URL", "SUPABASE_ANON_KEY"):
         if not os.environ.get(key):
@@ -63,15 +68,33 @@ def _ensure_supabase_env() -> None:
 
 
 # ---------------------------------------------------------------------------
-# Background ingestion worker
+# Ingestion
 # ---------------------------------------------------------------------------
 
+def start_ingestion_job(tickers: list) -> str:
+    """
+    Queue price-history ingestion for ``tickers`` and ensure a worker runs it.
+
+    An identical queued or running job is reused, so repeated page loads do
+    not stack up backfills.  The worker inherits os.environ, hence the
+    Supabase keys are copied there first.
+    """
+    from services.jobs import enqueue, ensure_worker
+
+    _ensure_supabase_env()
+    job = enqueue("ingest_tickers", {"tickers": sorted(set(tickers)), "interval": "1d"})
+    ensure_worker()
+    _logger.info("Ingestion job %s queued for %d tickers.", job.id, len(tickers))
+    return job.id
+
+
 def run_ingestion_only(tickers: list) -> None:
     """
     Fetch 5-year daily price history for each ticker and upsert into Supabase.
 
-    Runs in a daemon thread.  Writes results to PIPELINE_RESULT_PATH so the
-    UI can poll for completion on each Streamlit rerun.
+    Synchronous fallback for when the job queue cannot be used.  Writes
+    results to PIPELINE_RESULT_PATH in the same shape as an ingest_tickers
+    job result.
     """
     _ensure_supabase_env()
 
@@ -129,11 +152,11 @@ def run_full_sync(api_key: str, api_secret: str, paper: bool) -> None:
 
     # ── Credentials into os.environ ──────────────────────────────────────────
     # run_sync() reads Alpaca credentials via get_secret() which tries
-    # os.environ as fallback — pre-populate so background thread also works.
+    # os.environ as fallback — pre-populate so the job worker inherits them.
     os.environ["ALPACA_API_KEY"] = api_key
     os.environ["ALPACA_API_SECRET"] = api_secret
     os.environ["ALPACA_PAPER"] = "true" if paper else "false"
-    _ensure_supabase_env()  # pre-populate Supabase keys for background thread
+    _ensure_supabase_env()  # pre-populate Supabase keys for the job worker
 
     # ── Step 1: Portfolio write ───────────────────────────────────────────────
     try:
@@ -156,7 +179,7 @@ def run_full_sync(api_key: str, api_secret: str, paper: bool) -> None:
         _logger.error("Portfolio sync failed: %s", exc, exc_info=True)
         return
 
-    # ── Step 2: Kick off price-history ingestion in background ───────────────
+    # ── Step 2: Queue price-history ingestion for a worker process ───────────
     try:
         from integrations.atlas_alpaca_integration import AlpacaAdapter
         adapter = AlpacaAdapter(api_key, secret_key=api_secret, paper=paper)
@@ -174,9 +197,15 @@ def run_full_sync(api_key: str, api_secret: str, paper: bool) -> None:
 
     if tickers:
         st.session_state["ingestion_ticker_count"] = len(tickers)
+        try:
+            st.session_state["ingestion_job_id"] = start_ingestion_job(tickers)
+            st.session_state["ingestion_status"] = "running"
+            return
+        except Exception as exc:
+            _logger.warning("Job queue unavailable (%s); ingesting synchronously.", exc)
         if os.path.exists(PIPELINE_RESULT_PATH):
             os.remove(PIPELINE_RESULT_PATH)
         _logger.info("Running ingestion synchronously for %d tickers.", len(tickers))
         run_ingestion_only(tickers)
-        st.session_state["ingestion_status"] = "complete"
+        st.session_state["ingestion_status"] = "running"  # dashboard reads the result file
         _logger.info("Ingestion complete (synchronous).")
@@ -0,0 +1,141 @@
+"""
+ATLAS Terminal - Covariance Service
+===================================
+One cached source of covariance matrices for the optimisers, risk pages
+and Monte Carlo engines (estimators in analytics.covariance).
+
+    from services.covariance_service import get_covariance_service
+
+    cov = get_covariance_service().estimate(returns, 'ledoit_wolf', window=252, scale=252)
+    cov.values          # n x n annualised matrix
+    cov.cholesky()      # lower factor for correlated draws (cached with the estimate)
+    cov.variance(w)     # w' Sigma w, O(nk) for 'factor'
+
+Estimates are cached in the process-wide market cache keyed by
+(universe, window, estimator, as-of date, parameters, scale) plus a digest
+of the returns window, so callers passing different return series for the
+same universe never share an entry. EWMA estimates are also kept as
+running ``EWMAState``s per (universe, decay): when tomorrow's request
+extends yesterday's history unchanged, only the new rows are folded in.
+
+Cached estimates are shared between sessions: treat them as read-only.
+"""
+
+import threading
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from analytics.covariance import (
+    ESTIMATORS, RISKMETRICS_LAMBDA, CovarianceEstimate, EWMAState, estimate_covariance,
+)
+from core.shared_cache import SharedCache, market_cache
+
+# Estimates depend only on their inputs; the TTL just bounds memory churn
+COVARIANCE_TTL = 6 * 3600
+MAX_EWMA_STATES = 64
+
+
+def _digest(window: pd.DataFrame) -> int:
+    """Cheap content fingerprint of a returns window (index + values)."""
+    return int(pd.util.hash_pandas_object(window, index=True).sum())
+
+
+class CovarianceService:
+    """Cached covariance estimates over dates x assets returns frames."""
+
+    def __init__(self, cache: Optional[SharedCache] = None, ttl: float = COVARIANCE_TTL):
+        self._cache = cache
+        self.ttl = ttl
+        self._ewma: Dict[Tuple, Tuple[EWMAState, int]] = {}   # state, digest of its rows
+        self._lock = threading.Lock()
+
+    @property
+    def cache(self) -> SharedCache:
+        return self._cache if self._cache is not None else market_cache
+
+    def estimate(
+        self,
+        returns: pd.DataFrame,
+        estimator: str = "sample",
+        window: Optional[int] = None,
+        scale: float = 1.0,
+        **params,
+    ) -> CovarianceEstimate:
+        """Covariance of ``returns`` (trailing ``window`` rows) with ``estimator``.
+
+        Args:
+            returns: dates x assets returns (per-period, e.g. daily)
+            estimator: one of analytics.covariance.ESTIMATORS
+            window: trailing rows to use (default: all)
+            scale: multiply the result, e.g. 252 to annualise daily returns
+            **params: estimator options (``lam`` for ewma, ``n_factors`` for factor)
+        """
+        if estimator not in ESTIMATORS:
+            raise ValueError(f"estimator must be one of {ESTIMATORS}, got {estimator!r}")
+        data = returns.iloc[-window:] if window else returns
+        as_of = data.index[-1] if len(data) else None
+        key = ('covariance', tuple(data.columns), window, estimator,
+               str(as_of), repr(sorted(params.items())), float(scale), _digest(data))
+
+        def compute():
+            base = self._ewma_estimate(data, **params) if estimator == "ewma" and not window \
+                else estimate_covariance(data, estimator, **params)
+            return base if scale == 1.0 else base.scaled(scale)
+
+        return self.cache.get_or_compute(key, compute, ttl=self.ttl)
+
+    def cholesky(self, returns: pd.DataFrame, estimator: str = "sample", window: Optional[int] = None,
+                 scale: float = 1.0, jitter: float = 1e-8, **params) -> np.ndarray:
+        """Lower Cholesky factor of ``estimate(...)`` (cached with the estimate)."""
+        return self.estimate(returns, estimator, window, scale, **params).cholesky(jitter)
+
+    # -- EWMA ------------------------------------------------------------------
+
+    def _ewma_estimate(self, data: pd.DataFrame, lam: float = RISKMETRICS_LAMBDA) -> CovarianceEstimate:
+        """EWMA over the full history, extending a stored state when possible.
+
+        The stored state is only extended when the rows it was built from are
+        unchanged (same digest); a revised or different history is rebuilt.
+        """
+        key = (tuple(data.columns), float(lam))
+        with self._lock:
+            state, digest = self._ewma.get(key, (None, None))
+            if state is not None and isinstance(data.index, pd.DatetimeIndex) \
+                    and state.as_of is not None and state.as_of in data.index \
+                    and data.index.get_loc(state.as_of) == state.n_obs - 1 \
+                    and _digest(data.iloc[:state.n_obs]) == digest:
+                newer = data.iloc[state.n_obs:]
+                if len(newer):
+                    state = EWMAState(list(state.assets), state.lam, state.cov.copy(),
+                                      state.weight_sum, state.n_obs, state.as_of).update(newer)
+            else:
+                state = EWMAState.from_returns(data, lam)
+            if state.as_of is not None:
+                self._ewma[key] = (state, _digest(data))
+                while len(self._ewma) > MAX_EWMA_STATES:
+                    self._ewma.pop(next(iter(self._ewma)))
+            return state.estimate()
+
+    def update_ewma(self, returns: pd.DataFrame, lam: float = RISKMETRICS_LAMBDA) -> CovarianceEstimate:
+        """Fold the latest rows of ``returns`` into the stored EWMA (daily refresh)."""
+        return self.estimate(returns, "ewma", lam=lam)
+
+    def clear(self):
+        with self._lock:
+            self._ewma.clear()
+        self.cache.invalidate(lambda k: isinstance(k, tuple) and k[:1] == ('covariance',))
+
+
+_service: Optional[CovarianceService] = None
+_service_lock = threading.Lock()
+
+
+def get_covariance_service() -> CovarianceService:
+    """Process-wide CovarianceService."""
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = CovarianceService()
+        return _service
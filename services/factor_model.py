@@ -13,6 +13,8 @@ import pandas as pd
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
 
+from core.shared_cache import market_cache
+
 
 # =============================================================================
 # FACTOR DEFINITIONS
@@ -27,6 +29,9 @@ FACTOR_ETFS = {
     'growth': 'IWF',       # iShares Russell 1000 Growth ETF
 }
 
+# Factor ETF returns are refreshed at most hourly (shared across sessions)
+FACTOR_RETURNS_TTL = 3600
+
 FACTOR_LABELS = {
     'value': 'Value',
     'quality': 'Quality',
@@ -52,25 +57,26 @@ class FactorModelService:
     Uses regression-based approach against factor ETF proxies.
     """
 
-    def __init__(self):
-        self._factor_returns_cache = {}
-        self._cache_ts = None
-
     def get_factor_returns(self, period: str = '1y') -> Optional[pd.DataFrame]:
         """
         Fetch daily returns for all factor ETFs.
 
+        Factor ETF returns are the same for every user, so they are held in
+        the process-wide shared cache for an hour rather than per instance.
+
         Returns:
             DataFrame with columns for each factor, indexed by date
         """
-        cache_key = period
-        if (
-            self._cache_ts
-            and cache_key in self._factor_returns_cache
-            and (datetime.now() - self._cache_ts).seconds < 3600
-        ):
-            return self._factor_returns_cache[cache_key]
+        returns = market_cache.get_or_compute(
+            ('factor_returns', period),
+            lambda: self._download_factor_returns(period),
+            ttl=FACTOR_RETURNS_TTL,
+        )
+        return returns.copy(deep=False) if returns is not None else None
 
+    @staticmethod
+    def _download_factor_returns(period: str) -> Optional[pd.DataFrame]:
+        """Download factor ETF + SPY closes and convert to daily returns."""
         try:
             import yfinance as yf
 
@@ -91,12 +97,7 @@ class FactorModelService:
             # Rename columns to factor names
             rename_map = {v: k for k, v in FACTOR_ETFS.items()}
             rename_map['SPY'] = 'market'
-            returns = returns.rename(columns=rename_map)
-
-            self._factor_returns_cache[cache_key] = returns
-            self._cache_ts = datetime.now()
-
-            return returns
+            return returns.rename(columns=rename_map)
 
         except Exception:
             return None
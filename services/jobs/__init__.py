@@ -0,0 +1,37 @@
+"""
+Durable background jobs.
+
+A persistent queue (SQLite locally, the ``sync_jobs`` table remotely) with
+worker processes that run outside the Streamlit server, per-job progress,
+retries with exponential backoff, deduplication of identical jobs and a
+status API (``get_job`` / ``list_jobs`` / ``cancel_job``; also
+``python -m services.jobs status`` and /v1/jobs in the REST API).
+
+    from services.jobs import enqueue, ensure_worker, get_job
+    job = enqueue("ingest_tickers", {"tickers": ["AAPL", "MSFT"]})
+    ensure_worker()
+    get_job(job.id)["progress"]   # {'done': 2, 'total': 2, 'records': ...}
+
+Exports resolve lazily (PEP 562), so the app can import the status API
+without loading the ingestion stack.
+"""
+import importlib
+# Submodule -> names it exports through ``services.jobs``
+_EXPORTS = {
+    "store": ("Job", "JobStore", "SQLiteJobStore", "SupabaseJobStore", "open_store",
+              "get_job_store"),
+    "worker": ("Worker", "JobContext", "JobCancelled", "PermanentJobError", "job_handler",
+               "run_workers", "ensure_worker"),
+    "api": ("enqueue", "get_job", "list_jobs", "cancel_job"),
+}
+_EXPORT_SOURCE = {name: module for module, names in _EXPORTS.items() for name in names}
+def __getattr__(name):
+    module = _EXPORT_SOURCE.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORT_SOURCE))
+__all__ = sorted(_EXPORT_SOURCE)
@@ -0,0 +1,106 @@
+"""
+Job queue command line.
+
+Usage:
+    python -m services.jobs [--backend sqlite|supabase] [--db PATH] worker [--processes 2]
+    python -m services.jobs worker --idle-exit 60      # cron-style: drain, then exit
+    python -m services.jobs enqueue ingest_tickers --payload '{"tickers": ["AAPL"]}'
+    python -m services.jobs status [JOB_ID] [--status running] [--limit 20]
+    python -m services.jobs cancel JOB_ID
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+
+from .store import open_store
+from .worker import DEFAULT_LEASE, DEFAULT_POLL_INTERVAL, run_workers
+
+
+def _print(value):
+    print(json.dumps(value, indent=2, default=str))
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m services.jobs",
+                                     description="ATLAS background job queue")
+    parser.add_argument("--backend", choices=["sqlite", "supabase"],
+                        help="Queue backend (default: ATLAS_JOB_BACKEND or sqlite)")
+    parser.add_argument("--db", help="SQLite queue file (default: ATLAS_JOB_DB)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    work = sub.add_parser("worker", help="Run worker process(es) until SIGTERM")
+    work.add_argument("--processes", type=int, default=1)
+    work.add_argument("--kinds", nargs="+", help="Only run these job kinds")
+    work.add_argument("--poll-interval", type=float, default=DEFAULT_POLL_INTERVAL)
+    work.add_argument("--lease", type=float, default=DEFAULT_LEASE,
+                      help="Seconds without a heartbeat before a job is recovered")
+    work.add_argument("--max-jobs", type=int, help="Exit after running this many jobs")
+    work.add_argument("--idle-exit", type=float,
+                      help="Exit once the queue has been empty for this many seconds")
+    work.add_argument("--pidfile", help="Write this process's PID here while running")
+    work.add_argument("--log-level", default="INFO")
+
+    enq = sub.add_parser("enqueue", help="Queue a job")
+    enq.add_argument("kind")
+    enq.add_argument("--payload", default="{}", help="JSON object")
+    enq.add_argument("--max-attempts", type=int, default=3)
+    enq.add_argument("--no-dedupe", action="store_true")
+
+    status = sub.add_parser("status", help="Show one job, or recent jobs")
+    status.add_argument("job_id", nargs="?")
+    status.add_argument("--status", dest="job_status")
+    status.add_argument("--kind")
+    status.add_argument("--limit", type=int, default=20)
+
+    cancel = sub.add_parser("cancel", help="Cancel a job")
+    cancel.add_argument("job_id")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "worker":
+        logging.basicConfig(level=getattr(logging, args.log_level.upper(), logging.INFO),
+                            format="%(asctime)s %(levelname)s %(name)s %(message)s")
+        if args.pidfile:
+            with open(args.pidfile, "w") as fh:
+                fh.write(str(os.getpid()))
+        try:
+            run_workers(args.processes, backend=args.backend, path=args.db, kinds=args.kinds,
+                        max_jobs=args.max_jobs, idle_exit=args.idle_exit,
+                        poll_interval=args.poll_interval, lease=args.lease)
+        finally:
+            if args.pidfile:
+                try:
+                    with open(args.pidfile) as fh:
+                        mine = fh.read().strip() == str(os.getpid())
+                    if mine:
+                        os.remove(args.pidfile)
+                except OSError:
+                    pass
+        return 0
+
+    store = open_store(args.backend, args.db)
+    if args.command == "enqueue":
+        job = store.enqueue(args.kind, json.loads(args.payload), max_attempts=args.max_attempts,
+                            dedupe=not args.no_dedupe)
+        _print(job.to_dict())
+    elif args.command == "status":
+        if args.job_id:
+            job = store.get(args.job_id)
+            if job is None:
+                print(f"No job {args.job_id}", file=sys.stderr)
+                return 1
+            _print(job.to_dict())
+        else:
+            _print([j.to_dict() for j in store.list(args.job_status, args.kind, args.limit)])
+    elif args.command == "cancel":
+        ok = store.cancel(args.job_id)
+        print("cancelled" if ok else "not cancellable (unknown or already finished)")
+        return 0 if ok else 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,38 @@
+"""
+Job status API over the process's default store (store.get_job_store).
+
+Each function takes an optional ``store`` for callers holding their own.
+Results are plain dicts so they serialise straight to JSON for the UI,
+the CLI and the REST router.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional
+
+from .store import DEFAULT_MAX_ATTEMPTS, JobStore, get_job_store
+
+
+def enqueue(kind: str, payload: Optional[Dict[str, Any]] = None, *,
+            max_attempts: int = DEFAULT_MAX_ATTEMPTS, delay: float = 0.0, dedupe: bool = True,
+            store: Optional[JobStore] = None):
+    """Queue a job (deduplicated against identical active jobs); returns the Job."""
+    store = store or get_job_store()
+    return store.enqueue(kind, payload, max_attempts=max_attempts, delay=delay, dedupe=dedupe)
+
+
+def get_job(job_id: str, store: Optional[JobStore] = None) -> Optional[Dict[str, Any]]:
+    """Current state of one job, or None if unknown."""
+    job = (store or get_job_store()).get(job_id)
+    return None if job is None else job.to_dict()
+
+
+def list_jobs(status: Optional[str] = None, kind: Optional[str] = None, limit: int = 50,
+              store: Optional[JobStore] = None) -> List[Dict[str, Any]]:
+    """Most recent jobs first, optionally filtered by status and kind."""
+    return [j.to_dict() for j in (store or get_job_store()).list(status, kind, limit)]
+
+
+def cancel_job(job_id: str, store: Optional[JobStore] = None) -> bool:
+    """Cancel a queued job, or ask a running one to stop. False if already finished."""
+    return (store or get_job_store()).cancel(job_id)
@@ -0,0 +1,101 @@
+"""
+Built-in job handlers (registered on import by the Worker).
+
+    ingest_tickers   price_history backfill/refresh for a ticker list
+    sync_all_assets  the nightly refresh of every asset (scheduler.py)
+    sync_portfolio   refresh the tickers held in one portfolio
+    alpaca_sync      Alpaca -> Supabase portfolio write (services/alpaca_sync)
+
+Payloads carry no credentials; workers read them from the environment /
+secrets like the rest of the app.
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Any, Dict, List
+
+from .worker import HANDLERS, JobContext, PermanentJobError, job_handler  # noqa: F401
+
+logger = logging.getLogger(__name__)
+
+INGEST_CHUNK = 50                # tickers per sync_tickers call (one progress step)
+
+
+def _ingestion_service(payload: Dict[str, Any], ctx: JobContext):
+    from services.market_data.ingestion_service import MarketDataIngestionService
+    provider = None
+    if payload.get("provider"):
+        from services.market_data.provider_factory import get_provider
+        provider = get_provider(payload["provider"], **(payload.get("provider_options") or {}))
+    return MarketDataIngestionService(ctx.supabase, provider)
+
+
+def _sync_in_chunks(service, tickers: List[str], payload: Dict[str, Any],
+                    ctx: JobContext) -> Dict[str, Any]:
+    """sync_tickers over ``tickers`` in chunks, reporting progress per chunk."""
+    chunk = int(payload.get("chunk") or INGEST_CHUNK)
+    results: Dict[str, int] = {}
+    errors: Dict[str, str] = {}
+    last_error = None
+    ctx.progress(0, len(tickers), records=0, failed=0, force=True)
+    for i in range(0, len(tickers), chunk):
+        part = tickers[i:i + chunk]
+        try:
+            results.update(service.sync_tickers(
+                part, interval=payload.get("interval", "1d"),
+                force_full=bool(payload.get("force_full")),
+                start=payload.get("start"), end=payload.get("end"),
+            ))
+        except Exception as e:
+            last_error = e
+            errors.update({t: str(e) for t in part})
+            logger.warning(f"[Jobs] Ingestion chunk failed ({len(part)} tickers): {e}")
+        ctx.progress(min(i + chunk, len(tickers)), records=sum(results.values()),
+                     failed=len(errors))
+    if tickers and not results and last_error is not None:
+        raise last_error  # nothing worked: let the worker retry the whole job
+    return {
+        "records": sum(results.values()),
+        "ingestion_results": results,
+        "ingestion_errors": errors,
+    }
+
+
+@job_handler("ingest_tickers")
+def ingest_tickers(payload: Dict[str, Any], ctx: JobContext) -> Dict[str, Any]:
+    """payload: tickers, interval='1d', start, end, force_full, chunk, provider."""
+    tickers = list(dict.fromkeys(payload.get("tickers") or []))
+    if not tickers:
+        raise PermanentJobError("ingest_tickers requires a non-empty 'tickers' list")
+    return _sync_in_chunks(_ingestion_service(payload, ctx), tickers, payload, ctx)
+
+
+@job_handler("sync_all_assets")
+def sync_all_assets(payload: Dict[str, Any], ctx: JobContext) -> Dict[str, Any]:
+    """payload: interval='1d', force_full, chunk, provider."""
+    service = _ingestion_service(payload, ctx)
+    tickers = [a["symbol"] for a in service._get_all_assets() if a.get("symbol")]
+    logger.info(f"[Jobs] Nightly sync: {len(tickers)} assets.")
+    return _sync_in_chunks(service, tickers, payload, ctx)
+
+
+@job_handler("sync_portfolio")
+def sync_portfolio(payload: Dict[str, Any], ctx: JobContext) -> Dict[str, Any]:
+    """payload: portfolio_id, interval='1d', force_full, chunk, provider."""
+    if not payload.get("portfolio_id"):
+        raise PermanentJobError("sync_portfolio requires 'portfolio_id'")
+    service = _ingestion_service(payload, ctx)
+    tickers = service._get_portfolio_tickers(payload["portfolio_id"])
+    return _sync_in_chunks(service, tickers, payload, ctx)
+
+
+@job_handler("alpaca_sync")
+def alpaca_sync(payload: Dict[str, Any], ctx: JobContext) -> Dict[str, Any]:
+    """payload: order_limit=200. Credentials come from ALPACA_* secrets."""
+    from services.alpaca_sync import run_sync
+    ctx.progress(0, 1, force=True)
+    stats = run_sync(order_limit=int(payload.get("order_limit", 200)))
+    ctx.progress(1, 1, force=True)
+    return {"supabase_stats": stats,
+            "records": int(sum(v for v in stats.values() if isinstance(v, int)))}
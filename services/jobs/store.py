@@ -0,0 +1,617 @@
+"""
+Persistent job queue storage.
+
+Two interchangeable stores back the job runner (services/jobs/worker.py):
+
+``SQLiteJobStore``
+    A local SQLite file (WAL journal, IMMEDIATE transactions, busy
+    timeout, per-thread connections, as in atlas_terminal/core/disk_cache).
+    Safe for several worker processes and the Streamlit app sharing one file.
+
+``SupabaseJobStore``
+    The existing ``sync_jobs`` table through PostgREST (SupabaseSyncClient).
+    Claims are compare-and-set PATCHes (``status=eq.queued`` plus the
+    attempt count), so two workers can never take the same job.
+
+Both keep the ``sync_jobs`` status vocabulary (queued, running, succeeded,
+failed, cancelled). A retry puts a job back to ``queued`` with a later
+``run_after``. Identical jobs (same kind and payload) are deduplicated
+while one is queued or running.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+ACTIVE_STATUSES = (QUEUED, RUNNING)
+TERMINAL_STATUSES = (SUCCEEDED, FAILED, CANCELLED)
+
+DEFAULT_MAX_ATTEMPTS = 3
+BUSY_TIMEOUT = 30.0              # seconds to wait on another process's write lock
+CLAIM_CANDIDATES = 10            # queued rows inspected per remote claim attempt
+
+_ROOT = Path(__file__).resolve().parent.parent.parent
+DEFAULT_DB_PATH = Path(os.environ.get("ATLAS_JOB_DB", _ROOT / "data" / "jobs" / "jobs.sqlite3"))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    dedupe_key TEXT,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    run_after REAL NOT NULL,
+    progress TEXT NOT NULL DEFAULT '{}',
+    result TEXT,
+    error TEXT,
+    worker_id TEXT,
+    heartbeat_at REAL,
+    cancel_requested INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_ready ON jobs (status, run_after);
+CREATE INDEX IF NOT EXISTS idx_jobs_created ON jobs (created_at);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_jobs_dedupe ON jobs (dedupe_key)
+    WHERE dedupe_key IS NOT NULL AND status IN ('queued', 'running');
+"""
+
+
+@dataclass
+class Job:
+    """One unit of background work. Timestamps are epoch seconds."""
+
+    id: str
+    kind: str
+    payload: Dict[str, Any]
+    status: str = QUEUED
+    dedupe_key: Optional[str] = None
+    attempts: int = 0
+    max_attempts: int = DEFAULT_MAX_ATTEMPTS
+    run_after: float = 0.0
+    progress: Dict[str, Any] = field(default_factory=dict)
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    worker_id: Optional[str] = None
+    heartbeat_at: Optional[float] = None
+    cancel_requested: bool = False
+    created_at: float = 0.0
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in TERMINAL_STATUSES
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def dedupe_key(kind: str, payload: Dict[str, Any]) -> str:
+    """Stable hash of (kind, payload); key order in the payload does not matter."""
+    canonical = json.dumps([kind, payload], sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:32]
+
+
+class JobStore(ABC):
+    """
+    Interface shared by the local and remote stores.
+
+    Every state change made by a worker is guarded by its ``worker_id``, so a
+    worker whose lease expired (and whose job was handed to another worker)
+    cannot overwrite the newer attempt.
+    """
+
+    @abstractmethod
+    def enqueue(self, kind: str, payload: Optional[Dict[str, Any]] = None, *,
+                max_attempts: int = DEFAULT_MAX_ATTEMPTS, delay: float = 0.0,
+                dedupe: bool = True) -> Job:
+        """
+        Queue a job, or return the identical queued/running job if there is one.
+
+        Args:
+            kind: Handler name (see worker.job_handler)
+            payload: JSON-serialisable arguments; never put secrets here, the
+                     queue is persistent
+            max_attempts: Total tries before the job is marked failed
+            delay: Seconds before the job becomes eligible to run
+            dedupe: Reuse an active job with the same kind and payload
+        """
+
+    @abstractmethod
+    def get(self, job_id: str) -> Optional[Job]:
+        """The job with ``job_id``, or None if there is none."""
+
+    @abstractmethod
+    def list(self, status: Optional[str] = None, kind: Optional[str] = None,
+             limit: int = 50) -> List[Job]:
+        """Most recently created jobs first."""
+
+    @abstractmethod
+    def claim(self, worker_id: str, kinds: Optional[Iterable[str]] = None) -> Optional[Job]:
+        """Atomically move the next due queued job to running for ``worker_id``."""
+
+    @abstractmethod
+    def heartbeat(self, job_id: str, worker_id: str,
+                  progress: Optional[Dict[str, Any]] = None) -> bool:
+        """
+        Refresh the lease (and optionally progress) of a running job.
+
+        Returns:
+            False if the worker should stop: the job was cancelled, or the
+            lease was lost to another worker.
+        """
+
+    @abstractmethod
+    def finish(self, job_id: str, worker_id: str, status: str, *,
+               result: Optional[Dict[str, Any]] = None, error: Optional[str] = None,
+               progress: Optional[Dict[str, Any]] = None) -> bool:
+        """Record a terminal status. Returns False if the lease was lost."""
+
+    @abstractmethod
+    def retry(self, job_id: str, worker_id: str, error: str, delay: float) -> bool:
+        """Put a failed attempt back in the queue after ``delay`` seconds."""
+
+    @abstractmethod
+    def cancel(self, job_id: str) -> bool:
+        """
+        Cancel a job: queued jobs stop at once, running jobs are flagged and
+        stop at their worker's next heartbeat or progress report.
+        """
+
+    @abstractmethod
+    def requeue_stale(self, lease: float) -> int:
+        """
+        Recover running jobs whose worker stopped heartbeating for ``lease``
+        seconds (a killed process). They go back to the queue, or to failed
+        once out of attempts. Returns the number recovered.
+        """
+
+
+# ---------------------------------------------------------------------------
+# SQLite
+# ---------------------------------------------------------------------------
+
+_COLUMNS = ("id", "kind", "payload", "dedupe_key", "status", "attempts", "max_attempts",
+            "run_after", "progress", "result", "error", "worker_id", "heartbeat_at",
+            "cancel_requested", "created_at", "started_at", "finished_at")
+_SELECT = f"SELECT {', '.join(_COLUMNS)} FROM jobs"
+
+
+def _row_to_job(row) -> Job:
+    data = dict(zip(_COLUMNS, row))
+    data["payload"] = json.loads(data["payload"])
+    data["progress"] = json.loads(data["progress"] or "{}")
+    data["result"] = json.loads(data["result"]) if data["result"] else None
+    data["cancel_requested"] = bool(data["cancel_requested"])
+    return Job(**data)
+
+
+def _dumps(value: Any) -> Optional[str]:
+    return None if value is None else json.dumps(value, default=str)
+
+
+class SQLiteJobStore(JobStore):
+    """
+    Job queue in a local SQLite file.
+
+    Args:
+        path: Database file (default ``ATLAS_JOB_DB`` or data/jobs/jobs.sqlite3)
+    """
+
+    def __init__(self, path=None):
+        self.path = Path(path or DEFAULT_DB_PATH)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(_SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.path), timeout=BUSY_TIMEOUT,
+                                   isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _transaction(self, fn):
+        """Run ``fn(conn)`` inside one IMMEDIATE transaction."""
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            out = fn(conn)
+            conn.execute("COMMIT")
+            return out
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def enqueue(self, kind, payload=None, *, max_attempts=DEFAULT_MAX_ATTEMPTS, delay=0.0,
+                dedupe=True) -> Job:
+        payload = payload or {}
+        key = dedupe_key(kind, payload) if dedupe else None
+        now = time.time()
+        job = Job(id=str(uuid.uuid4()), kind=kind, payload=payload, dedupe_key=key,
+                  max_attempts=max_attempts, run_after=now + delay, created_at=now)
+
+        def insert(conn):
+            if key is not None:
+                row = conn.execute(
+                    f"{_SELECT} WHERE dedupe_key = ? AND status IN (?, ?)", (key, *ACTIVE_STATUSES)
+                ).fetchone()
+                if row is not None:
+                    return _row_to_job(row)
+            conn.execute(
+                f"INSERT INTO jobs ({', '.join(_COLUMNS)}) VALUES ({', '.join('?' * len(_COLUMNS))})",
+                (job.id, job.kind, _dumps(job.payload), key, QUEUED, 0, max_attempts,
+                 job.run_after, "{}", None, None, None, None, 0, now, None, None),
+            )
+            return job
+        return self._transaction(insert)
+
+    def get(self, job_id) -> Optional[Job]:
+        row = self._conn().execute(f"{_SELECT} WHERE id = ?", (job_id,)).fetchone()
+        return _row_to_job(row) if row else None
+
+    def list(self, status=None, kind=None, limit=50) -> List[Job]:
+        clauses, params = [], []
+        if status:
+            clauses.append("status = ?")
+            params.append(status)
+        if kind:
+            clauses.append("kind = ?")
+            params.append(kind)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = self._conn().execute(
+            f"{_SELECT}{where} ORDER BY created_at DESC LIMIT ?", (*params, int(limit))
+        ).fetchall()
+        return [_row_to_job(r) for r in rows]
+
+    def claim(self, worker_id, kinds=None) -> Optional[Job]:
+        kinds = list(kinds or [])
+        now = time.time()
+
+        def take(conn):
+            sql = "SELECT id FROM jobs WHERE status = ? AND run_after <= ?"
+            params: list = [QUEUED, now]
+            if kinds:
+                sql += f" AND kind IN ({', '.join('?' * len(kinds))})"
+                params += kinds
+            row = conn.execute(sql + " ORDER BY run_after, created_at LIMIT 1", params).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE jobs SET status = ?, attempts = attempts + 1, worker_id = ?, "
+                "heartbeat_at = ?, started_at = ?, error = NULL WHERE id = ?",
+                (RUNNING, worker_id, now, now, row[0]),
+            )
+            return _row_to_job(conn.execute(f"{_SELECT} WHERE id = ?", (row[0],)).fetchone())
+        return self._transaction(take)
+
+    def heartbeat(self, job_id, worker_id, progress=None) -> bool:
+        def beat(conn):
+            sets, params = ["heartbeat_at = ?"], [time.time()]
+            if progress is not None:
+                sets.append("progress = ?")
+                params.append(_dumps(progress))
+            cur = conn.execute(
+                f"UPDATE jobs SET {', '.join(sets)} WHERE id = ? AND worker_id = ? AND status = ?",
+                (*params, job_id, worker_id, RUNNING),
+            )
+            if cur.rowcount == 0:
+                return False
+            return not conn.execute(
+                "SELECT cancel_requested FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()[0]
+        return self._transaction(beat)
+
+    def finish(self, job_id, worker_id, status, *, result=None, error=None, progress=None) -> bool:
+        sets = ["status = ?", "result = ?", "error = ?", "finished_at = ?"]
+        params: list = [status, _dumps(result), error, time.time()]
+        if progress is not None:
+            sets.append("progress = ?")
+            params.append(_dumps(progress))
+        cur = self._transaction(lambda conn: conn.execute(
+            f"UPDATE jobs SET {', '.join(sets)} WHERE id = ? AND worker_id = ? AND status = ?",
+            (*params, job_id, worker_id, RUNNING),
+        ))
+        return cur.rowcount > 0
+
+    def retry(self, job_id, worker_id, error, delay) -> bool:
+        cur = self._transaction(lambda conn: conn.execute(
+            "UPDATE jobs SET status = ?, error = ?, run_after = ?, worker_id = NULL, "
+            "heartbeat_at = NULL WHERE id = ? AND worker_id = ? AND status = ?",
+            (QUEUED, error, time.time() + delay, job_id, worker_id, RUNNING),
+        ))
+        return cur.rowcount > 0
+
+    def cancel(self, job_id) -> bool:
+        def cancel(conn):
+            now = time.time()
+            if conn.execute(
+                "UPDATE jobs SET status = ?, finished_at = ? WHERE id = ? AND status = ?",
+                (CANCELLED, now, job_id, QUEUED),
+            ).rowcount:
+                return True
+            return conn.execute(
+                "UPDATE jobs SET cancel_requested = 1 WHERE id = ? AND status = ?",
+                (job_id, RUNNING),
+            ).rowcount > 0
+        return self._transaction(cancel)
+
+    def requeue_stale(self, lease) -> int:
+        now = time.time()
+
+        def recover(conn):
+            stale = conn.execute(
+                "SELECT id, attempts, max_attempts, cancel_requested FROM jobs "
+                "WHERE status = ? AND heartbeat_at < ?", (RUNNING, now - lease),
+            ).fetchall()
+            for job_id, attempts, max_attempts, cancel_requested in stale:
+                if cancel_requested:
+                    conn.execute("UPDATE jobs SET status = ?, finished_at = ?, worker_id = NULL "
+                                 "WHERE id = ?", (CANCELLED, now, job_id))
+                elif attempts >= max_attempts:
+                    conn.execute("UPDATE jobs SET status = ?, error = ?, finished_at = ?, "
+                                 "worker_id = NULL WHERE id = ?",
+                                 (FAILED, "Worker lost (lease expired)", now, job_id))
+                else:
+                    conn.execute("UPDATE jobs SET status = ?, error = ?, run_after = ?, "
+                                 "worker_id = NULL, heartbeat_at = NULL WHERE id = ?",
+                                 (QUEUED, "Worker lost (lease expired)", now, job_id))
+            return len(stale)
+        return self._transaction(recover)
+
+
+# ---------------------------------------------------------------------------
+# Supabase (sync_jobs)
+# ---------------------------------------------------------------------------
+
+def _iso(ts: Optional[float]) -> Optional[str]:
+    return None if ts is None else datetime.fromtimestamp(ts, timezone.utc).isoformat()
+
+
+def _epoch(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    return datetime.fromisoformat(str(value).replace("Z", "+00:00")).timestamp()
+
+
+class SupabaseJobStore(JobStore):
+    """
+    Job queue on the ``sync_jobs`` table (queue columns added by
+    supabase/migrations/20261018090000_sync_jobs_queue.sql).
+
+    Args:
+        client: SupabaseSyncClient (or anything with its ``_request``); a
+                default client is created when omitted
+        organization_id / user_id: Stamped on jobs this store enqueues
+                                   (both optional for system jobs)
+        broker: Value for the legacy ``broker`` column
+    """
+
+    TABLE = "sync_jobs"
+
+    def __init__(self, client=None, organization_id: Optional[str] = None,
+                 user_id: Optional[str] = None, broker: str = "atlas"):
+        if client is None:
+            from services.supabase_client import create_supabase_sync_client
+            client = create_supabase_sync_client()
+        self.client = client
+        self.organization_id = organization_id
+        self.user_id = user_id
+        self.broker = broker
+
+    def _request(self, method, *, query=None, payload=None, prefer=None) -> List[Dict[str, Any]]:
+        return self.client._request(method, self.TABLE, query=query, json_payload=payload,
+                                    prefer=prefer)
+
+    def _patch(self, query: Dict[str, str], changes: Dict[str, Any]) -> List[Dict[str, Any]]:
+        return self._request("PATCH", query=query, payload=changes, prefer="return=representation")
+
+    @staticmethod
+    def _to_job(row: Dict[str, Any]) -> Job:
+        return Job(
+            id=str(row["id"]),
+            kind=row.get("job_type") or "alpaca_sync",
+            payload=row.get("settings") or {},
+            status=row.get("status") or QUEUED,
+            dedupe_key=row.get("dedupe_key"),
+            attempts=int(row.get("attempts") or 0),
+            max_attempts=int(row.get("max_attempts") or DEFAULT_MAX_ATTEMPTS),
+            run_after=_epoch(row.get("run_after")) or 0.0,
+            progress=row.get("progress") or {},
+            result=row.get("result"),
+            error=row.get("error_message"),
+            worker_id=row.get("worker_id"),
+            heartbeat_at=_epoch(row.get("heartbeat_at")),
+            cancel_requested=bool(row.get("cancel_requested")),
+            created_at=_epoch(row.get("requested_at")) or 0.0,
+            started_at=_epoch(row.get("started_at")),
+            finished_at=_epoch(row.get("finished_at")),
+        )
+
+    def _active(self, key: str) -> Optional[Job]:
+        rows = self._request("GET", query={"dedupe_key": f"eq.{key}",
+                                           "status": f"in.({','.join(ACTIVE_STATUSES)})",
+                                           "limit": "1"})
+        return self._to_job(rows[0]) if rows else None
+
+    def enqueue(self, kind, payload=None, *, max_attempts=DEFAULT_MAX_ATTEMPTS, delay=0.0,
+                dedupe=True) -> Job:
+        payload = payload or {}
+        key = dedupe_key(kind, payload) if dedupe else None
+        if key is not None:
+            existing = self._active(key)
+            if existing is not None:
+                return existing
+        now = time.time()
+        row: Dict[str, Any] = {
+            "job_type": kind,
+            "broker": self.broker,
+            "status": QUEUED,
+            "settings": payload,
+            "dedupe_key": key,
+            "attempts": 0,
+            "max_attempts": max_attempts,
+            "run_after": _iso(now + delay),
+            "progress": {},
+            "requested_at": _iso(now),
+        }
+        if self.organization_id:
+            row["organization_id"] = self.organization_id
+        if self.user_id:
+            row["user_id"] = self.user_id
+        try:
+            rows = self._request("POST", payload=row, prefer="return=representation")
+        except Exception:
+            # Lost an enqueue race against the unique active-dedupe index
+            existing = self._active(key) if key is not None else None
+            if existing is None:
+                raise
+            return existing
+        return self._to_job(rows[0])
+
+    def get(self, job_id) -> Optional[Job]:
+        rows = self._request("GET", query={"id": f"eq.{job_id}"})
+        return self._to_job(rows[0]) if rows else None
+
+    def list(self, status=None, kind=None, limit=50) -> List[Job]:
+        query = {"order": "requested_at.desc", "limit": str(int(limit))}
+        if status:
+            query["status"] = f"eq.{status}"
+        if kind:
+            query["job_type"] = f"eq.{kind}"
+        return [self._to_job(r) for r in self._request("GET", query=query)]
+
+    def claim(self, worker_id, kinds=None) -> Optional[Job]:
+        now = time.time()
+        query = {"status": f"eq.{QUEUED}", "run_after": f"lte.{_iso(now)}",
+                 "order": "run_after.asc,requested_at.asc", "limit": str(CLAIM_CANDIDATES)}
+        kinds = list(kinds or [])
+        if kinds:
+            query["job_type"] = f"in.({','.join(kinds)})"
+        for row in self._request("GET", query=query):
+            attempts = int(row.get("attempts") or 0)
+            claimed = self._patch(
+                {"id": f"eq.{row['id']}", "status": f"eq.{QUEUED}", "attempts": f"eq.{attempts}"},
+                {"status": RUNNING, "attempts": attempts + 1, "worker_id": worker_id,
+                 "heartbeat_at": _iso(now), "started_at": _iso(now), "error_message": None},
+            )
+            if claimed:
+                return self._to_job(claimed[0])
+        return None
+
+    def _owned(self, job_id, worker_id) -> Dict[str, str]:
+        return {"id": f"eq.{job_id}", "worker_id": f"eq.{worker_id}", "status": f"eq.{RUNNING}"}
+
+    def heartbeat(self, job_id, worker_id, progress=None) -> bool:
+        changes: Dict[str, Any] = {"heartbeat_at": _iso(time.time())}
+        if progress is not None:
+            changes["progress"] = progress
+        rows = self._patch(self._owned(job_id, worker_id), changes)
+        return bool(rows) and not rows[0].get("cancel_requested")
+
+    def finish(self, job_id, worker_id, status, *, result=None, error=None, progress=None) -> bool:
+        changes: Dict[str, Any] = {"status": status, "result": result, "error_message": error,
+                                   "finished_at": _iso(time.time())}
+        if progress is not None:
+            changes["progress"] = progress
+        records = (result or {}).get("records")
+        if isinstance(records, int):
+            changes["rows_synced"] = records
+        return bool(self._patch(self._owned(job_id, worker_id), changes))
+
+    def retry(self, job_id, worker_id, error, delay) -> bool:
+        return bool(self._patch(self._owned(job_id, worker_id), {
+            "status": QUEUED, "error_message": error, "run_after": _iso(time.time() + delay),
+            "worker_id": None, "heartbeat_at": None,
+        }))
+
+    def cancel(self, job_id) -> bool:
+        if self._patch({"id": f"eq.{job_id}", "status": f"eq.{QUEUED}"},
+                       {"status": CANCELLED, "finished_at": _iso(time.time())}):
+            return True
+        return bool(self._patch({"id": f"eq.{job_id}", "status": f"eq.{RUNNING}"},
+                                {"cancel_requested": True}))
+
+    def requeue_stale(self, lease) -> int:
+        now = time.time()
+        stale = self._request("GET", query={"status": f"eq.{RUNNING}",
+                                            "heartbeat_at": f"lt.{_iso(now - lease)}"})
+        recovered = 0
+        for row in stale:
+            job = self._to_job(row)
+            if job.cancel_requested:
+                changes = {"status": CANCELLED, "finished_at": _iso(now)}
+            elif job.attempts >= job.max_attempts:
+                changes = {"status": FAILED, "error_message": "Worker lost (lease expired)",
+                           "finished_at": _iso(now)}
+            else:
+                changes = {"status": QUEUED, "error_message": "Worker lost (lease expired)",
+                           "run_after": _iso(now), "heartbeat_at": None}
+            changes["worker_id"] = None
+            # Guard on the attempt count so a job re-claimed meanwhile is left alone
+            if self._patch({"id": f"eq.{job.id}", "status": f"eq.{RUNNING}",
+                            "attempts": f"eq.{job.attempts}"}, changes):
+                recovered += 1
+        return recovered
+
+
+# ---------------------------------------------------------------------------
+# Default store
+# ---------------------------------------------------------------------------
+
+_default_store: Optional[JobStore] = None
+_default_lock = threading.Lock()
+
+
+def open_store(backend: Optional[str] = None, path=None) -> JobStore:
+    """
+    Build a store for ``backend`` ('sqlite' or 'supabase'; default
+    ``ATLAS_JOB_BACKEND``, else 'sqlite').
+    """
+    backend = (backend or os.environ.get("ATLAS_JOB_BACKEND") or "sqlite").lower()
+    if backend == "sqlite":
+        return SQLiteJobStore(path)
+    if backend == "supabase":
+        return SupabaseJobStore(organization_id=os.environ.get("ATLAS_ORGANIZATION_ID") or None,
+                                user_id=os.environ.get("ATLAS_USER_ID") or None)
+    raise ValueError(f"Unknown job backend {backend!r} (expected 'sqlite' or 'supabase')")
+
+
+def get_job_store() -> JobStore:
+    """Process-wide store configured from the environment, created on first use."""
+    global _default_store
+    with _default_lock:
+        if _default_store is None:
+            _default_store = open_store()
+        return _default_store
+
+
+__all__ = [
+    "Job", "JobStore", "SQLiteJobStore", "SupabaseJobStore", "dedupe_key",
+    "open_store", "get_job_store",
+    "QUEUED", "RUNNING", "SUCCEEDED", "FAILED", "CANCELLED",
+]
@@ -0,0 +1,363 @@
+"""
+Job worker: claims jobs from a JobStore and runs their handlers.
+
+Workers run in their own processes (``python -m services.jobs worker``),
+so a long ingestion survives Streamlit reruns and worker restarts and never
+holds a web-server thread. A killed worker's job is recovered by the next
+worker once its lease expires (``JobStore.requeue_stale``).
+
+Handlers are plain functions registered by kind::
+
+    @job_handler("ingest_tickers")
+    def ingest_tickers(payload, ctx):
+        ...
+        ctx.progress(done, total, records=n)
+        return {"records": n}
+
+A handler's return value (a JSON-serialisable dict) becomes the job
+result. Raising retries the job with exponential backoff until
+``max_attempts``; ``PermanentJobError`` fails it at once.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import random
+import signal
+import socket
+import subprocess
+import sys
+import threading
+import time
+import traceback
+import uuid
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from .store import CANCELLED, FAILED, SUCCEEDED, Job, JobStore, open_store
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POLL_INTERVAL = 2.0      # seconds between claims when the queue is empty
+DEFAULT_LEASE = 300.0            # seconds without a heartbeat before a job is recovered
+PROGRESS_INTERVAL = 1.0          # minimum seconds between progress writes
+BACKOFF_BASE = 30.0              # first retry delay, doubled per attempt
+BACKOFF_CAP = 1800.0
+
+Handler = Callable[[Dict[str, Any], "JobContext"], Optional[Dict[str, Any]]]
+HANDLERS: Dict[str, Handler] = {}
+
+_ROOT = Path(__file__).resolve().parent.parent.parent
+
+
+class JobCancelled(Exception):
+    """Raised inside a handler when its job was cancelled or its lease lost."""
+
+
+class PermanentJobError(Exception):
+    """Handler failure that retrying cannot fix (bad payload, missing config)."""
+
+
+def job_handler(kind: str):
+    """Decorator registering ``fn(payload, ctx)`` as the handler for ``kind``."""
+    def register(fn: Handler) -> Handler:
+        HANDLERS[kind] = fn
+        return fn
+    return register
+
+
+def backoff_delay(attempt: int, base: float = BACKOFF_BASE, cap: float = BACKOFF_CAP,
+                  jitter: float = 0.1) -> float:
+    """Seconds before retrying after failed attempt number ``attempt`` (1-based)."""
+    delay = min(cap, base * 2 ** max(attempt - 1, 0))
+    return delay * (1.0 + random.uniform(0.0, jitter))
+
+
+class JobContext:
+    """
+    Handed to a handler with its payload: progress reporting, cancellation
+    and shared resources.
+    """
+
+    def __init__(self, worker: "Worker", job: Job):
+        self.worker = worker
+        self.job = job
+        self.state: Dict[str, Any] = dict(job.progress)
+        self._stopped = threading.Event()
+        self._last_write = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._stopped.is_set()
+
+    @property
+    def supabase(self):
+        """Supabase client for handlers (the worker's, else the process default)."""
+        if self.worker.supabase_client is None:
+            from services.supabase_client import get_supabase_client
+            self.worker.supabase_client = get_supabase_client()
+        return self.worker.supabase_client
+
+    def check_cancelled(self):
+        if self._stopped.is_set():
+            raise JobCancelled(self.job.id)
+
+    def progress(self, done: Optional[int] = None, total: Optional[int] = None,
+                 force: bool = False, **counters):
+        """
+        Record progress counters; written to the store at most every
+        PROGRESS_INTERVAL seconds (or when ``force``). Raises JobCancelled
+        if the job was cancelled.
+        """
+        with self._lock:
+            if done is not None:
+                self.state["done"] = done
+            if total is not None:
+                self.state["total"] = total
+            self.state.update(counters)
+            due = force or time.monotonic() - self._last_write >= PROGRESS_INTERVAL
+        if due:
+            self.flush()
+        self.check_cancelled()
+
+    def flush(self):
+        """Write progress and refresh the lease now."""
+        with self._lock:
+            snapshot = dict(self.state)
+            self._last_write = time.monotonic()
+        if not self.worker.store.heartbeat(self.job.id, self.worker.worker_id, snapshot):
+            self._stopped.set()
+
+
+class Worker:
+    """
+    Claims and runs jobs one at a time.
+
+    Args:
+        store: JobStore to work from
+        kinds: Only claim these job kinds (default: every registered kind)
+        handlers: Handler overrides; defaults to the registry, which includes
+                  the built-in handlers in services/jobs/handlers.py
+        poll_interval: Seconds to sleep when no job is due
+        lease: Seconds without a heartbeat after which a job is recovered
+        backoff_base / backoff_cap: Retry delay schedule (seconds)
+        supabase_client: Client exposed to handlers as ``ctx.supabase``
+    """
+
+    def __init__(self, store: JobStore, kinds: Optional[Iterable[str]] = None,
+                 handlers: Optional[Dict[str, Handler]] = None,
+                 poll_interval: float = DEFAULT_POLL_INTERVAL, lease: float = DEFAULT_LEASE,
+                 backoff_base: float = BACKOFF_BASE, backoff_cap: float = BACKOFF_CAP,
+                 supabase_client=None):
+        from . import handlers as _builtin  # noqa: F401  (registers built-in kinds)
+        self.store = store
+        self.handlers = dict(HANDLERS)
+        self.handlers.update(handlers or {})
+        self.kinds = list(kinds) if kinds else None
+        self.poll_interval = poll_interval
+        self.lease = lease
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.supabase_client = supabase_client
+        self.worker_id = f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._stop = threading.Event()
+        self._last_reap = 0.0
+
+    def stop(self):
+        self._stop.set()
+
+    def run_once(self) -> Optional[Job]:
+        """Claim and run one due job; returns it (final state), or None if idle."""
+        job = self.store.claim(self.worker_id, self.kinds)
+        if job is None:
+            return None
+        self._execute(job)
+        return self.store.get(job.id)
+
+    def run(self, max_jobs: Optional[int] = None, idle_exit: Optional[float] = None) -> int:
+        """
+        Work until stopped, ``max_jobs`` jobs have run, or the queue has been
+        empty for ``idle_exit`` seconds. Returns the number of jobs run.
+        """
+        ran = 0
+        idle_since = time.monotonic()
+        logger.info("[Jobs] Worker %s started.", self.worker_id)
+        while not self._stop.is_set():
+            self._reap()
+            if self.run_once() is not None:
+                ran += 1
+                idle_since = time.monotonic()
+                if max_jobs is not None and ran >= max_jobs:
+                    break
+                continue
+            if idle_exit is not None and time.monotonic() - idle_since >= idle_exit:
+                break
+            self._stop.wait(self.poll_interval)
+        logger.info("[Jobs] Worker %s stopped after %d job(s).", self.worker_id, ran)
+        return ran
+
+    def _reap(self):
+        now = time.monotonic()
+        if now - self._last_reap < self.lease / 4:
+            return
+        self._last_reap = now
+        try:
+            recovered = self.store.requeue_stale(self.lease)
+            if recovered:
+                logger.warning("[Jobs] Recovered %d job(s) from lost workers.", recovered)
+        except Exception as e:
+            logger.warning(f"[Jobs] Stale job sweep failed: {e}")
+
+    def _execute(self, job: Job):
+        handler = self.handlers.get(job.kind)
+        if handler is None:
+            self.store.finish(job.id, self.worker_id, FAILED,
+                              error=f"No handler registered for job kind {job.kind!r}")
+            return
+        ctx = JobContext(self, job)
+        beating = threading.Event()
+        beat = threading.Thread(target=self._heartbeat, args=(ctx, beating), daemon=True,
+                                name=f"job-heartbeat-{job.id[:8]}")
+        beat.start()
+        logger.info("[Jobs] Running %s %s (attempt %d/%d).",
+                    job.kind, job.id, job.attempts, job.max_attempts)
+        try:
+            ctx.check_cancelled()
+            result = handler(job.payload, ctx) or {}
+        except JobCancelled:
+            self.store.finish(job.id, self.worker_id, CANCELLED, error="Cancelled",
+                              progress=ctx.state)
+            logger.info("[Jobs] %s %s cancelled.", job.kind, job.id)
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            if isinstance(e, PermanentJobError) or job.attempts >= job.max_attempts:
+                self.store.finish(job.id, self.worker_id, FAILED, error=error, progress=ctx.state)
+                logger.error("[Jobs] %s %s failed: %s\n%s", job.kind, job.id, error,
+                             traceback.format_exc())
+            else:
+                delay = backoff_delay(job.attempts, self.backoff_base, self.backoff_cap)
+                self.store.retry(job.id, self.worker_id, error, delay)
+                logger.warning("[Jobs] %s %s failed (%s); retrying in %.0fs.",
+                               job.kind, job.id, error, delay)
+        else:
+            self.store.finish(job.id, self.worker_id, SUCCEEDED, result=result,
+                              progress=ctx.state)
+            logger.info("[Jobs] %s %s succeeded.", job.kind, job.id)
+        finally:
+            beating.set()
+            beat.join()
+
+    def _heartbeat(self, ctx: JobContext, done: threading.Event):
+        """Keep the lease alive while a handler runs without reporting progress."""
+        interval = max(self.lease / 3, 0.05)
+        while not done.wait(interval):
+            try:
+                ctx.flush()
+            except Exception as e:
+                logger.warning(f"[Jobs] Heartbeat failed for {ctx.job.id}: {e}")
+
+
+# ---------------------------------------------------------------------------
+# Worker processes
+# ---------------------------------------------------------------------------
+
+def _worker_main(backend: Optional[str], path: Optional[str], kinds, options: Dict[str, Any],
+                 max_jobs: Optional[int], idle_exit: Optional[float]):
+    """Process entry point: open the store in this process and run a Worker."""
+    worker = Worker(open_store(backend, path), kinds=kinds, **options)
+    signal.signal(signal.SIGTERM, lambda *_: worker.stop())
+    signal.signal(signal.SIGINT, lambda *_: worker.stop())
+    worker.run(max_jobs=max_jobs, idle_exit=idle_exit)
+
+
+def run_workers(processes: int = 1, backend: Optional[str] = None, path: Optional[str] = None,
+                kinds: Optional[Iterable[str]] = None, max_jobs: Optional[int] = None,
+                idle_exit: Optional[float] = None, **options) -> None:
+    """
+    Run ``processes`` workers until SIGTERM/SIGINT (or ``max_jobs`` /
+    ``idle_exit``, per worker, as in Worker.run). With one process the worker
+    runs here; more are started as child processes, each with its own store
+    connection.
+    """
+    kinds = list(kinds) if kinds else None
+    args = (backend, path, kinds, options, max_jobs, idle_exit)
+    if processes <= 1:
+        _worker_main(*args)
+        return
+    import multiprocessing
+    children = [multiprocessing.Process(target=_worker_main, args=args,
+                                        name=f"atlas-job-worker-{i}")
+                for i in range(processes)]
+    for child in children:
+        child.start()
+
+    def forward(signum, _frame):
+        for child in children:
+            if child.is_alive():
+                os.kill(child.pid, signum)
+    signal.signal(signal.SIGTERM, forward)
+    signal.signal(signal.SIGINT, forward)
+    for child in children:
+        child.join()
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def default_pidfile(backend: Optional[str] = None, path=None) -> Path:
+    backend = (backend or os.environ.get("ATLAS_JOB_BACKEND") or "sqlite").lower()
+    if backend == "sqlite":
+        from .store import DEFAULT_DB_PATH
+        return Path(path or DEFAULT_DB_PATH).with_suffix(".worker.pid")
+    return Path("/tmp/atlas_job_worker.pid")
+
+
+def ensure_worker(backend: Optional[str] = None, path=None, pidfile=None) -> Optional[int]:
+    """
+    Start a detached worker process unless one recorded in ``pidfile`` is
+    alive. Called by the app after enqueueing so jobs run without a
+    separately managed worker; deployments that run their own workers set
+    ``ATLAS_JOB_SPAWN_WORKER=0``.
+
+    Returns:
+        PID of the running worker, or None if spawning is disabled.
+    """
+    if os.environ.get("ATLAS_JOB_SPAWN_WORKER", "1") == "0":
+        return None
+    pidfile = Path(pidfile or default_pidfile(backend, path))
+    try:
+        pid = int(pidfile.read_text().strip())
+        if _pid_alive(pid):
+            return pid
+    except (OSError, ValueError):
+        pass
+    cmd = [sys.executable, "-m", "services.jobs"]
+    if backend:
+        cmd += ["--backend", backend]
+    if path:
+        cmd += ["--db", str(path)]
+    cmd += ["worker", "--pidfile", str(pidfile)]
+    pidfile.parent.mkdir(parents=True, exist_ok=True)
+    log = open(pidfile.with_suffix(".log"), "ab")
+    # New session: the worker outlives the Streamlit process that started it
+    proc = subprocess.Popen(cmd, cwd=str(_ROOT), stdin=subprocess.DEVNULL, stdout=log,
+                            stderr=subprocess.STDOUT, start_new_session=True)
+    log.close()
+    pidfile.write_text(str(proc.pid))
+    logger.info("[Jobs] Started worker process %d.", proc.pid)
+    return proc.pid
+
+
+__all__ = [
+    "Worker", "JobContext", "JobCancelled", "PermanentJobError", "job_handler", "HANDLERS",
+    "backoff_delay", "run_workers", "ensure_worker",
+]
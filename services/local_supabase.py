@@ -0,0 +1,486 @@
+"""In-process stand-in for the Supabase table API.
+
+Lets the ingestion and sync pipelines run without a Supabase project, for
+tests and throughput benchmarks. Two front ends share one in-memory store:
+
+1. ``LocalSupabase.table(name)`` -- the supabase-py fluent builder subset
+   used by ``MarketDataIngestionService`` (select / filters / order /
+   limit / insert / upsert / update / delete / execute, one level of
+   embedded ``table(cols)`` selects).
+2. ``LocalSupabase.request(method, table, query=, json_payload=, prefer=)``
+   -- the PostgREST call signature of ``SupabaseSyncClient._request`` and
+   ``sync/run_sync._supabase_request`` (``eq.``/``gte.``/``in.(...)``
+   filters, ``on_conflict`` + ``resolution=merge-duplicates`` upserts).
+   ``LocalSupabaseSyncClient`` wires it into ``SupabaseSyncClient``.
+
+Upserts honour the ``on_conflict`` columns through a hash index, equality
+filters use lazily built column indexes, and new rows get a uuid ``id``.
+Every ``execute()`` / ``request()`` counts as one round trip and can sleep
+for a configurable simulated network ``latency``.
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from services.supabase_client import SupabaseSyncClient
+
+
+@dataclass
+class LocalResponse:
+    """Mimics the supabase-py APIResponse attributes callers use."""
+    data: Any
+    count: Optional[int] = None
+
+
+class _Table:
+    """Rows keyed by an internal row id, plus unique and equality indexes."""
+
+    def __init__(self):
+        self.rows: Dict[int, Dict[str, Any]] = {}
+        self.unique: Dict[Tuple[str, ...], Dict[tuple, int]] = {}
+        self.indexes: Dict[str, Dict[Any, set]] = {}
+        self._next = 0
+
+    def unique_index(self, cols: Tuple[str, ...]) -> Dict[tuple, int]:
+        index = self.unique.get(cols)
+        if index is None:
+            index = {tuple(r.get(c) for c in cols): rid for rid, r in self.rows.items()}
+            self.unique[cols] = index
+        return index
+
+    def eq_index(self, col: str) -> Dict[Any, set]:
+        index = self.indexes.get(col)
+        if index is None:
+            index = {}
+            for rid, row in self.rows.items():
+                index.setdefault(_hashable(row.get(col)), set()).add(rid)
+            self.indexes[col] = index
+        return index
+
+    def insert(self, row: Dict[str, Any]) -> int:
+        rid = self._next
+        self._next += 1
+        self.rows[rid] = row
+        for cols, index in self.unique.items():
+            index[tuple(row.get(c) for c in cols)] = rid
+        for col, index in self.indexes.items():
+            index.setdefault(_hashable(row.get(col)), set()).add(rid)
+        return rid
+
+    def update(self, rid: int, changes: Dict[str, Any]):
+        row = self.rows[rid]
+        for col, index in self.indexes.items():
+            if col in changes and changes[col] != row.get(col):
+                index.get(_hashable(row.get(col)), set()).discard(rid)
+                index.setdefault(_hashable(changes[col]), set()).add(rid)
+        for cols, index in self.unique.items():
+            if any(c in changes for c in cols):
+                index.pop(tuple(row.get(c) for c in cols), None)
+        row.update(changes)
+        for cols, index in self.unique.items():
+            if any(c in changes for c in cols):
+                index[tuple(row.get(c) for c in cols)] = rid
+
+    def delete(self, rid: int):
+        row = self.rows.pop(rid)
+        for cols, index in self.unique.items():
+            index.pop(tuple(row.get(c) for c in cols), None)
+        for col, index in self.indexes.items():
+            index.get(_hashable(row.get(col)), set()).discard(rid)
+
+
+def _hashable(value: Any) -> Any:
+    return value if isinstance(value, (str, int, float, bool, type(None))) else repr(value)
+
+
+# Filter operators shared by both front ends
+_OPS: Dict[str, Callable[[Any, Any], bool]] = {
+    "eq": lambda a, b: a == b,
+    "neq": lambda a, b: a != b,
+    "gt": lambda a, b: a is not None and a > b,
+    "gte": lambda a, b: a is not None and a >= b,
+    "lt": lambda a, b: a is not None and a < b,
+    "lte": lambda a, b: a is not None and a <= b,
+    "in": lambda a, b: a in b,
+    "is": lambda a, b: a is b,
+}
+
+
+class LocalSupabase:
+    """
+    In-memory Supabase stand-in.
+
+    Args:
+        latency: Seconds slept per round trip (simulated network time)
+    """
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self._tables: Dict[str, _Table] = {}
+        self._lock = threading.RLock()
+        self.reset_stats()
+
+    # ------------------------------------------------------------------
+    # supabase-py style
+    # ------------------------------------------------------------------
+
+    def table(self, name: str) -> "_Query":
+        return _Query(self, name)
+
+    from_ = table
+
+    # ------------------------------------------------------------------
+    # PostgREST style
+    # ------------------------------------------------------------------
+
+    def request(
+        self,
+        method: str,
+        table: str,
+        *,
+        query: Optional[Dict[str, str]] = None,
+        json_payload: Optional[Any] = None,
+        prefer: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Serve one PostgREST call (same signature as SupabaseSyncClient._request)."""
+        query = dict(query or {})
+        select = query.pop("select", "*")
+        on_conflict = query.pop("on_conflict", None)
+        order = query.pop("order", None)
+        limit = query.pop("limit", None)
+        filters = [_parse_rest_filter(col, expr) for col, expr in query.items()]
+        prefer = prefer or ""
+        method = method.upper()
+
+        if method == "GET":
+            rows = self._run_select(table, select, filters, _parse_rest_order(order),
+                                    int(limit) if limit else None, None)
+        elif method == "POST":
+            payload = json_payload if isinstance(json_payload, list) else [json_payload]
+            if on_conflict or "merge-duplicates" in prefer:
+                rows = self._run_upsert(table, payload, on_conflict or "id",
+                                        ignore_duplicates="ignore-duplicates" in prefer)
+            else:
+                rows = self._run_insert(table, payload)
+        elif method == "PATCH":
+            rows = self._run_update(table, json_payload or {}, filters)
+        elif method == "DELETE":
+            rows = self._run_delete(table, filters)
+        else:
+            raise ValueError(f"Unsupported method {method!r}")
+        self._round_trip()
+        return [] if "return=minimal" in prefer else rows
+
+    # ------------------------------------------------------------------
+    # Introspection
+    # ------------------------------------------------------------------
+
+    def rows(self, table: str) -> List[Dict[str, Any]]:
+        """Copy of every row in ``table``."""
+        with self._lock:
+            return [dict(r) for r in self._table(table).rows.values()]
+
+    def count(self, table: str) -> int:
+        with self._lock:
+            return len(self._table(table).rows)
+
+    def stats(self) -> Dict[str, int]:
+        return dict(self._stats)
+
+    def reset_stats(self):
+        self._stats = {"round_trips": 0, "rows_read": 0, "rows_written": 0}
+
+    # ------------------------------------------------------------------
+    # Operations
+    # ------------------------------------------------------------------
+
+    def _table(self, name: str) -> _Table:
+        table = self._tables.get(name)
+        if table is None:
+            table = self._tables[name] = _Table()
+        return table
+
+    def _round_trip(self):
+        self._stats["round_trips"] += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def _matching(self, table: _Table, filters: List[Tuple[str, str, Any]]) -> Iterable[int]:
+        eq = [(c, v) for c, op, v in filters if op == "eq"]
+        if eq:
+            # Narrow with the most selective equality index
+            candidates = min((table.eq_index(c).get(_hashable(v), set()) for c, v in eq), key=len)
+            candidates = sorted(candidates)
+        else:
+            candidates = list(table.rows)
+        for rid in candidates:
+            row = table.rows[rid]
+            if all(_OPS[op](row.get(c), v) for c, op, v in filters):
+                yield rid
+
+    def _run_select(self, name, select, filters, order, limit, offset) -> List[Dict[str, Any]]:
+        with self._lock:
+            table = self._table(name)
+            rows = [table.rows[rid] for rid in self._matching(table, filters)]
+            for col, desc in reversed(order):
+                rows.sort(key=lambda r: (r.get(col) is None, r.get(col)), reverse=desc)
+            if offset:
+                rows = rows[offset:]
+            if limit is not None:
+                rows = rows[:limit]
+            out = [self._project(r, select) for r in rows]
+        self._stats["rows_read"] += len(out)
+        return out
+
+    def _project(self, row: Dict[str, Any], select: str) -> Dict[str, Any]:
+        out: Dict[str, Any] = {}
+        for part in _split_select(select):
+            embed = re.match(r"^(\w+)\((.*)\)$", part)
+            if part == "*":
+                out.update(row)
+            elif embed:
+                ref, cols = embed.groups()
+                fk = row.get(f"{ref[:-1] if ref.endswith('s') else ref}_id")
+                target = self._table(ref)
+                rids = target.eq_index("id").get(_hashable(fk), set())
+                out[ref] = self._project(target.rows[min(rids)], cols) if rids else None
+            else:
+                out[part] = row.get(part)
+        return out
+
+    def _run_insert(self, name, rows) -> List[Dict[str, Any]]:
+        with self._lock:
+            table = self._table(name)
+            out = []
+            for row in rows:
+                row = dict(row)
+                row.setdefault("id", str(uuid.uuid4()))
+                table.insert(row)
+                out.append(dict(row))
+        self._stats["rows_written"] += len(out)
+        return out
+
+    def _run_upsert(self, name, rows, on_conflict: str, ignore_duplicates: bool = False):
+        cols = tuple(c.strip() for c in on_conflict.split(","))
+        with self._lock:
+            table = self._table(name)
+            index = table.unique_index(cols)
+            out = []
+            for row in rows:
+                rid = index.get(tuple(row.get(c) for c in cols))
+                if rid is None:
+                    row = dict(row)
+                    row.setdefault("id", str(uuid.uuid4()))
+                    rid = table.insert(row)
+                elif not ignore_duplicates:
+                    table.update(rid, row)
+                out.append(dict(table.rows[rid]))
+        self._stats["rows_written"] += len(out)
+        return out
+
+    def _run_update(self, name, changes, filters) -> List[Dict[str, Any]]:
+        with self._lock:
+            table = self._table(name)
+            out = []
+            for rid in list(self._matching(table, filters)):
+                table.update(rid, changes)
+                out.append(dict(table.rows[rid]))
+        self._stats["rows_written"] += len(out)
+        return out
+
+    def _run_delete(self, name, filters) -> List[Dict[str, Any]]:
+        with self._lock:
+            table = self._table(name)
+            doomed = list(self._matching(table, filters))
+            out = [dict(table.rows[rid]) for rid in doomed]
+            for rid in doomed:
+                table.delete(rid)
+        return out
+
+
+class _Query:
+    """Fluent builder: ``db.table('t').select('a').eq('b', 1).execute()``."""
+
+    def __init__(self, db: LocalSupabase, name: str):
+        self._db = db
+        self._name = name
+        self._action = "select"
+        self._select = "*"
+        self._payload: Any = None
+        self._on_conflict = "id"
+        self._ignore_duplicates = False
+        self._filters: List[Tuple[str, str, Any]] = []
+        self._order: List[Tuple[str, bool]] = []
+        self._limit: Optional[int] = None
+        self._offset: Optional[int] = None
+        self._single = False
+        self._count = None
+
+    # Actions
+    def select(self, columns: str = "*", count: Optional[str] = None) -> "_Query":
+        self._select, self._count = columns, count
+        return self
+
+    def insert(self, rows, **_) -> "_Query":
+        self._action, self._payload = "insert", rows
+        return self
+
+    def upsert(self, rows, on_conflict: str = "id", ignore_duplicates: bool = False, **_) -> "_Query":
+        self._action, self._payload = "upsert", rows
+        self._on_conflict, self._ignore_duplicates = on_conflict, ignore_duplicates
+        return self
+
+    def update(self, changes: Dict[str, Any], **_) -> "_Query":
+        self._action, self._payload = "update", changes
+        return self
+
+    def delete(self, **_) -> "_Query":
+        self._action = "delete"
+        return self
+
+    # Filters
+    def _filter(self, col, op, value) -> "_Query":
+        self._filters.append((col, op, value))
+        return self
+
+    def eq(self, col, value):
+        return self._filter(col, "eq", value)
+
+    def neq(self, col, value):
+        return self._filter(col, "neq", value)
+
+    def gt(self, col, value):
+        return self._filter(col, "gt", value)
+
+    def gte(self, col, value):
+        return self._filter(col, "gte", value)
+
+    def lt(self, col, value):
+        return self._filter(col, "lt", value)
+
+    def lte(self, col, value):
+        return self._filter(col, "lte", value)
+
+    def in_(self, col, values):
+        return self._filter(col, "in", set(values))
+
+    def is_(self, col, value):
+        return self._filter(col, "is", None if value in (None, "null") else value)
+
+    # Modifiers
+    def order(self, col: str, desc: bool = False, **_) -> "_Query":
+        self._order.append((col, desc))
+        return self
+
+    def limit(self, n: int) -> "_Query":
+        self._limit = n
+        return self
+
+    def range(self, start: int, end: int) -> "_Query":
+        self._offset, self._limit = start, end - start + 1
+        return self
+
+    def single(self) -> "_Query":
+        self._single = True
+        return self
+
+    maybe_single = single
+
+    def execute(self) -> LocalResponse:
+        db = self._db
+        if self._action == "select":
+            data = db._run_select(self._name, self._select, self._filters, self._order,
+                                  self._limit, self._offset)
+        elif self._action == "insert":
+            rows = self._payload if isinstance(self._payload, list) else [self._payload]
+            data = db._run_insert(self._name, rows)
+        elif self._action == "upsert":
+            rows = self._payload if isinstance(self._payload, list) else [self._payload]
+            data = db._run_upsert(self._name, rows, self._on_conflict, self._ignore_duplicates)
+        elif self._action == "update":
+            data = db._run_update(self._name, self._payload, self._filters)
+        else:
+            data = db._run_delete(self._name, self._filters)
+        db._round_trip()
+        count = len(data) if self._count else None
+        if self._single:
+            data = data[0] if data else None
+        return LocalResponse(data=data, count=count)
+
+
+class LocalSupabaseSyncClient(SupabaseSyncClient):
+    """SupabaseSyncClient whose REST calls are served by a LocalSupabase."""
+
+    def __init__(self, db: Optional[LocalSupabase] = None):
+        self.supabase_url = "local://supabase"
+        self.supabase_key = ""
+        self.db = db or LocalSupabase()
+
+    def _request(self, method, table, *, query=None, json_payload=None, prefer=None):
+        return self.db.request(method, table, query=query, json_payload=json_payload, prefer=prefer)
+
+
+# ----------------------------------------------------------------------
+# Parsing helpers
+# ----------------------------------------------------------------------
+
+def _split_select(select: str) -> List[str]:
+    """Split a select clause on top-level commas: 'id, assets(symbol)'."""
+    parts, depth, current = [], 0, ""
+    for ch in select:
+        if ch == "," and depth == 0:
+            parts.append(current.strip())
+            current = ""
+            continue
+        depth += ch == "("
+        depth -= ch == ")"
+        current += ch
+    if current.strip():
+        parts.append(current.strip())
+    return parts
+
+
+def _parse_rest_value(text: str) -> Any:
+    if text == "null":
+        return None
+    if text in ("true", "false"):
+        return text == "true"
+    try:
+        return int(text)
+    except ValueError:
+        pass
+    try:
+        return float(text)
+    except ValueError:
+        return text
+
+
+def _parse_rest_filter(col: str, expr: str) -> Tuple[str, str, Any]:
+    """'eq.abc' -> (col, 'eq', 'abc'); 'in.(a,b)' -> (col, 'in', {'a', 'b'})."""
+    op, _, raw = str(expr).partition(".")
+    if op not in _OPS:
+        raise ValueError(f"Unsupported PostgREST filter {col}={expr!r}")
+    if op == "in":
+        values = {_parse_rest_value(v.strip().strip('"')) for v in raw.strip("()").split(",") if v}
+        return col, op, values | {str(v) for v in values}
+    value = _parse_rest_value(raw)
+    return col, op, value
+
+
+def _parse_rest_order(order: Optional[str]) -> List[Tuple[str, bool]]:
+    if not order:
+        return []
+    out = []
+    for part in order.split(","):
+        col, _, direction = part.partition(".")
+        out.append((col, direction.startswith("desc")))
+    return out
+
+
+__all__ = ["LocalSupabase", "LocalSupabaseSyncClient", "LocalResponse"]
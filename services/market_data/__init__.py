@@ -1,17 +1,40 @@
-from .ingestion_service import MarketDataIngestionService
-from .provider_factory import get_provider, get_default_provider
-from .base_provider import BaseMarketDataProvider, OHLCVRecord
-from .yfinance_provider import YFinanceProvider
-from .alpha_vantage_provider import AlphaVantageProvider
-from .scheduler import start_scheduler, stop_scheduler, trigger_sync_now
+"""
+Market data ingestion package.
+
+Exports resolve lazily (PEP 562): importing one provider or the batch types
+does not pull in yfinance, requests or the APScheduler-based scheduler.
+"""
+import importlib
+# Submodule -> names it exports through ``services.market_data``
+_EXPORTS = {
+    "ingestion_service": ("MarketDataIngestionService",),
+    "provider_factory": ("get_provider", "get_default_provider"),
+    "base_provider": ("BaseMarketDataProvider", "OHLCVRecord", "OHLCVBatch"),
+    "yfinance_provider": ("YFinanceProvider",),
+    "alpha_vantage_provider": ("AlphaVantageProvider",),
+    "replay_provider": ("ReplayProvider",),
+    "scheduler": ("start_scheduler", "stop_scheduler", "trigger_sync_now"),
+}
+_EXPORT_SOURCE = {name: module for module, names in _EXPORTS.items() for name in names}
+def __getattr__(name):
+    module = _EXPORT_SOURCE.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORT_SOURCE))
 __all__ = [
     "MarketDataIngestionService",
     "get_provider",
     "get_default_provider",
     "BaseMarketDataProvider",
     "OHLCVRecord",
+    "OHLCVBatch",
     "YFinanceProvider",
     "AlphaVantageProvider",
+    "ReplayProvider",
     "start_scheduler",
     "stop_scheduler",
     "trigger_sync_now",
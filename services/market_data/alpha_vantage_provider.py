@@ -1,8 +1,9 @@
 import os
 import logging
 from datetime import datetime
+import numpy as np
 import requests
-from .base_provider import BaseMarketDataProvider, OHLCVRecord
+from .base_provider import BaseMarketDataProvider, OHLCVBatch
 from .rate_limiter import RateLimiter
 from services.secrets_helper import get_secret
 logger = logging.getLogger(__name__)
@@ -61,13 +62,13 @@ class AlphaVantageProvider(BaseMarketDataProvider):
             f"[alpha_vantage] Provider initialised "
             f"({calls_per_minute} calls/min limit)."
         )
-    def fetch_ohlcv(
+    def fetch_batch(
         self,
         ticker: str,
         start: str,
         end: str,
         interval: str = "1d"
-    ) -> list[OHLCVRecord]:
+    ) -> OHLCVBatch:
         """
         Fetch OHLCV data from Alpha Vantage.
         Note: Alpha Vantage returns full history regardless of start/end.
@@ -78,7 +79,9 @@ class AlphaVantageProvider(BaseMarketDataProvider):
             end:      End date as YYYY-MM-DD string.
             interval: Data frequency. Default '1d'.
         Returns:
-            List of OHLCVRecord objects filtered to start→end range.
+            OHLCVBatch filtered to start→end range, sorted ascending.
+        Alpha Vantage has no multi-symbol endpoint, so fetch_ohlcv_batch
+        uses the base class loop (each call goes through the rate limiter).
         """
         function = FUNCTION_MAP.get(interval)
         if not function:
@@ -126,41 +129,44 @@ class AlphaVantageProvider(BaseMarketDataProvider):
                 f"[alpha_vantage] No time series data in response for {ticker}. "
                 f"Keys found: {list(data.keys())}"
             )
-            return []
-        records = []
+            return OHLCVBatch.empty(ticker, interval, self.provider_name)
+        dates, prices, volumes = [], [], []
         for dt_str, values in time_series.items():
             date_only = dt_str[:10]  # Handles both date and datetime strings
             # Filter to requested window
             if date_only < start or date_only > end:
                 continue
             try:
-                record = OHLCVRecord(
-                    ticker=ticker,
-                    date=date_only,
-                    interval=interval,
-                    open=float(values.get("1. open", 0)),
-                    high=float(values.get("2. high", 0)),
-                    low=float(values.get("3. low", 0)),
-                    close=float(values.get("4. close", 0)),
-                    adj_close=(
-                        float(values["5. adjusted close"])
-                        if "5. adjusted close" in values else None
-                    ),
-                    volume=int(float(values.get("6. volume", values.get("5. volume", 0)))),
-                    provider=self.provider_name,
-                )
-                records.append(record)
+                row = [
+                    float(values.get("1. open", 0)),
+                    float(values.get("2. high", 0)),
+                    float(values.get("3. low", 0)),
+                    float(values.get("4. close", 0)),
+                    float(values.get("5. adjusted close", "nan")),
+                ]
+                volume = int(float(values.get("6. volume", values.get("5. volume", 0))))
             except Exception as e:
                 logger.warning(
                     f"[alpha_vantage] Skipping row {dt_str} for {ticker}: {e}"
                 )
                 continue
+            dates.append(date_only)
+            prices.append(row)
+            volumes.append(volume)
         # Alpha Vantage returns newest-first; sort ascending
-        records.sort(key=lambda r: r.date)
+        order = np.argsort(np.asarray(dates, dtype=object), kind="stable")
+        batch = OHLCVBatch(
+            ticker=ticker,
+            interval=interval,
+            provider=self.provider_name,
+            dates=np.asarray(dates, dtype=object)[order],
+            prices=np.asarray(prices, dtype=np.float64).reshape(-1, 5)[order],
+            volume=np.asarray(volumes, dtype=np.int64)[order],
+        )
         logger.info(
-            f"[alpha_vantage] Fetched {len(records)} records for {ticker}."
+            f"[alpha_vantage] Fetched {len(batch)} records for {ticker}."
         )
-        return records
+        return batch
     def is_available(self) -> bool:
         """Validate API key with a minimal request."""
         try:
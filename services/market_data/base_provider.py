@@ -1,7 +1,9 @@
 import logging
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
-from typing import Optional
+from dataclasses import dataclass, field
+from typing import Iterable, Optional, Union
+import numpy as np
+import pandas as pd
 logger = logging.getLogger(__name__)
 @dataclass
 class OHLCVRecord:
@@ -16,31 +18,199 @@ class OHLCVRecord:
     adj_close: Optional[float]
     volume: int
     provider: str
+# Column order of OHLCVBatch.prices
+PRICE_FIELDS = ("open", "high", "low", "close", "adj_close")
+@dataclass
+class OHLCVBatch:
+    """
+    Columnar OHLCV bars for one ticker -- the native provider return type.
+    Prices live in a single (n, 5) float64 matrix (columns PRICE_FIELDS, a
+    missing adj_close is NaN) and volume in an int64 array, so a multi-year
+    history is three arrays instead of thousands of OHLCVRecord objects.
+    ``to_frame()`` wraps the matrix without copying it.
+    """
+    ticker: str
+    interval: str
+    provider: str
+    dates: np.ndarray       # object array of date / ISO-8601 strings, ascending
+    prices: np.ndarray      # float64, shape (n, 5)
+    volume: np.ndarray      # int64, shape (n,)
+    def __post_init__(self):
+        self.dates = np.asarray(self.dates, dtype=object)
+        self.prices = np.asarray(self.prices, dtype=np.float64).reshape(-1, len(PRICE_FIELDS))
+        self.volume = np.asarray(self.volume, dtype=np.int64)
+        if not (len(self.dates) == len(self.prices) == len(self.volume)):
+            raise ValueError(
+                f"OHLCVBatch field lengths differ for {self.ticker}: "
+                f"{len(self.dates)} dates, {len(self.prices)} prices, {len(self.volume)} volumes"
+            )
+    def __len__(self) -> int:
+        return len(self.dates)
+    # Per-field views (no copies)
+    @property
+    def open(self) -> np.ndarray:
+        return self.prices[:, 0]
+    @property
+    def high(self) -> np.ndarray:
+        return self.prices[:, 1]
+    @property
+    def low(self) -> np.ndarray:
+        return self.prices[:, 2]
+    @property
+    def close(self) -> np.ndarray:
+        return self.prices[:, 3]
+    @property
+    def adj_close(self) -> np.ndarray:
+        return self.prices[:, 4]
+    # ------------------------------------------------------------------
+    # Construction
+    # ------------------------------------------------------------------
+    @classmethod
+    def empty(cls, ticker: str, interval: str, provider: str) -> "OHLCVBatch":
+        return cls(ticker, interval, provider, np.empty(0, dtype=object),
+                   np.empty((0, len(PRICE_FIELDS))), np.empty(0, dtype=np.int64))
+    @classmethod
+    def from_records(cls, records: list[OHLCVRecord]) -> "OHLCVBatch":
+        """Build a batch from OHLCVRecord objects (all for the same ticker)."""
+        if not records:
+            raise ValueError("from_records needs at least one record")
+        first = records[0]
+        prices = np.array(
+            [[r.open, r.high, r.low, r.close, np.nan if r.adj_close is None else r.adj_close]
+             for r in records],
+            dtype=np.float64,
+        )
+        return cls(first.ticker, first.interval, first.provider,
+                   [r.date for r in records], prices, [r.volume for r in records])
+    def filter_dates(self, start: str, end: str) -> "OHLCVBatch":
+        """Bars whose date (first 10 chars) lies in [start, end]."""
+        day = np.array([d[:10] for d in self.dates], dtype=object)
+        mask = (day >= start) & (day <= end)
+        if mask.all():
+            return self
+        return OHLCVBatch(self.ticker, self.interval, self.provider,
+                          self.dates[mask], self.prices[mask], self.volume[mask])
+    # ------------------------------------------------------------------
+    # Conversion
+    # ------------------------------------------------------------------
+    def to_frame(self) -> pd.DataFrame:
+        """
+        DataFrame indexed by timestamp with PRICE_FIELDS + volume columns.
+        The price columns share memory with ``prices``.
+        """
+        frame = pd.DataFrame(self.prices, index=pd.to_datetime(self.dates),
+                             columns=list(PRICE_FIELDS), copy=False)
+        frame["volume"] = self.volume
+        frame.index.name = "date"
+        return frame
+    def to_arrow(self):
+        """pyarrow Table with one column per field (requires pyarrow)."""
+        import pyarrow as pa
+        columns = {"date": pa.array(self.dates.tolist(), type=pa.string())}
+        for i, name in enumerate(PRICE_FIELDS):
+            columns[name] = pa.array(self.prices[:, i], from_pandas=True)
+        columns["volume"] = pa.array(self.volume)
+        return pa.table(columns)
+    def to_records(self) -> list[OHLCVRecord]:
+        """Row-wise OHLCVRecord view, for callers of the old list API."""
+        adj = [None if v != v else v for v in self.adj_close.tolist()]
+        return [
+            OHLCVRecord(self.ticker, d, self.interval, o, h, l, c, a, v, self.provider)
+            for d, o, h, l, c, a, v in zip(
+                self.dates.tolist(), self.open.tolist(), self.high.tolist(),
+                self.low.tolist(), self.close.tolist(), adj, self.volume.tolist(),
+            )
+        ]
+    def to_upsert_rows(self, asset_id: str) -> list[dict]:
+        """
+        price_history rows for Supabase. Columns are converted to Python
+        scalars with one ``tolist()`` each rather than per value.
+        """
+        adj = [None if v != v else v for v in self.adj_close.tolist()]
+        return [
+            {
+                "asset_id": asset_id,
+                "source": self.provider,
+                "interval": self.interval,
+                "price_date": d,
+                "open": o,
+                "high": h,
+                "low": l,
+                "close": c,
+                "adjusted_close": a,
+                "volume": v,
+            }
+            for d, o, h, l, c, a, v in zip(
+                self.dates.tolist(), self.open.tolist(), self.high.tolist(),
+                self.low.tolist(), self.close.tolist(), adj, self.volume.tolist(),
+            )
+        ]
+def as_batch(data: Union[OHLCVBatch, list[OHLCVRecord]]) -> Optional[OHLCVBatch]:
+    """Normalise a provider result (batch or legacy record list) to a batch; None if empty."""
+    if isinstance(data, OHLCVBatch):
+        return data if len(data) else None
+    return OHLCVBatch.from_records(data) if data else None
 class BaseMarketDataProvider(ABC):
     """
     Abstract base class for all market data providers.
-    Every provider must implement fetch_ohlcv and return
-    a list of OHLCVRecord objects -- normalised and provider-agnostic.
+    Every provider must implement fetch_batch and return an OHLCVBatch --
+    columnar, normalised and provider-agnostic. fetch_ohlcv (list of
+    OHLCVRecord) and fetch_ohlcv_batch (many tickers) build on it.
     """
     provider_name: str = "base"
     @abstractmethod
-    def fetch_ohlcv(
+    def fetch_batch(
         self,
         ticker: str,
         start: str,          # YYYY-MM-DD
         end: str,            # YYYY-MM-DD
         interval: str = "1d"
+    ) -> OHLCVBatch:
+        """
+        Fetch OHLCV data for a ticker between start and end dates.
+        Returns an OHLCVBatch sorted ascending by date.
+        """
+        pass
+    def fetch_ohlcv(
+        self,
+        ticker: str,
+        start: str,
+        end: str,
+        interval: str = "1d"
     ) -> list[OHLCVRecord]:
         """
         Fetch OHLCV data for a ticker between start and end dates.
         Returns a list of OHLCVRecord objects.
         """
-        pass
+        return self.fetch_batch(ticker, start, end, interval).to_records()
+    def fetch_ohlcv_batch(
+        self,
+        tickers: Iterable[str],
+        start: str,
+        end: str,
+        interval: str = "1d"
+    ) -> dict[str, OHLCVBatch]:
+        """
+        Fetch several tickers over the same window.
+        The default fetches them one at a time; providers with a
+        multi-symbol endpoint override this. Tickers that fail or return
+        no data are left out of the result, so callers can retry them.
+        """
+        results = {}
+        for ticker in dict.fromkeys(tickers):
+            try:
+                batch = self.fetch_batch(ticker, start, end, interval)
+            except Exception as e:
+                logger.warning(f"[{self.provider_name}] Batch fetch failed for {ticker}: {e}")
+                continue
+            if len(batch):
+                results[ticker] = batch
+        return results
     @abstractmethod
     def is_available(self) -> bool:
         """
         Perform a health check to verify that the provider is reachable and any credentials are valid.
-        
+
         Returns:
             True if the provider is reachable and credentials (if any) are valid, False otherwise.
         """
@@ -55,12 +225,12 @@ class BaseMarketDataProvider(ABC):
     ) -> list[OHLCVRecord]:
         """
         Fetch OHLCV data for a ticker from this provider, falling back to an alternative provider if this provider fails.
-        
+
         If this provider raises an exception during fetch and a `fallback` provider is supplied, this function logs a warning and returns the result from `fallback.fetch_ohlcv(...)`. If no `fallback` is provided, the original exception is propagated.
-        
+
         Parameters:
             fallback (Optional[BaseMarketDataProvider]): Provider to use if this provider's fetch fails.
-        
+
         Returns:
             list[OHLCVRecord]: OHLCV records for the requested ticker, date range, and interval.
         """
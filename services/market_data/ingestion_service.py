@@ -11,8 +11,8 @@ Designed to be idempotent -- safe to run multiple times.
 import logging
 import re
 from datetime import date, datetime, timedelta
-from typing import Optional
-from .base_provider import BaseMarketDataProvider, OHLCVRecord
+from typing import Optional, Union
+from .base_provider import BaseMarketDataProvider, OHLCVBatch, OHLCVRecord, as_batch
 from .provider_factory import get_default_provider
 logger = logging.getLogger(__name__)
 
@@ -115,58 +115,74 @@ class MarketDataIngestionService:
             logger.info(f"[Ingestion] Skipping options ticker: {ticker}")
             return 0
         provider = self._resolve_provider()
-        end_date = end or date.today().strftime("%Y-%m-%d")
-        start_date = start or self._default_start_date()
-        asset_id = self._get_or_create_asset(ticker)
-        if force_full or interval not in DAILY_INTERVALS:
-            # Intraday: always fetch the full requested range (gap detection
-            # would require timestamp-level comparison which is not implemented)
-            missing_ranges = [(start_date, end_date)]
-        else:
-            missing_ranges = self._get_missing_ranges(
-                asset_id, ticker, interval, start_date, end_date
-            )
-        if not missing_ranges:
-            logger.info(f"[Ingestion] {ticker} is up to date. Nothing to fetch.")
+        plan = self._plan_fetch(ticker, interval, start, end, force_full)
+        if plan is None:
             return 0
-        # Collapse all gaps into a single range to minimise yfinance API calls.
-        # yfinance already returns only trading days so fetching a wider range
-        # that covers all gaps costs nothing extra but avoids rate-limit issues
-        # from many small requests.
-        if len(missing_ranges) > 1:
-            missing_ranges = [(missing_ranges[0][0], missing_ranges[-1][1])]
-        total_upserted = 0
-        for range_start, range_end in missing_ranges:
-            logger.info(
-                f"[Ingestion] Fetching {ticker} | {range_start} -> {range_end}"
-            )
-            try:
-                records = provider.fetch_ohlcv(ticker, range_start, range_end, interval)
-            except Exception as fetch_err:
-                # If the primary provider fails mid-sync, try the fallback once
-                fallback = self._get_fallback_provider(provider)
-                if fallback:
-                    logger.warning(
-                        f"[Ingestion] Primary provider failed for {ticker}: {fetch_err}. "
-                        f"Retrying with {fallback.provider_name}."
-                    )
-                    try:
-                        records = fallback.fetch_ohlcv(ticker, range_start, range_end, interval)
-                    except Exception as fallback_err:
-                        logger.warning(
-                            f"[Ingestion] Fallback also failed for {ticker}: {fallback_err}. Skipping."
-                        )
-                        continue
-                else:
-                    logger.warning(f"[Ingestion] Skipping {ticker}: {fetch_err}")
-                    continue
-            if records:
-                upserted = self._upsert_records(asset_id, records)
-                total_upserted += upserted
+        asset_id, (range_start, range_end) = plan
+        batch = self._fetch_batch(provider, ticker, range_start, range_end, interval)
+        total_upserted = self._upsert_records(asset_id, batch) if batch is not None else 0
         logger.info(
             f"[Ingestion] {ticker}: {total_upserted} records upserted."
         )
         return total_upserted
+    def sync_tickers(
+        self,
+        tickers: list[str],
+        interval: str = "1d",
+        force_full: bool = False,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+    ) -> dict[str, int]:
+        """
+        Sync many tickers, fetching those that share a fetch window in one
+        multi-symbol provider call (fetch_ohlcv_batch). On a nightly run most
+        tickers need the same range (last sync -> today), so hundreds of
+        assets become a handful of downloads. Tickers missing from a batch
+        response are retried one at a time, with the fallback provider.
+        ``start`` / ``end`` override the default backfill window as in
+        sync_ticker.
+
+        Returns:
+            dict[str, int]: Mapping from ticker to the number of records upserted.
+        """
+        provider = self._resolve_provider()
+        results: dict[str, int] = {}
+        groups: dict[tuple[str, str], dict[str, str]] = {}
+        for ticker in dict.fromkeys(tickers):
+            if _is_options_ticker(ticker):
+                logger.info(f"[Ingestion] Skipping options ticker: {ticker}")
+                results[ticker] = 0
+                continue
+            try:
+                plan = self._plan_fetch(ticker, interval, start, end, force_full)
+            except Exception as e:
+                logger.exception(f"[Ingestion] Failed to plan sync for {ticker}: {e}")
+                results[ticker] = 0
+                continue
+            if plan is None:
+                results[ticker] = 0
+                continue
+            asset_id, fetch_range = plan
+            groups.setdefault(fetch_range, {})[ticker] = asset_id
+        for (range_start, range_end), assets in groups.items():
+            logger.info(
+                f"[Ingestion] Fetching {len(assets)} tickers | {range_start} -> {range_end}"
+            )
+            try:
+                batches = provider.fetch_ohlcv_batch(list(assets), range_start, range_end, interval)
+            except Exception as e:
+                logger.warning(f"[Ingestion] Batch fetch failed: {e}. Fetching tickers individually.")
+                batches = {}
+            for ticker, asset_id in assets.items():
+                try:
+                    batch = batches.get(ticker)
+                    if batch is None:
+                        batch = self._fetch_batch(provider, ticker, range_start, range_end, interval)
+                    results[ticker] = self._upsert_records(asset_id, batch) if batch is not None else 0
+                except Exception as e:
+                    logger.exception(f"[Ingestion] Failed to sync {ticker}: {e}")
+                    results[ticker] = 0
+        return results
     def sync_portfolio(
         self,
         portfolio_id: str,
@@ -194,18 +210,7 @@ class MarketDataIngestionService:
         logger.info(
             f"[Ingestion] Syncing {len(tickers)} tickers for portfolio {portfolio_id}."
         )
-        results = {}
-        for ticker in tickers:
-            try:
-                results[ticker] = self.sync_ticker(
-                    ticker, interval=interval, force_full=force_full
-                )
-            except Exception as e:
-                logger.exception(
-                    f"[Ingestion] Failed to sync {ticker}: {e}"
-                )
-                results[ticker] = 0
-        return results
+        return self.sync_tickers(tickers, interval=interval, force_full=force_full)
     def sync_all_assets(
         self,
         interval: str = "1d",
@@ -223,19 +228,75 @@ class MarketDataIngestionService:
         """
         assets = self._get_all_assets()
         logger.info(f"[Ingestion] Nightly sync: {len(assets)} assets.")
-        results = {}
-        for asset in assets:
-            ticker = asset.get("symbol")
-            if not ticker:
-                continue
-            try:
-                results[ticker] = self.sync_ticker(
-                    ticker, interval=interval, force_full=force_full
+        tickers = [asset["symbol"] for asset in assets if asset.get("symbol")]
+        return self.sync_tickers(tickers, interval=interval, force_full=force_full)
+    # ------------------------------------------------------------------
+    # Fetch planning
+    # ------------------------------------------------------------------
+    def _plan_fetch(
+        self,
+        ticker: str,
+        interval: str,
+        start: Optional[str],
+        end: Optional[str],
+        force_full: bool,
+    ) -> Optional[tuple[str, tuple[str, str]]]:
+        """
+        Resolve the asset and the single date range to fetch for a ticker.
+
+        Returns:
+            (asset_id, (start, end)), or None if the ticker is up to date.
+        """
+        end_date = end or date.today().strftime("%Y-%m-%d")
+        start_date = start or self._default_start_date()
+        asset_id = self._get_or_create_asset(ticker)
+        if force_full or interval not in DAILY_INTERVALS:
+            # Intraday: always fetch the full requested range (gap detection
+            # would require timestamp-level comparison which is not implemented)
+            missing_ranges = [(start_date, end_date)]
+        else:
+            missing_ranges = self._get_missing_ranges(
+                asset_id, ticker, interval, start_date, end_date
+            )
+        if not missing_ranges:
+            logger.info(f"[Ingestion] {ticker} is up to date. Nothing to fetch.")
+            return None
+        # Collapse all gaps into a single range to minimise yfinance API calls.
+        # yfinance already returns only trading days so fetching a wider range
+        # that covers all gaps costs nothing extra but avoids rate-limit issues
+        # from many small requests.
+        return asset_id, (missing_ranges[0][0], missing_ranges[-1][1])
+    def _fetch_batch(
+        self,
+        provider: BaseMarketDataProvider,
+        ticker: str,
+        start: str,
+        end: str,
+        interval: str,
+    ) -> Optional[OHLCVBatch]:
+        """Fetch one ticker, retrying once with the fallback provider. None if nothing was fetched."""
+        logger.info(
+            f"[Ingestion] Fetching {ticker} | {start} -> {end}"
+        )
+        try:
+            return as_batch(provider.fetch_batch(ticker, start, end, interval))
+        except Exception as fetch_err:
+            # If the primary provider fails mid-sync, try the fallback once
+            fallback = self._get_fallback_provider(provider)
+            if fallback:
+                logger.warning(
+                    f"[Ingestion] Primary provider failed for {ticker}: {fetch_err}. "
+                    f"Retrying with {fallback.provider_name}."
                 )
-            except Exception as e:
-                logger.exception(f"[Ingestion] Nightly sync failed for {ticker}: {e}")
-                results[ticker] = 0
-        return results
+                try:
+                    return as_batch(fallback.fetch_batch(ticker, start, end, interval))
+                except Exception as fallback_err:
+                    logger.warning(
+                        f"[Ingestion] Fallback also failed for {ticker}: {fallback_err}. Skipping."
+                    )
+                    return None
+            logger.warning(f"[Ingestion] Skipping {ticker}: {fetch_err}")
+            return None
     # ------------------------------------------------------------------
     # Gap detection
     # ------------------------------------------------------------------
@@ -271,11 +332,13 @@ class MarketDataIngestionService:
         ranges = []
         range_start = missing[0]
         prev = missing[0]
+        prev_dt = date.fromisoformat(prev)
         for d in missing[1:]:
-            d_dt = datetime.strptime(d, "%Y-%m-%d").date()
-            p_dt = datetime.strptime(prev, "%Y-%m-%d").date()
+            d_dt = date.fromisoformat(d)
             # Allow up to 3-day gap (weekend bridge) before splitting ranges
-            if (d_dt - p_dt).days <= 3:
+            gap = (d_dt - prev_dt).days
+            prev_dt = d_dt
+            if gap <= 3:
                 prev = d
             else:
                 ranges.append((range_start, prev))
@@ -325,36 +388,25 @@ class MarketDataIngestionService:
     def _upsert_records(
         self,
         asset_id: str,
-        records: list[OHLCVRecord],
+        records: Union[OHLCVBatch, list[OHLCVRecord]],
     ) -> int:
         """
-        Upsert OHLCV records for an asset into the price_history table.
-        
-        Each record is written as a row; conflicts on (asset_id, source, interval, price_date) update the existing row.
-        
+        Upsert OHLCV bars for an asset into the price_history table.
+
+        Accepts an OHLCVBatch (built into rows column-wise) or, for older
+        callers, a list of OHLCVRecord objects. Conflicts on
+        (asset_id, source, interval, price_date) update the existing row.
+
         Returns:
         	int: Number of rows upserted.
-        
+
         Raises:
         	Exception: If the database upsert operation fails.
-        Upsert a list of OHLCVRecord objects into price_history.
-        Uses ON CONFLICT (asset_id, source, interval, price_date) DO UPDATE.
         """
-        rows = [
-            {
-                "asset_id": asset_id,
-                "source": r.provider,
-                "interval": r.interval,
-                "price_date": r.date,
-                "open": r.open,
-                "high": r.high,
-                "low": r.low,
-                "close": r.close,
-                "adjusted_close": r.adj_close,
-                "volume": r.volume,
-            }
-            for r in records
-        ]
+        batch = as_batch(records)
+        if batch is None:
+            return 0
+        rows = batch.to_upsert_rows(asset_id)
         try:
             self.supabase.table("price_history").upsert(
                 rows,
@@ -3,17 +3,19 @@ import logging
 from .base_provider import BaseMarketDataProvider
 from .yfinance_provider import YFinanceProvider
 from .alpha_vantage_provider import AlphaVantageProvider
+from .replay_provider import ReplayProvider
 from services.secrets_helper import get_secret
 logger = logging.getLogger(__name__)
 PROVIDER_REGISTRY = {
     "yfinance": YFinanceProvider,
     "alpha_vantage": AlphaVantageProvider,
+    "replay": ReplayProvider,
 }
 def get_provider(name: str = "yfinance", **kwargs) -> BaseMarketDataProvider:
     """
     Return an initialised provider instance by name.
     Args:
-        name:    Provider name. Options: 'yfinance', 'alpha_vantage'.
+        name:    Provider name. Options: 'yfinance', 'alpha_vantage', 'replay'.
         **kwargs: Passed directly to the provider constructor.
                   e.g. get_provider('alpha_vantage', api_key='your_key')
     Returns:
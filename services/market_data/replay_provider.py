@@ -0,0 +1,242 @@
+"""
+Replay market data provider.
+Serves OHLCV bars from recordings on disk or, for tickers without a
+recording, from a deterministic synthetic generator -- so the ingestion
+pipeline can be exercised and benchmarked without network access or
+rate limits. Latency and failures are injected on request.
+Recordings live under ``<root>/<interval>/<TICKER>.parquet`` (or ``.csv``)
+in the ``OHLCVBatch.to_frame()`` layout; ``save_batch`` / ``record`` write
+them from any live provider.
+"""
+import logging
+import os
+import time
+import zlib
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterable, Optional
+import numpy as np
+import pandas as pd
+from .base_provider import BaseMarketDataProvider, OHLCVBatch, PRICE_FIELDS
+logger = logging.getLogger(__name__)
+# Synthetic histories start here, so overlapping windows see the same bars
+SYNTHETIC_EPOCH = "2000-01-03"
+# Resampling rule per coarser-than-daily interval (last bar of each period)
+RESAMPLE_RULES = {"1wk": "W-FRI", "1mo": "ME"}
+class ReplayProviderError(ConnectionError):
+    """Injected provider failure."""
+def _ticker_seed(ticker: str, seed: int) -> int:
+    return zlib.crc32(ticker.encode("utf-8")) ^ (seed * 0x9E3779B1 & 0xFFFFFFFF)
+def synthetic_batch(ticker: str, start: str, end: str, interval: str = "1d",
+                    seed: int = 0) -> OHLCVBatch:
+    """
+    Deterministic GBM bars for a ticker over business days in [start, end].
+    The path is always generated from SYNTHETIC_EPOCH, so a ticker's bar on a
+    given date does not depend on the requested window. Drift, volatility,
+    starting price and volume scale are drawn per ticker.
+    """
+    if interval not in ("1d",) and interval not in RESAMPLE_RULES:
+        raise ValueError(f"Synthetic replay supports daily-or-coarser intervals, not {interval!r}")
+    days = _business_days(end)
+    if len(days) == 0:
+        return OHLCVBatch.empty(ticker, interval, ReplayProvider.provider_name)
+    key = _ticker_seed(ticker, seed)
+    rng = np.random.default_rng(key)
+    mu = rng.uniform(-0.05, 0.15) / 252
+    sigma = rng.uniform(0.15, 0.45) / np.sqrt(252)
+    s0 = rng.uniform(10.0, 500.0)
+    base_volume = rng.uniform(1e5, 5e6)
+    z = rng.standard_normal(len(days))
+    # The close path needs every draw since the epoch; the intrabar noise
+    # only needs the window, so it comes from a second stream (one uint64
+    # per uniform) that is advanced straight to the first requested bar.
+    lo = 0 if interval in RESAMPLE_RULES else int(np.searchsorted(days, start))
+    log_close = np.log(s0) + np.cumsum(mu - 0.5 * sigma ** 2 + sigma * z)
+    close = np.exp(log_close[lo:])
+    prev_close = np.exp(log_close[lo - 1]) if lo else s0
+    prev_close = np.concatenate(([prev_close], close[:-1]))
+    noise = np.random.PCG64([key, 1])
+    noise.advance(3 * lo)
+    u = np.random.Generator(noise).random((len(close), 3))
+    open_ = prev_close * np.exp(0.5 * sigma * (u[:, 0] - 0.5))
+    high = np.maximum(open_, close) * np.exp(-0.5 * sigma * np.log1p(-u[:, 1]))
+    low = np.minimum(open_, close) * np.exp(0.5 * sigma * np.log1p(-u[:, 2]))
+    volume = (base_volume * (1.0 + np.abs(z[lo:]))).astype(np.int64)
+    prices = np.column_stack([open_, high, low, close, close])
+    if interval in RESAMPLE_RULES:
+        frame = pd.DataFrame(prices, index=pd.DatetimeIndex(days), columns=list(PRICE_FIELDS))
+        frame["volume"] = volume
+        frame = frame.resample(RESAMPLE_RULES[interval]).agg(
+            {"open": "first", "high": "max", "low": "min", "close": "last",
+             "adj_close": "last", "volume": "sum"}
+        ).dropna().loc[start:end]
+        return OHLCVBatch(ticker, interval, ReplayProvider.provider_name,
+                          frame.index.strftime("%Y-%m-%d"), frame[list(PRICE_FIELDS)].to_numpy(),
+                          frame["volume"].to_numpy())
+    return OHLCVBatch(ticker, interval, ReplayProvider.provider_name, days[lo:], prices, volume)
+@lru_cache(maxsize=8)
+def _business_days(end: str) -> np.ndarray:
+    """'YYYY-MM-DD' strings for every weekday from SYNTHETIC_EPOCH to end."""
+    return pd.bdate_range(SYNTHETIC_EPOCH, end).strftime("%Y-%m-%d").to_numpy(dtype=object)
+def _recording_path(root: Path, ticker: str, interval: str) -> Optional[Path]:
+    for suffix in (".parquet", ".csv"):
+        path = root / interval / f"{ticker}{suffix}"
+        if path.exists():
+            return path
+    return None
+def load_batch(path: Path, ticker: str, interval: str) -> OHLCVBatch:
+    """Read a recording written by save_batch."""
+    if path.suffix == ".parquet":
+        frame = pd.read_parquet(path)
+    else:
+        frame = pd.read_csv(path, index_col=0)
+    frame = frame.sort_index()
+    dates = [str(d) for d in frame.index]
+    if interval in ("1d",) or interval in RESAMPLE_RULES:
+        dates = [d[:10] for d in dates]
+    return OHLCVBatch(ticker, interval, ReplayProvider.provider_name, dates,
+                      frame[list(PRICE_FIELDS)].to_numpy(dtype=np.float64),
+                      frame["volume"].to_numpy(dtype=np.int64))
+def save_batch(batch: OHLCVBatch, root) -> Path:
+    """Write a batch as a recording (Parquet when pyarrow is available, else CSV)."""
+    directory = Path(root) / batch.interval
+    directory.mkdir(parents=True, exist_ok=True)
+    frame = batch.to_frame()
+    frame.index = batch.dates
+    try:
+        path = directory / f"{batch.ticker}.parquet"
+        frame.to_parquet(path)
+    except ImportError:
+        path = directory / f"{batch.ticker}.csv"
+        frame.to_csv(path)
+    return path
+class ReplayProvider(BaseMarketDataProvider):
+    """
+    Offline provider for tests and benchmarks.
+    Args:
+        path:       Recording root (default: ATLAS_REPLAY_DIR, if set)
+        synthetic:  Generate bars for tickers without a recording. If False,
+                    such tickers raise ValueError.
+        latency:    Seconds slept per request. A fetch_ohlcv_batch call is one
+                    request however many tickers it covers, as with the
+                    yfinance multi-symbol download.
+        error_rate: Probability that a request fails. Single-ticker requests
+                    raise ReplayProviderError; in a multi-symbol request each
+                    ticker is dropped independently, as yfinance does.
+        seed:       Seeds both the synthetic paths and the failure draws.
+    """
+    provider_name = "replay"
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        synthetic: bool = True,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        seed: int = 0,
+    ):
+        if not 0.0 <= error_rate <= 1.0:
+            raise ValueError(f"error_rate must be in [0, 1], got {error_rate}")
+        root = path or os.environ.get("ATLAS_REPLAY_DIR")
+        self.root = Path(root) if root else None
+        self.synthetic = synthetic
+        self.latency = latency
+        self.error_rate = error_rate
+        self.seed = seed
+        self._failures = np.random.default_rng(seed)
+        self._recordings: dict[tuple[str, str], OHLCVBatch] = {}
+        self.reset_stats()
+        logger.info(
+            f"[replay] Provider initialised (root={self.root}, synthetic={synthetic}, "
+            f"latency={latency}s, error_rate={error_rate})."
+        )
+    # ------------------------------------------------------------------
+    # Provider API
+    # ------------------------------------------------------------------
+    def fetch_batch(
+        self,
+        ticker: str,
+        start: str,
+        end: str,
+        interval: str = "1d"
+    ) -> OHLCVBatch:
+        """Serve one ticker as a single request."""
+        self._request()
+        if self._fails():
+            self._stats["failures"] += 1
+            raise ReplayProviderError(f"Injected failure fetching {ticker}")
+        return self._serve(ticker, start, end, interval)
+    def fetch_ohlcv_batch(
+        self,
+        tickers: Iterable[str],
+        start: str,
+        end: str,
+        interval: str = "1d"
+    ) -> dict[str, OHLCVBatch]:
+        """Serve many tickers as one request; failed or empty tickers are left out."""
+        self._request()
+        results = {}
+        for ticker in dict.fromkeys(tickers):
+            if self._fails():
+                self._stats["failures"] += 1
+                continue
+            try:
+                batch = self._serve(ticker, start, end, interval)
+            except ValueError as e:
+                logger.warning(f"[replay] {e}")
+                continue
+            if len(batch):
+                results[ticker] = batch
+        return results
+    def is_available(self) -> bool:
+        return True
+    # ------------------------------------------------------------------
+    # Recording
+    # ------------------------------------------------------------------
+    def record(
+        self,
+        source: BaseMarketDataProvider,
+        tickers: Iterable[str],
+        start: str,
+        end: str,
+        interval: str = "1d",
+    ) -> list[Path]:
+        """Fetch tickers from a live provider and save them under this provider's root."""
+        if self.root is None:
+            raise ValueError("ReplayProvider.record needs a recording path")
+        paths = []
+        for ticker, batch in source.fetch_ohlcv_batch(list(tickers), start, end, interval).items():
+            paths.append(save_batch(batch, self.root))
+            self._recordings.pop((ticker, interval), None)
+        return paths
+    # ------------------------------------------------------------------
+    # Stats
+    # ------------------------------------------------------------------
+    def stats(self) -> dict[str, int]:
+        return dict(self._stats)
+    def reset_stats(self):
+        self._stats = {"requests": 0, "failures": 0, "bars_served": 0}
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+    def _request(self):
+        self._stats["requests"] += 1
+        if self.latency:
+            time.sleep(self.latency)
+    def _fails(self) -> bool:
+        return self.error_rate > 0 and self._failures.random() < self.error_rate
+    def _serve(self, ticker: str, start: str, end: str, interval: str) -> OHLCVBatch:
+        recording = self._recording(ticker, interval)
+        if recording is not None:
+            batch = recording.filter_dates(start, end)
+        elif self.synthetic:
+            batch = synthetic_batch(ticker, start, end, interval, seed=self.seed)
+        else:
+            raise ValueError(f"No recording for {ticker} ({interval}) under {self.root}")
+        self._stats["bars_served"] += len(batch)
+        return batch
+    def _recording(self, ticker: str, interval: str) -> Optional[OHLCVBatch]:
+        key = (ticker, interval)
+        if key not in self._recordings:
+            path = _recording_path(self.root, ticker, interval) if self.root else None
+            self._recordings[key] = load_batch(path, ticker, interval) if path else None
+        return self._recordings[key]
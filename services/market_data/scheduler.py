@@ -7,7 +7,10 @@ while also supporting on-demand triggers (e.g. when a new
 asset is added to a portfolio).
 Start this as part of Atlas's startup sequence:
     from services.market_data.scheduler import start_scheduler
-    start_scheduler(supabase_client)
+    start_scheduler(supabase_client, job_store=get_job_store())
+With a job store the nightly run only enqueues a ``sync_all_assets`` job
+(services/jobs) and a worker process does the work, so the web process
+never spends a thread on it. Without one it runs in-process as before.
 """
 import logging
 from apscheduler.schedulers.background import BackgroundScheduler
@@ -16,7 +19,8 @@ from .ingestion_service import MarketDataIngestionService
 logger = logging.getLogger(__name__)
 _scheduler: BackgroundScheduler | None = None
 _ingestion_service: MarketDataIngestionService | None = None
-def start_scheduler(supabase_client, provider=None):
+_job_store = None
+def start_scheduler(supabase_client, provider=None, job_store=None):
     """
     Initialise and start the background scheduler.
     Guards against duplicate starts — safe to call from atlas_app.py on
@@ -27,8 +31,10 @@ def start_scheduler(supabase_client, provider=None):
     Args:
         supabase_client: Initialised Supabase client.
         provider:        Optional market data provider override.
+        job_store:       Optional services.jobs JobStore; the nightly sync is
+                         queued there for a worker process instead of run here.
     """
-    global _scheduler, _ingestion_service
+    global _scheduler, _ingestion_service, _job_store
     # Process-level guard: skip if a scheduler is already running.
     if _scheduler is not None and _scheduler.running:
         logger.debug("[Scheduler] Already running. Skipping re-initialisation.")
@@ -37,6 +43,7 @@ def start_scheduler(supabase_client, provider=None):
         supabase_client=supabase_client,
         provider=provider,
     )
+    _job_store = job_store
     _scheduler = BackgroundScheduler(timezone="Africa/Johannesburg")
     # Nightly sync - Mon to Sat at 18:00 SAST
     # Runs 6 days to catch Saturday corrections on some data providers
@@ -54,12 +61,13 @@ def start_scheduler(supabase_client, provider=None):
     return _scheduler
 def stop_scheduler():
     """Gracefully shut down the scheduler and reset module state."""
-    global _scheduler, _ingestion_service
+    global _scheduler, _ingestion_service, _job_store
     if _scheduler and _scheduler.running:
         _scheduler.shutdown(wait=False)
         logger.info("[Scheduler] Scheduler stopped and state reset.")
     _scheduler = None
     _ingestion_service = None
+    _job_store = None
 def trigger_sync_now(ticker: str | None = None, portfolio_id: str | None = None):
     """
     Trigger an immediate market data sync for a single ticker or for all tickers in a portfolio.
@@ -90,6 +98,15 @@ def trigger_sync_now(ticker: str | None = None, portfolio_id: str | None = None)
     return {}
 def _run_nightly_sync():
     """Internal job function for the nightly scheduler."""
+    if _job_store is not None:
+        try:
+            from services.jobs import ensure_worker
+            job = _job_store.enqueue("sync_all_assets", {"interval": "1d"})
+            ensure_worker()
+            logger.info(f"[Scheduler] Nightly sync queued as job {job.id}.")
+            return
+        except Exception as e:
+            logger.error(f"[Scheduler] Could not queue nightly sync, running in-process: {e}")
     logger.info("[Scheduler] Nightly sync starting...")
     try:
         results = _ingestion_service.sync_all_assets(interval="1d")
@@ -1,8 +1,9 @@
 import logging
 from datetime import datetime, timedelta
+import numpy as np
 import pandas as pd
 import yfinance as yf
-from .base_provider import BaseMarketDataProvider, OHLCVRecord
+from .base_provider import BaseMarketDataProvider, OHLCVBatch, PRICE_FIELDS
 logger = logging.getLogger(__name__)
 # Map Atlas interval strings to yfinance interval strings
 INTERVAL_MAP = {
@@ -32,45 +33,78 @@ class YFinanceProvider(BaseMarketDataProvider):
     provider_name = "yfinance"
     def __init__(self):
         logger.info("[yfinance] Provider initialised.")
-    def fetch_ohlcv(
+    def fetch_batch(
         self,
         ticker: str,
         start: str,
         end: str,
         interval: str = "1d"
-    ) -> list[OHLCVRecord]:
+    ) -> OHLCVBatch:
         """
         Fetch OHLCV data from Yahoo Finance for a ticker over a date range.
-        
+
         Parameters:
             ticker (str): Ticker symbol (use '.JO' suffix for JSE tickers, e.g. 'NPN.JO').
             start (str): Start date as 'YYYY-MM-DD' (inclusive).
             end (str): End date as 'YYYY-MM-DD' (inclusive).
             interval (str): Data frequency key (see INTERVAL_MAP); defaults to '1d'.
-        
-        Notes:
-            The function treats the provided `end` as inclusive when querying Yahoo Finance.
-            For daily-or-coarser intervals the record `date` stores only the 'YYYY-MM-DD' date;
-            for intraday intervals the record `date` stores a full ISO-8601 timestamp so
-            multiple bars on the same day do not collide.
-        
-        Returns:
-            list[OHLCVRecord]: OHLCV records for the requested range, sorted ascending by date/datetime.
-        Fetch OHLCV data from Yahoo Finance.
-        Args:
-            ticker:   Ticker symbol. Use .JO suffix for JSE (e.g. 'NPN.JO').
-            start:    Start date as YYYY-MM-DD string (inclusive).
-            end:      End date as YYYY-MM-DD string (inclusive).
-            interval: Data frequency. Default '1d'.
-        Returns:
-            List of OHLCVRecord objects, sorted ascending by date/datetime.
+
         Notes:
             yfinance treats `end` as exclusive, so we add one calendar day
             to ensure the final requested date is always included.
-            For intraday intervals the full ISO-8601 timestamp is preserved
-            in OHLCVRecord.date so bars from the same day don't collide on
-            the (asset_id, source, interval, price_date) unique key.
+            For daily-or-coarser intervals the batch dates are 'YYYY-MM-DD';
+            for intraday intervals the full ISO-8601 timestamp is preserved so
+            bars from the same day don't collide on the
+            (asset_id, source, interval, price_date) unique key.
+
+        Returns:
+            OHLCVBatch: Bars for the requested range, sorted ascending by date/datetime.
+        """
+        raw = self._download(ticker, start, end, interval)
+        if raw.empty:
+            logger.warning(f"[yfinance] No data returned for {ticker}.")
+            return OHLCVBatch.empty(ticker, interval, self.provider_name)
+        # yfinance returns MultiIndex columns when auto_adjust=False
+        # Flatten if necessary
+        if isinstance(raw.columns, pd.MultiIndex):
+            raw.columns = raw.columns.get_level_values(0)
+        batch = self._frame_to_batch(raw, ticker, interval)
+        logger.info(
+            f"[yfinance] Fetched {len(batch)} records for {ticker}."
+        )
+        return batch
+    def fetch_ohlcv_batch(
+        self,
+        tickers,
+        start: str,
+        end: str,
+        interval: str = "1d"
+    ) -> dict[str, OHLCVBatch]:
+        """
+        Fetch many tickers with a single yf.download call.
+        Tickers with no rows in the window are left out of the result.
         """
+        tickers = list(dict.fromkeys(tickers))
+        if len(tickers) <= 1:
+            return super().fetch_ohlcv_batch(tickers, start, end, interval)
+        raw = self._download(tickers, start, end, interval, group_by="ticker")
+        results = {}
+        if raw.empty:
+            logger.warning(f"[yfinance] No data returned for batch of {len(tickers)} tickers.")
+            return results
+        present = set(raw.columns.get_level_values(0))
+        for ticker in tickers:
+            if ticker not in present:
+                continue
+            batch = self._frame_to_batch(raw[ticker], ticker, interval)
+            if len(batch):
+                results[ticker] = batch
+        logger.info(
+            f"[yfinance] Batch fetched {sum(len(b) for b in results.values())} records "
+            f"for {len(results)}/{len(tickers)} tickers."
+        )
+        return results
+    def _download(self, tickers, start: str, end: str, interval: str, **kwargs) -> pd.DataFrame:
         yf_interval = INTERVAL_MAP.get(interval)
         if not yf_interval:
             raise ValueError(
@@ -81,63 +115,54 @@ class YFinanceProvider(BaseMarketDataProvider):
         end_dt = datetime.strptime(end, "%Y-%m-%d") + timedelta(days=1)
         end_exclusive = end_dt.strftime("%Y-%m-%d")
         logger.info(
-            f"[yfinance] Fetching {ticker} | {start} -> {end} | {interval}"
+            f"[yfinance] Fetching {tickers} | {start} -> {end} | {interval}"
         )
         try:
-            raw = yf.download(
-                ticker,
+            return yf.download(
+                tickers,
                 start=start,
                 end=end_exclusive,
                 interval=yf_interval,
                 auto_adjust=False,   # Keep raw + adj_close separate
                 progress=False,
                 threads=False,
+                **kwargs,
             )
         except Exception as e:
-            logger.error(f"[yfinance] Download failed for {ticker}: {e}")
+            logger.error(f"[yfinance] Download failed for {tickers}: {e}")
             raise
-        if raw.empty:
-            logger.warning(f"[yfinance] No data returned for {ticker}.")
-            return []
-        # yfinance returns MultiIndex columns when auto_adjust=False
-        # Flatten if necessary
-        if isinstance(raw.columns, pd.MultiIndex):
-            raw.columns = raw.columns.get_level_values(0)
-        use_date_only = interval in DAILY_INTERVALS
-        records = []
-        for dt, row in raw.iterrows():
-            if isinstance(dt, pd.Timestamp):
-                if use_date_only:
-                    date_str = dt.strftime("%Y-%m-%d")
-                else:
-                    # Preserve full timestamp for intraday bars so that
-                    # multiple bars per day don't overwrite each other on upsert
-                    date_str = dt.isoformat()
-            else:
-                date_str = str(dt)[:10] if use_date_only else str(dt)
-            try:
-                record = OHLCVRecord(
-                    ticker=ticker,
-                    date=date_str,
-                    interval=interval,
-                    open=float(row.get("Open", 0)),
-                    high=float(row.get("High", 0)),
-                    low=float(row.get("Low", 0)),
-                    close=float(row.get("Close", 0)),
-                    adj_close=float(row["Adj Close"]) if "Adj Close" in row else None,
-                    volume=int(row.get("Volume", 0)),
-                    provider=self.provider_name,
-                )
-                records.append(record)
-            except Exception as e:
-                logger.warning(
-                    f"[yfinance] Skipping row {date_str} for {ticker}: {e}"
-                )
-                continue
-        logger.info(
-            f"[yfinance] Fetched {len(records)} records for {ticker}."
+    def _frame_to_batch(self, raw: pd.DataFrame, ticker: str, interval: str) -> OHLCVBatch:
+        """
+        Vectorised conversion of one ticker's yfinance frame.
+        Rows without a volume (or with no prices at all, as on dates only
+        other tickers in a multi-symbol download traded) are dropped.
+        """
+        columns = {"open": "Open", "high": "High", "low": "Low",
+                   "close": "Close", "adj_close": "Adj Close"}
+        prices = np.column_stack([
+            raw[col].to_numpy(dtype=np.float64) if col in raw.columns
+            else np.full(len(raw), np.nan if field == "adj_close" else 0.0)
+            for field, col in columns.items()
+        ]) if len(raw) else np.empty((0, len(PRICE_FIELDS)))
+        volume = raw["Volume"].to_numpy(dtype=np.float64) if "Volume" in raw.columns else np.zeros(len(raw))
+        keep = np.isfinite(volume) & ~np.isnan(prices[:, :4]).all(axis=1)
+        index = raw.index[keep]
+        if not isinstance(index, pd.DatetimeIndex):
+            index = pd.DatetimeIndex(index)
+        if interval in DAILY_INTERVALS:
+            dates = index.strftime("%Y-%m-%d")
+        else:
+            # Preserve full timestamp for intraday bars so that
+            # multiple bars per day don't overwrite each other on upsert
+            dates = [ts.isoformat() for ts in index]
+        return OHLCVBatch(
+            ticker=ticker,
+            interval=interval,
+            provider=self.provider_name,
+            dates=np.asarray(dates, dtype=object),
+            prices=prices[keep],
+            volume=volume[keep].astype(np.int64),
         )
-        return records
     def is_available(self) -> bool:
         """Ping Yahoo Finance with a minimal request."""
         try:
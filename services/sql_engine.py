@@ -0,0 +1,455 @@
+"""
+ATLAS Terminal - Local SQL Engine
+=================================
+DuckDB over Parquet snapshots of the core Supabase tables, so the SQL
+Terminal can run exploratory queries without a REST round trip each time.
+
+    from services.sql_engine import get_sql_engine, get_snapshot_store
+
+    get_snapshot_store().refresh_from_supabase(client)   # nightly / on demand
+    get_snapshot_store().refresh_local_prices()          # replay price store
+
+    engine = get_sql_engine()
+    engine.route(sql)             # ('local', ...) or ('remote', reason)
+    engine.query(sql)             # same dict shape as the page's remote path
+    engine.explain(sql)           # DuckDB plan as text
+
+Snapshots live under data/cache/sql (ATLAS_SQL_SNAPSHOTS), one
+``<table>.parquet`` per table plus ``manifest.json`` with row counts and
+refresh times. The snapshot version is a digest of the manifest; query
+results are cached on (normalised SQL, version), so re-running a query is
+a dictionary lookup until the next refresh.
+
+On each new version the snapshots are loaded into an in-memory DuckDB
+database (schema ``public``, so Supabase SQL such as ``::numeric`` casts,
+``STRING_AGG(... ORDER BY ...)`` and information_schema queries run
+unchanged) and file access is then switched off for user queries.
+
+``route`` sends a query to Supabase when DuckDB is missing, when it
+references a table with no snapshot, or - if ``push_down_stale`` - when
+any referenced snapshot is older than ``max_age``.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+try:
+    import duckdb
+    DUCKDB_AVAILABLE = True
+except ImportError:
+    DUCKDB_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+_ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_SNAPSHOT_DIR = Path(os.environ.get("ATLAS_SQL_SNAPSHOTS", _ROOT / "data" / "cache" / "sql"))
+# Core tables copied locally (all keyed on ``id``)
+SNAPSHOT_TABLES = (
+    "assets", "positions", "transactions", "price_history",
+    "portfolio_equity_curve", "account_snapshots", "sync_log",
+)
+LOCAL_PRICES_TABLE = "local_prices"
+SNAPSHOT_MAX_AGE = 24 * 3600
+RESULT_CACHE_SIZE = 128
+PAGE_SIZE = 1000
+
+# Statements that touch files, extensions or settings -- never allowed locally
+_LOCAL_KW = re.compile(
+    r"\b(ATTACH|DETACH|COPY|EXPORT|IMPORT|INSTALL|LOAD|PRAGMA|SET|RESET|CALL|USE|CHECKPOINT|VACUUM)\b",
+    re.IGNORECASE,
+)
+_TOKENS = re.compile(r"'(?:[^']|'')*'|\"(?:[^\"]|\"\")*\"|--[^\n]*|/\*.*?\*/|\s+", re.DOTALL)
+_TABLE_REF = re.compile(r"\b(?:FROM|JOIN)\s+((?:\"[^\"]+\"|\w+)(?:\.(?:\"[^\"]+\"|\w+))*)", re.IGNORECASE)
+_CTE_NAME = re.compile(r"(?:\bWITH(?:\s+RECURSIVE)?|,)\s*(\"[^\"]+\"|\w+)\s+AS\s*\(", re.IGNORECASE)
+# Calls whose arguments use FROM as a keyword (EXTRACT(YEAR FROM ts), ...)
+_FROM_ARG_CALLS = re.compile(r"\b(EXTRACT|SUBSTRING|TRIM|OVERLAY|POSITION)\s*\(", re.IGNORECASE)
+_DISTINCT_FROM = re.compile(r"\bIS\s+(NOT\s+)?DISTINCT\s+FROM\b", re.IGNORECASE)
+_ISO_DATE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+_ISO_TIMESTAMP = re.compile(r"^\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}(:\d{2}(\.\d+)?)?(Z|[+-]\d{2}(:?\d{2})?)?$")
+
+
+# ---------------------------------------------------------------------------
+# SQL text helpers
+# ---------------------------------------------------------------------------
+
+def normalize_sql(sql: str) -> str:
+    """
+    Canonical form of a query for cache keys: comments dropped, whitespace
+    collapsed and the trailing semicolon removed. String literals and quoted
+    identifiers are kept verbatim.
+    """
+    out, pos = [], 0
+    for m in _TOKENS.finditer(sql):
+        if m.start() > pos:
+            out.append(sql[pos:m.start()])
+        token = m.group(0)
+        if token[0] in "'\"":
+            out.append(token)
+        elif out and out[-1] != " ":
+            out.append(" ")
+        pos = m.end()
+    out.append(sql[pos:])
+    return "".join(out).strip().rstrip(";").strip()
+
+
+def _strip_literals(sql: str) -> str:
+    """Query text with string literals and comments blanked (quoted identifiers kept)."""
+    return _TOKENS.sub(lambda m: m.group(0) if m.group(0)[0] == '"' else " ", sql)
+
+
+def _blank_from_args(text: str) -> str:
+    """Blank the arguments of EXTRACT(... FROM ...) style calls and IS DISTINCT FROM."""
+    text = _DISTINCT_FROM.sub(" <> ", text)
+    m = _FROM_ARG_CALLS.search(text)
+    while m:
+        depth, i = 1, m.end()
+        while i < len(text) and depth:
+            depth += {"(": 1, ")": -1}.get(text[i], 0)
+            i += 1
+        text = text[:m.end()] + " " * (i - 1 - m.end()) + text[i - 1:]
+        m = _FROM_ARG_CALLS.search(text, m.end())
+    return text
+
+
+def referenced_tables(sql: str) -> set:
+    """Lower-cased table names after FROM / JOIN, minus CTE names and schema prefixes."""
+    text = _blank_from_args(_strip_literals(sql))
+    ctes = {m.group(1).strip('"').lower() for m in _CTE_NAME.finditer(text)}
+    tables = set()
+    for m in _TABLE_REF.finditer(text):
+        parts = [p.strip('"') for p in re.findall(r"\"[^\"]+\"|\w+", m.group(1))]
+        name = parts[-1].lower()
+        if name not in ctes:
+            tables.add(name if len(parts) == 1 or parts[-2].lower() != "information_schema"
+                       else f"information_schema.{name}")
+    return tables
+
+
+# ---------------------------------------------------------------------------
+# Snapshots
+# ---------------------------------------------------------------------------
+
+def _typed_snapshot(rows: List[Dict[str, Any]]) -> pd.DataFrame:
+    """
+    DataFrame from PostgREST rows with ISO date / timestamp strings parsed
+    and nested JSON kept as text, so Parquet carries real column types.
+    """
+    frame = pd.DataFrame(rows)
+    for col in frame.columns:
+        values = frame[col].dropna()
+        if values.empty or not (pd.api.types.is_object_dtype(frame[col])
+                                or pd.api.types.is_string_dtype(frame[col])):
+            continue
+        if values.map(lambda v: isinstance(v, (dict, list))).any():
+            frame[col] = frame[col].map(lambda v: None if v is None else json.dumps(v, default=str))
+            continue
+        if not values.map(lambda v: isinstance(v, str)).all():
+            continue
+        if values.str.match(_ISO_DATE).all():
+            frame[col] = pd.to_datetime(frame[col], errors="coerce").dt.date
+        elif values.str.match(_ISO_TIMESTAMP).all():
+            frame[col] = pd.to_datetime(frame[col], utc=True, errors="coerce").dt.tz_localize(None)
+    return frame
+
+
+class SnapshotStore:
+    """
+    Parquet snapshots plus a manifest of row counts and refresh times.
+
+    Args:
+        root: Snapshot directory
+    """
+
+    MANIFEST = "manifest.json"
+
+    def __init__(self, root: Optional[Path] = None):
+        self.root = Path(root) if root is not None else DEFAULT_SNAPSHOT_DIR
+        self._lock = threading.Lock()
+
+    @property
+    def manifest(self) -> Dict[str, Dict[str, Any]]:
+        path = self.root / self.MANIFEST
+        try:
+            return json.loads(path.read_text())["tables"]
+        except (OSError, ValueError, KeyError):
+            return {}
+
+    @property
+    def version(self) -> str:
+        """Digest of the manifest; changes whenever any table is refreshed."""
+        payload = json.dumps(self.manifest, sort_keys=True).encode()
+        return hashlib.sha1(payload).hexdigest()[:16]
+
+    def tables(self) -> List[str]:
+        return sorted(t for t in self.manifest if self.path(t).exists())
+
+    def path(self, table: str) -> Path:
+        return self.root / f"{table}.parquet"
+
+    def age(self, table: str, now: Optional[float] = None) -> Optional[float]:
+        """Seconds since ``table`` was refreshed, or None if it has no snapshot."""
+        entry = self.manifest.get(table)
+        if entry is None:
+            return None
+        return (time.time() if now is None else now) - entry["refreshed_at"]
+
+    def stale_tables(self, tables: Iterable[str], max_age: float = SNAPSHOT_MAX_AGE,
+                     now: Optional[float] = None) -> List[str]:
+        """Tables among ``tables`` whose snapshot is older than ``max_age``."""
+        ages = {t: self.age(t, now) for t in tables}
+        return sorted(t for t, a in ages.items() if a is not None and a > max_age)
+
+    def write(self, table: str, frame: pd.DataFrame, source: str, at: Optional[float] = None) -> Path:
+        """Atomically replace one table's snapshot and record it in the manifest."""
+        if not re.match(r"^[a-z_][a-z0-9_]*$", table):
+            raise ValueError(f"Invalid snapshot table name {table!r}")
+        with self._lock:
+            self.root.mkdir(parents=True, exist_ok=True)
+            path = self.path(table)
+            tmp = path.with_suffix(".parquet.tmp")
+            frame.to_parquet(tmp, index=False)
+            os.replace(tmp, path)
+            manifest = self.manifest
+            manifest[table] = {"rows": int(len(frame)), "columns": [str(c) for c in frame.columns],
+                               "source": source, "refreshed_at": time.time() if at is None else at}
+            tmp = self.root / f"{self.MANIFEST}.tmp"
+            tmp.write_text(json.dumps({"tables": manifest}, indent=1, sort_keys=True))
+            os.replace(tmp, self.root / self.MANIFEST)
+        return path
+
+    def refresh_from_supabase(self, client: Any, tables: Sequence[str] = SNAPSHOT_TABLES,
+                              page_size: int = PAGE_SIZE) -> Dict[str, Any]:
+        """
+        Copy tables from Supabase, keyset-paged on ``id``.
+
+        Returns:
+            {table: row count} for tables copied, {table: error string} for failures
+        """
+        from services.view_reader import PostgrestSource
+
+        source = PostgrestSource(client)
+        results: Dict[str, Any] = {}
+        for table in tables:
+            try:
+                rows, after = [], None
+                while True:
+                    page = source.fetch_page(table, ["*"], [], ("id",), after, page_size)
+                    rows.extend(page)
+                    if len(page) < page_size:
+                        break
+                    after = [page[-1]["id"]]
+                self.write(table, _typed_snapshot(rows), source="supabase")
+                results[table] = len(rows)
+            except Exception as exc:
+                logger.warning("Snapshot of %s failed: %s", table, exc)
+                results[table] = f"{type(exc).__name__}: {exc}"
+        return results
+
+    def refresh_local_prices(self, root: Optional[str] = None, interval: str = "1d") -> int:
+        """
+        Snapshot the local price store (replay recordings under
+        ``<root>/<interval>/<TICKER>.parquet``, default ATLAS_REPLAY_DIR) as
+        one long ``local_prices`` table: symbol, price_date, OHLC, adj_close,
+        volume.
+        """
+        from services.market_data.replay_provider import load_batch
+
+        root = root or os.environ.get("ATLAS_REPLAY_DIR")
+        directory = Path(root) / interval if root else None
+        if directory is None or not directory.is_dir():
+            return 0
+        frames = []
+        for path in sorted(directory.glob("*.parquet")) + sorted(directory.glob("*.csv")):
+            batch = load_batch(path, path.stem, interval)
+            frame = batch.to_frame().reset_index().rename(columns={"date": "price_date"})
+            frame.insert(0, "symbol", batch.ticker)
+            frames.append(frame)
+        if not frames:
+            return 0
+        prices = pd.concat(frames, ignore_index=True)
+        self.write(LOCAL_PRICES_TABLE, prices, source=f"replay:{directory}")
+        return len(prices)
+
+
+# ---------------------------------------------------------------------------
+# Engine
+# ---------------------------------------------------------------------------
+
+class LocalSQLEngine:
+    """
+    DuckDB query engine over a SnapshotStore with a result cache.
+
+    Results are shared between sessions through the cache: treat returned
+    frames as read-only.
+
+    Args:
+        store: Snapshot store (defaults to the process-wide one)
+        cache_size: Maximum cached results
+    """
+
+    def __init__(self, store: Optional[SnapshotStore] = None, cache_size: int = RESULT_CACHE_SIZE):
+        self.store = store or get_snapshot_store()
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[Tuple[str, str], pd.DataFrame]" = OrderedDict()
+        self._con = None
+        self._con_version: Optional[str] = None
+        self._lock = threading.RLock()
+        self.stats = {"hits": 0, "misses": 0, "loads": 0}
+
+    @property
+    def available(self) -> bool:
+        return DUCKDB_AVAILABLE and bool(self.store.tables())
+
+    # ------------------------------------------------------------------
+    # Routing
+    # ------------------------------------------------------------------
+
+    def route(self, sql: str, push_down_stale: bool = True,
+              max_age: float = SNAPSHOT_MAX_AGE) -> Tuple[str, str]:
+        """
+        Where ``sql`` should run: ('local', detail) or ('remote', reason).
+        """
+        if not DUCKDB_AVAILABLE:
+            return "remote", "duckdb is not installed"
+        snapshots = set(self.store.tables())
+        if not snapshots:
+            return "remote", "no local snapshots"
+        tables = {t for t in referenced_tables(sql) if not t.startswith("information_schema.")}
+        missing = sorted(tables - snapshots)
+        if missing:
+            return "remote", f"no snapshot of {', '.join(missing)}"
+        stale = self.store.stale_tables(tables, max_age)
+        if stale and push_down_stale:
+            return "remote", f"snapshot stale: {', '.join(stale)}"
+        return "local", f"snapshot {self.store.version}" + (f" (stale: {', '.join(stale)})" if stale else "")
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def query(self, sql: str, use_cache: bool = True) -> Dict[str, Any]:
+        """
+        Run a read-only query locally.
+
+        Returns:
+            {"ok", "df", "rows", "ms", "err", "engine", "cached", "version"},
+            the SQL Terminal's result shape
+        """
+        t0 = time.perf_counter()
+        version = self.store.version
+        key = (normalize_sql(sql), version)
+        try:
+            self._check(sql)
+            with self._lock:
+                df = self._cache.get(key) if use_cache else None
+                cached = df is not None
+                if cached:
+                    self._cache.move_to_end(key)
+                    self.stats["hits"] += 1
+                else:
+                    self.stats["misses"] += 1
+                    df = self._connection(version).execute(key[0]).df()
+                    self._cache[key] = df
+                    while len(self._cache) > self.cache_size:
+                        self._cache.popitem(last=False)
+            return {"ok": True, "df": df, "rows": len(df), "ms": int((time.perf_counter() - t0) * 1000),
+                    "err": None, "engine": "duckdb", "cached": cached, "version": version}
+        except Exception as exc:
+            return {"ok": False, "df": pd.DataFrame(), "rows": 0, "ms": int((time.perf_counter() - t0) * 1000),
+                    "err": str(exc), "engine": "duckdb", "cached": False, "version": version}
+
+    def explain(self, sql: str, analyze: bool = False) -> str:
+        """DuckDB physical plan (with timings if ``analyze``) as text."""
+        self._check(sql)
+        with self._lock:
+            con = self._connection(self.store.version)
+            rows = con.execute(f"EXPLAIN {'ANALYZE ' if analyze else ''}{normalize_sql(sql)}").fetchall()
+        return "\n\n".join(str(r[-1]) for r in rows)
+
+    def schema(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Snapshot tables and columns, in the SQL Terminal schema-browser format."""
+        result = self.query(
+            "SELECT table_name, column_name, data_type, is_nullable FROM information_schema.columns "
+            "WHERE table_schema = 'public' ORDER BY table_name, ordinal_position"
+        )
+        schema: Dict[str, List[Dict[str, Any]]] = {}
+        for row in result["df"].itertuples(index=False):
+            schema.setdefault(row.table_name, []).append(
+                {"name": row.column_name, "type": row.data_type, "nullable": row.is_nullable == "YES"})
+        return schema
+
+    def clear_cache(self):
+        with self._lock:
+            self._cache.clear()
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _check(sql: str):
+        m = _LOCAL_KW.search(_strip_literals(sql))
+        if m:
+            raise ValueError(f"'{m.group(0).upper()}' is not permitted in the local SQL engine.")
+
+    def _connection(self, version: str):
+        """Connection holding the snapshot tables for ``version`` (rebuilt on change)."""
+        if not DUCKDB_AVAILABLE:
+            raise RuntimeError("duckdb is not installed")
+        if self._con is not None and self._con_version == version:
+            return self._con
+        con = duckdb.connect(database=":memory:")
+        con.execute("CREATE SCHEMA IF NOT EXISTS public")
+        con.execute("SET schema = 'public'")
+        for table in self.store.tables():
+            path = str(self.store.path(table)).replace("'", "''")
+            try:
+                con.execute(f'CREATE TABLE public."{table}" AS SELECT * FROM read_parquet(\'{path}\')')
+            except Exception as exc:
+                logger.warning("Skipping snapshot %s: %s", table, exc)
+        # User queries run against the loaded tables only
+        con.execute("SET enable_external_access = false")
+        con.execute("SET lock_configuration = true")
+        if self._con is not None:
+            self._con.close()
+        self._con, self._con_version = con, version
+        self._cache.clear()
+        self.stats["loads"] += 1
+        return con
+
+
+# ---------------------------------------------------------------------------
+# Process-wide instances
+# ---------------------------------------------------------------------------
+
+_store: Optional[SnapshotStore] = None
+_engine: Optional[LocalSQLEngine] = None
+_instance_lock = threading.Lock()
+
+
+def get_snapshot_store() -> SnapshotStore:
+    global _store
+    with _instance_lock:
+        if _store is None:
+            _store = SnapshotStore()
+        return _store
+
+
+def get_sql_engine() -> LocalSQLEngine:
+    global _engine
+    store = get_snapshot_store()
+    with _instance_lock:
+        if _engine is None:
+            _engine = LocalSQLEngine(store)
+        return _engine
@@ -25,7 +25,7 @@ from __future__ import annotations
 import pandas as pd
 import streamlit as st
 
-from services.supabase_views import fetch_view
+from services.supabase_views import fetch_view, read_view
 
 
 # ---------------------------------------------------------------------------
@@ -115,13 +115,15 @@ def get_portfolio_returns(
     call render_data_diagnostic().
     """
     required_cols = {"price_date", "daily_return"}
+    columns = ["price_date", "daily_return"]
 
-    # Primary: FIFO transaction-based NAV
-    df = fetch_view("vw_portfolio_nav_daily")
+    # Primary: FIFO transaction-based NAV (only the date range asked for,
+    # incrementally refreshed)
+    df = read_view("vw_portfolio_nav_daily", columns=columns, start=start_date, end=end_date)
 
     # Fallback: legacy position-snapshot view
     if df.empty or not required_cols.issubset(df.columns):
-        df = fetch_view("vw_portfolio_returns_daily")
+        df = read_view("vw_portfolio_returns_daily", columns=columns, start=start_date, end=end_date)
 
     if df.empty or not required_cols.issubset(df.columns):
         return None
@@ -135,11 +137,6 @@ def get_portfolio_returns(
 
     returns = df['daily_return'].dropna()
 
-    if start_date:
-        returns = returns[returns.index >= pd.to_datetime(start_date)]
-    if end_date:
-        returns = returns[returns.index <= pd.to_datetime(end_date)]
-
     if len(returns) < 2:
         return None
 
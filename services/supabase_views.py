@@ -2,6 +2,10 @@
 ATLAS Terminal — Supabase View Fetcher
 Shared helper used by all frontend page modules that pull from pre-computed
 Supabase analytics views (vw_portfolio_home, vw_quant_dashboard, etc.).
+
+fetch_view() suits the small single-snapshot views.  The daily time-series
+views go through read_view(), which projects columns, filters server side
+and refreshes incrementally (services.view_reader).
 """
 from __future__ import annotations
 
@@ -9,6 +13,11 @@ import streamlit as st
 import pandas as pd
 
 
+def _view_missing(exc: Exception) -> bool:
+    err_str = str(exc)
+    return "PGRST205" in err_str or "schema cache" in err_str
+
+
 @st.cache_data(ttl=300)  # 5-minute cache — views are pre-computed, not live
 def fetch_view(view_name: str) -> pd.DataFrame:
     """
@@ -36,9 +45,44 @@ def fetch_view(view_name: str) -> pd.DataFrame:
             df[col] = pd.to_numeric(df[col], errors='ignore')
         return df
     except Exception as e:
-        err_str = str(e)
         # PGRST205 = view not yet created in Supabase schema cache
-        if "PGRST205" in err_str or "schema cache" in err_str:
+        if _view_missing(e):
+            st.warning(
+                f"**{view_name}** not found in Supabase. "
+                "Run `migrations/supabase_views.sql` in the Supabase SQL Editor to create the analytics views."
+            )
+        else:
+            st.warning(f"⚠️ View `{view_name}` failed: {type(e).__name__}: {e}")
+        return pd.DataFrame()
+
+
+def read_view(
+    view_name: str,
+    columns: list[str] | None = None,
+    filters: list[tuple] | None = None,
+    start=None,
+    end=None,
+) -> pd.DataFrame:
+    """
+    Projected, date-ranged read of a registered time-series view.
+
+    Only the requested columns and rows cross the wire, and repeat calls
+    fetch just the rows at or after the cached high-water date.
+
+    Args:
+        view_name: View registered in services.view_reader.VIEW_SCHEMAS.
+        columns: Columns to return (the view key is always included).
+        filters: (column, op, value) triples applied server side.
+        start, end: Inclusive date bounds on the view's date column.
+
+    Returns:
+        Typed pd.DataFrame ordered by date, or an empty DataFrame on error.
+    """
+    try:
+        from services.view_reader import get_view_reader
+        return get_view_reader().read(view_name, columns=columns, filters=filters, start=start, end=end)
+    except Exception as e:
+        if _view_missing(e):
             st.warning(
                 f"**{view_name}** not found in Supabase. "
                 "Run `migrations/supabase_views.sql` in the Supabase SQL Editor to create the analytics views."
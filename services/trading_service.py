@@ -339,6 +339,18 @@ class TradingService:
         except Exception as exc:
             return TradeResult(success=False, message=str(exc))
 
+    def submit_orders(
+        self,
+        orders: List[Dict],
+        time_in_force: str = "day",
+    ) -> List[TradeResult]:
+        """Submit a batch of market orders ({"symbol", "qty", "side"} dicts,
+        e.g. ``SizedBook.orders()``) in the given order; one result each."""
+        return [
+            self.submit_market_order(o["symbol"], o["qty"], o["side"], time_in_force=time_in_force)
+            for o in orders
+        ]
+
     # ------------------------------------------------------------------
     # Order management
     # ------------------------------------------------------------------
@@ -0,0 +1,599 @@
+"""
+ATLAS Terminal - Streaming View Reader
+======================================
+Typed, incremental reads of the pre-computed Supabase analytics views.
+
+``fetch_view`` pulls ``select("*")`` for a whole view and its cache is
+dropped every five minutes, so the ever-growing daily series
+(vw_portfolio_nav_daily, vw_portfolio_returns_daily) are re-downloaded in
+full on every page load. This reader instead:
+
+1. projects only the requested columns (plus the view's key),
+2. pushes filters and date ranges to the server,
+3. pages with keyset pagination (``key > last key ORDER BY key LIMIT n``,
+   never OFFSET) and streams each page into Arrow record batches typed by
+   the view's ``ViewSchema``,
+4. keeps the result in memory and as parquet under data/cache/views, and
+   on later reads fetches only rows at or after the cached high-water mark.
+
+    from services.view_reader import get_view_reader
+
+    df = get_view_reader().read("vw_portfolio_nav_daily",
+                                columns=["price_date", "daily_return"],
+                                start="2025-01-01")
+
+The last cached day is always re-fetched (rows ``>=`` the high-water date
+replace the cached tail), so a view that restates today's NAV intraday is
+picked up without a full reload.
+
+Sources are pluggable: ``PostgrestSource`` drives a supabase-py client (or
+``services.local_supabase.LocalSupabase``), ``SQLSource`` runs generated,
+parameterised SQL over any DB-API connection (a local Postgres through
+psycopg, or sqlite3 in tests).
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+_ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_CACHE_DIR = Path(os.environ.get("ATLAS_VIEW_CACHE", _ROOT / "data" / "cache" / "views"))
+DEFAULT_PAGE_SIZE = 1000
+# Views are refreshed by the nightly sync; polling more often than this is wasted traffic
+MIN_REFRESH_INTERVAL = 300.0
+FILTER_OPS = ("eq", "neq", "gt", "gte", "lt", "lte", "in")
+_IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+
+# ---------------------------------------------------------------------------
+# Schemas
+# ---------------------------------------------------------------------------
+
+@dataclass(frozen=True)
+class ViewSchema:
+    """
+    Column types and paging key of one view.
+
+    Args:
+        name: View name
+        columns: Column -> type, one of date / timestamp / float64 / int64 /
+            string / bool, in the view's column order
+        key: Unique, ordered key used for keyset paging
+        high_water: Monotone column (normally the leading key) behind
+            incremental refresh, or None to re-read the view every time
+        page_size: Rows per request
+    """
+    name: str
+    columns: Dict[str, str]
+    key: Tuple[str, ...]
+    high_water: Optional[str] = None
+    page_size: int = DEFAULT_PAGE_SIZE
+
+    def __post_init__(self):
+        for col in (self.name, *self.columns):
+            if not _IDENTIFIER.match(col):
+                raise ValueError(f"Invalid identifier {col!r}")
+        missing = [c for c in (*self.key, self.high_water) if c and c not in self.columns]
+        if missing:
+            raise ValueError(f"{self.name}: key columns {missing} not in schema")
+        if self.high_water and self.high_water != self.key[0]:
+            raise ValueError(f"{self.name}: high_water must be the leading key column")
+
+    def project(self, columns: Optional[Sequence[str]] = None) -> List[str]:
+        """Requested columns plus the key, in schema order."""
+        if columns is None:
+            return list(self.columns)
+        unknown = [c for c in columns if c not in self.columns]
+        if unknown:
+            raise ValueError(f"{self.name} has no columns {unknown}")
+        wanted = set(columns) | set(self.key)
+        return [c for c in self.columns if c in wanted]
+
+
+VIEW_SCHEMAS: Dict[str, ViewSchema] = {
+    # One row per (portfolio, day): the date alone is not a unique paging key
+    "vw_portfolio_nav_daily": ViewSchema(
+        "vw_portfolio_nav_daily",
+        {"portfolio_id": "string", "price_date": "date", "nav": "float64", "daily_return": "float64",
+         "position_count": "int64"},
+        key=("price_date", "portfolio_id"), high_water="price_date",
+    ),
+    # Aggregated across positions: one row per day
+    "vw_portfolio_returns_daily": ViewSchema(
+        "vw_portfolio_returns_daily",
+        {"price_date": "date", "portfolio_nav": "float64", "daily_return": "float64"},
+        key=("price_date",), high_water="price_date",
+    ),
+}
+
+
+def register_view(schema: ViewSchema) -> ViewSchema:
+    """Add or replace a view schema."""
+    VIEW_SCHEMAS[schema.name] = schema
+    return schema
+
+
+def _literal(value: Any, dtype: str) -> Any:
+    """Filter value in the wire format the view returns (ISO strings for dates)."""
+    if value is None:
+        return None
+    if dtype == "date":
+        return pd.Timestamp(value).date().isoformat()
+    if dtype == "timestamp":
+        return pd.Timestamp(value).isoformat()
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+# ---------------------------------------------------------------------------
+# Sources
+# ---------------------------------------------------------------------------
+
+class PostgrestSource:
+    """Pages from a supabase-py style fluent client (``client.table(v).select(...)``)."""
+
+    _METHODS = {"in": "in_"}
+
+    def __init__(self, client: Any):
+        self.client = client
+
+    def fetch_page(self, view: str, columns: Sequence[str], filters: Sequence[Tuple[str, str, Any]],
+                   key: Sequence[str], after: Optional[Sequence[Any]], limit: int) -> List[Dict[str, Any]]:
+        query = self.client.table(view).select(",".join(columns))
+        for col, op, value in filters:
+            query = getattr(query, self._METHODS.get(op, op))(col, value)
+        if after is not None:
+            if len(key) == 1:
+                query = query.gt(key[0], after[0])
+            else:
+                query = query.or_(self._keyset_clause(key, after))
+        for col in key:
+            query = query.order(col)
+        return query.limit(limit).execute().data or []
+
+    @staticmethod
+    def _keyset_clause(key: Sequence[str], after: Sequence[Any]) -> str:
+        """PostgREST ``or`` expression for (k1, ..., kn) > (v1, ..., vn)."""
+        def value(v):
+            return f'"{v}"' if isinstance(v, str) and re.search(r'[,.()":]', v) else str(v)
+
+        terms = []
+        for i, col in enumerate(key):
+            parts = [f"{k}.eq.{value(v)}" for k, v in zip(key[:i], after[:i])]
+            parts.append(f"{col}.gt.{value(after[i])}")
+            terms.append(parts[0] if len(parts) == 1 else f"and({','.join(parts)})")
+        return ",".join(terms)
+
+
+def _quote(identifier: str) -> str:
+    """Double-quoted SQL identifier (names are already checked against ViewSchema)."""
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+class SQLSource:
+    """
+    Pages from a DB-API connection with generated, parameterised SQL.
+
+    Args:
+        connection: Open DB-API connection (psycopg, sqlite3, ...)
+        paramstyle: 'qmark' (sqlite3) or 'format' (psycopg)
+    """
+
+    _OPS = {"eq": "=", "neq": "<>", "gt": ">", "gte": ">=", "lt": "<", "lte": "<="}
+
+    def __init__(self, connection: Any, paramstyle: str = "qmark"):
+        if paramstyle not in ("qmark", "format"):
+            raise ValueError(f"Unsupported paramstyle {paramstyle!r}")
+        self.connection = connection
+        self._mark = "?" if paramstyle == "qmark" else "%s"
+
+    def build_query(self, view: str, columns: Sequence[str], filters: Sequence[Tuple[str, str, Any]],
+                    key: Sequence[str], after: Optional[Sequence[Any]], limit: int) -> Tuple[str, List[Any]]:
+        where, params = [], []
+        for col, op, value in filters:
+            if op == "in":
+                values = list(value)
+                where.append(f'{_quote(col)} IN ({", ".join([self._mark] * len(values))})' if values else "1 = 0")
+                params.extend(values)
+            else:
+                where.append(f'{_quote(col)} {self._OPS[op]} {self._mark}')
+                params.append(value)
+        if after is not None:
+            lhs = ", ".join(_quote(c) for c in key)
+            rhs = ", ".join([self._mark] * len(key))
+            where.append(f"({lhs}) > ({rhs})" if len(key) > 1 else f"{lhs} > {rhs}")
+            params.extend(after)
+        sql = f'SELECT {", ".join(_quote(c) for c in columns)} FROM {_quote(view)}'
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += f' ORDER BY {", ".join(_quote(c) for c in key)} LIMIT {int(limit)}'
+        return sql, params
+
+    def fetch_page(self, view: str, columns: Sequence[str], filters: Sequence[Tuple[str, str, Any]],
+                   key: Sequence[str], after: Optional[Sequence[Any]], limit: int) -> List[Dict[str, Any]]:
+        sql, params = self.build_query(view, columns, filters, key, after, limit)
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute(sql, params)
+            names = [d[0] for d in cursor.description]
+            return [dict(zip(names, row)) for row in cursor.fetchall()]
+        finally:
+            cursor.close()
+
+
+# ---------------------------------------------------------------------------
+# Typed buffers
+# ---------------------------------------------------------------------------
+
+if PYARROW_AVAILABLE:
+    _ARROW_TYPES = {
+        "date": pa.date32(), "timestamp": pa.timestamp("us"), "float64": pa.float64(),
+        "int64": pa.int64(), "string": pa.string(), "bool": pa.bool_(),
+    }
+
+
+def _arrow_column(values: List[Any], dtype: str):
+    target = _ARROW_TYPES[dtype]
+    try:
+        return pa.array(values, type=target, from_pandas=True)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        pass
+    if dtype == "timestamp":
+        # Offsets ('...+00:00') are normalised to naive UTC
+        parsed = pd.to_datetime(pd.Series(values, dtype=object), utc=True, errors="coerce").dt.tz_localize(None)
+        return pa.array(parsed, type=target, from_pandas=True)
+    return pa.array(values, from_pandas=True).cast(target, safe=False)
+
+
+def _pandas_column(values: List[Any], dtype: str) -> pd.Series:
+    series = pd.Series(values, dtype=object)
+    if dtype in ("date", "timestamp"):
+        parsed = pd.to_datetime(series, utc=True, errors="coerce").dt.tz_localize(None)
+        return parsed.dt.normalize() if dtype == "date" else parsed
+    if dtype in ("float64", "int64"):
+        numeric = pd.to_numeric(series, errors="coerce")
+        return numeric.astype("Int64") if dtype == "int64" else numeric.astype("float64")
+    if dtype == "bool":
+        return series.astype("boolean")
+    return series.astype("string")
+
+
+class _PageBuffer:
+    """Accumulates pages as typed Arrow batches (pandas columns without pyarrow)."""
+
+    def __init__(self, schema: ViewSchema, columns: Sequence[str]):
+        self.schema = schema
+        self.columns = list(columns)
+        self._parts: List[Any] = []
+        self.rows = 0
+
+    def append(self, page: List[Dict[str, Any]]):
+        if not page:
+            return
+        data = {c: [row.get(c) for row in page] for c in self.columns}
+        if PYARROW_AVAILABLE:
+            arrays = [_arrow_column(data[c], self.schema.columns[c]) for c in self.columns]
+            self._parts.append(pa.RecordBatch.from_arrays(arrays, names=self.columns))
+        else:
+            self._parts.append(pd.DataFrame({c: _pandas_column(data[c], self.schema.columns[c])
+                                             for c in self.columns}))
+        self.rows += len(page)
+
+    def to_pandas(self) -> pd.DataFrame:
+        if not self._parts:
+            return _empty_frame(self.schema, self.columns)
+        if PYARROW_AVAILABLE:
+            return pa.Table.from_batches(self._parts).to_pandas(date_as_object=False)
+        return pd.concat(self._parts, ignore_index=True)
+
+
+def _empty_frame(schema: ViewSchema, columns: Sequence[str]) -> pd.DataFrame:
+    return pd.DataFrame({c: _pandas_column([], schema.columns[c]) for c in columns})
+
+
+# ---------------------------------------------------------------------------
+# Reader
+# ---------------------------------------------------------------------------
+
+@dataclass
+class _CacheEntry:
+    frame: pd.DataFrame
+    high_water: Optional[Any] = None      # wire value of the last high-water date
+    covered_from: Optional[Any] = None    # lower bound of the cached range (None = all history)
+    checked_at: float = 0.0
+
+
+@dataclass
+class ReadStats:
+    """What the last read moved over the wire."""
+    view: str
+    rows: int = 0
+    pages: int = 0
+    cached_rows: int = 0
+    seconds: float = 0.0
+    incremental: bool = False
+    extra: Dict[str, Any] = field(default_factory=dict)
+
+
+class ViewReader:
+    """
+    Projected, filtered, incrementally refreshed view reads.
+
+    Args:
+        source: Object with ``fetch_page`` (PostgrestSource / SQLSource), or a
+            zero-argument callable returning one (resolved on first read)
+        cache_dir: Directory for parquet snapshots, or None for memory only
+        min_refresh_interval: Seconds between incremental checks per cache entry
+        schemas: View schemas (defaults to VIEW_SCHEMAS)
+    """
+
+    def __init__(self, source: Any = None, cache_dir: Optional[Path] = DEFAULT_CACHE_DIR,
+                 min_refresh_interval: float = MIN_REFRESH_INTERVAL,
+                 schemas: Optional[Dict[str, ViewSchema]] = None):
+        self._source = source
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        self.min_refresh_interval = min_refresh_interval
+        self.schemas = schemas if schemas is not None else VIEW_SCHEMAS
+        self._entries: Dict[str, _CacheEntry] = {}
+        self._lock = threading.Lock()
+        self.last_stats: Optional[ReadStats] = None
+
+    @property
+    def source(self):
+        if self._source is None:
+            raise RuntimeError("ViewReader has no source configured")
+        if not hasattr(self._source, "fetch_page") and callable(self._source):
+            self._source = self._source()
+        return self._source
+
+    def schema(self, view: str) -> ViewSchema:
+        try:
+            return self.schemas[view]
+        except KeyError:
+            raise ValueError(f"No schema registered for view {view!r}") from None
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def read(
+        self,
+        view: str,
+        columns: Optional[Sequence[str]] = None,
+        filters: Optional[Sequence[Tuple[str, str, Any]]] = None,
+        start: Any = None,
+        end: Any = None,
+        refresh: bool = True,
+    ) -> pd.DataFrame:
+        """
+        Read a view.
+
+        Args:
+            view: Registered view name
+            columns: Columns to project (the key is always included); None = all
+            filters: (column, op, value) triples, op in FILTER_OPS, applied server side
+            start, end: Inclusive bounds on the view's high-water (date) column
+            refresh: Check the server for new rows (subject to min_refresh_interval)
+
+        Returns:
+            Typed DataFrame ordered by the view key
+        """
+        schema = self.schema(view)
+        cols = schema.project(columns)
+        filters = self._normalise_filters(schema, filters)
+        if (start is not None or end is not None) and not schema.high_water:
+            raise ValueError(f"{view} has no date column for start/end")
+        hw_type = schema.columns[schema.high_water] if schema.high_water else None
+        lo = _literal(start, hw_type) if start is not None else None
+        hi = _literal(end, hw_type) if end is not None else None
+
+        stats = ReadStats(view=view)
+        t0 = time.perf_counter()
+        with self._lock:
+            if schema.high_water:
+                frame = self._read_incremental(schema, cols, filters, lo, hi, refresh, stats)
+            else:
+                frame = self._read_full(schema, cols, filters, refresh, stats)
+        stats.seconds = time.perf_counter() - t0
+        self.last_stats = stats
+        return frame
+
+    def invalidate(self, view: Optional[str] = None):
+        """Drop cached entries (all, or one view's) from memory and disk."""
+        with self._lock:
+            for key in [k for k in self._entries if view is None or k.startswith(f"{view}-")]:
+                del self._entries[key]
+            if self.cache_dir is not None and self.cache_dir.exists():
+                for path in self.cache_dir.glob(f"{view}-*.parquet" if view else "*.parquet"):
+                    path.unlink(missing_ok=True)
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _normalise_filters(schema: ViewSchema, filters) -> List[Tuple[str, str, Any]]:
+        out = []
+        for col, op, value in filters or ():
+            if col not in schema.columns:
+                raise ValueError(f"{schema.name} has no column {col!r}")
+            if op not in FILTER_OPS:
+                raise ValueError(f"Unsupported filter op {op!r}; use one of {FILTER_OPS}")
+            dtype = schema.columns[col]
+            value = [_literal(v, dtype) for v in value] if op == "in" else _literal(value, dtype)
+            out.append((col, op, value))
+        return out
+
+    def _stream(self, schema: ViewSchema, cols: Sequence[str], filters, stats: ReadStats) -> pd.DataFrame:
+        """Keyset-page through the view into one typed frame."""
+        buffer = _PageBuffer(schema, cols)
+        after = None
+        while True:
+            page = self.source.fetch_page(schema.name, cols, filters, schema.key, after, schema.page_size)
+            stats.pages += 1
+            buffer.append(page)
+            if len(page) < schema.page_size:
+                break
+            after = [page[-1][k] for k in schema.key]
+        stats.rows += buffer.rows
+        return buffer.to_pandas()
+
+    def _entry_key(self, schema: ViewSchema, cols: Sequence[str], filters) -> str:
+        digest = hashlib.sha1(json.dumps([list(cols), [list(f) for f in filters]],
+                                         default=str, sort_keys=True).encode()).hexdigest()[:12]
+        return f"{schema.name}-{digest}"
+
+    def _read_full(self, schema, cols, filters, refresh, stats) -> pd.DataFrame:
+        key = self._entry_key(schema, cols, filters)
+        entry = self._entries.get(key)
+        now = time.time()
+        if entry is None or (refresh and now - entry.checked_at >= self.min_refresh_interval):
+            entry = self._entries[key] = _CacheEntry(self._stream(schema, cols, filters, stats), checked_at=now)
+        stats.cached_rows = len(entry.frame)
+        return entry.frame.copy()
+
+    def _read_incremental(self, schema, cols, filters, lo, hi, refresh, stats) -> pd.DataFrame:
+        hw = schema.high_water
+        key = self._entry_key(schema, cols, filters)
+        entry = self._entries.get(key) or self._load(key, schema, cols)
+        now = time.time()
+
+        if entry is None:
+            bound = [(hw, "gte", lo)] if lo is not None else []
+            entry = _CacheEntry(self._stream(schema, cols, [*filters, *bound], stats),
+                                covered_from=lo, checked_at=now)
+            entry.high_water = self._high_water(entry.frame, hw, schema.columns[hw])
+            self._save(key, entry)
+        else:
+            changed = False
+            if entry.covered_from is not None and (lo is None or lo < entry.covered_from):
+                # Backfill history before the cached range
+                bound = [(hw, "lt", entry.covered_from)] + ([(hw, "gte", lo)] if lo is not None else [])
+                older = self._stream(schema, cols, [*filters, *bound], stats)
+                entry.frame = _concat(older, entry.frame)
+                entry.covered_from = lo
+                changed = True
+            stale = now - entry.checked_at >= self.min_refresh_interval
+            wanted = hi is None or entry.high_water is None or hi >= entry.high_water
+            if refresh and stale and wanted:
+                bound = [(hw, "gte", entry.high_water)] if entry.high_water is not None else []
+                newer = self._stream(schema, cols, [*filters, *bound], stats)
+                if entry.high_water is not None:
+                    cutoff = _typed_scalar(entry.high_water, schema.columns[hw])
+                    entry.frame = entry.frame[entry.frame[hw] < cutoff]
+                entry.frame = _concat(entry.frame, newer)
+                entry.high_water = self._high_water(entry.frame, hw, schema.columns[hw])
+                entry.checked_at = now
+                stats.incremental = True
+                changed = True
+            if changed:
+                self._save(key, entry)
+        self._entries[key] = entry
+        stats.cached_rows = len(entry.frame)
+
+        frame = entry.frame
+        if lo is not None:
+            frame = frame[frame[hw] >= _typed_scalar(lo, schema.columns[hw])]
+        if hi is not None:
+            frame = frame[frame[hw] <= _typed_scalar(hi, schema.columns[hw])]
+        return frame.reset_index(drop=True)
+
+    @staticmethod
+    def _high_water(frame: pd.DataFrame, column: str, dtype: str) -> Optional[Any]:
+        """Wire value of the last row's high-water column."""
+        if frame.empty or pd.isna(frame[column].iloc[-1]):
+            return None
+        value = frame[column].iloc[-1]
+        return _literal(value, dtype) if dtype in ("date", "timestamp") else value.item()
+
+    # -- persistence ------------------------------------------------------
+
+    def _path(self, key: str) -> Optional[Path]:
+        return self.cache_dir / f"{key}.parquet" if self.cache_dir is not None else None
+
+    def _load(self, key: str, schema: ViewSchema, cols: Sequence[str]) -> Optional[_CacheEntry]:
+        path = self._path(key)
+        if not PYARROW_AVAILABLE or path is None or not path.exists():
+            return None
+        try:
+            table = pq.read_table(path)
+            meta = json.loads((table.schema.metadata or {}).get(b"atlas_view", b"{}"))
+            if table.column_names != list(cols):
+                return None
+            return _CacheEntry(table.to_pandas(date_as_object=False), high_water=meta.get("high_water"),
+                               covered_from=meta.get("covered_from"), checked_at=meta.get("checked_at", 0.0))
+        except Exception as exc:
+            logger.warning("Ignoring unreadable view cache %s: %s", path, exc)
+            return None
+
+    def _save(self, key: str, entry: _CacheEntry):
+        path = self._path(key)
+        if not PYARROW_AVAILABLE or path is None:
+            return
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            table = pa.Table.from_pandas(entry.frame, preserve_index=False)
+            meta = {"high_water": entry.high_water, "covered_from": entry.covered_from,
+                    "checked_at": entry.checked_at}
+            table = table.replace_schema_metadata({**(table.schema.metadata or {}),
+                                                   b"atlas_view": json.dumps(meta).encode()})
+            tmp = path.with_suffix(".parquet.tmp")
+            pq.write_table(table, tmp)
+            os.replace(tmp, path)
+        except Exception as exc:
+            logger.warning("Could not write view cache %s: %s", path, exc)
+
+
+def _typed_scalar(value: Any, dtype: str):
+    return pd.Timestamp(value) if dtype in ("date", "timestamp") else value
+
+
+def _concat(first: pd.DataFrame, second: pd.DataFrame) -> pd.DataFrame:
+    if first.empty:
+        return second.reset_index(drop=True)
+    if second.empty:
+        return first.reset_index(drop=True)
+    return pd.concat([first, second], ignore_index=True)
+
+
+# ---------------------------------------------------------------------------
+# Process-wide reader
+# ---------------------------------------------------------------------------
+
+_reader: Optional[ViewReader] = None
+_reader_lock = threading.Lock()
+
+
+def _supabase_source() -> PostgrestSource:
+    from services.supabase_client import get_supabase_client
+    return PostgrestSource(get_supabase_client())
+
+
+def get_view_reader() -> ViewReader:
+    """Process-wide reader over the Supabase client (created on first call)."""
+    global _reader
+    with _reader_lock:
+        if _reader is None:
+            _reader = ViewReader(_supabase_source)
+        return _reader
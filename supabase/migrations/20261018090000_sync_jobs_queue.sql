@@ -0,0 +1,68 @@
+-- ============================================================
+-- sync_jobs becomes the remote backend of the durable job queue
+-- (services/jobs/store.py, SupabaseJobStore).
+--
+-- Until now sync_jobs only recorded broker syncs after the fact, while the
+-- actual work ran in a daemon thread inside the Streamlit process and
+-- reported back through a JSON file in /tmp. A long ingestion died with the
+-- Streamlit worker and held one of its threads for the whole backfill.
+-- Workers now run as their own processes and take jobs from this table.
+--
+-- WHAT IS ADDED
+--   job_type          handler name (ingest_tickers, sync_all_assets, ...);
+--                     existing rows are broker syncs, hence the default
+--   dedupe_key        hash of (job_type, settings); see the unique index
+--   attempts /
+--   max_attempts      retries with exponential backoff
+--   run_after         earliest start; a retry pushes it out
+--   progress          {"done", "total", ...counters} written by the worker
+--   result            handler output on success
+--   worker_id /
+--   heartbeat_at      the lease. A worker that stops heartbeating has its
+--                     job re-queued by the next worker's sweep
+--   cancel_requested  cooperative cancel for a running job
+--
+-- The status vocabulary is unchanged: a retry goes back to 'queued'.
+--
+-- CLAIMING is a compare-and-set PATCH (status=eq.queued AND
+-- attempts=eq.<n>), so PostgREST alone is enough -- no RPC -- and two
+-- workers can never both take a job: the second PATCH matches no row.
+--
+-- organization_id / user_id become nullable: the nightly price sync is a
+-- system job that belongs to no user. RLS is unchanged -- a NULL
+-- organization_id matches no member's org, so system jobs are visible only
+-- to the service role the workers use.
+-- ============================================================
+
+ALTER TABLE public.sync_jobs
+  ALTER COLUMN organization_id DROP NOT NULL,
+  ALTER COLUMN user_id DROP NOT NULL;
+
+ALTER TABLE public.sync_jobs
+  ADD COLUMN IF NOT EXISTS job_type text NOT NULL DEFAULT 'alpaca_sync',
+  ADD COLUMN IF NOT EXISTS dedupe_key text,
+  ADD COLUMN IF NOT EXISTS attempts integer NOT NULL DEFAULT 0,
+  ADD COLUMN IF NOT EXISTS max_attempts integer NOT NULL DEFAULT 3,
+  ADD COLUMN IF NOT EXISTS run_after timestamptz NOT NULL DEFAULT now(),
+  ADD COLUMN IF NOT EXISTS progress jsonb NOT NULL DEFAULT '{}'::jsonb,
+  ADD COLUMN IF NOT EXISTS result jsonb,
+  ADD COLUMN IF NOT EXISTS worker_id text,
+  ADD COLUMN IF NOT EXISTS heartbeat_at timestamptz,
+  ADD COLUMN IF NOT EXISTS cancel_requested boolean NOT NULL DEFAULT false;
+
+-- Claim order: due queued jobs, oldest first
+CREATE INDEX IF NOT EXISTS idx_sync_jobs_ready
+  ON public.sync_jobs (run_after, requested_at)
+  WHERE status = 'queued';
+
+-- Stale-lease sweep
+CREATE INDEX IF NOT EXISTS idx_sync_jobs_heartbeat
+  ON public.sync_jobs (heartbeat_at)
+  WHERE status = 'running';
+
+-- At most one ACTIVE job per dedupe key. Finished jobs keep their key, so
+-- history is not constrained. A racing duplicate insert fails with 23505
+-- and the client falls back to the job that won.
+CREATE UNIQUE INDEX IF NOT EXISTS sync_jobs_active_dedupe_uniq
+  ON public.sync_jobs (dedupe_key)
+  WHERE dedupe_key IS NOT NULL AND status IN ('queued', 'running');
@@ -0,0 +1,141 @@
+"""
+Unit tests for the vectorized backtest engine (analytics/backtest.py) and
+the portfolio simulator built on it.
+"""
+
+import unittest
+import numpy as np
+import pandas as pd
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analytics.backtest import rebalance_dates, run_backtest, walk_forward, weight_schedule
+
+
+def _prices(n_days=600, n_assets=6, seed=0, drift=0.0003):
+    rng = np.random.default_rng(seed)
+    idx = pd.bdate_range('2020-01-01', periods=n_days)
+    steps = rng.normal(drift, 0.015, (n_days, n_assets))
+    return pd.DataFrame(100 * np.exp(np.cumsum(steps, axis=0)), index=idx,
+                        columns=[f'A{i}' for i in range(n_assets)])
+
+
+def inverse_vol(window):
+    """Module-level so it pickles into pool workers."""
+    inv = 1.0 / window.std()
+    return inv / inv.sum()
+
+
+class TestRunBacktest(unittest.TestCase):
+
+    def setUp(self):
+        self.prices = _prices()
+        self.weights = pd.Series([0.3, 0.2, 0.2, 0.1, 0.1, 0.1], index=self.prices.columns)
+
+    def test_daily_rebalance_matches_weighted_returns(self):
+        result = run_backtest(self.prices, self.weights, rebalance='D', cost_bps=0, cgt_rate=0)
+        expected = self.prices.pct_change().iloc[1:] @ self.weights
+        np.testing.assert_allclose(result.returns.iloc[1:], expected, atol=1e-12)
+
+    def test_buy_and_hold_drifts(self):
+        result = run_backtest(self.prices, self.weights, rebalance=None, cost_bps=0, cgt_rate=0)
+        growth = self.prices.iloc[-1] / self.prices.iloc[0]
+        self.assertAlmostEqual(result.value.iloc[-1], (growth * self.weights).sum(), places=12)
+        expected_w = growth * self.weights / (growth * self.weights).sum()
+        np.testing.assert_allclose(result.weights.iloc[-1], expected_w, atol=1e-12)
+        self.assertEqual(result.summary['rebalances'], 1)
+
+    def test_costs_and_conservative_cgt(self):
+        free = run_backtest(self.prices, self.weights, rebalance='M', cost_bps=0, cgt_rate=0)
+        costly = run_backtest(self.prices, self.weights, rebalance='M', cost_bps=25,
+                              cgt_rate=0.18, cgt_mode='conservative')
+        self.assertLess(costly.value.iloc[-1], free.value.iloc[-1])
+        # Conservative CGT: rate x sell value, as in analytics/transition
+        sells = (-costly.trades.clip(upper=0)).sum(axis=1)
+        np.testing.assert_allclose(costly.cgt, 0.18 * sells, rtol=1e-9)
+        traded = costly.trades.abs().sum(axis=1)
+        np.testing.assert_allclose(costly.transaction_costs, 0.0025 * traded, rtol=1e-9)
+        # Fully invested: after the first rebalance, buys fund sells net of costs and CGT exactly
+        settle = costly.trades.sum(axis=1) + costly.transaction_costs + costly.cgt
+        np.testing.assert_allclose(settle.iloc[1:], 0.0, atol=1e-9)
+        # Gross returns exclude the cost drag
+        self.assertGreater(costly.summary['cost_drag_bps'], 0)
+        self.assertGreater(np.prod(1 + costly.gross_returns), np.prod(1 + costly.returns))
+
+    def test_realised_cgt_only_on_gains(self):
+        # Assets trend at different rates, so every rebalance sells something
+        t = np.arange(len(self.prices))[:, None]
+        rates = 0.001 * (1 + np.arange(6))
+        falling = pd.DataFrame(100 * np.exp(-rates * t), index=self.prices.index, columns=self.prices.columns)
+        result = run_backtest(falling, self.weights, rebalance='M', cost_bps=0, cgt_rate=0.18)
+        self.assertEqual(result.summary['total_cgt'], 0.0)
+        rising = pd.DataFrame(100 * np.exp(rates * t), index=self.prices.index, columns=self.prices.columns)
+        result = run_backtest(rising, self.weights, rebalance='M', cost_bps=0, cgt_rate=0.18)
+        self.assertGreater(result.summary['total_cgt'], 0.0)
+
+    def test_schedule_snaps_to_trading_dates(self):
+        schedule = pd.DataFrame([self.weights, self.weights[::-1].values],
+                                index=pd.to_datetime(['2020-01-04', '2020-06-06']),
+                                columns=self.prices.columns)
+        snapped = weight_schedule(schedule, self.prices.index)
+        self.assertEqual(list(snapped.index), list(pd.to_datetime(['2020-01-06', '2020-06-08'])))
+        result = run_backtest(self.prices, schedule)
+        self.assertEqual(result.returns.index[0], pd.Timestamp('2020-01-06'))
+        self.assertEqual(len(result.trades), 2)
+
+    def test_unpriced_weight_rejected(self):
+        prices = self.prices.copy()
+        prices.iloc[:10, 0] = np.nan
+        with self.assertRaises(ValueError):
+            run_backtest(prices, self.weights)
+
+    def test_rebalance_dates(self):
+        idx = self.prices.index
+        monthly = rebalance_dates(idx, 'M')
+        self.assertEqual(monthly[1], pd.Timestamp('2020-02-03'))
+        self.assertEqual(len(rebalance_dates(idx, 20)), 30)
+        self.assertEqual(len(rebalance_dates(idx, 'never')), 1)
+
+
+class TestWalkForward(unittest.TestCase):
+
+    def test_serial_and_pool_agree(self):
+        prices = _prices(n_days=500)
+        serial = walk_forward(prices, inverse_vol, lookback=120, rebalance='M', processes=1)
+        pooled = walk_forward(prices, inverse_vol, lookback=120, rebalance='M', processes=2)
+        pd.testing.assert_series_equal(serial.value, pooled.value)
+        # First solve needs a full lookback of returns
+        start = prices.index.get_loc(serial.value.index[0])
+        self.assertGreaterEqual(start, 120)
+        months = rebalance_dates(prices.index[1:], 'M')
+        self.assertEqual(len(serial.trades), (months >= prices.index[start]).sum())
+
+    def test_named_optimizer(self):
+        prices = _prices(n_days=320, n_assets=5)
+        result = walk_forward(prices, 'min_volatility', lookback=126, rebalance='Q', processes=1,
+                              optimizer_kwargs={'max_position': 0.4, 'min_position': 0.0})
+        np.testing.assert_allclose(result.weights.sum(axis=1), 1.0, atol=1e-6)
+        self.assertLessEqual(result.weights.iloc[0].max(), 0.4 + 1e-6)
+
+
+class TestPortfolioSimulator(unittest.TestCase):
+
+    def test_rebalanced_simulation(self):
+        from modules.ee_enrichment.portfolio_simulator import simulate_portfolio_returns
+        prices = _prices(n_days=200, n_assets=3)
+        histories = {t: prices[t] for t in prices.columns}
+        holdings = pd.DataFrame({'Ticker': ['A0', 'A1', 'A2', 'A2'], 'Market_Value': [50, 30, 10, 10]})
+        daily = simulate_portfolio_returns(holdings, histories)
+        expected = prices.pct_change().fillna(0) @ np.array([0.5, 0.3, 0.2])
+        np.testing.assert_allclose(daily['daily_return'], expected.loc[daily.index], atol=1e-12)
+
+        held = simulate_portfolio_returns(holdings, histories, rebalance='never')
+        growth = (prices.iloc[-1] / prices.iloc[0]) @ np.array([0.5, 0.3, 0.2])
+        self.assertAlmostEqual(held['cumulative_return'].iloc[-1], growth - 1, places=10)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+"""
+Cold-start regression test for atlas_app.py.
+
+Runs the app module in a subprocess with ATLAS_BOOT_ONLY=1 (imports and page
+config only, no page rendered) and checks the [BOOT] import profile against
+core.monitoring.BOOT_BUDGET_SECONDS.
+"""
+
+import unittest
+import re
+import subprocess
+import sys
+import os
+
+# Add project root to path
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from core.monitoring import BOOT_BUDGET_SECONDS
+
+
+def _boot_output():
+    env = dict(os.environ, ATLAS_BOOT_ONLY='1')
+    proc = subprocess.run(
+        [sys.executable, os.path.join(ROOT, 'atlas_app.py')],
+        cwd=ROOT, env=env, capture_output=True, text=True, timeout=120,
+    )
+    return proc.returncode, proc.stdout
+
+
+class TestBootBudget(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.returncode, cls.stdout = _boot_output()
+
+    def test_boot_completes(self):
+        self.assertEqual(self.returncode, 0, self.stdout[-2000:])
+        self.assertIn('[BOOT] ATLAS_BOOT_ONLY=1', self.stdout)
+
+    def test_import_profile_within_budget(self):
+        match = re.search(r'\[BOOT\] Import profile: (\d+) ms total', self.stdout)
+        self.assertIsNotNone(match, self.stdout[-2000:])
+        self.assertLess(int(match.group(1)) / 1000.0, BOOT_BUDGET_SECONDS)
+
+    def test_no_heavy_modules_at_boot(self):
+        """yfinance/scipy/sklearn/etc. belong to the pages that use them."""
+        self.assertIn('[BOOT] Heavy modules imported: none', self.stdout)
+
+
+if __name__ == '__main__':
+    unittest.main()
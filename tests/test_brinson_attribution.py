@@ -0,0 +1,134 @@
+"""
+Unit tests for the vectorized Brinson-Fachler engine (analytics/attribution)
+and the bulk sector classifier (data/sectors.classify_sectors).
+"""
+
+import unittest
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analytics.attribution import (
+    drifted_weights, linked_attribution, linking_coefficients, sector_attribution, stock_attribution,
+)
+from data.sectors import STOCK_SECTOR_OVERRIDES, classify_sectors
+
+
+def _loop_reference(holdings, bw, br, total):
+    """The per-sector loop calculate_brinson_attribution_gics used to run (wp in selection)."""
+    rows = {}
+    for sector, grp in holdings.groupby('Sector'):
+        wp = grp['Weight'].sum()
+        rp = np.average(grp['Return'], weights=grp['Weight'])
+        wb, rb = bw.get(sector, 0), br.get(sector, 0)
+        rows[sector] = ((wp - wb) * (rb - total), wp * (rp - rb), (wp - wb) * (rp - rb))
+    for sector, wb in bw.items():
+        if sector not in rows and wb > 0:
+            rows[sector] = (-wb * (br.get(sector, 0) - total), 0.0, 0.0)
+    return rows
+
+
+class TestSectorAttribution(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(7)
+        self.holdings = pd.DataFrame({
+            'Ticker': [f'T{i}' for i in range(9)],
+            'Sector': ['Tech', 'Tech', 'Energy', 'Health', 'Tech', 'Energy', 'Health', 'Other', 'Tech'],
+            'Weight': rng.dirichlet(np.ones(9)),
+            'Return': rng.normal(5, 10, 9),
+        })
+        self.bw = {'Tech': 0.4, 'Energy': 0.2, 'Health': 0.25, 'Utilities': 0.15}
+        self.br = {'Tech': 8.0, 'Energy': -3.0, 'Health': 4.0, 'Utilities': 2.0}
+
+    def test_matches_legacy_loop(self):
+        total = 4.2
+        table = sector_attribution(self.holdings, self.bw, self.br, total,
+                                   selection_weight='portfolio').set_index('Sector')
+        expected = _loop_reference(self.holdings, self.bw, self.br, total)
+        self.assertEqual(set(table.index), set(expected))
+        for sector, (alloc, sel, inter) in expected.items():
+            row = table.loc[sector]
+            self.assertAlmostEqual(row['Allocation Effect'], alloc, places=10)
+            self.assertAlmostEqual(row['Selection Effect'], sel, places=10)
+            self.assertAlmostEqual(row['Interaction Effect'], inter, places=10)
+        # Unheld benchmark sectors show a zero portfolio return
+        self.assertEqual(table.loc['Utilities', 'Portfolio Return'], 0.0)
+        self.assertEqual(table.loc['Utilities', 'Portfolio Weight'], 0.0)
+
+    def test_effects_reconcile_to_active_return(self):
+        table = sector_attribution(self.holdings, self.bw, self.br)
+        port = float((self.holdings['Weight'] * self.holdings['Return']).sum())
+        bench = sum(self.bw[s] * self.br[s] for s in self.bw)
+        self.assertAlmostEqual(table['Total Effect'].sum(), port - bench, places=10)
+
+    def test_stock_attribution(self):
+        stocks = stock_attribution(self.holdings, self.br)
+        self.assertAlmostEqual(stocks['Contribution'].sum(),
+                               float((self.holdings['Weight'] * self.holdings['Return']).sum()))
+        other = stocks[stocks['Sector'] == 'Other'].iloc[0]
+        self.assertEqual(other['Sector Benchmark Return'], 0.0)
+
+    def test_rejects_unknown_selection_weight(self):
+        with self.assertRaises(ValueError):
+            sector_attribution(self.holdings, self.bw, self.br, selection_weight='equal')
+
+
+class TestLinkedAttribution(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(11)
+        dates = pd.bdate_range('2024-01-01', periods=63)
+        self.returns = pd.DataFrame(rng.normal(0.0005, 0.012, (63, 5)), index=dates,
+                                    columns=['A', 'B', 'C', 'D', 'E'])
+        self.sectors = {'A': 'Tech', 'B': 'Tech', 'C': 'Energy', 'D': 'Utilities', 'E': 'Energy'}
+        self.bench = pd.DataFrame(rng.normal(0.0004, 0.009, (63, 3)), index=dates,
+                                  columns=['Tech', 'Energy', 'Financials'])
+        self.bw = {'Tech': 0.5, 'Energy': 0.3, 'Financials': 0.2}
+        self.w0 = {'A': 0.3, 'B': 0.2, 'C': 0.2, 'D': 0.2, 'E': 0.1}
+
+    def test_linked_effects_sum_to_compounded_active_return(self):
+        for method in ('carino', 'menchero'):
+            result = linked_attribution(self.w0, self.returns, self.sectors, self.bw, self.bench,
+                                        method=method)
+            s = result.summary
+            self.assertAlmostEqual(s['residual'], 0.0, places=12)
+            self.assertAlmostEqual(result.sectors['Total Effect'].sum(), s['active_return'], places=12)
+            self.assertIn('Financials', set(result.sectors['Sector']))
+
+    def test_portfolio_return_uses_drifted_weights(self):
+        result = linked_attribution(self.w0, self.returns, self.sectors, self.bw, self.bench)
+        values = pd.Series(self.w0) * (1 + self.returns).prod()
+        self.assertAlmostEqual(result.summary['portfolio_return'], values.sum() - 1, places=12)
+        weights = drifted_weights(self.w0, self.returns)
+        np.testing.assert_allclose(weights.sum(axis=1), 1.0)
+
+    def test_coefficients(self):
+        one = pd.Series([0.02]), pd.Series([0.01])
+        self.assertAlmostEqual(linking_coefficients(*one, 'carino').iloc[0], 1.0)
+        self.assertAlmostEqual(linking_coefficients(*one, 'menchero').iloc[0], 1.0)
+        # Identical returns hit the 1 / (1 + r) limit instead of dividing by zero
+        same = pd.Series([0.01, -0.02, 0.03])
+        self.assertTrue(np.isfinite(linking_coefficients(same, same, 'carino')).all())
+        self.assertTrue(np.isfinite(linking_coefficients(same, same, 'menchero')).all())
+        with self.assertRaises(ValueError):
+            linking_coefficients(same, same, 'geometric')
+
+
+class TestClassifySectors(unittest.TestCase):
+
+    def test_overrides_and_offline_misses(self):
+        known = next(iter(STOCK_SECTOR_OVERRIDES))
+        sectors = classify_sectors([known.lower(), known, 'ZZZZ_NOT_A_TICKER'], fetch=False)
+        self.assertEqual(sectors[known], STOCK_SECTOR_OVERRIDES[known])
+        self.assertEqual(sectors['ZZZZ_NOT_A_TICKER'], 'Other')
+        self.assertEqual(len(sectors), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
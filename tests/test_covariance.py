@@ -0,0 +1,133 @@
+"""
+Unit tests for the covariance estimators (analytics/covariance) and the
+cached covariance service (services/covariance_service).
+"""
+
+import unittest
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analytics.covariance import (
+    EWMAState, estimate_covariance, ewma_covariance, factor_covariance, ledoit_wolf, sample_covariance,
+)
+from core.shared_cache import SharedCache
+from services.covariance_service import CovarianceService
+
+try:
+    from sklearn.covariance import LedoitWolf
+    SKLEARN_AVAILABLE = True
+except ImportError:
+    SKLEARN_AVAILABLE = False
+
+
+def _returns(n_days=250, n_assets=12, n_factors=3, seed=5):
+    rng = np.random.default_rng(seed)
+    factors = rng.normal(0, 0.01, (n_days, n_factors))
+    loadings = rng.normal(1, 0.4, (n_factors, n_assets))
+    data = factors @ loadings + rng.normal(0, 0.006, (n_days, n_assets))
+    return pd.DataFrame(data, index=pd.bdate_range('2024-01-01', periods=n_days),
+                        columns=[f'A{i}' for i in range(n_assets)])
+
+
+class TestEstimators(unittest.TestCase):
+
+    def setUp(self):
+        self.returns = _returns()
+
+    def test_sample_matches_pandas(self):
+        np.testing.assert_allclose(sample_covariance(self.returns).values, self.returns.cov().values)
+        gappy = self.returns.copy()
+        gappy.iloc[:20, 3] = np.nan
+        np.testing.assert_allclose(sample_covariance(gappy).values, gappy.cov().values)
+
+    @unittest.skipUnless(SKLEARN_AVAILABLE, "sklearn not installed")
+    def test_ledoit_wolf_matches_sklearn(self):
+        for data in (self.returns, self.returns.iloc[:8]):
+            est = ledoit_wolf(data)
+            ref = LedoitWolf().fit(data.values)
+            np.testing.assert_allclose(est.values, ref.covariance_, rtol=1e-10, atol=1e-16)
+            self.assertAlmostEqual(est.params['shrinkage'], ref.shrinkage_)
+
+    def test_ewma_incremental_equals_batch(self):
+        state = EWMAState.from_returns(self.returns.iloc[:200])
+        for i in range(200, 250):
+            state.update(self.returns.iloc[i:i + 1])
+        batch = ewma_covariance(self.returns)
+        np.testing.assert_allclose(state.cov, batch.values, rtol=1e-10)
+        self.assertEqual(state.as_of, self.returns.index[-1])
+        self.assertEqual(state.n_obs, 250)
+
+    def test_factor_model_is_o_nk(self):
+        est = factor_covariance(self.returns, n_factors=3)
+        self.assertTrue(est.is_factor)
+        self.assertEqual(est.loadings.shape, (12, 3))
+        w = np.full(12, 1 / 12)
+        variance = est.variance(w)
+        self.assertTrue(est.is_factor)          # variance did not build the n x n matrix
+        np.testing.assert_allclose(est.diag(), self.returns.var().values, rtol=1e-8)
+        self.assertAlmostEqual(variance, float(w @ est.values @ w))
+        # Three true factors: portfolio variance close to the sample estimate
+        self.assertAlmostEqual(variance / float(w @ self.returns.cov().values @ w), 1.0, delta=0.05)
+
+        annual = est.scaled(252)
+        self.assertAlmostEqual(annual.variance(w), 252 * variance)
+        draws = est.simulate(40000, np.random.default_rng(0))
+        self.assertAlmostEqual(float((draws @ w).var()) / variance, 1.0, delta=0.05)
+
+    def test_cholesky_regularises(self):
+        singular = self.returns.copy()
+        singular['dup'] = singular['A0']
+        est = sample_covariance(singular)
+        L = est.cholesky()
+        np.testing.assert_allclose(L @ L.T, est.values, atol=1e-6)
+        self.assertIs(est.cholesky(), L)
+
+    def test_unknown_estimator(self):
+        with self.assertRaises(ValueError):
+            estimate_covariance(self.returns, 'shrunk')
+
+
+class TestCovarianceService(unittest.TestCase):
+
+    def setUp(self):
+        self.service = CovarianceService(cache=SharedCache())
+        self.returns = _returns()
+
+    def test_cached_by_universe_window_and_data(self):
+        a = self.service.estimate(self.returns, 'ledoit_wolf', window=120, scale=252)
+        b = self.service.estimate(self.returns.copy(), 'ledoit_wolf', window=120, scale=252)
+        self.assertIs(a, b)
+        np.testing.assert_allclose(a.values, ledoit_wolf(self.returns.iloc[-120:]).values * 252)
+        # Different window, estimator or data: different entries
+        self.assertIsNot(self.service.estimate(self.returns, 'ledoit_wolf', window=60, scale=252), a)
+        self.assertIsNot(self.service.estimate(self.returns * 2, 'ledoit_wolf', window=120, scale=252), a)
+        self.assertIs(self.service.cholesky(self.returns, 'ledoit_wolf', window=120, scale=252),
+                      a.cholesky())
+
+    def test_ewma_extends_previous_day(self):
+        first = self.service.estimate(self.returns.iloc[:249], 'ewma')
+        second = self.service.update_ewma(self.returns)
+        self.assertEqual(first.as_of, self.returns.index[-2])
+        self.assertEqual(second.as_of, self.returns.index[-1])
+        np.testing.assert_allclose(second.values, ewma_covariance(self.returns).values, rtol=1e-10)
+
+    def test_ewma_rebuilds_revised_history(self):
+        self.service.estimate(self.returns.iloc[:249], 'ewma')
+        revised = self.returns.copy()
+        revised.iloc[:100] *= 3
+        np.testing.assert_allclose(self.service.update_ewma(revised).values,
+                                   ewma_covariance(revised).values, rtol=1e-10)
+        # Another caller's series over the same universe and dates
+        other = self.returns * 3
+        np.testing.assert_allclose(self.service.estimate(other, 'ewma').values,
+                                   ewma_covariance(other).values, rtol=1e-10)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,167 @@
+"""
+Unit tests for the batch DCF trap screener (analytics/dcf_trap_screener):
+agreement with DCFTrapDetector, the shared regime overlay and flag history,
+all on injected fundamentals (no network).
+"""
+
+import unittest
+import sys
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analytics.dcf_regime_overlay import DCFRegimeOverlay
+from analytics.dcf_trap_detector import DCFTrapDetector
+from analytics.dcf_trap_screener import (
+    MacroSnapshot, TrapFlagStore, build_fundamentals_table, screen_dcf_traps, screening_universe,
+)
+
+YEARS = pd.to_datetime(['2024-12-31', '2023-12-31', '2022-12-31', '2021-12-31'])   # yfinance: newest first
+PROFILES = [
+    # sector, industry, beta, revenues (old -> new), fcf, debt, equity, market cap
+    ('Technology', 'Semiconductors', 0.6, [50, 70, 95, 130], 20, 10, 100, 3000),
+    ('Utilities', 'Utilities - Regulated Electric', 0.4, [100, 99, 98, 97], 8, 250, 100, 150),
+    ('Healthcare', 'Biotechnology', 1.3, [10, 12, 15, 19], -2, 5, 50, 200),
+    ('Consumer Defensive', 'Tobacco', 0.7, [80, 78, 76, 74], 15, 200, 80, 300),
+    ('Industrials', 'Aerospace & Defense', 1.0, [60, 63, 66, 70], 6, 40, 60, 120),
+    ('Financial Services', 'Banks - Regional', 1.1, [30, 31, 32, 33], 5, 20, 40, 60),
+]
+
+
+def _fundamentals(sector, industry, beta, revenues, fcf, debt, equity, market_cap):
+    financials = pd.DataFrame([revenues[::-1]], index=['Total Revenue'], columns=YEARS).astype(float)
+    balance = pd.DataFrame([[debt, debt * 0.9, 0, 0], [equity, equity, 0, 0], [5, 5, 5, 5]],
+                           index=['Total Debt', 'Stockholders Equity', 'Cash And Cash Equivalents'],
+                           columns=YEARS).astype(float)
+    cashflow = pd.DataFrame([[fcf, fcf, fcf, fcf]], index=['Free Cash Flow'], columns=YEARS).astype(float)
+    info = {'sector': sector, 'industry': industry, 'beta': beta, 'marketCap': market_cap,
+            'currentPrice': 10.0, 'sharesOutstanding': 10.0}
+    return {'info': info, 'financials': financials, 'balance_sheet': balance, 'cashflow': cashflow}
+
+
+def _universe(n):
+    return {f'T{i:03d}': _fundamentals(*PROFILES[i % len(PROFILES)]) for i in range(n)}
+
+
+def _macro(regime='neutral', rf=0.045):
+    return MacroSnapshot(treasury_10y=rf, regime_info={'regime': regime})
+
+
+class TestScreen(unittest.TestCase):
+
+    def setUp(self):
+        self.fundamentals = _universe(len(PROFILES))
+        self.screen = screen_dcf_traps(list(self.fundamentals), macro=_macro(), loader=self.fundamentals.get)
+
+    def test_matches_single_name_detector(self):
+        table = self.screen.table
+        for ticker, fundamentals in self.fundamentals.items():
+            row = table.loc[ticker]
+            n = int(row['projection_years'])
+            revenue = row['revenue'] * np.cumprod(1 + np.linspace(
+                np.clip(row['revenue_cagr'], -0.05, 0.25), 0.025, n))
+            inputs = {
+                'wacc': row['wacc'], 'terminal_growth_rate': row['terminal_growth_rate'],
+                'terminal_value': row['terminal_value'], 'enterprise_value': row['enterprise_value'],
+                'revenue_projections': list(revenue),
+                'fcf_projections': list(revenue * row['final_fcf_margin']),
+                'current_price': row['current_price'], 'fair_value': row['fair_value'],
+            }
+            detector = DCFTrapDetector(ticker, inputs, fundamentals=fundamentals, treasury_10y=0.045)
+            expected = {(w.trap_type, w.severity, round(w.confidence, 6)) for w in detector.run_all_checks()}
+            fired = self.screen.traps[self.screen.traps['ticker'] == ticker]
+            got = {(r.trap_type, r.severity, round(r.confidence, 6)) for r in fired.itertuples()}
+            self.assertEqual(got, expected, ticker)
+        self.assertGreater(len(self.screen.traps), 0)
+
+    def test_saved_model_overrides_standard_dcf(self):
+        inputs = {'T000': {'wacc': 0.05, 'terminal_growth_rate': 0.04, 'terminal_value': 900.0,
+                           'enterprise_value': 1000.0, 'fair_value': 50.0, 'current_price': 10.0,
+                           'revenue_projections': [100, 150, 230, 350, 520],
+                           'fcf_projections': [10, 20, 40, 70, 110]}}
+        screen = screen_dcf_traps(list(self.fundamentals), dcf_inputs=inputs, macro=_macro(),
+                                  loader=self.fundamentals.get)
+        row = screen.table.loc['T000']
+        self.assertEqual(row['dcf_source'], 'model')
+        self.assertEqual(row['fair_value'], 50.0)
+        traps = screen.traps.set_index(['ticker', 'trap_type'])
+        self.assertEqual(traps.loc[('T000', 'TERMINAL_VALUE_DEPENDENCY'), 'severity'], 'CRITICAL')
+        self.assertEqual(traps.loc[('T000', 'IDIOSYNCRATIC_OPTIONALITY'), 'severity'], 'CRITICAL')
+        self.assertEqual(screen.table.loc['T001', 'dcf_source'], 'standard')
+
+    def test_regime_overlay_shared_across_names(self):
+        overlay = DCFRegimeOverlay()
+        risk_off = build_fundamentals_table(self.fundamentals, _macro('risk_off'))
+        np.testing.assert_allclose(risk_off['adjusted_wacc'] - risk_off['wacc'],
+                                   overlay.wacc_adjustments['risk_off'] / 10000)
+        positive = risk_off['fair_value'] > 0
+        self.assertTrue((risk_off.loc[positive, 'regime_value_change_pct'] < 0).all())
+        risk_on = build_fundamentals_table(self.fundamentals, _macro('risk_on'))
+        self.assertTrue((risk_on.loc[positive, 'regime_value_change_pct'] > 0).all())
+
+    def test_missing_names_are_reported(self):
+        screen = screen_dcf_traps(['T000', 'NOPE'], macro=_macro(), loader=self.fundamentals.get)
+        self.assertEqual(screen.tickers, ['T000'])
+        self.assertIn('NOPE', screen.errors)
+        self.assertEqual(screen.summary().index[0], 'T000')
+
+    def test_universe_from_holdings_and_watchlist(self):
+        holdings = pd.DataFrame({'Ticker': ['aapl', 'MSFT', None]})
+        self.assertEqual(screening_universe(holdings, [{'ticker': 'msft'}, 'NVDA']), ['AAPL', 'MSFT', 'NVDA'])
+
+    def test_three_hundred_names_quickly(self):
+        fundamentals = _universe(300)
+        start = time.perf_counter()
+        screen = screen_dcf_traps(list(fundamentals), macro=_macro(), loader=fundamentals.get)
+        self.assertLess(time.perf_counter() - start, 5.0)
+        self.assertEqual(len(screen.table), 300)
+        per_profile = screen.traps.groupby('ticker').size()
+        self.assertEqual(per_profile['T000'], per_profile['T006'])
+
+
+class TestTrapFlagStore(unittest.TestCase):
+
+    def test_change_tracking(self):
+        fundamentals = _universe(len(PROFILES))
+        with tempfile.TemporaryDirectory() as tmp:
+            store = TrapFlagStore(os.path.join(tmp, 'traps', 'flags.sqlite3'))
+            first = screen_dcf_traps(list(fundamentals), macro=_macro(), loader=fundamentals.get)
+            events = store.record(first, at=1000.0)
+            self.assertEqual(set(events['event']), {'fired'})
+            self.assertEqual(len(store.active()), len(first.traps))
+
+            # Same run again: nothing changes
+            self.assertTrue(store.record(first, at=2000.0).empty)
+
+            # A saved model escalates one name, another clears; names not screened keep their flags
+            inputs = {'T000': {'wacc': 0.05, 'terminal_growth_rate': 0.04, 'terminal_value': 950.0,
+                               'enterprise_value': 1000.0, 'revenue_projections': [1, 2, 3, 4, 5],
+                               'fcf_projections': [1, 1, 1, 1, 1]}}
+            cleared = {'T004': {'wacc': 0.10, 'terminal_growth_rate': 0.02, 'terminal_value': 100.0,
+                                'enterprise_value': 1000.0}}
+            subset = {t: fundamentals[t] for t in ('T000', 'T004')}
+            second = screen_dcf_traps(list(subset), dcf_inputs={**inputs, **cleared}, macro=_macro(),
+                                      loader=fundamentals.get)
+            events = store.record(second, at=3000.0).set_index(['ticker', 'trap_type'])['event']
+            self.assertEqual(events[('T000', 'TERMINAL_VALUE_DEPENDENCY')], 'escalated')
+            self.assertEqual(events[('T004', 'TERMINAL_VALUE_DEPENDENCY')], 'cleared')
+            self.assertNotIn(('T004', 'REVENUE_CONCENTRATION'), events.index)
+            self.assertEqual(set(events.index.get_level_values('ticker')), {'T000', 'T004'})
+            active = store.active().set_index(['ticker', 'trap_type'])
+            self.assertIn(('T001', 'TERMINAL_VALUE_DEPENDENCY'), active.index)
+            self.assertNotIn(('T004', 'TERMINAL_VALUE_DEPENDENCY'), active.index)
+            self.assertEqual(active.loc[('T000', 'TERMINAL_VALUE_DEPENDENCY'), 'first_fired'],
+                             pd.Timestamp(1000.0, unit='s'))
+            history = store.history('T000')
+            self.assertEqual(history['event'].iloc[0], 'fired')
+            self.assertEqual(len(store.runs()), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,136 @@
+"""
+Unit tests for the SQLite disk cache behind atlas_terminal's CacheManager.
+"""
+
+import unittest
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from atlas_terminal.core import disk_cache
+from atlas_terminal.core.disk_cache import DiskCache, PARQUET_AVAILABLE
+from atlas_terminal.core.cache_manager import CacheManager
+from core.shared_cache import SharedCache
+
+
+class TestDiskCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = DiskCache(os.path.join(self.tmp.name, 'cache.db'), sweep_interval=None)
+
+    def tearDown(self):
+        self.cache.close()
+        self.tmp.cleanup()
+
+    def test_roundtrip_values(self):
+        frame = pd.DataFrame({'close': [1.0, 2.5]}, index=pd.date_range('2024-01-01', periods=2))
+        series = pd.Series([1, 2, 3], name='spy')
+        self.cache.set('frame', frame)
+        self.cache.set('series', series)
+        self.cache.set('dict', {'a': [1, 2]})
+        pd.testing.assert_frame_equal(self.cache.get('frame'), frame, check_freq=False)
+        self.assertEqual(self.cache.get('series').tolist(), [1, 2, 3])
+        self.assertEqual(self.cache.get('dict'), {'a': [1, 2]})
+        self.assertIsNone(self.cache.get('missing'))
+
+    def test_series_keeps_name_and_freq(self):
+        close = pd.Series(np.linspace(100, 110, 10), name='Close',
+                          index=pd.bdate_range('2024-01-01', periods=10))
+        self.cache.set('close', close)
+        self.cache.set('unnamed', pd.Series([1.0, 2.0]))
+        restored = self.cache.get('close')
+        pd.testing.assert_series_equal(restored, close)
+        self.assertEqual(restored.name, 'Close')
+        self.assertEqual(restored.index.freq, close.index.freq)
+        self.assertIsNone(self.cache.get('unnamed').name)
+
+    @unittest.skipUnless(PARQUET_AVAILABLE, "pyarrow not installed")
+    def test_frames_stored_as_parquet(self):
+        self.cache.set('frame', pd.DataFrame({'x': [1.0]}))
+        fmt = self.cache._conn().execute(
+            "SELECT format FROM cache_entries WHERE key = 'frame'").fetchone()[0]
+        self.assertEqual(fmt, disk_cache.FORMAT_PARQUET_FRAME)
+
+    def test_expiry(self):
+        self.cache.set('short', 1, ttl=0.01)
+        self.cache.set('old', 2, created=time.time() - 100)
+        time.sleep(0.02)
+        self.assertIsNone(self.cache.get('short'))
+        self.assertEqual(self.cache.get('old', max_age=200), 2)
+        self.assertIsNone(self.cache.get('old', max_age=50))
+        self.assertEqual(len(self.cache), 0)
+
+        self.cache.set('a', 1, ttl=0.01)
+        time.sleep(0.02)
+        self.assertEqual(self.cache.purge_expired(), 1)
+
+    def test_lru_size_bound(self):
+        blob = np.zeros(1000).tobytes()
+        self.cache.max_bytes = len(blob) * 3 + 500
+        for i in range(5):
+            self.cache.set(f'k{i}', blob)
+            self.cache._conn().execute(
+                "UPDATE cache_entries SET accessed = ? WHERE key = ?", (i, f'k{i}'))
+        self.cache.evict()
+        self.assertLessEqual(self.cache.stats()['bytes'], self.cache.max_bytes)
+        self.assertIsNone(self.cache.get('k0'))
+        self.assertIsNotNone(self.cache.get('k4'))
+
+    def test_eviction_spans_batches(self):
+        from unittest import mock
+        blob = np.zeros(100).tobytes()
+        self.cache.max_bytes = 10 ** 9
+        for i in range(20):
+            self.cache.set(f'k{i}', blob)
+            self.cache._conn().execute(
+                "UPDATE cache_entries SET accessed = ? WHERE key = ?", (i, f'k{i}'))
+        entry = self.cache.stats()['bytes'] // 20
+        self.cache.max_bytes = entry * 5 + entry // 2
+        with mock.patch.object(disk_cache, 'EVICT_BATCH', 4):
+            self.assertEqual(self.cache.evict(), 15)
+        self.assertEqual(len(self.cache), 5)
+        self.assertIsNone(self.cache.get('k14'))
+        self.assertIsNotNone(self.cache.get('k15'))
+
+    def test_clear_pattern(self):
+        self.cache.set('benchmark_return:ab', 1)
+        self.cache.set('gics_sector:cd', 2)
+        self.assertEqual(self.cache.clear('benchmark'), 1)
+        self.assertEqual(len(self.cache), 1)
+
+
+class TestCacheManager(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.manager = CacheManager(cache_dir=self.tmp.name, memory=SharedCache())
+
+    def tearDown(self):
+        self.manager.disk.close()
+        self.tmp.cleanup()
+
+    def test_disk_hit_after_memory_loss(self):
+        key = self.manager.get_cache_key('prices', 'SPY')
+        self.manager.set(key, pd.DataFrame({'x': [1.0]}), ttl=60)
+        self.manager.memory.clear()
+        self.assertEqual(self.manager.get(key, ttl=60)['x'].tolist(), [1.0])
+        self.assertEqual(self.manager.get_stats()['disk_hits'], 1)
+        self.assertEqual(os.listdir(self.tmp.name).count('atlas_cache.db'), 1)
+
+    def test_frame_arguments_hash_by_content(self):
+        a = pd.DataFrame({'x': np.arange(100)})
+        b = a.copy()
+        b.iloc[50, 0] = -1   # same str() (truncated), different contents
+        self.assertNotEqual(self.manager.get_cache_key('f', a), self.manager.get_cache_key('f', b))
+        self.assertEqual(self.manager.get_cache_key('f', a), self.manager.get_cache_key('f', a.copy()))
+
+
+if __name__ == '__main__':
+    unittest.main()
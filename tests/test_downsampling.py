@@ -0,0 +1,112 @@
+"""
+Unit tests for core/downsampling.py and the TradingView data preparation
+that uses it.
+"""
+
+import unittest
+from unittest import mock
+import numpy as np
+import pandas as pd
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.downsampling import lttb_indices, aggregate_ohlcv, downsample_series, target_points
+from core import tradingview_charts
+from core.tradingview_charts import prepare_ohlcv_data, prepare_line_data
+
+
+def _price_frame(n=3000):
+    idx = pd.bdate_range('2010-01-01', periods=n)
+    close = 100 * np.exp(np.cumsum(np.random.default_rng(7).normal(0, 0.01, n)))
+    return pd.DataFrame({'Open': close, 'High': close * 1.01, 'Low': close * 0.99,
+                         'Close': close, 'Volume': np.ones(n)}, index=idx)
+
+
+class TestLTTB(unittest.TestCase):
+
+    def test_keeps_endpoints_and_budget(self):
+        y = np.sin(np.linspace(0, 20, 5000))
+        keep = lttb_indices(np.arange(5000), y, 200)
+        self.assertEqual(len(keep), 200)
+        self.assertEqual(keep[0], 0)
+        self.assertEqual(keep[-1], 4999)
+        self.assertTrue(np.all(np.diff(keep) > 0))
+
+    def test_keeps_isolated_spike(self):
+        y = np.zeros(10000)
+        y[6543] = 50.0
+        keep = lttb_indices(np.arange(10000), y, 100)
+        self.assertIn(6543, keep)
+
+    def test_short_series_untouched(self):
+        s = pd.Series([1.0, np.nan, 3.0])
+        self.assertEqual(downsample_series(s, 10).tolist(), [1.0, 3.0])
+
+
+class TestOHLCBuckets(unittest.TestCase):
+
+    def test_bucket_aggregation(self):
+        arrays = {
+            'time': np.arange(6),
+            'open': np.array([1, 2, 3, 4, 5, 6], dtype=float),
+            'high': np.array([2, 9, 4, 5, 6, 7], dtype=float),
+            'low': np.array([0, 1, 2, 3, -1, 5], dtype=float),
+            'close': np.array([1.5, 2.5, 3.5, 4.5, 5.5, 6.5]),
+            'volume': np.array([1, 1, 1, 1, 1, 1], dtype=float),
+        }
+        out = aggregate_ohlcv(arrays, 2)
+        self.assertEqual(out['time'].tolist(), [0, 3])
+        self.assertEqual(out['open'].tolist(), [1, 4])
+        self.assertEqual(out['high'].tolist(), [9, 7])
+        self.assertEqual(out['low'].tolist(), [0, -1])
+        self.assertEqual(out['close'].tolist(), [3.5, 6.5])
+        self.assertEqual(out['volume'].tolist(), [3, 3])
+
+
+class TestTradingViewPreparation(unittest.TestCase):
+
+    def test_candles_respect_width_budget(self):
+        data = prepare_ohlcv_data(_price_frame(), width_px=800)
+        self.assertEqual(len(data['candles']), target_points(3000, 800, kind='candle'))
+        self.assertEqual(len(data['volume']), len(data['candles']))
+        self.assertEqual(data['candles'][0]['time'], '2010-01-01')
+        self.assertEqual(sum(v['value'] for v in data['volume']), 3000)
+
+    def test_line_visible_range(self):
+        data = prepare_line_data(_price_frame(), visible_range=('2012-01-01', '2012-03-31'))
+        self.assertEqual(data[0]['time'], '2012-01-02')
+        self.assertLessEqual(data[-1]['time'], '2012-03-31')
+        self.assertEqual(set(data[0]), {'time', 'value'})
+
+    def test_nan_values_serialize_as_none(self):
+        df = _price_frame(10)
+        df.iloc[3, df.columns.get_loc('High')] = np.nan
+        data = prepare_ohlcv_data(df)
+        self.assertIsNone(data['candles'][3]['high'])
+
+    def test_indicator_overlays_share_candle_times(self):
+        df = _price_frame()
+        # Intraday bars at 00:00 and 12:00: the bucket starts alone look daily
+        df.index = pd.date_range('2015-01-01', periods=len(df), freq='12h')
+        with mock.patch.object(tradingview_charts, 'TRADINGVIEW_AVAILABLE', True), \
+                mock.patch.object(tradingview_charts, 'renderLightweightCharts') as render:
+            tradingview_charts.render_candlestick_with_indicators(
+                df, 'k', show_ma_50=True, show_ma_200=True, show_bollinger=True, width_px=800)
+        series = render.call_args[0][0][0]['series']
+        candle_times = [c['time'] for c in series[0]['data']]
+        self.assertEqual(len(series), 5)
+        for overlay in series[1:]:
+            times = [p['time'] for p in overlay['data']]
+            self.assertTrue(set(times) <= set(candle_times), overlay['options']['title'])
+            self.assertEqual(times, sorted(times))
+            self.assertEqual(times[-1], candle_times[-1])
+        ma50 = df['Close'].rolling(50, min_periods=20).mean()
+        last = pd.Timestamp(series[1]['data'][-1]['time'], unit='s')
+        self.assertAlmostEqual(series[1]['data'][-1]['value'], ma50[last])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,126 @@
+"""
+Unit tests for the native GARCH-family volatility engine (analytics/volatility)
+and the GARCH VaR in risk_analytics.atlas_risk_metrics.
+"""
+
+import unittest
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analytics.volatility import _initial, _natural, _recursion, fit_garch, garch_volatility
+from risk_analytics.atlas_risk_metrics import RiskAnalytics
+
+
+def _simulate(n_days=3000, n_assets=4, omega=2e-6, alpha=0.05, gamma=0.08, beta=0.88, seed=11):
+    """GJR-GARCH paths (gamma=0 gives plain GARCH(1,1))."""
+    rng = np.random.default_rng(seed)
+    h = np.full(n_assets, omega / (1 - alpha - gamma / 2 - beta))
+    eps = np.empty((n_days, n_assets))
+    for t in range(n_days):
+        eps[t] = np.sqrt(h) * rng.standard_normal(n_assets)
+        h = omega + (alpha + gamma * (eps[t] < 0)) * eps[t] ** 2 + beta * h
+    return pd.DataFrame(eps, index=pd.bdate_range('2012-01-02', periods=n_days),
+                        columns=[f'A{i}' for i in range(n_assets)])
+
+
+class TestLikelihood(unittest.TestCase):
+
+    def test_analytic_gradient_matches_finite_differences(self):
+        eps = _simulate(400, 3).to_numpy()
+        eps = eps - eps.mean(axis=0)
+        mask = np.ones_like(eps, dtype=bool)
+        var = (eps ** 2).mean(axis=0)
+        rng = np.random.default_rng(0)
+        for model in ('garch', 'gjr', 'egarch'):
+            u = _initial(model, var) + rng.normal(0, 0.05, _initial(model, var).shape)
+            theta, jac = _natural(model, u, var)
+            _, _, dll, _ = _recursion(model, theta, eps, mask, var)
+            analytic = np.einsum('in,ikn->kn', dll, jac)
+            numeric = np.zeros_like(u)
+            for i in range(u.shape[0]):
+                up, down = u.copy(), u.copy()
+                up[i] += 1e-6
+                down[i] -= 1e-6
+                numeric[i] = (_recursion(model, _natural(model, up, var)[0], eps, mask, var, grad=False)[0]
+                              - _recursion(model, _natural(model, down, var)[0], eps, mask, var,
+                                           grad=False)[0]) / 2e-6
+            np.testing.assert_allclose(analytic, numeric, rtol=1e-5, atol=1e-4, err_msg=model)
+
+
+class TestFit(unittest.TestCase):
+
+    def test_garch_recovers_parameters(self):
+        returns = _simulate(gamma=0.0, alpha=0.08)
+        fit = fit_garch(returns, 'garch')
+        self.assertTrue(fit.converged)
+        np.testing.assert_allclose(fit.params['alpha'], 0.08, atol=0.03)
+        np.testing.assert_allclose(fit.params['beta'], 0.88, atol=0.05)
+        self.assertTrue((fit.params['gamma'] == 0).all())
+
+    def test_gjr_picks_up_leverage(self):
+        returns = _simulate()
+        fit = fit_garch(returns, 'gjrGARCH')             # rugarch name accepted
+        self.assertEqual(fit.model, 'gjr')
+        np.testing.assert_allclose(fit.params['gamma'], 0.08, atol=0.04)
+        np.testing.assert_allclose(fit.params['persistence'], 0.97, atol=0.02)
+        # The asymmetric model fits asymmetric data better than GARCH(1,1)
+        plain = fit_garch(returns, 'garch')
+        self.assertTrue((fit.params['loglik'] > plain.params['loglik']).all())
+
+    def test_egarch_negative_leverage(self):
+        fit = fit_garch(_simulate(), 'eGARCH')
+        self.assertTrue((fit.params['gamma'] < 0).all())
+        self.assertTrue((fit.params['beta'] < 1).all())
+
+    def test_shorter_history_in_batch_matches_solo_fit(self):
+        returns = _simulate(1500, 3)
+        returns.iloc[:400, 1] = np.nan
+        batch = fit_garch(returns, 'garch')
+        solo = fit_garch(returns['A1'].dropna(), 'garch')
+        self.assertAlmostEqual(batch.params.loc['A1', 'loglik'], solo.params.loc['A1', 'loglik'], places=2)
+        self.assertTrue(batch.conditional_volatility['A1'].iloc[:400].isna().all())
+        self.assertEqual(int(batch.params.loc['A1', 'n_obs']), 1100)
+
+    def test_forecast_reverts_to_long_run(self):
+        fit = fit_garch(_simulate(gamma=0.0, alpha=0.08), 'garch')
+        path = fit.forecast(2000)
+        np.testing.assert_allclose(path.iloc[-1] ** 2, fit.params['long_run_variance'], rtol=1e-3)
+        np.testing.assert_allclose(path.iloc[0] ** 2, fit.next_variance)
+        term = fit.term_structure((1, 21, 252))
+        np.testing.assert_allclose(term.loc[1], np.sqrt(fit.next_variance * 252))
+        np.testing.assert_allclose(term.loc[21], np.sqrt((path.iloc[:21] ** 2).mean() * 252))
+
+    def test_summary_and_validation(self):
+        returns = _simulate(800, 1)['A0']
+        result = garch_volatility(returns, 'sGARCH')
+        self.assertEqual(result['model'], 'garch')
+        self.assertAlmostEqual(result['last_volatility'], float(result['volatility'].iloc[-1]))
+        with self.assertRaises(ValueError):
+            fit_garch(returns, 'figarch')
+        with self.assertRaises(ValueError):
+            fit_garch(returns.iloc[:10])
+
+
+class TestRiskAnalyticsVaR(unittest.TestCase):
+
+    def test_garch_var_tracks_current_volatility(self):
+        returns = _simulate(1500, 1, gamma=0.0, alpha=0.1, beta=0.85)['A0']
+        stressed = returns.copy()
+        stressed.iloc[-5:] = -0.06
+        var_stressed = RiskAnalytics(stressed).value_at_risk(0.99)
+        var_hist = RiskAnalytics(stressed).value_at_risk(0.99, method='historical')
+        self.assertGreater(var_stressed['var'], var_hist['var'])
+        self.assertGreater(var_stressed['cvar'], var_stressed['var'])
+        vol = RiskAnalytics(stressed).conditional_volatility(horizon=10)
+        self.assertGreater(vol['current_volatility'], vol['long_run_volatility'])
+        self.assertLess(RiskAnalytics(returns).value_at_risk(0.99)['var'], var_stressed['var'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,221 @@
+"""
+Unit tests for the durable job queue (services/jobs): SQLite and sync_jobs
+stores, the worker (retries, leases, cancellation, progress) and the
+built-in ingestion handler.
+"""
+
+import unittest
+import tempfile
+import threading
+import time
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.jobs.store import (
+    CANCELLED, FAILED, QUEUED, RUNNING, SUCCEEDED, JobStore, SQLiteJobStore, SupabaseJobStore,
+)
+from services.jobs.worker import PermanentJobError, Worker, backoff_delay
+from services.local_supabase import LocalSupabase, LocalSupabaseSyncClient
+
+
+class _StoreContract:
+    """Behaviour both stores must share; subclasses provide make_store()."""
+
+    def setUp(self):
+        self.store = self.make_store()
+
+    def test_enqueue_dedupes_active_jobs(self):
+        a = self.store.enqueue("ingest_tickers", {"tickers": ["A", "B"], "interval": "1d"})
+        b = self.store.enqueue("ingest_tickers", {"interval": "1d", "tickers": ["A", "B"]})
+        c = self.store.enqueue("ingest_tickers", {"tickers": ["C"]})
+        self.assertEqual(a.id, b.id)
+        self.assertNotEqual(a.id, c.id)
+        self.assertNotEqual(self.store.enqueue("ingest_tickers", {"tickers": ["C"]}, dedupe=False).id, c.id)
+
+        # Once finished, an identical job is new work again
+        job = self.store.claim("w1", kinds=["ingest_tickers"])
+        self.assertEqual(job.id, a.id)
+        self.assertEqual((job.status, job.attempts), (RUNNING, 1))
+        self.assertTrue(self.store.finish(a.id, "w1", SUCCEEDED, result={"records": 3}))
+        again = self.store.enqueue("ingest_tickers", {"tickers": ["A", "B"], "interval": "1d"})
+        self.assertNotEqual(again.id, a.id)
+        self.assertEqual(self.store.get(a.id).result, {"records": 3})
+
+    def test_claim_is_exclusive_and_guarded(self):
+        job = self.store.enqueue("k", {"n": 1})
+        self.assertEqual(self.store.claim("w1").id, job.id)
+        self.assertIsNone(self.store.claim("w2"))
+        # Another worker cannot report on a job it does not hold
+        self.assertFalse(self.store.heartbeat(job.id, "w2", {"done": 1}))
+        self.assertFalse(self.store.finish(job.id, "w2", SUCCEEDED))
+        self.assertTrue(self.store.heartbeat(job.id, "w1", {"done": 1, "total": 2}))
+        self.assertEqual(self.store.get(job.id).progress, {"done": 1, "total": 2})
+
+    def test_delay_retry_and_cancel(self):
+        later = self.store.enqueue("k", {"n": 2}, delay=60)
+        self.assertIsNone(self.store.claim("w1"))
+        self.assertTrue(self.store.cancel(later.id))
+        self.assertEqual(self.store.get(later.id).status, CANCELLED)
+        self.assertFalse(self.store.cancel(later.id))
+
+        job = self.store.enqueue("k", {"n": 3})
+        self.store.claim("w1")
+        self.assertTrue(self.store.retry(job.id, "w1", "boom", delay=0))
+        retried = self.store.get(job.id)
+        self.assertEqual((retried.status, retried.error, retried.attempts), (QUEUED, "boom", 1))
+        self.assertEqual(self.store.claim("w2").attempts, 2)
+        # Cancelling a running job flags it; the next heartbeat tells the worker to stop
+        self.assertTrue(self.store.cancel(job.id))
+        self.assertFalse(self.store.heartbeat(job.id, "w2"))
+
+    def test_stale_leases_recovered(self):
+        job = self.store.enqueue("k", {"n": 4}, max_attempts=2)
+        self.store.claim("dead-worker")
+        time.sleep(0.02)
+        self.assertEqual(self.store.requeue_stale(lease=0.01), 1)
+        self.assertEqual(self.store.get(job.id).status, QUEUED)
+        self.store.claim("dead-worker")
+        time.sleep(0.02)
+        self.store.requeue_stale(lease=0.01)
+        final = self.store.get(job.id)
+        self.assertEqual(final.status, FAILED)
+        self.assertIn("lease expired", final.error)
+        self.assertEqual([j.id for j in self.store.list(status=FAILED)], [job.id])
+
+
+class TestJobStoreInterface(unittest.TestCase):
+
+    def test_incomplete_backend_fails_at_construction(self):
+        class NoRequeue(JobStore):
+            enqueue = get = list = claim = heartbeat = finish = retry = cancel = None
+        with self.assertRaises(TypeError):
+            JobStore()
+        with self.assertRaises(TypeError):
+            NoRequeue()
+
+
+class TestSQLiteJobStore(_StoreContract, unittest.TestCase):
+
+    def make_store(self):
+        self._dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self._dir.cleanup)
+        return SQLiteJobStore(os.path.join(self._dir.name, "jobs.sqlite3"))
+
+
+class TestSupabaseJobStore(_StoreContract, unittest.TestCase):
+
+    def make_store(self):
+        self.client = LocalSupabaseSyncClient()
+        return SupabaseJobStore(self.client)
+
+    def test_rows_use_sync_jobs_columns(self):
+        job = self.store.enqueue("ingest_tickers", {"tickers": ["A"]})
+        self.store.claim("w1")
+        self.store.finish(job.id, "w1", SUCCEEDED, result={"records": 7})
+        row = self.client.db.rows("sync_jobs")[0]
+        self.assertEqual((row["job_type"], row["status"], row["rows_synced"]),
+                         ("ingest_tickers", SUCCEEDED, 7))
+        self.assertEqual(row["settings"], {"tickers": ["A"]})
+
+
+class TestWorker(unittest.TestCase):
+
+    def setUp(self):
+        self._dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self._dir.cleanup)
+        self.path = os.path.join(self._dir.name, "jobs.sqlite3")
+        self.store = SQLiteJobStore(self.path)
+
+    def test_retries_with_backoff_then_succeeds(self):
+        calls = []
+
+        def flaky(payload, ctx):
+            calls.append(ctx.job.attempts)
+            if len(calls) < 3:
+                raise ConnectionError("provider down")
+            return {"records": 1}
+
+        worker = Worker(self.store, handlers={"flaky": flaky}, backoff_base=0.0)
+        job = self.store.enqueue("flaky", {}, max_attempts=3)
+        self.assertEqual(worker.run(idle_exit=0.0), 3)
+        final = self.store.get(job.id)
+        self.assertEqual((final.status, final.attempts, calls), (SUCCEEDED, 3, [1, 2, 3]))
+
+        # Permanent errors and exhausted attempts fail the job
+        def bad(payload, ctx):
+            raise PermanentJobError("missing tickers")
+        job = self.store.enqueue("bad", {})
+        Worker(self.store, handlers={"bad": bad}, backoff_base=0.0).run(idle_exit=0.0)
+        final = self.store.get(job.id)
+        self.assertEqual((final.status, final.attempts), (FAILED, 1))
+        self.assertIn("missing tickers", final.error)
+
+        self.assertGreaterEqual(backoff_delay(3, base=30), 120)
+        self.assertLessEqual(backoff_delay(20, base=30, cap=600, jitter=0.1), 660)
+
+    def test_progress_and_cancellation(self):
+        seen = {}
+
+        def long_job(payload, ctx):
+            for i in range(1000):
+                ctx.progress(i + 1, 1000, force=True, records=i)
+                if i == 4:
+                    seen["mid"] = self.store.get(ctx.job.id).progress
+                    self.store.cancel(ctx.job.id)
+            return {}
+
+        job = self.store.enqueue("long", {})
+        Worker(self.store, handlers={"long": long_job}).run(idle_exit=0.0)
+        final = self.store.get(job.id)
+        self.assertEqual(seen["mid"], {"done": 5, "total": 1000, "records": 4})
+        self.assertEqual(final.status, CANCELLED)
+        self.assertEqual(final.progress["done"], 6)
+
+    def test_concurrent_workers_run_each_job_once(self):
+        ran, lock = [], threading.Lock()
+
+        def record(payload, ctx):
+            with lock:
+                ran.append(payload["n"])
+            return {}
+
+        for n in range(40):
+            self.store.enqueue("record", {"n": n})
+        workers = [Worker(SQLiteJobStore(self.path), handlers={"record": record}, poll_interval=0.01)
+                   for _ in range(4)]
+        threads = [threading.Thread(target=w.run, kwargs={"idle_exit": 0.05}) for w in workers]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(sorted(ran), list(range(40)))
+        self.assertEqual(len(self.store.list(status=SUCCEEDED, limit=100)), 40)
+
+    def test_unknown_kind_fails(self):
+        job = self.store.enqueue("no_such_kind", {})
+        Worker(self.store).run_once()
+        self.assertEqual(self.store.get(job.id).status, FAILED)
+
+
+class TestIngestionJob(unittest.TestCase):
+
+    def test_ingest_tickers_handler(self):
+        db = LocalSupabase()
+        store = SupabaseJobStore(LocalSupabaseSyncClient(db))
+        tickers = [f"SYN{i}" for i in range(12)]
+        job = store.enqueue("ingest_tickers", {"tickers": tickers, "provider": "replay",
+                                               "start": "2024-01-01", "end": "2024-01-31",
+                                               "chunk": 5})
+        final = Worker(store, supabase_client=db).run_once()
+        self.assertEqual(final.id, job.id)
+        self.assertEqual(final.status, SUCCEEDED)
+        self.assertEqual(final.result["records"], 12 * 23)
+        self.assertEqual(final.progress, {"done": 12, "total": 12, "records": 12 * 23, "failed": 0})
+        self.assertEqual(db.count("price_history"), 12 * 23)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,121 @@
+"""
+Unit tests for atlas_quant_dashboard/analytics/incremental_state.py: an
+appended state must match a full recompute with the pure metric functions.
+"""
+
+import unittest
+import numpy as np
+import pandas as pd
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from atlas_quant_dashboard.analytics import performance_metrics as pm
+from atlas_quant_dashboard.analytics import statistical_metrics as stm
+from atlas_quant_dashboard.analytics.incremental_state import IncrementalMetricState, ROLLING_WINDOWS
+
+
+def _returns(n=900, seed=3):
+    rng = np.random.default_rng(seed)
+    idx = pd.bdate_range('2020-01-01', periods=n)
+    bench = pd.Series(rng.normal(0.0004, 0.011, n), index=idx)
+    port = 0.9 * bench + pd.Series(rng.normal(0.0001, 0.006, n), index=idx)
+    return port, bench
+
+
+class TestIncrementalMetricState(unittest.TestCase):
+
+    def assertAnatomyEqual(self, got, expected):
+        self.assertEqual(set(got), set(expected))
+        for key, value in expected.items():
+            self.assertAlmostEqual(got[key], value, places=12, msg=key)
+
+    def assertMatchesFullRecompute(self, snap, port, bench):
+        scalars = {
+            'ann_return': pm.annualise_return(port),
+            'ann_vol': pm.annualise_volatility(port),
+            'sharpe': pm.sharpe_ratio(port),
+            'sortino': pm.sortino_ratio(port),
+            'calmar': pm.calmar_ratio(port),
+            'tracking_error': pm.tracking_error(port, bench),
+            'ir': pm.information_ratio(port, bench),
+            'convexity': pm.convexity_score(port, bench),
+            'max_drawdown': pm.max_drawdown(port),
+        }
+        scalars['up_capture'], scalars['down_capture'] = pm.capture_ratios(port, bench)
+        for key, expected in scalars.items():
+            self.assertAlmostEqual(snap[key], expected, places=10, msg=key)
+
+        series = {
+            'cum_returns': pm.cumulative_return(port),
+            'bench_cum_returns': pm.cumulative_return(bench),
+            'drawdown_series': pm.drawdown_series(port),
+            'rolling_beta': pm.rolling_beta(port, bench, 63),
+        }
+        for w in ROLLING_WINDOWS:
+            series[f'rolling_sharpe_{w}'] = pm.rolling_sharpe(port, w)
+            series[f'rolling_vol_{w}'] = pm.rolling_volatility(port, w)
+            series[f'rolling_returns_{w}'] = pm.rolling_returns(port, w)
+        for key, expected in series.items():
+            np.testing.assert_allclose(snap[key].values, expected.values, rtol=1e-8, atol=1e-12,
+                                       err_msg=key)
+            self.assertTrue(snap[key].index.equals(port.index), key)
+
+        self.assertAnatomyEqual(snap['drawdown_anatomy'], pm.drawdown_anatomy(port))
+        expected_moments = stm.return_moments(port)
+        for key, expected in expected_moments.items():
+            self.assertAlmostEqual(snap['return_moments'][key], expected, places=9, msg=key)
+        expected_stability = stm.rolling_sharpe_stability(port, window=63)
+        for key in ('mean_sharpe', 'std_sharpe', 'breach_count', 'stable'):
+            self.assertEqual(snap['sharpe_stability'][key], expected_stability[key], key)
+
+    def test_append_matches_full_recompute(self):
+        port, bench = _returns()
+        state = IncrementalMetricState()
+        self.assertEqual(state.update(port.iloc[:600], bench.iloc[:600]), 'rebuild')
+        # Grow one day at a time, then in a block
+        for end in range(601, 611):
+            self.assertEqual(state.update(port.iloc[:end], bench.iloc[:end]), 'append')
+        self.assertEqual(state.update(port, bench), 'append')
+        self.assertEqual(state.rebuilds, 1)
+        self.assertMatchesFullRecompute(state.snapshot(), port, bench)
+
+    def test_unchanged_history_is_a_no_op(self):
+        port, bench = _returns(300)
+        state = IncrementalMetricState()
+        state.update(port, bench)
+        self.assertEqual(state.update(port.copy(), bench.copy()), 'unchanged')
+
+    def test_revised_history_triggers_rebuild(self):
+        port, bench = _returns(400)
+        state = IncrementalMetricState()
+        state.update(port.iloc[:350], bench.iloc[:350])
+        revised = port.copy()
+        revised.iloc[100] += 0.01
+        self.assertEqual(state.update(revised, bench), 'rebuild')
+        self.assertEqual(state.rebuilds, 2)
+        self.assertMatchesFullRecompute(state.snapshot(), revised, bench)
+
+    def test_short_history_and_open_drawdown(self):
+        idx = pd.bdate_range('2024-01-01', periods=12)
+        port = pd.Series([0.01, -0.02, -0.01, 0.04, 0.0, -0.03, 0.01, 0.005, -0.01, -0.02, 0.01, -0.004],
+                         index=idx)
+        bench = port * 0.5 + 0.001
+        state = IncrementalMetricState()
+        state.update(port.iloc[:5], bench.iloc[:5])
+        state.update(port, bench)
+        snap = state.snapshot()
+        self.assertAnatomyEqual(snap['drawdown_anatomy'], pm.drawdown_anatomy(port))
+        self.assertTrue(snap['rolling_sharpe_21'].isna().all())
+
+    def test_rejects_nans(self):
+        port, bench = _returns(50)
+        port.iloc[3] = np.nan
+        with self.assertRaises(ValueError):
+            IncrementalMetricState().update(port, bench)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,131 @@
+"""
+Unit tests for the columnar OHLCVBatch type, the yfinance multi-symbol
+fetch and batched ingestion in services/market_data.
+"""
+
+import unittest
+from unittest import mock
+import numpy as np
+import pandas as pd
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.market_data.base_provider import (
+    BaseMarketDataProvider, OHLCVBatch, OHLCVRecord, as_batch,
+)
+
+
+def _batch(n=5, ticker='AAA'):
+    dates = pd.bdate_range('2024-01-01', periods=n).strftime('%Y-%m-%d')
+    prices = np.column_stack([np.arange(n) + k for k in (1.0, 2.0, 0.5, 1.5, 1.4)])
+    prices[1, 4] = np.nan
+    return OHLCVBatch(ticker, '1d', 'test', dates, prices, np.arange(n) * 100)
+
+
+def _yf_frame(tickers, n=4):
+    idx = pd.bdate_range('2024-02-01', periods=n)
+    fields = ['Open', 'High', 'Low', 'Close', 'Adj Close', 'Volume']
+    cols = pd.MultiIndex.from_product([tickers, fields])
+    data = np.tile(np.array([10, 11, 9, 10.5, 10.4, 1000.0]), (n, len(tickers)))
+    frame = pd.DataFrame(data, index=idx, columns=cols)
+    frame.loc[idx[0], (tickers[-1], slice(None))] = np.nan   # not traded on day 0
+    return frame
+
+
+class TestOHLCVBatch(unittest.TestCase):
+
+    def test_record_round_trip(self):
+        batch = _batch()
+        records = batch.to_records()
+        self.assertIsInstance(records[0], OHLCVRecord)
+        self.assertIsNone(records[1].adj_close)
+        self.assertEqual(records[3].volume, 300)
+        again = OHLCVBatch.from_records(records)
+        np.testing.assert_array_equal(again.prices, batch.prices)
+        self.assertEqual(again.dates.tolist(), batch.dates.tolist())
+
+    def test_frame_shares_price_memory(self):
+        batch = _batch()
+        frame = batch.to_frame()
+        self.assertTrue(np.shares_memory(frame['close'].to_numpy(), batch.prices))
+        self.assertEqual(list(frame.columns), ['open', 'high', 'low', 'close', 'adj_close', 'volume'])
+        self.assertIsInstance(frame.index, pd.DatetimeIndex)
+
+    def test_upsert_rows(self):
+        rows = _batch().to_upsert_rows('asset-1')
+        self.assertEqual(len(rows), 5)
+        self.assertEqual(rows[0]['price_date'], '2024-01-01')
+        self.assertIsNone(rows[1]['adjusted_close'])
+        self.assertIsInstance(rows[2]['volume'], int)
+        self.assertIsInstance(rows[2]['close'], float)
+
+    def test_filter_and_validation(self):
+        self.assertEqual(len(_batch().filter_dates('2024-01-02', '2024-01-04')), 3)
+        with self.assertRaises(ValueError):
+            OHLCVBatch('X', '1d', 't', ['2024-01-01'], np.zeros((2, 5)), [1, 2])
+        self.assertIsNone(as_batch([]))
+
+
+class TestYFinanceBatch(unittest.TestCase):
+
+    def setUp(self):
+        from services.market_data.yfinance_provider import YFinanceProvider
+        self.provider = YFinanceProvider()
+
+    def test_multi_symbol_single_download(self):
+        with mock.patch('services.market_data.yfinance_provider.yf.download',
+                        return_value=_yf_frame(['AAA', 'BBB'])) as download:
+            result = self.provider.fetch_ohlcv_batch(['AAA', 'BBB'], '2024-02-01', '2024-02-06')
+        self.assertEqual(download.call_count, 1)
+        self.assertEqual(len(result['AAA']), 4)
+        self.assertEqual(len(result['BBB']), 3)     # NaN row dropped
+        self.assertEqual(result['BBB'].dates[0], '2024-02-02')
+        self.assertEqual(result['AAA'].volume.dtype, np.int64)
+
+    def test_single_ticker_records_api(self):
+        frame = _yf_frame(['AAA']).swaplevel(axis=1)    # single download: (field, ticker)
+        with mock.patch('services.market_data.yfinance_provider.yf.download', return_value=frame):
+            records = self.provider.fetch_ohlcv('AAA', '2024-02-01', '2024-02-06')
+        self.assertEqual(len(records), 3)
+        self.assertEqual(records[0].adj_close, 10.4)
+
+
+class _FakeProvider(BaseMarketDataProvider):
+    provider_name = 'fake'
+
+    def __init__(self):
+        self.batch_calls = []
+
+    def fetch_batch(self, ticker, start, end, interval='1d'):
+        return _batch(3, ticker)
+
+    def fetch_ohlcv_batch(self, tickers, start, end, interval='1d'):
+        self.batch_calls.append(list(tickers))
+        return {t: _batch(3, t) for t in tickers if t != 'MISS'}
+
+    def is_available(self):
+        return True
+
+
+class TestBatchedIngestion(unittest.TestCase):
+
+    def test_sync_tickers_groups_by_range(self):
+        from services.market_data.ingestion_service import MarketDataIngestionService
+        supabase = mock.MagicMock()
+        provider = _FakeProvider()
+        service = MarketDataIngestionService(supabase, provider=provider)
+        with mock.patch.object(MarketDataIngestionService, '_get_fallback_provider', return_value=None):
+            result = service.sync_tickers(['AAA', 'BBB', 'MISS', 'AAPL250117C00150000'], force_full=True)
+        self.assertEqual(provider.batch_calls, [['AAA', 'BBB', 'MISS']])
+        self.assertEqual(result, {'AAA': 3, 'BBB': 3, 'MISS': 3, 'AAPL250117C00150000': 0})
+        upserts = [c for c in supabase.mock_calls
+                   if c[0] == 'table().upsert' and c.kwargs.get('on_conflict', '').startswith('asset_id')]
+        self.assertEqual(len(upserts), 3)
+        self.assertEqual(upserts[0].args[0][0]['source'], 'test')
+
+
+if __name__ == '__main__':
+    unittest.main()
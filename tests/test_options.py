@@ -0,0 +1,176 @@
+"""
+Unit tests for the options analytics engine (analytics/options): pricing,
+Greeks, the batched implied-vol solver, SVI surfaces and strategy P&L, all
+on synthetic chain snapshots.
+"""
+
+import unittest
+import sys
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analytics.options import (
+    MARKET_CLOSE, ChainSnapshot, OptionLeg, black76, black_scholes, breakevens, implied_volatility,
+    pnl_grid, strategy_legs, svi_total_variance,
+)
+
+AS_OF = pd.Timestamp('2026-01-05 12:00')
+SVI = {30: (0.0033, 0.029, -0.5, 0.0, 0.2), 90: (0.0099, 0.050, -0.4, 0.01, 0.25),
+       240: (0.0263, 0.081, -0.3, 0.02, 0.3)}
+
+
+def _snapshot(spot=100.0, rate=0.04):
+    """A chain priced off known SVI smiles, quoted 1% wide around the model price."""
+    rows = []
+    for days, params in SVI.items():
+        expiry = AS_OF.normalize() + pd.Timedelta(days=days)
+        T = (expiry + MARKET_CLOSE - AS_OF).total_seconds() / (365 * 86400)
+        strikes = np.arange(60.0, 141.0, 2.5)
+        k = np.log(strikes / (spot * np.exp(rate * T)))
+        iv = np.sqrt(svi_total_variance(k, *params) / T)
+        for kind in ('call', 'put'):
+            price = black_scholes(spot, strikes, T, rate, iv, 0.0, kind)
+            rows += [{'expiry': expiry, 'kind': kind, 'strike': K, 'bid': p * 0.995, 'ask': p * 1.005,
+                      'last': p, 'volume': 10, 'open_interest': 100} for K, p in zip(strikes, price)]
+    return ChainSnapshot('TEST', spot, AS_OF, pd.DataFrame(rows), rate=rate)
+
+
+class TestPricing(unittest.TestCase):
+
+    def test_put_call_parity_and_black76(self):
+        K = np.array([80.0, 100.0, 120.0])
+        call = black_scholes(100, K, 0.5, 0.03, 0.25, 0.01, 'call')
+        put = black_scholes(100, K, 0.5, 0.03, 0.25, 0.01, 'put')
+        np.testing.assert_allclose(call - put, 100 * np.exp(-0.005) - K * np.exp(-0.015))
+        F = 100 * np.exp(0.02 * 0.5)
+        np.testing.assert_allclose(black76(F, K, 0.5, 0.03, 0.25), black_scholes(100, K, 0.5, 0.03, 0.25, 0.01))
+
+    def test_greeks_match_finite_differences(self):
+        args = dict(K=105.0, T=0.75, r=0.03, q=0.01)
+        for kind in ('call', 'put'):
+            g = black_scholes(100.0, sigma=0.3, kind=kind, greeks=True, **args)
+
+            def price(S=100.0, sigma=0.3, T=0.75, r=0.03):
+                return float(black_scholes(S, args['K'], T, r, sigma, args['q'], kind))
+            h = 1e-4
+            self.assertAlmostEqual(g['delta'], (price(S=100 + h) - price(S=100 - h)) / (2 * h), places=6)
+            self.assertAlmostEqual(g['gamma'], (price(S=100 + h) - 2 * price() + price(S=100 - h)) / h ** 2,
+                                   places=4)
+            self.assertAlmostEqual(g['vega'], (price(sigma=0.3 + h) - price(sigma=0.3 - h)) / (2 * h) / 100,
+                                   places=6)
+            self.assertAlmostEqual(g['rho'], (price(r=0.03 + h) - price(r=0.03 - h)) / (2 * h) / 100, places=6)
+            self.assertAlmostEqual(g['theta'], -(price(T=0.75 + h) - price(T=0.75 - h)) / (2 * h) / 365,
+                                   places=6)
+
+    def test_black76_greeks_hold_forward_fixed(self):
+        F, K, T, r = 102.0, np.array([90.0, 105.0]), 0.5, 0.03
+        for kind in ('call', 'put'):
+            g = black76(F, K, T, r, 0.25, kind=kind, greeks=True)
+            h = 1e-5
+            fd = (black76(F, K, T, r + h, 0.25, kind) - black76(F, K, T, r - h, 0.25, kind)) / (2 * h) / 100
+            np.testing.assert_allclose(g['rho'], fd, atol=1e-8)
+            np.testing.assert_allclose(g['rho'], -T * g['price'] / 100)
+
+    def test_expiry_is_intrinsic(self):
+        g = black_scholes(100.0, np.array([90.0, 110.0]), 0.0, 0.03, 0.3, kind='put', greeks=True)
+        np.testing.assert_allclose(g['price'], [0.0, 10.0])
+        np.testing.assert_allclose(g['delta'], [0.0, -1.0])
+        np.testing.assert_allclose(g['gamma'], 0.0)
+
+
+class TestImpliedVolatility(unittest.TestCase):
+
+    def test_recovers_vols_across_a_large_chain(self):
+        rng = np.random.default_rng(0)
+        n = 5000
+        K = rng.uniform(50, 150, n)
+        T = rng.uniform(0.02, 2.0, n)
+        sigma = rng.uniform(0.05, 1.2, n)
+        kind = rng.choice(['call', 'put'], n)
+        g = black_scholes(100.0, K, T, 0.03, sigma, 0.01, kind, greeks=True)
+        iv = implied_volatility(g['price'], 100.0, K, T, 0.03, 0.01, kind)
+        informative = g['vega'] > 1e-3          # vol is only pinned down where price moves with it
+        np.testing.assert_allclose(iv[informative], sigma[informative], atol=1e-6)
+
+    def test_arbitrage_violations_are_nan(self):
+        iv = implied_volatility([0.5, 150.0, 0.0, 5.0], 100.0, [90.0, 100.0, 100.0, 100.0], [0.5, 0.5, 0.5, 0.0],
+                                kind='call')
+        self.assertTrue(np.isnan(iv).all())
+
+
+class TestChainSnapshot(unittest.TestCase):
+
+    def setUp(self):
+        self.snapshot = _snapshot()
+
+    def test_analyze_solves_every_contract(self):
+        chain = self.snapshot.analyze()
+        self.assertEqual(len(chain), len(self.snapshot.quotes))
+        self.assertFalse(chain['iv'].isna().any())
+        calls = chain[chain['kind'] == 'call']
+        self.assertTrue(((calls['delta'] > 0) & (calls['delta'] < 1)).all())
+        self.assertIs(self.snapshot.analyze(), chain)
+
+    def test_save_and_replay(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = self.snapshot.save(os.path.join(tmp, 'options', 'TEST.json'))
+            replayed = ChainSnapshot.load(path)
+        self.assertEqual(replayed.as_of, AS_OF)
+        self.assertEqual(replayed.expiries, self.snapshot.expiries)
+        np.testing.assert_allclose(replayed.analyze()['iv'], self.snapshot.analyze()['iv'])
+
+    def test_from_yfinance_frames(self):
+        calls = pd.DataFrame({'contractSymbol': ['X1'], 'strike': [100.0], 'bid': [4.0], 'ask': [4.2],
+                              'lastPrice': [4.1], 'impliedVolatility': [0.3], 'inTheMoney': [False]})
+        snap = ChainSnapshot.from_chains('X', 100.0, {'2026-02-20': (calls, pd.DataFrame())}, as_of=AS_OF)
+        self.assertEqual(list(snap.quotes['kind']), ['call'])
+        self.assertAlmostEqual(float(snap.analyze()['mid'].iloc[0]), 4.1)
+
+    def test_svi_surface_recovers_smiles(self):
+        surface = self.snapshot.surface()
+        self.assertEqual(len(surface.params), 3)
+        self.assertTrue((surface.params['rmse'] < 1e-4).all())
+        chain = self.snapshot.analyze()
+        fitted = surface.implied_vol(chain['strike'].to_numpy(), chain['T'].to_numpy())
+        np.testing.assert_allclose(fitted, chain['iv'], atol=5e-3)
+        # Between expiries: total variance interpolates monotonically
+        T = surface.params['T'].to_numpy()
+        mid = surface.total_variance(0.0, 0.5 * (T[0] + T[1]))
+        self.assertTrue(surface.total_variance(0.0, T[0]) < mid < surface.total_variance(0.0, T[1]))
+        self.assertEqual(surface.grid().shape, (3, 13))
+
+
+class TestStrategies(unittest.TestCase):
+
+    def test_straddle_payoff_at_expiry(self):
+        legs = [OptionLeg('call', 1, 100.0, 4.0, 0.25, 0.2), OptionLeg('put', 1, 100.0, 3.0, 0.25, 0.2)]
+        spots = np.array([80.0, 100.0, 120.0])
+        grid = pnl_grid(legs, spots, days=(0, 0.25 * 365))
+        np.testing.assert_allclose(grid.iloc[:, -1], [1300.0, -700.0, 1300.0])
+        self.assertEqual(sorted(round(x, 6) for x in breakevens(pnl_grid(legs, np.linspace(80, 120, 41),
+                                                                         days=[0.25 * 365]).iloc[:, 0])),
+                         [93.0, 107.0])
+
+    def test_presets_on_a_chain(self):
+        snapshot = _snapshot()
+        chain = snapshot.for_expiry(snapshot.expiries[1]).analyze()
+        condor = strategy_legs('iron_condor', chain, 100.0)
+        self.assertEqual([leg.quantity for leg in condor], [1, -1, -1, 1])
+        grid = pnl_grid(condor, np.linspace(70, 130, 61), days=[condor[0].T * 365])
+        # Defined risk: flat wings, credit kept between the short strikes
+        self.assertAlmostEqual(grid.iloc[0, 0], grid.iloc[1, 0], places=6)
+        self.assertGreater(grid.loc[100.0].iloc[0], 0)
+        covered = strategy_legs('covered_call', chain, 100.0)
+        self.assertEqual(covered[0].kind, 'stock')
+        with self.assertRaises(ValueError):
+            strategy_legs('butterfly', chain, 100.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,140 @@
+"""
+Unit tests for book-level position sizing (analytics/position_sizer.size_book):
+agreement with the single-name sizers, covariance Kelly, risk parity,
+caps and order generation, on synthetic returns.
+"""
+
+import unittest
+import sys
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analytics.covariance import sample_covariance
+from analytics.position_sizer import kelly_fraction, size_book, volatility_based
+
+
+def _returns(n_names=20, n_days=504, seed=0):
+    """Returns from a five-factor model with a small positive drift."""
+    rng = np.random.default_rng(seed)
+    factors = rng.standard_normal((n_days, 5)) * 0.01
+    loadings = rng.normal(0.5, 0.3, (n_names, 5))
+    noise = rng.standard_normal((n_days, n_names)) * 0.015 * rng.uniform(0.5, 2.0, n_names)
+    return pd.DataFrame(factors @ loadings.T + noise + 0.0004,
+                        index=pd.bdate_range('2024-01-01', periods=n_days),
+                        columns=[f'S{i:03d}' for i in range(n_names)])
+
+
+class TestSizeBook(unittest.TestCase):
+
+    def setUp(self):
+        self.returns = _returns()
+        self.prices = pd.Series(100.0, index=self.returns.columns)
+        self.loose = dict(max_position_pct=10.0, max_gross=1e9)
+
+    def test_single_name_methods_match_scalar_sizers(self):
+        book = size_book(self.returns, self.prices, 1e6, **self.loose).table
+        for ticker in ['S000', 'S007']:
+            r = self.returns[ticker]
+            wins, losses = r[r > 0], r[r < 0]
+            scalar = kelly_fraction(len(wins) / (len(wins) + len(losses)), wins.mean(), -losses.mean(),
+                                    1e6, 100.0, max_position_pct=10.0)
+            self.assertAlmostEqual(book.loc[ticker, 'kelly_pct'], scalar.kelly_fraction, places=10)
+            daily_vol = r.iloc[-63:].std()
+            scalar = volatility_based(daily_vol, 1e6, 100.0, max_position_pct=10.0)
+            self.assertAlmostEqual(book.loc[ticker, 'volatility_pct'] * 100, scalar.pct_of_portfolio, places=2)
+        np.testing.assert_allclose(book['fixed_fractional_pct'], 0.01)
+
+    def test_short_signals_flip_direction(self):
+        signals = pd.Series(1.0, index=self.returns.columns)
+        signals[['S001', 'S002']] = -1.0
+        signals['S003'] = 0.0
+        book = size_book(self.returns, self.prices, 1e6, signals=signals, **self.loose).table
+        self.assertTrue((book.loc[['S001', 'S002'], 'volatility_pct'] < 0).all())
+        self.assertTrue((book.loc[['S001', 'S002'], 'risk_parity_pct'] < 0).all())
+        self.assertEqual(book.loc['S003', 'target_pct'], 0.0)
+
+    def test_kelly_under_covariance(self):
+        cov = sample_covariance(self.returns)
+        mu = pd.Series(np.linspace(0.02, 0.12, 20), index=self.returns.columns)
+        book = size_book(self.returns, self.prices, 1e6, expected_returns=mu, covariance=cov,
+                         method='kelly_covariance', target_vol=10.0, **self.loose).table
+        full = np.linalg.solve(cov.values * 252, mu.to_numpy())
+        expected = np.where(full > 0, 0.5 * full, 0.0)
+        np.testing.assert_allclose(book['kelly_covariance_pct'], expected, atol=1e-10)
+        # With a volatility ceiling the book is scaled down to it
+        capped = size_book(self.returns, self.prices, 1e6, expected_returns=mu, covariance=cov,
+                           method='kelly_covariance', target_vol=0.05, **self.loose)
+        self.assertAlmostEqual(capped.stats.loc['kelly_covariance', 'ex_ante_vol'], 0.05, places=8)
+
+    def test_risk_parity_targets_volatility_and_budgets(self):
+        signals = pd.Series(np.where(np.arange(20) < 10, 1.0, 0.5), index=self.returns.columns)
+        book = size_book(self.returns, self.prices, 1e6, signals=signals, covariance=sample_covariance(self.returns),
+                         target_vol=0.08, **self.loose)
+        w = book.table['risk_parity_pct'].to_numpy()
+        cov = sample_covariance(self.returns).values * 252
+        contributions = w * (cov @ w)
+        np.testing.assert_allclose(contributions / contributions.sum(), signals / signals.sum(), atol=1e-8)
+        self.assertAlmostEqual(book.stats.loc['risk_parity', 'ex_ante_vol'], 0.08, places=8)
+        self.assertEqual(book.method, 'risk_parity')
+        np.testing.assert_allclose(book.table['target_notional'], w * 1e6)
+
+    def test_position_liquidity_and_gross_caps(self):
+        adv = pd.Series(1e9, index=self.returns.columns)
+        adv['S004'] = 20_000.0
+        book = size_book(self.returns, self.prices, 1e6, adv=adv, max_participation=0.05,
+                         max_position_pct=0.06, max_gross=0.9, target_vol=0.5)
+        table = book.table
+        self.assertAlmostEqual(table.loc['S004', 'liquidity_cap_pct'], 0.001)
+        self.assertLessEqual(abs(table.loc['S004', 'risk_parity_pct']), 0.001 + 1e-12)
+        for method in ('kelly', 'fixed_fractional', 'volatility', 'kelly_covariance', 'risk_parity'):
+            self.assertLessEqual(table[f'{method}_pct'].abs().max(), 0.06 + 1e-12)
+            self.assertLessEqual(book.stats.loc[method, 'gross'], 0.9 + 1e-9)
+
+    def test_unsizable_names(self):
+        returns = self.returns.copy()
+        returns.iloc[:-10, 5] = np.nan
+        prices = self.prices.copy()
+        prices['S006'] = np.nan
+        book = size_book(returns, prices, 1e6, **self.loose)
+        self.assertEqual(book.notes, {'S005': 'insufficient history', 'S006': 'no price'})
+        for ticker in ('S005', 'S006'):
+            self.assertTrue((book.table.loc[ticker, book.table.columns.str.endswith('_pct')
+                                            & (book.table.columns != 'liquidity_cap_pct')] == 0).all())
+        with self.assertRaises(ValueError):
+            size_book(returns, prices, 1e6, method='martingale')
+
+    def test_orders_against_current_positions(self):
+        book = size_book(self.returns, self.prices, 1e6, **self.loose)
+        target = book.table['target_shares']
+        positions = [{'symbol': 'S000', 'qty': target['S000'] + 5.0},
+                     {'symbol': 'S001', 'qty': target['S001']},
+                     {'symbol': 'AAPL', 'qty': 10.0}]
+        orders = book.orders(positions)
+        by_symbol = {o['symbol']: o for o in orders}
+        self.assertEqual(orders[0], {'symbol': 'S000', 'qty': 5.0, 'side': 'sell'})
+        self.assertNotIn('S001', by_symbol)
+        self.assertNotIn('AAPL', by_symbol)
+        self.assertEqual(len(orders), 19)
+        self.assertTrue(all(o['side'] == 'buy' for o in orders[1:]))
+        whole = book.orders(whole_shares=True)
+        self.assertTrue(all(float(o['qty']).is_integer() for o in whole))
+
+    def test_five_hundred_names_in_one_pass(self):
+        returns = _returns(500)
+        prices = pd.Series(np.linspace(10, 500, 500), index=returns.columns)
+        signals = pd.Series(np.random.default_rng(1).uniform(-1, 1, 500), index=returns.columns)
+        start = time.perf_counter()
+        book = size_book(returns, prices, 1e7, signals=signals)
+        self.assertLess(time.perf_counter() - start, 2.0)
+        self.assertEqual(len(book.table), 500)
+        self.assertEqual(len(book.stats), 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,128 @@
+"""
+Unit tests for the replay market data provider and the in-process
+Supabase stand-in used to exercise ingestion offline.
+"""
+
+import unittest
+import tempfile
+import numpy as np
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.local_supabase import LocalSupabase, LocalSupabaseSyncClient
+from services.market_data.ingestion_service import MarketDataIngestionService
+from services.market_data.provider_factory import PROVIDER_REGISTRY, get_provider
+from services.market_data.replay_provider import (
+    ReplayProvider, ReplayProviderError, save_batch, synthetic_batch,
+)
+
+
+class TestReplayProvider(unittest.TestCase):
+
+    def test_registered(self):
+        self.assertIs(PROVIDER_REGISTRY["replay"], ReplayProvider)
+        self.assertIsInstance(get_provider("replay", seed=3), ReplayProvider)
+
+    def test_synthetic_bars_do_not_depend_on_window(self):
+        a = synthetic_batch("AAA", "2024-01-01", "2024-03-29")
+        b = synthetic_batch("AAA", "2024-03-01", "2024-06-28")
+        overlap = sorted(set(a.dates) & set(b.dates))
+        self.assertEqual(len(overlap), 21)
+        ia = [list(a.dates).index(d) for d in overlap]
+        ib = [list(b.dates).index(d) for d in overlap]
+        np.testing.assert_array_equal(a.prices[ia], b.prices[ib])
+        np.testing.assert_array_equal(a.volume[ia], b.volume[ib])
+        self.assertTrue((a.high >= np.maximum(a.open, a.close)).all())
+        self.assertTrue((a.low <= np.minimum(a.open, a.close)).all())
+        self.assertFalse(np.array_equal(a.close, synthetic_batch("BBB", "2024-01-01", "2024-03-29").close))
+
+    def test_error_injection(self):
+        provider = ReplayProvider(error_rate=1.0)
+        with self.assertRaises(ReplayProviderError):
+            provider.fetch_batch("AAA", "2024-01-01", "2024-01-31")
+        self.assertEqual(provider.fetch_ohlcv_batch(["AAA", "BBB"], "2024-01-01", "2024-01-31"), {})
+        self.assertEqual(provider.stats(), {"requests": 2, "failures": 3, "bars_served": 0})
+
+        provider = ReplayProvider(error_rate=0.3, seed=7)
+        served = provider.fetch_ohlcv_batch([f"T{i}" for i in range(400)], "2024-01-01", "2024-01-31")
+        self.assertEqual(provider.stats()["requests"], 1)
+        self.assertAlmostEqual(len(served) / 400, 0.7, delta=0.08)
+
+    def test_recordings_round_trip(self):
+        live = synthetic_batch("REC", "2024-01-01", "2024-02-29", seed=5)
+        with tempfile.TemporaryDirectory() as root:
+            save_batch(live, root)
+            provider = ReplayProvider(path=root, synthetic=False)
+            batch = provider.fetch_batch("REC", "2024-02-01", "2024-02-29")
+            self.assertEqual(list(batch.dates), [d for d in live.dates if d >= "2024-02-01"])
+            np.testing.assert_allclose(batch.prices, live.prices[-len(batch):])
+            with self.assertRaises(ValueError):
+                provider.fetch_batch("MISSING", "2024-02-01", "2024-02-29")
+
+
+class TestLocalSupabase(unittest.TestCase):
+
+    def test_builder_upsert_and_filters(self):
+        db = LocalSupabase()
+        first = db.table("assets").upsert({"symbol": "AAA", "name": "A"}, on_conflict="symbol").execute()
+        again = db.table("assets").upsert({"symbol": "AAA", "name": "A2"}, on_conflict="symbol").execute()
+        self.assertEqual(first.data[0]["id"], again.data[0]["id"])
+        self.assertEqual(db.count("assets"), 1)
+
+        asset_id = first.data[0]["id"]
+        rows = [{"asset_id": asset_id, "interval": "1d", "price_date": d, "close": float(i)}
+                for i, d in enumerate(["2024-01-01", "2024-01-02", "2024-01-03"])]
+        db.table("price_history").upsert(rows, on_conflict="asset_id,interval,price_date").execute()
+        db.table("positions").insert({"portfolio_id": "p1", "asset_id": asset_id}).execute()
+
+        res = (db.table("price_history").select("price_date").eq("asset_id", asset_id)
+               .gte("price_date", "2024-01-02").order("price_date", desc=True).execute())
+        self.assertEqual(res.data, [{"price_date": "2024-01-03"}, {"price_date": "2024-01-02"}])
+        res = db.table("positions").select("assets(symbol)").eq("portfolio_id", "p1").execute()
+        self.assertEqual(res.data, [{"assets": {"symbol": "AAA"}}])
+        self.assertEqual(db.stats()["round_trips"], 6)
+
+    def test_postgrest_requests(self):
+        client = LocalSupabaseSyncClient()
+        prefer = "resolution=merge-duplicates,return=representation"
+        client._request("POST", "orders", query={"on_conflict": "order_id"}, prefer=prefer,
+                        json_payload=[{"order_id": "o1", "qty": 1}, {"order_id": "o2", "qty": 0}])
+        client._request("POST", "orders", query={"on_conflict": "order_id"}, prefer=prefer,
+                        json_payload={"order_id": "o1", "qty": 5})
+        rows = client._request("GET", "orders", query={"select": "order_id,qty", "qty": "neq.0"})
+        self.assertEqual(rows, [{"order_id": "o1", "qty": 5}])
+        rows = client._request("GET", "orders", query={"order_id": "in.(o1,o2)", "order": "order_id.desc"})
+        self.assertEqual([r["order_id"] for r in rows], ["o2", "o1"])
+
+
+class TestReplayIngestion(unittest.TestCase):
+
+    def test_sync_then_incremental(self):
+        db = LocalSupabase()
+        provider = ReplayProvider()
+        service = MarketDataIngestionService(db, provider)
+        tickers = [f"SYN{i}" for i in range(20)]
+
+        results = service.sync_tickers(tickers, start="2024-01-01", end="2024-01-31")
+        self.assertEqual(set(results.values()), {23})
+        self.assertEqual(db.count("price_history"), 20 * 23)
+        self.assertEqual(provider.stats()["requests"], 1)
+
+        results = service.sync_tickers(tickers, start="2024-01-01", end="2024-02-07")
+        self.assertEqual(set(results.values()), {5})
+        self.assertEqual(db.count("price_history"), 20 * 28)
+
+    def test_failed_tickers_retried_individually(self):
+        db = LocalSupabase()
+        service = MarketDataIngestionService(db, ReplayProvider(error_rate=0.2, seed=1))
+        results = service.sync_tickers([f"SYN{i}" for i in range(50)], start="2024-01-01", end="2024-01-31")
+        synced = sum(1 for n in results.values() if n)
+        self.assertGreater(synced, 45)
+        self.assertEqual(db.count("price_history"), synced * 23)
+
+
+if __name__ == '__main__':
+    unittest.main()
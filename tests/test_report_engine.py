@@ -0,0 +1,143 @@
+"""
+Unit tests for the multi-portfolio report engine (scheduler/engine) and the
+batched weekly / monthly / quarterly jobs built on it. Price fetching and
+delivery are patched out; no network access.
+"""
+
+import unittest
+from unittest import mock
+from datetime import datetime
+import threading
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scheduler import engine
+from scheduler.jobs import monthly_commentary, quarterly_attribution, weekly_snapshot
+from data.sectors import SECTOR_ETFS
+
+END = datetime(2026, 9, 30, 18, 0)
+DATES = pd.bdate_range('2026-01-02', END.date())
+
+
+def _prices(tickers, seed=3):
+    rng = np.random.default_rng(seed)
+    data = 100 * np.cumprod(1 + rng.normal(0.0004, 0.012, (len(DATES), len(tickers))), axis=0)
+    return pd.DataFrame(data, index=DATES, columns=tickers)
+
+
+class _FakeFetcher:
+    """Stands in for core.fetchers.fetch_historical_data and counts calls."""
+
+    def __init__(self, prices):
+        self.prices = prices
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def __call__(self, ticker, start, end):
+        with self.lock:
+            self.calls.append(ticker)
+        if ticker not in self.prices:
+            return None
+        close = self.prices[ticker]
+        return pd.DataFrame({'Close': close[(close.index >= pd.Timestamp(start)) &
+                                            (close.index <= pd.Timestamp(end))]})
+
+
+USERS = [
+    {'email': 'a@x.com', 'portfolio_tickers': ['AAA', 'BBB', 'CCC'],
+     'portfolio_weights': {'AAA': 0.5, 'BBB': 0.3, 'CCC': 0.2}, 'benchmark': 'BENCH'},
+    {'email': 'b@x.com', 'portfolio_tickers': ['BBB', 'DDD'], 'benchmark': 'BENCH'},
+    {'email': 'c@x.com', 'portfolio_tickers': ['AAA', 'DDD', 'MISSING'],
+     'portfolio_weights': {'AAA': 0.6, 'DDD': 0.4}, 'benchmark': 'BENCH'},
+]
+
+
+class TestEngine(unittest.TestCase):
+
+    def test_weight_matrix_and_portfolio_returns(self):
+        closes = _prices(['AAA', 'BBB', 'CCC', 'DDD'])
+        W = engine.weight_matrix(USERS, closes.columns)
+        self.assertEqual(W.shape, (3, 4))
+        self.assertAlmostEqual(W.loc[1, 'BBB'], 0.5)       # unweighted -> 1/len(tickers)
+        self.assertEqual(W.loc[2, 'BBB'], 0.0)
+
+        start = pd.Timestamp('2026-07-01')
+        got = engine.portfolio_returns(W, closes, start)
+        for i, cfg in enumerate(USERS):
+            held = [t for t in cfg['portfolio_tickers'] if t in closes.columns]
+            window = closes.loc[closes.index >= start, held]
+            w = np.array([cfg.get('portfolio_weights', {}).get(t, 1 / len(cfg['portfolio_tickers']))
+                          for t in held])
+            self.assertAlmostEqual(got[i], float((window.iloc[-1] / window.iloc[0] - 1).dot(w)))
+
+    def test_fan_out_isolates_failures(self):
+        def fn(cfg):
+            if cfg['email'] == 'b@x.com':
+                raise RuntimeError('sendgrid down')
+        outcomes = engine.fan_out(fn, USERS, max_workers=3)
+        self.assertIsNone(outcomes['a@x.com'])
+        self.assertIsInstance(outcomes['b@x.com'], RuntimeError)
+
+
+class TestBatchedJobs(unittest.TestCase):
+
+    def setUp(self):
+        self.fetcher = _FakeFetcher(_prices(['AAA', 'BBB', 'CCC', 'DDD', 'BENCH'] + list(SECTOR_ETFS.values())))
+        patcher = mock.patch('core.fetchers.fetch_historical_data', self.fetcher)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_weekly_fetches_each_ticker_once(self):
+        sent = {}
+        with mock.patch.object(weekly_snapshot, 'datetime', wraps=datetime) as dt, \
+                mock.patch.object(weekly_snapshot, '_market_context', return_value={}), \
+                mock.patch.object(weekly_snapshot, '_render_and_send',
+                                  side_effect=lambda cfg, snap, ctx: sent.setdefault(cfg['email'], snap)):
+            dt.now.return_value = END
+            outcomes = weekly_snapshot.execute_weekly_snapshot_batch(USERS)
+        self.assertEqual(sorted(self.fetcher.calls), ['AAA', 'BBB', 'CCC', 'DDD', 'MISSING'])
+        self.assertEqual(set(outcomes), {'a@x.com', 'b@x.com', 'c@x.com'})
+        self.assertTrue(all(e is None for e in outcomes.values()))
+
+        prices = self.fetcher.prices
+        ytd = prices.loc[prices.index >= pd.Timestamp('2026-01-01'), ['AAA', 'BBB', 'CCC']]
+        expected = float((ytd.iloc[-1] / ytd.iloc[0] - 1).dot([0.5, 0.3, 0.2]))
+        self.assertAlmostEqual(sent['a@x.com']['ytd_return'], expected)
+        self.assertEqual({m['ticker'] for m in sent['c@x.com']['top_movers']}, {'AAA', 'DDD'})
+
+    def test_monthly_market_context_from_shared_prices(self):
+        seen = {}
+        with mock.patch.object(monthly_commentary, '_regime_context', return_value=None) as regime, \
+                mock.patch.object(monthly_commentary, '_generate_and_send',
+                                  side_effect=lambda cfg, ctx, text: seen.setdefault(cfg['email'], text)):
+            outcomes = monthly_commentary.execute_monthly_commentary_batch(USERS)
+        regime.assert_called_once()
+        self.assertEqual(len(self.fetcher.calls), 5)
+        self.assertEqual(set(outcomes), {'a@x.com', 'b@x.com', 'c@x.com'})
+        self.assertTrue(seen['b@x.com'].startswith('- BBB: '))
+        self.assertNotIn('MISSING', seen['c@x.com'])
+
+    def test_quarterly_batch(self):
+        delivered = {}
+        sectors = {'AAA': 'Information Technology', 'BBB': 'Energy', 'CCC': 'Financials',
+                   'DDD': 'Health Care'}
+        with mock.patch('data.sectors.classify_sectors', return_value=sectors) as classify, \
+                mock.patch.object(quarterly_attribution, '_deliver',
+                                  side_effect=lambda cfg, data: delivered.setdefault(cfg['email'], data)):
+            outcomes = quarterly_attribution.execute_quarterly_attribution_batch(USERS)
+        classify.assert_called_once()
+        self.assertEqual(len(self.fetcher.calls), len(set(self.fetcher.calls)))
+        self.assertTrue(all(e is None for e in outcomes.values()))
+        data = delivered['a@x.com']
+        effects = data['allocation_effect'] + data['selection_effect'] + data['interaction_effect']
+        self.assertAlmostEqual(effects, data['total_return'] - data['attribution_benchmark_return'])
+
+
+if __name__ == '__main__':
+    unittest.main()
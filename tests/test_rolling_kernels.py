@@ -0,0 +1,78 @@
+"""
+Unit tests for atlas_quant_dashboard/analytics/rolling_kernels.py against
+the pandas rolling reference implementations.
+"""
+
+import unittest
+import numpy as np
+import pandas as pd
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from atlas_quant_dashboard.analytics import rolling_kernels as rk
+from atlas_quant_dashboard.analytics.performance_metrics import sortino_ratio
+
+TRADING_DAYS = 252
+
+
+def _returns(n=600, k=None, seed=3):
+    rng = np.random.default_rng(seed)
+    idx = pd.bdate_range('2018-01-01', periods=n)
+    if k is None:
+        return pd.Series(rng.normal(0.0004, 0.01, n), index=idx)
+    return pd.DataFrame(rng.normal(0.0004, 0.01, (n, k)), index=idx,
+                        columns=[f'A{i}' for i in range(k)])
+
+
+class TestRollingKernels(unittest.TestCase):
+
+    def test_moments_match_pandas(self):
+        r = _returns()
+        r.iloc[100] = np.nan
+        for w in (5, 63):
+            pd.testing.assert_series_equal(rk.rolling_mean(r, w), r.rolling(w).mean(), rtol=1e-9)
+            pd.testing.assert_series_equal(rk.rolling_std(r, w), r.rolling(w).std(), rtol=1e-9)
+
+    def test_sharpe_and_compound_return(self):
+        r = _returns()
+        w = 21
+        ref = r.rolling(w).apply(lambda x: x.mean() / x.std(ddof=1) * np.sqrt(TRADING_DAYS), raw=True)
+        pd.testing.assert_series_equal(rk.rolling_sharpe(r, w), ref, rtol=1e-8)
+        ref = r.rolling(w).apply(lambda x: (1 + x).prod() ** (TRADING_DAYS / w) - 1, raw=True)
+        pd.testing.assert_series_equal(rk.rolling_compound_return(r, w), ref, rtol=1e-8)
+
+    def test_constant_window_sharpe_is_nan(self):
+        r = pd.Series([0.001] * 30 + list(_returns(30)))
+        self.assertTrue(np.isnan(rk.rolling_sharpe(r, 10).iloc[25]))
+
+    def test_sortino_matches_scalar_definition(self):
+        r = _returns(300)
+        ref = r.rolling(63).apply(lambda x: sortino_ratio(pd.Series(x)), raw=True)
+        pd.testing.assert_series_equal(rk.rolling_sortino(r, 63), ref, rtol=1e-8)
+
+    def test_matrix_beta_and_correlation(self):
+        m = _returns(400, k=4)
+        b = _returns(400, seed=9)
+        beta = rk.rolling_beta(m, b, 63)
+        corr = rk.rolling_correlation(m, b, 63)
+        self.assertEqual(beta.shape, m.shape)
+        for col in m.columns:
+            ref = m[col].rolling(63).cov(b) / b.rolling(63).var()
+            np.testing.assert_allclose(beta[col], ref, rtol=1e-8)
+            np.testing.assert_allclose(corr[col], m[col].rolling(63).corr(b), rtol=1e-8, atol=1e-12)
+
+    def test_rolling_max_and_drawdown(self):
+        m = _returns(257, k=3)
+        for w in (1, 10, 64, 257):
+            np.testing.assert_array_equal(rk.rolling_max(m, w).values, m.rolling(w).max().values)
+        wealth = (1 + m).cumprod()
+        ref = wealth / wealth.rolling(20, min_periods=20).max() - 1
+        np.testing.assert_allclose(rk.rolling_drawdown(m, 20), ref, rtol=1e-12)
+        np.testing.assert_allclose(rk.drawdown(m), wealth / wealth.cummax() - 1, rtol=1e-12)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,143 @@
+"""
+Unit tests for bulk SBC screening (analytics/sbc_screener) and the shared
+statement-level helpers in analytics/sbc_detector, on synthetic yfinance-shaped
+statements (no network).
+"""
+
+import unittest
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analytics.sbc_detector import SBCDetector, sbc_trends
+from analytics.sbc_forecaster import SBCForecaster, SBCForecastMethod
+from analytics.sbc_screener import screen_sbc
+
+DATES = pd.to_datetime(['2025-12-31', '2024-12-31', '2023-12-31', '2022-12-31'])   # yfinance: newest first
+
+
+def _statements(revenue, sbc=None, shares=None, sbc_line='Stock Based Compensation'):
+    financials = pd.DataFrame([revenue], index=['Total Revenue'], columns=DATES)
+    if shares is not None:
+        financials.loc['Diluted Average Shares'] = shares
+    cashflow = pd.DataFrame([[-1.0, -1.0, -1.0, -1.0]], index=['Net Income'], columns=DATES)
+    if sbc is not None:
+        cashflow.loc[sbc_line] = sbc
+    return {'cashflow': cashflow, 'financials': financials}
+
+
+UNIVERSE = {
+    # SBC falls from 20% to 11% of revenue; shares grow 5% a year
+    'HIGH': _statements([1000.0, 800.0, 600.0, 500.0], [110.0, 112.0, 96.0, 100.0],
+                        [1157.625, 1102.5, 1050.0, 1000.0]),
+    'LOW': _statements([5000.0, 5000.0, 5000.0, 5000.0], [100.0, 100.0, 100.0, 100.0],
+                       [1000.0, 1000.0, 1000.0, 1000.0]),
+    # Missing a year of SBC (NaN) and reported under another label
+    'GAP': _statements([200.0, 200.0, 200.0, 200.0], [12.0, np.nan, 10.0, 8.0], sbc_line='Share Based Compensation'),
+    'NOSBC': _statements([300.0, 300.0, 300.0, 300.0]),
+    'EMPTY': None,
+}
+
+
+class TestTrends(unittest.TestCase):
+
+    def test_matches_per_ticker_loop(self):
+        pct = pd.DataFrame({'A': [10.0, 8.0, 7.0, 6.0], 'B': [1.0, np.nan, 2.0, 3.0], 'C': [np.nan, np.nan, 4.0, np.nan]},
+                           index=[2022, 2023, 2024, 2025])
+        stats = sbc_trends(pct)
+        self.assertAlmostEqual(stats.loc['A', 'avg_annual_change_pct'], np.mean(np.diff([10, 8, 7, 6])))
+        self.assertAlmostEqual(stats.loc['B', 'avg_annual_change_pct'], np.mean(np.diff([1, 2, 3])))
+        self.assertAlmostEqual(stats.loc['A', 'volatility'], np.std([10, 8, 7, 6]))
+        self.assertEqual(list(stats['trend_direction'][:2]), ['decreasing', 'increasing'])
+        self.assertTrue(pd.isna(stats.loc['C', 'trend_direction']))
+        self.assertEqual(list(stats['latest_sbc_pct']), [6.0, 3.0, 4.0])
+        self.assertTrue(stats.loc['A', 'is_normalizing'])
+        self.assertTrue(np.isnan(stats.loc['C', 'avg_annual_change_pct']))
+
+
+class TestDetectorWithStatements(unittest.TestCase):
+
+    def test_preloaded_statements_reproduce_detector_output(self):
+        detector = SBCDetector('high', statements=UNIVERSE['HIGH'])
+        data = detector.extract_sbc_data()
+        self.assertEqual(data['method'], 'cash_flow_statement')
+        self.assertEqual(data['line_item'], 'Stock Based Compensation')
+        self.assertEqual(list(data['sbc_pct_revenue']), [2022, 2023, 2024, 2025])
+        np.testing.assert_allclose(list(data['sbc_pct_revenue'].values()), [20.0, 16.0, 14.0, 11.0])
+        self.assertTrue(data['is_material'])
+        trend = detector.analyze_sbc_trend()
+        self.assertEqual(trend['trend_direction'], 'decreasing')
+        self.assertAlmostEqual(trend['avg_annual_change_pct'], -3.0)
+        self.assertEqual(trend['historical_years'], [2022, 2023, 2024, 2025])
+        inputs = detector.get_forecast_inputs()
+        self.assertEqual((inputs['normalization_target'], inputs['years_to_normalize']), (7.0, 7))
+
+    def test_income_statement_fallback(self):
+        statements = _statements([100.0, 100.0, 100.0, 100.0])
+        statements['financials'].loc['Stock Based Compensation'] = [4.0, 4.0, 4.0, 4.0]
+        data = SBCDetector('inc', statements=statements).extract_sbc_data()
+        self.assertEqual(data['method'], 'income_statement')
+        self.assertEqual(data['latest_sbc_pct'], 4.0)
+
+
+class TestScreen(unittest.TestCase):
+
+    def setUp(self):
+        self.screen = screen_sbc(list(UNIVERSE) + ['high'], fetch=False, loader=UNIVERSE.get)
+
+    def test_aligned_histories(self):
+        self.assertEqual(list(self.screen.sbc_pct.columns), ['HIGH', 'LOW', 'GAP', 'NOSBC'])
+        self.assertEqual(list(self.screen.sbc_pct.index), [2022, 2023, 2024, 2025])
+        self.assertTrue(np.isnan(self.screen.sbc_pct.loc[2024, 'GAP']))
+        self.assertEqual(self.screen.errors, {'EMPTY': 'No financial statements available'})
+
+    def test_summary_and_ranking(self):
+        summary = self.screen.summary
+        self.assertEqual(summary.loc['GAP', 'line_item'], 'Share Based Compensation')
+        self.assertEqual(summary.loc['NOSBC', 'method'], 'estimated')
+        self.assertEqual(summary.loc['NOSBC', 'latest_sbc_pct'], 2.0)        # unknown sector: 2%
+        self.assertAlmostEqual(summary.loc['HIGH', 'share_growth_pct'], 5.0)
+        self.assertAlmostEqual(summary.loc['LOW', 'share_growth_pct'], 0.0)
+        self.assertEqual(int(summary.loc['HIGH', 'latest_year']), 2025)
+        self.assertEqual(list(self.screen.ranked().index), ['HIGH', 'GAP', 'LOW'])
+        self.assertEqual(list(self.screen.ranked(material_only=True).index), ['HIGH', 'GAP'])
+        self.assertEqual(self.screen.ranked(by='share_growth_pct').index[0], 'HIGH')
+        self.assertIn('NOSBC', self.screen.ranked(include_estimated=True).index)
+        with self.assertRaises(ValueError):
+            self.screen.ranked(by='pe')
+
+    def test_feeds_detector_and_forecaster_without_fetching(self):
+        detector = SBCDetector('HIGH', statements=UNIVERSE['HIGH'])
+        detector.extract_sbc_data()
+        self.assertEqual(self.screen.sbc_data('HIGH'), detector.sbc_data)
+        self.assertEqual(self.screen.forecast_inputs('high'), detector.get_forecast_inputs())
+        self.assertEqual(self.screen.detector('HIGH').get_forecast_inputs(), detector.get_forecast_inputs())
+
+        config = self.screen.forecast_config('HIGH', forecast_years=5)
+        self.assertEqual((config.starting_sbc_pct_revenue, config.normalization_target_pct,
+                          config.years_to_normalize), (11.0, 7.0, 5))
+        forecast = SBCForecaster(config).generate_sbc_forecast({y: 1000.0 for y in range(1, 6)})
+        self.assertAlmostEqual(forecast[5]['sbc_pct_revenue'], 7.0)
+        maintain = self.screen.forecast_config('LOW', SBCForecastMethod.MAINTAIN_CURRENT)
+        self.assertEqual(maintain.starting_sbc_pct_revenue, 2.0)
+        with self.assertRaises(KeyError):
+            self.screen.sbc_data('EMPTY')
+
+    def test_five_hundred_names(self):
+        rng = np.random.default_rng(0)
+        universe = {f'T{i:03d}': _statements(list(rng.uniform(100, 1000, 4)), list(rng.uniform(1, 50, 4)))
+                    for i in range(500)}
+        screen = screen_sbc(universe, loader=universe.get)
+        self.assertEqual(screen.sbc_pct.shape, (4, 500))
+        ranked = screen.ranked()
+        self.assertEqual(len(ranked), 500)
+        self.assertTrue(ranked['latest_sbc_pct'].is_monotonic_decreasing)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+"""
+Unit tests for core/shared_cache.py.
+"""
+
+import unittest
+import threading
+import time
+import numpy as np
+import pandas as pd
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.shared_cache import SharedCache, shared_cached, estimate_size
+
+
+class TestSharedCache(unittest.TestCase):
+
+    def test_lru_eviction_by_entries(self):
+        cache = SharedCache(max_entries=2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')            # 'b' is now least recently used
+        cache.set('c', 3)
+        self.assertIn('a', cache)
+        self.assertNotIn('b', cache)
+        self.assertEqual(cache.stats()['evictions'], 1)
+
+    def test_byte_budget(self):
+        frame = pd.DataFrame({'x': np.zeros(1000)})
+        size = estimate_size(frame)
+        cache = SharedCache(max_bytes=int(size * 2.5))
+        for key in 'abc':
+            cache.set(key, frame)
+        self.assertEqual(len(cache), 2)
+        self.assertLessEqual(cache.size_bytes, cache.max_bytes)
+        self.assertFalse(cache.set('huge', pd.DataFrame({'x': np.zeros(10000)})))
+
+    def test_ttl_and_max_age(self):
+        cache = SharedCache()
+        cache.set('k', 'v', ttl=0.05)
+        self.assertEqual(cache.get('k'), 'v')
+        time.sleep(0.06)
+        self.assertIsNone(cache.get('k'))
+
+        cache.set('k2', 'v')
+        self.assertIsNone(cache.get('k2', max_age=0))
+        self.assertEqual(cache.stats()['expirations'], 2)
+
+    def test_concurrent_callers_share_one_fetch(self):
+        cache = SharedCache()
+        calls = []
+
+        def fetch():
+            calls.append(1)
+            time.sleep(0.05)
+            return 'SPY'
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(cache.get_or_compute('spy', fetch)))
+                   for _ in range(10)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, ['SPY'] * 10)
+
+    def test_none_is_not_cached(self):
+        cache = SharedCache()
+        calls = []
+        fetch = lambda: calls.append(1)
+        cache.get_or_compute('k', fetch)
+        cache.get_or_compute('k', fetch)
+        self.assertEqual(len(calls), 2)
+
+
+class TestSharedCachedDecorator(unittest.TestCase):
+
+    def test_keyed_by_arguments_and_copies_frames(self):
+        cache = SharedCache()
+        calls = []
+
+        @shared_cached(ttl=60, cache=cache)
+        def prices(ticker, period='1y'):
+            calls.append((ticker, period))
+            return pd.DataFrame({'close': [1.0, 2.0]})
+
+        first = prices('SPY')
+        first['extra'] = 0
+        second = prices('SPY')
+        prices('SPY', period='5y')
+        self.assertEqual(calls, [('SPY', '1y'), ('SPY', '5y')])
+        self.assertNotIn('extra', second.columns)
+
+
+if __name__ == '__main__':
+    unittest.main()
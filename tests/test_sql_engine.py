@@ -0,0 +1,169 @@
+"""
+Unit tests for the SQL Terminal's local engine (services/sql_engine): SQL
+normalisation, table references, Parquet snapshots from LocalSupabase and
+the replay price store, routing, and DuckDB queries when it is installed.
+"""
+
+import unittest
+import sys
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.local_supabase import LocalSupabase
+from services.market_data.replay_provider import save_batch, synthetic_batch
+from services.sql_engine import (
+    DUCKDB_AVAILABLE, LocalSQLEngine, SnapshotStore, normalize_sql, referenced_tables,
+)
+
+
+def _supabase(n_prices=2600):
+    db = LocalSupabase()
+    db.table("assets").insert([{"symbol": s, "name": s, "asset_class": "us_equity", "metadata": {"x": 1}}
+                               for s in ("AAPL", "MSFT")]).execute()
+    assets = {r["symbol"]: r["id"] for r in db.rows("assets")}
+    dates = pd.bdate_range("2016-01-01", periods=n_prices // 2)
+    rng = np.random.default_rng(0)
+    db.table("price_history").insert([
+        {"asset_id": assets[s], "price_date": d.date().isoformat(), "interval": "1d",
+         "close": float(100 * np.exp(rng.normal(0, 0.01)))}
+        for s in assets for d in dates]).execute()
+    db.table("sync_log").insert([{"started_at": "2026-03-01T06:00:00+00:00", "status": "ok"}]).execute()
+    return db
+
+
+class TestSQLText(unittest.TestCase):
+
+    def test_normalize_sql(self):
+        a = "SELECT a,  b -- trailing comment\nFROM   positions /* block */ WHERE s = 'x  --y';"
+        b = "select a, b FROM positions WHERE s = 'x  --y'"
+        self.assertEqual(normalize_sql(a), "SELECT a, b FROM positions WHERE s = 'x  --y'")
+        self.assertNotEqual(normalize_sql(a), normalize_sql(b))
+        self.assertEqual(normalize_sql('SELECT "My  Col"\n\n FROM t ;'), 'SELECT "My  Col" FROM t')
+
+    def test_referenced_tables(self):
+        sql = """
+        WITH r AS (SELECT * FROM price_history ph JOIN public.assets a ON a.id = ph.asset_id)
+        SELECT EXTRACT(YEAR FROM ph.price_date), SUBSTRING(a.symbol FROM 1 FOR 2)
+        FROM r LEFT JOIN "sync_log" s ON s.status IS DISTINCT FROM 'from orders'
+        WHERE a.id IN (SELECT column_name FROM information_schema.columns)
+        """
+        self.assertEqual(referenced_tables(sql),
+                         {"price_history", "assets", "sync_log", "information_schema.columns"})
+
+
+class TestSnapshotStore(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = SnapshotStore(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_refresh_from_supabase(self):
+        db = _supabase()
+        results = self.store.refresh_from_supabase(db, tables=("assets", "price_history", "sync_log", "nope"),
+                                                   page_size=500)
+        self.assertEqual(results["price_history"], 2600)
+        self.assertEqual(results["assets"], 2)
+        self.assertEqual(results["nope"], 0)
+        prices = pd.read_parquet(self.store.path("price_history"))
+        self.assertEqual(len(prices), 2600)
+        self.assertEqual(prices["id"].nunique(), 2600)
+        self.assertEqual(type(prices["price_date"].iloc[0]).__name__, "date")
+        log = pd.read_parquet(self.store.path("sync_log"))
+        self.assertTrue(pd.api.types.is_datetime64_any_dtype(log["started_at"]))
+        assets = pd.read_parquet(self.store.path("assets"))
+        self.assertEqual(assets["metadata"].iloc[0], '{"x": 1}')
+        self.assertEqual(self.store.manifest["price_history"]["source"], "supabase")
+
+        version = self.store.version
+        self.store.refresh_from_supabase(db, tables=("sync_log",))
+        self.assertNotEqual(self.store.version, version)
+
+    def test_local_price_store(self):
+        replay = os.path.join(self.tmp.name, "replay")
+        for ticker in ("AAPL", "NPN.JO"):
+            save_batch(synthetic_batch(ticker, "2024-01-01", "2024-12-31"), replay)
+        rows = self.store.refresh_local_prices(replay)
+        prices = pd.read_parquet(self.store.path("local_prices"))
+        self.assertEqual(rows, len(prices))
+        self.assertEqual(set(prices["symbol"]), {"AAPL", "NPN.JO"})
+        self.assertEqual(list(prices.columns[:2]), ["symbol", "price_date"])
+        self.assertEqual(self.store.refresh_local_prices(os.path.join(self.tmp.name, "missing")), 0)
+
+    def test_staleness_and_routing(self):
+        frame = pd.DataFrame({"id": [1], "x": [1.0]})
+        now = time.time()
+        self.store.write("positions", frame, "test", at=now - 3 * 86400)
+        self.store.write("assets", frame, "test", at=now)
+        self.assertEqual(self.store.stale_tables(["positions", "assets", "nope"], 86400, now), ["positions"])
+
+        engine = LocalSQLEngine(self.store)
+        target, reason = engine.route("SELECT * FROM orders")
+        self.assertEqual(target, "remote")
+        if not DUCKDB_AVAILABLE:
+            self.assertIn("duckdb", reason)
+            return
+        self.assertIn("orders", reason)
+        self.assertEqual(engine.route("SELECT * FROM assets")[0], "local")
+        sql = "SELECT * FROM positions p JOIN assets a ON a.id = p.id"
+        self.assertEqual(engine.route(sql), ("remote", "snapshot stale: positions"))
+        self.assertEqual(engine.route(sql, push_down_stale=False)[0], "local")
+
+
+@unittest.skipUnless(DUCKDB_AVAILABLE, "duckdb not installed")
+class TestLocalSQLEngine(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = SnapshotStore(self.tmp.name)
+        self.store.refresh_from_supabase(_supabase(), tables=("assets", "price_history", "sync_log"))
+        self.engine = LocalSQLEngine(self.store)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_window_query_and_cache(self):
+        sql = """
+        SELECT a.symbol, ph.price_date,
+               ph.close / LAG(ph.close) OVER (PARTITION BY a.symbol ORDER BY ph.price_date) - 1 AS ret,
+               ROUND(ph.close::numeric, 2) AS close
+        FROM price_history ph JOIN assets a ON a.id = ph.asset_id
+        ORDER BY a.symbol, ph.price_date
+        """
+        first = self.engine.query(sql)
+        self.assertTrue(first["ok"], first["err"])
+        self.assertEqual(first["rows"], 2600)
+        self.assertFalse(first["cached"])
+        again = self.engine.query(sql.replace("\n", " ") + ";")
+        self.assertTrue(again["cached"])
+        self.assertIs(again["df"], first["df"])
+
+        # A refresh changes the version and invalidates the cached result
+        self.store.write("sync_log", pd.DataFrame({"id": [1], "status": ["ok"]}), "test")
+        self.assertFalse(self.engine.query(sql)["cached"])
+
+    def test_postgres_surface_and_explain(self):
+        r = self.engine.query("SELECT STRING_AGG(symbol, ', ' ORDER BY symbol) AS s FROM assets")
+        self.assertEqual(r["df"]["s"].iloc[0], "AAPL, MSFT")
+        schema = self.engine.schema()
+        self.assertIn("price_history", schema)
+        self.assertIn("close", [c["name"] for c in schema["price_history"]])
+        plan = self.engine.explain("SELECT symbol FROM assets WHERE symbol = 'AAPL'")
+        self.assertIn("assets", plan.lower())
+
+    def test_file_and_settings_access_blocked(self):
+        for sql in ("SELECT * FROM read_csv('/etc/passwd')", "COPY assets TO 'x.csv'", "SET threads = 1"):
+            self.assertFalse(self.engine.query(sql)["ok"], sql)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+"""
+Unit tests for the vectorised Hurst / DFA estimators and the warm-started,
+memoised distribution fits in atlas_quant_dashboard/analytics/statistical_metrics.py.
+"""
+
+import unittest
+import numpy as np
+import pandas as pd
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scipy import stats
+from atlas_quant_dashboard.analytics import statistical_metrics as stm
+
+
+def _loop_rs(r, window):
+    """Reference R/S: the original per-chunk loop."""
+    sub_rs = []
+    for start in range(0, len(r) - window, window):
+        chunk = r[start:start + window]
+        deviation = np.cumsum(chunk - chunk.mean())
+        s = chunk.std(ddof=1)
+        if s > 0:
+            sub_rs.append((deviation.max() - deviation.min()) / s)
+    return np.mean(sub_rs)
+
+
+def _fat_tailed(n=1500, seed=5):
+    return pd.Series(stats.t.rvs(4, scale=0.008, size=n, random_state=seed) + 0.0004)
+
+
+class TestHurst(unittest.TestCase):
+
+    def test_rescaled_range_matches_loop(self):
+        r = np.random.default_rng(0).normal(0, 0.01, 1003)
+        for window in (20, 57, 250, 500):
+            self.assertAlmostEqual(stm.rescaled_range(r, window), _loop_rs(r, window), places=10)
+
+    def test_dfa_separates_noise_from_persistence(self):
+        rng = np.random.default_rng(1)
+        noise = rng.normal(size=4000)
+        ar = np.zeros(4000)
+        for i in range(1, 4000):
+            ar[i] = 0.7 * ar[i - 1] + noise[i]
+        self.assertAlmostEqual(stm.dfa_exponent(pd.Series(noise)), 0.5, delta=0.08)
+        self.assertGreater(stm.dfa_exponent(pd.Series(ar)), stm.dfa_exponent(pd.Series(noise)))
+
+    def test_hurst_reports_dfa_and_handles_short_series(self):
+        result = stm.hurst_exponent(_fat_tailed())
+        self.assertIsNotNone(result['hurst'])
+        self.assertIn('dfa_alpha', result)
+        self.assertIsNone(stm.hurst_exponent(pd.Series(np.ones(10)))['hurst'])
+
+
+class TestDistributionFit(unittest.TestCase):
+
+    def setUp(self):
+        stm.clear_memo()
+
+    def test_mle_matches_scipy(self):
+        r = _fat_tailed()
+        fit = stm.distribution_fit(r)
+        df, loc, scale = stats.t.fit(r.values)
+        ll_scipy = stats.t.logpdf(r.values, df, loc, scale).sum()
+        self.assertGreaterEqual(fit['student_t']['log_likelihood'], round(ll_scipy, 2) - 0.01)
+        self.assertAlmostEqual(fit['student_t']['params']['df'], df, delta=0.05)
+        a, loc, scale = stats.skewnorm.fit(r.values)
+        ll_scipy = stats.skewnorm.logpdf(r.values, a, loc, scale).sum()
+        self.assertGreaterEqual(fit['skew_normal']['log_likelihood'], round(ll_scipy, 2) - 0.01)
+        self.assertEqual(fit['best_fit'], 'student_t')
+
+    def test_warm_start_reaches_same_optimum(self):
+        r = _fat_tailed()
+        previous = stm.distribution_fit(r.iloc[:-1])
+        warm = stm.distribution_fit(r, previous=previous)
+        stm.clear_memo()
+        cold = stm.distribution_fit(r)
+        for dist in ('student_t', 'skew_normal'):
+            self.assertAlmostEqual(warm[dist]['log_likelihood'], cold[dist]['log_likelihood'], delta=0.01)
+
+    def test_memoised_on_content(self):
+        r = _fat_tailed(400)
+        first = stm.distribution_fit(r)
+        first['best_fit'] = 'mutated'
+        again = stm.distribution_fit(pd.Series(r.values.copy()))
+        self.assertNotEqual(again['best_fit'], 'mutated')
+        self.assertNotEqual(stm.returns_fingerprint(r.values), stm.returns_fingerprint(r.values[:-1]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+"""
+Unit tests for the local symbol index (core/symbol_index): prefix, multi-word
+and fuzzy search, source merging and the asset snapshot round trip.
+"""
+
+import unittest
+import sys
+import os
+import tempfile
+import time
+
+import pandas as pd
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core import symbol_index
+from core.symbol_index import SymbolIndex, _merge, load_asset_snapshot, refresh_asset_snapshot, snapshot_is_stale
+
+
+def _frame(rows, source):
+    return pd.DataFrame([dict(zip(('symbol', 'name', 'sector', 'exchange', 'asset_class'), r), source=source)
+                         for r in rows])
+
+
+RECORDS = _merge([
+    _frame([('AAPL', 'Apple Inc.', 'Technology', '', 'equity'),
+            ('NVDA', 'NVIDIA Corporation', 'Technology', '', 'equity'),
+            ('BAC', 'Bank of America', 'Financials', '', 'equity')], 'universe'),
+    _frame([('^GSPC', 'S&P 500', '', '', 'index'), ('BTC-USD', 'Bitcoin', '', '', 'crypto')], 'instruments'),
+    _frame([('AAPL', 'APPLE INC', '', 'NASDAQ', 'equity'), ('APP', 'AppLovin Corp', '', 'NASDAQ', 'equity'),
+            ('BRK.B', 'Berkshire Hathaway Inc', '', 'NYSE', 'equity'),
+            ('RY', 'Royal Bank of Canada', '', 'NYSE', 'equity')], 'snapshot'),
+])
+
+
+class TestSymbolIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.index = SymbolIndex(RECORDS)
+
+    def test_merge_prefers_curated_fields(self):
+        self.assertEqual(len(self.index), 8)
+        aapl = self.index.lookup('aapl')
+        self.assertEqual((aapl['name'], aapl['sector'], aapl['exchange']), ('Apple Inc.', 'Technology', 'NASDAQ'))
+        self.assertIn('BRK.B', self.index)
+        self.assertIsNone(self.index.lookup('ZZZZ'))
+
+    def test_prefix_search_ranks_symbols_first(self):
+        self.assertEqual([m['symbol'] for m in self.index.search('AAPL')][0], 'AAPL')
+        self.assertEqual([m['symbol'] for m in self.index.search('app')][:2], ['APP', 'AAPL'])
+        self.assertEqual(self.index.search('apple')[0]['symbol'], 'AAPL')
+        self.assertEqual({m['symbol'] for m in self.index.search('tech', fuzzy=False)}, {'AAPL', 'NVDA'})
+
+    def test_multi_word_and_punctuated_queries(self):
+        self.assertEqual({m['symbol'] for m in self.index.search('bank of', fuzzy=False)}, {'BAC', 'RY'})
+        self.assertEqual(self.index.search('^gspc')[0]['symbol'], '^GSPC')
+        self.assertEqual(self.index.search('brk.b')[0]['symbol'], 'BRK.B')
+        self.assertEqual(self.index.search('s&p 500')[0]['symbol'], '^GSPC')
+
+    def test_fuzzy_catches_typos(self):
+        self.assertEqual(self.index.search('nvdia')[0]['symbol'], 'NVDA')
+        self.assertEqual(self.index.search('berkshre')[0]['symbol'], 'BRK.B')
+        self.assertEqual(self.index.search('nvdia', fuzzy=False), [])
+
+    def test_filters_and_limits(self):
+        self.assertEqual([m['symbol'] for m in self.index.search('b', asset_class='crypto')], ['BTC-USD'])
+        self.assertEqual(len(self.index.search('a', limit=2)), 2)
+        self.assertEqual(self.index.search('  '), [])
+
+
+class TestSnapshot(unittest.TestCase):
+
+    def test_refresh_round_trip_resets_shared_index(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'assets.parquet')
+            self.assertTrue(snapshot_is_stale(path))
+            symbol_index._index = SymbolIndex(RECORDS)
+            saved = refresh_asset_snapshot([{'symbol': 'ZZTEST', 'name': 'Zed Test Holdings', 'exchange': 'NYSE'}],
+                                           path)
+            self.assertEqual(saved, 1)
+            self.assertIsNone(symbol_index._index)
+            self.assertFalse(snapshot_is_stale(path))
+            self.assertTrue(snapshot_is_stale(path, max_age=-1))
+            snapshot = load_asset_snapshot(path)
+            self.assertEqual(list(snapshot['source']), ['snapshot'])
+            index = SymbolIndex.build(path)
+            self.assertEqual(index.search('zed test')[0]['symbol'], 'ZZTEST')
+            self.assertIn('AAPL', index)
+
+    def test_large_universe_answers_quickly(self):
+        frame = pd.DataFrame({'symbol': [f'S{i:05d}' for i in range(50000)],
+                              'name': [f'Company {i} Holdings' for i in range(50000)],
+                              'sector': '', 'exchange': 'NYSE', 'asset_class': 'equity', 'source': 'snapshot'})
+        index = SymbolIndex(_merge([frame]))
+        start = time.perf_counter()
+        for query in ('s1', 'company 123', 'holdings', 'holdngs'):
+            self.assertTrue(index.search(query))
+        self.assertLess((time.perf_counter() - start) / 4, 0.05)
+
+
+if __name__ == '__main__':
+    unittest.main()
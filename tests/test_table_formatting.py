@@ -0,0 +1,95 @@
+"""
+Unit tests for the vectorized renderers in core/atlas_table_formatting.py.
+"""
+
+import unittest
+import numpy as np
+import pandas as pd
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.atlas_table_formatting import (
+    render_generic_table,
+    render_holdings_table,
+    clear_table_cache,
+    format_volume,
+    STYLE_PRICE,
+    STYLE_TEXT,
+)
+
+
+COLUMNS = [
+    {'key': 'ticker', 'label': 'Ticker', 'type': 'ticker'},
+    {'key': 'price', 'label': 'Price', 'type': 'price'},
+    {'key': 'change', 'label': 'Change', 'type': 'change'},
+    {'key': 'volume', 'label': 'Volume', 'type': 'volume'},
+]
+
+
+class TestRenderGenericTable(unittest.TestCase):
+    """Column-wise rendering, caching and row windows."""
+
+    def setUp(self):
+        clear_table_cache()
+        self.df = pd.DataFrame({
+            'ticker': ['AAPL', 'MSFT', 'NVDA'],
+            'price': [150.0, np.nan, 'n/a'],
+            'change': [1.234, '-2.5%', 'flat'],
+            'volume': [1.5e6, 2.0e9, 900],
+        })
+
+    def test_cell_formatting(self):
+        """Each column type formats like the scalar formatters."""
+        html = render_generic_table(self.df, COLUMNS)
+        self.assertIn(f'<td style="{STYLE_PRICE}">$150.00</td>', html)
+        self.assertIn(f'<td style="{STYLE_TEXT}">—</td>', html)   # NaN price
+        self.assertIn(f'<td style="{STYLE_PRICE}">n/a</td>', html)     # unparseable price
+        self.assertIn('▲ +1.23%', html)
+        self.assertIn('▼ -2.50%', html)
+        self.assertIn('>flat</td>', html)
+        self.assertIn(f'>{format_volume(2.0e9)}</td>', html)
+        self.assertEqual(html.count('<tr>'), 4)
+
+    def test_cache_returns_identical_html(self):
+        """Re-rendering an unchanged frame hits the cache."""
+        first = render_generic_table(self.df, COLUMNS)
+        second = render_generic_table(self.df.copy(), COLUMNS)
+        self.assertIs(first, second)
+
+        changed = self.df.copy()
+        changed.loc[0, 'price'] = 151.0
+        self.assertIn('$151.00', render_generic_table(changed, COLUMNS))
+
+    def test_page_window(self):
+        """Only the requested page of rows is rendered."""
+        df = pd.DataFrame({'ticker': [f'T{i}' for i in range(25)], 'price': range(25),
+                           'change': 0.0, 'volume': 1.0})
+        html = render_generic_table(df, COLUMNS, page=2, page_size=10)
+        self.assertEqual(html.count('<tr>'), 6)  # header + 5 remaining rows
+        self.assertIn('>T20</td>', html)
+        self.assertNotIn('>T19</td>', html)
+
+    def test_missing_column_renders_dash(self):
+        """A column absent from the frame renders as empty cells."""
+        html = render_generic_table(self.df, [{'key': 'nope', 'label': 'X', 'type': 'ratio'}])
+        self.assertEqual(html.count('—'), 3)
+
+
+class TestRenderHoldingsTable(unittest.TestCase):
+    """Holdings table fallbacks."""
+
+    def test_value_falls_back_to_shares_times_price(self):
+        df = pd.DataFrame({'symbol': ['AAPL'], 'quantity': [2.5], 'current_price': [100.0],
+                           'market_value': [0.0], 'daily_change': [-1.0]})
+        html = render_holdings_table(df)
+        self.assertIn('>AAPL</td>', html)
+        self.assertIn('>2.50</td>', html)
+        self.assertIn('$250.00', html)
+        self.assertIn('▼ -1.00%', html)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,146 @@
+"""
+Unit tests for the lot-aware transition optimizer (analytics/transition_optimizer):
+feasibility, lot selection by tax cost, holding periods, the annual
+exclusion and solve time on a 2,000-lot book.
+"""
+
+import unittest
+import sys
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analytics.transition import calculate_transition_plan
+from analytics.transition_optimizer import lots_from_trades, optimize_transition
+
+AS_OF = pd.Timestamp('2026-03-01')
+CLASSES = ['SA Equity', 'Global Equity', 'SA Bonds', 'Global Bonds', 'Property']
+
+
+def _lot(ticker, asset_class, value, basis_ratio, days_held, price=100.0):
+    return {'ticker': ticker, 'asset_class': asset_class, 'quantity': value / price,
+            'cost_basis': price * basis_ratio, 'acquired': AS_OF - pd.Timedelta(days=days_held), 'price': price}
+
+
+def _book(n_positions=200, lots_per_position=10, seed=0):
+    rng = np.random.default_rng(seed)
+    rows = []
+    for p in range(n_positions):
+        price = rng.uniform(20, 200)
+        for _ in range(lots_per_position):
+            rows.append(_lot(f'P{p:03d}', CLASSES[p % len(CLASSES)], rng.uniform(1e3, 2e4),
+                             rng.uniform(0.3, 1.1), int(rng.integers(10, 2000)), price))
+    return pd.DataFrame(rows)
+
+
+def _class_weights(plan, lots):
+    """End-state class weights implied by the plan's trades."""
+    value = (lots['quantity'] * lots['price']).groupby(lots['asset_class']).sum()
+    value = value.sub(plan.lot_trades.groupby('asset_class')['value'].sum(), fill_value=0)
+    value = value.add(plan.buys.groupby('asset_class')['value'].sum(), fill_value=0)
+    return value / plan.portfolio_value
+
+
+class TestTransitionOptimizer(unittest.TestCase):
+
+    def test_reaches_target_within_turnover_caps(self):
+        lots = _book(40, 5)
+        target = {'SA Equity': 0.10, 'Global Equity': 0.35, 'SA Bonds': 0.15, 'Global Bonds': 0.25,
+                  'Property': 0.05, 'Cash': 0.10}
+        plan = optimize_transition(lots, target, max_turnover=0.15, as_of=AS_OF)
+        weights = _class_weights(plan, lots)
+        for ac, w in target.items():
+            self.assertAlmostEqual(weights.get(ac, 0.0), w, places=6)
+        self.assertLess(plan.phases[-1].cumulative_drift, 1e-6)
+        for phase in plan.phases:
+            self.assertLessEqual(phase.total_turnover, 0.15 + 1e-9)
+            sells = sum(t.trade_value for t in phase.trades if t.action == 'SELL')
+            buys = sum(t.trade_value for t in phase.trades if t.action == 'BUY')
+            self.assertAlmostEqual(sells, buys, delta=1e-6 * plan.portfolio_value)
+        # Lots are never oversold
+        sold = plan.lot_trades.groupby('lot_id')['value'].sum()
+        self.assertTrue((sold <= (lots['quantity'] * lots['price'])[sold.index] + 1e-6).all())
+
+    def test_sells_highest_basis_lots_first(self):
+        lots = pd.DataFrame([_lot('A', 'SA Equity', 50_000, 0.4, 800), _lot('A', 'SA Equity', 50_000, 1.2, 800),
+                             _lot('B', 'SA Bonds', 100_000, 1.0, 800)])
+        plan = optimize_transition(lots, {'SA Equity': 0.25, 'SA Bonds': 0.75}, max_turnover=1.0,
+                                   annual_exclusion=0.0, as_of=AS_OF)
+        self.assertEqual(list(plan.lot_trades['lot_id']), [1])
+        self.assertAlmostEqual(plan.lot_trades['value'].iloc[0], 50_000)
+        self.assertEqual(plan.total_cgt_exposure, 0.0)
+
+    def test_waits_for_long_term_rate(self):
+        # The equity lot turns long-term before phase 2: deferring the sale beats the drift penalty
+        lots = pd.DataFrame([_lot('A', 'SA Equity', 100_000, 0.5, 200), _lot('C', 'SA Bonds', 100_000, 1.0, 800)])
+        plan = optimize_transition(lots, {'SA Equity': 0.40, 'SA Bonds': 0.60}, cgt_rate=0.15,
+                                   short_term_cgt_rate=0.40, annual_exclusion=0.0, phases=2, max_turnover=0.25,
+                                   as_of=AS_OF)
+        self.assertEqual(plan.lot_trades['phase'].tolist(), [2])
+        self.assertTrue(plan.lot_trades['long_term'].all())
+        self.assertAlmostEqual(plan.total_cgt_exposure, 0.15 * 10_000)
+
+    def test_spreads_gains_over_annual_exclusions(self):
+        lots = pd.DataFrame([_lot('A', 'SA Equity', 200_000, 0.5, 800), _lot('C', 'SA Bonds', 200_000, 1.0, 800)])
+        plan = optimize_transition(lots, {'SA Equity': 0.3, 'SA Bonds': 0.7}, phases=2, max_turnover=1.0,
+                                   annual_exclusion=20_000, tracking_penalty=0.0, as_of=AS_OF)
+        # 40k gain realised: 20k in each tax year, both inside the exclusion
+        np.testing.assert_allclose(plan.tax_by_phase['long_term_gain'], [20_000, 20_000])
+        self.assertAlmostEqual(plan.total_cgt_exposure, 0.0, places=6)
+
+    def test_losses_offset_gains_across_holding_periods(self):
+        # A +50k long-term gain and a -50k short-term loss sold in the same phase
+        lots = pd.DataFrame([_lot('A', 'SA Equity', 100_000, 0.5, 800), _lot('B', 'SA Equity', 100_000, 1.5, 100),
+                             _lot('C', 'SA Bonds', 100_000, 1.0, 800)])
+        kwargs = dict(max_turnover=1.0, annual_exclusion=0.0, tracking_penalty=0.0, as_of=AS_OF)
+        plan = optimize_transition(lots, {'SA Bonds': 1.0}, **kwargs)
+        self.assertEqual(sorted(plan.lot_trades['lot_id']), [0, 1])
+        self.assertAlmostEqual(plan.total_cgt_exposure, 0.0, places=6)
+        # A short-term loss still offsets long-term gains when short-term gains are taxed more
+        plan = optimize_transition(lots, {'SA Bonds': 1.0}, short_term_cgt_rate=0.36, **kwargs)
+        self.assertAlmostEqual(plan.total_cgt_exposure, 0.0, places=6)
+        # With a 40k exclusion the netted gain is nil, so none of it is used
+        plan = optimize_transition(lots, {'SA Bonds': 1.0}, **{**kwargs, 'annual_exclusion': 40_000})
+        self.assertAlmostEqual(plan.tax_by_phase['exclusion_used'].iloc[0], 0.0, places=6)
+
+    def test_cheaper_than_greedy_plan_at_scale(self):
+        lots = _book()
+        self.assertEqual(len(lots), 2000)
+        target = {'SA Equity': 0.15, 'Global Equity': 0.30, 'SA Bonds': 0.20, 'Global Bonds': 0.25,
+                  'Property': 0.10}
+        start = time.perf_counter()
+        plan = optimize_transition(lots, target, short_term_cgt_rate=0.30, as_of=AS_OF)
+        self.assertLess(time.perf_counter() - start, 5.0)
+        current = ((lots['quantity'] * lots['price']).groupby(lots['asset_class']).sum()
+                   / plan.portfolio_value).to_dict()
+        greedy = calculate_transition_plan(current, target, plan.portfolio_value)
+        self.assertEqual(plan.phases_required, greedy.phases_required)
+        self.assertLess(plan.total_implementation_cost, greedy.total_implementation_cost)
+        self.assertEqual(set(plan.tax_by_phase.columns),
+                         {'phase', 'date', 'short_term_gain', 'long_term_gain', 'exclusion_used', 'cgt'})
+
+    def test_lots_from_trades_fifo(self):
+        trades = pd.DataFrame({
+            'Date': ['2024-01-02', '2024-06-03', '2025-02-03', '2025-03-03'],
+            'Ticker': ['npn', 'NPN', 'NPN', 'STX40'],
+            'Trade Type': ['Buy', 'Buy', 'Sell', 'Buy'],
+            'Quantity': [10, 5, 12, 100], 'Price': [3000, 3200, 3500, 80],
+        })
+        lots = lots_from_trades(trades, {'NPN': 3600, 'STX40': 90}, {'NPN': 'SA Equity'})
+        self.assertEqual(list(lots['ticker']), ['NPN', 'STX40'])
+        self.assertEqual(lots['quantity'].tolist(), [3, 100])
+        self.assertEqual(lots['cost_basis'].tolist(), [3200, 80])
+        self.assertEqual(lots['asset_class'].tolist(), ['SA Equity', 'Unclassified'])
+
+    def test_validation(self):
+        with self.assertRaises(ValueError):
+            optimize_transition(pd.DataFrame({'ticker': ['A']}), {'SA Equity': 1.0})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,187 @@
+"""
+Unit tests for the streaming view reader (services/view_reader): projection,
+server-side filters, keyset paging, typed buffers and incremental refresh,
+against sqlite3 and the in-process LocalSupabase stand-in.
+"""
+
+import unittest
+import sys
+import os
+import sqlite3
+import tempfile
+from dataclasses import replace
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.local_supabase import LocalSupabase
+from services.view_reader import VIEW_SCHEMAS, PostgrestSource, SQLSource, ViewReader, ViewSchema
+
+NAV = ViewSchema("vw_portfolio_nav_daily",
+                 {"price_date": "date", "nav": "float64", "daily_return": "float64"},
+                 key=("price_date",), high_water="price_date", page_size=100)
+HOLDINGS = ViewSchema("vw_holdings_daily",
+                      {"price_date": "date", "symbol": "string", "quantity": "int64", "weight": "float64"},
+                      key=("price_date", "symbol"), high_water="price_date", page_size=7)
+SCHEMAS = {s.name: s for s in (NAV, HOLDINGS)}
+
+
+def _nav_rows(dates, seed=0):
+    rng = np.random.default_rng(seed)
+    returns = rng.normal(0.0004, 0.01, len(dates))
+    nav = 1e6 * np.cumprod(1 + returns)
+    return [{"price_date": d.date().isoformat(), "nav": float(n), "daily_return": float(r)}
+            for d, n, r in zip(dates, nav, returns)]
+
+
+class _SQLiteViews:
+    """sqlite3 database standing in for Postgres, counting rows returned."""
+
+    def __init__(self):
+        self.conn = sqlite3.connect(":memory:")
+        self.conn.execute("CREATE TABLE vw_portfolio_nav_daily (price_date TEXT, nav REAL, daily_return REAL)")
+        self.conn.execute("CREATE TABLE vw_holdings_daily (price_date TEXT, symbol TEXT, quantity INTEGER, weight REAL)")
+        self.source = SQLSource(self.conn)
+        self.rows_read = 0
+        fetch = self.source.fetch_page
+
+        def counting(*args, **kwargs):
+            page = fetch(*args, **kwargs)
+            self.rows_read += len(page)
+            return page
+        self.source.fetch_page = counting
+
+    def insert_nav(self, rows):
+        self.conn.executemany("INSERT INTO vw_portfolio_nav_daily VALUES (:price_date, :nav, :daily_return)", rows)
+
+
+class TestSQLSource(unittest.TestCase):
+
+    def setUp(self):
+        self.db = _SQLiteViews()
+        self.dates = pd.bdate_range("2020-01-01", periods=1500)
+        self.db.insert_nav(_nav_rows(self.dates))
+        self.reader = ViewReader(self.db.source, cache_dir=None, min_refresh_interval=0.0, schemas=SCHEMAS)
+
+    def test_typed_projection_in_pages(self):
+        df = self.reader.read("vw_portfolio_nav_daily", columns=["daily_return"])
+        self.assertEqual(list(df.columns), ["price_date", "daily_return"])
+        self.assertEqual(len(df), 1500)
+        self.assertTrue(pd.api.types.is_datetime64_any_dtype(df["price_date"]))
+        self.assertEqual(df["daily_return"].dtype, np.float64)
+        self.assertTrue(df["price_date"].is_monotonic_increasing)
+        self.assertEqual(self.reader.last_stats.pages, 16)
+
+    def test_date_range_and_filters_run_server_side(self):
+        df = self.reader.read("vw_portfolio_nav_daily", start="2025-01-01", end="2025-01-31",
+                              filters=[("daily_return", "gt", 0.0)])
+        self.assertTrue((df["daily_return"] > 0).all())
+        self.assertGreaterEqual(df["price_date"].min(), pd.Timestamp("2025-01-01"))
+        self.assertLessEqual(df["price_date"].max(), pd.Timestamp("2025-01-31"))
+        # Only rows from the start date onward were transferred, not the full history
+        self.assertLess(self.db.rows_read, 200)
+        with self.assertRaises(ValueError):
+            self.reader.read("vw_portfolio_nav_daily", filters=[("nav; DROP TABLE x", "eq", 1)])
+        with self.assertRaises(ValueError):
+            self.reader.read("vw_portfolio_nav_daily", filters=[("nav", "like", 1)])
+
+    def test_incremental_refresh_fetches_only_new_rows(self):
+        first = self.reader.read("vw_portfolio_nav_daily")
+        self.db.rows_read = 0
+        # The last day is restated and three new days arrive
+        last = first["price_date"].iloc[-1].date().isoformat()
+        self.db.conn.execute("UPDATE vw_portfolio_nav_daily SET nav = 1.0 WHERE price_date = ?", (last,))
+        new_dates = pd.bdate_range(self.dates[-1] + pd.offsets.BDay(), periods=3)
+        self.db.insert_nav(_nav_rows(new_dates, seed=1))
+        second = self.reader.read("vw_portfolio_nav_daily")
+        self.assertEqual(self.db.rows_read, 4)
+        self.assertTrue(self.reader.last_stats.incremental)
+        self.assertEqual(len(second), 1503)
+        self.assertEqual(second.loc[second["price_date"] == pd.Timestamp(last), "nav"].item(), 1.0)
+        pd.testing.assert_frame_equal(second.iloc[:1499], first.iloc[:1499])
+
+        # Within the refresh interval nothing is fetched
+        self.reader.min_refresh_interval = 3600.0
+        self.db.rows_read = 0
+        self.reader.read("vw_portfolio_nav_daily")
+        self.assertEqual(self.db.rows_read, 0)
+
+    def test_backfills_before_cached_range(self):
+        recent = self.reader.read("vw_portfolio_nav_daily", start="2025-01-01")
+        full = self.reader.read("vw_portfolio_nav_daily")
+        self.assertEqual(len(full), 1500)
+        self.assertEqual(full["price_date"].iloc[-len(recent):].tolist(), recent["price_date"].tolist())
+
+    def test_composite_keyset(self):
+        rows = [(d.date().isoformat(), sym, q, q / 100.0)
+                for d in pd.bdate_range("2025-01-01", periods=20)
+                for q, sym in enumerate(["AAPL", "MSFT", "NVDA", "SPY", "TLT"])]
+        self.db.conn.executemany("INSERT INTO vw_holdings_daily VALUES (?, ?, ?, ?)", rows)
+        df = self.reader.read("vw_holdings_daily", columns=["quantity"], filters=[("symbol", "in", ["MSFT", "SPY"])])
+        self.assertEqual(list(df.columns), ["price_date", "symbol", "quantity"])
+        self.assertEqual(len(df), 40)
+        self.assertEqual(df["quantity"].dtype, np.int64)
+        self.assertFalse(df.duplicated(["price_date", "symbol"]).any())
+        sql, params = SQLSource(self.db.conn).build_query(
+            "vw_holdings_daily", ["price_date", "symbol"], [], HOLDINGS.key, ["2025-01-01", "MSFT"], 7)
+        self.assertIn('("price_date", "symbol") > (?, ?)', sql)
+        self.assertEqual(params, ["2025-01-01", "MSFT"])
+
+    def test_shared_dates_straddling_page_boundaries(self):
+        # The live NAV view has one row per (portfolio, day); pages of 1,000 split dates
+        schema = VIEW_SCHEMAS["vw_portfolio_nav_daily"]
+        self.assertEqual(schema.key, ("price_date", "portfolio_id"))
+        self.db.conn.execute("CREATE TABLE nav_live (portfolio_id TEXT, price_date TEXT, nav REAL, "
+                             "daily_return REAL, position_count INTEGER)")
+        rows = [(f"p{p}", d.date().isoformat(), 1e6 + i, 0.001, None)
+                for i, d in enumerate(pd.bdate_range("2020-01-01", periods=700)) for p in range(3)]
+        self.db.conn.executemany("INSERT INTO nav_live VALUES (?, ?, ?, ?, ?)", rows)
+        live = replace(schema, name="nav_live")
+        reader = ViewReader(self.db.source, cache_dir=None, schemas={"nav_live": live})
+        df = reader.read("nav_live", columns=["nav"])
+        self.assertEqual(len(df), 2100)
+        self.assertEqual(reader.last_stats.pages, 3)
+        self.assertFalse(df.duplicated(["price_date", "portfolio_id"]).any())
+        self.assertEqual(list(df.columns), ["portfolio_id", "price_date", "nav"])
+
+
+class TestPostgrestSource(unittest.TestCase):
+
+    def setUp(self):
+        self.db = LocalSupabase()
+        self.dates = pd.bdate_range("2016-01-01", periods=2500)
+        self.db.table("vw_portfolio_nav_daily").insert(_nav_rows(self.dates)).execute()
+        self.db.reset_stats()
+
+    def test_page_load_moves_only_new_rows(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            reader = ViewReader(PostgrestSource(self.db), cache_dir=tmp, min_refresh_interval=0.0, schemas=SCHEMAS)
+            df = reader.read("vw_portfolio_nav_daily", columns=["daily_return"])
+            self.assertEqual(len(df), 2500)
+            self.assertEqual(self.db.stats()["round_trips"], 26)
+
+            # A new process picks up the parquet snapshot and asks only for the tail
+            new_dates = pd.bdate_range(self.dates[-1] + pd.offsets.BDay(), periods=2)
+            self.db.table("vw_portfolio_nav_daily").insert(_nav_rows(new_dates, seed=2)).execute()
+            self.db.reset_stats()
+            restarted = ViewReader(PostgrestSource(self.db), cache_dir=tmp, min_refresh_interval=0.0,
+                                   schemas=SCHEMAS)
+            df = restarted.read("vw_portfolio_nav_daily", columns=["daily_return"], start="2025-01-01")
+            self.assertEqual(self.db.stats()["rows_read"], 3)
+            self.assertEqual(self.db.stats()["round_trips"], 1)
+            self.assertEqual(df["price_date"].iloc[-1], new_dates[-1])
+            self.assertEqual(list(df.columns), ["price_date", "daily_return"])
+
+            restarted.invalidate("vw_portfolio_nav_daily")
+            self.assertEqual(os.listdir(tmp), [])
+
+    def test_composite_keyset_clause(self):
+        clause = PostgrestSource._keyset_clause(("price_date", "symbol"), ["2025-01-02", "BRK.B"])
+        self.assertEqual(clause, 'price_date.gt.2025-01-02,and(price_date.eq.2025-01-02,symbol.gt."BRK.B")')
+
+
+if __name__ == '__main__':
+    unittest.main()
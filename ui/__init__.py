@@ -8,36 +8,53 @@ Usage:
     from ui.charts_professional import create_performance_chart, create_bar_chart
 """
 
-# Theme exports
-from ui.theme import (
-    ATLAS_COLORS,
-    CHART_COLORS,
-    CHART_FILLS,
-    FONTS,
-    FONT_SIZES,
-    FONT_WEIGHTS,
-    SPACING,
-    CARD_STYLE,
-    CHART_LAYOUT,
-    CHART_HEIGHTS,
-    get_color,
-    get_semantic_color,
-    format_percentage,
-    format_currency,
-    format_large_number,
-    get_atlas_css,
-)
+import importlib
+
+# Exported name -> submodule. Resolved lazily on first access (see
+# ui/components/__init__.py) so importing ui.atlas_css at boot does not
+# pull in Plotly via ui.charts_professional.
+_EXPORTS = {
+    # Theme exports
+    'ATLAS_COLORS': 'theme',
+    'CHART_COLORS': 'theme',
+    'CHART_FILLS': 'theme',
+    'FONTS': 'theme',
+    'FONT_SIZES': 'theme',
+    'FONT_WEIGHTS': 'theme',
+    'SPACING': 'theme',
+    'CARD_STYLE': 'theme',
+    'CHART_LAYOUT': 'theme',
+    'CHART_HEIGHTS': 'theme',
+    'get_color': 'theme',
+    'get_semantic_color': 'theme',
+    'format_percentage': 'theme',
+    'format_currency': 'theme',
+    'format_large_number': 'theme',
+    'get_atlas_css': 'theme',
+    # Chart exports
+    'apply_atlas_theme': 'charts_professional',
+    'create_multi_line_chart': 'charts_professional',
+    'create_performance_chart': 'charts_professional',
+    'create_bar_chart': 'charts_professional',
+    'create_donut_chart': 'charts_professional',
+    'create_gauge_chart': 'charts_professional',
+    'create_waterfall_chart': 'charts_professional',
+}
+
+
+def __getattr__(name):
+    try:
+        module = _EXPORTS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(importlib.import_module(f'.{module}', __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
 
-# Chart exports
-from ui.charts_professional import (
-    apply_atlas_theme,
-    create_multi_line_chart,
-    create_performance_chart,
-    create_bar_chart,
-    create_donut_chart,
-    create_gauge_chart,
-    create_waterfall_chart,
-)
 
 __all__ = [
     # Colors
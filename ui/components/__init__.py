@@ -5,103 +5,95 @@ Phase 1B - Sidebar Navigation Component
 Phase 2A - Badge Pills & Enhanced Components
 
 Centralized UI components for charts, metrics, tables, navigation, and badges.
-"""
-
-# Navigation Module (Phase 1B)
-from .sidebar_nav import render_sidebar_navigation
-
-# Badge Module (Phase 2A)
-from .badges import (
-    badge,
-    render_badge,
-    badge_group,
-    BadgeType,
-    BadgeSize
-)
-
-# Tables Module
-from .tables import (
-    make_scrollable_table,
-    style_holdings_dataframe,
-    style_holdings_dataframe_with_optimization,
-    add_arrow_indicator,
-    format_percentage,
-    format_currency
-)
-
-# Enhanced Tables Module (Phase 2A)
-from .tables_enhanced import (
-    atlas_table,
-    atlas_table_with_badges
-)
-
-# Enhanced Chart Theme (Phase 2A)
-from .charts_theme import (
-    ATLAS_TEMPLATE,
-    ATLAS_COLORS,
-    COLOR_SEQUENCE,
-    create_line_chart,
-    create_bar_chart,
-    create_performance_chart,
-    create_heatmap,
-    apply_neon_glow
-)
-
-# Metrics Module
-from .metrics import (
-    ATLASFormatter,
-    create_risk_snapshot,
-    create_signal_health_badge,
-    calculate_signal_health,
-    create_skill_assessment_card,
-    create_performance_dashboard,
-    is_valid_series,
-    apply_chart_theme as apply_chart_theme_metrics,
-    COLORS as COLORS_METRICS
-)
-
-# Charts Module
-from .charts import (
-    # Attribution Charts
-    create_pnl_attribution_sector,
-    create_pnl_attribution_position,
-    create_brinson_attribution_chart,
-    create_sector_attribution_table,
-    create_holdings_attribution_waterfall,
-    create_factor_attribution_table,
-
-    # Performance Charts
-    create_interactive_performance_chart,
-    create_rolling_metrics_chart,
-    create_underwater_plot,
-    create_performance_heatmap,
-    create_portfolio_heatmap,
-
-    # Risk Charts
-    create_rolling_var_cvar_chart,
-    create_risk_reward_plot,
-    create_monte_carlo_chart,
 
-    # Sector/Factor Charts
-    create_sector_rotation_heatmap,
-    create_factor_momentum_chart,
-
-    # Valuation Charts
-    create_cash_flow_chart,
+Exports resolve lazily on first access (see core/__init__.py), so the
+sidebar can be imported at boot without loading Plotly for the chart modules.
+"""
 
-    # Contributor Charts
-    create_top_contributors_chart,
-    create_top_detractors_chart,
+import importlib
+
+# Exported name -> (submodule, attribute)
+_EXPORTS = {
+    # Navigation Module (Phase 1B)
+    'render_sidebar_navigation': ('sidebar_nav', 'render_sidebar_navigation'),
+    # Badge Module (Phase 2A)
+    'badge': ('badges', 'badge'),
+    'render_badge': ('badges', 'render_badge'),
+    'badge_group': ('badges', 'badge_group'),
+    'BadgeType': ('badges', 'BadgeType'),
+    'BadgeSize': ('badges', 'BadgeSize'),
+    # Tables Module
+    'make_scrollable_table': ('tables', 'make_scrollable_table'),
+    'style_holdings_dataframe': ('tables', 'style_holdings_dataframe'),
+    'style_holdings_dataframe_with_optimization': ('tables', 'style_holdings_dataframe_with_optimization'),
+    'add_arrow_indicator': ('tables', 'add_arrow_indicator'),
+    'format_percentage': ('tables', 'format_percentage'),
+    'format_currency': ('tables', 'format_currency'),
+    # Enhanced Tables Module (Phase 2A)
+    'atlas_table': ('tables_enhanced', 'atlas_table'),
+    'atlas_table_with_badges': ('tables_enhanced', 'atlas_table_with_badges'),
+    # Enhanced Chart Theme (Phase 2A)
+    'ATLAS_TEMPLATE': ('charts_theme', 'ATLAS_TEMPLATE'),
+    'ATLAS_COLORS': ('charts_theme', 'ATLAS_COLORS'),
+    'COLOR_SEQUENCE': ('charts_theme', 'COLOR_SEQUENCE'),
+    'create_line_chart': ('charts_theme', 'create_line_chart'),
+    'create_bar_chart': ('charts_theme', 'create_bar_chart'),
+    'create_performance_chart': ('charts_theme', 'create_performance_chart'),
+    'create_heatmap': ('charts_theme', 'create_heatmap'),
+    'apply_neon_glow': ('charts_theme', 'apply_neon_glow'),
+    # Metrics Module
+    'ATLASFormatter': ('metrics', 'ATLASFormatter'),
+    'create_risk_snapshot': ('metrics', 'create_risk_snapshot'),
+    'create_signal_health_badge': ('metrics', 'create_signal_health_badge'),
+    'calculate_signal_health': ('metrics', 'calculate_signal_health'),
+    'create_skill_assessment_card': ('metrics', 'create_skill_assessment_card'),
+    'create_performance_dashboard': ('metrics', 'create_performance_dashboard'),
+    'is_valid_series': ('metrics', 'is_valid_series'),
+    'apply_chart_theme_metrics': ('metrics', 'apply_chart_theme'),
+    'COLORS_METRICS': ('metrics', 'COLORS'),
+    # Charts Module
+    'create_pnl_attribution_sector': ('charts', 'create_pnl_attribution_sector'),
+    'create_pnl_attribution_position': ('charts', 'create_pnl_attribution_position'),
+    'create_brinson_attribution_chart': ('charts', 'create_brinson_attribution_chart'),
+    'create_sector_attribution_table': ('charts', 'create_sector_attribution_table'),
+    'create_holdings_attribution_waterfall': ('charts', 'create_holdings_attribution_waterfall'),
+    'create_factor_attribution_table': ('charts', 'create_factor_attribution_table'),
+    'create_interactive_performance_chart': ('charts', 'create_interactive_performance_chart'),
+    'create_rolling_metrics_chart': ('charts', 'create_rolling_metrics_chart'),
+    'create_underwater_plot': ('charts', 'create_underwater_plot'),
+    'create_performance_heatmap': ('charts', 'create_performance_heatmap'),
+    'create_portfolio_heatmap': ('charts', 'create_portfolio_heatmap'),
+    'create_rolling_var_cvar_chart': ('charts', 'create_rolling_var_cvar_chart'),
+    'create_risk_reward_plot': ('charts', 'create_risk_reward_plot'),
+    'create_monte_carlo_chart': ('charts', 'create_monte_carlo_chart'),
+    'create_sector_rotation_heatmap': ('charts', 'create_sector_rotation_heatmap'),
+    'create_factor_momentum_chart': ('charts', 'create_factor_momentum_chart'),
+    'create_cash_flow_chart': ('charts', 'create_cash_flow_chart'),
+    'create_top_contributors_chart': ('charts', 'create_top_contributors_chart'),
+    'create_top_detractors_chart': ('charts', 'create_top_detractors_chart'),
+    'apply_chart_theme': ('charts', 'apply_chart_theme'),
+    'format_percentage_charts': ('charts', 'format_percentage'),
+    'COLORS': ('charts', 'COLORS'),
+    'CHART_HEIGHT_COMPACT': ('charts', 'CHART_HEIGHT_COMPACT'),
+    'CHART_HEIGHT_STANDARD': ('charts', 'CHART_HEIGHT_STANDARD'),
+    'CHART_HEIGHT_LARGE': ('charts', 'CHART_HEIGHT_LARGE'),
+    'CHART_HEIGHT_DEEP_DIVE': ('charts', 'CHART_HEIGHT_DEEP_DIVE'),
+}
+
+
+def __getattr__(name):
+    try:
+        module, attr = _EXPORTS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(importlib.import_module(f'.{module}', __name__), attr)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
 
-    # Utilities
-    apply_chart_theme,
-    format_percentage as format_percentage_charts,
-    COLORS,
-    CHART_HEIGHT_COMPACT,
-    CHART_HEIGHT_STANDARD,
-    CHART_HEIGHT_LARGE,
-    CHART_HEIGHT_DEEP_DIVE
-)
 
 __all__ = [
     # Navigation (Phase 1B)
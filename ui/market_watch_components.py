@@ -707,8 +707,8 @@ def render_stock_universe():
 
             st.markdown(f"**{len(filtered):,}** stocks found")
 
-            # Show top 100 results with ATLAS table formatting
-            from core.atlas_table_formatting import render_generic_table
+            # Page through results with ATLAS table formatting
+            from core.atlas_table_formatting import render_paginated_table
             col_defs = []
             col_map = {
                 'symbol': ('Ticker', 'ticker'),
@@ -723,7 +723,7 @@ def render_stock_universe():
                     label, ctype = col_map[c]
                     col_defs.append({'key': c, 'label': label, 'type': ctype})
             st.markdown(
-                render_generic_table(filtered, columns=col_defs, max_rows=100),
+                render_paginated_table(filtered, columns=col_defs, page_size=100, session_key="av_universe_table"),
                 unsafe_allow_html=True
             )
 
@@ -48,6 +48,18 @@ try:
 except ImportError:
     SIZER_AVAILABLE = False
 
+# ── Options analytics ─────────────────────────────────────────────────────────
+try:
+    from analytics.options import (
+        ChainSnapshot, STRATEGIES, breakevens, pnl_grid, strategy_legs,
+    )
+    OPTIONS_ANALYTICS_AVAILABLE = True
+except ImportError:
+    OPTIONS_ANALYTICS_AVAILABLE = False
+
+# Expiries pulled for the volatility surface (one request each)
+SURFACE_MAX_EXPIRIES = 8
+
 # ─────────────────────────────────────────────────────────────────────────────
 # CSS — dark terminal palette
 # ─────────────────────────────────────────────────────────────────────────────
@@ -314,8 +326,31 @@ def get_fundamentals(symbol: str) -> Dict:
     return out
 
 
+def _recorded_chain(symbol: str):
+    """Recorded ChainSnapshot under $ATLAS_REPLAY_DIR/options/<SYMBOL>.json, if any."""
+    import os
+    from pathlib import Path
+    root = os.environ.get("ATLAS_REPLAY_DIR")
+    if not (root and OPTIONS_ANALYTICS_AVAILABLE):
+        return None
+    path = Path(root) / "options" / f"{symbol.upper()}.json"
+    return ChainSnapshot.load(path) if path.exists() else None
+
+
 @st.cache_data(ttl=120)
 def get_option_chain(symbol: str, expiry: Optional[str] = None) -> Dict:
+    recorded = _recorded_chain(symbol)
+    if recorded is not None:
+        expirations = [e.strftime("%Y-%m-%d") for e in recorded.expiries]
+        if not expirations:
+            return {"available": False, "reason": "Recorded chain has no quotes"}
+        selected    = expiry if expiry in expirations else expirations[0]
+        return {
+            "available":   True,
+            "expirations": expirations,
+            "selected":    selected,
+            "snapshot":    recorded.for_expiry(selected),
+        }
     if not YF_AVAILABLE:
         return {"available": False, "reason": "yfinance not installed"}
     try:
@@ -337,25 +372,55 @@ def get_option_chain(symbol: str, expiry: Optional[str] = None) -> Dict:
         return {"available": False, "reason": str(e)[:120]}
 
 
+@st.cache_data(ttl=300)
+def get_surface_snapshot(symbol: str, spot: float):
+    """Quotes for the nearest SURFACE_MAX_EXPIRIES expiries as one ChainSnapshot."""
+    recorded = _recorded_chain(symbol)
+    if recorded is not None or not (YF_AVAILABLE and OPTIONS_ANALYTICS_AVAILABLE):
+        return recorded
+    try:
+        import yfinance as yf
+        tk = yf.Ticker(symbol)
+        chains = {}
+        for exp in list(tk.options or [])[:SURFACE_MAX_EXPIRIES]:
+            chain = tk.option_chain(exp)
+            chains[exp] = (chain.calls, chain.puts)
+        return ChainSnapshot.from_chains(symbol, spot, chains) if chains else None
+    except Exception:
+        return None
+
+
+def _refresh_asset_snapshot():
+    """Re-pull Alpaca's active asset list into the symbol index (at most daily)."""
+    from core.symbol_index import refresh_asset_snapshot, snapshot_is_stale
+    if not ALPACA_AVAILABLE or not snapshot_is_stale():
+        return
+    try:
+        from alpaca.trading.requests import GetAssetsRequest
+        from alpaca.trading.enums import AssetClass, AssetStatus
+        svc = TradingService.from_session_state()
+        if svc:
+            req = GetAssetsRequest(asset_class=AssetClass.US_EQUITY, status=AssetStatus.ACTIVE)
+            refresh_asset_snapshot(
+                {"symbol": a.symbol, "name": a.name or "",
+                 "exchange": getattr(a.exchange, "value", a.exchange), "asset_class": "equity"}
+                for a in svc._client.get_all_assets(req) if a.tradable
+            )
+    except Exception:
+        pass
+
+
 def search_symbols(query: str) -> List[Dict]:
     if not query:
         return []
-    if ALPACA_AVAILABLE:
-        try:
-            from alpaca.trading.requests import GetAssetsRequest
-            from alpaca.trading.enums import AssetClass, AssetStatus
-            svc = TradingService.from_session_state()
-            if svc:
-                req    = GetAssetsRequest(asset_class=AssetClass.US_EQUITY, status=AssetStatus.ACTIVE)
-                assets = svc._client.get_all_assets(req)
-                q      = query.upper()
-                return [
-                    {"symbol": a.symbol, "name": a.name or "", "exchange": str(a.exchange)}
-                    for a in assets
-                    if q in a.symbol.upper() or q in (a.name or "").upper()
-                ][:10]
-        except Exception:
-            pass
+    _refresh_asset_snapshot()
+    try:
+        from core.symbol_index import get_symbol_index
+        matches = get_symbol_index().search(query, limit=10)
+        if matches:
+            return [{"symbol": m["symbol"], "name": m["name"], "exchange": m["exchange"]} for m in matches]
+    except Exception:
+        pass
     return [{"symbol": query.upper(), "name": "", "exchange": ""}]
 
 
@@ -1061,22 +1126,36 @@ def render_options_chain(symbol: str) -> None:
     calls = chain.get("calls", pd.DataFrame())
     puts  = chain.get("puts",  pd.DataFrame())
 
+    # Solved IVs and Greeks for the whole expiry in one vectorised pass
+    analyzed = pd.DataFrame()
+    if OPTIONS_ANALYTICS_AVAILABLE:
+        snapshot = chain.get("snapshot")
+        if snapshot is None and spot:
+            snapshot = ChainSnapshot.from_chains(symbol, spot, {selected: (calls, puts)})
+        if snapshot is not None:
+            spot     = snapshot.spot
+            analyzed = snapshot.analyze()
+            calls    = analyzed[analyzed["kind"] == "call"]
+            puts     = analyzed[analyzed["kind"] == "put"]
+
     view  = st.radio("View", ["Both", "Calls", "Puts"], horizontal=True, key="cc_opt_view")
 
     # ── Column prep helper ────────────────────────────────────────────────
-    _wanted = ["strike", "bid", "ask", "lastPrice", "impliedVolatility",
-               "volume", "openInterest", "inTheMoney"]
+    # Analysed snapshot columns first, raw yfinance names as the fallback
+    _rename = {
+        "strike": "Strike", "bid": "Bid", "ask": "Ask", "last": "Last", "lastPrice": "Last",
+        "iv": "IV", "impliedVolatility": "IV", "delta": "Δ", "gamma": "Γ", "theta": "Θ",
+        "vega": "Vega", "volume": "Vol", "open_interest": "OI", "openInterest": "OI",
+    }
 
     def _prep(df: pd.DataFrame) -> pd.DataFrame:
         if df is None or df.empty:
             return pd.DataFrame()
-        cols = [c for c in _wanted if c in df.columns]
-        out  = df[cols].copy()
-        out  = out.rename(columns={
-            "strike": "Strike", "bid": "Bid", "ask": "Ask",
-            "lastPrice": "Last", "impliedVolatility": "IV",
-            "volume": "Vol", "openInterest": "OI", "inTheMoney": "ITM",
-        })
+        cols = [c for c in _rename if c in df.columns]
+        if "iv" in cols and "impliedVolatility" in cols:
+            cols.remove("impliedVolatility")
+        out  = df[cols].rename(columns=_rename)
+        out  = out.loc[:, ~out.columns.duplicated()].copy()
         if "IV" in out.columns:
             out["IV"] = out["IV"].apply(
                 lambda x: f"{x*100:.1f}%" if pd.notna(x) else "—"
@@ -1086,13 +1165,16 @@ def render_options_chain(symbol: str) -> None:
                 out[col] = out[col].apply(
                     lambda x: f"${x:.2f}" if pd.notna(x) else "—"
                 )
+        for col, fmt in [("Δ", "{:+.2f}"), ("Γ", "{:.3f}"), ("Θ", "{:+.3f}"), ("Vega", "{:.3f}")]:
+            if col in out.columns:
+                out[col] = out[col].apply(
+                    lambda x, fmt=fmt: fmt.format(x) if pd.notna(x) else "—"
+                )
         for col in ["Vol", "OI"]:
             if col in out.columns:
                 out[col] = out[col].apply(
                     lambda x: f"{int(x):,}" if pd.notna(x) and x > 0 else "—"
                 )
-        if "ITM" in out.columns:
-            out = out.drop(columns=["ITM"])
         return out.reset_index(drop=True)
 
     # ── Render ────────────────────────────────────────────────────────────
@@ -1118,6 +1200,10 @@ def render_options_chain(symbol: str) -> None:
         else:
             st.caption(f"No {view.lower()} data.")
 
+    if not analyzed.empty:
+        _render_strategy_pnl(analyzed, spot)
+        _render_vol_surface(symbol, spot)
+
     # ── My position in this underlying ────────────────────────────────────
     try:
         svc = TradingService.from_session_state()
@@ -1142,6 +1228,76 @@ def render_options_chain(symbol: str) -> None:
         pass
 
 
+def _render_strategy_pnl(analyzed: pd.DataFrame, spot: float) -> None:
+    """Preset multi-leg strategy on the selected expiry: P&L at expiry and today."""
+    import numpy as np
+    import plotly.graph_objects as go
+
+    with st.expander("Strategy P&L", expanded=False):
+        name = st.selectbox("Strategy", STRATEGIES, key="cc_opt_strategy",
+                            format_func=lambda s: s.replace("_", " ").title())
+        vol_shift = st.slider("Vol shift (pts)", -20, 20, 0, key="cc_opt_vol_shift") / 100
+        try:
+            legs = strategy_legs(name, analyzed, spot)
+        except ValueError as e:
+            st.caption(str(e))
+            return
+        expiry_days = legs[-1].T * 365
+        spots = np.linspace(spot * 0.7, spot * 1.3, 121)
+        grid  = pnl_grid(legs, spots, days=(0, expiry_days), vol_shift=vol_shift)
+
+        fig = go.Figure()
+        fig.add_trace(go.Scatter(x=spots, y=grid[expiry_days], name="At expiry",
+                                 line=dict(color="#58a6ff", width=2)))
+        fig.add_trace(go.Scatter(x=spots, y=grid[0.0], name="Today",
+                                 line=dict(color="#d29922", width=1.5, dash="dash")))
+        fig.add_hline(y=0, line_color="#30363d")
+        fig.add_vline(x=spot, line_color="#8b949e", line_dash="dot")
+        fig.update_layout(height=260, margin=dict(l=0, r=0, t=10, b=0),
+                          paper_bgcolor="rgba(0,0,0,0)", plot_bgcolor="rgba(0,0,0,0)",
+                          font=dict(color="#e6edf3", size=10), legend=dict(orientation="h"))
+        st.plotly_chart(fig, use_container_width=True)
+
+        at_expiry = grid[expiry_days]
+        be = ", ".join(f"${x:.2f}" for x in breakevens(at_expiry)) or "—"
+        st.caption(
+            " · ".join(f"{leg.quantity:+g} {leg.kind} {leg.strike:g}" if leg.kind != "stock"
+                       else f"{leg.quantity:+g} sh" for leg in legs)
+            + f"  |  max profit ${at_expiry.max():,.0f} · max loss ${at_expiry.min():,.0f} · breakeven {be}"
+        )
+
+
+def _render_vol_surface(symbol: str, spot: float) -> None:
+    """SVI-fitted implied volatility smiles across the listed expiries."""
+    import plotly.graph_objects as go
+
+    with st.expander("Volatility Surface (SVI)", expanded=False):
+        if not st.button("Fit surface", key="cc_opt_fit_surface"):
+            st.caption(f"Fetches up to {SURFACE_MAX_EXPIRIES} expiries and fits an SVI smile to each.")
+            return
+        snapshot = get_surface_snapshot(symbol, spot)
+        if snapshot is None:
+            st.caption("No chain available for a surface.")
+            return
+        try:
+            surface = snapshot.surface()
+        except ValueError as e:
+            st.caption(str(e))
+            return
+        grid = surface.grid()
+        fig = go.Figure()
+        for expiry, row in grid.iterrows():
+            fig.add_trace(go.Scatter(x=grid.columns, y=row.values * 100, mode="lines",
+                                     name=pd.Timestamp(expiry).strftime("%d %b %y")))
+        fig.update_layout(height=280, margin=dict(l=0, r=0, t=10, b=0),
+                          xaxis_title="Strike / Forward", yaxis_title="IV (%)",
+                          paper_bgcolor="rgba(0,0,0,0)", plot_bgcolor="rgba(0,0,0,0)",
+                          font=dict(color="#e6edf3", size=10))
+        st.plotly_chart(fig, use_container_width=True)
+        st.dataframe(surface.params[["T", "a", "b", "rho", "m", "sigma", "rmse"]].round(4),
+                     use_container_width=True)
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # Chunk 10 — Entry point (called by navigation/registry.py)
 # ─────────────────────────────────────────────────────────────────────────────
@@ -340,6 +340,13 @@ def _build_attribution_message(
         lines.append(f"- Excess return: {excess:+.2f}%")
         lines.append(f"- Allocation effect: {attr_data.get('allocation_effect', 0):.2f}%")
         lines.append(f"- Selection effect: {attr_data.get('selection_effect', 0):.2f}%")
+        if 'interaction_effect' in attr_data:
+            lines.append(f"- Interaction effect: {attr_data['interaction_effect']:.2f}%")
+        if attr_data.get('attribution_benchmark'):
+            lines.append(
+                f"- Effects measured against: {attr_data['attribution_benchmark']} "
+                f"({attr_data.get('attribution_benchmark_return', 0):.2f}%)"
+            )
         te = attr_data.get('tracking_error', 0)
         ir = attr_data.get('information_ratio', 0)
         if te:
@@ -62,6 +62,12 @@ def render_monte_carlo():
         with col3:
             confidence_level = st.slider("Confidence Level", min_value=90, max_value=99, value=95, step=1)
 
+        dependence = st.selectbox(
+            "Dependence Model",
+            ["Multivariate normal", "Student-t copula", "Clayton copula"],
+            help="Copulas fitted to the holdings' history add joint-crash (tail) dependence"
+        )
+
         if st.button("🚀 Run Monte Carlo Simulation", type="primary"):
             with st.spinner("Running Monte Carlo simulation..."):
                 try:
@@ -139,7 +145,9 @@ def render_monte_carlo():
                     print(f"   - Max weight: {weights.max():.4f}")
 
                     # Initialize StochasticEngine
-                    engine = StochasticEngine(tickers=list(returns.columns), returns_data=returns)
+                    copula = {"Student-t copula": "t", "Clayton copula": "clayton"}.get(dependence)
+                    engine = StochasticEngine(tickers=list(returns.columns), returns_data=returns,
+                                              copula=copula)
 
                     # Run Monte Carlo simulation
                     portfolio_paths, final_returns, metrics = engine.monte_carlo_simulation(
@@ -39,6 +39,7 @@ def render_performance_suite():
     import plotly.express as px
     from scipy import stats
     import numpy as np
+    from atlas_quant_dashboard.analytics import rolling_kernels as rk
 
     # Try to import optional functions
     try:
@@ -241,9 +242,10 @@ def render_performance_suite():
                 rolling_window = min(90, len(portfolio_returns) // 2)
 
                 if rolling_window > 20:
-                    rolling_sharpe = portfolio_returns.rolling(rolling_window).apply(
-                        lambda x: (x.mean() / x.std() * np.sqrt(252)) if x.std() > 0 else 0
-                    )
+                    # O(n) kernel; flat windows show 0 rather than a gap
+                    rolling_sharpe = rk.rolling_sharpe(portfolio_returns, rolling_window)
+                    full_window = portfolio_returns.rolling(rolling_window).count() >= rolling_window
+                    rolling_sharpe = rolling_sharpe.mask(full_window & rolling_sharpe.isna(), 0.0)
 
                     fig_rolling = go.Figure()
 
@@ -5,7 +5,6 @@ Extracted from atlas_app.py for modular page-level editing.
 import json
 import logging
 import os
-import threading
 
 from services.secrets_helper import get_secret
 from services.auto_sync import PIPELINE_RESULT_PATH
@@ -20,91 +19,14 @@ from utils.formatting import format_currency, format_percentage, format_large_nu
 _pipeline_logger = logging.getLogger('atlas.phoenix_pipeline')
 
 
-def _run_supabase_pipeline(api_key: str, api_secret: str, paper: bool, tickers: list) -> None:
-    """
-    Full Supabase data pipeline — runs in a daemon background thread.
-
-    Step 1: Write Alpaca portfolio (assets, positions, transactions) to Supabase
-            via services/alpaca_sync.run_sync().
-    Step 2: Fetch 5-year daily price history per ticker via
-            services/market_data.MarketDataIngestionService.
-
-    Results are written to PIPELINE_RESULT_PATH for the UI to pick up on
-    the next Streamlit rerun.  All per-ticker errors are non-fatal.
-    """
-    result = {
-        'supabase_stats': {},
-        'ingestion_results': {},
-        'ingestion_errors': {},
-        'error': None,
-    }
-
-    # Expose credentials for alpaca_sync.run_sync() which reads from os.environ.
-    # Atlas is a single-user deployment so process-wide env mutation is safe here.
-    os.environ['ALPACA_API_KEY'] = api_key
-    os.environ['ALPACA_API_SECRET'] = api_secret
-    os.environ['ALPACA_PAPER'] = 'true' if paper else 'false'
-
-    # ------------------------------------------------------------------ #
-    # Step 1 — Write portfolio snapshot to Supabase
-    # ------------------------------------------------------------------ #
-    try:
-        from services.alpaca_sync import run_sync
-        result['supabase_stats'] = run_sync()
-        _pipeline_logger.info(
-            "[Phoenix Pipeline] Supabase portfolio write complete: %s",
-            result['supabase_stats'],
-        )
-    except Exception as exc:
-        result['error'] = str(exc)
-        _pipeline_logger.error(
-            "[Phoenix Pipeline] Supabase portfolio write failed: %s", exc, exc_info=True
-        )
-        with open(PIPELINE_RESULT_PATH, 'w') as f:
-            json.dump(result, f)
-        return
-
-    # ------------------------------------------------------------------ #
-    # Step 2 — Per-ticker market data ingestion with result tracking
-    # ------------------------------------------------------------------ #
-    try:
-        from services.supabase_client import get_supabase_client
-        from services.market_data.ingestion_service import MarketDataIngestionService
-
-        supabase = get_supabase_client()
-        svc = MarketDataIngestionService(supabase)
-
-        for ticker in tickers:
-            try:
-                count = svc.sync_ticker(ticker)
-                result['ingestion_results'][ticker] = count
-            except Exception as exc:
-                result['ingestion_errors'][ticker] = str(exc)
-                _pipeline_logger.warning(
-                    "[Phoenix Pipeline] Ingestion failed for %s: %s", ticker, exc
-                )
-    except Exception as exc:
-        result['ingestion_errors']['_setup'] = str(exc)
-        _pipeline_logger.error(
-            "[Phoenix Pipeline] MarketDataIngestionService setup failed: %s", exc, exc_info=True
-        )
-
-    _pipeline_logger.info(
-        "[Phoenix Pipeline] Complete. ingestion_results=%d tickers, errors=%d",
-        len(result['ingestion_results']),
-        len(result['ingestion_errors']),
-    )
-    with open(PIPELINE_RESULT_PATH, 'w') as f:
-        json.dump(result, f)
-
-
 def _render_status_dashboard() -> None:
     """
     Status dashboard shown in Alpaca mode when env credentials are configured.
 
     Replaces the manual credential form.  Displays:
     - Supabase portfolio write outcome
-    - Market data ingestion progress / results (polls PIPELINE_RESULT_PATH)
+    - Market data ingestion progress / results (polls the ingestion job,
+      or PIPELINE_RESULT_PATH after a synchronous fallback run)
     - Force Re-Sync button to re-trigger the full pipeline
     """
     st.markdown("#### 🤖 Auto-Sync Active")
@@ -139,8 +61,27 @@ def _render_status_dashboard() -> None:
     _ticker_count = st.session_state.get('ingestion_ticker_count', 0)
 
     if _ing_status == 'running':
-        # Poll the result file written by _run_ingestion_only
-        if os.path.exists(PIPELINE_RESULT_PATH):
+        _job_id = st.session_state.get('ingestion_job_id')
+        _job = None
+        if _job_id:
+            try:
+                from services.jobs import get_job
+                _job = get_job(_job_id)
+            except Exception as exc:
+                _pipeline_logger.warning("[Phoenix] Could not read job %s: %s", _job_id, exc)
+
+        if _job is not None:
+            if _job['status'] in ('succeeded', 'failed', 'cancelled'):
+                _result = _job.get('result') or {}
+                st.session_state['ingestion_status'] = (
+                    'complete' if _job['status'] == 'succeeded' else 'failed'
+                )
+                st.session_state['ingestion_total_records'] = _result.get('records', 0)
+                st.session_state['ingestion_error_count'] = len(_result.get('ingestion_errors', {}))
+                st.session_state['ingestion_error_message'] = _job.get('error')
+                st.rerun()
+        elif os.path.exists(PIPELINE_RESULT_PATH):
+            # Written by the synchronous fallback (services/auto_sync.run_ingestion_only)
             try:
                 with open(PIPELINE_RESULT_PATH) as _f:
                     _result = json.load(_f)
@@ -155,13 +96,31 @@ def _render_status_dashboard() -> None:
             except Exception:
                 pass  # File may be mid-write; try again next rerun
 
+        _progress = (_job or {}).get('progress') or {}
+        if _progress.get('total'):
+            st.progress(
+                min(_progress.get('done', 0) / _progress['total'], 1.0),
+                text=f"{_progress.get('done', 0)} / {_progress['total']} tickers · "
+                     f"{_progress.get('records', 0):,} records",
+            )
+        if _job is not None and _job['status'] == 'queued' and _job.get('error'):
+            st.warning(
+                f"Attempt {_job['attempts']} of {_job['max_attempts']} failed "
+                f"({_job['error']}); retrying shortly."
+            )
         st.info(
-            f"🔄 Market data ingestion running for **{_ticker_count} tickers** in background. "
+            f"🔄 Market data ingestion running for **{_ticker_count} tickers** in a background worker. "
             f"Backfilling up to 5 years of daily price history."
         )
         if st.button("🔄 Check ingestion status", key="auto_check_ingestion_btn"):
             st.rerun()
 
+    elif _ing_status == 'failed':
+        st.error(
+            f"❌ Price history ingestion failed: "
+            f"{st.session_state.get('ingestion_error_message') or 'see worker log'}"
+        )
+
     elif _ing_status == 'complete':
         _total = st.session_state.get('ingestion_total_records', 0)
         _errors = st.session_state.get('ingestion_error_count', 0)
@@ -181,7 +140,8 @@ def _render_status_dashboard() -> None:
     if st.button("🔄 Force Re-Sync Now", key="force_resync_btn", type="secondary"):
         for _k in ('alpaca_synced', 'alpaca_sync_attempts', 'supabase_sync_status',
                    'supabase_sync_message', 'ingestion_status', 'ingestion_ticker_count',
-                   'ingestion_total_records', 'ingestion_error_count'):
+                   'ingestion_total_records', 'ingestion_error_count', 'ingestion_job_id',
+                   'ingestion_error_message'):
             st.session_state.pop(_k, None)
         st.rerun()
 
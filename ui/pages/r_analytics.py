@@ -19,7 +19,11 @@ def render_r_analytics():
         apply_chart_theme,
     )
 
-    # Check for R availability
+    from analytics.copula import fit_copula
+    from analytics.volatility import fit_garch
+
+    # Check for R availability (only custom R code still runs in R;
+    # GARCH volatility and copulas are native)
     try:
         import rpy2
         from rpy2.robjects.packages import importr
@@ -32,21 +36,6 @@ def render_r_analytics():
     def get_r():
         """Stub for R interface."""
         class RInterface:
-            def garch_volatility(self, returns, model='sGARCH'):
-                return {
-                    'last_volatility': 0.02,
-                    'mean_volatility': 0.02,
-                    'model': model,
-                    'volatility': returns.rolling(20).std()
-                }
-
-            def copula_dependency(self, returns_data, copula_type='t'):
-                return {
-                    'copula_type': copula_type,
-                    'n_assets': returns_data.shape[1],
-                    'parameters': {}
-                }
-
             def run_custom_analysis(self, r_code, data=None):
                 return "R analysis not available"
 
@@ -57,112 +46,17 @@ def render_r_analytics():
 
     st.markdown("## 📊 R ANALYTICS - ADVANCED QUANTITATIVE MODELS")
 
-    if not R_AVAILABLE:
-        st.error("❌ R Analytics Requires Manual Setup")
-
-        st.markdown("""
-        ### 📋 R Analytics Setup Instructions
-
-        R analytics requires packages that cannot be installed from within the app.
-        You must install these dependencies **before** running the application.
-
-        ---
-
-        #### 🔧 For Google Colab Users:
-
-        1. Create a new code cell **ABOVE** your Streamlit app cell
-        2. Run this code:
-
-        ```python
-        # Install R and packages (takes 3-5 minutes)
-        !apt-get update -qq
-        !apt-get install -y r-base r-base-dev
-        !R -e "install.packages(c('rugarch', 'copula', 'xts'), repos='https://cloud.r-project.org')"
-        !pip install rpy2
-        ```
-
-        3. Wait for installation to complete
-        4. Restart your Streamlit app
-        5. R Analytics will then be available
-
-        ---
-
-        #### 💻 For Local Deployment (Linux/MacOS):
-
-        ```bash
-        # Install R
-        sudo apt-get update
-        sudo apt-get install -y r-base r-base-dev
-
-        # Install R packages
-        R -e "install.packages(c('rugarch', 'copula', 'xts'), repos='https://cloud.r-project.org')"
-
-        # Install Python bridge
-        pip install rpy2
-        ```
-
-        ---
-
-        #### 🪟 For Windows:
-
-        1. Download and install R from: https://cran.r-project.org/bin/windows/base/
-        2. Open R console and run:
-           ```r
-           install.packages(c('rugarch', 'copula', 'xts'))
-           ```
-        3. Install rpy2:
-           ```bash
-           pip install rpy2
-           ```
-
-        ---
-        """)
-
-        # Add status check
-        st.markdown("### 🔍 Package Status Check")
-
-        col1, col2, col3 = st.columns(3)
-
-        with col1:
-            try:
-                import rpy2
-                st.success("✅ rpy2 installed")
-            except ImportError:
-                st.error("❌ rpy2 missing")
-                st.caption("Run: `pip install rpy2`")
-
-        with col2:
-            try:
-                from rpy2.robjects.packages import importr
-                importr('rugarch')
-                st.success("✅ rugarch available")
-            except (ImportError, OSError):
-                st.error("❌ rugarch missing")
-                st.caption("Install in R")
-
-        with col3:
-            try:
-                from rpy2.robjects.packages import importr
-                importr('copula')
-                st.success("✅ copula available")
-            except (ImportError, OSError):
-                st.error("❌ copula missing")
-                st.caption("Install in R")
-
-        return
-
-    # Initialize R analytics
-    try:
-        r = get_r()
+    r = get_r() if R_AVAILABLE else None
+    if R_AVAILABLE:
         st.success("✅ R Analytics Engine Ready")
-    except (ImportError, OSError, RuntimeError) as e:
-        st.error(f"Error initializing R: {str(e)}")
-        return
+    else:
+        st.info("GARCH volatility and copulas run natively. Custom R code needs an R installation "
+                "(setup instructions in that tab).")
 
     # Create tabs
     tabs = st.tabs(["📈 GARCH Volatility", "🔗 Copula Analysis", "🎲 Custom R Code"])
 
-    # Tab 1: GARCH Volatility Modeling
+    # Tab 1: GARCH Volatility Modeling (native engine, no R required)
     with tabs[0]:
         st.markdown("### 📈 GARCH Volatility Forecasting")
         st.markdown("Fit GARCH models to estimate conditional volatility and forecast future volatility")
@@ -172,9 +66,14 @@ def render_r_analytics():
             st.warning("⚠️ Upload portfolio data via Phoenix Parser first")
         else:
             df = pd.DataFrame(portfolio_data)
+            all_tickers = df['Ticker'].tolist() if 'Ticker' in df.columns else []
 
-            # Ticker selection
-            ticker = st.selectbox("Select Ticker", df['Ticker'].tolist() if 'Ticker' in df.columns else [])
+            scope = st.radio("Fit", ["Single ticker", "All holdings"], horizontal=True)
+            if scope == "Single ticker":
+                ticker = st.selectbox("Select Ticker", all_tickers)
+                tickers = [ticker] if ticker else []
+            else:
+                tickers = all_tickers
 
             col1, col2 = st.columns(2)
             with col1:
@@ -182,47 +81,101 @@ def render_r_analytics():
             with col2:
                 forecast_days = st.number_input("Forecast Horizon (days)", 1, 30, 10)
 
-            if st.button("🎯 Fit GARCH Model", type="primary"):
-                with st.spinner(f"Fitting {model_type} model to {ticker}..."):
+            if tickers and st.button("🎯 Fit GARCH Model", type="primary"):
+                fit = None
+                with st.spinner(f"Fitting {model_type} model to {len(tickers)} asset(s)..."):
                     try:
-                        # Get historical data
-                        stock_data = MarketDataFetcher.get_prices([ticker], period="1y")
-                        returns = stock_data.iloc[:, 0].pct_change().dropna()
-
-                        # Fit GARCH model using R
-                        result = r.garch_volatility(returns, model=model_type)
-
-                        # Display metrics
-                        col1, col2, col3 = st.columns(3)
-                        col1.metric("Current Volatility", f"{result['last_volatility']*100:.2f}%")
-                        col2.metric("Mean Volatility", f"{result['mean_volatility']*100:.2f}%")
-                        col3.metric("Model Type", result['model'])
-
-                        # Plot volatility
-                        import plotly.graph_objects as go
-                        fig = go.Figure()
-                        fig.add_trace(go.Scatter(
-                            y=result['volatility'] * 100,
-                            mode='lines',
-                            name=f'{model_type} Volatility',
-                            line=dict(color='#818cf8', width=2)
-                        ))
-                        fig.update_layout(
-                            title=f"{ticker} - Conditional Volatility ({model_type})",
-                            xaxis_title="Time",
-                            yaxis_title="Volatility (%)",
-                            height=400,
-                        )
-                        apply_chart_theme(fig)
-                        st.plotly_chart(fig, use_container_width=True)
-
-                        st.success(f"✅ {model_type} model fitted successfully to {ticker}")
-
+                        # Get historical data; all holdings are fitted in one batch
+                        prices = MarketDataFetcher.get_prices(tickers, period="1y")
+                        returns = prices.pct_change().iloc[1:].dropna(axis=1, how='all')
+                        fit = fit_garch(returns, model=model_type)
                     except (ValueError, KeyError, TypeError, AttributeError, RuntimeError) as e:
                         st.error(f"Error: {str(e)}")
-                        st.info("Make sure rugarch package is installed in R: install.packages('rugarch')")
 
-    # Tab 2: Copula Dependency Analysis
+                if fit is not None and len(fit.assets) == 1:
+                    ticker = fit.assets[0]
+                    result = fit.summary()
+                    forecast = fit.forecast(int(forecast_days))[ticker]
+
+                    # Display metrics
+                    col1, col2, col3 = st.columns(3)
+                    col1.metric("Current Volatility", f"{result['last_volatility']*100:.2f}%")
+                    col2.metric("Mean Volatility", f"{result['mean_volatility']*100:.2f}%")
+                    col3.metric(f"{int(forecast_days)}d Forecast", f"{forecast.iloc[-1]*100:.2f}%")
+
+                    # Plot volatility with the forecast appended
+                    import plotly.graph_objects as go
+                    fig = go.Figure()
+                    fig.add_trace(go.Scatter(
+                        x=result['volatility'].index,
+                        y=result['volatility'] * 100,
+                        mode='lines',
+                        name=f'{model_type} Volatility',
+                        line=dict(color='#818cf8', width=2)
+                    ))
+                    future = pd.bdate_range(result['volatility'].index[-1], periods=len(forecast) + 1)[1:]
+                    fig.add_trace(go.Scatter(
+                        x=future,
+                        y=forecast.values * 100,
+                        mode='lines',
+                        name='Forecast',
+                        line=dict(color='#f59e0b', width=2, dash='dash')
+                    ))
+                    fig.update_layout(
+                        title=f"{ticker} - Conditional Volatility ({model_type})",
+                        xaxis_title="Time",
+                        yaxis_title="Daily Volatility (%)",
+                        height=400,
+                    )
+                    apply_chart_theme(fig)
+                    st.plotly_chart(fig, use_container_width=True)
+
+                    params = fit.params.loc[ticker]
+                    st.caption(
+                        f"omega={params['omega']:.2e} · alpha={params['alpha']:.3f} · "
+                        f"gamma={params['gamma']:.3f} · beta={params['beta']:.3f} · "
+                        f"persistence={params['persistence']:.3f} · "
+                        f"long-run vol={params['long_run_volatility']*100:.1f}% p.a."
+                    )
+                    st.success(f"✅ {model_type} model fitted successfully to {ticker}")
+
+                elif fit is not None:
+                    st.success(f"✅ {model_type} fitted to {len(fit.assets)} holdings")
+
+                    # Annualised vol term structure per holding
+                    term = fit.term_structure((1, 5, 21, 63, 126, 252))
+                    table = pd.DataFrame({
+                        'Current Vol': fit.conditional_volatility.ffill().iloc[-1] * (252 ** 0.5),
+                        '1M Vol': term.loc[21],
+                        '3M Vol': term.loc[63],
+                        '1Y Vol': term.loc[252],
+                        'Long-Run Vol': fit.params['long_run_volatility'],
+                        'Persistence': fit.params['persistence'],
+                        'Converged': fit.params['converged'],
+                    })
+                    st.dataframe(
+                        table.style.format({
+                            **{c: '{:.1%}' for c in ['Current Vol', '1M Vol', '3M Vol', '1Y Vol', 'Long-Run Vol']},
+                            'Persistence': '{:.3f}',
+                        }),
+                        use_container_width=True,
+                    )
+
+                    import plotly.graph_objects as go
+                    fig = go.Figure()
+                    for asset in term.columns:
+                        fig.add_trace(go.Scatter(x=term.index, y=term[asset] * 100, mode='lines+markers',
+                                                 name=str(asset)))
+                    fig.update_layout(
+                        title=f"Volatility Term Structure ({model_type})",
+                        xaxis_title="Horizon (trading days)",
+                        yaxis_title="Annualised Volatility (%)",
+                        height=450,
+                    )
+                    apply_chart_theme(fig)
+                    st.plotly_chart(fig, use_container_width=True)
+
+    # Tab 2: Copula Dependency Analysis (native engine, no R required)
     with tabs[1]:
         st.markdown("### 🔗 Copula Dependency Analysis")
         st.markdown("Model the dependency structure between assets using copula functions")
@@ -241,7 +194,12 @@ def render_r_analytics():
                 default=all_tickers[:min(3, len(all_tickers))]
             )
 
-            copula_type = st.selectbox("Copula Type", ["t", "normal", "clayton", "gumbel"])
+            col1, col2 = st.columns(2)
+            with col1:
+                copula_type = st.selectbox("Copula Type", ["t", "normal", "clayton"])
+            with col2:
+                marginals = st.selectbox("Marginals", ["empirical", "garch"],
+                                         help="'garch' fits the dependence of GARCH-filtered residuals")
 
             if len(selected_tickers) >= 2:
                 if st.button("🔗 Fit Copula", type="primary"):
@@ -250,39 +208,49 @@ def render_r_analytics():
                             # Get returns data
                             returns_data = MarketDataFetcher.get_prices(selected_tickers, period="1y").pct_change().dropna()
 
-                            # Fit copula
-                            result = r.copula_dependency(returns_data, copula_type=copula_type)
+                            # Fit copula (and a Gaussian benchmark for the joint-tail comparison)
+                            fit = fit_copula(returns_data, copula_type, marginals=marginals)
+                            gaussian = fit if fit.family == 'gaussian' else fit_copula(returns_data, 'gaussian')
+                            result = fit.summary()
 
                             st.success(f"✅ {copula_type.upper()} Copula fitted successfully")
 
-                            col1, col2 = st.columns(2)
+                            col1, col2, col3, col4 = st.columns(4)
                             col1.metric("Copula Type", result['copula_type'].upper())
                             col2.metric("Number of Assets", result['n_assets'])
+                            col3.metric("AIC", f"{result['aic']:,.1f}")
+                            crash = fit.joint_crash_probability(0.05, n=500_000, rng=0)
+                            crash_gauss = gaussian.joint_crash_probability(0.05, n=500_000, rng=0)
+                            col4.metric("Joint 5% Crash Prob.", f"{crash:.2%}",
+                                        delta=f"{crash - crash_gauss:+.2%} vs Gaussian", delta_color="inverse")
 
                             st.markdown("#### Copula Parameters")
                             st.write(result['parameters'])
 
-                            # Correlation heatmap
-                            corr_matrix = returns_data.corr()
+                            # Correlation and lower-tail dependence heatmaps
                             import plotly.express as px
-                            fig = px.imshow(
-                                corr_matrix,
-                                labels=dict(color="Correlation"),
-                                x=corr_matrix.columns,
-                                y=corr_matrix.columns,
-                                color_continuous_scale='Spectral_r',
-                                zmin=-1, zmax=1
-                            )
-                            fig.update_layout(
-                                title="Asset Correlation Matrix",
-                                height=500,
-                            )
-                            apply_chart_theme(fig)
-                            st.plotly_chart(fig, use_container_width=True)
+                            corr_matrix = returns_data.corr()
+                            for matrix, title, label, zmin in (
+                                (corr_matrix, "Asset Correlation Matrix", "Correlation", -1),
+                                (fit.tail_dependence(), "Lower-Tail Dependence", "Lambda", 0),
+                            ):
+                                fig = px.imshow(
+                                    matrix,
+                                    labels=dict(color=label),
+                                    x=matrix.columns,
+                                    y=matrix.columns,
+                                    color_continuous_scale='Spectral_r',
+                                    zmin=zmin, zmax=1
+                                )
+                                fig.update_layout(
+                                    title=title,
+                                    height=500,
+                                )
+                                apply_chart_theme(fig)
+                                st.plotly_chart(fig, use_container_width=True)
 
                         except (ValueError, KeyError, TypeError, AttributeError, RuntimeError) as e:
                             st.error(f"Error: {str(e)}")
-                            st.info("Make sure copula package is installed in R: install.packages('copula')")
             else:
                 st.info("Please select at least 2 assets for copula analysis")
 
@@ -293,6 +261,9 @@ def render_r_analytics():
 
         st.markdown("**Portfolio data available as `df` variable in R**")
 
+        if not R_AVAILABLE:
+            _render_r_setup()
+
         r_code = st.text_area(
             "R Code",
             value="""# Example: Calculate correlation matrix
@@ -303,7 +274,7 @@ def render_r_analytics():
             height=200
         )
 
-        if st.button("▶️ Run R Code", type="primary"):
+        if R_AVAILABLE and st.button("▶️ Run R Code", type="primary"):
             portfolio_data = load_portfolio_data()
 
             if portfolio_data is None or (isinstance(portfolio_data, pd.DataFrame) and portfolio_data.empty):
@@ -335,3 +306,96 @@ def render_r_analytics():
     # ========================================================================
     # DATABASE PAGE - PROFESSIONAL SQL INTERFACE
 
+
+def _render_r_setup():
+    """Setup instructions and package status for the custom R code tab."""
+    st.error("❌ R Analytics Requires Manual Setup")
+
+    st.markdown("""
+    ### 📋 R Analytics Setup Instructions
+
+    R analytics requires packages that cannot be installed from within the app.
+    You must install these dependencies **before** running the application.
+
+    ---
+
+    #### 🔧 For Google Colab Users:
+
+    1. Create a new code cell **ABOVE** your Streamlit app cell
+    2. Run this code:
+
+    ```python
+    # Install R and packages (takes 3-5 minutes)
+    !apt-get update -qq
+    !apt-get install -y r-base r-base-dev
+    !R -e "install.packages(c('rugarch', 'copula', 'xts'), repos='https://cloud.r-project.org')"
+    !pip install rpy2
+    ```
+
+    3. Wait for installation to complete
+    4. Restart your Streamlit app
+    5. R Analytics will then be available
+
+    ---
+
+    #### 💻 For Local Deployment (Linux/MacOS):
+
+    ```bash
+    # Install R
+    sudo apt-get update
+    sudo apt-get install -y r-base r-base-dev
+
+    # Install R packages
+    R -e "install.packages(c('rugarch', 'copula', 'xts'), repos='https://cloud.r-project.org')"
+
+    # Install Python bridge
+    pip install rpy2
+    ```
+
+    ---
+
+    #### 🪟 For Windows:
+
+    1. Download and install R from: https://cran.r-project.org/bin/windows/base/
+    2. Open R console and run:
+       ```r
+       install.packages(c('rugarch', 'copula', 'xts'))
+       ```
+    3. Install rpy2:
+       ```bash
+       pip install rpy2
+       ```
+
+    ---
+    """)
+
+    # Add status check
+    st.markdown("### 🔍 Package Status Check")
+
+    col1, col2, col3 = st.columns(3)
+
+    with col1:
+        try:
+            import rpy2
+            st.success("✅ rpy2 installed")
+        except ImportError:
+            st.error("❌ rpy2 missing")
+            st.caption("Run: `pip install rpy2`")
+
+    with col2:
+        try:
+            from rpy2.robjects.packages import importr
+            importr('rugarch')
+            st.success("✅ rugarch available")
+        except (ImportError, OSError):
+            st.error("❌ rugarch missing")
+            st.caption("Install in R")
+
+    with col3:
+        try:
+            from rpy2.robjects.packages import importr
+            importr('copula')
+            st.success("✅ copula available")
+        except (ImportError, OSError):
+            st.error("❌ copula missing")
+            st.caption("Install in R")
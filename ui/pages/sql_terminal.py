@@ -5,10 +5,15 @@ A first-class ATLAS module for exploring the portfolio database in real time,
 saving discoveries, and routing insights back to Supabase as materialised tables.
 
 Read-only by default. Write path (materialise) is isolated to a separate RPC.
+
+Queries run on the local DuckDB engine (services.sql_engine) when every
+table they reference has a Parquet snapshot, and on Supabase otherwise --
+or, with push-down enabled, whenever a referenced snapshot is stale.
 """
 
 from __future__ import annotations
 
+import html
 import re
 import time
 from datetime import datetime
@@ -76,6 +81,46 @@ def _exec_sql(sql: str) -> dict:
         return {"ok": False, "df": pd.DataFrame(), "rows": 0, "ms": elapsed, "err": str(exc)}
 
 
+def _local_engine():
+    from services.sql_engine import get_sql_engine
+    return get_sql_engine()
+
+
+def _run_query(sql: str, use_local: bool, push_down_stale: bool) -> dict:
+    """Run on the local engine when it can serve the query, else on Supabase."""
+    reason = "Supabase selected"
+    if use_local:
+        try:
+            engine = _local_engine()
+            target, reason = engine.route(sql, push_down_stale=push_down_stale)
+        except Exception as exc:
+            target, reason = "remote", str(exc)
+        if target == "local":
+            result = engine.query(sql)
+            if result["ok"]:
+                result["route"] = reason
+                return result
+            # Dialect gaps and the like: Supabase still has the final word
+            reason = f"local engine failed: {result['err']}"
+    result = _exec_sql(sql)
+    result.update(engine="supabase", cached=False, route=reason)
+    return result
+
+
+def _explain(sql: str, use_local: bool, push_down_stale: bool) -> dict:
+    """DuckDB plan for a query the local engine would serve."""
+    if not use_local:
+        return {"plan": None, "note": "EXPLAIN is available on the local engine only."}
+    try:
+        engine = _local_engine()
+        target, reason = engine.route(sql, push_down_stale=push_down_stale)
+        if target != "local":
+            return {"plan": None, "note": f"Query routes to Supabase ({reason}); EXPLAIN needs the local engine."}
+        return {"plan": engine.explain(sql), "note": reason}
+    except Exception as exc:
+        return {"plan": None, "note": f"EXPLAIN failed: {exc}"}
+
+
 def _log_query(sql: str, ms: int, rows: int, err: Optional[str], saved: bool = False):
     try:
         _client().table("query_log").insert({
@@ -443,6 +488,47 @@ _KBD_JS = """
 
 # ── Sub-renderers ────────────────────────────────────────────────────────────────
 
+def _format_age(seconds: float) -> str:
+    if seconds < 3600:
+        return f"{int(seconds // 60)}m ago"
+    if seconds < 86400:
+        return f"{seconds / 3600:.0f}h ago"
+    return f"{seconds / 86400:.0f}d ago"
+
+
+def _render_snapshot_panel():
+    st.markdown('<p class="schema-hdr">⚡ Local Snapshots</p>', unsafe_allow_html=True)
+    try:
+        from services.sql_engine import DUCKDB_AVAILABLE, get_snapshot_store
+        store = get_snapshot_store()
+        manifest = store.manifest
+    except Exception as e:
+        st.caption(f"Local engine unavailable: {e}")
+        return
+
+    if not DUCKDB_AVAILABLE:
+        st.caption("Install `duckdb` to run queries locally.")
+    if manifest:
+        now = time.time()
+        for tbl, info in sorted(manifest.items()):
+            st.markdown(
+                f'<div class="schema-col-row">{tbl}'
+                f'<span class="schema-type">{info["rows"]:,} · {_format_age(now - info["refreshed_at"])}</span></div>',
+                unsafe_allow_html=True,
+            )
+    else:
+        st.caption("No snapshots yet — every query goes to Supabase.")
+
+    if st.button("⟳ Refresh snapshots", key="snapshot_refresh", help="Copy core tables from Supabase to Parquet"):
+        with st.spinner("Snapshotting…"):
+            results = store.refresh_from_supabase(_client())
+            store.refresh_local_prices()
+        failed = {t: r for t, r in results.items() if isinstance(r, str)}
+        if failed:
+            st.warning("Snapshot failed for " + ", ".join(f"`{t}`" for t in failed))
+        st.rerun()
+
+
 def _render_schema_sidebar():
     st.markdown('<p class="schema-hdr">📋 Schema Browser</p>', unsafe_allow_html=True)
     if st.button("↺ Refresh", key="schema_refresh", help="Reload schema from Supabase"):
@@ -452,6 +538,8 @@ def _render_schema_sidebar():
     with st.spinner("Loading…"):
         schema = _fetch_schema()
 
+    _render_snapshot_panel()
+
     if not schema:
         st.caption("Schema unavailable — check Supabase connection.")
         return
@@ -678,6 +766,7 @@ def render_sql_terminal():
     st.session_state.setdefault("sql_history", [])
     st.session_state.setdefault("show_save_modal", False)
     st.session_state.setdefault("show_mat_modal", False)
+    st.session_state.setdefault("sql_explain", None)
 
     # ── Header ─────────────────────────────────────────────────────────────────
     st.markdown(
@@ -693,7 +782,7 @@ def render_sql_terminal():
             🛢 Query Your Portfolio Universe
           </h2>
           <p style="font-size:0.7rem;color:rgba(255,255,255,0.38);margin-top:0.2rem">
-            Read-only · Supabase PostgreSQL · Auto-limited to 10,000 rows ·
+            Read-only · Local DuckDB snapshots or Supabase PostgreSQL · Auto-limited to 10,000 rows ·
             Ctrl+Enter / ⌘+Enter to execute
           </p>
         </div>
@@ -710,6 +799,22 @@ def render_sql_terminal():
 
     # ── Editor panel ───────────────────────────────────────────────────────────
     with col_editor:
+        o1, o2 = st.columns([2, 3])
+        with o1:
+            use_local = st.checkbox(
+                "⚡ Local engine (DuckDB)",
+                value=True,
+                key="sql_use_local",
+                help="Run against local Parquet snapshots when they cover the query.",
+            )
+        with o2:
+            push_down = st.checkbox(
+                "Push down to Supabase when snapshot is stale",
+                value=True,
+                key="sql_push_down",
+                disabled=not use_local,
+            )
+
         with st.form("sql_form", clear_on_submit=False):
             sql_input = st.text_area(
                 "SQL Editor",
@@ -726,17 +831,28 @@ def render_sql_terminal():
                 save_btn = st.form_submit_button("💾 Save", use_container_width=True)
             with c3:
                 clear_btn = st.form_submit_button("✕ Clear", use_container_width=True)
+            with c4:
+                explain_btn = st.form_submit_button("🔍 Explain", use_container_width=True)
 
         # Persist editor text on any form submit
-        if run or save_btn or clear_btn:
+        if run or save_btn or clear_btn or explain_btn:
             st.session_state["sql_text"] = sql_input
 
         if clear_btn:
             st.session_state["sql_text"] = ""
             st.session_state["sql_results"] = None
             st.session_state["sql_meta"] = None
+            st.session_state["sql_explain"] = None
             st.rerun()
 
+        # ── Explain ────────────────────────────────────────────────────────────
+        if explain_btn and sql_input.strip():
+            ok, err_msg = _validate_sql(sql_input)
+            if not ok:
+                st.error(f"🚫 {err_msg}")
+            else:
+                st.session_state["sql_explain"] = _explain(_ensure_limit(sql_input), use_local, push_down)
+
         # ── Execute ────────────────────────────────────────────────────────────
         if run and sql_input.strip():
             ok, err_msg = _validate_sql(sql_input)
@@ -745,7 +861,7 @@ def render_sql_terminal():
             else:
                 bounded = _ensure_limit(sql_input)
                 with st.spinner("Executing…"):
-                    result = _exec_sql(bounded)
+                    result = _run_query(bounded, use_local, push_down)
 
                 st.session_state["sql_results"] = result["df"]
                 st.session_state["sql_meta"] = {
@@ -753,6 +869,9 @@ def render_sql_terminal():
                     "ms": result["ms"],
                     "err": result["err"],
                     "sql": bounded,
+                    "engine": result["engine"],
+                    "cached": result["cached"],
+                    "route": result["route"],
                 }
 
                 # History (last 50, no duplicates)
@@ -774,10 +893,13 @@ def render_sql_terminal():
         # ── Metadata bar ───────────────────────────────────────────────────────
         meta = st.session_state.get("sql_meta")
         if meta:
+            engine_lbl = "DuckDB" if meta.get("engine") == "duckdb" else "Supabase"
+            if meta.get("cached"):
+                engine_lbl += " · cached"
             if meta["err"]:
                 st.markdown(
                     f'<div class="sql-meta"><span class="err">✗ Error</span> · '
-                    f'<span class="num">{meta["ms"]}ms</span></div>',
+                    f'<span class="num">{meta["ms"]}ms</span> · {engine_lbl}</div>',
                     unsafe_allow_html=True,
                 )
                 st.error(meta["err"])
@@ -785,10 +907,21 @@ def render_sql_terminal():
                 st.markdown(
                     f'<div class="sql-meta"><span class="ok">✓</span> '
                     f'<span class="num">{meta["rows"]:,} rows</span> · '
-                    f'<span class="num">{meta["ms"]}ms</span></div>',
+                    f'<span class="num">{meta["ms"]}ms</span> · '
+                    f'<span title="{html.escape(meta.get("route", ""))}">{engine_lbl}</span></div>',
                     unsafe_allow_html=True,
                 )
 
+        # ── Query plan ─────────────────────────────────────────────────────────
+        explained = st.session_state.get("sql_explain")
+        if explained:
+            with st.expander("🔍 Query plan", expanded=True):
+                if explained["plan"]:
+                    st.caption(explained["note"])
+                    st.code(explained["plan"], language="text")
+                else:
+                    st.info(explained["note"])
+
         # ── Results table ──────────────────────────────────────────────────────
         df: pd.DataFrame = st.session_state.get("sql_results")
         if df is not None and not df.empty: